@@ -0,0 +1,43 @@
+"""Add progress and spool format to report_executions
+
+Revision ID: a3c7e9f1b5d4
+Revises: f1a9d3c5e7b2
+Create Date: 2026-10-19 17:48:12.604931
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3c7e9f1b5d4'
+down_revision: Union[str, None] = 'f1a9d3c5e7b2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('report_executions', sa.Column('result_format', sa.String(20), nullable=True), schema='synapscale_db')
+    op.add_column('report_executions', sa.Column('progress', sa.Float(), nullable=True), schema='synapscale_db')
+    # Resultados spoolados podem passar de 2^31 linhas/bytes
+    op.alter_column('report_executions', 'rows_processed', type_=sa.BigInteger(), schema='synapscale_db')
+    op.alter_column('report_executions', 'data_size_bytes', type_=sa.BigInteger(), schema='synapscale_db')
+    op.create_index(
+        'ix_report_executions_report_started',
+        'report_executions',
+        ['report_id', 'started_at'],
+        unique=False,
+        schema='synapscale_db',
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_report_executions_report_started', 'report_executions', schema='synapscale_db')
+    op.alter_column('report_executions', 'data_size_bytes', type_=sa.Integer(), schema='synapscale_db')
+    op.alter_column('report_executions', 'rows_processed', type_=sa.Integer(), schema='synapscale_db')
+    op.drop_column('report_executions', 'progress', schema='synapscale_db')
+    op.drop_column('report_executions', 'result_format', schema='synapscale_db')
@@ -0,0 +1,32 @@
+"""Add worker owner and heartbeat to analytics_exports
+
+Revision ID: a6c0e4f8b2d5
+Revises: f4b8d2a6c0e3
+Create Date: 2026-10-20 09:41:05.772913
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a6c0e4f8b2d5'
+down_revision: Union[str, None] = 'f4b8d2a6c0e3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('analytics_exports', sa.Column('worker_id', sa.String(255), nullable=True), schema='synapscale_db')
+    op.add_column(
+        'analytics_exports', sa.Column('heartbeat_at', sa.DateTime(timezone=True), nullable=True), schema='synapscale_db'
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('analytics_exports', 'heartbeat_at', schema='synapscale_db')
+    op.drop_column('analytics_exports', 'worker_id', schema='synapscale_db')
@@ -0,0 +1,43 @@
+"""Add partition manifest and counters to analytics_exports
+
+Revision ID: b5d1f3a7c9e2
+Revises: a3c7e9f1b5d4
+Create Date: 2026-10-19 19:05:41.218377
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5d1f3a7c9e2'
+down_revision: Union[str, None] = 'a3c7e9f1b5d4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('analytics_exports', sa.Column('manifest', postgresql.JSONB(), nullable=True), schema='synapscale_db')
+    op.add_column('analytics_exports', sa.Column('rows_exported', sa.BigInteger(), nullable=True), schema='synapscale_db')
+    op.add_column('analytics_exports', sa.Column('bytes_written', sa.BigInteger(), nullable=True), schema='synapscale_db')
+    op.add_column('analytics_exports', sa.Column('error_message', sa.Text(), nullable=True), schema='synapscale_db')
+    op.create_index(
+        'ix_analytics_exports_status',
+        'analytics_exports',
+        ['status'],
+        unique=False,
+        schema='synapscale_db',
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_analytics_exports_status', 'analytics_exports', schema='synapscale_db')
+    op.drop_column('analytics_exports', 'error_message', schema='synapscale_db')
+    op.drop_column('analytics_exports', 'bytes_written', schema='synapscale_db')
+    op.drop_column('analytics_exports', 'rows_exported', schema='synapscale_db')
+    op.drop_column('analytics_exports', 'manifest', schema='synapscale_db')
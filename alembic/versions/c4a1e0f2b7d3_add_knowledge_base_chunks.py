@@ -0,0 +1,57 @@
+"""Add knowledge_base_chunks table for chunked retrieval
+
+Revision ID: c4a1e0f2b7d3
+Revises: 18130f981b06
+Create Date: 2026-10-19 09:12:40.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4a1e0f2b7d3'
+down_revision: Union[str, None] = '18130f981b06'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'knowledge_base_chunks',
+        sa.Column('id', UUID(as_uuid=True), primary_key=True),
+        sa.Column(
+            'kb_id',
+            UUID(as_uuid=True),
+            sa.ForeignKey('synapscale_db.knowledge_bases.kb_id', ondelete='CASCADE'),
+            nullable=False,
+        ),
+        sa.Column('section', sa.Text(), nullable=False),
+        sa.Column('chunk_index', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('content', sa.Text(), nullable=False),
+        sa.Column('content_hash', sa.String(40), nullable=False),
+        sa.Column('metadata', JSONB(), nullable=True),
+        sa.Column('embedding', sa.LargeBinary(), nullable=True),
+        sa.Column('embedding_model', sa.String(100), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.text('now()')),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.text('now()')),
+        sa.UniqueConstraint('kb_id', 'content_hash', name='uq_kb_chunks_kb_hash'),
+        schema='synapscale_db',
+    )
+    op.create_index(
+        'ix_kb_chunks_kb_id',
+        'knowledge_base_chunks',
+        ['kb_id'],
+        unique=False,
+        schema='synapscale_db',
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_kb_chunks_kb_id', 'knowledge_base_chunks', schema='synapscale_db')
+    op.drop_table('knowledge_base_chunks', schema='synapscale_db')
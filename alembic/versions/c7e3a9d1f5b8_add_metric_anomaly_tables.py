@@ -0,0 +1,76 @@
+"""Add metric_detector_states and metric_anomalies tables
+
+Revision ID: c7e3a9d1f5b8
+Revises: b5d1f3a7c9e2
+Create Date: 2026-10-19 20:31:57.642018
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7e3a9d1f5b8'
+down_revision: Union[str, None] = 'b5d1f3a7c9e2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'metric_detector_states',
+        sa.Column('metric_name', sa.String(100), primary_key=True),
+        sa.Column('resolution', sa.String(4), primary_key=True),
+        sa.Column(
+            'tenant_id',
+            UUID(as_uuid=True),
+            sa.ForeignKey('synapscale_db.tenants.id', ondelete='CASCADE'),
+            primary_key=True,
+        ),
+        sa.Column('service', sa.String(50), primary_key=True),
+        sa.Column('state', JSONB(), nullable=False, server_default=sa.text("'{}'")),
+        sa.Column('last_bucket', sa.DateTime(), nullable=False),
+        sa.Column('last_score', sa.Float(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.text('now()')),
+        schema='synapscale_db',
+    )
+    op.create_table(
+        'metric_anomalies',
+        sa.Column('metric_name', sa.String(100), primary_key=True),
+        sa.Column('resolution', sa.String(4), primary_key=True),
+        sa.Column('bucket_start', sa.DateTime(), primary_key=True),
+        sa.Column(
+            'tenant_id',
+            UUID(as_uuid=True),
+            sa.ForeignKey('synapscale_db.tenants.id', ondelete='CASCADE'),
+            primary_key=True,
+        ),
+        sa.Column('service', sa.String(50), primary_key=True),
+        sa.Column('value', sa.Float(), nullable=False),
+        sa.Column('expected', sa.Float(), nullable=True),
+        sa.Column('score', sa.Float(), nullable=False),
+        sa.Column('direction', sa.String(4), nullable=False),
+        sa.Column('details', JSONB(), nullable=False, server_default=sa.text("'{}'")),
+        sa.Column('detected_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.text('now()')),
+        schema='synapscale_db',
+    )
+    op.create_index('ix_metric_anomalies_bucket', 'metric_anomalies', ['bucket_start'], unique=False, schema='synapscale_db')
+    op.create_index(
+        'ix_metric_anomalies_metric_bucket',
+        'metric_anomalies',
+        ['metric_name', 'bucket_start'],
+        unique=False,
+        schema='synapscale_db',
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_metric_anomalies_metric_bucket', 'metric_anomalies', schema='synapscale_db')
+    op.drop_index('ix_metric_anomalies_bucket', 'metric_anomalies', schema='synapscale_db')
+    op.drop_table('metric_anomalies', schema='synapscale_db')
+    op.drop_table('metric_detector_states', schema='synapscale_db')
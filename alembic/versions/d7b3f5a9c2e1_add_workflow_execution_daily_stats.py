@@ -0,0 +1,88 @@
+"""Add workflow_execution_daily_stats rollup table
+
+Revision ID: d7b3f5a9c2e1
+Revises: c4a1e0f2b7d3
+Create Date: 2026-10-19 11:04:27.551902
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd7b3f5a9c2e1'
+down_revision: Union[str, None] = 'c4a1e0f2b7d3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'workflow_execution_daily_stats',
+        sa.Column(
+            'user_id',
+            UUID(as_uuid=True),
+            sa.ForeignKey('synapscale_db.users.id', ondelete='CASCADE'),
+            primary_key=True,
+        ),
+        sa.Column(
+            'workflow_id',
+            UUID(as_uuid=True),
+            sa.ForeignKey('synapscale_db.workflows.id', ondelete='CASCADE'),
+            primary_key=True,
+        ),
+        sa.Column('day', sa.Date(), primary_key=True),
+        sa.Column('status', sa.String(20), primary_key=True),
+        sa.Column('tenant_id', UUID(as_uuid=True), sa.ForeignKey('synapscale_db.tenants.id'), nullable=True),
+        sa.Column('execution_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('duration_sum', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.Column('duration_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('nodes_completed_sum', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.text('now()')),
+        schema='synapscale_db',
+    )
+    op.create_index(
+        'ix_wf_exec_daily_stats_user_day',
+        'workflow_execution_daily_stats',
+        ['user_id', 'day'],
+        unique=False,
+        schema='synapscale_db',
+    )
+
+    # Backfill com as execuções já finalizadas
+    op.execute(
+        """
+        INSERT INTO synapscale_db.workflow_execution_daily_stats (
+            user_id, workflow_id, day, status, tenant_id,
+            execution_count, duration_sum, duration_count, nodes_completed_sum
+        )
+        SELECT
+            user_id,
+            workflow_id,
+            DATE(COALESCE(completed_at, created_at)),
+            status,
+            tenant_id,
+            COUNT(*),
+            COALESCE(SUM(actual_duration), 0),
+            COUNT(actual_duration),
+            COALESCE(SUM(completed_nodes), 0)
+        FROM synapscale_db.workflow_executions
+        WHERE status IN ('completed', 'failed', 'cancelled', 'timeout')
+        GROUP BY user_id, workflow_id, DATE(COALESCE(completed_at, created_at)), status, tenant_id
+        ON CONFLICT DO NOTHING
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        'ix_wf_exec_daily_stats_user_day',
+        'workflow_execution_daily_stats',
+        schema='synapscale_db',
+    )
+    op.drop_table('workflow_execution_daily_stats', schema='synapscale_db')
@@ -0,0 +1,34 @@
+"""Add covering (metric_name, timestamp) index on analytics_metrics
+
+Revision ID: d9f2b4c6e8a1
+Revises: c7e3a9d1f5b8
+Create Date: 2026-10-19 22:14:08.513207
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd9f2b4c6e8a1'
+down_revision: Union[str, None] = 'c7e3a9d1f5b8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_analytics_metrics_name_timestamp',
+        'analytics_metrics',
+        ['metric_name', 'timestamp'],
+        unique=False,
+        schema='synapscale_db',
+        postgresql_include=['metric_value'],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_analytics_metrics_name_timestamp', 'analytics_metrics', schema='synapscale_db')
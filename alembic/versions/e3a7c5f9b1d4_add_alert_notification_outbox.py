@@ -0,0 +1,68 @@
+"""Add alert_notification_outbox table
+
+Revision ID: e3a7c5f9b1d4
+Revises: d9f2b4c6e8a1
+Create Date: 2026-10-19 23:02:41.219734
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e3a7c5f9b1d4'
+down_revision: Union[str, None] = 'd9f2b4c6e8a1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'alert_notification_outbox',
+        sa.Column('id', UUID(as_uuid=True), primary_key=True),
+        sa.Column('fingerprint', sa.String(64), nullable=False),
+        sa.Column('channel', sa.String(20), nullable=False),
+        sa.Column('recipient', sa.String(500), nullable=False),
+        sa.Column(
+            'alert_id',
+            UUID(as_uuid=True),
+            sa.ForeignKey('synapscale_db.analytics_alerts.id', ondelete='CASCADE'),
+            nullable=True,
+        ),
+        sa.Column('tenant_id', UUID(as_uuid=True), sa.ForeignKey('synapscale_db.tenants.id'), nullable=True),
+        sa.Column('payload', JSONB(), nullable=False, server_default=sa.text("'{}'")),
+        sa.Column('config', JSONB(), nullable=False, server_default=sa.text("'{}'")),
+        sa.Column('status', sa.String(20), nullable=False, server_default='pending'),
+        sa.Column('attempts', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('digest_id', UUID(as_uuid=True), nullable=True),
+        sa.Column('fired_at', sa.DateTime(), nullable=False),
+        sa.Column('available_at', sa.DateTime(), nullable=False),
+        sa.Column('delivered_at', sa.DateTime(), nullable=True),
+        schema='synapscale_db',
+    )
+    op.create_index(
+        'ix_alert_notification_outbox_due',
+        'alert_notification_outbox',
+        ['status', 'available_at'],
+        unique=False,
+        schema='synapscale_db',
+    )
+    op.create_index(
+        'ix_alert_notification_outbox_fingerprint',
+        'alert_notification_outbox',
+        ['fingerprint', 'status'],
+        unique=False,
+        schema='synapscale_db',
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_alert_notification_outbox_fingerprint', 'alert_notification_outbox', schema='synapscale_db')
+    op.drop_index('ix_alert_notification_outbox_due', 'alert_notification_outbox', schema='synapscale_db')
+    op.drop_table('alert_notification_outbox', schema='synapscale_db')
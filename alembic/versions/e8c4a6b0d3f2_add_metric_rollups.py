@@ -0,0 +1,65 @@
+"""Add metric_rollups and metric_rollup_cursors tables
+
+Revision ID: e8c4a6b0d3f2
+Revises: d7b3f5a9c2e1
+Create Date: 2026-10-19 14:22:09.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e8c4a6b0d3f2'
+down_revision: Union[str, None] = 'd7b3f5a9c2e1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'metric_rollups',
+        sa.Column('metric_name', sa.String(100), primary_key=True),
+        sa.Column('resolution', sa.String(4), primary_key=True),
+        sa.Column('bucket_start', sa.DateTime(), primary_key=True),
+        sa.Column(
+            'tenant_id',
+            UUID(as_uuid=True),
+            sa.ForeignKey('synapscale_db.tenants.id', ondelete='CASCADE'),
+            primary_key=True,
+        ),
+        sa.Column('service', sa.String(50), primary_key=True),
+        sa.Column('count', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.Column('sum', sa.Float(), nullable=False, server_default='0'),
+        sa.Column('min', sa.Float(), nullable=True),
+        sa.Column('max', sa.Float(), nullable=True),
+        sa.Column('sketch', JSONB(), nullable=False, server_default=sa.text("'{}'")),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.text('now()')),
+        schema='synapscale_db',
+    )
+    op.create_index(
+        'ix_metric_rollups_lookup',
+        'metric_rollups',
+        ['metric_name', 'resolution', 'bucket_start'],
+        unique=False,
+        schema='synapscale_db',
+    )
+    # Cursor começa em 0: o agregador em background processa o histórico
+    op.create_table(
+        'metric_rollup_cursors',
+        sa.Column('source', sa.String(50), primary_key=True),
+        sa.Column('last_id', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.text('now()')),
+        schema='synapscale_db',
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('metric_rollup_cursors', schema='synapscale_db')
+    op.drop_index('ix_metric_rollups_lookup', 'metric_rollups', schema='synapscale_db')
+    op.drop_table('metric_rollups', schema='synapscale_db')
@@ -0,0 +1,44 @@
+"""Add active_user_sketches table
+
+Revision ID: f1a9d3c5e7b2
+Revises: e8c4a6b0d3f2
+Create Date: 2026-10-19 16:05:41.772310
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1a9d3c5e7b2'
+down_revision: Union[str, None] = 'e8c4a6b0d3f2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Dias anteriores à migração são preenchidos pelo backfill em background
+    op.create_table(
+        'active_user_sketches',
+        sa.Column('day', sa.Date(), primary_key=True),
+        sa.Column('scope', sa.String(36), primary_key=True),
+        sa.Column('sketch', sa.LargeBinary(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.text('now()')),
+        schema='synapscale_db',
+    )
+    op.create_index(
+        'ix_active_user_sketches_scope_day',
+        'active_user_sketches',
+        ['scope', 'day'],
+        unique=False,
+        schema='synapscale_db',
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_active_user_sketches_scope_day', 'active_user_sketches', schema='synapscale_db')
+    op.drop_table('active_user_sketches', schema='synapscale_db')
@@ -0,0 +1,32 @@
+"""Add worker owner and heartbeat to report_executions
+
+Revision ID: f4b8d2a6c0e3
+Revises: e3a7c5f9b1d4
+Create Date: 2026-10-20 09:12:37.418502
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4b8d2a6c0e3'
+down_revision: Union[str, None] = 'e3a7c5f9b1d4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('report_executions', sa.Column('worker_id', sa.String(255), nullable=True), schema='synapscale_db')
+    op.add_column(
+        'report_executions', sa.Column('heartbeat_at', sa.DateTime(timezone=True), nullable=True), schema='synapscale_db'
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('report_executions', 'heartbeat_at', schema='synapscale_db')
+    op.drop_column('report_executions', 'worker_id', schema='synapscale_db')
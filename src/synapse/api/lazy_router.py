@@ -0,0 +1,168 @@
+"""
+Montagem preguiçosa de routers.
+
+Cada entrada do manifesto vira uma rota provisória que casa com o prefixo do
+router. Na primeira requisição ao prefixo o módulo de endpoints é importado
+(numa thread, sem bloquear o event loop), suas rotas substituem a provisória
+na mesma posição da tabela de rotas e a requisição é despachada de novo.
+Assim a ordem final das rotas é a mesma da montagem antecipada.
+"""
+
+import asyncio
+import importlib
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from fastapi import FastAPI
+from starlette.routing import BaseRoute, Match, NoMatchFound
+from starlette.types import Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class RouterEntry:
+    """Router de endpoints: módulo (com atributo ``router``), prefixo e tags"""
+
+    module: str
+    prefix: str
+    tags: Tuple[str, ...] = ()
+
+
+class LazyRouterPlaceholder(BaseRoute):
+    """Rota provisória que carrega o router real na primeira requisição ao prefixo"""
+
+    def __init__(self, loader: "LazyRouterLoader", entry: RouterEntry, path: str):
+        self.loader = loader
+        self.entry = entry
+        self.path = path
+        self._path_slash = path + "/"
+
+    def matches(self, scope: Scope) -> Tuple[Match, Scope]:
+        if scope["type"] in ("http", "websocket"):
+            path = scope["path"]
+            root_path = scope.get("root_path", "")
+            if root_path and path.startswith(root_path):
+                path = path[len(root_path):]
+            if path == self.path or path.startswith(self._path_slash):
+                return Match.FULL, {}
+        return Match.NONE, {}
+
+    def url_path_for(self, name: str, /, **path_params):
+        raise NoMatchFound(name, path_params)
+
+    async def handle(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await self.loader.load(self.entry)
+        # A tabela de rotas mudou: despachar novamente pelo router da aplicação
+        await self.loader.app.router.app(scope, receive, send)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(path={self.path!r}, module={self.entry.module!r})"
+
+
+class LazyRouterLoader:
+    """Registra os routers de um manifesto como rotas provisórias e os carrega sob demanda"""
+
+    def __init__(self, app: FastAPI, prefix: str, entries: Sequence[RouterEntry], package: str):
+        self.app = app
+        self.prefix = prefix
+        self.entries = list(entries)
+        self.package = package
+        self.load_times: Dict[str, float] = {}
+        self._placeholders: Dict[RouterEntry, LazyRouterPlaceholder] = {}
+        self._loading: Dict[RouterEntry, asyncio.Future] = {}
+        self._install_lock = threading.Lock()
+        self._preload_task: Optional[asyncio.Task] = None
+
+    @property
+    def pending(self) -> List[RouterEntry]:
+        return [entry for entry in self.entries if entry in self._placeholders]
+
+    def mount(self) -> None:
+        for entry in self.entries:
+            placeholder = LazyRouterPlaceholder(self, entry, self.prefix + entry.prefix)
+            self._placeholders[entry] = placeholder
+            self.app.router.routes.append(placeholder)
+
+    def _import(self, entry: RouterEntry):
+        start = time.perf_counter()
+        module = importlib.import_module(f"{self.package}.{entry.module}")
+        self.load_times[entry.module] = time.perf_counter() - start
+        return module
+
+    def _install(self, entry: RouterEntry, module) -> None:
+        """Troca a rota provisória pelas rotas do router, na mesma posição"""
+        with self._install_lock:
+            placeholder = self._placeholders.pop(entry, None)
+            if placeholder is None:
+                return
+            routes = self.app.router.routes
+            first_new = len(routes)
+            self.app.include_router(module.router, prefix=self.prefix + entry.prefix, tags=list(entry.tags))
+            new_routes = routes[first_new:]
+            del routes[first_new:]
+            index = routes.index(placeholder)
+            routes[index:index + 1] = new_routes
+            self.app.openapi_schema = None
+        logger.debug(
+            f"Router {entry.module} carregado em {self.load_times.get(entry.module, 0) * 1000:.0f} ms"
+        )
+
+    async def load(self, entry: RouterEntry) -> None:
+        if entry not in self._placeholders:
+            return
+        future = self._loading.get(entry)
+        if future is None:
+            future = self._loading[entry] = asyncio.get_running_loop().create_future()
+            try:
+                module = await asyncio.to_thread(self._import, entry)
+                self._install(entry, module)
+                future.set_result(None)
+            except BaseException as e:
+                # A próxima requisição tenta de novo
+                self._loading.pop(entry, None)
+                future.set_exception(e)
+                future.exception()  # evita aviso de exceção não consumida
+                raise
+        else:
+            await asyncio.shield(future)
+
+    def load_all(self) -> None:
+        """Carrega, de forma síncrona, todos os routers pendentes (ex.: para gerar o OpenAPI)"""
+        for entry in self.pending:
+            self._install(entry, self._import(entry))
+
+    async def preload(self, entries: Optional[Iterable[RouterEntry]] = None) -> None:
+        """Carrega os routers pendentes um a um, cedendo o event loop entre eles"""
+        start = time.perf_counter()
+        loaded = 0
+        for entry in list(entries or self.entries):
+            try:
+                if entry in self._placeholders:
+                    await self.load(entry)
+                    loaded += 1
+            except Exception as e:
+                logger.error(f"Erro ao pré-carregar o router {entry.module}: {e}")
+            await asyncio.sleep(0)
+        if loaded:
+            logger.info(f"{loaded} routers pré-carregados em {time.perf_counter() - start:.2f}s")
+
+    def start_preload(self, delay: float = 0.0) -> asyncio.Task:
+        async def run():
+            await asyncio.sleep(delay)
+            await self.preload()
+
+        self._preload_task = asyncio.create_task(run(), name="router_preload")
+        return self._preload_task
+
+    async def stop_preload(self) -> None:
+        if self._preload_task is not None and not self._preload_task.done():
+            self._preload_task.cancel()
+            try:
+                await self._preload_task
+            except asyncio.CancelledError:
+                pass
+        self._preload_task = None
@@ -2,22 +2,35 @@
 Analytics endpoints - Simplified Version
 """
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+import logging
+from functools import partial
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from typing import Dict, Any, List, Optional
 from datetime import datetime
 
-from synapse.api.deps import get_current_active_user, get_db
+from synapse.api.deps import get_current_active_user, get_db, require_admin
 from synapse.models.user import User
 from synapse.services.analytics_service import AnalyticsService
+from synapse.services.dashboard_evaluator import dashboard_evaluator, format_sse
+from synapse.services.report_job_service import execution_status, report_job_service
+from synapse.core.analytics.ingestion import (
+    IngestionBackpressure,
+    build_event_row,
+    ingestion_pipeline,
+)
 from synapse.schemas.analytics import (
     EventCreate,
+    EventBatchCreate,
     EventResponse,
     DashboardCreate,
     DashboardUpdate,
     DashboardResponse,
     MetricCreate,
     ReportCreate,
+    ReportExecutionRequest,
     ReportUpdate,
     ReportResponse,
     AlertResponse,
@@ -26,9 +39,13 @@ from synapse.schemas.analytics import (
     BusinessMetricResponse,
     AnalyticsQuery,
     QueryResponse,
-    ExportRequest
+    ExportRequest,
+    FunnelAnalysis,
+    CohortAnalysis,
 )
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 
 # Basic health check endpoint
@@ -72,27 +89,74 @@ async def analytics_overview(
         logger.error(f"Erro inesperado em analytics_overview: {str(e)}", extra={"error_type": type(e).__name__})
         raise
 
-# Basic event creation
-@router.post("/events", response_model=Dict[str, Any])
+async def _ingest_events(
+    events: List[EventCreate], current_user: User, db: Session
+) -> Dict[str, Any]:
+    """Enqueue events on the ingestion pipeline, or write them directly if the flusher is not running"""
+    service = AnalyticsService(db)
+    # Project/workspace/workflow ids come from the client: only the caller's tenant is accepted
+    allowed_ids = service.tenant_event_ids(events, current_user.tenant_id)
+    if not ingestion_pipeline.running:
+        return service.track_events_batch(
+            events, current_user.id, current_user.tenant_id, allowed_ids=allowed_ids
+        )
+
+    build = partial(
+        build_event_row,
+        user_id=current_user.id,
+        tenant_id=current_user.tenant_id,
+        allowed_ids=allowed_ids,
+    )
+    try:
+        result = await ingestion_pipeline.submit(events, build)
+    except IngestionBackpressure as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "1"},
+        )
+    return {
+        "processed": result.accepted,
+        "failed": result.invalid + result.dropped,
+        **result.to_dict(),
+    }
+
+
+@router.post(
+    "/events", response_model=Dict[str, Any], status_code=status.HTTP_202_ACCEPTED
+)
 async def create_event(
     event_data: EventCreate,
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
-    """Create analytics event"""
-    try:
-        service = AnalyticsService(db)
-        # Simplified event creation
-        return {
-            "message": "Event created successfully",
-            "event_type": event_data.event_type,
-            "user_id": str(current_user.id)
-        }
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Erro ao criar evento: {str(e)}", extra={"error_type": type(e).__name__})
-        raise
+    """Track an analytics event (acknowledged once buffered)"""
+    result = await _ingest_events([event_data], current_user, db)
+    if result["invalid"]:
+        raise HTTPException(status_code=422, detail=result["errors"])
+    return result
+
+
+@router.post(
+    "/events/batch",
+    response_model=Dict[str, Any],
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def create_events_batch(
+    batch: EventBatchCreate,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Track a batch of analytics events (acknowledged once buffered)"""
+    return await _ingest_events(batch.events, current_user, db)
+
+
+@router.get("/events/ingestion", response_model=Dict[str, Any])
+async def get_ingestion_stats(
+    current_user: User = Depends(require_admin),
+):
+    """Ingestion pipeline counters (accepted, dropped, flushed, buffered); global, admins only"""
+    return ingestion_pipeline.get_stats()
 
 # Basic dashboard endpoints
 @router.post("/dashboards", response_model=Dict[str, Any])
@@ -136,3 +200,213 @@ async def list_dashboards(
     except Exception as e:
         logger.error(f"Erro ao listar dashboards: {str(e)}", extra={"error_type": type(e).__name__})
         raise
+
+
+def _load_dashboard(dashboard_id: str, current_user: User, db: Session):
+    dashboard = AnalyticsService(db).get_accessible_dashboard(dashboard_id, current_user.id)
+    if not dashboard:
+        raise HTTPException(status_code=404, detail="Dashboard not found")
+    return dashboard
+
+
+@router.get("/dashboards/{dashboard_id}/data", response_model=Dict[str, Any])
+async def get_dashboard_data(
+    dashboard_id: str,
+    start_date: Optional[datetime] = Query(None),
+    end_date: Optional[datetime] = Query(None),
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Evaluate all dashboard widgets concurrently (cached per widget)"""
+    dashboard = _load_dashboard(dashboard_id, current_user, db)
+    widgets = await dashboard_evaluator.evaluate(
+        dashboard.widgets or [], start_date, end_date, tenant_id=current_user.tenant_id
+    )
+    return {
+        "dashboard_id": str(dashboard.id),
+        "widgets": widgets,
+        "last_updated": datetime.utcnow().isoformat(),
+    }
+
+
+@router.get("/dashboards/{dashboard_id}/stream")
+async def stream_dashboard_data(
+    dashboard_id: str,
+    start_date: Optional[datetime] = Query(None),
+    end_date: Optional[datetime] = Query(None),
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Stream widget results as Server-Sent Events as soon as each one is ready"""
+    dashboard = _load_dashboard(dashboard_id, current_user, db)
+    widgets = list(dashboard.widgets or [])
+
+    async def events():
+        yield format_sse("start", {"dashboard_id": str(dashboard.id), "widgets": len(widgets)})
+        async for result in dashboard_evaluator.iter_widgets(
+            widgets, start_date, end_date, tenant_id=current_user.tenant_id
+        ):
+            yield format_sse("widget", result)
+        yield format_sse("done", {"last_updated": datetime.utcnow().isoformat()})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.post("/funnels", response_model=Dict[str, Any])
+async def analyze_funnel(
+    funnel_config: FunnelAnalysis,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Ordered multi-step funnel with a conversion window"""
+    try:
+        return AnalyticsService(db).analyze_funnel(
+            funnel_config, current_user.id, tenant_id=current_user.tenant_id
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.post("/cohorts", response_model=Dict[str, Any])
+async def analyze_cohort(
+    cohort_config: CohortAnalysis,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Cohort retention matrix"""
+    try:
+        return AnalyticsService(db).analyze_cohort(
+            cohort_config, current_user.id, tenant_id=current_user.tenant_id
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/anomalies", response_model=Dict[str, Any])
+async def detect_anomalies(
+    metric: str = Query(..., min_length=1, max_length=100),
+    days: int = Query(7, ge=1, le=90),
+    sensitivity: float = Query(3.5, gt=0, le=20),
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Anomalous hourly buckets of a metric, scored against its seasonal baseline"""
+    return AnalyticsService(db).detect_anomalies_data(metric, days, sensitivity, current_user.id)
+
+
+@router.get("/insights/system", response_model=Dict[str, Any])
+async def get_system_insights(
+    days: int = Query(30, ge=1, le=365),
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """System-wide metrics, metric trends and recently flagged anomalies"""
+    return AnalyticsService(db).get_system_insights(days)
+
+
+@router.post("/reports", response_model=Dict[str, Any], status_code=status.HTTP_201_CREATED)
+async def create_report(
+    report_data: ReportCreate,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Create a report; its query_config is validated by the report query builder"""
+    try:
+        report = AnalyticsService(db).create_report(report_data, current_user.id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {
+        "id": str(report.id),
+        "name": report.name,
+        "query_config": report.report_query,
+        "schedule": report.schedule,
+        "created_at": report.created_at,
+    }
+
+
+@router.post(
+    "/reports/{report_id}/executions",
+    response_model=Dict[str, Any],
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def execute_report(
+    report_id: str,
+    request: Optional[ReportExecutionRequest] = None,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Queue a report execution; poll the execution for progress and result pages"""
+    request = request or ReportExecutionRequest()
+    try:
+        return AnalyticsService(db).execute_report(
+            report_id, current_user.id, request.parameters, request.format
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/reports/{report_id}/executions", response_model=List[Dict[str, Any]])
+async def list_report_executions(
+    report_id: str,
+    limit: int = Query(10, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Execution history of a report"""
+    return AnalyticsService(db).get_report_executions(report_id, current_user.id, limit, offset)
+
+
+def _load_execution(execution_id: str, current_user: User, db: Session):
+    try:
+        return AnalyticsService(db).get_report_execution(execution_id, current_user.id)
+    except LookupError:
+        raise HTTPException(status_code=404, detail="Report execution not found")
+
+
+@router.get("/reports/executions/{execution_id}", response_model=Dict[str, Any])
+async def get_report_execution(
+    execution_id: str,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Status, progress and row count of a report execution"""
+    return execution_status(_load_execution(execution_id, current_user, db))
+
+
+@router.get("/reports/executions/{execution_id}/pages/{page}", response_model=Dict[str, Any])
+async def get_report_page(
+    execution_id: str,
+    page: int,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """One page of spooled results (available while the execution is still running)"""
+    execution = _load_execution(execution_id, current_user, db)
+    try:
+        return report_job_service.read_page(execution, page)
+    except (LookupError, IndexError) as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
+@router.get("/reports/executions/{execution_id}/download")
+async def download_report(
+    execution_id: str,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Full gzip-compressed result, streamed from the spool"""
+    execution = _load_execution(execution_id, current_user, db)
+    try:
+        chunks, filename = report_job_service.download(execution)
+    except LookupError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return StreamingResponse(
+        chunks,
+        media_type="application/gzip",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
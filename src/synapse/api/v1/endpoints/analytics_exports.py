@@ -2,21 +2,25 @@
 Endpoints for managing Analytics Exports.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func, and_, or_
 from typing import List, Optional
 import uuid
 
 from synapse.api.deps import get_current_active_user, get_async_db
+from synapse.core.analytics.bulk_export import iter_file_range, parse_byte_range
 from synapse.models.user import User
 from synapse.schemas.analytics_export import (
     AnalyticsExportResponse,
     AnalyticsExportCreate,
     AnalyticsExportUpdate,
-    AnalyticsExportListResponse
+    AnalyticsExportListResponse,
+    AnalyticsExportProgress,
 )
 from synapse.models import AnalyticsExport
+from synapse.services.bulk_export_service import bulk_export_service, export_status
 
 router = APIRouter()
 
@@ -35,12 +39,108 @@ async def create_analytics_export(
     if not export_in.tenant_id:
         export_in.tenant_id = current_user.tenant_id
 
-    db_export = AnalyticsExport(**export_in.model_dump())
+    db_export = AnalyticsExport(id=uuid.uuid4(), **export_in.model_dump())
+    db_export.status = "pending"
+    try:
+        bulk_export_service.validate(db_export)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e))
     db.add(db_export)
     await db.commit()
     await db.refresh(db_export)
+    bulk_export_service.submit(db_export.id)
     return db_export
 
+
+async def _get_tenant_export(db: AsyncSession, export_id: uuid.UUID, user: User) -> AnalyticsExport:
+    result = await db.execute(
+        select(AnalyticsExport).where(AnalyticsExport.id == export_id, AnalyticsExport.tenant_id == user.tenant_id)
+    )
+    export = result.scalar_one_or_none()
+    if not export:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Export not found")
+    return export
+
+
+@router.get("/{export_id}/progress", response_model=AnalyticsExportProgress)
+async def get_analytics_export_progress(
+    export_id: uuid.UUID,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """Partition progress and rows/sec per worker of an export."""
+    return export_status(await _get_tenant_export(db, export_id, current_user))
+
+
+@router.post("/{export_id}/resume", response_model=AnalyticsExportProgress, status_code=status.HTTP_202_ACCEPTED)
+async def resume_analytics_export(
+    export_id: uuid.UUID,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """Resume a failed export; partitions with a valid checksum are not exported again."""
+    export = await _get_tenant_export(db, export_id, current_user)
+    if not bulk_export_service.resume(export):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Only failed or cancelled exports can be resumed (status: {export.status})",
+        )
+    await db.commit()
+    await db.refresh(export)
+    bulk_export_service.submit(export.id)
+    return export_status(export)
+
+
+@router.get("/{export_id}/download")
+async def download_analytics_export(
+    export_id: uuid.UUID,
+    partition: Optional[int] = Query(None, ge=0, description="Download a single partition file"),
+    range_header: Optional[str] = Header(None, alias="Range"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """
+    Stream a completed export. Without ``partition`` the partitions are
+    concatenated into one file; ``Range: bytes=`` requests get a 206 so
+    interrupted downloads can be resumed.
+    """
+    export = await _get_tenant_export(db, export_id, current_user)
+    try:
+        files, filename, etag = bulk_export_service.download_files(export, partition)
+    except IndexError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except LookupError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    total = sum(size for _, size in files)
+    headers = {
+        "Accept-Ranges": "bytes",
+        "ETag": f'"{etag}"',
+        "Content-Disposition": f'attachment; filename="{filename}"',
+    }
+    try:
+        byte_range = parse_byte_range(range_header, total)
+    except ValueError:
+        return Response(
+            status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+            headers={"Content-Range": f"bytes */{total}"},
+        )
+    if byte_range is None:
+        headers["Content-Length"] = str(total)
+        return StreamingResponse(iter_file_range(files), media_type="application/octet-stream", headers=headers)
+
+    start, end = byte_range
+    headers["Content-Range"] = f"bytes {start}-{end}/{total}"
+    headers["Content-Length"] = str(end - start + 1)
+    return StreamingResponse(
+        iter_file_range(files, start, end),
+        status_code=status.HTTP_206_PARTIAL_CONTENT,
+        media_type="application/octet-stream",
+        headers=headers,
+    )
+
 @router.get("/{export_id}", response_model=AnalyticsExportResponse)
 async def get_analytics_export(
     export_id: uuid.UUID,
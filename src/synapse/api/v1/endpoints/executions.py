@@ -6,6 +6,7 @@ from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session, joinedload
 from sqlalchemy import and_, or_, func, desc, asc
 from typing import List, Optional, Dict, Any, Union
+import asyncio
 import uuid
 from synapse.logger_config import get_logger
 from datetime import datetime
@@ -18,15 +19,23 @@ from synapse.schemas.workflow_execution import (
     WorkflowExecutionWithNodesResponse,
     NodeExecutionResponse,
     ExecutionMetricsResponse,
+    ExecutionStats,
 )
 from synapse.schemas.base import PaginatedResponse
 from synapse.models.workflow_execution import WorkflowExecution, ExecutionStatus
 from synapse.models.node_execution import NodeExecution
 from synapse.models.workflow import Workflow
 from synapse.models.user import User
+from synapse.services.execution_stats_service import (
+    ExecutionStatsService,
+    RollupContribution,
+)
+from synapse.core.executors.worker_pool import get_worker_pool
+from synapse.services.execution_output_service import execution_output_service
 
 router = APIRouter()
 logger = get_logger(__name__)
+stats_service = ExecutionStatsService()
 
 
 @router.get("/", response_model=PaginatedResponse[WorkflowExecutionResponse])
@@ -43,11 +52,13 @@ async def list_executions(
     has_errors: Optional[bool] = Query(None, description="Filter executions with/without errors"),
     sort_by: Optional[str] = Query("created_at", description="Sort field"),
     sort_order: Optional[str] = Query("desc", regex="^(asc|desc)$", description="Sort order"),
+    include_data: bool = Query(False, description="Include input/output/context, logs and debug columns"),
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db),
 ):
     """
-    List workflow executions with comprehensive filtering, search, and pagination
+    List workflow executions with comprehensive filtering, search, and pagination.
+    Heavy columns (data, logs, debug) are only loaded with include_data=true
     """
     try:
         # Base query with relationships
@@ -55,6 +66,8 @@ async def list_executions(
             joinedload(WorkflowExecution.workflow),
             joinedload(WorkflowExecution.user)
         )
+        if not include_data:
+            query = query.options(*execution_output_service.summary_options(WorkflowExecution))
 
         # Apply tenant filtering
         query = query.filter(WorkflowExecution.tenant_id == current_user.tenant_id)
@@ -117,7 +130,13 @@ async def list_executions(
         # Convert to response format
         execution_responses = []
         for execution in executions:
-            execution_data = WorkflowExecutionResponse.from_orm(execution)
+            if include_data:
+                execution_data = WorkflowExecutionResponse.from_orm(execution)
+            else:
+                # Colunas adiadas ficam de fora (sem um SELECT extra por linha)
+                execution_data = WorkflowExecutionResponse.model_validate(
+                    execution_output_service.loaded_fields(execution)
+                )
             execution_responses.append(execution_data)
 
         return PaginatedResponse(
@@ -136,6 +155,36 @@ async def list_executions(
         raise
 
 
+@router.get("/statistics", response_model=ExecutionStats)
+async def get_execution_statistics(
+    trend_days: int = Query(30, ge=1, le=365, description="Number of days in the trend series"),
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db),
+):
+    """
+    Get aggregated execution statistics for the current user
+    """
+    try:
+        return stats_service.get_statistics(db, current_user.id, trend_days=trend_days)
+    except Exception as e:
+        logger.error(f"Erro inesperado em get_execution_statistics: {str(e)}", extra={"error_type": type(e).__name__})
+        raise
+
+
+@router.get("/workers", response_model=Dict[str, Any])
+async def get_worker_pool_status(
+    current_user: User = Depends(get_current_active_user),
+):
+    """
+    Get the node worker pool status: queue depth, running tasks, limit
+    violations and utilization of the CPU-bound worker processes
+    """
+    pool = get_worker_pool()
+    if pool is None:
+        return {"enabled": False}
+    return {"enabled": True, **pool.get_stats()}
+
+
 @router.post("/", response_model=WorkflowExecutionResponse, status_code=status.HTTP_201_CREATED)
 async def create_execution(
     execution_data: WorkflowExecutionCreate,
@@ -209,11 +258,14 @@ async def create_execution(
 async def get_execution(
     execution_id: str,
     include_nodes: bool = Query(True, description="Include node executions in response"),
+    expand_outputs: bool = Query(False, description="Load node outputs kept in storage instead of returning their reference"),
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db),
 ):
     """
-    Get a specific workflow execution by ID with optional node executions
+    Get a specific workflow execution by ID with optional node executions.
+    Large node outputs are returned as a reference ({"$ref", "bytes", "preview"})
+    unless expand_outputs=true
     """
     try:
         # Try to parse as UUID first, then check execution_id field
@@ -263,6 +315,13 @@ async def get_execution(
         
         if include_nodes:
             node_responses = [NodeExecutionResponse.from_orm(node) for node in node_executions]
+            if expand_outputs:
+                for node_response in node_responses:
+                    node_response.output_data = await asyncio.to_thread(
+                        execution_output_service.resolve_output_data,
+                        node_response.output_data,
+                        str(execution.execution_id),
+                    )
             return WorkflowExecutionWithNodesResponse(
                 **execution_response.dict(),
                 node_executions=node_responses
@@ -319,6 +378,7 @@ async def update_execution_status(
 
         # Update status and related fields
         old_status = execution.status
+        previous_stats = RollupContribution.from_execution(execution)
         execution.status = new_status
         execution.updated_at = datetime.utcnow()
 
@@ -336,6 +396,7 @@ async def update_execution_status(
         if new_status == ExecutionStatus.COMPLETED:
             execution.progress_percentage = 100.0
 
+        stats_service.record_transition(db, execution, previous_stats)
         db.commit()
 
         return {
@@ -629,11 +690,13 @@ async def get_execution_nodes(
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=1000),
     node_status: Optional[str] = Query(None, description="Filter by node execution status"),
+    include_data: bool = Query(False, description="Include input/output/config, logs and debug columns"),
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db),
 ):
     """
-    Get node executions for a specific workflow execution
+    Get node executions for a specific workflow execution.
+    Heavy columns (data, logs, debug) are only loaded with include_data=true
     """
     try:
         # Find execution
@@ -694,10 +757,18 @@ async def get_execution_nodes(
         total = query.count()
 
         # Apply pagination and ordering
+        if not include_data:
+            query = query.options(*execution_output_service.summary_options(NodeExecution))
         node_executions = query.order_by(NodeExecution.execution_order).offset(skip).limit(limit).all()
 
         # Convert to response format
-        node_responses = [NodeExecutionResponse.from_orm(node) for node in node_executions]
+        if include_data:
+            node_responses = [NodeExecutionResponse.from_orm(node) for node in node_executions]
+        else:
+            node_responses = [
+                NodeExecutionResponse.model_validate(execution_output_service.loaded_fields(node))
+                for node in node_executions
+            ]
 
         return PaginatedResponse(
             items=node_responses,
@@ -715,6 +786,57 @@ async def get_execution_nodes(
         raise
 
 
+@router.get("/{execution_id}/nodes/{node_key}/output")
+async def get_execution_node_output(
+    execution_id: str,
+    node_key: str,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db),
+):
+    """
+    Get the full output of a node execution, loading it from storage when it
+    was too large to be kept inline
+    """
+    try:
+        try:
+            execution_filter = WorkflowExecution.id == uuid.UUID(execution_id)
+        except ValueError:
+            execution_filter = WorkflowExecution.execution_id == execution_id
+
+        row = db.query(NodeExecution, WorkflowExecution.execution_id).join(
+            WorkflowExecution, NodeExecution.workflow_execution_id == WorkflowExecution.id
+        ).filter(
+            and_(
+                execution_filter,
+                WorkflowExecution.tenant_id == current_user.tenant_id,
+                NodeExecution.node_key == node_key
+            )
+        ).first()
+
+        if not row:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Node execution not found"
+            )
+
+        node_execution, workflow_execution_id = row
+        try:
+            return await asyncio.to_thread(
+                execution_output_service.node_output, node_execution, str(workflow_execution_id)
+            )
+        except FileNotFoundError:
+            raise HTTPException(
+                status_code=status.HTTP_410_GONE,
+                detail="Node output is no longer available in storage"
+            )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Erro inesperado em get_execution_node_output: {str(e)}", extra={"error_type": type(e).__name__})
+        raise
+
+
 # Legacy functions for backward compatibility
 async def initialize_execution_service(websocket_manager):
     """Initialize execution service (placeholder implementation)"""
@@ -30,6 +30,7 @@ from synapse.schemas.file import (
 from synapse.models import File as FileModel, User
 from synapse.database import get_async_db
 from synapse.core.config import settings
+from synapse.services.counter_service import FILE, counter_service
 
 
 router = APIRouter()
@@ -369,9 +370,8 @@ async def download_file(
             detail="Arquivo físico não encontrado",
         )
 
-    # Incrementar contador de downloads
-    file.download_count += 1
-    await db.commit()
+    # Contador de acessos acumulado e gravado em lote (sem travar a linha)
+    counter_service.increment(FILE, file.id, touch=True, access_count=1)
 
     # Retornar arquivo
     async def file_generator():
@@ -6,6 +6,7 @@ from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func, and_, or_
 from typing import List, Optional
+import time
 import uuid
 
 from synapse.api.deps import get_current_active_user
@@ -19,9 +20,13 @@ from synapse.schemas.knowledge_base import (
     KnowledgeBaseSearch,
     KnowledgeBaseStatistics,
     KnowledgeBaseExport,
-    KnowledgeBaseIndexing,
+    KnowledgeBaseRetrievalRequest,
+    KnowledgeBaseSearchResponse,
+    KnowledgeBaseSearchResult,
+    KnowledgeBaseSyncResult,
 )
 from synapse.models import KnowledgeBase, User
+from synapse.core.retrieval.service import get_retrieval_service
 
 router = APIRouter()
 
@@ -180,13 +185,14 @@ async def search_knowledge_bases(
     return result.scalars().all()
 
 
-@router.post("/{kb_id}/sync", response_model=KnowledgeBaseIndexing)
+@router.post("/{kb_id}/sync", response_model=KnowledgeBaseSyncResult)
 async def sync_knowledge_base(
     kb_id: uuid.UUID,
+    force: bool = Query(False, description="Re-embed all chunks, even unchanged ones"),
     db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user),
 ):
-    """Sync knowledge base with external sources."""
+    """Re-index the knowledge base content, embedding only changed chunks."""
     result = await db.execute(
         select(KnowledgeBase).where(
             KnowledgeBase.kb_id == kb_id,
@@ -201,12 +207,73 @@ async def sync_knowledge_base(
             detail="Knowledge base not found"
         )
 
-    # Implementar lógica de sincronização aqui
-    return KnowledgeBaseIndexing(
+    sync_result = await get_retrieval_service().sync(db, kb, force=force)
+
+    return KnowledgeBaseSyncResult(
         kb_id=kb.kb_id,
-        sync_status="completed",
-        synced_items=0,
-        errors=[]
+        sync_status="completed" if not sync_result.errors else "partial",
+        synced_items=sync_result.synced_items,
+        total_chunks=sync_result.total_chunks,
+        added_chunks=sync_result.added,
+        reembedded_chunks=sync_result.reembedded,
+        removed_chunks=sync_result.removed,
+        unchanged_chunks=sync_result.unchanged,
+        duration_ms=sync_result.duration_ms,
+        errors=sync_result.errors,
+    )
+
+
+@router.post("/{kb_id}/retrieve", response_model=KnowledgeBaseSearchResponse)
+async def retrieve_knowledge_base_chunks(
+    kb_id: uuid.UUID,
+    retrieval: KnowledgeBaseRetrievalRequest,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """Top-k vector similarity search over the indexed chunks of a knowledge base."""
+    result = await db.execute(
+        select(KnowledgeBase.kb_id, KnowledgeBase.title).where(
+            KnowledgeBase.kb_id == kb_id,
+            KnowledgeBase.tenant_id == current_user.tenant_id
+        )
+    )
+    kb = result.one_or_none()
+
+    if not kb:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, 
+            detail="Knowledge base not found"
+        )
+
+    started = time.perf_counter()
+    try:
+        chunks = await get_retrieval_service().search(
+            db,
+            kb_id,
+            retrieval.query,
+            k=retrieval.top_k,
+            filters=retrieval.filters,
+            min_score=retrieval.min_score,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    return KnowledgeBaseSearchResponse(
+        kb_id=kb_id,
+        query=retrieval.query,
+        results=[
+            KnowledgeBaseSearchResult(
+                document_id=chunk.chunk_id,
+                title=f"{kb.title} · {chunk.section}",
+                content=chunk.content,
+                score=chunk.score,
+                source_url=chunk.metadata.get("source_url"),
+                metadata=chunk.metadata,
+            )
+            for chunk in chunks
+        ],
+        total_results=len(chunks),
+        search_time_ms=int((time.perf_counter() - started) * 1000),
     )
 
 
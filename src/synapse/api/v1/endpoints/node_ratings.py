@@ -19,6 +19,7 @@ from synapse.schemas.node_rating import (
     NodeRatingTrend
 )
 from synapse.models import NodeRating
+from synapse.services.counter_service import NODE, counter_service
 
 router = APIRouter()
 
@@ -59,6 +60,9 @@ async def create_node_rating(
     db.add(db_rating)
     await db.commit()
     await db.refresh(db_rating)
+
+    # Média do nó recalculada de node_ratings, gravada em lote
+    counter_service.add_rating(NODE, db_rating.node_id)
     return db_rating
 
 @router.get("/{rating_id}", response_model=NodeRatingResponse)
@@ -131,12 +135,16 @@ async def update_node_rating(
             status_code=status.HTTP_404_NOT_FOUND, detail="Node rating not found"
         )
 
+    previous_rating = db_rating.rating
     update_data = rating_in.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(db_rating, field, value)
 
     await db.commit()
     await db.refresh(db_rating)
+
+    if db_rating.rating != previous_rating:
+        counter_service.add_rating(NODE, db_rating.node_id)
     return db_rating
 
 @router.delete("/{rating_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -158,6 +166,8 @@ async def delete_node_rating(
 
     await db.delete(db_rating)
     await db.commit()
+
+    counter_service.add_rating(NODE, db_rating.node_id)
     return
 
 @router.get("/{node_id}/summary", response_model=NodeRatingSummary)
@@ -339,7 +339,6 @@ async def publish_template(
 @router.post("/{template_id}/download")
 async def download_template(
     template_id: str,
-    background_tasks: BackgroundTasks,
     download_type: str = Query("full", regex="^(full|preview|demo)$"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
@@ -365,12 +364,6 @@ async def download_template(
                 detail="Template não encontrado ou não autorizado"
             )
         
-        # Background task para atualizar contadores
-        background_tasks.add_task(
-            template_service.increment_download_count,
-            template_id
-        )
-        
         return {"message": "Download realizado com sucesso"}
         
     except HTTPException:
@@ -383,7 +376,6 @@ async def download_template(
 @router.post("/install", response_model=TemplateInstallResponse)
 async def install_template(
     install_data: TemplateInstall,
-    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
 ):
@@ -401,14 +393,6 @@ async def install_template(
             tenant_id=current_user.tenant_id
         )
         
-        # Background task para registrar uso
-        background_tasks.add_task(
-            template_service.record_template_usage,
-            install_data.template_id,
-            current_user.id,
-            "install"
-        )
-        
         return result
         
     except ValueError as e:
@@ -5,16 +5,25 @@ Real-time monitoring and notification system for SynapScale
 
 import asyncio
 import logging
+import math
+import time
 import uuid
+import zlib
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any, Union
+from typing import Dict, List, Optional, Any, Tuple, Union
 from sqlalchemy.orm import Session
 from sqlalchemy import and_, or_, desc, func, text
 from dataclasses import dataclass
 from enum import Enum
 
-from synapse.core.email.service import EmailService
-from synapse.core.websockets.manager import ConnectionManager
+from synapse.core.alerts.evaluation import (
+    AggregateKey,
+    TimerWheel,
+    aggregate_key,
+    compute_aggregates,
+)
+from synapse.core.alerts.notifications import Notification, notification_dispatcher
+from synapse.core.config import settings
 from synapse.models import AnalyticsAlert, AnalyticsEvent, AnalyticsMetric, User
 
 
@@ -39,6 +48,7 @@ class AlertCondition(Enum):
     NOT_EQUALS = "not_equals"
     PERCENTAGE_CHANGE = "percentage_change"
     THRESHOLD_BREACH = "threshold_breach"
+    ANOMALY = "anomaly"
 
 
 class NotificationChannel(Enum):
@@ -72,54 +82,186 @@ class AlertEvaluationEngine:
     """
 
     def __init__(self):
-        self.email_service = EmailService()
-        self.websocket_manager = ConnectionManager()
         self.running = False
-        self.evaluation_interval = 60  # seconds
-        self.active_alerts_cache = {}
-        self.last_evaluation = {}
+        self.tick_seconds = settings.ALERT_TICK_SECONDS
+        self.evaluation_interval = settings.ALERT_DEFAULT_INTERVAL_SECONDS  # seconds
+        self.wheel = TimerWheel()
+        self.active_alerts_cache: Dict[str, Dict[str, Any]] = {}
+        self.last_evaluation: Dict[str, datetime] = {}
+        self._last_refresh: Optional[float] = None
 
     async def start(self):
         """Start the alert evaluation engine"""
         self.running = True
         logger.info("Alert evaluation engine started")
 
+        loop = asyncio.get_running_loop()
+        next_tick = loop.time()
         while self.running:
             try:
-                await self._evaluate_all_alerts()
-                await asyncio.sleep(self.evaluation_interval)
+                await self._tick()
             except Exception as e:
                 logger.error(f"Error in alert evaluation loop: {e}")
-                await asyncio.sleep(self.evaluation_interval)
+            # Fixed-rate ticks: a slow tick is caught up instead of drifting
+            next_tick += self.tick_seconds
+            await asyncio.sleep(max(0.0, next_tick - loop.time()))
 
     async def stop(self):
         """Stop the alert evaluation engine"""
         self.running = False
         logger.info("Alert evaluation engine stopped")
 
-    async def _evaluate_all_alerts(self):
-        """Evaluate all active alerts"""
+    async def _tick(self):
+        """Advance the timer wheel one tick and evaluate the alerts that became due"""
+        now = time.monotonic()
+        if self._last_refresh is None or now - self._last_refresh >= settings.ALERT_REFRESH_SECONDS:
+            await self._refresh_alerts()
+            self._last_refresh = now
+
+        due = self.wheel.advance()
+        if due:
+            await self._evaluate_batch(due)
+
+    async def _refresh_alerts(self):
+        """Reload active alert conditions and (re)schedule them on the wheel"""
+        rows = await asyncio.to_thread(self._load_active_alerts)
+        active = {}
+        for alert_id, condition, tenant_id in rows:
+            alert_id = str(alert_id)
+            active[alert_id] = {"condition": condition or {}, "tenant_id": tenant_id}
+            interval = self._interval_ticks(active[alert_id]["condition"])
+            if self.wheel.interval(alert_id) != interval:
+                # Spread first evaluations over the interval instead of all on the next tick
+                self.wheel.schedule(alert_id, interval, zlib.crc32(alert_id.encode()) % interval + 1)
+
+        for alert_id in set(self.active_alerts_cache) - set(active):
+            self.wheel.cancel(alert_id)
+            self.last_evaluation.pop(alert_id, None)
+        self.active_alerts_cache = active
+
+    @staticmethod
+    def _load_active_alerts() -> List[Tuple[Any, Dict[str, Any], Any]]:
         from synapse.database import get_db_session
 
+        with get_db_session() as db:
+            return [
+                tuple(row)
+                for row in db.query(
+                    AnalyticsAlert.id, AnalyticsAlert.condition, AnalyticsAlert.tenant_id
+                ).filter(AnalyticsAlert.is_active == True)
+            ]
+
+    def _interval_ticks(self, condition: Dict[str, Any]) -> int:
+        seconds = condition.get("evaluation_interval_seconds") or self.evaluation_interval
+        return max(1, math.ceil(float(seconds) / self.tick_seconds))
+
+    async def _evaluate_all_alerts(self):
+        """Evaluate all active alerts now, regardless of their schedule"""
         try:
+            await self._refresh_alerts()
+            await self._evaluate_batch(list(self.active_alerts_cache))
+        except Exception as e:
+            logger.error(f"Error getting active alerts: {e}")
+
+    async def _evaluate_batch(self, alert_ids: List[str]):
+        """Evaluate many alerts off the event loop; only triggered alerts come back to it"""
+        from synapse.database import get_db_session
+
+        specs = {
+            alert_id: self.active_alerts_cache[alert_id]
+            for alert_id in alert_ids
+            if alert_id in self.active_alerts_cache
+        }
+        if not specs:
+            return
+
+        def evaluate():
             with get_db_session() as db:
-                # Get all active alerts
-                active_alerts = (
-                    db.query(AnalyticsAlert)
-                    .filter(AnalyticsAlert.is_active == True)
-                    .all()
-                )
+                return self._evaluate_specs(db, specs)
+
+        results = await asyncio.to_thread(evaluate)
+        evaluated_at = datetime.utcnow()
+        for alert_id in specs:
+            self.last_evaluation[alert_id] = evaluated_at
+
+        triggered = {
+            alert_id: (value, threshold)
+            for alert_id, (value, threshold, should_trigger) in results.items()
+            if should_trigger
+        }
+        if not triggered:
+            return
+        logger.debug(f"{len(triggered)} of {len(specs)} evaluated alerts triggered")
+
+        with get_db_session() as db:
+            alerts = db.query(AnalyticsAlert).filter(
+                AnalyticsAlert.id.in_([uuid.UUID(alert_id) for alert_id in triggered])
+            )
+            for alert in alerts:
+                value, threshold = triggered[str(alert.id)]
+                await self._trigger_alert(db, alert, value, threshold)
 
-                logger.debug(f"Evaluating {len(active_alerts)} active alerts")
+    def _evaluate_specs(
+        self,
+        db: Session,
+        specs: Dict[str, Dict[str, Any]],
+        now: Optional[datetime] = None,
+    ) -> Dict[str, Tuple[float, float, bool]]:
+        """
+        Evaluate alert conditions with one computation per distinct aggregate.
+
+        Returns ``alert id -> (value, threshold, should_trigger)`` for the
+        alerts that had data.
+        """
+        now = now or datetime.utcnow()
+        keys: Dict[str, AggregateKey] = {}
+        anomaly_keys: Dict[str, Tuple[str, Any, int]] = {}
+        thresholds: Dict[str, Tuple[float, str]] = {}
+        for alert_id, spec in specs.items():
+            condition = spec["condition"]
+            metric_name = condition.get("metric_name")
+            threshold = condition.get("threshold")
+            condition_type = condition.get("condition")
+            window = int(condition.get("time_window_minutes", 5)) * 60
+            if condition_type == AlertCondition.ANOMALY.value and threshold is None:
+                threshold = settings.ANALYTICS_ANOMALY_THRESHOLD
+            if not all([metric_name, threshold, condition_type]):
+                logger.warning(f"Alert {alert_id} has incomplete condition configuration")
+                continue
 
-                for alert in active_alerts:
-                    try:
-                        await self._evaluate_alert(db, alert)
-                    except Exception as e:
-                        logger.error(f"Error evaluating alert {alert.id}: {e}")
+            thresholds[alert_id] = (threshold, condition_type)
+            if condition_type == AlertCondition.ANOMALY.value:
+                anomaly_keys[alert_id] = (metric_name, spec["tenant_id"], window)
+            else:
+                keys[alert_id] = aggregate_key(metric_name, condition.get("aggregation", "avg"), window)
 
-        except Exception as e:
-            logger.error(f"Error getting active alerts: {e}")
+        values = compute_aggregates(db, set(keys.values()), now)
+        scores: Dict[Tuple[str, Any, int], Optional[float]] = {}
+        if anomaly_keys:
+            from synapse.services.metric_anomaly_service import metric_anomaly_service
+
+            delay = timedelta(hours=1, seconds=settings.ANALYTICS_ANOMALY_CLOSE_DELAY_SECONDS)
+            scores = {
+                key: metric_anomaly_service.current_score(
+                    db, key[0], now - timedelta(seconds=key[2]) - delay, key[1]
+                )
+                for key in set(anomaly_keys.values())
+            }
+
+        results = {}
+        for alert_id, (threshold, condition_type) in thresholds.items():
+            if alert_id in keys:
+                value = values.get(keys[alert_id])
+            else:
+                value = scores.get(anomaly_keys[alert_id])
+            if value is None:
+                continue
+            results[alert_id] = (
+                value,
+                threshold,
+                self._evaluate_condition(value, threshold, condition_type),
+            )
+        return results
 
     async def _evaluate_alert(self, db: Session, alert: AnalyticsAlert):
         """Evaluate a single alert"""
@@ -130,6 +272,9 @@ class AlertEvaluationEngine:
             condition_type = condition.get("condition")
             time_window = condition.get("time_window_minutes", 5)
 
+            if condition_type == AlertCondition.ANOMALY.value and threshold is None:
+                threshold = settings.ANALYTICS_ANOMALY_THRESHOLD
+
             if not all([metric_name, threshold, condition_type]):
                 logger.warning(
                     f"Alert {alert.id} has incomplete condition configuration"
@@ -140,12 +285,8 @@ class AlertEvaluationEngine:
             end_time = datetime.utcnow()
             start_time = end_time - timedelta(minutes=time_window)
 
-            current_value = await self._get_metric_value(
-                db,
-                metric_name,
-                start_time,
-                end_time,
-                condition.get("aggregation", "avg"),
+            current_value = await self._get_condition_value(
+                db, alert, start_time, end_time
             )
 
             if current_value is None:
@@ -180,10 +321,46 @@ class AlertEvaluationEngine:
             return abs(current_value - threshold) < 0.001  # Float comparison
         elif condition_type == AlertCondition.NOT_EQUALS.value:
             return abs(current_value - threshold) >= 0.001
+        elif condition_type == AlertCondition.ANOMALY.value:
+            # Anomaly scores are signed: spikes and drops both trigger
+            return abs(current_value) >= threshold
         else:
             logger.warning(f"Unknown condition type: {condition_type}")
             return False
 
+    async def _get_condition_value(
+        self,
+        db: Session,
+        alert: AnalyticsAlert,
+        start_time: datetime,
+        end_time: datetime,
+    ) -> Optional[float]:
+        """Value compared against the threshold of an alert condition"""
+        condition = alert.condition
+        if condition.get("condition") != AlertCondition.ANOMALY.value:
+            return await self._get_metric_value(
+                db,
+                condition.get("metric_name"),
+                start_time,
+                end_time,
+                condition.get("aggregation", "avg"),
+            )
+
+        from synapse.services.metric_anomaly_service import metric_anomaly_service
+
+        # Anomaly scores only exist for closed rollup buckets, so the window
+        # is widened by the length of an hourly bucket plus the close delay
+        since = start_time - timedelta(
+            hours=1, seconds=settings.ANALYTICS_ANOMALY_CLOSE_DELAY_SECONDS
+        )
+        try:
+            return metric_anomaly_service.current_score(
+                db, condition.get("metric_name"), since, alert.tenant_id
+            )
+        except Exception as e:
+            logger.error(f"Error getting anomaly score: {e}")
+            return None
+
     async def _get_metric_value(
         self,
         db: Session,
@@ -325,144 +502,58 @@ class AlertEvaluationEngine:
     async def _send_notifications(
         self, db: Session, alert: AnalyticsAlert, trigger: AlertTrigger
     ):
-        """Send notifications through configured channels"""
-        notification_config = alert.notification_config
+        """Hand notifications for every configured channel to the dispatcher"""
+        notification_config = alert.notification_config or {}
         channels = notification_config.get("channels", ["email"])
 
+        payload = {
+            "event": "alert_triggered",
+            "alert_id": trigger.alert_id,
+            "alert_name": alert.name,
+            "severity": trigger.severity.value,
+            "metric_name": trigger.metric_name,
+            "current_value": trigger.current_value,
+            "threshold": trigger.threshold,
+            "condition": trigger.condition,
+            "message": trigger.message,
+            "triggered_at": trigger.triggered_at.isoformat(),
+            "user_id": trigger.user_id,
+        }
+
+        notifications = []
         for channel in channels:
-            try:
-                if channel == NotificationChannel.EMAIL.value:
-                    await self._send_email_notification(db, alert, trigger)
-                elif channel == NotificationChannel.WEBSOCKET.value:
-                    await self._send_websocket_notification(alert, trigger)
-                elif channel == NotificationChannel.WEBHOOK.value:
-                    await self._send_webhook_notification(
-                        alert, trigger, notification_config
-                    )
-                else:
-                    logger.warning(f"Unknown notification channel: {channel}")
-            except Exception as e:
-                logger.error(
-                    f"Error sending {channel} notification for alert {alert.id}: {e}"
+            if channel == NotificationChannel.EMAIL.value:
+                user = db.query(User).filter(User.id == alert.owner_id).first()
+                if not user or not user.email:
+                    logger.warning(f"No email found for user {alert.owner_id}")
+                    continue
+                recipient = user.email
+                config = {"user_name": user.full_name or user.email}
+            elif channel == NotificationChannel.WEBSOCKET.value:
+                recipient, config = str(alert.owner_id), {}
+            elif channel == NotificationChannel.WEBHOOK.value:
+                recipient = notification_config.get("webhook_url")
+                if not recipient:
+                    logger.warning(f"No webhook URL configured for alert {alert.id}")
+                    continue
+                config = {"headers": notification_config.get("webhook_headers", {})}
+            else:
+                logger.warning(f"Unknown notification channel: {channel}")
+                continue
+
+            notifications.append(
+                Notification(
+                    channel=channel,
+                    recipient=recipient,
+                    payload=payload,
+                    alert_id=alert.id,
+                    tenant_id=alert.tenant_id,
+                    config=config,
+                    fired_at=trigger.triggered_at,
                 )
-
-    async def _send_email_notification(
-        self, db: Session, alert: AnalyticsAlert, trigger: AlertTrigger
-    ):
-        """Send email notification"""
-        try:
-            # Get user email
-            user = db.query(User).filter(User.id == alert.owner_id).first()
-            if not user or not user.email:
-                logger.warning(f"No email found for user {alert.owner_id}")
-                return
-
-            subject = f"🚨 Alert Triggered: {alert.name}"
-
-            content = f"""
-            <div style="margin-bottom: 20px;">
-                <h3>Alert Details</h3>
-                <ul>
-                    <li><strong>Alert Name:</strong> {alert.name}</li>
-                    <li><strong>Severity:</strong> {trigger.severity.value.upper()}</li>
-                    <li><strong>Metric:</strong> {trigger.metric_name}</li>
-                    <li><strong>Current Value:</strong> {trigger.current_value:.2f}</li>
-                    <li><strong>Threshold:</strong> {trigger.threshold:.2f}</li>
-                    <li><strong>Condition:</strong> {trigger.condition}</li>
-                    <li><strong>Triggered At:</strong> {trigger.triggered_at.strftime('%Y-%m-%d %H:%M:%S UTC')}</li>
-                </ul>
-            </div>
-            <div style="margin-bottom: 20px;">
-                <p><strong>Message:</strong> {trigger.message}</p>
-            </div>
-            <div>
-                <p>Please check your dashboard for more details and take appropriate action if needed.</p>
-            </div>
-            """
-
-            await self.email_service.send_notification_email(
-                email=user.email,
-                title="Alert Triggered",
-                content=content,
-                user_name=user.full_name or user.email,
-                subject=subject,
-            )
-
-            logger.info(f"Email notification sent for alert {alert.id} to {user.email}")
-
-        except Exception as e:
-            logger.error(f"Error sending email notification: {e}")
-
-    async def _send_websocket_notification(
-        self, alert: AnalyticsAlert, trigger: AlertTrigger
-    ):
-        """Send real-time websocket notification"""
-        try:
-            notification_data = {
-                "type": "alert_triggered",
-                "alert_id": trigger.alert_id,
-                "alert_name": alert.name,
-                "severity": trigger.severity.value,
-                "metric_name": trigger.metric_name,
-                "current_value": trigger.current_value,
-                "threshold": trigger.threshold,
-                "message": trigger.message,
-                "triggered_at": trigger.triggered_at.isoformat(),
-            }
-
-            await self.websocket_manager.send_to_user(
-                str(alert.owner_id), notification_data
             )
 
-            logger.info(f"WebSocket notification sent for alert {alert.id}")
-
-        except Exception as e:
-            logger.error(f"Error sending WebSocket notification: {e}")
-
-    async def _send_webhook_notification(
-        self, alert: AnalyticsAlert, trigger: AlertTrigger, config: Dict
-    ):
-        """Send webhook notification"""
-        try:
-            import aiohttp
-
-            webhook_url = config.get("webhook_url")
-            if not webhook_url:
-                logger.warning(f"No webhook URL configured for alert {alert.id}")
-                return
-
-            payload = {
-                "alert_id": trigger.alert_id,
-                "alert_name": alert.name,
-                "severity": trigger.severity.value,
-                "metric_name": trigger.metric_name,
-                "current_value": trigger.current_value,
-                "threshold": trigger.threshold,
-                "condition": trigger.condition,
-                "message": trigger.message,
-                "triggered_at": trigger.triggered_at.isoformat(),
-                "user_id": trigger.user_id,
-            }
-
-            headers = {"Content-Type": "application/json"}
-
-            # Add custom headers if configured
-            custom_headers = config.get("webhook_headers", {})
-            headers.update(custom_headers)
-
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    webhook_url, json=payload, headers=headers
-                ) as response:
-                    if response.status == 200:
-                        logger.info(f"Webhook notification sent for alert {alert.id}")
-                    else:
-                        logger.error(
-                            f"Webhook failed with status {response.status} for alert {alert.id}"
-                        )
-
-        except Exception as e:
-            logger.error(f"Error sending webhook notification: {e}")
+        notification_dispatcher.enqueue(notifications)
 
     async def _check_alert_resolution(
         self, db: Session, alert: AnalyticsAlert, current_value: float
@@ -497,16 +588,17 @@ class AlertEvaluationEngine:
                 metric_name = condition.get("metric_name")
                 threshold = condition.get("threshold")
                 time_window = condition.get("time_window_minutes", 5)
+                if (
+                    condition.get("condition") == AlertCondition.ANOMALY.value
+                    and threshold is None
+                ):
+                    threshold = settings.ANALYTICS_ANOMALY_THRESHOLD
 
                 end_time = datetime.utcnow()
                 start_time = end_time - timedelta(minutes=time_window)
 
-                current_value = await self._get_metric_value(
-                    db,
-                    metric_name,
-                    start_time,
-                    end_time,
-                    condition.get("aggregation", "avg"),
+                current_value = await self._get_condition_value(
+                    db, alert, start_time, end_time
                 )
 
                 should_trigger = False
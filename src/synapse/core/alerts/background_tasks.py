@@ -10,6 +10,9 @@ from typing import Optional
 from datetime import datetime, timedelta
 
 from synapse.core.alerts.alert_engine import alert_engine
+from synapse.core.alerts.notifications import notification_dispatcher
+from synapse.core.config import settings
+from synapse.core.analytics.ingestion import ingestion_pipeline
 
 logger = logging.getLogger(__name__)
 
@@ -33,6 +36,9 @@ class BackgroundTaskManager:
         logger.info("Starting background tasks")
 
         try:
+            # Start notification delivery before anything can trigger alerts
+            await notification_dispatcher.start()
+
             # Start alert evaluation engine
             self.tasks["alert_engine"] = asyncio.create_task(
                 self._run_alert_engine(), name="alert_engine"
@@ -48,6 +54,12 @@ class BackgroundTaskManager:
                 self._run_cleanup_task(), name="cleanup"
             )
 
+            # Start analytics ingestion flusher
+            await ingestion_pipeline.start()
+
+            # Report jobs whose worker stopped sending heartbeats will never finish
+            await asyncio.to_thread(self._recover_report_jobs)
+
             logger.info(f"Started {len(self.tasks)} background tasks")
 
         except Exception as e:
@@ -65,6 +77,28 @@ class BackgroundTaskManager:
         # Stop alert engine first
         await alert_engine.stop()
 
+        # Deliveries in flight get a moment to finish; the rest stays in the outbox
+        try:
+            await notification_dispatcher.stop()
+        except Exception as e:
+            logger.error(f"Error stopping alert notification dispatcher: {e}")
+
+        # Flush buffered analytics events before shutting down
+        try:
+            await ingestion_pipeline.stop()
+        except Exception as e:
+            logger.error(f"Error flushing analytics ingestion buffer: {e}")
+
+        # Stop accepting report jobs; queued ones are marked failed once their heartbeat goes stale
+        from synapse.services.report_job_service import report_job_service
+
+        report_job_service.shutdown(wait=False, cancel_pending=True)
+
+        # Interrupted exports keep their manifest and can be resumed
+        from synapse.services.bulk_export_service import bulk_export_service
+
+        bulk_export_service.shutdown(wait=False, cancel_pending=True)
+
         # Cancel all tasks
         for task_name, task in self.tasks.items():
             if not task.done():
@@ -102,6 +136,12 @@ class BackgroundTaskManager:
             self.tasks[task_name] = asyncio.create_task(
                 self._run_cleanup_task(), name=task_name
             )
+        elif task_name == "analytics_ingestion":
+            await ingestion_pipeline.stop()
+            await ingestion_pipeline.start()
+        elif task_name == "alert_notifications":
+            await notification_dispatcher.stop()
+            await notification_dispatcher.start()
 
         logger.info(f"Restarted task: {task_name}")
 
@@ -118,6 +158,8 @@ class BackgroundTaskManager:
                 ),
             }
 
+        status["analytics_ingestion"] = ingestion_pipeline.get_stats()
+        status["alert_notifications"] = notification_dispatcher.get_stats()
         return status
 
     async def _run_alert_engine(self):
@@ -138,11 +180,12 @@ class BackgroundTaskManager:
     async def _run_metric_aggregation(self):
         """Run metric aggregation task"""
         logger.info("Starting metric aggregation task")
+        await self._backfill_active_users()
 
         while self.running:
             try:
                 await self._aggregate_metrics()
-                await asyncio.sleep(300)  # Run every 5 minutes
+                await asyncio.sleep(settings.METRIC_ROLLUP_INTERVAL_SECONDS)
             except asyncio.CancelledError:
                 logger.info("Metric aggregation task cancelled")
                 raise
@@ -166,101 +209,89 @@ class BackgroundTaskManager:
                 await asyncio.sleep(300)  # Wait before retry
 
     async def _aggregate_metrics(self):
-        """Aggregate metrics for better performance"""
+        """Fold new raw metric rows into the 1m/1h/1d rollups"""
         try:
-            from synapse.models import AnalyticsEvent, AnalyticsMetric
-            from synapse.database import get_db_session
-            from sqlalchemy import func, text
+            processed = await asyncio.to_thread(self._run_metric_rollups)
+            if processed:
+                logger.debug(f"Rolled up {processed} metric rows")
+        except Exception as e:
+            logger.error(f"Error aggregating metrics: {e}")
 
-            with get_db_session() as db:
-                # Aggregate events into metrics every 5 minutes
-                end_time = datetime.utcnow()
-                start_time = end_time - timedelta(minutes=5)
+        # Score the buckets that closed since the last pass
+        try:
+            await asyncio.to_thread(self._run_anomaly_detection)
+        except Exception as e:
+            logger.error(f"Error detecting metric anomalies: {e}")
 
-                # Count error events
-                error_count = (
-                    db.query(AnalyticsEvent)
-                    .filter(
-                        AnalyticsEvent.event_type == "error_occurred",
-                        AnalyticsEvent.timestamp >= start_time,
-                        AnalyticsEvent.timestamp < end_time,
-                    )
-                    .count()
-                )
+    @staticmethod
+    def _run_metric_rollups() -> int:
+        from synapse.database import get_db_session
+        from synapse.services.metric_rollup_service import metric_rollup_service
 
-                if error_count > 0:
-                    error_metric = AnalyticsMetric(
-                        metric_name="error_count",
-                        metric_value=error_count,
-                        dimensions={"aggregation_period": "5min"},
-                        timestamp=end_time,
-                    )
-                    db.add(error_metric)
+        with get_db_session() as db:
+            return metric_rollup_service.run_incremental(db)
 
-                # Count page views
-                page_view_count = (
-                    db.query(AnalyticsEvent)
-                    .filter(
-                        AnalyticsEvent.event_type == "page_view",
-                        AnalyticsEvent.timestamp >= start_time,
-                        AnalyticsEvent.timestamp < end_time,
-                    )
-                    .count()
-                )
+    @staticmethod
+    def _run_anomaly_detection() -> int:
+        from synapse.database import get_db_session
+        from synapse.services.metric_anomaly_service import metric_anomaly_service
 
-                if page_view_count > 0:
-                    page_view_metric = AnalyticsMetric(
-                        metric_name="page_view_count",
-                        metric_value=page_view_count,
-                        dimensions={"aggregation_period": "5min"},
-                        timestamp=end_time,
-                    )
-                    db.add(page_view_metric)
-
-                # Calculate average response time (if available in properties)
-                response_times = (
-                    db.query(AnalyticsEvent.properties)
-                    .filter(
-                        AnalyticsEvent.event_type == "performance_metric",
-                        AnalyticsEvent.timestamp >= start_time,
-                        AnalyticsEvent.timestamp < end_time,
-                        AnalyticsEvent.properties.contains(
-                            {"response_time": 1}
-                        ),  # Check if contains response_time
-                    )
-                    .all()
-                )
+        with get_db_session() as db:
+            return metric_anomaly_service.run_incremental(db)
 
-                if response_times:
-                    total_time = 0
-                    count = 0
-                    for event in response_times:
-                        if (
-                            isinstance(event.properties, dict)
-                            and "response_time" in event.properties
-                        ):
-                            total_time += float(event.properties["response_time"])
-                            count += 1
-
-                    if count > 0:
-                        avg_response_time = total_time / count
-                        response_metric = AnalyticsMetric(
-                            metric_name="avg_response_time",
-                            metric_value=avg_response_time,
-                            dimensions={"aggregation_period": "5min"},
-                            timestamp=end_time,
-                        )
-                        db.add(response_metric)
-
-                logger.debug(
-                    f"Aggregated metrics for period {start_time} to {end_time}"
-                )
+    async def _backfill_active_users(self):
+        """Build daily active-user sketches for recent days that predate them"""
+        try:
+            rebuilt = await asyncio.to_thread(self._run_active_user_backfill)
+            if rebuilt:
+                logger.info(f"Rebuilt active-user sketches for {rebuilt} days")
+        except Exception as e:
+            logger.error(f"Error backfilling active-user sketches: {e}")
+
+    @staticmethod
+    def _run_active_user_backfill() -> int:
+        from synapse.database import get_db_session
+        from synapse.services.active_user_service import active_user_service
+
+        with get_db_session() as db:
+            return active_user_service.backfill(db)
+
+    @staticmethod
+    def _recover_report_jobs() -> None:
+        from synapse.database import get_db_session
+        from synapse.services.report_job_service import report_job_service
 
+        try:
+            with get_db_session() as db:
+                recovered = report_job_service.recover_interrupted(db)
+            if recovered:
+                logger.warning(f"Marked {recovered} interrupted report executions as failed")
         except Exception as e:
-            logger.error(f"Error aggregating metrics: {e}")
+            logger.error(f"Error recovering interrupted report executions: {e}")
+
+        from synapse.services.bulk_export_service import bulk_export_service
+
+        try:
+            with get_db_session() as db:
+                recovered = bulk_export_service.recover_interrupted(db)
+            if recovered:
+                logger.warning(f"Marked {recovered} interrupted exports as failed (resumable)")
+        except Exception as e:
+            logger.error(f"Error recovering interrupted exports: {e}")
+
+    @staticmethod
+    def _purge_execution_outputs() -> int:
+        from synapse.database import get_db_session
+        from synapse.services.execution_output_service import execution_output_service
+
+        with get_db_session() as db:
+            return execution_output_service.purge(db)
 
     async def _cleanup_old_data(self):
         """Clean up old analytics data"""
+        # Workers that died since startup leave jobs behind with a stale heartbeat
+        await asyncio.to_thread(self._recover_report_jobs)
+
         try:
             from synapse.models import AnalyticsEvent, AnalyticsMetric
             from synapse.database import get_db_session
@@ -289,6 +320,52 @@ class BackgroundTaskManager:
                         f"Cleaned up {deleted_events} old events and {deleted_metrics} old metrics"
                     )
 
+            # Expire fine-grained rollup buckets past their retention
+            from synapse.services.metric_rollup_service import metric_rollup_service
+
+            with get_db_session() as db:
+                deleted_rollups = metric_rollup_service.purge(db)
+                if deleted_rollups:
+                    logger.info(f"Cleaned up {deleted_rollups} expired metric rollup buckets")
+
+            from synapse.services.metric_anomaly_service import metric_anomaly_service
+
+            with get_db_session() as db:
+                deleted_anomalies = metric_anomaly_service.purge(db)
+                if deleted_anomalies:
+                    logger.info(f"Cleaned up {deleted_anomalies} old metric anomalies")
+
+            with get_db_session() as db:
+                deleted_notifications = notification_dispatcher.purge(db)
+                if deleted_notifications:
+                    logger.info(f"Cleaned up {deleted_notifications} old alert notifications")
+
+            from synapse.services.active_user_service import active_user_service
+
+            with get_db_session() as db:
+                deleted_sketches = active_user_service.purge(db)
+                if deleted_sketches:
+                    logger.info(f"Cleaned up {deleted_sketches} expired active-user sketches")
+
+            from synapse.services.report_job_service import report_job_service
+
+            with get_db_session() as db:
+                expired_reports = report_job_service.purge(db)
+                if expired_reports:
+                    logger.info(f"Removed spooled results of {expired_reports} report executions")
+
+            from synapse.services.bulk_export_service import bulk_export_service
+
+            with get_db_session() as db:
+                expired_exports = bulk_export_service.purge(db)
+                if expired_exports:
+                    logger.info(f"Removed files of {expired_exports} expired exports")
+
+            # Stored node outputs of executions deleted outside the ORM session
+            orphaned_outputs = await asyncio.to_thread(self._purge_execution_outputs)
+            if orphaned_outputs:
+                logger.info(f"Removed stored outputs of {orphaned_outputs} deleted executions")
+
         except Exception as e:
             logger.error(f"Error cleaning up old data: {e}")
 
@@ -0,0 +1,160 @@
+"""
+Batched Alert Evaluation
+Alert conditions are grouped by (metric, aggregation, window) so every
+distinct aggregate is computed once per tick, in one grouped query, and fanned
+out to all alerts that depend on it. Per-alert evaluation intervals are kept
+on a hashed timer wheel.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple
+
+from sqlalchemy import case, func, select
+from sqlalchemy.orm import Session
+
+from synapse.models import AnalyticsMetric
+
+AGGREGATIONS = ("avg", "sum", "min", "max", "count")
+
+# Each window adds five conditional aggregates to the grouped query
+_WINDOWS_PER_QUERY = 16
+
+
+@dataclass(frozen=True)
+class AggregateKey:
+    """One distinct aggregate shared by every alert that watches it"""
+
+    metric_name: str
+    aggregation: str
+    window_seconds: int
+
+
+def aggregate_key(metric_name: str, aggregation: Optional[str], window_seconds: float) -> AggregateKey:
+    """Normalized key; unknown aggregations fall back to avg, like the per-alert query did"""
+    if aggregation not in AGGREGATIONS:
+        aggregation = "avg"
+    return AggregateKey(metric_name, aggregation, max(1, int(window_seconds)))
+
+
+def compute_aggregates(
+    db: Session, keys: Iterable[AggregateKey], now: Optional[datetime] = None
+) -> Dict[AggregateKey, Optional[float]]:
+    """
+    Compute every requested aggregate in a single scan per group of windows.
+
+    Rows are filtered once by metric name and the widest window; each window
+    contributes its row count plus ``count/sum/min/max`` of the value over a
+    ``CASE`` that keeps only its own rows, so avg/sum/min/max/count of all
+    windows come out of the same GROUP BY. ``count`` counts rows, while avg
+    divides by the number of non-null values. Aggregates with no rows are
+    ``None`` (``0`` for count).
+    """
+    now = now or datetime.utcnow()
+    keys = set(keys)
+    if not keys:
+        return {}
+
+    metric = AnalyticsMetric
+    windows = sorted({key.window_seconds for key in keys})
+    stats: Dict[Tuple[str, int], Tuple] = {}
+    for offset in range(0, len(windows), _WINDOWS_PER_QUERY):
+        chunk = windows[offset : offset + _WINDOWS_PER_QUERY]
+        columns = []
+        for window in chunk:
+            in_window = metric.timestamp >= now - timedelta(seconds=window)
+            inside = case((in_window, metric.metric_value))
+            columns += [
+                func.count(case((in_window, 1))),
+                func.count(inside),
+                func.sum(inside),
+                func.min(inside),
+                func.max(inside),
+            ]
+        names = sorted({key.metric_name for key in keys if key.window_seconds in chunk})
+        rows = db.execute(
+            select(metric.metric_name, *columns)
+            .where(
+                metric.metric_name.in_(names),
+                metric.timestamp >= now - timedelta(seconds=chunk[-1]),
+                metric.timestamp <= now,
+            )
+            .group_by(metric.metric_name)
+        )
+        for row in rows:
+            for index, window in enumerate(chunk):
+                stats[(row[0], window)] = tuple(row[1 + 5 * index : 6 + 5 * index])
+
+    results: Dict[AggregateKey, Optional[float]] = {}
+    for key in keys:
+        rows, count, total, low, high = stats.get(
+            (key.metric_name, key.window_seconds), (0, 0, None, None, None)
+        )
+        if key.aggregation == "count":
+            results[key] = float(rows or 0)
+        elif not count:
+            results[key] = None
+        elif key.aggregation == "sum":
+            results[key] = float(total)
+        elif key.aggregation == "min":
+            results[key] = float(low)
+        elif key.aggregation == "max":
+            results[key] = float(high)
+        else:
+            results[key] = float(total) / count
+    return results
+
+
+class TimerWheel:
+    """
+    Hashed timing wheel.
+
+    An entry due at tick ``t`` lives in slot ``t % slots``; advancing one tick
+    only looks at that slot, so the cost of a tick depends on how many entries
+    share the slot, not on how many are scheduled. Fired entries are put back
+    one interval later.
+    """
+
+    def __init__(self, slots: int = 512):
+        self.slots = slots
+        self.tick = 0
+        self._buckets: List[Dict[Hashable, int]] = [{} for _ in range(slots)]
+        self._entries: Dict[Hashable, Tuple[int, int]] = {}  # key -> (interval, due tick)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def interval(self, key: Hashable) -> Optional[int]:
+        entry = self._entries.get(key)
+        return entry[0] if entry else None
+
+    def schedule(self, key: Hashable, interval: int, delay: Optional[int] = None) -> None:
+        """Fire ``key`` every ``interval`` ticks, the first time after ``delay`` ticks"""
+        self.cancel(key)
+        interval = max(1, int(interval))
+        delay = interval if delay is None else max(1, int(delay))
+        self._place(key, interval, self.tick + delay)
+
+    def cancel(self, key: Hashable) -> bool:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        del self._buckets[entry[1] % self.slots][key]
+        return True
+
+    def advance(self) -> List[Hashable]:
+        """Move one tick forward and return the keys that became due"""
+        self.tick += 1
+        bucket = self._buckets[self.tick % self.slots]
+        due = [key for key, at in bucket.items() if at == self.tick]
+        for key in due:
+            del bucket[key]
+            self._place(key, self._entries[key][0], self.tick + self._entries[key][0])
+        return due
+
+    def _place(self, key: Hashable, interval: int, due: int) -> None:
+        self._buckets[due % self.slots][key] = due
+        self._entries[key] = (interval, due)
@@ -0,0 +1,638 @@
+"""
+Alert Notification Dispatcher
+Alert firings are written to an outbox and delivered by a worker pool with
+per-channel concurrency limits, so slow channels never stall evaluation.
+Firings for the same channel and recipient that arrive within the grouping
+window go out as one digest; failed deliveries are retried with exponential
+backoff and jitter.
+"""
+
+import asyncio
+import contextlib
+import hashlib
+import html
+import logging
+import random
+import time
+import uuid
+from collections import defaultdict, deque
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Deque, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import and_, delete, func, insert, or_, select, update
+from sqlalchemy.orm import Session
+
+from synapse.core.config import settings
+from synapse.middlewares.metrics import (
+    alert_notification_delivery_seconds,
+    alert_notification_queue_depth,
+    alert_notifications_total,
+)
+from synapse.models.alert_notification import AlertNotification
+
+logger = logging.getLogger(__name__)
+
+# Firings listed in a digest body; the count always covers all of them
+DIGEST_MAX_FIRINGS = 20
+
+
+class PermanentDeliveryError(Exception):
+    """Delivery failure that retrying cannot fix (bad address, 4xx response)"""
+
+
+def notification_fingerprint(channel: str, recipient: str) -> str:
+    """Grouping key: every pending firing for the same destination joins one digest"""
+    return hashlib.sha256(f"{channel}\x1f{recipient}".encode()).hexdigest()
+
+
+def retry_delay(attempts: int, base: float, cap: float) -> float:
+    """Exponential backoff with jitter: half of the delay is fixed, half random"""
+    delay = min(cap, base * 2 ** max(attempts - 1, 0))
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+def parse_channel_limits(spec: str) -> Dict[str, int]:
+    """``"email:4,webhook:16"`` -> ``{"email": 4, "webhook": 16}``"""
+    limits = {}
+    for item in spec.split(","):
+        name, _, value = item.partition(":")
+        if name.strip() and value.strip():
+            limits[name.strip()] = max(1, int(value))
+    return limits
+
+
+def _as_uuid(value: Any) -> Optional[uuid.UUID]:
+    if value is None or isinstance(value, uuid.UUID):
+        return value
+    try:
+        return uuid.UUID(str(value))
+    except ValueError:
+        return None
+
+
+def _default_session_factory() -> Session:
+    from synapse.database import SessionLocal
+
+    return SessionLocal()
+
+
+@dataclass
+class Notification:
+    """One alert firing addressed to one recipient of one channel"""
+
+    channel: str
+    recipient: str
+    payload: Dict[str, Any]
+    alert_id: Any = None
+    tenant_id: Any = None
+    config: Dict[str, Any] = field(default_factory=dict)
+    fired_at: datetime = field(default_factory=datetime.utcnow)
+
+    @property
+    def fingerprint(self) -> str:
+        return notification_fingerprint(self.channel, self.recipient)
+
+    @property
+    def dedup_key(self) -> Tuple[str, str, str, Any]:
+        return (str(self.alert_id), self.channel, self.recipient, self.payload.get("severity"))
+
+
+@dataclass
+class Digest:
+    """Outbox rows of one fingerprint claimed for a single delivery"""
+
+    fingerprint: str
+    channel: str
+    recipient: str
+    config: Dict[str, Any]
+    ids: List[uuid.UUID]
+    firings: List[Dict[str, Any]]  # oldest first, at most DIGEST_MAX_FIRINGS
+    count: int
+    first_fired_at: datetime
+    last_fired_at: datetime
+    attempts: int = 0
+    dedup_keys: List[Tuple[str, str, str, Any]] = field(default_factory=list)
+
+    @classmethod
+    def from_rows(cls, rows: List[AlertNotification]) -> "Digest":
+        last = rows[-1]
+        return cls(
+            fingerprint=last.fingerprint,
+            channel=last.channel,
+            recipient=last.recipient,
+            config=last.config or {},
+            ids=[row.id for row in rows],
+            firings=[row.payload for row in rows[-DIGEST_MAX_FIRINGS:]],
+            count=len(rows),
+            first_fired_at=rows[0].fired_at,
+            last_fired_at=last.fired_at,
+            attempts=max(row.attempts for row in rows),
+            dedup_keys=list(
+                {(str(row.alert_id), row.channel, row.recipient, row.payload.get("severity")) for row in rows}
+            ),
+        )
+
+    def message(self) -> Dict[str, Any]:
+        """JSON body for webhooks and WebSocket pushes; a single firing is sent unchanged"""
+        if self.count == 1:
+            return self.firings[0]
+        return {
+            "event": "alert_digest",
+            "count": self.count,
+            "first_fired_at": self.first_fired_at.isoformat(),
+            "last_fired_at": self.last_fired_at.isoformat(),
+            "alerts": self.firings,
+        }
+
+    def email(self) -> Tuple[str, str, str]:
+        """(subject, title, HTML content)"""
+        latest = self.firings[-1]
+        name = html.escape(str(latest.get("alert_name", "")))
+        if self.count == 1:
+            rows = "".join(
+                f"<li><strong>{label}:</strong> {html.escape(str(latest[key]))}</li>"
+                for key, label in (
+                    ("severity", "Severity"),
+                    ("metric_name", "Metric"),
+                    ("description", "Description"),
+                    ("current_value", "Current Value"),
+                    ("threshold", "Threshold"),
+                    ("condition", "Condition"),
+                    ("triggered_at", "Triggered At"),
+                )
+                if latest.get(key) is not None
+            )
+            message = html.escape(str(latest.get("message") or ""))
+            content = (
+                f'<div style="margin-bottom: 20px;"><h3>Alert Details</h3><ul>'
+                f"<li><strong>Alert Name:</strong> {name}</li>{rows}</ul></div>"
+                + (f"<p><strong>Message:</strong> {message}</p>" if message else "")
+                + "<p>Please check your dashboard for more details and take appropriate action if needed.</p>"
+            )
+            return f"🚨 Alert Triggered: {latest.get('alert_name', '')}", "Alert Triggered", content
+
+        items = "".join(
+            f"<li>{html.escape(str(firing.get('triggered_at', '')))} — "
+            f"<strong>{html.escape(str(firing.get('alert_name', '')))}</strong> "
+            f"({html.escape(str(firing.get('severity', '')))}): "
+            f"{html.escape(str(firing.get('message') or firing.get('current_value', '')))}</li>"
+            for firing in self.firings
+        )
+        omitted = self.count - len(self.firings)
+        content = (
+            f"<h3>{self.count} alert notifications</h3>"
+            f"<p>Between {self.first_fired_at:%Y-%m-%d %H:%M:%S} and "
+            f"{self.last_fired_at:%Y-%m-%d %H:%M:%S} UTC:</p><ul>{items}</ul>"
+            + (f"<p>… and {omitted} earlier notifications.</p>" if omitted > 0 else "")
+            + "<p>Please check your dashboard for more details.</p>"
+        )
+        return f"🚨 {self.count} alerts triggered", "Alert Digest", content
+
+
+@dataclass
+class DispatcherStats:
+    """Dispatcher counters"""
+
+    enqueued: int = 0
+    suppressed: int = 0
+    persisted: int = 0
+    digests_delivered: int = 0
+    notifications_delivered: int = 0
+    retried: int = 0
+    dead: int = 0
+    last_delivery_ms: Optional[float] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+Sender = Callable[[Digest], Awaitable[None]]
+
+
+class NotificationDispatcher:
+    """
+    Outbox-backed notification delivery.
+
+    ``enqueue`` only buffers firings in memory. A collector task writes the
+    buffer to the outbox, a scheduler task claims fingerprints whose grouping
+    window (or retry backoff) is over, and ``workers`` tasks deliver the
+    claimed digests, each channel behind its own semaphore.
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        channel_limits: Optional[Dict[str, int]] = None,
+        group_window: Optional[float] = None,
+        dedup_window: Optional[float] = None,
+        max_attempts: Optional[int] = None,
+        retry_base: Optional[float] = None,
+        retry_max: Optional[float] = None,
+        lease: Optional[float] = None,
+        poll_interval: float = 1.0,
+        session_factory: Callable[[], Session] = _default_session_factory,
+        senders: Optional[Dict[str, Sender]] = None,
+    ):
+        self.workers = workers or settings.ALERT_NOTIFICATION_WORKERS
+        self.channel_limits = channel_limits or parse_channel_limits(settings.ALERT_NOTIFICATION_CONCURRENCY)
+        self.group_window = settings.ALERT_NOTIFICATION_GROUP_SECONDS if group_window is None else group_window
+        self.dedup_window = settings.ALERT_NOTIFICATION_DEDUP_SECONDS if dedup_window is None else dedup_window
+        self.max_attempts = max_attempts or settings.ALERT_NOTIFICATION_MAX_ATTEMPTS
+        self.retry_base = retry_base or settings.ALERT_NOTIFICATION_RETRY_BASE_SECONDS
+        self.retry_max = retry_max or settings.ALERT_NOTIFICATION_RETRY_MAX_SECONDS
+        self.lease = lease or settings.ALERT_NOTIFICATION_LEASE_SECONDS
+        self.poll_interval = poll_interval
+        self.session_factory = session_factory
+        self.senders: Dict[str, Sender] = {
+            "email": self._send_email,
+            "websocket": self._send_websocket,
+            "webhook": self._send_webhook,
+        }
+        self.senders.update(senders or {})
+        self.stats = DispatcherStats()
+
+        self._buffer: Deque[Notification] = deque()
+        self._delivered: Dict[Tuple[str, str, str, Any], float] = {}  # dedup key -> monotonic time
+        self._outbox_pending = 0
+        self._queue: Optional[asyncio.Queue] = None
+        self._limits: Dict[str, asyncio.Semaphore] = {}
+        self._wakeup: Optional[asyncio.Event] = None
+        self._tasks: List[asyncio.Task] = []
+        self._workers: List[asyncio.Task] = []
+        self._stopping = False
+        self._http = None
+        self._email_service = None
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks) and not all(task.done() for task in self._tasks)
+
+    # ==================== ENQUEUE ====================
+
+    def enqueue(self, notifications: Iterable[Notification]) -> int:
+        """Buffer firings for the outbox; never blocks on delivery. Returns how many were accepted."""
+        now = time.monotonic()
+        accepted = 0
+        for notification in notifications:
+            delivered_at = self._delivered.get(notification.dedup_key)
+            if delivered_at is not None and now - delivered_at < self.dedup_window:
+                self.stats.suppressed += 1
+                alert_notifications_total.labels(notification.channel, "suppressed").inc()
+                continue
+            self._buffer.append(notification)
+            accepted += 1
+
+        self.stats.enqueued += accepted
+        alert_notification_queue_depth.labels("buffered").set(len(self._buffer))
+        if accepted and self._wakeup is not None:
+            self._wakeup.set()
+        return accepted
+
+    # ==================== OUTBOX ====================
+
+    def _persist(self, notifications: List[Notification]) -> int:
+        rows = [
+            {
+                "id": uuid.uuid4(),
+                "fingerprint": notification.fingerprint,
+                "channel": notification.channel,
+                "recipient": notification.recipient[:500],
+                "alert_id": _as_uuid(notification.alert_id),
+                "tenant_id": _as_uuid(notification.tenant_id),
+                "payload": notification.payload,
+                "config": notification.config,
+                "status": "pending",
+                "attempts": 0,
+                "fired_at": notification.fired_at,
+                "available_at": notification.fired_at + timedelta(seconds=self.group_window),
+            }
+            for notification in notifications
+        ]
+        with self.session_factory() as db:
+            db.execute(insert(AlertNotification), rows)
+            db.commit()
+        return len(rows)
+
+    def _claim(self, limit: int, now: Optional[datetime] = None) -> List[Digest]:
+        """
+        Mark every pending row of up to ``limit`` due fingerprints as sending.
+
+        A fingerprint is due once its oldest pending row is available; rows
+        that arrived later (still inside the window) join the same digest.
+        Claimed rows keep the claim's expiry in ``available_at``. A row still
+        ``sending`` after that was left behind by a process that stopped, so
+        it is claimed again. Rows claimed by live processes are left alone.
+        Delivery is at-least-once: a digest sent right before a crash is sent again.
+        """
+        now = now or datetime.utcnow()
+        outbox = AlertNotification
+        with self.session_factory() as db:
+            fingerprints = list(
+                db.execute(
+                    select(outbox.fingerprint)
+                    .where(outbox.status.in_(("pending", "sending")), outbox.available_at <= now)
+                    .group_by(outbox.fingerprint)
+                    .limit(limit)
+                ).scalars()
+            )
+            if not fingerprints:
+                return []
+
+            query = (
+                select(outbox)
+                .where(
+                    outbox.fingerprint.in_(fingerprints),
+                    or_(
+                        outbox.status == "pending",
+                        and_(outbox.status == "sending", outbox.available_at <= now),
+                    ),
+                )
+                .order_by(outbox.fired_at)
+            )
+            if db.get_bind().dialect.name == "postgresql":
+                query = query.with_for_update(skip_locked=True)
+            lease_until = now + timedelta(seconds=self.lease)
+            groups: Dict[str, List[AlertNotification]] = defaultdict(list)
+            for row in db.execute(query).scalars():
+                row.status = "sending"
+                row.available_at = lease_until
+                groups[row.fingerprint].append(row)
+            digests = [Digest.from_rows(rows) for rows in groups.values()]
+            db.commit()
+        return digests
+
+    def _pending_count(self) -> int:
+        with self.session_factory() as db:
+            return db.execute(
+                select(func.count()).select_from(AlertNotification).where(AlertNotification.status == "pending")
+            ).scalar_one()
+
+    def _complete(
+        self, digest: Digest, error: Optional[str] = None, permanent: bool = False, now: Optional[datetime] = None
+    ) -> str:
+        """Record a delivery attempt for every row of the digest; returns the new status"""
+        now = now or datetime.utcnow()
+        attempts = digest.attempts + 1
+        if error is None:
+            values = {"status": "delivered", "delivered_at": now, "digest_id": uuid.uuid4(), "last_error": None}
+        elif permanent or attempts >= self.max_attempts:
+            values = {"status": "dead", "last_error": error[:2000]}
+        else:
+            delay = retry_delay(attempts, self.retry_base, self.retry_max)
+            values = {
+                "status": "pending",
+                "last_error": error[:2000],
+                "available_at": now + timedelta(seconds=delay),
+            }
+        with self.session_factory() as db:
+            db.execute(
+                update(AlertNotification)
+                .where(AlertNotification.id.in_(digest.ids))
+                .values(attempts=attempts, **values)
+            )
+            db.commit()
+        return values["status"]
+
+    def _release(self, digests: List[Digest]) -> None:
+        """Put claimed but undelivered digests back in the outbox"""
+        ids = [row_id for digest in digests for row_id in digest.ids]
+        if not ids:
+            return
+        with self.session_factory() as db:
+            db.execute(
+                update(AlertNotification)
+                .where(AlertNotification.id.in_(ids), AlertNotification.status == "sending")
+                .values(status="pending", available_at=datetime.utcnow())
+            )
+            db.commit()
+
+    def purge(self, db: Session, now: Optional[datetime] = None) -> int:
+        """Delete delivered and dead rows past the retention period"""
+        cutoff = (now or datetime.utcnow()) - timedelta(days=settings.ALERT_NOTIFICATION_RETENTION_DAYS)
+        result = db.execute(
+            delete(AlertNotification).where(
+                AlertNotification.status.in_(["delivered", "dead"]),
+                AlertNotification.fired_at < cutoff,
+            )
+        )
+        db.commit()
+        return result.rowcount or 0
+
+    # ==================== DELIVERY ====================
+
+    async def _deliver(self, digest: Digest) -> str:
+        start = time.perf_counter()
+        error, permanent = None, False
+        limit = self._limits.get(digest.channel)
+        async with limit if limit is not None else contextlib.nullcontext():
+            try:
+                sender = self.senders.get(digest.channel)
+                if sender is None:
+                    raise PermanentDeliveryError(f"Unknown notification channel: {digest.channel}")
+                await sender(digest)
+            except PermanentDeliveryError as e:
+                error, permanent = str(e), True
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+
+        status = await asyncio.to_thread(self._complete, digest, error, permanent)
+        if status == "delivered":
+            now = time.monotonic()
+            for key in digest.dedup_keys:
+                self._delivered[key] = now
+            self.stats.digests_delivered += 1
+            self.stats.notifications_delivered += digest.count
+            self.stats.last_delivery_ms = round((time.perf_counter() - start) * 1000, 2)
+            alert_notification_delivery_seconds.labels(digest.channel).observe(
+                (datetime.utcnow() - digest.first_fired_at).total_seconds()
+            )
+            alert_notifications_total.labels(digest.channel, "delivered").inc(digest.count)
+        elif status == "dead":
+            self.stats.dead += digest.count
+            alert_notifications_total.labels(digest.channel, "dead").inc(digest.count)
+            logger.error(
+                f"Dropping {digest.count} {digest.channel} notifications to {digest.recipient} "
+                f"after {digest.attempts + 1} attempts: {error}"
+            )
+        else:
+            self.stats.retried += digest.count
+            alert_notifications_total.labels(digest.channel, "retried").inc(digest.count)
+            logger.warning(f"{digest.channel} notification to {digest.recipient} failed, will retry: {error}")
+        return status
+
+    async def _send_email(self, digest: Digest) -> None:
+        if self._email_service is None:
+            from synapse.core.email.service import EmailService
+
+            self._email_service = EmailService()
+        subject, title, content = digest.email()
+        sent = await self._email_service.send_notification_email(
+            email=digest.recipient,
+            title=title,
+            content=content,
+            user_name=digest.config.get("user_name", ""),
+            subject=subject,
+        )
+        if not sent:
+            raise RuntimeError("Email was not accepted by the mail server")
+
+    async def _send_websocket(self, digest: Digest) -> None:
+        from synapse.core.websockets.manager import manager
+
+        message = digest.message()
+        message = {**message, "type": "alert_triggered" if digest.count == 1 else "alert_digest"}
+        await manager.send_to_user(message, digest.recipient)
+
+    async def _http_session(self):
+        """Shared pooled HTTP client for webhooks (one connection pool for all alerts)"""
+        if self._http is None or self._http.closed:
+            import aiohttp
+
+            self._http = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.channel_limits.get("webhook", 16), ttl_dns_cache=300),
+                timeout=aiohttp.ClientTimeout(total=settings.ALERT_NOTIFICATION_WEBHOOK_TIMEOUT),
+            )
+        return self._http
+
+    async def _send_webhook(self, digest: Digest) -> None:
+        session = await self._http_session()
+        headers = {"Content-Type": "application/json", **(digest.config.get("headers") or {})}
+        async with session.post(digest.recipient, json=digest.message(), headers=headers) as response:
+            if response.status < 400:
+                return
+            error = f"Webhook responded with HTTP {response.status}"
+            if response.status in (408, 429) or response.status >= 500:
+                raise RuntimeError(error)
+            raise PermanentDeliveryError(error)
+
+    # ==================== LIFECYCLE ====================
+
+    async def flush(self) -> int:
+        """Write buffered firings to the outbox; on failure they stay buffered"""
+        if not self._buffer:
+            return 0
+        batch = list(self._buffer)
+        self._buffer.clear()
+        try:
+            await asyncio.to_thread(self._persist, batch)
+        except Exception as e:
+            logger.error(f"Failed to write {len(batch)} alert notifications to the outbox: {e}")
+            self._buffer.extendleft(reversed(batch))
+            return 0
+        self.stats.persisted += len(batch)
+        alert_notification_queue_depth.labels("buffered").set(len(self._buffer))
+        return len(batch)
+
+    async def _run_collector(self) -> None:
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    def _poll(self, limit: int) -> Tuple[List[Digest], int]:
+        digests = self._claim(limit) if limit > 0 else []
+        return digests, self._pending_count()
+
+    async def _run_scheduler(self) -> None:
+        while not self._stopping:
+            claimed = free = 0
+            try:
+                free = self._queue.maxsize - self._queue.qsize()
+                digests, self._outbox_pending = await asyncio.to_thread(self._poll, free)
+                for digest in digests:
+                    self._queue.put_nowait(digest)
+                claimed = len(digests)
+                alert_notification_queue_depth.labels("outbox").set(self._outbox_pending)
+                alert_notification_queue_depth.labels("claimed").set(self._queue.qsize())
+                self._prune_delivered()
+            except Exception as e:
+                logger.error(f"Error claiming alert notifications: {e}")
+            # A full claim means more digests are due: poll again right away
+            await asyncio.sleep(0 if claimed and claimed == free else self.poll_interval)
+
+    async def _run_worker(self) -> None:
+        while True:
+            digest = await self._queue.get()
+            try:
+                await self._deliver(digest)
+            except Exception as e:
+                logger.error(f"Error delivering {digest.channel} notification: {e}")
+            finally:
+                self._queue.task_done()
+
+    def _prune_delivered(self) -> None:
+        if len(self._delivered) < 1024:
+            return
+        cutoff = time.monotonic() - self.dedup_window
+        self._delivered = {key: at for key, at in self._delivered.items() if at >= cutoff}
+
+    async def start(self) -> None:
+        if self.running:
+            return
+        self._stopping = False
+        self._queue = asyncio.Queue(maxsize=self.workers * 4)
+        self._wakeup = asyncio.Event()
+        self._limits = {
+            channel: asyncio.Semaphore(self.channel_limits.get(channel, self.workers)) for channel in self.senders
+        }
+        self._workers = [
+            asyncio.create_task(self._run_worker(), name=f"alert_notifications_worker_{index}")
+            for index in range(self.workers)
+        ]
+        self._tasks = [
+            asyncio.create_task(self._run_collector(), name="alert_notifications_collector"),
+            asyncio.create_task(self._run_scheduler(), name="alert_notifications_scheduler"),
+            *self._workers,
+        ]
+
+    async def stop(self, timeout: float = 5.0) -> None:
+        """Stop claiming, let in-flight deliveries finish briefly, and persist what is left"""
+        if self._tasks:
+            self._stopping = True
+            self._wakeup.set()
+            background = [task for task in self._tasks if task not in self._workers]
+            await asyncio.gather(*background, return_exceptions=True)
+            try:
+                await asyncio.wait_for(self._queue.join(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+            for task in self._workers:
+                task.cancel()
+            await asyncio.gather(*self._workers, return_exceptions=True)
+
+            leftover = []
+            while not self._queue.empty():
+                leftover.append(self._queue.get_nowait())
+            try:
+                await asyncio.to_thread(self._release, leftover)
+            except Exception as e:
+                logger.error(f"Failed to release {len(leftover)} claimed notification digests: {e}")
+            self._tasks, self._workers = [], []
+
+        await self.flush()
+        if self._http is not None:
+            await self._http.close()
+            self._http = None
+        self._wakeup = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = self.stats.to_dict()
+        stats.update(
+            {
+                "buffered": len(self._buffer),
+                "outbox_pending": self._outbox_pending,
+                "claimed": self._queue.qsize() if self._queue is not None else 0,
+                "workers": self.workers,
+                "channel_limits": self.channel_limits,
+                "group_window_seconds": self.group_window,
+                "running": self.running,
+            }
+        )
+        return stats
+
+
+notification_dispatcher = NotificationDispatcher()
@@ -0,0 +1,112 @@
+"""
+Analytics Core Module
+
+Infraestrutura de alto volume para analytics:
+- Pipeline de ingestão com ring buffer limitado (ou Redis Stream)
+- Flusher em background com INSERT multi-linha e backpressure
+- Sketch de quantis mesclável para rollups de métricas
+- Downsampling LTTB para séries de gráficos
+- Motor de funis e coortes (plano SQL com funções de janela ou NumPy)
+- HyperLogLog para contagem de usuários distintos
+- Query builder de relatórios e spool de resultados paginado
+- Exportação em massa particionada com manifesto de checksums
+- Detecção de anomalias (EWMA, Welford, sazonal, MAD) e tendências
+"""
+
+from .anomaly import (
+    AnomalyScore,
+    DetectorConfig,
+    DetectorState,
+    score_series,
+    season_slot,
+    trend_summary,
+)
+from .bulk_export import (
+    ExportFormatError,
+    ExportManifest,
+    ExportPartition,
+    PartitionWriter,
+    iter_file_range,
+    parse_byte_range,
+    split_time_range,
+)
+from .downsampling import lttb, lttb_indices
+from .funnels import (
+    FunnelStepResult,
+    ResultCache,
+    RetentionMatrix,
+    build_funnel_select,
+    build_retention_select,
+    funnel_from_arrays,
+    retention_from_arrays,
+    retention_from_rows,
+)
+from .hll import HyperLogLog, hash_member
+from .ingestion import (
+    AnalyticsIngestionPipeline,
+    IngestionBackpressure,
+    IngestionStats,
+    IngestResult,
+    OverflowPolicy,
+    RingBuffer,
+    build_event_row,
+    derive_metric_rows,
+    ingestion_pipeline,
+    write_event_batch,
+)
+from .report_query import CompiledReport, ReportQueryError, ReportSource, compile_report_query
+from .sketch import QuantileSketch
+from .spool import ResultSpool, SpoolManifest, iter_download, read_page
+
+__all__ = [
+    "AnalyticsIngestionPipeline",
+    "IngestionBackpressure",
+    "IngestionStats",
+    "IngestResult",
+    "OverflowPolicy",
+    "RingBuffer",
+    "build_event_row",
+    "derive_metric_rows",
+    "ingestion_pipeline",
+    "write_event_batch",
+    # Séries temporais
+    "QuantileSketch",
+    "lttb",
+    "lttb_indices",
+    # Anomalias e tendências
+    "AnomalyScore",
+    "DetectorConfig",
+    "DetectorState",
+    "score_series",
+    "season_slot",
+    "trend_summary",
+    # Funis e coortes
+    "FunnelStepResult",
+    "ResultCache",
+    "RetentionMatrix",
+    "build_funnel_select",
+    "build_retention_select",
+    "funnel_from_arrays",
+    "retention_from_arrays",
+    "retention_from_rows",
+    # Contagem de distintos
+    "HyperLogLog",
+    "hash_member",
+    # Relatórios
+    "CompiledReport",
+    "ReportQueryError",
+    "ReportSource",
+    "compile_report_query",
+    "ResultSpool",
+    "SpoolManifest",
+    "iter_download",
+    "read_page",
+    # Exportações
+    "ExportFormatError",
+    "ExportManifest",
+    "ExportPartition",
+    "PartitionWriter",
+    "iter_file_range",
+    "parse_byte_range",
+    "split_time_range",
+]
@@ -0,0 +1,371 @@
+"""
+Estatística de streaming para detecção de anomalias
+Estimadores online por série (um valor por bucket de rollup fechado):
+
+- EWMA da média e da variância (West/Finch)
+- média/variância da janela móvel via Welford (com remoção do mais antigo)
+- linha de base sazonal: EWMA por posição no ciclo (hora do dia, dia da
+  semana), com a escala dada pela variância exponencial dos resíduos de todas
+  as posições (estável mesmo com poucas observações por posição)
+- z-score robusto pela mediana e MAD da janela
+
+Cada valor é pontuado com o estado *anterior* a ele e só depois incorporado,
+então a detecção incremental não relê o histórico. ``score_series`` faz o
+mesmo cálculo vetorizado com NumPy (backfill de séries novas) e devolve o
+estado final, idêntico ao que a atualização ponto a ponto produziria.
+"""
+
+import math
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Período sazonal por resolução de rollup (None = sem sazonalidade)
+SEASONAL_PERIODS: Dict[str, Optional[int]] = {"1m": None, "1h": 24, "1d": 7}
+
+# Fator de consistência do MAD para a distribuição normal
+_MAD_SCALE = 1.4826
+_MAX_Z = 1e6
+
+
+def season_slot(bucket: datetime, resolution: str) -> Optional[int]:
+    """Posição do bucket no ciclo sazonal da resolução"""
+    if resolution == "1h":
+        return bucket.hour
+    if resolution == "1d":
+        return bucket.weekday()
+    return None
+
+
+@dataclass
+class DetectorConfig:
+    alpha: float = 0.1  # suavização do EWMA
+    seasonal_alpha: float = 0.2  # suavização de cada posição sazonal
+    residual_alpha: float = 0.05  # suavização da variância dos resíduos sazonais
+    window: int = 48  # buckets da janela móvel (Welford, mediana/MAD)
+    min_samples: int = 12  # histórico mínimo antes de pontuar
+    min_seasonal_samples: int = 4  # observações mínimas da posição sazonal
+    threshold: float = 3.5  # |score| a partir do qual o valor é anômalo
+
+
+@dataclass
+class AnomalyScore:
+    """Pontuação de um valor contra o estado anterior a ele"""
+
+    value: float
+    expected: Optional[float]
+    ewma_z: Optional[float]
+    rolling_z: Optional[float]
+    seasonal_z: Optional[float]
+    robust_z: Optional[float]
+    score: Optional[float]
+    is_anomaly: bool
+
+    @property
+    def direction(self) -> Optional[str]:
+        if self.score is None:
+            return None
+        return "up" if self.score > 0 else "down"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {**asdict(self), "direction": self.direction}
+
+
+def _z(deviation: float, scale: float, reference: float) -> float:
+    # Piso relativo: série constante + salto vira z alto, mas finito
+    floor = 1e-9 + 1e-6 * abs(reference)
+    return float(np.clip(deviation / max(scale, floor), -_MAX_Z, _MAX_Z))
+
+
+def _combine(robust_z: Optional[float], seasonal_z: Optional[float]) -> Optional[float]:
+    """
+    Com a linha de base sazonal pronta, o score é o z sazonal: um vale
+    noturno é incomum na janela, mas normal para a hora. Sem ela, o z
+    robusto da janela (mediana/MAD), insensível a picos anteriores.
+    """
+    return seasonal_z if seasonal_z is not None else robust_z
+
+
+@dataclass
+class DetectorState:
+    """Estado serializável (JSON) dos estimadores de uma série"""
+
+    count: int = 0
+    ewma: float = 0.0
+    ewm_var: float = 0.0
+    window: List[float] = field(default_factory=list)
+    rolling_mean: float = 0.0
+    rolling_m2: float = 0.0
+    seasonal: Dict[str, List[float]] = field(default_factory=dict)  # posição -> [n, média]
+    residual_var: float = 0.0
+    residual_count: int = 0
+    last_bucket: Optional[str] = None
+    last_score: Optional[float] = None
+
+    def score(self, value: float, slot: Optional[int], config: DetectorConfig) -> AnomalyScore:
+        if self.count < config.min_samples or not self.window:
+            return AnomalyScore(value, None, None, None, None, None, None, False)
+        ewma_z = _z(value - self.ewma, math.sqrt(self.ewm_var), self.ewma)
+        n = len(self.window)
+        rolling_z = _z(value - self.rolling_mean, math.sqrt(max(self.rolling_m2, 0.0) / n), self.rolling_mean)
+        window = np.asarray(self.window)
+        median = float(np.median(window))
+        mad = float(np.median(np.abs(window - median)))
+        robust_z = _z(value - median, _MAD_SCALE * mad, median)
+
+        seasonal_z = None
+        expected = median
+        stats = self.seasonal.get(str(slot)) if slot is not None else None
+        if (
+            stats is not None
+            and stats[0] >= config.min_seasonal_samples
+            and self.residual_count >= config.min_samples
+        ):
+            seasonal_z = _z(value - stats[1], math.sqrt(self.residual_var), stats[1])
+            expected = stats[1]
+        score = _combine(robust_z, seasonal_z)
+        return AnomalyScore(
+            value, expected, ewma_z, rolling_z, seasonal_z, robust_z, score, abs(score) >= config.threshold
+        )
+
+    def update(self, value: float, slot: Optional[int], config: DetectorConfig) -> AnomalyScore:
+        """Pontua ``value`` e o incorpora ao estado"""
+        result = self.score(value, slot, config)
+
+        if self.count == 0:
+            self.ewma, self.ewm_var = value, 0.0
+        else:
+            delta = value - self.ewma
+            self.ewma += config.alpha * delta
+            self.ewm_var = (1 - config.alpha) * (self.ewm_var + config.alpha * delta * delta)
+
+        # Welford com remoção: a janela mantém só os últimos ``window`` valores
+        self.window.append(value)
+        n = len(self.window)
+        delta = value - self.rolling_mean
+        self.rolling_mean += delta / n
+        self.rolling_m2 += delta * (value - self.rolling_mean)
+        if n > config.window:
+            oldest = self.window.pop(0)
+            n -= 1
+            delta = oldest - self.rolling_mean
+            self.rolling_mean -= delta / n
+            self.rolling_m2 -= delta * (oldest - self.rolling_mean)
+
+        if slot is not None:
+            key = str(slot)
+            seen, mean = self.seasonal.get(key, (0, 0.0))
+            if seen == 0:
+                mean = value
+            else:
+                residual = value - mean
+                squared = residual * residual
+                if self.residual_count == 0:
+                    self.residual_var = squared
+                else:
+                    self.residual_var += config.residual_alpha * (squared - self.residual_var)
+                self.residual_count += 1
+                mean += config.seasonal_alpha * residual
+            self.seasonal[key] = [seen + 1, mean]
+
+        self.count += 1
+        self.last_score = result.score
+        return result
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "DetectorState":
+        return cls(**data)
+
+
+# ==================== VETORIZADO ====================
+
+
+def _linear_recurrence(decay: float, inputs: np.ndarray) -> np.ndarray:
+    """
+    ``y[t] = decay * y[t-1] + inputs[t]`` (``y[-1] = 0``) em blocos: dentro
+    de um bloco a soma é um cumsum ponderado por ``decay^-j``, com o bloco
+    limitado para que os pesos fiquem abaixo de 1e8.
+    """
+    n = inputs.size
+    output = np.empty(n)
+    if n == 0:
+        return output
+    if decay <= 0.0:
+        return inputs.astype(np.float64).copy()
+    block = max(1, int(8 * math.log(10) / -math.log(decay))) if decay < 1.0 else n
+    carry = 0.0
+    for start in range(0, n, block):
+        chunk = inputs[start : start + block]
+        powers = decay ** np.arange(1, chunk.size + 1)
+        inverse = decay ** -np.arange(chunk.size)
+        values = powers / decay * np.cumsum(chunk * inverse) + powers * carry
+        output[start : start + chunk.size] = values
+        carry = values[-1]
+    return output
+
+
+def _ewm(values: np.ndarray, alpha: float) -> Tuple[np.ndarray, np.ndarray]:
+    """Média e variância exponenciais após cada ponto (iniciadas no primeiro valor)"""
+    decay = 1.0 - alpha
+    inputs = alpha * values
+    inputs[:1] = values[:1]
+    mean = _linear_recurrence(decay, inputs)
+    previous = np.concatenate(([values[0]], mean[:-1])) if values.size else mean
+    delta = values - previous
+    variance = _linear_recurrence(decay, decay * alpha * delta * delta)
+    return mean, variance
+
+
+def _shift(values: np.ndarray) -> np.ndarray:
+    """Valor anterior a cada ponto (NaN no primeiro)"""
+    return np.concatenate(([np.nan], values[:-1]))
+
+
+def _z_array(deviation: np.ndarray, scale: np.ndarray, reference: np.ndarray) -> np.ndarray:
+    floor = 1e-9 + 1e-6 * np.abs(reference)
+    return np.clip(deviation / np.maximum(scale, floor), -_MAX_Z, _MAX_Z)
+
+
+def score_series(
+    values: Sequence[float], slots: Sequence[Optional[int]], config: DetectorConfig
+) -> Tuple[List[AnomalyScore], DetectorState]:
+    """
+    Pontua uma série inteira a partir de um estado vazio (vetorizado) e
+    devolve o estado final, pronto para continuar com ``DetectorState.update``
+    """
+    x = np.asarray(values, dtype=np.float64)
+    n = x.size
+    state = DetectorState()
+    if n == 0:
+        return [], state
+    index = np.arange(n)
+    scored = index >= config.min_samples
+
+    mean, variance = _ewm(x.copy(), config.alpha)
+    ewma_z = _z_array(x - _shift(mean), np.sqrt(np.maximum(_shift(variance), 0.0)), _shift(mean))
+
+    # Janela anterior a cada ponto: x[max(0, t - W):t]
+    W = config.window
+    shifted = x - x[0]  # reduz cancelamento nas somas acumuladas
+    sums = np.concatenate(([0.0], np.cumsum(shifted)))
+    squares = np.concatenate(([0.0], np.cumsum(shifted * shifted)))
+    lower = np.maximum(index - W, 0)
+    counts = np.maximum(index - lower, 1)
+    window_mean = (sums[index] - sums[lower]) / counts
+    window_var = np.maximum((squares[index] - squares[lower]) / counts - window_mean**2, 0.0)
+    window_mean += x[0]
+    rolling_z = _z_array(x - window_mean, np.sqrt(window_var), window_mean)
+
+    medians = np.full(n, np.nan)
+    mads = np.full(n, np.nan)
+    first = max(config.min_samples, 1)
+    for t in range(first, min(W, n)):
+        window = x[:t]
+        medians[t] = np.median(window)
+        mads[t] = np.median(np.abs(window - medians[t]))
+    if n > W:
+        windows = np.lib.stride_tricks.sliding_window_view(x[:-1], W)
+        full = np.median(windows, axis=1)
+        medians[W:] = full
+        mads[W:] = np.median(np.abs(windows - full[:, None]), axis=1)
+    robust_z = _z_array(x - medians, _MAD_SCALE * mads, medians)
+
+    # Média sazonal anterior a cada ponto e quantas vezes a posição já apareceu
+    seasonal_mean = np.full(n, np.nan)
+    seen = np.zeros(n, dtype=np.int64)
+    slot_array = np.array([-1 if slot is None else slot for slot in slots])
+    for slot in np.unique(slot_array[slot_array >= 0]):
+        positions = np.flatnonzero(slot_array == slot)
+        slot_mean, _ = _ewm(x[positions].copy(), config.seasonal_alpha)
+        seasonal_mean[positions] = _shift(slot_mean)
+        seen[positions] = np.arange(positions.size)
+        state.seasonal[str(int(slot))] = [int(positions.size), float(slot_mean[-1])]
+
+    # Variância exponencial dos resíduos (pontos cuja posição já tinha média)
+    has_residual = seen >= 1
+    residuals = x[has_residual] - seasonal_mean[has_residual]
+    residual_var = _ewm(residuals * residuals, config.residual_alpha)[0] if residuals.size else residuals
+    residuals_before = np.cumsum(has_residual) - has_residual
+    var_before = np.full(n, np.nan)
+    known = residuals_before > 0
+    var_before[known] = residual_var[residuals_before[known] - 1]
+    ready = (seen >= config.min_seasonal_samples) & (residuals_before >= config.min_samples)
+    seasonal_z = np.full(n, np.nan)
+    seasonal_z[ready] = _z_array(
+        x[ready] - seasonal_mean[ready], np.sqrt(var_before[ready]), seasonal_mean[ready]
+    )
+    if residuals.size:
+        state.residual_var = float(residual_var[-1])
+        state.residual_count = int(residuals.size)
+
+    results = []
+    for t in range(n):
+        if not scored[t]:
+            results.append(AnomalyScore(float(x[t]), None, None, None, None, None, None, False))
+            continue
+        seasonal = None if np.isnan(seasonal_z[t]) else float(seasonal_z[t])
+        robust = float(robust_z[t])
+        score = _combine(robust, seasonal)
+        expected = float(medians[t]) if seasonal is None else float(seasonal_mean[t])
+        results.append(
+            AnomalyScore(
+                float(x[t]),
+                expected,
+                float(ewma_z[t]),
+                float(rolling_z[t]),
+                seasonal,
+                robust,
+                score,
+                abs(score) >= config.threshold,
+            )
+        )
+
+    tail = x[-W:]
+    state.count = n
+    state.ewma = float(mean[-1])
+    state.ewm_var = float(variance[-1])
+    state.window = tail.tolist()
+    state.rolling_mean = float(tail.mean())
+    state.rolling_m2 = float(((tail - tail.mean()) ** 2).sum())
+    state.last_score = results[-1].score
+    return results, state
+
+
+# ==================== TENDÊNCIA ====================
+
+
+def trend_summary(values: Sequence[float], stable_percent: float = 5.0) -> Optional[Dict[str, Any]]:
+    """
+    Tendência linear (mínimos quadrados) de uma série: inclinação por
+    bucket, variação percentual entre os extremos da reta ajustada e R²
+    """
+    y = np.asarray(values, dtype=np.float64)
+    if y.size < 3:
+        return None
+    x = np.arange(y.size, dtype=np.float64)
+    slope, intercept = np.polyfit(x, y, 1)
+    fitted = slope * x + intercept
+    residual = float(((y - fitted) ** 2).sum())
+    total = float(((y - y.mean()) ** 2).sum())
+    start, end = float(fitted[0]), float(fitted[-1])
+    change = (end - start) / abs(start) * 100 if abs(start) > 1e-12 else None
+    if change is None:
+        direction = "increasing" if slope > 0 else "decreasing" if slope < 0 else "stable"
+    elif abs(change) < stable_percent:
+        direction = "stable"
+    else:
+        direction = "increasing" if change > 0 else "decreasing"
+    return {
+        "trend": direction,
+        "change_percent": round(change, 2) if change is not None else None,
+        "slope": float(slope),
+        "r_squared": round(1 - residual / total, 4) if total > 0 else 1.0,
+        "start_value": start,
+        "end_value": end,
+        "points": int(y.size),
+    }
@@ -0,0 +1,442 @@
+"""
+Exportação em massa
+Arquivos de partição (um intervalo de tempo cada) gravados em streaming com
+memória limitada, checksum SHA-256 calculado durante a escrita e um manifesto
+que permite retomar só as partições que falharam.
+
+Formatos: ``csv`` e ``jsonl`` (gzip, zstd ou sem compressão) e ``parquet``
+(compressão interna do arquivo). Partições CSV/JSONL comprimidas com gzip ou
+zstd podem ser concatenadas (membros/frames consecutivos formam um arquivo
+válido e o cabeçalho CSV só existe na partição 0), então o download completo
+é a concatenação das partições na ordem e aceita requisições ``Range``.
+"""
+
+import csv
+import gzip
+import hashlib
+import io
+import json
+import os
+from dataclasses import asdict, dataclass, field
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from synapse.core.analytics.spool import encode_value
+
+EXPORT_FORMATS = {"csv": ".csv", "jsonl": ".jsonl", "parquet": ".parquet"}
+EXPORT_COMPRESSIONS = {"gzip": ".gz", "zstd": ".zst", "none": ""}
+
+# Tipos de export_type aceitos como sinônimos
+FORMAT_ALIASES = {"json": "jsonl", "ndjson": "jsonl"}
+
+_GZIP_LEVEL = 6
+_ZSTD_LEVEL = 3
+_CHUNK_SIZE = 1 << 16
+
+
+class ExportFormatError(ValueError):
+    """Formato/compressão desconhecido ou dependência opcional ausente"""
+
+
+def normalize_format(export_type: str) -> str:
+    fmt = FORMAT_ALIASES.get(export_type, export_type)
+    if fmt not in EXPORT_FORMATS:
+        raise ExportFormatError(f"Formato não suportado pelo motor de exportação: {export_type}")
+    return fmt
+
+
+def partition_suffix(fmt: str, compression: str) -> str:
+    if compression not in EXPORT_COMPRESSIONS:
+        raise ExportFormatError(f"Compressão não suportada: {compression}")
+    if fmt == "parquet":
+        return EXPORT_FORMATS[fmt]
+    return EXPORT_FORMATS[fmt] + EXPORT_COMPRESSIONS[compression]
+
+
+def split_time_range(start: datetime, end: datetime, span: timedelta) -> List[Tuple[datetime, datetime]]:
+    """Divide ``[start, end)`` em intervalos consecutivos de até ``span``"""
+    if span <= timedelta(0):
+        raise ValueError("O tamanho da partição deve ser positivo")
+    ranges = []
+    cursor = start
+    while cursor < end:
+        upper = min(cursor + span, end)
+        ranges.append((cursor, upper))
+        cursor = upper
+    return ranges
+
+
+# ==================== MANIFESTO ====================
+
+
+@dataclass
+class ExportPartition:
+    index: int
+    start: Optional[str]
+    end: Optional[str]
+    status: str = "pending"  # pending, completed, failed
+    file: Optional[str] = None
+    rows: int = 0
+    bytes: int = 0
+    sha256: Optional[str] = None
+    seconds: float = 0.0
+    worker: Optional[str] = None
+    error: Optional[str] = None
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds > 0 else 0.0
+
+
+@dataclass
+class ExportManifest:
+    """Partições de uma exportação (guardado em analytics_exports.manifest)"""
+
+    format: str
+    compression: str
+    columns: List[str]
+    partitions: List[ExportPartition] = field(default_factory=list)
+
+    @property
+    def rows(self) -> int:
+        return sum(partition.rows for partition in self.partitions if partition.status == "completed")
+
+    @property
+    def bytes(self) -> int:
+        return sum(partition.bytes for partition in self.partitions if partition.status == "completed")
+
+    @property
+    def is_complete(self) -> bool:
+        return all(partition.status == "completed" for partition in self.partitions)
+
+    @property
+    def concatenable(self) -> bool:
+        return self.format != "parquet"
+
+    @property
+    def etag(self) -> str:
+        """Identifica o conteúdo completo (checksums das partições, em ordem)"""
+        digest = hashlib.sha256()
+        for partition in self.partitions:
+            digest.update((partition.sha256 or "").encode())
+        return digest.hexdigest()
+
+    def progress(self) -> float:
+        if not self.partitions:
+            return 100.0
+        done = sum(1 for partition in self.partitions if partition.status == "completed")
+        return round(done / len(self.partitions) * 100, 1)
+
+    def worker_throughput(self) -> Dict[str, Dict[str, float]]:
+        """Linhas, segundos e linhas/s por worker (partições concluídas)"""
+        workers: Dict[str, Dict[str, float]] = {}
+        for partition in self.partitions:
+            if partition.status != "completed" or not partition.worker:
+                continue
+            stats = workers.setdefault(partition.worker, {"partitions": 0, "rows": 0, "seconds": 0.0})
+            stats["partitions"] += 1
+            stats["rows"] += partition.rows
+            stats["seconds"] += partition.seconds
+        for stats in workers.values():
+            stats["seconds"] = round(stats["seconds"], 3)
+            stats["rows_per_second"] = round(stats["rows"] / stats["seconds"], 1) if stats["seconds"] else 0.0
+        return workers
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "format": self.format,
+            "compression": self.compression,
+            "columns": self.columns,
+            "partitions": [asdict(partition) for partition in self.partitions],
+            "rows": self.rows,
+            "bytes": self.bytes,
+            "workers": self.worker_throughput(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ExportManifest":
+        return cls(
+            format=data["format"],
+            compression=data["compression"],
+            columns=list(data["columns"]),
+            partitions=[ExportPartition(**partition) for partition in data.get("partitions", [])],
+        )
+
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        while chunk := handle.read(_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def verify_partition(base_path: Path, partition: ExportPartition) -> bool:
+    """Partição concluída cujo arquivo ainda existe com o tamanho e o checksum do manifesto"""
+    if partition.status != "completed" or not partition.file:
+        return False
+    path = Path(base_path) / partition.file
+    try:
+        if path.stat().st_size != partition.bytes:
+            return False
+    except FileNotFoundError:
+        return False
+    return file_sha256(path) == partition.sha256
+
+
+# ==================== ESCRITA ====================
+
+
+class _HashingWriter(io.RawIOBase):
+    """Arquivo binário que acumula SHA-256 e tamanho do que é gravado"""
+
+    def __init__(self, handle):
+        self._handle = handle
+        self.digest = hashlib.sha256()
+        self.size = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        view = memoryview(data)
+        self._handle.write(view)
+        self.digest.update(view)
+        self.size += view.nbytes
+        return view.nbytes
+
+    def tell(self) -> int:
+        return self.size
+
+    def flush(self) -> None:
+        if not self._handle.closed:
+            self._handle.flush()
+
+
+def _compressor(raw, compression: str):
+    if compression == "gzip":
+        return gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=_GZIP_LEVEL, mtime=0)
+    if compression == "zstd":
+        try:
+            import zstandard
+        except ImportError:
+            raise ExportFormatError("Compressão zstd requer o pacote 'zstandard'")
+        return zstandard.ZstdCompressor(level=_ZSTD_LEVEL).stream_writer(raw, closefd=False)
+    return None
+
+
+def _arrow_type(python_type: Optional[type]):
+    import pyarrow as pa
+
+    if python_type is bool:
+        return pa.bool_()
+    if python_type is int:
+        return pa.int64()
+    if python_type in (float, Decimal):
+        return pa.float64()
+    if python_type is datetime:
+        return pa.timestamp("us", tz="UTC")
+    if python_type is date:
+        return pa.date32()
+    return pa.string()
+
+
+def _arrow_value(value: Any, python_type: Optional[type]) -> Any:
+    if value is None:
+        return None
+    if python_type in (float, Decimal):
+        return float(value)
+    if python_type in (bool, int, datetime, date):
+        return value
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, default=str)
+    return str(encode_value(value))
+
+
+class PartitionWriter:
+    """
+    Grava uma partição em ``path`` (via arquivo temporário). ``stream`` é o
+    destino binário já comprimido, usado diretamente pelo ``COPY TO STDOUT``.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        columns: Sequence[str],
+        fmt: str,
+        compression: str,
+        header: bool = True,
+        column_types: Optional[Sequence[Optional[type]]] = None,
+    ):
+        self.path = Path(path)
+        self.columns = list(columns)
+        self.format = fmt
+        self.rows = 0
+        self._temporary = self.path.with_name(self.path.name + ".tmp")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._handle = open(self._temporary, "wb")
+        self._raw = _HashingWriter(self._handle)
+        self._compressed = None
+        self._text = None
+        self._parquet = None
+        if fmt == "parquet":
+            try:
+                import pyarrow as pa
+                import pyarrow.parquet as pq
+            except ImportError:
+                self._abort()
+                raise ExportFormatError("Exportação parquet requer o pacote 'pyarrow'")
+            self._types = list(column_types or [None] * len(self.columns))
+            self._schema = pa.schema(
+                [(name, _arrow_type(python_type)) for name, python_type in zip(self.columns, self._types)]
+            )
+            codec = compression if compression != "none" else "none"
+            self._parquet = pq.ParquetWriter(self._raw, self._schema, compression=codec)
+            return
+        try:
+            self._compressed = _compressor(self._raw, compression)
+        except ExportFormatError:
+            self._abort()
+            raise
+        target = self._compressed or self._raw
+        self._text = io.TextIOWrapper(target, encoding="utf-8", newline="", write_through=True)
+        if fmt == "csv":
+            self._csv = csv.writer(self._text)
+            if header:
+                self._csv.writerow(self.columns)
+
+    @property
+    def stream(self):
+        """Destino binário (comprimido) para escrita direta, p.ex. COPY"""
+        return self._compressed or self._raw
+
+    def write_rows(self, rows: Sequence[Sequence[Any]]) -> None:
+        if not rows:
+            return
+        if self._parquet is not None:
+            import pyarrow as pa
+
+            arrays = [
+                pa.array([_arrow_value(row[index], self._types[index]) for row in rows], type=self._schema.field(index).type)
+                for index in range(len(self.columns))
+            ]
+            self._parquet.write_table(pa.Table.from_arrays(arrays, schema=self._schema))
+        elif self.format == "csv":
+            self._csv.writerows([[encode_value(value) for value in row] for row in rows])
+        else:
+            columns = self.columns
+            self._text.write(
+                "".join(json.dumps(dict(zip(columns, map(encode_value, row))), default=str) + "\n" for row in rows)
+            )
+        self.rows += len(rows)
+
+    def commit(self) -> Tuple[int, str]:
+        """Fecha, move para o nome final e devolve (bytes, sha256)"""
+        if self._parquet is not None:
+            self._parquet.close()
+        if self._text is not None:
+            self._text.flush()
+            self._text.detach()
+        if self._compressed is not None:
+            self._compressed.close()
+        self._handle.flush()
+        os.fsync(self._handle.fileno())
+        self._handle.close()
+        os.replace(self._temporary, self.path)
+        return self._raw.size, self._raw.digest.hexdigest()
+
+    def _abort(self) -> None:
+        self._handle.close()
+        self._temporary.unlink(missing_ok=True)
+
+    def abort(self) -> None:
+        try:
+            if self._compressed is not None:
+                self._compressed.close()
+        except Exception:
+            pass
+        self._abort()
+
+
+def write_manifest_file(base_path: Path, directory: str, export_id: Any, manifest: ExportManifest) -> str:
+    """Grava ``manifest.json`` (arquivos, linhas e SHA-256) ao lado das partições"""
+    relative = f"{directory}/manifest.json"
+    path = Path(base_path) / relative
+    path.parent.mkdir(parents=True, exist_ok=True)
+    document = {
+        "export_id": str(export_id),
+        "generated_at": datetime.utcnow().isoformat(),
+        "format": manifest.format,
+        "compression": manifest.compression,
+        "columns": manifest.columns,
+        "rows": manifest.rows,
+        "bytes": manifest.bytes,
+        "files": [
+            {
+                "file": Path(partition.file).name,
+                "start": partition.start,
+                "end": partition.end,
+                "rows": partition.rows,
+                "bytes": partition.bytes,
+                "sha256": partition.sha256,
+            }
+            for partition in manifest.partitions
+        ],
+    }
+    temporary = path.with_name(path.name + ".tmp")
+    temporary.write_text(json.dumps(document, indent=2))
+    os.replace(temporary, path)
+    return relative
+
+
+# ==================== DOWNLOAD ====================
+
+
+def parse_byte_range(header: Optional[str], total: int) -> Optional[Tuple[int, int]]:
+    """
+    ``Range: bytes=a-b`` -> (início, fim inclusive). ``None`` quando o
+    cabeçalho está ausente ou pede vários intervalos (resposta completa);
+    ``ValueError`` quando o intervalo não é satisfazível.
+    """
+    if not header or not header.startswith("bytes=") or "," in header:
+        return None
+    first, _, last = header[len("bytes=") :].strip().partition("-")
+    try:
+        if first == "":
+            length = int(last)
+            if length <= 0:
+                raise ValueError
+            start, end = max(0, total - length), total - 1
+        else:
+            start = int(first)
+            end = min(int(last), total - 1) if last else total - 1
+    except ValueError:
+        raise ValueError("Range inválido")
+    if start >= total or start > end:
+        raise ValueError("Range fora do arquivo")
+    return start, end
+
+
+def iter_file_range(
+    files: Sequence[Tuple[Path, int]], start: int = 0, end: Optional[int] = None, chunk_size: int = _CHUNK_SIZE
+) -> Iterator[bytes]:
+    """Bytes ``[start, end]`` da concatenação de ``files`` (caminho, tamanho)"""
+    total = sum(size for _, size in files)
+    end = total - 1 if end is None else end
+    offset = 0
+    for path, size in files:
+        file_start, file_end = offset, offset + size - 1
+        offset += size
+        if file_end < start or file_start > end:
+            continue
+        with open(path, "rb") as handle:
+            handle.seek(max(start - file_start, 0))
+            remaining = min(end, file_end) - max(start, file_start) + 1
+            while remaining > 0:
+                chunk = handle.read(min(chunk_size, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                yield chunk
@@ -0,0 +1,49 @@
+"""
+Downsampling de séries temporais para gráficos
+Largest-Triangle-Three-Buckets (LTTB): mantém a forma visual da série com um
+número fixo de pontos, preservando picos e vales
+"""
+
+import numpy as np
+
+
+def lttb_indices(x, y, threshold: int) -> np.ndarray:
+    """
+    Índices dos pontos selecionados pelo LTTB (sempre inclui o primeiro e o último).
+
+    ``x`` deve estar ordenado; se a série já couber em ``threshold`` todos os
+    índices são retornados.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    size = len(x)
+    if threshold >= size or threshold < 3:
+        return np.arange(size) if threshold >= size else np.array([0, size - 1][:threshold])
+
+    # Buckets internos (o primeiro e o último ponto ficam fixos)
+    edges = np.linspace(1, size - 1, threshold - 1).astype(np.int64)
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = size - 1
+
+    previous = 0
+    for bucket in range(threshold - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        if bucket + 2 < len(edges):
+            next_start, next_end = edges[bucket + 1], edges[bucket + 2]
+            avg_x = x[next_start:next_end].mean()
+            avg_y = y[next_start:next_end].mean()
+        else:
+            avg_x, avg_y = x[-1], y[-1]
+
+        px, py = x[previous], y[previous]
+        areas = np.abs((px - avg_x) * (y[start:end] - py) - (px - x[start:end]) * (avg_y - py))
+        previous = start + int(areas.argmax())
+        selected[bucket + 1] = previous
+    return selected
+
+
+def lttb(x, y, threshold: int) -> tuple[np.ndarray, np.ndarray]:
+    """Retorna a série (x, y) reduzida a no máximo ``threshold`` pontos"""
+    indices = lttb_indices(x, y, threshold)
+    return np.asarray(x)[indices], np.asarray(y)[indices]
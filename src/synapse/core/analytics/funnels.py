@@ -0,0 +1,301 @@
+"""
+Motor de funis e coortes
+Funis ordenados com janela de conversão e matrizes de retenção calculados em
+uma única passada sobre os eventos, de duas formas equivalentes:
+
+- plano SQL com funções de janela (executado no banco, uma leitura da tabela)
+- máquina de estados vetorizada em NumPy sobre as sequências ordenadas por usuário
+
+Semântica do funil (igual à ``windowFunnel`` do ClickHouse): um usuário
+alcança o passo k se existe uma cadeia de eventos dos passos 0..k em ordem,
+com o último evento ocorrendo até ``window`` segundos após o primeiro. A
+cadeia sempre parte do início mais recente possível, o que maximiza o passo
+alcançado.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+from sqlalchemy import and_, case, distinct, func, select
+
+DEFAULT_RESULT_TTL_SECONDS = 300
+
+
+@dataclass
+class FunnelStepResult:
+    """Resultado de um passo do funil"""
+
+    name: str
+    users: int
+    conversion_rate: float  # em relação ao passo anterior (%)
+    overall_rate: float  # em relação ao primeiro passo (%)
+    avg_seconds_to_step: Optional[float] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "step": self.name,
+            "user_count": self.users,
+            "conversion_rate": self.conversion_rate,
+            "overall_rate": self.overall_rate,
+            "avg_seconds_to_step": self.avg_seconds_to_step,
+        }
+
+
+@dataclass
+class RetentionMatrix:
+    """Matriz de retenção: ``rates[i][j]`` = % da coorte i ativa no período j"""
+
+    cohort_labels: List[Any]
+    cohort_sizes: List[int]
+    rates: List[List[Optional[float]]] = field(default_factory=list)
+
+
+def build_step_results(
+    names: Sequence[str], counts: Sequence[int], avg_seconds: Optional[Sequence[Optional[float]]] = None
+) -> List[FunnelStepResult]:
+    results = []
+    first = counts[0] if counts else 0
+    for index, (name, users) in enumerate(zip(names, counts)):
+        previous = counts[index - 1] if index else users
+        results.append(
+            FunnelStepResult(
+                name=name,
+                users=int(users),
+                conversion_rate=round(users / previous * 100, 2) if previous else 0.0,
+                overall_rate=round(users / first * 100, 2) if first else 0.0,
+                avg_seconds_to_step=(
+                    round(float(avg_seconds[index]), 2)
+                    if avg_seconds is not None and avg_seconds[index] is not None
+                    else None
+                ),
+            )
+        )
+    return results
+
+
+# ==================== MOTOR VETORIZADO ====================
+
+
+def funnel_from_arrays(
+    user_codes: np.ndarray,
+    timestamps: np.ndarray,
+    step_masks: np.ndarray,
+    window_seconds: float,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Calcula o funil sobre arrays de eventos.
+
+    ``user_codes`` (inteiros), ``timestamps`` (segundos) e ``step_masks``
+    (bool, passos × eventos; um evento pode casar com vários passos).
+    Retorna (usuários por passo, tempo médio até cada passo em segundos).
+
+    Para cada passo k, cada evento do passo busca (searchsorted) o último
+    evento válido do passo k-1 anterior a ele na ordem (usuário, tempo); a
+    cadeia herda o início desse evento se couber na janela.
+    """
+    n_steps = step_masks.shape[0]
+    counts = np.zeros(n_steps, dtype=np.int64)
+    avg_seconds = np.full(n_steps, np.nan)
+    if not len(user_codes):
+        return counts, avg_seconds
+
+    order = np.lexsort((timestamps, user_codes))
+    users = np.asarray(user_codes)[order]
+    times = np.asarray(timestamps, dtype=np.float64)[order]
+    masks = np.asarray(step_masks, dtype=bool)[:, order]
+
+    valid_pos = np.flatnonzero(masks[0])
+    valid_start = times[valid_pos]
+    counts[0] = np.unique(users[valid_pos]).size
+    avg_seconds[0] = 0.0 if valid_pos.size else np.nan
+
+    for step in range(1, n_steps):
+        if not valid_pos.size:
+            break
+        positions = np.flatnonzero(masks[step])
+        previous = np.searchsorted(valid_pos, positions, side="left") - 1
+        has_previous = previous >= 0
+        previous = np.where(has_previous, previous, 0)
+        same_user = has_previous & (users[valid_pos[previous]] == users[positions])
+        starts = valid_start[previous]
+        ok = same_user & (times[positions] - starts <= window_seconds)
+
+        valid_pos = positions[ok]
+        valid_start = starts[ok]
+        if not valid_pos.size:
+            break
+
+        step_users = users[valid_pos]
+        durations = times[valid_pos] - valid_start
+        # Menor tempo até o passo por usuário (valid_pos está ordenado por usuário)
+        boundaries = np.flatnonzero(np.r_[True, step_users[1:] != step_users[:-1]])
+        per_user = np.minimum.reduceat(durations, boundaries)
+        counts[step] = boundaries.size
+        avg_seconds[step] = per_user.mean()
+
+    return counts, avg_seconds
+
+
+def retention_from_arrays(
+    user_codes: np.ndarray,
+    cohort_periods: np.ndarray,
+    activity_periods: np.ndarray,
+    cohort_sizes: Dict[int, int],
+    periods: int,
+) -> RetentionMatrix:
+    """
+    Matriz de retenção a partir de eventos já mapeados para índices de período:
+    conta usuários distintos por (coorte, períodos desde a coorte)
+    """
+    cohorts = sorted(cohort_sizes)
+    index = {cohort: row for row, cohort in enumerate(cohorts)}
+    active = np.zeros((len(cohorts), periods), dtype=np.int64)
+
+    offsets = np.asarray(activity_periods) - np.asarray(cohort_periods)
+    keep = (offsets >= 0) & (offsets < periods)
+    if keep.any():
+        key = np.stack(
+            [np.asarray(cohort_periods)[keep], offsets[keep], np.asarray(user_codes)[keep]], axis=1
+        )
+        unique = np.unique(key, axis=0)
+        pairs, counts = np.unique(unique[:, :2], axis=0, return_counts=True)
+        for (cohort, offset), count in zip(pairs.tolist(), counts.tolist()):
+            if cohort in index:
+                active[index[cohort], offset] = count
+
+    return _retention_matrix(cohorts, [cohort_sizes[c] for c in cohorts], active)
+
+
+def _retention_matrix(cohorts, sizes, active) -> RetentionMatrix:
+    rates = []
+    for row, size in enumerate(sizes):
+        rates.append(
+            [round(float(active[row][col]) / size * 100, 2) if size else None for col in range(len(active[row]))]
+        )
+    return RetentionMatrix(cohort_labels=list(cohorts), cohort_sizes=list(sizes), rates=rates)
+
+
+# ==================== PLANO SQL ====================
+
+
+def build_funnel_select(source, n_steps: int, window_seconds: float):
+    """
+    Plano SQL do funil sobre ``source`` (subquery com ``user_id``, ``ts`` em
+    segundos, ``seq`` para desempate e uma flag ``m{k}`` (0/1) por passo).
+
+    Cada passo é um nível de subquery com uma função de janela
+    ``MAX(inicio_{k-1}) OVER (PARTITION BY user_id ORDER BY ts, seq ROWS
+    UNBOUNDED PRECEDING .. 1 PRECEDING)``; todas usam a mesma ordenação,
+    então o banco lê os eventos uma vez e ordena uma vez por usuário.
+    Retorna um SELECT com ``users_k`` e ``avg_k`` para cada passo.
+    """
+    stage = select(
+        *source.c,
+        case((source.c.m0 == 1, source.c.ts), else_=None).label("start0"),
+    ).subquery("stage0")
+
+    for k in range(1, n_steps):
+        window = func.max(stage.c[f"start{k - 1}"]).over(
+            partition_by=stage.c.user_id,
+            order_by=(stage.c.ts, stage.c.seq),
+            rows=(None, -1),
+        )
+        candidate = select(*stage.c, window.label(f"candidate{k}")).subquery(f"candidate{k}")
+        start = case(
+            (
+                and_(
+                    candidate.c[f"m{k}"] == 1,
+                    candidate.c[f"candidate{k}"].isnot(None),
+                    candidate.c.ts - candidate.c[f"candidate{k}"] <= window_seconds,
+                ),
+                candidate.c[f"candidate{k}"],
+            ),
+            else_=None,
+        )
+        stage = select(*candidate.c, start.label(f"start{k}")).subquery(f"stage{k}")
+
+    # Por usuário: alcançou o passo? menor tempo até ele
+    per_user = (
+        select(
+            stage.c.user_id,
+            *[
+                func.min(stage.c.ts - stage.c[f"start{k}"]).label(f"d{k}")
+                for k in range(n_steps)
+            ],
+        )
+        .group_by(stage.c.user_id)
+        .subquery("per_user")
+    )
+    columns = []
+    for k in range(n_steps):
+        columns.append(func.count(per_user.c[f"d{k}"]).label(f"users_{k}"))
+        columns.append(func.avg(per_user.c[f"d{k}"]).label(f"avg_{k}"))
+    return select(*columns)
+
+
+def build_retention_select(source, cohorts, periods: int):
+    """
+    Plano SQL da retenção: ``source`` tem ``user_id`` e ``period`` (índice
+    do período do evento); ``cohorts`` tem ``user_id`` e ``cohort`` (índice
+    do período da coorte). Retorna (cohort, offset, users).
+    """
+    offset = (source.c.period - cohorts.c.cohort).label("offset")
+    return (
+        select(cohorts.c.cohort, offset, func.count(distinct(source.c.user_id)).label("users"))
+        .select_from(source.join(cohorts, source.c.user_id == cohorts.c.user_id))
+        .where(offset >= 0, offset < periods)
+        .group_by(cohorts.c.cohort, offset)
+    )
+
+
+def retention_from_rows(rows, cohort_sizes: Dict[int, int], periods: int) -> RetentionMatrix:
+    cohorts = sorted(cohort_sizes)
+    index = {cohort: row for row, cohort in enumerate(cohorts)}
+    active = np.zeros((len(cohorts), periods), dtype=np.int64)
+    for cohort, offset, users in rows:
+        if cohort in index:
+            active[index[cohort], int(offset)] = users
+    return _retention_matrix(cohorts, [cohort_sizes[c] for c in cohorts], active)
+
+
+# ==================== CACHE DE RESULTADOS ====================
+
+
+class ResultCache:
+    """Cache LRU com TTL para resultados de funil/coorte (seguro entre threads)"""
+
+    def __init__(self, maxsize: int = 256, ttl: float = DEFAULT_RESULT_TTL_SECONDS):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._items: "OrderedDict[str, tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(kind: str, params: Dict[str, Any]) -> str:
+        payload = json.dumps(params, sort_keys=True, default=str)
+        return f"{kind}:{hashlib.sha256(payload.encode()).hexdigest()[:32]}"
+
+    def get_or_compute(self, key: str, compute: Callable[[], Any]) -> tuple[Any, bool]:
+        now = time.monotonic()
+        with self._lock:
+            item = self._items.get(key)
+            if item is not None and item[0] > now:
+                self._items.move_to_end(key)
+                return item[1], True
+        value = compute()
+        with self._lock:
+            self._items[key] = (now + self.ttl, value)
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+        return value, False
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
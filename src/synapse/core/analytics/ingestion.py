@@ -0,0 +1,704 @@
+"""
+Pipeline de ingestão de eventos de analytics
+Os eventos são validados e enfileirados em um ring buffer limitado (ou em um
+Redis Stream, para durabilidade) e confirmados imediatamente; um flusher em
+background grava eventos e métricas derivadas com INSERT multi-linha a cada
+N ms ou M eventos, com backpressure e contabilização de descartes.
+
+Um lote que falha por erro dos dados é dividido ao meio até isolar as linhas
+com problema, que vão para a fila de rejeitados (dead letter) e são
+confirmadas; falhas transitórias (banco indisponível) devolvem o restante do
+lote para nova tentativa
+"""
+
+import asyncio
+import json
+import logging
+import socket
+import threading
+import time
+import uuid
+from collections import deque
+from collections.abc import Callable, Iterable, Mapping
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from enum import Enum
+from typing import Any
+
+from synapse.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_UUID_COLUMNS = ("id", "user_id", "workspace_id", "project_id", "workflow_id", "tenant_id")
+
+# Referências enviadas pelo cliente que precisam pertencer ao tenant de quem envia
+TENANT_SCOPED_COLUMNS = ("project_id", "workspace_id", "workflow_id")
+
+# Colunas gravadas em analytics_events (todas as linhas têm as mesmas chaves,
+# requisito do executemany multi-linha)
+EVENT_COLUMNS = (
+    "id",
+    "event_id",
+    "event_type",
+    "category",
+    "action",
+    "label",
+    "user_id",
+    "session_id",
+    "anonymous_id",
+    "ip_address",
+    "user_agent",
+    "referrer",
+    "page_url",
+    "properties",
+    "value",
+    "workspace_id",
+    "project_id",
+    "workflow_id",
+    "country",
+    "city",
+    "device_type",
+    "os",
+    "browser",
+    "screen_resolution",
+    "timestamp",
+    "tenant_id",
+)
+
+
+class OverflowPolicy(str, Enum):
+    """O que fazer quando o buffer está cheio"""
+
+    DROP_OLDEST = "drop_oldest"
+    DROP_NEWEST = "drop_newest"
+    REJECT = "reject"
+
+
+class IngestionBackpressure(Exception):
+    """Buffer cheio com política ``reject``: o cliente deve tentar novamente"""
+
+
+@dataclass
+class IngestResult:
+    """Resultado de uma submissão de eventos"""
+
+    accepted: int = 0
+    invalid: int = 0
+    dropped: int = 0
+    buffered: int = 0
+    errors: list[str] = field(default_factory=list)
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass
+class IngestionStats:
+    """Contadores acumulados do pipeline"""
+
+    accepted: int = 0
+    invalid: int = 0
+    dropped: int = 0
+    flushed_events: int = 0
+    flushed_metrics: int = 0
+    flushes: int = 0
+    failed_flushes: int = 0
+    dead_lettered: int = 0
+    last_flush_ms: float = 0.0
+    last_flush_at: str | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+def is_transient_error(error: BaseException) -> bool:
+    """Falha que não depende das linhas (conexão, pool): o lote deve ser tentado de novo"""
+    from sqlalchemy.exc import DBAPIError, DisconnectionError, InterfaceError, OperationalError
+    from sqlalchemy.exc import TimeoutError as PoolTimeout
+
+    if isinstance(error, (DisconnectionError, PoolTimeout, ConnectionError, TimeoutError)):
+        return True
+    if isinstance(error, DBAPIError):
+        return error.connection_invalidated or isinstance(error, (OperationalError, InterfaceError))
+    return False
+
+
+def _as_uuid(value: Any) -> uuid.UUID | None:
+    if value is None or value == "":
+        return None
+    return value if isinstance(value, uuid.UUID) else uuid.UUID(str(value))
+
+
+def build_event_row(
+    event: Any,
+    user_id: Any = None,
+    tenant_id: Any = None,
+    project_id: Any = None,
+    workspace_id: Any = None,
+    allowed_ids: Mapping[str, set] | None = None,
+) -> dict[str, Any]:
+    """
+    Converte um ``EventCreate`` na linha de ``analytics_events``.
+
+    Campos sem coluna própria (event_name, page_title, duration_ms) vão para
+    ``properties``. Com ``allowed_ids`` (ids do tenant por coluna de
+    ``TENANT_SCOPED_COLUMNS``) referências de outro tenant são recusadas.
+    Levanta ``ValueError`` se o evento não puder ser gravado.
+    """
+    properties = dict(event.properties or {})
+    event_type = getattr(event.event_type, "value", event.event_type)
+
+    project_id = _as_uuid(
+        project_id or getattr(event, "project_id", None) or properties.pop("project_id", None)
+    )
+    if project_id is None:
+        raise ValueError("project_id é obrigatório para eventos de analytics")
+
+    for extra in ("event_name", "page_title", "duration_ms"):
+        value = getattr(event, extra, None)
+        if value is not None:
+            properties[extra] = value
+
+    row_id = uuid.uuid4()
+    row = {
+        "id": row_id,
+        "event_id": str(getattr(event, "event_id", None) or row_id),
+        "event_type": event_type,
+        "category": event.event_category or event_type,
+        "action": event.event_action or event.event_name,
+        "label": event.event_label,
+        "user_id": _as_uuid(user_id),
+        "session_id": event.session_id,
+        "anonymous_id": getattr(event, "anonymous_id", None),
+        "ip_address": event.ip_address,
+        "user_agent": event.user_agent,
+        "referrer": event.referrer,
+        "page_url": event.page_url,
+        "properties": properties,
+        "value": event.event_value,
+        "workspace_id": _as_uuid(workspace_id or getattr(event, "workspace_id", None)),
+        "project_id": project_id,
+        "workflow_id": _as_uuid(getattr(event, "workflow_id", None)),
+        "country": event.country,
+        "city": event.city,
+        "device_type": event.device_type,
+        "os": event.os,
+        "browser": event.browser,
+        "screen_resolution": event.screen_resolution,
+        "timestamp": datetime.now(timezone.utc),
+        "tenant_id": _as_uuid(tenant_id),
+    }
+    if allowed_ids is not None:
+        for column in TENANT_SCOPED_COLUMNS:
+            if row[column] is not None and row[column] not in allowed_ids.get(column, ()):
+                raise ValueError(f"{column} {row[column]} não pertence ao tenant")
+    return row
+
+
+def derive_metric_rows(rows: Iterable[dict[str, Any]]) -> list[dict[str, Any]]:
+    """
+    Métricas derivadas do lote: ``page_load_time`` para eventos com duração.
+    System performance metrics exigem tenant, então eventos sem tenant são ignorados.
+    """
+    metrics = []
+    for row in rows:
+        duration = row["properties"].get("duration_ms")
+        if duration is None or row["tenant_id"] is None:
+            continue
+        metrics.append(
+            {
+                "tenant_id": row["tenant_id"],
+                "metric_name": "page_load_time",
+                "metric_type": "timer",
+                "service": "frontend",
+                "environment": settings.ENVIRONMENT,
+                "value": float(duration),
+                "unit": "ms",
+                "tags": {"page_url": row["page_url"], "browser": row["browser"]},
+                "timestamp": row["timestamp"].replace(tzinfo=None),
+            }
+        )
+    return metrics
+
+
+def write_event_batch(events: list[dict[str, Any]], metrics: list[dict[str, Any]]) -> None:
+    """
+    Grava o lote em uma única transação. O executemany do SQLAlchemy 2.0 agrupa
+    as linhas em INSERTs multi-linha; ``event_id`` repetido (reenvio do cliente)
+    é ignorado no PostgreSQL. Os sketches de usuários ativos são atualizados na
+    mesma transação (reprocessar um lote não altera as contagens).
+    """
+    from sqlalchemy import insert
+
+    from synapse.database import get_db_session
+    from synapse.models.analytics import SystemPerformanceMetric
+    from synapse.models.analytics_event import AnalyticsEvent
+    from synapse.services.active_user_service import active_user_service
+
+    with get_db_session() as db:
+        table = AnalyticsEvent.__table__
+        if db.get_bind().dialect.name == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+            statement = pg_insert(table).on_conflict_do_nothing(index_elements=["event_id"])
+        else:
+            statement = insert(table)
+        db.execute(statement, events)
+        if metrics:
+            db.execute(insert(SystemPerformanceMetric.__table__), metrics)
+        active_user_service.record(db, events)
+
+
+class RingBuffer:
+    """Buffer circular limitado e thread-safe (endpoints síncronos rodam em threads)"""
+
+    def __init__(self, capacity: int, policy: OverflowPolicy = OverflowPolicy.DROP_OLDEST):
+        self.capacity = capacity
+        self.policy = OverflowPolicy(policy)
+        self._items: deque = deque()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def put_many(self, rows: list[dict[str, Any]]) -> tuple[int, int]:
+        """Enfileira as linhas e retorna (aceitas, descartadas)"""
+        with self._lock:
+            free = self.capacity - len(self._items)
+            if len(rows) <= free:
+                self._items.extend(rows)
+                return len(rows), 0
+
+            if self.policy is OverflowPolicy.REJECT:
+                raise IngestionBackpressure(
+                    f"Buffer de analytics cheio ({len(self._items)}/{self.capacity})"
+                )
+            if self.policy is OverflowPolicy.DROP_NEWEST:
+                self._items.extend(rows[: max(free, 0)])
+                return max(free, 0), len(rows) - max(free, 0)
+
+            dropped = 0
+            if len(rows) > self.capacity:
+                dropped = len(rows) - self.capacity
+                rows = rows[-self.capacity :]
+            overflow = len(rows) - free
+            for _ in range(overflow):
+                self._items.popleft()
+            self._items.extend(rows)
+            return len(rows), dropped + overflow
+
+    def take(self, limit: int) -> list[dict[str, Any]]:
+        with self._lock:
+            count = min(limit, len(self._items))
+            return [self._items.popleft() for _ in range(count)]
+
+    def requeue(self, rows: list[dict[str, Any]]) -> int:
+        """Devolve um lote que falhou para o início do buffer; retorna os descartados"""
+        with self._lock:
+            free = self.capacity - len(self._items)
+            kept = rows[: max(free, 0)]
+            self._items.extendleft(reversed(kept))
+            return len(rows) - len(kept)
+
+
+class RedisStreamBuffer:
+    """
+    Buffer durável em Redis Stream: eventos sobrevivem a reinícios e só são
+    removidos (XACK + XDEL) depois de gravados no banco.
+
+    Cada worker lê com um nome de consumidor estável. Entradas pendentes há
+    mais de ``claim_idle_ms`` (gravação que falhou, processo que caiu) são
+    reivindicadas com XAUTOCLAIM por qualquer worker. O stream nunca é
+    aparado: com ``capacity`` entradas não confirmadas, os novos eventos são
+    descartados e contados. Entradas rejeitadas (ilegíveis ou recusadas pelo
+    banco) vão para ``<stream>:dead`` antes de serem confirmadas
+    """
+
+    GROUP = "analytics-flusher"
+
+    def __init__(
+        self,
+        redis_url: str,
+        stream: str,
+        capacity: int,
+        consumer: str | None = None,
+        claim_idle_ms: int = 60_000,
+        client: Any = None,
+        dead_letter_size: int = 10_000,
+    ):
+        if client is None:
+            import redis.asyncio as redis
+
+            client = redis.from_url(redis_url)
+        self.client = client
+        self.stream = stream
+        self.capacity = capacity
+        self.consumer = consumer or socket.gethostname()
+        self.claim_idle_ms = claim_idle_ms
+        self.dead_stream = f"{stream}:dead"
+        self.dead_letter_size = dead_letter_size
+        self._claim_cursor = "0-0"
+        self._group_ready = False
+
+    async def _ensure_group(self) -> None:
+        if self._group_ready:
+            return
+        try:
+            await self.client.xgroup_create(self.stream, self.GROUP, id="0", mkstream=True)
+        except Exception as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+        self._group_ready = True
+
+    @staticmethod
+    def _encode(row: dict[str, Any]) -> str:
+        return json.dumps(row, default=str)
+
+    @staticmethod
+    def _decode(payload: bytes | str) -> dict[str, Any]:
+        row = json.loads(payload)
+        for column in _UUID_COLUMNS:
+            row[column] = _as_uuid(row.get(column))
+        row["timestamp"] = datetime.fromisoformat(row["timestamp"])
+        return row
+
+    async def put_many(self, rows: list[dict[str, Any]]) -> int:
+        """Adiciona os eventos que cabem na capacidade; retorna os descartados"""
+        await self._ensure_group()
+        # Entradas confirmadas são removidas (XDEL): XLEN é o backlog não confirmado
+        free = max(self.capacity - await self.client.xlen(self.stream), 0)
+        kept = rows[:free]
+        if kept:
+            pipe = self.client.pipeline(transaction=False)
+            for row in kept:
+                pipe.xadd(self.stream, {"e": self._encode(row)})
+            await pipe.execute()
+        return len(rows) - len(kept)
+
+    async def _claim(self, limit: int) -> list[tuple[Any, dict]]:
+        """Reivindica entradas pendentes paradas há mais de ``claim_idle_ms``"""
+        response = await self.client.xautoclaim(
+            self.stream,
+            self.GROUP,
+            self.consumer,
+            min_idle_time=self.claim_idle_ms,
+            start_id=self._claim_cursor,
+            count=limit,
+        )
+        self._claim_cursor = response[0]
+        entries = response[1]
+        # Entradas removidas do stream mas ainda no PEL voltam sem campos
+        missing = [entry_id for entry_id, fields in entries if not fields]
+        if missing:
+            await self.client.xack(self.stream, self.GROUP, *missing)
+        return [(entry_id, fields) for entry_id, fields in entries if fields]
+
+    async def take(self, limit: int) -> tuple[list[dict[str, Any]], list[Any]]:
+        """
+        Lê até ``limit`` eventos: primeiro pendentes abandonados, depois novos.
+        Entradas ilegíveis vão direto para o dead letter
+        """
+        await self._ensure_group()
+        entries = await self._claim(limit)
+        if not entries:
+            response = await self.client.xreadgroup(
+                self.GROUP, self.consumer, {self.stream: ">"}, count=limit
+            )
+            entries = response[0][1] if response else []
+        rows, ids, unreadable = [], [], []
+        for entry_id, fields in entries:
+            payload = fields.get(b"e") or fields.get("e")
+            try:
+                rows.append(self._decode(payload))
+            except (ValueError, TypeError, KeyError) as e:
+                unreadable.append((entry_id, payload, f"{type(e).__name__}: {e}"))
+                continue
+            ids.append(entry_id)
+        if unreadable:
+            await self.dead_letter([(payload, error) for _, payload, error in unreadable])
+            await self.ack([entry_id for entry_id, _, _ in unreadable])
+        return rows, ids
+
+    async def dead_letter(self, entries: list[tuple[Any, str]]) -> None:
+        """Guarda ``(evento, erro)`` rejeitados no stream de dead letter (limitado)"""
+        pipe = self.client.pipeline(transaction=False)
+        for payload, error in entries:
+            if isinstance(payload, dict):
+                payload = self._encode(payload)
+            pipe.xadd(
+                self.dead_stream,
+                {"e": payload or "", "error": error},
+                maxlen=self.dead_letter_size,
+                approximate=True,
+            )
+        await pipe.execute()
+
+    async def ack(self, ids: list[Any]) -> None:
+        if ids:
+            await self.client.xack(self.stream, self.GROUP, *ids)
+            await self.client.xdel(self.stream, *ids)
+
+    async def size(self) -> int:
+        return await self.client.xlen(self.stream)
+
+
+class AnalyticsIngestionPipeline:
+    """
+    Pipeline de ingestão: ``submit`` confirma na hora e o flusher grava em lote.
+
+    O lote é disparado quando o buffer atinge ``batch_size`` eventos ou quando
+    ``flush_interval_ms`` expira. Falhas transitórias devolvem o lote ao
+    buffer; linhas recusadas pelo banco vão para ``dead_letters`` (em memória,
+    limitado) ou para o dead letter do stream.
+    """
+
+    def __init__(
+        self,
+        capacity: int | None = None,
+        batch_size: int | None = None,
+        flush_interval_ms: int | None = None,
+        overflow_policy: str | OverflowPolicy | None = None,
+        writer: Callable[[list[dict[str, Any]], list[dict[str, Any]]], None] | None = None,
+        redis_stream: str | None = None,
+    ):
+        self.capacity = capacity or settings.ANALYTICS_INGEST_BUFFER_SIZE
+        self.batch_size = batch_size or settings.ANALYTICS_INGEST_BATCH_SIZE
+        self.flush_interval = (flush_interval_ms or settings.ANALYTICS_INGEST_FLUSH_INTERVAL_MS) / 1000
+        self.writer = writer or write_event_batch
+        self.buffer = RingBuffer(
+            self.capacity, overflow_policy or settings.ANALYTICS_INGEST_OVERFLOW_POLICY
+        )
+        self.stats = IngestionStats()
+        self.dead_letters: deque = deque(maxlen=settings.ANALYTICS_INGEST_DEAD_LETTER_SIZE)
+
+        stream = redis_stream if redis_stream is not None else settings.ANALYTICS_INGEST_REDIS_STREAM
+        self.stream: RedisStreamBuffer | None = None
+        if stream and settings.REDIS_URL:
+            self.stream = RedisStreamBuffer(
+                settings.REDIS_URL,
+                stream,
+                self.capacity,
+                consumer=settings.ANALYTICS_INGEST_CONSUMER_NAME,
+                claim_idle_ms=settings.ANALYTICS_INGEST_CLAIM_IDLE_MS,
+                dead_letter_size=settings.ANALYTICS_INGEST_DEAD_LETTER_SIZE,
+            )
+
+        self._task: asyncio.Task | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._wakeup: asyncio.Event | None = None
+        self._stopping = False
+        self._stats_lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    # ==================== SUBMISSÃO ====================
+
+    def _validate(self, events: Iterable[Any], build: Callable[[Any], dict[str, Any]], result: IngestResult):
+        rows = []
+        for event in events:
+            try:
+                rows.append(build(event))
+            except (ValueError, TypeError) as e:
+                result.invalid += 1
+                if len(result.errors) < 10:
+                    result.errors.append(str(e))
+        return rows
+
+    def _account(self, result: IngestResult) -> IngestResult:
+        with self._stats_lock:
+            self.stats.accepted += result.accepted
+            self.stats.invalid += result.invalid
+            self.stats.dropped += result.dropped
+        result.buffered = len(self.buffer)
+        return result
+
+    def _notify(self) -> None:
+        if self._wakeup is None or self._loop is None or len(self.buffer) < self.batch_size:
+            return
+        try:
+            if asyncio.get_running_loop() is self._loop:
+                self._wakeup.set()
+                return
+        except RuntimeError:
+            pass
+        self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    def submit_nowait(
+        self, events: Iterable[Any], build: Callable[[Any], dict[str, Any]] = build_event_row
+    ) -> IngestResult:
+        """Valida e enfileira no ring buffer local (não bloqueia, seguro entre threads)"""
+        result = IngestResult()
+        rows = self._validate(events, build, result)
+        if rows:
+            try:
+                result.accepted, result.dropped = self.buffer.put_many(rows)
+            except IngestionBackpressure:
+                self._account(result)
+                raise
+        self._notify()
+        return self._account(result)
+
+    async def submit(
+        self, events: Iterable[Any], build: Callable[[Any], dict[str, Any]] = build_event_row
+    ) -> IngestResult:
+        """Como ``submit_nowait``, mas grava no Redis Stream quando configurado"""
+        if self.stream is None:
+            return self.submit_nowait(events, build)
+
+        result = IngestResult()
+        rows = self._validate(events, build, result)
+        if rows:
+            try:
+                result.dropped = await self.stream.put_many(rows)
+                result.accepted = len(rows) - result.dropped
+            except Exception as e:
+                logger.warning(f"Redis Stream indisponível, usando buffer local: {e}")
+                result.accepted, result.dropped = self.buffer.put_many(rows)
+                self._notify()
+        return self._account(result)
+
+    # ==================== FLUSH ====================
+
+    async def flush(self) -> int:
+        """Grava um lote (buffer local e stream) e retorna quantos eventos foram gravados"""
+        written = 0
+        rows = self.buffer.take(self.batch_size)
+        if rows:
+            written, rejected, pending = await self._write_rows(rows)
+            for row, error in rejected:
+                self.dead_letters.append({"event": row, "error": error})
+            if pending:
+                with self._stats_lock:
+                    self.stats.dropped += self.buffer.requeue(pending)
+
+        if self.stream is not None and written < self.batch_size:
+            stream_rows, ids = await self.stream.take(self.batch_size - written)
+            if stream_rows:
+                stream_written, rejected, pending = await self._write_rows(stream_rows)
+                if rejected:
+                    await self.stream.dead_letter(rejected)
+                # Pendentes ficam no PEL e voltam pelo XAUTOCLAIM
+                retry = {id(row) for row in pending}
+                await self.stream.ack(
+                    [entry_id for row, entry_id in zip(stream_rows, ids) if id(row) not in retry]
+                )
+                written += stream_written
+        return written
+
+    async def _write_rows(
+        self, rows: list[dict[str, Any]]
+    ) -> tuple[int, list[tuple[dict[str, Any], str]], list[dict[str, Any]]]:
+        """
+        Grava ``rows``; se o banco recusar o lote, divide ao meio até isolar as
+        linhas com erro. Retorna (gravadas, rejeitadas com o erro, pendentes
+        por falha transitória — sempre um sufixo de ``rows``)
+        """
+        error = await self._write(rows)
+        if error is None:
+            return len(rows), [], []
+        if is_transient_error(error):
+            logger.error(f"Falha ao gravar lote de {len(rows)} eventos de analytics: {error}")
+            with self._stats_lock:
+                self.stats.failed_flushes += 1
+            return 0, [], rows
+        if len(rows) == 1:
+            logger.error(f"Evento de analytics rejeitado ({rows[0]['event_id']}): {error}")
+            with self._stats_lock:
+                self.stats.dead_lettered += 1
+            return 0, [(rows[0], f"{type(error).__name__}: {error}")], []
+
+        middle = len(rows) // 2
+        written, rejected, pending = await self._write_rows(rows[:middle])
+        if pending:
+            return written, rejected, pending + rows[middle:]
+        more_written, more_rejected, pending = await self._write_rows(rows[middle:])
+        return written + more_written, rejected + more_rejected, pending
+
+    async def _write(self, rows: list[dict[str, Any]]) -> Exception | None:
+        metrics = derive_metric_rows(rows)
+        start = time.perf_counter()
+        try:
+            await asyncio.to_thread(self.writer, rows, metrics)
+        except Exception as e:
+            return e
+
+        with self._stats_lock:
+            self.stats.flushes += 1
+            self.stats.flushed_events += len(rows)
+            self.stats.flushed_metrics += len(metrics)
+            self.stats.last_flush_ms = round((time.perf_counter() - start) * 1000, 2)
+            self.stats.last_flush_at = datetime.now(timezone.utc).isoformat()
+        return None
+
+    async def drain(self) -> None:
+        """Grava tudo que estiver no buffer local (usado no desligamento)"""
+        while len(self.buffer):
+            before = self.stats.failed_flushes
+            await self.flush()
+            if self.stats.failed_flushes > before:
+                break
+
+    # ==================== CICLO DE VIDA ====================
+
+    async def run(self) -> None:
+        """Loop do flusher: acorda por tamanho de lote ou por intervalo"""
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        failures = 0
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+            before = self.stats.failed_flushes
+            while await self.flush() >= self.batch_size:
+                pass
+            if self.stats.failed_flushes > before:
+                failures += 1
+                await asyncio.sleep(min(self.flush_interval * 2**failures, 30))
+            else:
+                failures = 0
+
+    async def start(self) -> None:
+        if self.running:
+            return
+        self._stopping = False
+        self._task = asyncio.create_task(self.run(), name="analytics_ingestion")
+
+    async def stop(self) -> None:
+        """Encerra o flusher sem interromper um lote em gravação e esvazia o buffer"""
+        if self._task is not None:
+            self._stopping = True
+            if self._wakeup is not None:
+                self._wakeup.set()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.drain()
+        self._wakeup = None
+        self._loop = None
+
+    def get_stats(self) -> dict[str, Any]:
+        stats = self.stats.to_dict()
+        stats.update(
+            {
+                "buffered": len(self.buffer),
+                "dead_letters": len(self.dead_letters),
+                "capacity": self.capacity,
+                "batch_size": self.batch_size,
+                "flush_interval_ms": int(self.flush_interval * 1000),
+                "overflow_policy": self.buffer.policy.value,
+                "durable": self.stream is not None,
+                "running": self.running,
+            }
+        )
+        return stats
+
+
+ingestion_pipeline = AnalyticsIngestionPipeline()
@@ -0,0 +1,220 @@
+"""
+Query builder de relatórios
+Compila o ``query_config`` de um relatório em um SELECT do SQLAlchemy sobre
+fontes e colunas em whitelist: nenhum identificador vem do usuário sem ser
+validado e todos os valores viram parâmetros ligados (sem SQL bruto)
+"""
+
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Sequence
+
+from sqlalchemy import Table, and_, distinct, func, select
+
+MAX_REPORT_COLUMNS = 50
+
+TIME_BUCKETS = ("hour", "day", "week", "month")
+
+AGGREGATIONS = {
+    "count": lambda column: func.count(column) if column is not None else func.count(),
+    "count_distinct": lambda column: func.count(distinct(column)),
+    "sum": func.sum,
+    "avg": func.avg,
+    "min": func.min,
+    "max": func.max,
+}
+
+_FILTER_OPERATORS = {
+    "eq": lambda column, value: column == value,
+    "ne": lambda column, value: column != value,
+    "gt": lambda column, value: column > value,
+    "gte": lambda column, value: column >= value,
+    "lt": lambda column, value: column < value,
+    "lte": lambda column, value: column <= value,
+    "in": lambda column, value: column.in_(list(value)),
+    "not_in": lambda column, value: column.not_in(list(value)),
+    "contains": lambda column, value: column.contains(str(value), autoescape=True),
+    "is_null": lambda column, value: column.is_(None) if value else column.isnot(None),
+}
+
+_RELATIVE_RANGES = {
+    "1h": timedelta(hours=1),
+    "24h": timedelta(days=1),
+    "1d": timedelta(days=1),
+    "7d": timedelta(days=7),
+    "30d": timedelta(days=30),
+    "90d": timedelta(days=90),
+}
+
+
+class ReportQueryError(ValueError):
+    """``query_config`` inválido ou fora da whitelist"""
+
+
+@dataclass
+class ReportSource:
+    """Tabela consultável por relatórios e as colunas expostas"""
+
+    table: Table
+    columns: Sequence[str]
+    default_columns: Sequence[str]
+    timestamp_column: str = "timestamp"
+    tenant_column: Optional[str] = "tenant_id"
+
+
+@dataclass
+class CompiledReport:
+    statement: Any
+    columns: List[str] = field(default_factory=list)
+
+
+def _column(source: ReportSource, name: str):
+    if name not in source.columns:
+        raise ReportQueryError(f"Coluna não permitida: {name}")
+    return source.table.c[name]
+
+
+def parse_datetime(value: Any) -> datetime:
+    if isinstance(value, datetime):
+        return value
+    try:
+        return datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        raise ReportQueryError(f"Data inválida: {value}")
+
+
+def _time_filters(source: ReportSource, filters: Dict[str, Any], now: datetime) -> list:
+    timestamp = source.table.c[source.timestamp_column]
+    conditions = []
+    relative = filters.pop("time_range", None)
+    if relative is not None:
+        if relative not in _RELATIVE_RANGES:
+            raise ReportQueryError(f"time_range não suportado: {relative}")
+        conditions.append(timestamp >= now - _RELATIVE_RANGES[relative])
+    if "start_date" in filters:
+        conditions.append(timestamp >= parse_datetime(filters.pop("start_date")))
+    if "end_date" in filters:
+        conditions.append(timestamp <= parse_datetime(filters.pop("end_date")))
+    return conditions
+
+
+def _date_range_filters(source: ReportSource, date_range: Dict[str, Any]) -> list:
+    """Intervalo semiaberto ``[start, end)``: partições adjacentes não repetem linhas"""
+    timestamp = source.table.c[source.timestamp_column]
+    conditions = []
+    if date_range.get("start") is not None:
+        conditions.append(timestamp >= parse_datetime(date_range["start"]))
+    if date_range.get("end") is not None:
+        conditions.append(timestamp < parse_datetime(date_range["end"]))
+    return conditions
+
+
+def _filter_conditions(source: ReportSource, filters: Dict[str, Any]) -> list:
+    """``{campo: valor}``, ``{campo: [valores]}`` ou ``{campo: {operador: valor}}``"""
+    conditions = []
+    for name, spec in filters.items():
+        column = _column(source, name)
+        if isinstance(spec, dict):
+            for operator, value in spec.items():
+                if operator not in _FILTER_OPERATORS:
+                    raise ReportQueryError(f"Operador de filtro não suportado: {operator}")
+                if operator in ("in", "not_in") and not isinstance(value, (list, tuple)):
+                    raise ReportQueryError(f"Operador {operator} exige uma lista")
+                conditions.append(_FILTER_OPERATORS[operator](column, value))
+        elif isinstance(spec, (list, tuple)):
+            conditions.append(column.in_(list(spec)))
+        else:
+            conditions.append(column == spec)
+    return conditions
+
+
+def compile_report_query(
+    config: Dict[str, Any],
+    sources: Dict[str, ReportSource],
+    tenant_id: Any = None,
+    now: Optional[datetime] = None,
+) -> CompiledReport:
+    """
+    Compila ``query_config``:
+
+    - ``type``: fonte (chave de ``sources``)
+    - ``columns``: colunas do resultado (sem agregações)
+    - ``filters``: igualdade, lista (IN) ou operadores; ``start_date``,
+      ``end_date`` e ``time_range`` filtram pelo timestamp da fonte
+    - ``date_range``: ``{"start", "end"}``, intervalo semiaberto no timestamp
+    - ``time_bucket``: hour/day/week/month, adiciona a coluna ``period``
+    - ``group_by`` + ``aggregations`` (``{"function", "field", "alias"}``)
+    - ``order_by`` (``{"field", "direction"}``) e ``limit``
+    """
+    source_name = config.get("type", "events")
+    if source_name not in sources:
+        raise ReportQueryError(f"Fonte de relatório não suportada: {source_name}")
+    source = sources[source_name]
+    now = now or datetime.utcnow()
+
+    selected: Dict[str, Any] = {}
+    group_columns: List[Any] = []
+
+    bucket = config.get("time_bucket")
+    if bucket is not None:
+        if bucket not in TIME_BUCKETS:
+            raise ReportQueryError(f"time_bucket não suportado: {bucket}")
+        period = func.date_trunc(bucket, source.table.c[source.timestamp_column])
+        selected["period"] = period
+        group_columns.append(period)
+
+    aggregations = config.get("aggregations") or []
+    group_by = config.get("group_by") or []
+    if aggregations or group_by:
+        for name in group_by:
+            if name == "period" and bucket is not None:
+                continue
+            column = _column(source, name)
+            selected[name] = column
+            group_columns.append(column)
+        for spec in aggregations:
+            function = spec.get("function") or spec.get("func")
+            if function not in AGGREGATIONS:
+                raise ReportQueryError(f"Agregação não suportada: {function}")
+            field_name = spec.get("field")
+            column = _column(source, field_name) if field_name else None
+            if column is None and function != "count":
+                raise ReportQueryError(f"A agregação {function} exige um campo")
+            alias = spec.get("alias") or (f"{function}_{field_name}" if field_name else function)
+            if not alias.isidentifier() or alias in selected:
+                raise ReportQueryError(f"Alias inválido ou repetido: {alias}")
+            selected[alias] = AGGREGATIONS[function](column)
+    else:
+        for name in config.get("columns") or source.default_columns:
+            selected[name] = _column(source, name)
+
+    if not selected or len(selected) > MAX_REPORT_COLUMNS:
+        raise ReportQueryError(f"O relatório precisa de 1 a {MAX_REPORT_COLUMNS} colunas")
+
+    statement = select(*[expression.label(name) for name, expression in selected.items()])
+    statement = statement.select_from(source.table)
+
+    filters = dict(config.get("filters") or {})
+    conditions = _time_filters(source, filters, now) + _filter_conditions(source, filters)
+    conditions += _date_range_filters(source, config.get("date_range") or {})
+    if tenant_id is not None and source.tenant_column:
+        conditions.append(source.table.c[source.tenant_column] == tenant_id)
+    if conditions:
+        statement = statement.where(and_(*conditions))
+    if group_columns:
+        statement = statement.group_by(*group_columns)
+
+    for spec in config.get("order_by") or []:
+        name = spec.get("field")
+        if name not in selected:
+            raise ReportQueryError(f"order_by precisa usar uma coluna do resultado: {name}")
+        expression = selected[name]
+        direction = (spec.get("direction") or "asc").lower()
+        if direction not in ("asc", "desc"):
+            raise ReportQueryError(f"Direção de ordenação inválida: {direction}")
+        statement = statement.order_by(expression.desc() if direction == "desc" else expression.asc())
+
+    if config.get("limit"):
+        statement = statement.limit(int(config["limit"]))
+
+    return CompiledReport(statement=statement, columns=list(selected))
@@ -0,0 +1,131 @@
+"""
+Sketch de quantis mesclável (estilo DDSketch)
+Valores são contados em buckets logarítmicos, garantindo erro relativo
+``relative_accuracy`` em qualquer quantil; dois sketches se combinam somando
+os contadores, o que permite agregar buckets de 1m em 1h e 1d
+"""
+
+import math
+from collections.abc import Iterable
+from typing import Any
+
+import numpy as np
+
+DEFAULT_RELATIVE_ACCURACY = 0.01
+DEFAULT_MAX_BINS = 2048
+
+
+class QuantileSketch:
+    """Histograma logarítmico com erro relativo limitado e tamanho limitado"""
+
+    __slots__ = ("relative_accuracy", "max_bins", "_gamma", "_log_gamma", "positive", "negative", "zero_count", "count")
+
+    def __init__(
+        self,
+        relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY,
+        max_bins: int = DEFAULT_MAX_BINS,
+    ):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy deve estar entre 0 e 1")
+        self.relative_accuracy = relative_accuracy
+        self.max_bins = max_bins
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self.positive: dict[int, int] = {}
+        self.negative: dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+
+    def _key(self, magnitude: float) -> int:
+        return math.ceil(math.log(magnitude) / self._log_gamma)
+
+    def _value(self, key: int) -> float:
+        return 2 * self._gamma**key / (self._gamma + 1)
+
+    def add(self, value: float, count: int = 1) -> None:
+        if value > 0:
+            key = self._key(value)
+            self.positive[key] = self.positive.get(key, 0) + count
+        elif value < 0:
+            key = self._key(-value)
+            self.negative[key] = self.negative.get(key, 0) + count
+        else:
+            self.zero_count += count
+        self.count += count
+        self._collapse()
+
+    def add_many(self, values: Iterable[float]) -> None:
+        """Insere vários valores de uma vez (vetorizado com NumPy)"""
+        array = np.asarray(values if isinstance(values, np.ndarray) else list(values), dtype=float)
+        if not array.size:
+            return
+        for bins, selected in ((self.positive, array[array > 0]), (self.negative, -array[array < 0])):
+            if selected.size:
+                keys, counts = np.unique(
+                    np.ceil(np.log(selected) / self._log_gamma).astype(np.int64), return_counts=True
+                )
+                for key, count in zip(keys.tolist(), counts.tolist()):
+                    bins[key] = bins.get(key, 0) + count
+        self.zero_count += int(np.count_nonzero(array == 0))
+        self.count += int(array.size)
+        self._collapse()
+
+    def merge(self, other: "QuantileSketch") -> "QuantileSketch":
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Não é possível mesclar sketches com precisões diferentes")
+        for bins, other_bins in ((self.positive, other.positive), (self.negative, other.negative)):
+            for key, count in other_bins.items():
+                bins[key] = bins.get(key, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self._collapse()
+        return self
+
+    def _collapse(self) -> None:
+        """Limita o número de bins juntando os de menor magnitude (cauda inferior perde precisão)"""
+        for bins in (self.positive, self.negative):
+            excess = len(bins) - self.max_bins
+            if excess <= 0:
+                continue
+            keys = sorted(bins)
+            target = keys[excess]
+            bins[target] += sum(bins.pop(key) for key in keys[:excess])
+
+    def quantile(self, q: float) -> float | None:
+        """Valor estimado do quantil ``q`` (0..1); None se o sketch estiver vazio"""
+        if not self.count:
+            return None
+        q = min(max(q, 0.0), 1.0)
+        rank = q * (self.count - 1)
+
+        seen = 0
+        for key in sorted(self.negative, reverse=True):
+            seen += self.negative[key]
+            if seen > rank:
+                return -self._value(key)
+        seen += self.zero_count
+        if seen > rank:
+            return 0.0
+        for key in sorted(self.positive):
+            seen += self.positive[key]
+            if seen > rank:
+                return self._value(key)
+        return self._value(max(self.positive)) if self.positive else 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "a": self.relative_accuracy,
+            "p": {str(key): count for key, count in self.positive.items()},
+            "n": {str(key): count for key, count in self.negative.items()},
+            "z": self.zero_count,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any] | None) -> "QuantileSketch":
+        data = data or {}
+        sketch = cls(data.get("a", DEFAULT_RELATIVE_ACCURACY))
+        sketch.positive = {int(key): count for key, count in data.get("p", {}).items()}
+        sketch.negative = {int(key): count for key, count in data.get("n", {}).items()}
+        sketch.zero_count = data.get("z", 0)
+        sketch.count = sketch.zero_count + sum(sketch.positive.values()) + sum(sketch.negative.values())
+        return sketch
@@ -0,0 +1,158 @@
+"""
+Spool de resultados
+Grava o resultado de um relatório em páginas comprimidas (gzip) no
+armazenamento local, uma página por lote do cursor; a memória usada não
+depende do tamanho do resultado.
+
+Formatos:
+- ``jsonl``: um objeto JSON por linha
+- ``csv``: cabeçalho apenas na primeira página
+- ``columnar``: cada página é um objeto ``{coluna: [valores]}`` em uma linha
+
+Membros gzip concatenados formam um gzip válido, então o download é a
+concatenação das páginas na ordem.
+"""
+
+import csv
+import gzip
+import io
+import json
+import os
+import shutil
+import uuid
+from dataclasses import asdict, dataclass, field
+from datetime import date, datetime
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Sequence
+
+# Formato -> extensão dos arquivos
+SPOOL_FORMATS = {
+    "jsonl": ".jsonl.gz",
+    "csv": ".csv.gz",
+    "columnar": ".columns.jsonl.gz",
+}
+
+_COMPRESSION_LEVEL = 6
+
+
+def encode_value(value: Any) -> Any:
+    """Converte valores do banco para tipos serializáveis em JSON"""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (uuid.UUID, Decimal)):
+        return str(value)
+    return value
+
+
+@dataclass
+class SpoolPage:
+    file: str
+    rows: int
+    bytes: int
+
+
+@dataclass
+class SpoolManifest:
+    """Índice das páginas gravadas (guardado junto da execução)"""
+
+    format: str
+    columns: List[str]
+    pages: List[SpoolPage] = field(default_factory=list)
+
+    @property
+    def rows(self) -> int:
+        return sum(page.rows for page in self.pages)
+
+    @property
+    def bytes(self) -> int:
+        return sum(page.bytes for page in self.pages)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "format": self.format,
+            "columns": self.columns,
+            "pages": [asdict(page) for page in self.pages],
+            "rows": self.rows,
+            "bytes": self.bytes,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SpoolManifest":
+        return cls(
+            format=data["format"],
+            columns=list(data["columns"]),
+            pages=[SpoolPage(**page) for page in data.get("pages", [])],
+        )
+
+
+class ResultSpool:
+    """
+    Escreve páginas em ``base_path/relative_dir``. Os caminhos do manifesto
+    são relativos a ``base_path`` (raiz do StorageManager).
+    """
+
+    def __init__(self, base_path: Path, relative_dir: str, columns: Sequence[str], fmt: str = "jsonl"):
+        if fmt not in SPOOL_FORMATS:
+            raise ValueError(f"Formato de resultado não suportado: {fmt}")
+        self.base_path = Path(base_path)
+        self.relative_dir = relative_dir
+        self.manifest = SpoolManifest(format=fmt, columns=list(columns))
+        (self.base_path / relative_dir).mkdir(parents=True, exist_ok=True)
+
+    def _encode_page(self, rows: Sequence[Sequence[Any]]) -> str:
+        columns = self.manifest.columns
+        fmt = self.manifest.format
+        if fmt == "jsonl":
+            return "".join(
+                json.dumps(dict(zip(columns, map(encode_value, row))), default=str) + "\n" for row in rows
+            )
+        if fmt == "csv":
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            if not self.manifest.pages:
+                writer.writerow(columns)
+            writer.writerows([[encode_value(value) for value in row] for row in rows])
+            return buffer.getvalue()
+        block = {name: [encode_value(row[index]) for row in rows] for index, name in enumerate(columns)}
+        return json.dumps(block, default=str) + "\n"
+
+    def write_page(self, rows: Sequence[Sequence[Any]]) -> SpoolPage:
+        suffix = SPOOL_FORMATS[self.manifest.format]
+        relative = f"{self.relative_dir}/page-{len(self.manifest.pages):05d}{suffix}"
+        path = self.base_path / relative
+        data = gzip.compress(self._encode_page(rows).encode(), compresslevel=_COMPRESSION_LEVEL)
+        # Escrita atômica: páginas já listadas no manifesto estão sempre completas
+        temporary = path.with_name(path.name + ".tmp")
+        temporary.write_bytes(data)
+        os.replace(temporary, path)
+        page = SpoolPage(file=relative, rows=len(rows), bytes=len(data))
+        self.manifest.pages.append(page)
+        return page
+
+    def discard(self) -> None:
+        shutil.rmtree(self.base_path / self.relative_dir, ignore_errors=True)
+
+
+def read_page(base_path: Path, manifest: SpoolManifest, index: int) -> List[Dict[str, Any]]:
+    """Linhas de uma página como dicionários"""
+    if not 0 <= index < len(manifest.pages):
+        raise IndexError(f"Página inexistente: {index}")
+    text = gzip.decompress((Path(base_path) / manifest.pages[index].file).read_bytes()).decode()
+    if manifest.format == "jsonl":
+        return [json.loads(line) for line in text.splitlines() if line]
+    if manifest.format == "csv":
+        reader = csv.reader(io.StringIO(text))
+        if index == 0:
+            next(reader, None)
+        return [dict(zip(manifest.columns, row)) for row in reader]
+    block = json.loads(text)
+    return [dict(zip(manifest.columns, values)) for values in zip(*(block[name] for name in manifest.columns))]
+
+
+def iter_download(base_path: Path, manifest: SpoolManifest, chunk_size: int = 1 << 16) -> Iterator[bytes]:
+    """Bytes do arquivo completo (.gz) sem carregá-lo em memória"""
+    for page in manifest.pages:
+        with open(Path(base_path) / page.file, "rb") as handle:
+            while chunk := handle.read(chunk_size):
+                yield chunk
@@ -94,6 +94,18 @@ class Settings(BaseSettings):
         default_factory=lambda: os.getenv("API_V1_STR", "/api/v1"),
         description="Prefixo da API v1",
     )
+    API_LAZY_ROUTERS: bool = Field(
+        default_factory=lambda: os.getenv("API_LAZY_ROUTERS", "True").lower() == "true",
+        description="Importar os módulos de endpoints na primeira requisição ao prefixo (False: todos no startup)",
+    )
+    API_PRELOAD_ROUTERS: bool = Field(
+        default_factory=lambda: os.getenv("API_PRELOAD_ROUTERS", "True").lower() == "true",
+        description="Carregar em background, após o startup, os routers ainda não importados",
+    )
+    API_PRELOAD_DELAY_SECONDS: float = Field(
+        default_factory=lambda: float(os.getenv("API_PRELOAD_DELAY_SECONDS", "2")),
+        description="Espera após o startup antes do pré-carregamento dos routers",
+    )
     DESCRIPTION: str = Field(
         default_factory=lambda: os.getenv(
             "DESCRIPTION", "Plataforma de Automação com IA"
@@ -515,6 +527,11 @@ class Settings(BaseSettings):
         default_factory=lambda: int(os.getenv("RATE_LIMIT_WINDOW", "60")),
         description="Janela de tempo em segundos",
     )
+    HTTP_RATE_LIMIT_ENABLED: bool = Field(
+        default_factory=lambda: os.getenv("HTTP_RATE_LIMIT_ENABLED", "False").lower()
+        == "true",
+        description="Aplicar o limite global por IP (RATE_LIMIT_REQUESTS/RATE_LIMIT_WINDOW) no pipeline HTTP",
+    )
 
     # ============================
     # CONFIGURAÇÕES DE WEBSOCKET
@@ -613,6 +630,26 @@ class Settings(BaseSettings):
         default_factory=lambda: os.getenv("LOG_DIRECTORY", str(_PROJECT_ROOT / "logs")),
         description="Diretório de logs",
     )
+    LOG_ASYNC: bool = Field(
+        default_factory=lambda: os.getenv("LOG_ASYNC", "True").lower() == "true",
+        description="Formatar e gravar logs em uma thread dedicada (fila) fora do event loop",
+    )
+    LOG_QUEUE_SIZE: int = Field(
+        default_factory=lambda: int(os.getenv("LOG_QUEUE_SIZE", "10000")),
+        description="Capacidade da fila de registros de log (registros excedentes são descartados)",
+    )
+    LOG_QUEUE_BLOCK_MS: int = Field(
+        default_factory=lambda: int(os.getenv("LOG_QUEUE_BLOCK_MS", "50")),
+        description="Espera máxima (ms) por espaço na fila para WARNING ou acima antes do descarte",
+    )
+    LOG_ACCESS_SAMPLE_RATE: float = Field(
+        default_factory=lambda: float(os.getenv("LOG_ACCESS_SAMPLE_RATE", "1.0")),
+        description="Fração dos logs de acesso bem-sucedidos registrados (erros e lentos sempre)",
+    )
+    LOG_SLOW_REQUEST_MS: int = Field(
+        default_factory=lambda: int(os.getenv("LOG_SLOW_REQUEST_MS", "1000")),
+        description="Requisições acima deste tempo (ms) sempre entram no log de acesso",
+    )
 
     # ============================
     # CONFIGURAÇÕES DE CACHE
@@ -649,6 +686,84 @@ class Settings(BaseSettings):
         default_factory=lambda: int(os.getenv("EXECUTION_RETRY_ATTEMPTS", "3")),
         description="Tentativas de retry de execução",
     )
+    EXECUTION_PLAN_CACHE_SIZE: int = Field(
+        default_factory=lambda: int(os.getenv("EXECUTION_PLAN_CACHE_SIZE", "512")),
+        description="Planos de execução compilados mantidos em memória por processo",
+    )
+    EXECUTION_PLAN_CACHE_TTL: int = Field(
+        default_factory=lambda: int(os.getenv("EXECUTION_PLAN_CACHE_TTL", "86400")),
+        description="TTL (segundos) dos planos de execução compilados no Redis",
+    )
+    EXECUTION_NODE_STATE_MODE: str = Field(
+        default_factory=lambda: os.getenv("EXECUTION_NODE_STATE_MODE", "tick").lower(),
+        description=(
+            "Gravação do estado dos nós: 'tick' (transições em lote a cada flush) "
+            "ou 'final' (só o estado final; início apenas de nós lentos)"
+        ),
+    )
+    EXECUTION_NODE_STATE_STORE: str = Field(
+        default_factory=lambda: os.getenv("EXECUTION_NODE_STATE_STORE", "memory").lower(),
+        description="Onde fica o estado em andamento dos nós: 'memory' ou 'redis' (espelhado)",
+    )
+    EXECUTION_STATE_FLUSH_INTERVAL_MS: int = Field(
+        default_factory=lambda: int(os.getenv("EXECUTION_STATE_FLUSH_INTERVAL_MS", "1000")),
+        description="Intervalo (ms) entre flushes do estado dos nós e métricas de uma execução",
+    )
+    EXECUTION_FAST_NODE_MS: int = Field(
+        default_factory=lambda: int(os.getenv("EXECUTION_FAST_NODE_MS", "500")),
+        description="No modo 'final', nós que rodam mais que isso têm o início gravado",
+    )
+    EXECUTION_OUTPUT_INLINE_BYTES: int = Field(
+        default_factory=lambda: int(os.getenv("EXECUTION_OUTPUT_INLINE_BYTES", "16384")),
+        description=(
+            "Outputs de nós até este tamanho (JSON, bytes) ficam na linha; os maiores "
+            "vão comprimidos para o armazenamento e a linha guarda só a referência"
+        ),
+    )
+    EXECUTION_OUTPUT_CACHE_BYTES: int = Field(
+        default_factory=lambda: int(os.getenv("EXECUTION_OUTPUT_CACHE_BYTES", str(1024 * 1024))),
+        description="Outputs externalizados já lidos mantidos em memória por execução (bytes do JSON)",
+    )
+    EXECUTION_OUTPUT_DIRECTORY: str = Field(
+        default_factory=lambda: os.getenv("EXECUTION_OUTPUT_DIRECTORY", "execution_outputs"),
+        description="Subdiretório do STORAGE_BASE_PATH com os outputs externalizados",
+    )
+    EXECUTION_WORKER_POOL_ENABLED: bool = Field(
+        default_factory=lambda: os.getenv("EXECUTION_WORKER_POOL_ENABLED", "true").lower() == "true",
+        description="Executa nós CPU-bound (código personalizado, transformações grandes) em um pool de processos",
+    )
+    EXECUTION_WORKER_PROCESSES: int = Field(
+        default_factory=lambda: int(os.getenv("EXECUTION_WORKER_PROCESSES", "0")),
+        description="Processos do pool de executores (0 = núcleos disponíveis, até 4)",
+    )
+    EXECUTION_WORKER_START_METHOD: str = Field(
+        default_factory=lambda: os.getenv("EXECUTION_WORKER_START_METHOD", "forkserver").lower(),
+        description="Método de início dos workers: 'forkserver' (módulos pré-carregados) ou 'spawn'",
+    )
+    EXECUTION_WORKER_MAX_TASKS_PER_CHILD: int = Field(
+        default_factory=lambda: int(os.getenv("EXECUTION_WORKER_MAX_TASKS_PER_CHILD", "500")),
+        description="Tarefas por worker antes de ser reciclado (0 = sem limite)",
+    )
+    EXECUTION_WORKER_TASK_TIMEOUT: float = Field(
+        default_factory=lambda: float(os.getenv("EXECUTION_WORKER_TASK_TIMEOUT", "60")),
+        description="Tempo máximo (segundos) de uma tarefa no worker",
+    )
+    EXECUTION_WORKER_TASK_CPU_SECONDS: int = Field(
+        default_factory=lambda: int(os.getenv("EXECUTION_WORKER_TASK_CPU_SECONDS", "30")),
+        description="Tempo de CPU máximo (segundos) de uma tarefa no worker",
+    )
+    EXECUTION_WORKER_TASK_MEMORY_MB: int = Field(
+        default_factory=lambda: int(os.getenv("EXECUTION_WORKER_TASK_MEMORY_MB", "1024")),
+        description="Memória (MB) que uma tarefa pode alocar além da base do worker",
+    )
+    EXECUTION_WORKER_SHM_MIN_BYTES: int = Field(
+        default_factory=lambda: int(os.getenv("EXECUTION_WORKER_SHM_MIN_BYTES", str(256 * 1024))),
+        description="Payloads a partir deste tamanho vão para os workers por memória compartilhada",
+    )
+    EXECUTION_WORKER_OFFLOAD_MIN_ROWS: int = Field(
+        default_factory=lambda: int(os.getenv("EXECUTION_WORKER_OFFLOAD_MIN_ROWS", "50000")),
+        description="Transformações tabulares com pelo menos estes itens rodam no pool de processos",
+    )
 
     # ============================
     # CONFIGURAÇÕES DE MARKETPLACE
@@ -669,6 +784,42 @@ class Settings(BaseSettings):
         default_factory=lambda: float(os.getenv("MARKETPLACE_COMMISSION_RATE", "0.15")),
         description="Taxa de comissão do marketplace",
     )
+    COUNTER_SHARDS: int = Field(
+        default_factory=lambda: int(os.getenv("COUNTER_SHARDS", "16")),
+        description="Shards (locks independentes) dos contadores de uso/downloads/avaliações",
+    )
+    COUNTER_FLUSH_INTERVAL_MS: int = Field(
+        default_factory=lambda: int(os.getenv("COUNTER_FLUSH_INTERVAL_MS", "5000")),
+        description="Intervalo (ms) entre gravações dos contadores acumulados no banco",
+    )
+    TRENDING_HALF_LIFE_HOURS: float = Field(
+        default_factory=lambda: float(os.getenv("TRENDING_HALF_LIFE_HOURS", "24")),
+        description="Meia-vida (horas) do decaimento dos scores de tendência",
+    )
+    TRENDING_REDIS_PREFIX: str = Field(
+        default_factory=lambda: os.getenv("TRENDING_REDIS_PREFIX", "trending"),
+        description="Prefixo das chaves de tendência no Redis (vazio usa só memória)",
+    )
+    RBAC_CACHE_TTL: float = Field(
+        default_factory=lambda: float(os.getenv("RBAC_CACHE_TTL", "60")),
+        description="Validade máxima (s) das decisões de autorização pré-computadas",
+    )
+    RBAC_CACHE_SIZE: int = Field(
+        default_factory=lambda: int(os.getenv("RBAC_CACHE_SIZE", "50000")),
+        description="Máximo de principais e de workspaces mantidos no cache de autorização",
+    )
+    RBAC_VERSION_SYNC_MS: int = Field(
+        default_factory=lambda: int(os.getenv("RBAC_VERSION_SYNC_MS", "1000")),
+        description="Intervalo (ms) de sincronização das versões de autorização entre workers",
+    )
+    RBAC_REDIS_PREFIX: str = Field(
+        default_factory=lambda: os.getenv("RBAC_REDIS_PREFIX", "authz"),
+        description="Prefixo das versões de autorização no Redis (vazio usa só memória)",
+    )
+    RBAC_CHANGE_LOG_SIZE: int = Field(
+        default_factory=lambda: int(os.getenv("RBAC_CHANGE_LOG_SIZE", "10000")),
+        description="Entradas mantidas no log de invalidações de autorização no Redis",
+    )
 
     # ============================
     # CONFIGURAÇÕES DE NOTIFICAÇÕES
@@ -696,6 +847,198 @@ class Settings(BaseSettings):
         default_factory=lambda: int(os.getenv("ANALYTICS_RETENTION_DAYS", "90")),
         description="Dias de retenção de analytics",
     )
+    ANALYTICS_INGEST_BUFFER_SIZE: int = Field(
+        default_factory=lambda: int(os.getenv("ANALYTICS_INGEST_BUFFER_SIZE", "50000")),
+        description="Capacidade do ring buffer de ingestão de eventos",
+    )
+    ANALYTICS_INGEST_BATCH_SIZE: int = Field(
+        default_factory=lambda: int(os.getenv("ANALYTICS_INGEST_BATCH_SIZE", "1000")),
+        description="Eventos por lote gravado pelo flusher de analytics",
+    )
+    ANALYTICS_INGEST_FLUSH_INTERVAL_MS: int = Field(
+        default_factory=lambda: int(os.getenv("ANALYTICS_INGEST_FLUSH_INTERVAL_MS", "250")),
+        description="Intervalo máximo (ms) entre gravações do flusher de analytics",
+    )
+    ANALYTICS_INGEST_OVERFLOW_POLICY: str = Field(
+        default_factory=lambda: os.getenv("ANALYTICS_INGEST_OVERFLOW_POLICY", "drop_oldest"),
+        description="Política com buffer cheio: drop_oldest, drop_newest ou reject",
+    )
+    ANALYTICS_INGEST_REDIS_STREAM: str | None = Field(
+        default_factory=lambda: os.getenv("ANALYTICS_INGEST_REDIS_STREAM"),
+        description="Redis Stream para ingestão durável (vazio = apenas memória)",
+    )
+    ANALYTICS_INGEST_CONSUMER_NAME: str | None = Field(
+        default_factory=lambda: os.getenv("ANALYTICS_INGEST_CONSUMER_NAME"),
+        description="Nome estável do consumidor no Redis Stream (padrão: hostname)",
+    )
+    ANALYTICS_INGEST_CLAIM_IDLE_MS: int = Field(
+        default_factory=lambda: int(os.getenv("ANALYTICS_INGEST_CLAIM_IDLE_MS", "60000")),
+        description="Tempo (ms) parado no PEL até um evento pendente ser reivindicado por outro worker",
+    )
+    ANALYTICS_INGEST_DEAD_LETTER_SIZE: int = Field(
+        default_factory=lambda: int(os.getenv("ANALYTICS_INGEST_DEAD_LETTER_SIZE", "10000")),
+        description="Eventos rejeitados pelo banco guardados para inspeção (memória ou <stream>:dead)",
+    )
+    METRIC_ROLLUP_INTERVAL_SECONDS: int = Field(
+        default_factory=lambda: int(os.getenv("METRIC_ROLLUP_INTERVAL_SECONDS", "60")),
+        description="Intervalo da agregação incremental de métricas em rollups 1m/1h/1d",
+    )
+    METRIC_ROLLUP_BATCH_SIZE: int = Field(
+        default_factory=lambda: int(os.getenv("METRIC_ROLLUP_BATCH_SIZE", "5000")),
+        description="Linhas brutas incorporadas por transação de rollup",
+    )
+    METRIC_ROLLUP_SAFETY_LAG_SECONDS: float = Field(
+        default_factory=lambda: float(os.getenv("METRIC_ROLLUP_SAFETY_LAG_SECONDS", "30")),
+        description="Folga (s) antes de incorporar ids recém-visíveis (transações ainda abertas)",
+    )
+    METRIC_CHART_MAX_POINTS: int = Field(
+        default_factory=lambda: int(os.getenv("METRIC_CHART_MAX_POINTS", "500")),
+        description="Número máximo de pontos por série em gráficos de métricas",
+    )
+    METRIC_CHART_RAW_MAX_SPAN_MINUTES: int = Field(
+        default_factory=lambda: int(os.getenv("METRIC_CHART_RAW_MAX_SPAN_MINUTES", "60")),
+        description="Intervalos até este tamanho usam pontos brutos (com LTTB) em vez de rollups",
+    )
+    METRIC_CHART_RAW_POINT_LIMIT: int = Field(
+        default_factory=lambda: int(os.getenv("METRIC_CHART_RAW_POINT_LIMIT", "20000")),
+        description="Máximo de linhas brutas lidas por série antes de recorrer ao rollup",
+    )
+    DASHBOARD_WIDGET_CONCURRENCY: int = Field(
+        default_factory=lambda: int(os.getenv("DASHBOARD_WIDGET_CONCURRENCY", "4")),
+        description="Widgets avaliados em paralelo por dashboard (cada um usa uma conexão do pool)",
+    )
+    ANALYTICS_FUNNEL_ENGINE: str = Field(
+        default_factory=lambda: os.getenv("ANALYTICS_FUNNEL_ENGINE", "sql"),
+        description="Motor de funis: sql (funções de janela no banco) ou numpy",
+    )
+    ANALYTICS_FUNNEL_CACHE_TTL_SECONDS: int = Field(
+        default_factory=lambda: int(os.getenv("ANALYTICS_FUNNEL_CACHE_TTL_SECONDS", "300")),
+        description="TTL do cache de resultados de funis e coortes",
+    )
+    ANALYTICS_HLL_PRECISION: int = Field(
+        default_factory=lambda: int(os.getenv("ANALYTICS_HLL_PRECISION", "14")),
+        description="Precisão p do HyperLogLog de usuários ativos (2^p registradores, erro ~1.04/sqrt(2^p))",
+    )
+    ANALYTICS_HLL_EXACT_THRESHOLD: int = Field(
+        default_factory=lambda: int(os.getenv("ANALYTICS_HLL_EXACT_THRESHOLD", "1024")),
+        description="Usuários por sketch mantidos em modo exato antes de virar HyperLogLog",
+    )
+    ANALYTICS_ACTIVE_USERS_BACKFILL_DAYS: int = Field(
+        default_factory=lambda: int(os.getenv("ANALYTICS_ACTIVE_USERS_BACKFILL_DAYS", "90")),
+        description="Dias recentes reconstruídos a partir dos eventos quando falta o sketch diário",
+    )
+    ANALYTICS_ACTIVE_USERS_RETENTION_DAYS: int = Field(
+        default_factory=lambda: int(os.getenv("ANALYTICS_ACTIVE_USERS_RETENTION_DAYS", "400")),
+        description="Retenção dos sketches diários de usuários ativos",
+    )
+    ANALYTICS_ANOMALY_RESOLUTIONS: str = Field(
+        default_factory=lambda: os.getenv("ANALYTICS_ANOMALY_RESOLUTIONS", "1h,1d"),
+        description="Resoluções de rollup com detecção de anomalias (separadas por vírgula)",
+    )
+    ANALYTICS_ANOMALY_THRESHOLD: float = Field(
+        default_factory=lambda: float(os.getenv("ANALYTICS_ANOMALY_THRESHOLD", "3.5")),
+        description="|z-score| a partir do qual um bucket é sinalizado como anômalo",
+    )
+    ANALYTICS_ANOMALY_WINDOW: int = Field(
+        default_factory=lambda: int(os.getenv("ANALYTICS_ANOMALY_WINDOW", "48")),
+        description="Buckets da janela móvel (média/variância e mediana/MAD)",
+    )
+    ANALYTICS_ANOMALY_MIN_SAMPLES: int = Field(
+        default_factory=lambda: int(os.getenv("ANALYTICS_ANOMALY_MIN_SAMPLES", "12")),
+        description="Buckets de histórico antes de uma série começar a ser pontuada",
+    )
+    ANALYTICS_ANOMALY_BACKFILL_BUCKETS: int = Field(
+        default_factory=lambda: int(os.getenv("ANALYTICS_ANOMALY_BACKFILL_BUCKETS", "720")),
+        description="Buckets de histórico usados para iniciar o estado de uma série nova",
+    )
+    ANALYTICS_ANOMALY_CLOSE_DELAY_SECONDS: int = Field(
+        default_factory=lambda: int(os.getenv("ANALYTICS_ANOMALY_CLOSE_DELAY_SECONDS", "120")),
+        description="Atraso após o fim de um bucket antes de considerá-lo fechado",
+    )
+    ANALYTICS_ANOMALY_RETENTION_DAYS: int = Field(
+        default_factory=lambda: int(os.getenv("ANALYTICS_ANOMALY_RETENTION_DAYS", "90")),
+        description="Retenção das anomalias detectadas",
+    )
+    REPORT_WORKER_CONCURRENCY: int = Field(
+        default_factory=lambda: int(os.getenv("REPORT_WORKER_CONCURRENCY", "2")),
+        description="Execuções de relatório simultâneas (threads do pool de jobs)",
+    )
+    REPORT_PAGE_SIZE: int = Field(
+        default_factory=lambda: int(os.getenv("REPORT_PAGE_SIZE", "5000")),
+        description="Linhas por lote do cursor e por página do spool de resultados",
+    )
+    REPORT_DEFAULT_FORMAT: str = Field(
+        default_factory=lambda: os.getenv("REPORT_DEFAULT_FORMAT", "jsonl"),
+        description="Formato padrão do spool de relatórios: jsonl, csv ou columnar",
+    )
+    REPORT_SPOOL_RETENTION_DAYS: int = Field(
+        default_factory=lambda: int(os.getenv("REPORT_SPOOL_RETENTION_DAYS", "7")),
+        description="Dias que os resultados spoolados de relatórios ficam disponíveis",
+    )
+    REPORT_JOB_STALE_SECONDS: int = Field(
+        default_factory=lambda: int(os.getenv("REPORT_JOB_STALE_SECONDS", "300")),
+        description="Tempo sem heartbeat após o qual um job de relatório é dado como interrompido",
+    )
+    EXPORT_WORKERS: int = Field(
+        default_factory=lambda: int(os.getenv("EXPORT_WORKERS", "4")),
+        description="Partições de exportação gravadas em paralelo (threads compartilhadas)",
+    )
+    EXPORT_MAX_CONCURRENT: int = Field(
+        default_factory=lambda: int(os.getenv("EXPORT_MAX_CONCURRENT", "2")),
+        description="Exportações coordenadas simultaneamente",
+    )
+    EXPORT_PARTITION_HOURS: int = Field(
+        default_factory=lambda: int(os.getenv("EXPORT_PARTITION_HOURS", "24")),
+        description="Tamanho, em horas, do intervalo de tempo de cada partição de exportação",
+    )
+    EXPORT_BATCH_SIZE: int = Field(
+        default_factory=lambda: int(os.getenv("EXPORT_BATCH_SIZE", "10000")),
+        description="Linhas por lote do cursor de servidor ao gravar uma partição",
+    )
+    EXPORT_COMPRESSION: str = Field(
+        default_factory=lambda: os.getenv("EXPORT_COMPRESSION", "gzip"),
+        description="Compressão padrão das exportações: gzip, zstd ou none",
+    )
+    EXPORT_USE_COPY: bool = Field(
+        default_factory=lambda: os.getenv("EXPORT_USE_COPY", "true").lower() == "true",
+        description="Usa COPY TO STDOUT para partições CSV no PostgreSQL",
+    )
+    EXPORT_RETENTION_DAYS: int = Field(
+        default_factory=lambda: int(os.getenv("EXPORT_RETENTION_DAYS", "7")),
+        description="Dias que os arquivos de exportação ficam disponíveis para download",
+    )
+    EXPORT_STALE_SECONDS: int = Field(
+        default_factory=lambda: int(os.getenv("EXPORT_STALE_SECONDS", "300")),
+        description="Tempo sem heartbeat após o qual uma exportação é dada como interrompida",
+    )
+
+    # ============================
+    # CONFIGURAÇÕES DE KNOWLEDGE BASE (RETRIEVAL)
+    # ============================
+    KB_CHUNK_SIZE: int = Field(
+        default_factory=lambda: int(os.getenv("KB_CHUNK_SIZE", "800")),
+        description="Tamanho alvo (caracteres) de cada chunk da knowledge base",
+    )
+    KB_CHUNK_OVERLAP: int = Field(
+        default_factory=lambda: int(os.getenv("KB_CHUNK_OVERLAP", "100")),
+        description="Sobreposição (caracteres) entre chunks consecutivos",
+    )
+    KB_EMBEDDER: str = Field(
+        default_factory=lambda: os.getenv("KB_EMBEDDER", "hashing"),
+        description="Embedder usado na indexação (hashing, openai)",
+    )
+    KB_EMBEDDING_DIM: int = Field(
+        default_factory=lambda: int(os.getenv("KB_EMBEDDING_DIM", "384")),
+        description="Dimensão dos embeddings do embedder local",
+    )
+    KB_EMBEDDING_BATCH_SIZE: int = Field(
+        default_factory=lambda: int(os.getenv("KB_EMBEDDING_BATCH_SIZE", "64")),
+        description="Tamanho do lote de chunks enviados ao embedder",
+    )
+    KB_VECTOR_BACKEND: str = Field(
+        default_factory=lambda: os.getenv("KB_VECTOR_BACKEND", "numpy"),
+        description="Backend do índice vetorial (numpy, hnsw, pgvector)",
+    )
 
     # ============================
     # CONFIGURAÇÕES DE BACKUP
@@ -743,6 +1086,60 @@ class Settings(BaseSettings):
         == "true",
         description="Habilitar sistema de alertas",
     )
+    ALERT_TICK_SECONDS: float = Field(
+        default_factory=lambda: float(os.getenv("ALERT_TICK_SECONDS", "5")),
+        description="Resolução da roda de timers da avaliação de alertas (segundos)",
+    )
+    ALERT_DEFAULT_INTERVAL_SECONDS: int = Field(
+        default_factory=lambda: int(os.getenv("ALERT_DEFAULT_INTERVAL_SECONDS", "60")),
+        description="Intervalo de avaliação de alertas sem evaluation_interval_seconds",
+    )
+    ALERT_REFRESH_SECONDS: int = Field(
+        default_factory=lambda: int(os.getenv("ALERT_REFRESH_SECONDS", "30")),
+        description="Intervalo de recarga das condições dos alertas ativos",
+    )
+    ALERT_NOTIFICATION_WORKERS: int = Field(
+        default_factory=lambda: int(os.getenv("ALERT_NOTIFICATION_WORKERS", "8")),
+        description="Workers de entrega de notificações de alerta",
+    )
+    ALERT_NOTIFICATION_CONCURRENCY: str = Field(
+        default_factory=lambda: os.getenv(
+            "ALERT_NOTIFICATION_CONCURRENCY", "email:4,webhook:16,websocket:32"
+        ),
+        description="Entregas simultâneas por canal (canal:limite, separados por vírgula)",
+    )
+    ALERT_NOTIFICATION_GROUP_SECONDS: int = Field(
+        default_factory=lambda: int(os.getenv("ALERT_NOTIFICATION_GROUP_SECONDS", "30")),
+        description="Janela de agrupamento: disparos para o mesmo destino viram um resumo",
+    )
+    ALERT_NOTIFICATION_DEDUP_SECONDS: int = Field(
+        default_factory=lambda: int(os.getenv("ALERT_NOTIFICATION_DEDUP_SECONDS", "300")),
+        description="Disparo idêntico (alerta, destino, severidade) entregue há menos que isso é descartado",
+    )
+    ALERT_NOTIFICATION_MAX_ATTEMPTS: int = Field(
+        default_factory=lambda: int(os.getenv("ALERT_NOTIFICATION_MAX_ATTEMPTS", "6")),
+        description="Tentativas de entrega antes de a notificação ser descartada",
+    )
+    ALERT_NOTIFICATION_RETRY_BASE_SECONDS: float = Field(
+        default_factory=lambda: float(os.getenv("ALERT_NOTIFICATION_RETRY_BASE_SECONDS", "5")),
+        description="Atraso base do backoff exponencial das entregas",
+    )
+    ALERT_NOTIFICATION_RETRY_MAX_SECONDS: float = Field(
+        default_factory=lambda: float(os.getenv("ALERT_NOTIFICATION_RETRY_MAX_SECONDS", "900")),
+        description="Atraso máximo entre tentativas de entrega",
+    )
+    ALERT_NOTIFICATION_WEBHOOK_TIMEOUT: float = Field(
+        default_factory=lambda: float(os.getenv("ALERT_NOTIFICATION_WEBHOOK_TIMEOUT", "10")),
+        description="Timeout dos webhooks de alerta (segundos)",
+    )
+    ALERT_NOTIFICATION_RETENTION_DAYS: int = Field(
+        default_factory=lambda: int(os.getenv("ALERT_NOTIFICATION_RETENTION_DAYS", "14")),
+        description="Dias de retenção das notificações entregues ou descartadas no outbox",
+    )
+    ALERT_NOTIFICATION_LEASE_SECONDS: float = Field(
+        default_factory=lambda: float(os.getenv("ALERT_NOTIFICATION_LEASE_SECONDS", "300")),
+        description="Prazo de uma reivindicação; depois dele outro processo pode reivindicar a notificação",
+    )
 
     # ============================
     # CONFIGURAÇÕES DE WEBHOOK
@@ -11,9 +11,17 @@ from .base import (
     ExecutorRegistry,
     executor_registry,
 )
+from .plan import ExecutionPlan, NodeSpec, PlanNode, compile_plan
 from .llm_executor import LLMExecutor, LLMProvider
 from .http_executor import HTTPExecutor, HTTPMethod, AuthType
-from .transform_executor import TransformExecutor, TransformType, DataType
+from .transform_executor import (
+    TransformExecutor,
+    TransformType,
+    DataType,
+    ExecutionMode,
+    OffloadMode,
+)
+from .worker_pool import NodeWorkerPool, OffloadTarget, TaskLimits, get_worker_pool
 
 
 # Inicializa e registra todos os executores
@@ -39,6 +47,11 @@ __all__ = [
     "ExecutionContext",
     "ExecutorRegistry",
     "executor_registry",
+    # Planos de execução compilados
+    "ExecutionPlan",
+    "NodeSpec",
+    "PlanNode",
+    "compile_plan",
     # Executores específicos
     "LLMExecutor",
     "LLMProvider",
@@ -48,6 +61,13 @@ __all__ = [
     "TransformExecutor",
     "TransformType",
     "DataType",
+    "ExecutionMode",
+    "OffloadMode",
+    # Pool de processos
+    "NodeWorkerPool",
+    "OffloadTarget",
+    "TaskLimits",
+    "get_worker_pool",
     # Funções
     "initialize_executors",
 ]
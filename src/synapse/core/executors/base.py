@@ -13,6 +13,10 @@ import json
 import traceback
 from enum import Enum
 
+from synapse.core.executors.outputs import ExecutionOutputStore, NodeOutputs
+from synapse.core.executors.plan import PlanNode, parse_config
+from synapse.core.executors.templates import MISSING, compile_template
+from synapse.core.executors.worker_pool import OffloadTarget
 from synapse.models.node_execution import NodeExecution
 from synapse.models.node import Node
 
@@ -38,7 +42,8 @@ class ExecutorType(str, Enum):
 class ExecutionContext:
     """
     Contexto compartilhado durante a execução de um workflow
-    Contém dados, variáveis e estado da execução
+    Contém dados, variáveis e estado da execução. Com ``output_store``, os
+    outputs grandes dos nós ficam no armazenamento e são lidos sob demanda
     """
 
     def __init__(
@@ -49,6 +54,8 @@ class ExecutionContext:
         variables: dict[str, Any] = None,
         input_data: dict[str, Any] = None,
         context_data: dict[str, Any] = None,
+        output_store: ExecutionOutputStore | None = None,
+        output_cache_bytes: int = 1024 * 1024,
     ):
         self.execution_id = execution_id
         self.workflow_id = workflow_id
@@ -56,7 +63,11 @@ class ExecutionContext:
         self.variables = variables or {}
         self.input_data = input_data or {}
         self.context_data = context_data or {}
-        self.node_outputs: dict[str, Any] = {}
+        self.node_outputs = NodeOutputs(
+            output_store,
+            execution_id=execution_id,
+            cache_bytes=output_cache_bytes,
+        )
         self.execution_start_time = datetime.utcnow()
         self.current_node_id: str | None = None
         self.error_count = 0
@@ -94,7 +105,7 @@ class ExecutionContext:
             "variables": self.variables,
             "input_data": self.input_data,
             "context_data": self.context_data,
-            "node_outputs": self.node_outputs,
+            "node_outputs": self.node_outputs.snapshot(),
             "execution_start_time": self.execution_start_time.isoformat(),
             "current_node_id": self.current_node_id,
             "error_count": self.error_count,
@@ -150,6 +161,29 @@ class BaseExecutor(ABC):
         """
         return [self.executor_type.value]
 
+    def offload_target(self, config: dict[str, Any], data: Any = None) -> OffloadTarget:
+        """
+        Onde o nó roda: no event loop (padrão, executores IO-bound) ou no pool
+        de processos (executores CPU-bound sobrescrevem)
+        """
+        return OffloadTarget.LOOP
+
+    def _parse_node_config(self, node: Node) -> dict[str, Any]:
+        """
+        Parse da configuração do nó
+        """
+        return parse_config(node.config)
+
+    def prepare_config(self, node: Node | PlanNode) -> tuple[dict[str, Any], list[str]]:
+        """
+        Configuração do nó e erros de validação. Nós de um plano compilado já
+        chegam parseados e validados; os demais são processados aqui
+        """
+        if isinstance(node, PlanNode):
+            return node.config, list(node.errors)
+        config = self._parse_node_config(node)
+        return config, self.validate_config(config)["errors"]
+
     async def pre_execute(
         self,
         node: Node,
@@ -250,42 +284,103 @@ class BaseExecutor(ABC):
     ) -> str:
         """
         Resolve variáveis em templates usando sintaxe {{variable}}
+
+        O template é compilado uma única vez (cache por texto) e cada
+        placeholder é resolvido sob demanda via ``lookup_variable``, com
+        suporte a caminhos aninhados ({{node_id.output.campo}}).
+        Placeholders sem valor são mantidos no texto.
         """
         if not template or not isinstance(template, str):
             return template
 
-        # Combina todas as variáveis disponíveis
-        all_vars = {
-            **context.variables,
-            **context.input_data,
-            **context.context_data,
-            **context.node_outputs,
-            **(additional_vars or {}),
-        }
+        compiled = compile_template(template)
+        if compiled.is_static:
+            return template
 
-        # Adiciona variáveis especiais
-        all_vars.update(
-            {
-                "execution_id": context.execution_id,
-                "workflow_id": context.workflow_id,
-                "user_id": context.user_id,
-                "current_timestamp": datetime.utcnow().isoformat(),
-                "current_node_id": context.current_node_id,
-            }
+        return compiled.render(
+            lambda path: self.lookup_variable(path, context, additional_vars, MISSING)
         )
 
-        # Resolve as variáveis
-        result = template
-        for key, value in all_vars.items():
-            placeholder = f"{{{{{key}}}}}"
-            if placeholder in result:
-                # Converte valor para string se necessário
-                str_value = (
-                    json.dumps(value) if isinstance(value, (dict, list)) else str(value)
-                )
-                result = result.replace(placeholder, str_value)
-
-        return result
+    def resolve_config_templates(
+        self,
+        value: Any,
+        context: ExecutionContext,
+        additional_vars: dict[str, Any] = None,
+    ) -> Any:
+        """
+        Resolve templates em todas as strings de uma estrutura (dict/list)
+        """
+        if isinstance(value, str):
+            return self.resolve_template_variables(value, context, additional_vars)
+        if isinstance(value, dict):
+            return {
+                key: self.resolve_config_templates(item, context, additional_vars)
+                for key, item in value.items()
+            }
+        if isinstance(value, list):
+            return [
+                self.resolve_config_templates(item, context, additional_vars)
+                for item in value
+            ]
+        return value
+
+    def lookup_variable(
+        self,
+        path: str,
+        context: ExecutionContext,
+        additional_vars: dict[str, Any] = None,
+        default: Any = None,
+    ) -> Any:
+        """
+        Resolve um caminho ``nome[.campo...]`` consultando, em ordem de
+        precedência: variáveis especiais, variáveis adicionais, outputs de nós,
+        dados de contexto, input e variáveis do workflow
+        """
+        name, _, rest = path.partition(".")
+
+        if name == "execution_id":
+            value = context.execution_id
+        elif name == "workflow_id":
+            value = context.workflow_id
+        elif name == "user_id":
+            value = context.user_id
+        elif name == "current_timestamp":
+            value = datetime.utcnow().isoformat()
+        elif name == "current_node_id":
+            value = context.current_node_id
+        else:
+            sources = (
+                additional_vars or {},
+                context.node_outputs,
+                context.context_data,
+                context.input_data,
+                context.variables,
+            )
+            for source in sources:
+                if name in source:
+                    value = source[name]
+                    break
+            else:
+                # Chaves que contêm pontos ("a.b") também são aceitas
+                if rest:
+                    for source in sources:
+                        if path in source:
+                            return source[path]
+                return default
+
+        for part in rest.split(".") if rest else ():
+            if isinstance(value, dict):
+                if part not in value:
+                    return default
+                value = value[part]
+            elif isinstance(value, (list, tuple)) and part.isdigit():
+                index = int(part)
+                if index >= len(value):
+                    return default
+                value = value[index]
+            else:
+                return default
+        return value
 
     def extract_inputs_from_connections(
         self,
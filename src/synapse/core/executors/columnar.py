@@ -0,0 +1,552 @@
+"""
+Motor colunar do Transform Executor
+Converte listas de dicionários em colunas uma única vez e avalia filtros,
+agregações, agrupamentos e joins com kernels vetorizados (NumPy)
+"""
+
+import json
+import math
+import re
+from collections.abc import Iterable, Sequence
+from functools import lru_cache
+from itertools import repeat
+from typing import Any
+
+import numpy as np
+from jsonpath_ng import parse as jsonpath_parse
+
+_PERCENTILE_PATTERN = re.compile(r"^p(\d{1,2}(?:\.\d+)?|100)$")
+
+
+@lru_cache(maxsize=1024)
+def split_path(path: str) -> tuple[str, ...]:
+    """Divide um caminho em notação de ponto (cacheado por texto do caminho)"""
+    return tuple(path.split("."))
+
+
+@lru_cache(maxsize=256)
+def compile_jsonpath(path: str):
+    """Compila uma expressão JSONPath (cacheada por texto da expressão)"""
+    return jsonpath_parse(path)
+
+
+def extract_path(item: Any, parts: Sequence[str]) -> Any:
+    """Extrai um valor de ``item`` seguindo um caminho já dividido"""
+    value = item
+    try:
+        for part in parts:
+            if part.isdigit() and isinstance(value, (list, tuple)):
+                value = value[int(part)]
+            elif isinstance(value, dict):
+                value = value.get(part)
+            else:
+                return None
+        return value
+    except (IndexError, TypeError):
+        return None
+
+
+def extract_jsonpath(item: Any, path: str) -> Any:
+    """Extrai um valor usando JSONPath (um match -> valor, vários -> lista)"""
+    try:
+        matches = compile_jsonpath(path).find(item)
+    except Exception:
+        return None
+    if not matches:
+        return None
+    if len(matches) == 1:
+        return matches[0].value
+    return [match.value for match in matches]
+
+
+def extract_many(
+    items: Iterable[Any], path: str | None, all_dicts: bool = False
+) -> list[Any]:
+    """
+    Extrai o mesmo caminho de todos os itens, resolvendo o caminho uma única vez.
+    ``all_dicts`` indica que todos os itens já são dicionários.
+    """
+    if not path:
+        return list(items)
+    if path.startswith("$"):
+        return [extract_jsonpath(item, path) for item in items]
+    parts = split_path(path)
+    if not any(part.isdigit() for part in parts):
+        # Caminho só de chaves: uma passada por nível em vez de um laço por item
+        values = items
+        for depth, key in enumerate(parts):
+            if depth == 0 and all_dicts:
+                values = list(map(dict.get, values, repeat(key)))
+            else:
+                values = [value.get(key) if isinstance(value, dict) else None for value in values]
+        return values if isinstance(values, list) else list(values)
+    return [extract_path(item, parts) for item in items]
+
+
+def is_number(value: Any) -> bool:
+    return isinstance(value, (int, float))
+
+
+def parse_percentile(operation: str) -> float | None:
+    """Converte ``median``/``pNN`` no percentil correspondente"""
+    if operation == "median":
+        return 50.0
+    match = _PERCENTILE_PATTERN.match(operation)
+    return float(match.group(1)) if match else None
+
+
+def percentile_of_sorted(values: Sequence[float], q: float) -> float | None:
+    """Percentil com interpolação linear sobre valores já ordenados"""
+    if not values:
+        return None
+    position = (len(values) - 1) * q / 100.0
+    lower = math.floor(position)
+    upper = math.ceil(position)
+    if lower == upper:
+        return float(values[lower])
+    return float(values[lower] + (values[upper] - values[lower]) * (position - lower))
+
+
+def hashable_key(value: Any) -> Any:
+    """Chave hasheável para joins/agrupamentos (dicts e listas viram JSON)"""
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, sort_keys=True, default=str)
+    return value
+
+
+def factorize(values: Sequence[Any]) -> tuple[np.ndarray, list[Any]]:
+    """
+    Codifica valores em inteiros por ordem de primeira aparição.
+    Retorna (códigos, valores únicos)
+    """
+    index: dict[Any, int] = {}
+    setdefault = index.setdefault
+    codes = np.fromiter(
+        (setdefault(value, len(index)) for value in values),
+        dtype=np.int64,
+        count=len(values),
+    )
+    return codes, list(index)
+
+
+class Column:
+    """Coluna extraída de um frame, com visão numérica calculada sob demanda"""
+
+    __slots__ = ("values", "_numeric", "_integer")
+
+    def __init__(self, values: list[Any]):
+        self.values = values
+        self._numeric: np.ndarray | None = None
+        self._integer = True
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    @property
+    def numeric(self) -> np.ndarray:
+        """Valores como float64, com NaN onde o valor não é numérico"""
+        if self._numeric is None:
+            # Caminho rápido: colunas homogêneas viram array nativo direto
+            try:
+                native = np.asarray(self.values)
+            except (ValueError, TypeError):
+                native = None
+            if native is not None and native.ndim == 1 and native.dtype.kind in "biuf":
+                self._numeric = native.astype(np.float64)
+                self._integer = native.dtype.kind != "f"
+                return self._numeric
+
+            integer = True
+            nan = math.nan
+
+            def convert(value):
+                nonlocal integer
+                if isinstance(value, (int, float)):
+                    if integer and isinstance(value, float):
+                        integer = False
+                    return value
+                return nan
+
+            self._numeric = np.fromiter(
+                (convert(value) for value in self.values),
+                dtype=np.float64,
+                count=len(self.values),
+            )
+            self._integer = integer
+        return self._numeric
+
+    @property
+    def is_integer(self) -> bool:
+        """True se todos os valores numéricos da coluna forem inteiros"""
+        self.numeric  # garante a conversão (que também detecta floats)
+        return self._integer
+
+    def valid_numeric(self) -> np.ndarray:
+        values = self.numeric
+        return values[~np.isnan(values)]
+
+    def valid_positions(self) -> np.ndarray:
+        """Posições (nos valores originais) dos valores numéricos"""
+        return np.flatnonzero(~np.isnan(self.numeric))
+
+    def extreme(self, operation: str) -> Any:
+        """
+        Valor original (mesmo tipo da entrada, como no modo linha) do
+        mínimo/máximo; primeira ocorrência em caso de empate
+        """
+        values = self.valid_numeric()
+        if not values.size:
+            return None
+        position = values.argmin() if operation == "min" else values.argmax()
+        return self.values[self.valid_positions()[position]]
+
+
+def _as_python(value: float, integer: bool) -> int | float:
+    return int(value) if integer else float(value)
+
+
+def aggregate_column(column: Column, operations: Sequence[str], row_count: int) -> dict[str, Any]:
+    """Calcula as agregações de uma coluna com uma única conversão numérica"""
+    result: dict[str, Any] = {}
+    valid = column.valid_numeric()
+    integer = column.is_integer
+    percentiles = {op: q for op in operations if (q := parse_percentile(op)) is not None}
+    if percentiles and valid.size:
+        computed = np.percentile(valid, list(percentiles.values()))
+        percentile_values = dict(zip(percentiles, (float(v) for v in computed)))
+    else:
+        percentile_values = dict.fromkeys(percentiles)
+
+    for operation in operations:
+        if operation == "count":
+            result["count"] = row_count
+        elif operation == "sum":
+            result["sum"] = _as_python(valid.sum(), integer)
+        elif operation == "avg":
+            result["avg"] = float(valid.mean()) if valid.size else 0
+        elif operation in ("min", "max"):
+            result[operation] = column.extreme(operation)
+        elif operation in ("std", "var"):
+            if valid.size:
+                result[operation] = float(valid.std() if operation == "std" else valid.var())
+            else:
+                result[operation] = None
+        elif operation == "count_distinct":
+            result["count_distinct"] = len({hashable_key(v) for v in column.values if v is not None})
+        elif operation in percentile_values:
+            result[operation] = percentile_values[operation]
+    return result
+
+
+def aggregate_values(values: Sequence[Any], operations: Sequence[str], row_count: int) -> dict[str, Any]:
+    """Versão em modo linha de ``aggregate_column`` (Python puro)"""
+    result: dict[str, Any] = {}
+    numeric = [v for v in values if is_number(v)]
+    ordered: list[float] | None = None
+
+    for operation in operations:
+        if operation == "count":
+            result["count"] = row_count
+        elif operation == "sum":
+            result["sum"] = sum(numeric)
+        elif operation == "avg":
+            result["avg"] = sum(numeric) / len(numeric) if numeric else 0
+        elif operation == "min":
+            result["min"] = min(numeric) if numeric else None
+        elif operation == "max":
+            result["max"] = max(numeric) if numeric else None
+        elif operation in ("std", "var"):
+            if numeric:
+                mean = sum(numeric) / len(numeric)
+                variance = sum((v - mean) ** 2 for v in numeric) / len(numeric)
+                result[operation] = math.sqrt(variance) if operation == "std" else variance
+            else:
+                result[operation] = None
+        elif operation == "count_distinct":
+            result["count_distinct"] = len({hashable_key(v) for v in values if v is not None})
+        elif (q := parse_percentile(operation)) is not None:
+            if ordered is None:
+                ordered = sorted(numeric)
+            result[operation] = percentile_of_sorted(ordered, q)
+    return result
+
+
+class ColumnarFrame:
+    """
+    Visão colunar de uma lista de registros (todos dicionários, ver ``is_tabular``).
+
+    Cada caminho de campo é extraído uma única vez e reaproveitado por todas
+    as operações da transformação.
+    """
+
+    def __init__(self, records: Sequence[Any]):
+        self.records = records if isinstance(records, list) else list(records)
+        self._columns: dict[str, Column] = {}
+
+    @staticmethod
+    def is_tabular(data: Any) -> bool:
+        """True se ``data`` for uma lista não vazia de dicionários"""
+        return (
+            isinstance(data, (list, tuple))
+            and len(data) > 0
+            and all(isinstance(item, dict) for item in data)
+        )
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def column(self, path: str | None) -> Column:
+        key = path or ""
+        column = self._columns.get(key)
+        if column is None:
+            column = Column(extract_many(self.records, path, all_dicts=True))
+            self._columns[key] = column
+        return column
+
+    def take(self, indices: np.ndarray | Sequence[int]) -> list[Any]:
+        records = self.records
+        return [records[i] for i in indices]
+
+    # ------------------------------------------------------------------
+    # Projeção / filtro / ordenação
+    # ------------------------------------------------------------------
+
+    def project(self, mapping: dict[str, str]) -> list[dict[str, Any]]:
+        """Aplica um mapeamento campo_destino -> caminho_origem a todas as linhas"""
+        targets = list(mapping)
+        columns = [self.column(mapping[target]).values for target in targets]
+        return [dict(zip(targets, row)) for row in zip(*columns)]
+
+    def filter_mask(self, condition: dict[str, Any]) -> np.ndarray:
+        """Avalia uma condição estruturada para todas as linhas de uma vez"""
+        column = self.column(condition.get("field"))
+        operator = condition.get("operator", "eq")
+        value = condition.get("value")
+        values = column.values
+        size = len(values)
+
+        numeric_value = is_number(value) and not isinstance(value, bool)
+        if numeric_value and operator in ("eq", "ne", "gt", "gte", "lt", "lte"):
+            numeric = column.numeric
+            with np.errstate(invalid="ignore"):
+                if operator == "eq":
+                    return numeric == value
+                if operator == "ne":
+                    return ~(numeric == value)
+                if operator == "gt":
+                    return numeric > value
+                if operator == "gte":
+                    return numeric >= value
+                if operator == "lt":
+                    return numeric < value
+                return numeric <= value
+
+        if operator == "eq":
+            return np.fromiter((v == value for v in values), dtype=bool, count=size)
+        if operator == "ne":
+            return np.fromiter((v != value for v in values), dtype=bool, count=size)
+        if operator in ("gt", "gte", "lt", "lte"):
+            compare = _COMPARATORS[operator]
+            return np.fromiter((_safe_compare(compare, v, value) for v in values), dtype=bool, count=size)
+        if operator == "in":
+            if not isinstance(value, (list, tuple)):
+                return np.zeros(size, dtype=bool)
+            candidates = {hashable_key(v) for v in value}
+            return np.fromiter((hashable_key(v) in candidates for v in values), dtype=bool, count=size)
+        if operator == "contains":
+            return np.fromiter((_safe_contains(v, value) for v in values), dtype=bool, count=size)
+        if operator == "regex":
+            pattern = re.compile(value)
+            return np.fromiter((bool(pattern.search(str(v))) for v in values), dtype=bool, count=size)
+        return np.zeros(size, dtype=bool)
+
+    def filter(self, condition: dict[str, Any]) -> list[Any]:
+        return self.take(np.flatnonzero(self.filter_mask(condition)))
+
+    def sort(self, key: str, reverse: bool = False) -> list[Any] | None:
+        """Ordena por uma chave numérica; retorna None se a chave não for numérica"""
+        numeric = self.column(key).numeric
+        if np.isnan(numeric).any():
+            return None
+        order = np.argsort(-numeric if reverse else numeric, kind="stable")
+        return self.take(order)
+
+    # ------------------------------------------------------------------
+    # Agregação / agrupamento
+    # ------------------------------------------------------------------
+
+    def aggregate(self, field: str | None, operations: Sequence[str]) -> dict[str, Any]:
+        return aggregate_column(self.column(field), operations, len(self.records))
+
+    def group_codes(self, key: str) -> tuple[np.ndarray, list[str]]:
+        """Códigos de grupo (ordem de primeira aparição) usando ``str(valor)`` como chave"""
+        values = self.column(key).values
+        native = np.asarray(values) if values and isinstance(values[0], str) else None
+        if native is None or native.dtype.kind != "U":
+            return factorize([str(v) for v in values])
+
+        # Chaves só de strings: np.unique em C, reordenado por primeira aparição
+        uniques, first_index, inverse = np.unique(
+            native, return_index=True, return_inverse=True
+        )
+        order = np.argsort(first_index)
+        rank = np.empty_like(order)
+        rank[order] = np.arange(len(order))
+        return rank[inverse].astype(np.int64), uniques[order].tolist()
+
+    def group(self, key: str) -> dict[str, list[Any]]:
+        codes, keys = self.group_codes(key)
+        order = np.argsort(codes, kind="stable")
+        bounds = np.cumsum(np.bincount(codes, minlength=len(keys)))[:-1]
+        return {
+            group_key: self.take(indices)
+            for group_key, indices in zip(keys, np.split(order, bounds))
+        }
+
+    def group_aggregate(
+        self,
+        key: str,
+        field: str | None,
+        operations: Sequence[str],
+    ) -> dict[str, dict[str, Any]]:
+        """Agregações por grupo calculadas com bincount/ufunc.at, sem laço por linha"""
+        codes, keys = self.group_codes(key)
+        groups = len(keys)
+        column = self.column(field)
+        numeric = column.numeric
+        integer = column.is_integer
+        valid = ~np.isnan(numeric)
+        valid_codes = codes[valid]
+        valid_values = numeric[valid]
+
+        rows = np.bincount(codes, minlength=groups)
+        counts = np.bincount(valid_codes, minlength=groups)
+        sums = np.bincount(valid_codes, weights=valid_values, minlength=groups)
+        computed: dict[str, list[Any]] = {}
+
+        for operation in operations:
+            if operation == "count":
+                computed[operation] = rows.tolist()
+            elif operation == "sum":
+                computed[operation] = [_as_python(v, integer) for v in sums]
+            elif operation == "avg":
+                with np.errstate(invalid="ignore", divide="ignore"):
+                    means = sums / counts
+                computed[operation] = [float(m) if c else 0 for m, c in zip(means, counts)]
+            elif operation in ("min", "max"):
+                # Ordena por (grupo, valor) de forma estável: o primeiro de cada
+                # grupo é o extremo, e devolvemos o valor original (tipo da entrada)
+                ranked = valid_values if operation == "min" else -valid_values
+                order = np.lexsort((ranked, valid_codes))
+                ordered_codes = valid_codes[order]
+                firsts = order[np.r_[True, ordered_codes[1:] != ordered_codes[:-1]]] if order.size else order
+                positions = np.flatnonzero(valid)
+                extremes: list[Any] = [None] * groups
+                for code, index in zip(valid_codes[firsts].tolist(), positions[firsts].tolist()):
+                    extremes[code] = column.values[index]
+                computed[operation] = extremes
+            elif operation in ("std", "var"):
+                squares = np.bincount(valid_codes, weights=valid_values**2, minlength=groups)
+                with np.errstate(invalid="ignore", divide="ignore"):
+                    means = sums / counts
+                    variance = np.maximum(squares / counts - means**2, 0.0)
+                series = np.sqrt(variance) if operation == "std" else variance
+                computed[operation] = [float(v) if c else None for v, c in zip(series, counts)]
+            elif operation == "count_distinct":
+                distinct: list[set] = [set() for _ in range(groups)]
+                for code, value in zip(codes.tolist(), column.values):
+                    if value is not None:
+                        distinct[code].add(hashable_key(value))
+                computed[operation] = [len(values) for values in distinct]
+            elif (q := parse_percentile(operation)) is not None:
+                computed[operation] = self._group_percentile(
+                    valid_codes, valid_values, counts, q
+                )
+
+        return {
+            group_key: {operation: series[i] for operation, series in computed.items()}
+            for i, group_key in enumerate(keys)
+        }
+
+    @staticmethod
+    def _group_percentile(
+        codes: np.ndarray,
+        values: np.ndarray,
+        counts: np.ndarray,
+        q: float,
+    ) -> list[float | None]:
+        """Percentil por grupo: uma ordenação (grupo, valor) e interpolação vetorizada"""
+        if not values.size:
+            return [None] * len(counts)
+        ordered = values[np.lexsort((values, codes))]
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        position = (np.maximum(counts, 1) - 1) * q / 100.0
+        lower = np.floor(position).astype(np.int64)
+        upper = np.ceil(position).astype(np.int64)
+        last = len(ordered) - 1
+        low_values = ordered[np.minimum(starts + lower, last)]
+        high_values = ordered[np.minimum(starts + upper, last)]
+        result = low_values + (high_values - low_values) * (position - lower)
+        return [float(v) if c else None for v, c in zip(result, counts)]
+
+    # ------------------------------------------------------------------
+    # Join
+    # ------------------------------------------------------------------
+
+    def hash_join(
+        self,
+        right: Sequence[dict[str, Any]],
+        left_key: str,
+        right_key: str,
+        how: str = "inner",
+        suffix: str = "_right",
+    ) -> list[dict[str, Any]]:
+        """
+        Hash join: constrói a tabela hash do lado direito uma vez e sonda com o
+        lado esquerdo. Suporta ``inner`` e ``left``; colunas repetidas do lado
+        direito recebem ``suffix``.
+        """
+        if how not in ("inner", "left"):
+            raise ValueError(f"Tipo de join não suportado: {how}")
+
+        right_records = list(right)
+        table: dict[Any, list[int]] = {}
+        for index, value in enumerate(extract_many(right_records, right_key)):
+            if value is not None:
+                table.setdefault(hashable_key(value), []).append(index)
+
+        joined: list[dict[str, Any]] = []
+        for left_record, value in zip(self.records, self.column(left_key).values):
+            matches = table.get(hashable_key(value)) if value is not None else None
+            if not matches:
+                if how == "left":
+                    joined.append(dict(left_record))
+                continue
+            for index in matches:
+                merged = dict(left_record)
+                for name, right_value in right_records[index].items():
+                    merged[f"{name}{suffix}" if name in left_record else name] = right_value
+                joined.append(merged)
+        return joined
+
+
+def _safe_compare(compare, left: Any, right: Any) -> bool:
+    try:
+        return bool(compare(left, right))
+    except TypeError:
+        return False
+
+
+def _safe_contains(container: Any, value: Any) -> bool:
+    try:
+        return value in container if hasattr(container, "__contains__") else False
+    except TypeError:
+        return False
+
+
+_COMPARATORS = {
+    "gt": lambda a, b: a > b,
+    "gte": lambda a, b: a >= b,
+    "lt": lambda a, b: a < b,
+    "lte": lambda a, b: a <= b,
+}
@@ -0,0 +1,846 @@
+"""
+Linguagem de expressões segura do Transform Executor
+Expressões (subconjunto restrito da sintaxe Python) são analisadas e
+compiladas uma única vez em closures, com cache LRU por texto da expressão
+"""
+
+import ast
+import json
+import math
+import operator
+import re
+from collections.abc import Callable, Mapping
+from functools import lru_cache
+from typing import Any
+
+EXPRESSION_CACHE_SIZE = 1024
+MAX_SEQUENCE_LENGTH = 1_000_000
+MAX_POWER_EXPONENT = 1_000
+MAX_INTEGER_BITS = 100_000
+MAX_LOOP_ITERATIONS = 1_000_000
+
+_TEMPLATE_PATTERN = re.compile(r"\{\{\s*([^{}]+?)\s*\}\}")
+_TEMPLATE_MARKER = re.compile(r"_tpl(\d+)_")
+_FORMAT_NUMBER = re.compile(r"\d+")
+_PERCENT_SPEC = re.compile(r"%[^a-zA-Z%]*")
+
+Evaluator = Callable[[dict[str, Any]], Any]
+
+
+class ExpressionError(ValueError):
+    """Erro de compilação ou avaliação de uma expressão"""
+
+
+@lru_cache(maxsize=256)
+def _regex(pattern: str, flags: int = 0) -> re.Pattern:
+    return re.compile(pattern, flags)
+
+
+class Namespace:
+    """Módulo exposto às expressões com apenas os membros permitidos"""
+
+    __slots__ = ("name", "members")
+
+    def __init__(self, name: str, members: dict[str, Any]):
+        self.name = name
+        self.members = members
+
+    def member(self, attr: str) -> Any:
+        if attr not in self.members:
+            raise ExpressionError(f"'{self.name}.{attr}' não é permitido")
+        return self.members[attr]
+
+
+def _bounded_range(*args: int) -> range:
+    result = range(*args)
+    if len(result) > MAX_SEQUENCE_LENGTH:
+        raise ExpressionError("range excede o tamanho máximo permitido")
+    return result
+
+
+def _coalesce(*values: Any) -> Any:
+    return next((value for value in values if value is not None), None)
+
+
+def _get_path(value: Any, path: str, default: Any = None) -> Any:
+    for part in str(path).split("."):
+        if isinstance(value, Mapping):
+            value = value.get(part)
+        elif isinstance(value, (list, tuple)) and part.lstrip("-").isdigit():
+            index = int(part)
+            value = value[index] if -len(value) <= index < len(value) else None
+        else:
+            return default
+        if value is None:
+            return default
+    return value
+
+
+RE_NAMESPACE = Namespace(
+    "re",
+    {
+        "search": lambda pattern, string, flags=0: _regex(pattern, flags).search(string),
+        "match": lambda pattern, string, flags=0: _regex(pattern, flags).match(string),
+        "fullmatch": lambda pattern, string, flags=0: _regex(pattern, flags).fullmatch(string),
+        "findall": lambda pattern, string, flags=0: _regex(pattern, flags).findall(string),
+        "sub": lambda pattern, repl, string, count=0, flags=0: _regex(pattern, flags).sub(
+            repl, string, count
+        ),
+        "split": lambda pattern, string, maxsplit=0, flags=0: _regex(pattern, flags).split(
+            string, maxsplit
+        ),
+        "escape": re.escape,
+        "IGNORECASE": re.IGNORECASE,
+        "I": re.IGNORECASE,
+        "MULTILINE": re.MULTILINE,
+        "M": re.MULTILINE,
+        "DOTALL": re.DOTALL,
+        "S": re.DOTALL,
+    },
+)
+
+JSON_NAMESPACE = Namespace(
+    "json",
+    {
+        "dumps": lambda value, sort_keys=False: json.dumps(value, sort_keys=sort_keys, default=str),
+        "loads": json.loads,
+    },
+)
+
+MATH_NAMESPACE = Namespace(
+    "math",
+    {
+        name: getattr(math, name)
+        for name in (
+            "ceil", "floor", "sqrt", "log", "log10", "log2", "exp", "fabs",
+            "isnan", "isinf", "pi", "e", "inf",
+        )
+    },
+)
+
+# Funções disponíveis para todas as expressões
+SAFE_FUNCTIONS: dict[str, Any] = {
+    "len": len,
+    "str": str,
+    "int": int,
+    "float": float,
+    "bool": bool,
+    "abs": abs,
+    "min": min,
+    "max": max,
+    "sum": sum,
+    "round": round,
+    "sorted": sorted,
+    "reversed": lambda value: list(reversed(value)),
+    "list": list,
+    "dict": dict,
+    "set": set,
+    "tuple": tuple,
+    "any": any,
+    "all": all,
+    "enumerate": enumerate,
+    "zip": zip,
+    "range": _bounded_range,
+    "lower": lambda value: str(value).lower(),
+    "upper": lambda value: str(value).upper(),
+    "strip": lambda value: str(value).strip(),
+    "startswith": lambda value, prefix: str(value).startswith(prefix),
+    "endswith": lambda value, suffix: str(value).endswith(suffix),
+    "contains": lambda container, value: container is not None and value in container,
+    "replace": lambda value, old, new: str(value).replace(old, new),
+    "split": lambda value, sep=None: str(value).split(sep),
+    "join": lambda values, sep="": sep.join(str(v) for v in values),
+    "matches": lambda value, pattern: bool(_regex(pattern).search(str(value))),
+    "coalesce": _coalesce,
+    "get": _get_path,
+    "re": RE_NAMESPACE,
+    "json": JSON_NAMESPACE,
+    "math": MATH_NAMESPACE,
+    "True": True,
+    "False": False,
+    "None": None,
+    "true": True,
+    "false": False,
+    "null": None,
+}
+
+# Métodos permitidos por tipo (str.format fica de fora: acessa atributos)
+SAFE_METHODS: tuple[tuple[type, frozenset[str]], ...] = (
+    (
+        str,
+        frozenset(
+            {
+                "lower", "upper", "strip", "lstrip", "rstrip", "startswith", "endswith",
+                "replace", "split", "rsplit", "splitlines", "join", "find", "rfind",
+                "count", "title", "capitalize", "isdigit", "isalpha", "isalnum",
+                "isnumeric", "zfill",
+            }
+        ),
+    ),
+    (dict, frozenset({"get", "keys", "values", "items", "copy", "update", "pop", "setdefault"})),
+    # Mapeamentos somente leitura (ex.: outputs dos nós carregados sob demanda)
+    (Mapping, frozenset({"get", "keys", "values", "items"})),
+    (list, frozenset({"append", "extend", "insert", "pop", "index", "count", "copy", "reverse", "sort"})),
+    (tuple, frozenset({"index", "count"})),
+    (set, frozenset({"add", "union", "intersection", "difference", "issubset", "issuperset"})),
+    (re.Match, frozenset({"group", "groups", "groupdict", "start", "end", "span"})),
+)
+
+_BINARY_OPERATORS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod,
+    ast.Pow: operator.pow,
+}
+
+_COMPARE_OPERATORS = {
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge,
+    ast.In: lambda a, b: a in b,
+    ast.NotIn: lambda a, b: a not in b,
+    ast.Is: operator.is_,
+    ast.IsNot: operator.is_not,
+}
+
+_UNARY_OPERATORS = {
+    ast.Not: operator.not_,
+    ast.USub: operator.neg,
+    ast.UAdd: operator.pos,
+}
+
+
+class _LoopControl(Exception):
+    pass
+
+
+class _Break(_LoopControl):
+    pass
+
+
+class _Continue(_LoopControl):
+    pass
+
+
+_SEQUENCES = (str, bytes, list, tuple)
+
+
+def _check_sized(value: Any) -> Any:
+    if isinstance(value, (str, list, tuple)) and len(value) > MAX_SEQUENCE_LENGTH:
+        raise ExpressionError("Resultado excede o tamanho máximo permitido")
+    return value
+
+
+def _reject_size(size: int) -> None:
+    if size > MAX_SEQUENCE_LENGTH:
+        raise ExpressionError("Resultado excede o tamanho máximo permitido")
+
+
+def _reject_bits(bits: int) -> None:
+    if bits > MAX_INTEGER_BITS:
+        raise ExpressionError("Resultado numérico excede o limite permitido")
+
+
+def _is_int(value: Any) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _check_format_spec(spec: str) -> str:
+    """Larguras/precisões acima do limite gerariam strings enormes"""
+    if "*" in spec or any(int(n) > MAX_SEQUENCE_LENGTH for n in _FORMAT_NUMBER.findall(spec)):
+        raise ExpressionError("Formato excede o tamanho máximo permitido")
+    return spec
+
+
+def _estimate_binary(op: type, left: Any, right: Any) -> None:
+    """Rejeita a operação pelo tamanho estimado do resultado, antes de executá-la"""
+    if op is ast.Pow:
+        if isinstance(right, (int, float)) and abs(right) > MAX_POWER_EXPONENT:
+            raise ExpressionError("Expoente excede o limite permitido")
+        if _is_int(left) and _is_int(right) and right > 0:
+            _reject_bits(left.bit_length() * right)
+    elif op is ast.Mult:
+        if isinstance(left, _SEQUENCES) and _is_int(right):
+            _reject_size(len(left) * right)
+        elif isinstance(right, _SEQUENCES) and _is_int(left):
+            _reject_size(len(right) * left)
+        elif _is_int(left) and _is_int(right):
+            _reject_bits(left.bit_length() + right.bit_length())
+    elif op is ast.Add:
+        if isinstance(left, _SEQUENCES) and isinstance(right, _SEQUENCES):
+            _reject_size(len(left) + len(right))
+    elif op is ast.Mod and isinstance(left, str):
+        for spec in _PERCENT_SPEC.findall(left):
+            _check_format_spec(spec)
+
+
+def _safe_binary(op: type, func: Callable) -> Callable[[Any, Any], Any]:
+    if op in (ast.Pow, ast.Mult, ast.Add, ast.Mod):
+
+        def checked(left, right):
+            _estimate_binary(op, left, right)
+            return _check_sized(func(left, right))
+
+        return checked
+    return func
+
+
+def _estimate_join(separator: str, items: list) -> int:
+    return sum(len(item) for item in items if isinstance(item, str)) + len(separator) * max(len(items) - 1, 0)
+
+
+def _sized_str_method(obj: str, attr: str) -> Callable:
+    """Métodos de str cujo resultado pode crescer muito além da entrada"""
+    method = getattr(obj, attr)
+    if attr == "zfill":
+
+        def zfill(width):
+            _reject_size(width if _is_int(width) else 0)
+            return method(width)
+
+        return zfill
+    if attr == "replace":
+
+        def replace(old, new, *args):
+            if isinstance(old, str) and isinstance(new, str):
+                _reject_size(len(obj) + obj.count(old) * max(len(new) - len(old), 0))
+            return method(old, new, *args)
+
+        return replace
+
+    def join(iterable):
+        items = list(iterable)
+        _reject_size(_estimate_join(obj, items))
+        return method(items)
+
+    return join
+
+
+_SIZED_STR_METHODS = frozenset({"zfill", "replace", "join"})
+
+
+def _tick(scope: dict[str, Any]) -> None:
+    """Conta uma iteração (laços e compreensões) no orçamento da avaliação"""
+    steps = scope.get("_steps")
+    if steps is None:
+        steps = scope["_steps"] = [0]
+    steps[0] += 1
+    if steps[0] > MAX_LOOP_ITERATIONS:
+        raise ExpressionError("Limite de iterações excedido")
+
+
+def _resolve_method(obj: Any, attr: str) -> Any:
+    if isinstance(obj, Namespace):
+        return obj.member(attr)
+    for kind, methods in SAFE_METHODS:
+        if isinstance(obj, kind):
+            if attr in methods:
+                if kind is str and attr in _SIZED_STR_METHODS:
+                    return _sized_str_method(obj, attr)
+                return getattr(obj, attr)
+            break
+    raise ExpressionError(f"Método '{attr}' não permitido para {type(obj).__name__}")
+
+
+def _resolve_attribute(obj: Any, attr: str) -> Any:
+    if isinstance(obj, Mapping):
+        return obj.get(attr)
+    if isinstance(obj, Namespace):
+        return obj.member(attr)
+    if obj is None:
+        return None
+    raise ExpressionError(f"Atributo '{attr}' não permitido para {type(obj).__name__}")
+
+
+def _render_template_value(value: Any) -> str:
+    return json.dumps(value) if isinstance(value, (dict, list)) else str(value)
+
+
+class _Compiler:
+    """Compila nós AST permitidos em closures ``scope -> valor``"""
+
+    def __init__(self, templates: list[str]):
+        self.templates = templates
+
+    # -- expressões --------------------------------------------------
+
+    def expression(self, node: ast.AST) -> Evaluator:
+        method = getattr(self, f"_expr_{type(node).__name__}", None)
+        if method is None:
+            raise ExpressionError(f"Construção não permitida: {type(node).__name__}")
+        return method(node)
+
+    def _expr_Constant(self, node: ast.Constant) -> Evaluator:
+        value = node.value
+        if isinstance(value, str) and _TEMPLATE_MARKER.search(value):
+            return self._template_string(value)
+        return lambda scope: value
+
+    def _template_string(self, text: str) -> Evaluator:
+        parts: list[Any] = []
+        last = 0
+        for match in _TEMPLATE_MARKER.finditer(text):
+            parts.append(text[last : match.start()])
+            parts.append(self.templates[int(match.group(1))])
+            last = match.end()
+        parts.append(text[last:])
+        is_path = [index % 2 == 1 for index in range(len(parts))]
+
+        def render(scope):
+            lookup = scope.get("_lookup")
+            return "".join(
+                _render_template_value(lookup(part, scope) if lookup else None) if path else part
+                for part, path in zip(parts, is_path)
+            )
+
+        return render
+
+    def _expr_Name(self, node: ast.Name) -> Evaluator:
+        name = node.id
+        marker = _TEMPLATE_MARKER.fullmatch(name)
+        if marker:
+            path = self.templates[int(marker.group(1))]
+
+            def template(scope):
+                lookup = scope.get("_lookup")
+                return lookup(path, scope) if lookup else None
+
+            return template
+        if name.startswith("_"):
+            raise ExpressionError(f"Nome não permitido: {name}")
+        if name in SAFE_FUNCTIONS:
+            builtin = SAFE_FUNCTIONS[name]
+
+            def load_builtin(scope):
+                return scope[name] if name in scope else builtin
+
+            return load_builtin
+
+        def load(scope):
+            try:
+                return scope[name]
+            except KeyError:
+                raise ExpressionError(f"Nome não definido: {name}") from None
+
+        return load
+
+    def _expr_Attribute(self, node: ast.Attribute) -> Evaluator:
+        attr = node.attr
+        if attr.startswith("_"):
+            raise ExpressionError(f"Atributo não permitido: {attr}")
+        target = self.expression(node.value)
+        return lambda scope: _resolve_attribute(target(scope), attr)
+
+    def _expr_Subscript(self, node: ast.Subscript) -> Evaluator:
+        target = self.expression(node.value)
+        if isinstance(node.slice, ast.Slice):
+            lower = self.expression(node.slice.lower) if node.slice.lower else None
+            upper = self.expression(node.slice.upper) if node.slice.upper else None
+            step = self.expression(node.slice.step) if node.slice.step else None
+
+            def sliced(scope):
+                return target(scope)[
+                    slice(
+                        lower(scope) if lower else None,
+                        upper(scope) if upper else None,
+                        step(scope) if step else None,
+                    )
+                ]
+
+            return sliced
+        key = self.expression(node.slice)
+        return lambda scope: target(scope)[key(scope)]
+
+    def _expr_BinOp(self, node: ast.BinOp) -> Evaluator:
+        func = _BINARY_OPERATORS.get(type(node.op))
+        if func is None:
+            raise ExpressionError(f"Operador não permitido: {type(node.op).__name__}")
+        func = _safe_binary(type(node.op), func)
+        left = self.expression(node.left)
+        right = self.expression(node.right)
+        return lambda scope: func(left(scope), right(scope))
+
+    def _expr_UnaryOp(self, node: ast.UnaryOp) -> Evaluator:
+        func = _UNARY_OPERATORS.get(type(node.op))
+        if func is None:
+            raise ExpressionError(f"Operador não permitido: {type(node.op).__name__}")
+        operand = self.expression(node.operand)
+        return lambda scope: func(operand(scope))
+
+    def _expr_BoolOp(self, node: ast.BoolOp) -> Evaluator:
+        values = [self.expression(value) for value in node.values]
+        if isinstance(node.op, ast.And):
+
+            def and_(scope):
+                result = True
+                for value in values:
+                    result = value(scope)
+                    if not result:
+                        return result
+                return result
+
+            return and_
+
+        def or_(scope):
+            result = False
+            for value in values:
+                result = value(scope)
+                if result:
+                    return result
+            return result
+
+        return or_
+
+    def _expr_Compare(self, node: ast.Compare) -> Evaluator:
+        left = self.expression(node.left)
+        steps = []
+        for op, comparator in zip(node.ops, node.comparators):
+            func = _COMPARE_OPERATORS.get(type(op))
+            if func is None:
+                raise ExpressionError(f"Comparação não permitida: {type(op).__name__}")
+            steps.append((func, self.expression(comparator)))
+
+        if len(steps) == 1:
+            func, right = steps[0]
+            return lambda scope: func(left(scope), right(scope))
+
+        def chain(scope):
+            current = left(scope)
+            for func, right in steps:
+                value = right(scope)
+                if not func(current, value):
+                    return False
+                current = value
+            return True
+
+        return chain
+
+    def _expr_IfExp(self, node: ast.IfExp) -> Evaluator:
+        test = self.expression(node.test)
+        body = self.expression(node.body)
+        orelse = self.expression(node.orelse)
+        return lambda scope: body(scope) if test(scope) else orelse(scope)
+
+    def _expr_Call(self, node: ast.Call) -> Evaluator:
+        if isinstance(node.func, ast.Attribute):
+            attr = node.func.attr
+            if attr.startswith("_"):
+                raise ExpressionError(f"Método não permitido: {attr}")
+            target = self.expression(node.func.value)
+            func = lambda scope: _resolve_method(target(scope), attr)  # noqa: E731
+        else:
+            func = self.expression(node.func)
+
+        args = []
+        for arg in node.args:
+            if isinstance(arg, ast.Starred):
+                starred = self.expression(arg.value)
+                args.append((True, starred))
+            else:
+                args.append((False, self.expression(arg)))
+        kwargs = []
+        for keyword in node.keywords:
+            if keyword.arg is None or keyword.arg.startswith("_"):
+                raise ExpressionError("Argumentos nomeados dinâmicos não são permitidos")
+            kwargs.append((keyword.arg, self.expression(keyword.value)))
+
+        def call(scope):
+            function = func(scope)
+            if not callable(function):
+                raise ExpressionError("Valor não é chamável")
+            positional = []
+            for is_starred, value in args:
+                if is_starred:
+                    positional.extend(value(scope))
+                else:
+                    positional.append(value(scope))
+            return function(*positional, **{name: value(scope) for name, value in kwargs})
+
+        return call
+
+    def _expr_List(self, node: ast.List) -> Evaluator:
+        items = [self.expression(item) for item in node.elts]
+        return lambda scope: [item(scope) for item in items]
+
+    def _expr_Tuple(self, node: ast.Tuple) -> Evaluator:
+        items = [self.expression(item) for item in node.elts]
+        return lambda scope: tuple(item(scope) for item in items)
+
+    def _expr_Set(self, node: ast.Set) -> Evaluator:
+        items = [self.expression(item) for item in node.elts]
+        return lambda scope: {item(scope) for item in items}
+
+    def _expr_Dict(self, node: ast.Dict) -> Evaluator:
+        if any(key is None for key in node.keys):
+            raise ExpressionError("Desempacotamento de dicionário não é permitido")
+        pairs = [(self.expression(k), self.expression(v)) for k, v in zip(node.keys, node.values)]
+        return lambda scope: {key(scope): value(scope) for key, value in pairs}
+
+    def _expr_JoinedStr(self, node: ast.JoinedStr) -> Evaluator:
+        parts = [self.expression(value) for value in node.values]
+        return lambda scope: "".join(str(part(scope)) for part in parts)
+
+    def _expr_FormattedValue(self, node: ast.FormattedValue) -> Evaluator:
+        value = self.expression(node.value)
+        spec = self.expression(node.format_spec) if node.format_spec else None
+        conversion = {115: str, 114: repr, 97: ascii}.get(node.conversion)
+
+        def formatted(scope):
+            result = value(scope)
+            if conversion:
+                result = conversion(result)
+            return format(result, _check_format_spec(spec(scope)) if spec else "")
+
+        return formatted
+
+    def _expr_ListComp(self, node: ast.ListComp) -> Evaluator:
+        element = self.expression(node.elt)
+        run = self._comprehension(node.generators)
+        return lambda scope: [element(local) for local in run(scope)]
+
+    _expr_GeneratorExp = _expr_ListComp
+
+    def _expr_SetComp(self, node: ast.SetComp) -> Evaluator:
+        element = self.expression(node.elt)
+        run = self._comprehension(node.generators)
+        return lambda scope: {element(local) for local in run(scope)}
+
+    def _expr_DictComp(self, node: ast.DictComp) -> Evaluator:
+        key = self.expression(node.key)
+        value = self.expression(node.value)
+        run = self._comprehension(node.generators)
+        return lambda scope: {key(local): value(local) for local in run(scope)}
+
+    def _comprehension(self, generators: list[ast.comprehension]):
+        compiled = []
+        for generator in generators:
+            if generator.is_async:
+                raise ExpressionError("Compreensões assíncronas não são permitidas")
+            compiled.append(
+                (
+                    self._target(generator.target),
+                    self.expression(generator.iter),
+                    [self.expression(condition) for condition in generator.ifs],
+                )
+            )
+
+        def run(scope):
+            # O contador de iterações é compartilhado com o escopo externo
+            if "_steps" not in scope:
+                scope["_steps"] = [0]
+            local = dict(scope)
+
+            def walk(depth):
+                if depth == len(compiled):
+                    yield local
+                    return
+                assign, iterable, conditions = compiled[depth]
+                for value in iterable(local):
+                    _tick(local)
+                    assign(local, value)
+                    if all(condition(local) for condition in conditions):
+                        yield from walk(depth + 1)
+
+            return walk(0)
+
+        return run
+
+    # -- alvos de atribuição -----------------------------------------
+
+    def _target(self, node: ast.AST) -> Callable[[dict[str, Any], Any], None]:
+        if isinstance(node, ast.Name):
+            name = node.id
+            if name.startswith("_") or name in ("True", "False", "None"):
+                raise ExpressionError(f"Nome não permitido: {name}")
+
+            def assign_name(scope, value):
+                scope[name] = value
+
+            return assign_name
+        if isinstance(node, (ast.Tuple, ast.List)):
+            targets = [self._target(element) for element in node.elts]
+
+            def unpack(scope, value):
+                values = list(value)
+                if len(values) != len(targets):
+                    raise ExpressionError("Número de valores incompatível no desempacotamento")
+                for target, item in zip(targets, values):
+                    target(scope, item)
+
+            return unpack
+        if isinstance(node, ast.Subscript) and not isinstance(node.slice, ast.Slice):
+            container = self.expression(node.value)
+            key = self.expression(node.slice)
+
+            def assign_item(scope, value):
+                target = container(scope)
+                if not isinstance(target, (dict, list)):
+                    raise ExpressionError("Atribuição por índice só é permitida em dict/list")
+                target[key(scope)] = value
+
+            return assign_item
+        raise ExpressionError(f"Alvo de atribuição não permitido: {type(node).__name__}")
+
+    # -- instruções (programas) --------------------------------------
+
+    def block(self, statements: list[ast.stmt]) -> Callable[[dict[str, Any]], None]:
+        compiled = [self.statement(statement) for statement in statements]
+
+        def run(scope):
+            for statement in compiled:
+                statement(scope)
+
+        return run
+
+    def statement(self, node: ast.stmt) -> Callable[[dict[str, Any]], None]:
+        if isinstance(node, ast.Expr):
+            value = self.expression(node.value)
+            return lambda scope: value(scope) and None
+        if isinstance(node, ast.Assign):
+            targets = [self._target(target) for target in node.targets]
+            value = self.expression(node.value)
+
+            def assign(scope):
+                result = value(scope)
+                for target in targets:
+                    target(scope, result)
+
+            return assign
+        if isinstance(node, ast.AugAssign):
+            func = _BINARY_OPERATORS.get(type(node.op))
+            if func is None:
+                raise ExpressionError(f"Operador não permitido: {type(node.op).__name__}")
+            func = _safe_binary(type(node.op), func)
+            load = self.expression(
+                ast.Subscript(value=node.target.value, slice=node.target.slice, ctx=ast.Load())
+                if isinstance(node.target, ast.Subscript)
+                else ast.Name(id=getattr(node.target, "id", ""), ctx=ast.Load())
+            )
+            store = self._target(node.target)
+            value = self.expression(node.value)
+            return lambda scope: store(scope, func(load(scope), value(scope)))
+        if isinstance(node, ast.If):
+            test = self.expression(node.test)
+            body = self.block(node.body)
+            orelse = self.block(node.orelse)
+            return lambda scope: body(scope) if test(scope) else orelse(scope)
+        if isinstance(node, ast.For):
+            if node.orelse:
+                raise ExpressionError("for/else não é permitido")
+            target = self._target(node.target)
+            iterable = self.expression(node.iter)
+            body = self.block(node.body)
+
+            def loop(scope):
+                for value in iterable(scope):
+                    _tick(scope)
+                    target(scope, value)
+                    try:
+                        body(scope)
+                    except _Continue:
+                        continue
+                    except _Break:
+                        break
+
+            return loop
+        if isinstance(node, ast.Pass):
+            return lambda scope: None
+        if isinstance(node, ast.Break):
+
+            def break_(scope):
+                raise _Break()
+
+            return break_
+        if isinstance(node, ast.Continue):
+
+            def continue_(scope):
+                raise _Continue()
+
+            return continue_
+        raise ExpressionError(f"Instrução não permitida: {type(node).__name__}")
+
+
+def _extract_templates(source: str) -> tuple[str, list[str]]:
+    """Troca placeholders ``{{caminho}}`` por marcadores resolvidos na avaliação"""
+    templates: list[str] = []
+
+    def replace(match: re.Match) -> str:
+        templates.append(match.group(1))
+        return f"_tpl{len(templates) - 1}_"
+
+    return _TEMPLATE_PATTERN.sub(replace, source), templates
+
+
+class CompiledExpression:
+    """Expressão compilada, reutilizável entre itens e execuções"""
+
+    __slots__ = ("source", "_evaluator")
+
+    def __init__(self, source: str, evaluator: Evaluator):
+        self.source = source
+        self._evaluator = evaluator
+
+    def evaluate(self, scope: dict[str, Any]) -> Any:
+        # O escopo é reaproveitado entre itens: cada avaliação tem seu orçamento
+        scope.pop("_steps", None)
+        try:
+            return self._evaluator(scope)
+        except ExpressionError:
+            raise
+        except Exception as e:
+            raise ExpressionError(f"Erro ao avaliar '{self.source}': {e}") from e
+
+    __call__ = evaluate
+
+
+class CompiledProgram:
+    """Bloco de instruções compilado (usado por transformações CUSTOM)"""
+
+    __slots__ = ("source", "_block")
+
+    def __init__(self, source: str, block: Callable[[dict[str, Any]], None]):
+        self.source = source
+        self._block = block
+
+    def run(self, scope: dict[str, Any]) -> dict[str, Any]:
+        scope.pop("_steps", None)
+        try:
+            self._block(scope)
+        except ExpressionError:
+            raise
+        except _LoopControl:
+            raise ExpressionError("break/continue fora de um laço") from None
+        except Exception as e:
+            raise ExpressionError(f"Erro na execução do código: {e}") from e
+        return scope
+
+
+@lru_cache(maxsize=EXPRESSION_CACHE_SIZE)
+def compile_expression(source: str) -> CompiledExpression:
+    """
+    Compila uma expressão (cacheada por texto). Placeholders ``{{caminho}}``
+    são resolvidos na avaliação via ``scope["_lookup"](caminho, scope)``.
+    """
+    text, templates = _extract_templates(source.strip())
+    try:
+        tree = ast.parse(text, mode="eval")
+    except SyntaxError as e:
+        raise ExpressionError(f"Expressão inválida '{source}': {e.msg}") from None
+    return CompiledExpression(source, _Compiler(templates).expression(tree.body))
+
+
+@lru_cache(maxsize=256)
+def compile_program(source: str) -> CompiledProgram:
+    """Compila um bloco de instruções (atribuições, if, for) (cacheado por texto)"""
+    text, templates = _extract_templates(source)
+    try:
+        tree = ast.parse(text, mode="exec")
+    except SyntaxError as e:
+        raise ExpressionError(f"Código inválido: {e.msg} (linha {e.lineno})") from None
+    return CompiledProgram(source, _Compiler(templates).block(tree.body))
@@ -64,15 +64,12 @@ class HTTPExecutor(BaseExecutor):
         try:
             await self.pre_execute(node, context, node_execution)
 
-            # Parse da configuração do nó
-            config = self._parse_node_config(node)
-
-            # Valida configuração
-            validation = self.validate_config(config)
-            if not validation["is_valid"]:
+            # Configuração parseada e validada (pronta quando vem do plano compilado)
+            config, errors = self.prepare_config(node)
+            if errors:
                 return {
                     "success": False,
-                    "error": f"Configuração inválida: {', '.join(validation['errors'])}",
+                    "error": f"Configuração inválida: {', '.join(errors)}",
                     "output": None,
                 }
 
@@ -174,20 +171,6 @@ class HTTPExecutor(BaseExecutor):
         """
         return ["http", "api", "rest", "webhook", "request"]
 
-    def _parse_node_config(self, node: Node) -> dict[str, Any]:
-        """
-        Parse da configuração do nó
-        """
-        if isinstance(node.config, dict):
-            return node.config
-        elif isinstance(node.config, str):
-            try:
-                return json.loads(node.config)
-            except json.JSONDecodeError:
-                return {}
-        else:
-            return {}
-
     async def _prepare_request(
         self,
         config: dict[str, Any],
@@ -204,16 +187,14 @@ class HTTPExecutor(BaseExecutor):
         method = config.get("method", HTTPMethod.GET)
 
         # Headers
-        headers = {}
-        if config.get("headers"):
-            for key, value in config["headers"].items():
-                headers[key] = self.resolve_template_variables(value, context, inputs)
+        headers = self.resolve_config_templates(
+            config.get("headers") or {}, context, inputs
+        )
 
         # Query params
-        params = {}
-        if config.get("params"):
-            for key, value in config["params"].items():
-                params[key] = self.resolve_template_variables(value, context, inputs)
+        params = self.resolve_config_templates(
+            config.get("params") or {}, context, inputs
+        )
 
         # Body
         body = None
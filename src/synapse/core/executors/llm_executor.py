@@ -4,13 +4,10 @@ Criado por José - um desenvolvedor Full Stack
 Executor especializado para integração com modelos de linguagem
 """
 
-import json
 import time
 from typing import Dict, Any, List, Optional, Union
 from datetime import datetime
 import aiohttp
-import openai
-from openai import AsyncOpenAI
 
 from synapse.core.executors.base import BaseExecutor, ExecutorType, ExecutionContext
 from synapse.models.node_execution import NodeExecution
@@ -52,15 +49,12 @@ class LLMExecutor(BaseExecutor):
         try:
             await self.pre_execute(node, context, node_execution)
 
-            # Parse da configuração do nó
-            config = self._parse_node_config(node)
-
-            # Valida configuração
-            validation = self.validate_config(config)
-            if not validation["is_valid"]:
+            # Configuração parseada e validada (pronta quando vem do plano compilado)
+            config, errors = self.prepare_config(node)
+            if errors:
                 return {
                     "success": False,
-                    "error": f"Configuração inválida: {', '.join(validation['errors'])}",
+                    "error": f"Configuração inválida: {', '.join(errors)}",
                     "output": None,
                 }
 
@@ -125,20 +119,6 @@ class LLMExecutor(BaseExecutor):
         """
         return ["llm", "openai", "gpt", "claude", "chat", "completion"]
 
-    def _parse_node_config(self, node: Node) -> dict[str, Any]:
-        """
-        Parse da configuração do nó
-        """
-        if isinstance(node.config, dict):
-            return node.config
-        elif isinstance(node.config, str):
-            try:
-                return json.loads(node.config)
-            except json.JSONDecodeError:
-                return {}
-        else:
-            return {}
-
     async def _prepare_prompt(
         self,
         config: dict[str, Any],
@@ -208,9 +188,12 @@ class LLMExecutor(BaseExecutor):
         if not api_key:
             raise ValueError("API key da OpenAI não encontrada")
 
+        # SDK importado no primeiro uso (evita o custo no import do executor)
+        import openai
+
         # Inicializa cliente se necessário
         if not self.openai_client or self.openai_client.api_key != api_key:
-            self.openai_client = AsyncOpenAI(api_key=api_key)
+            self.openai_client = openai.AsyncOpenAI(api_key=api_key)
 
         # Prepara parâmetros
         params = {
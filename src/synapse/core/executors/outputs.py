@@ -0,0 +1,311 @@
+"""
+Outputs de nós em camadas
+Outputs pequenos ficam na linha (``node_executions.output_data``) e na
+memória da execução; os maiores que ``EXECUTION_OUTPUT_INLINE_BYTES`` são
+gravados comprimidos (gzip) no armazenamento e a linha guarda só uma
+referência. Nós seguintes e leitores da API carregam o conteúdo sob demanda.
+
+Referência gravada no lugar do output::
+
+    {"$ref": "execution_outputs/<execução>/<nó>.json.gz", "encoding": "json+gzip",
+     "bytes": 1048576, "stored_bytes": 80311, "preview": "{\\"items\\": [..."}
+
+Um output pequeno com esse mesmo formato também vai para o armazenamento,
+então na linha esse formato só aparece como referência gravada pelo store; na
+memória da execução só valem como referência as chaves externalizadas por
+``spill``. O conteúdo só é lido de dentro do diretório da própria execução.
+"""
+
+import asyncio
+import gzip
+import hashlib
+import json
+import os
+import re
+import shutil
+import uuid
+from collections import OrderedDict
+from collections.abc import Iterator, MutableMapping
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Set, Tuple
+
+REFERENCE_KEY = "$ref"
+REFERENCE_ENCODING = "json+gzip"
+PREVIEW_CHARS = 256
+
+_COMPRESSION_LEVEL = 6
+_UNSAFE_CHARS = re.compile(r"[^A-Za-z0-9_.-]")
+
+
+def is_output_reference(value: Any) -> bool:
+    """Se o valor é uma referência a um output externalizado"""
+    return (
+        isinstance(value, dict)
+        and isinstance(value.get(REFERENCE_KEY), str)
+        and value.get("encoding") == REFERENCE_ENCODING
+    )
+
+
+def encode_output(value: Any) -> bytes:
+    """Serialização usada para medir e gravar outputs (a mesma do JSONB)"""
+    return json.dumps(value, default=str, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class ExecutionOutputStore:
+    """
+    Outputs externalizados em ``base_path/directory/<execução>/``. Os caminhos
+    das referências são relativos a ``base_path`` (raiz do StorageManager)
+    """
+
+    def __init__(
+        self,
+        base_path: Path,
+        directory: str = "execution_outputs",
+        inline_bytes: int = 16384,
+        compression_level: int = _COMPRESSION_LEVEL,
+    ):
+        self.base_path = Path(base_path)
+        self.directory = directory
+        self.inline_bytes = inline_bytes
+        self.compression_level = compression_level
+
+    def _execution_path(self, execution_id: str) -> str:
+        return f"{self.directory}/{_UNSAFE_CHARS.sub('_', execution_id)}"
+
+    def _relative_path(self, execution_id: str, key: str) -> str:
+        # Nome legível + hash da chave original (chaves diferentes nunca colidem)
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:10]
+        name = f"{_UNSAFE_CHARS.sub('_', key)[:80]}-{digest}.json.gz"
+        return f"{self._execution_path(execution_id)}/{name}"
+
+    def put(self, execution_id: str, key: str, value: Any) -> Tuple[Any, int]:
+        """
+        Valor a gravar na linha e tamanho serializado do output. Acima do
+        limite (ou com o formato de uma referência) o output vai para o
+        armazenamento e o retorno é a referência
+        """
+        payload = encode_output(value)
+        if len(payload) <= self.inline_bytes and not is_output_reference(value):
+            return value, len(payload)
+
+        relative = self._relative_path(execution_id, key)
+        path = self.base_path / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        compressed = gzip.compress(payload, compresslevel=self.compression_level)
+        # Escrita atômica: leitores nunca veem um arquivo pela metade
+        partial = path.with_name(f".{path.name}.{uuid.uuid4().hex[:8]}")
+        partial.write_bytes(compressed)
+        os.replace(partial, path)
+
+        reference = {
+            REFERENCE_KEY: relative,
+            "encoding": REFERENCE_ENCODING,
+            "bytes": len(payload),
+            "stored_bytes": len(compressed),
+            "preview": payload[:PREVIEW_CHARS].decode("utf-8", errors="ignore"),
+        }
+        return reference, len(payload)
+
+    def load(self, reference: Dict[str, Any], execution_id: str) -> Any:
+        """Conteúdo de uma referência gravada para a execução ``execution_id``"""
+        root = (self.base_path / self._execution_path(execution_id)).resolve()
+        path = (self.base_path / reference[REFERENCE_KEY]).resolve()
+        if not path.is_relative_to(root):
+            raise ValueError(f"Referência fora dos outputs da execução: {reference[REFERENCE_KEY]}")
+        with gzip.open(path, "rb") as handle:
+            return json.loads(handle.read())
+
+    def resolve(self, value: Any, execution_id: str) -> Any:
+        """Carrega o valor se for uma referência; caso contrário devolve como está"""
+        return self.load(value, execution_id) if is_output_reference(value) else value
+
+    def resolve_output_data(
+        self, output_data: Optional[Dict[str, Any]], execution_id: str
+    ) -> Optional[Dict[str, Any]]:
+        """``output_data`` de um nó com o campo ``output`` carregado"""
+        if not output_data or not is_output_reference(output_data.get("output")):
+            return output_data
+        return {**output_data, "output": self.load(output_data["output"], execution_id)}
+
+    def delete_execution(self, execution_id: str) -> None:
+        """Remove os outputs externalizados de uma execução"""
+        shutil.rmtree(self.base_path / self._execution_path(execution_id), ignore_errors=True)
+
+    def stored_executions(self, older_than: float) -> Dict[str, Path]:
+        """Diretórios de execução (nome → caminho) sem alteração desde ``older_than`` (epoch)"""
+        root = self.base_path / self.directory
+        if not root.is_dir():
+            return {}
+        return {
+            path.name: path
+            for path in root.iterdir()
+            if path.is_dir() and path.stat().st_mtime < older_than
+        }
+
+
+class NodeOutputs(MutableMapping):
+    """
+    Outputs dos nós de uma execução (``ExecutionContext.node_outputs``).
+
+    Se comporta como um dict; outputs externalizados ficam em memória só como
+    referência e são carregados no primeiro acesso, com um cache LRU limitado
+    por ``cache_bytes``. Sem ``store`` nada é externalizado. ``preload``
+    carrega antes, fora do event loop, os outputs que um nó vai ler.
+    """
+
+    def __init__(
+        self,
+        store: Optional[ExecutionOutputStore] = None,
+        execution_id: Optional[str] = None,
+        cache_bytes: int = 1024 * 1024,
+    ):
+        self.store = store
+        self.execution_id = execution_id
+        self.cache_bytes = cache_bytes
+        self._values: Dict[str, Any] = {}
+        self._references: Set[str] = set()
+        self._preloaded: Dict[str, Any] = {}
+        self._cache: "OrderedDict[str, Tuple[Any, int]]" = OrderedDict()
+        self._cached_bytes = 0
+        self.stats = {
+            "inline": 0,
+            "inline_bytes": 0,
+            "spilled": 0,
+            "spilled_bytes": 0,
+            "stored_bytes": 0,
+            "loads": 0,
+        }
+
+    def __getitem__(self, key: str) -> Any:
+        value = self._values[key]
+        if key not in self._references:
+            return value
+        if key in self._preloaded:
+            return self._preloaded[key]
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            return cached[0]
+        loaded = self.store.load(value, self.execution_id)
+        self.stats["loads"] += 1
+        self._remember(key, loaded, value.get("bytes", 0))
+        return loaded
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self._forget(key)
+        self._references.discard(key)
+        self._values[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        self._forget(key)
+        self._references.discard(key)
+        del self._values[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._values)
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._values
+
+    def _remember(self, key: str, value: Any, size: int) -> None:
+        if size > self.cache_bytes:
+            return
+        self._cache[key] = (value, size)
+        self._cached_bytes += size
+        while self._cached_bytes > self.cache_bytes:
+            _, (_, evicted) = self._cache.popitem(last=False)
+            self._cached_bytes -= evicted
+
+    def _forget(self, key: str) -> None:
+        self._preloaded.pop(key, None)
+        cached = self._cache.pop(key, None)
+        if cached is not None:
+            self._cached_bytes -= cached[1]
+
+    def spill(self, key: str, value: Any) -> Any:
+        """
+        Registra o output final do nó e devolve o valor a gravar na linha:
+        o próprio output ou, acima do limite, a referência (a memória da
+        execução passa a guardar só a referência)
+        """
+        if self.store is None or self.execution_id is None:
+            self[key] = value
+            return value
+        return self._record(key, *self.store.put(self.execution_id, key, value))
+
+    async def aspill(self, key: str, value: Any) -> Any:
+        """``spill`` com a serialização, a compressão e a escrita numa thread"""
+        if self.store is None or self.execution_id is None:
+            return self.spill(key, value)
+        return self._record(key, *await asyncio.to_thread(self.store.put, self.execution_id, key, value))
+
+    def _record(self, key: str, stored: Any, size: int) -> Any:
+        self[key] = stored
+        if is_output_reference(stored):
+            self._references.add(key)
+            self.stats["spilled"] += 1
+            self.stats["spilled_bytes"] += size
+            self.stats["stored_bytes"] += stored["stored_bytes"]
+        else:
+            self.stats["inline"] += 1
+            self.stats["inline_bytes"] += size
+        return stored
+
+    async def preload(self, keys: Iterable[str]) -> None:
+        """
+        Carrega numa thread os outputs externalizados de ``keys`` (os que já
+        estão no cache saem dele); ficam disponíveis até ``release``
+        """
+        for key in keys:
+            if key not in self._references or key in self._preloaded:
+                continue
+            cached = self._cache.pop(key, None)
+            if cached is not None:
+                self._cached_bytes -= cached[1]
+                self._preloaded[key] = cached[0]
+                continue
+            reference = self._values[key]
+            self._preloaded[key] = await asyncio.to_thread(self.store.load, reference, self.execution_id)
+            self.stats["loads"] += 1
+
+    def release(self) -> None:
+        """Devolve os outputs pré-carregados ao cache limitado"""
+        preloaded, self._preloaded = self._preloaded, {}
+        for key, value in preloaded.items():
+            self._remember(key, value, self._values[key].get("bytes", 0))
+
+    @property
+    def references(self) -> Set[str]:
+        """Chaves cujo valor é uma referência gravada por ``spill``"""
+        return set(self._references)
+
+    def restore(self, values: Dict[str, Any], references: Iterable[str]) -> None:
+        """Recria o estado de outro processo: valores como gravados e quais são referências"""
+        for key, value in values.items():
+            self[key] = value
+        self._references.update(key for key in references if key in self._values)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Valores como gravados (referências não são carregadas)"""
+        return dict(self._values)
+
+
+_default_store: Optional[ExecutionOutputStore] = None
+
+
+def get_output_store() -> ExecutionOutputStore:
+    """Store padrão: raiz do StorageManager e limites das configurações"""
+    global _default_store
+    if _default_store is None:
+        from synapse.core.config import settings
+        from synapse.core.storage.storage_manager import storage_manager
+
+        _default_store = ExecutionOutputStore(
+            storage_manager.base_path,
+            directory=settings.EXECUTION_OUTPUT_DIRECTORY,
+            inline_bytes=settings.EXECUTION_OUTPUT_INLINE_BYTES,
+        )
+    return _default_store
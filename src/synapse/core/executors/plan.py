@@ -0,0 +1,363 @@
+"""
+Planos de execução compilados
+Um workflow é compilado uma única vez por versão em um plano imutável: ordem
+topológica, arestas de dependência, configurações parseadas e validadas pelo
+executor de cada tipo, templates pré-compilados e variáveis ``${VAR}``
+exigidas. As execuções rodam direto do plano, sem reler nem revalidar nós.
+"""
+
+import heapq
+import json
+import re
+import time
+from collections import Counter
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from synapse.core.executors.templates import CompiledTemplate, compile_template
+
+PLAN_FORMAT_VERSION = 1
+
+# Variáveis de ambiente do usuário referenciadas como ${NOME}
+_VARIABLE_PATTERN = re.compile(r"\$\{([^}]+)\}")
+
+# Segundos estimados por nó (mesma heurística da validação anterior)
+ESTIMATED_SECONDS_PER_NODE = 2
+
+DEFAULT_NODE_MAX_RETRIES = 3
+DEFAULT_NODE_RETRY_DELAY_MS = 1000
+
+
+@dataclass(frozen=True)
+class NodeSpec:
+    """Nó de origem (linha de workflow_nodes ou item de ``definition["nodes"]``)"""
+
+    key: str
+    node_type: str
+    config: Dict[str, Any]
+    name: Optional[str] = None
+    catalog_id: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class PlanNode:
+    """
+    Nó compilado. Expõe ``node_id``, ``node_type`` e ``config`` como um
+    ``Node`` para os executores; ``config`` é compartilhado entre execuções e
+    não deve ser alterado.
+    """
+
+    key: str
+    node_type: str
+    name: Optional[str]
+    order: int
+    config: Dict[str, Any]
+    catalog_id: Optional[str] = None
+    dependencies: Tuple[str, ...] = ()
+    dependents: Tuple[str, ...] = ()
+    required_variables: Tuple[str, ...] = ()
+    errors: Tuple[str, ...] = ()
+    continue_on_error: bool = False
+    max_retries: int = DEFAULT_NODE_MAX_RETRIES
+    retry_delay_ms: int = DEFAULT_NODE_RETRY_DELAY_MS
+    templates: Tuple[CompiledTemplate, ...] = field(default=(), compare=False, repr=False)
+
+    @property
+    def node_id(self) -> str:
+        return self.key
+
+    @property
+    def is_valid(self) -> bool:
+        return not self.errors
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "key": self.key,
+            "node_type": self.node_type,
+            "name": self.name,
+            "order": self.order,
+            "config": self.config,
+            "catalog_id": self.catalog_id,
+            "dependencies": list(self.dependencies),
+            "dependents": list(self.dependents),
+            "required_variables": list(self.required_variables),
+            "errors": list(self.errors),
+            "continue_on_error": self.continue_on_error,
+            "max_retries": self.max_retries,
+            "retry_delay_ms": self.retry_delay_ms,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "PlanNode":
+        config = data.get("config") or {}
+        return cls(
+            key=data["key"],
+            node_type=data["node_type"],
+            name=data.get("name"),
+            order=data["order"],
+            config=config,
+            catalog_id=data.get("catalog_id"),
+            dependencies=tuple(data.get("dependencies") or ()),
+            dependents=tuple(data.get("dependents") or ()),
+            required_variables=tuple(data.get("required_variables") or ()),
+            errors=tuple(data.get("errors") or ()),
+            continue_on_error=bool(data.get("continue_on_error", False)),
+            max_retries=data.get("max_retries", DEFAULT_NODE_MAX_RETRIES),
+            retry_delay_ms=data.get("retry_delay_ms", DEFAULT_NODE_RETRY_DELAY_MS),
+            templates=_compile_templates(config),
+        )
+
+
+@dataclass(frozen=True)
+class ExecutionPlan:
+    """Plano imutável de um workflow em uma versão"""
+
+    workflow_id: str
+    version: str
+    nodes: Tuple[PlanNode, ...]
+    required_variables: Tuple[str, ...] = ()
+    errors: Tuple[str, ...] = ()
+    compiled_at: float = 0.0
+    _by_key: Dict[str, PlanNode] = field(default_factory=dict, init=False, compare=False, repr=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, "_by_key", {node.key: node for node in self.nodes})
+
+    @property
+    def total_nodes(self) -> int:
+        return len(self.nodes)
+
+    @property
+    def estimated_duration_seconds(self) -> int:
+        return len(self.nodes) * ESTIMATED_SECONDS_PER_NODE
+
+    @property
+    def catalog_ids(self) -> Tuple[str, ...]:
+        return tuple({node.catalog_id for node in self.nodes if node.catalog_id})
+
+    def node(self, key: str) -> Optional[PlanNode]:
+        return self._by_key.get(key)
+
+    def validate(self, variables: Mapping[str, Any]) -> Dict[str, Any]:
+        """
+        Validação por execução: apenas o que depende das variáveis do usuário
+        é verificado aqui, o resto já foi resolvido na compilação
+        """
+        errors = list(self.errors)
+        if not self.nodes:
+            errors.append("Workflow não possui nós")
+
+        missing_vars = [var for var in self.required_variables if var not in variables]
+        if missing_vars:
+            errors.append(
+                "Variáveis necessárias não encontradas: %s" % ", ".join(missing_vars),
+            )
+
+        warnings = [
+            f"Nó {node.key}: {error}" for node in self.nodes for error in node.errors
+        ]
+
+        return {
+            "is_valid": len(errors) == 0,
+            "errors": errors,
+            "warnings": warnings,
+            "total_nodes": self.total_nodes,
+            "estimated_duration_seconds": self.estimated_duration_seconds,
+            "required_variables": list(self.required_variables),
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "format": PLAN_FORMAT_VERSION,
+            "workflow_id": self.workflow_id,
+            "version": self.version,
+            "nodes": [node.to_dict() for node in self.nodes],
+            "required_variables": list(self.required_variables),
+            "errors": list(self.errors),
+            "compiled_at": self.compiled_at,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> Optional["ExecutionPlan"]:
+        """Reconstrói um plano serializado (``None`` se o formato mudou)"""
+        if not isinstance(data, Mapping) or data.get("format") != PLAN_FORMAT_VERSION:
+            return None
+        return cls(
+            workflow_id=data["workflow_id"],
+            version=data["version"],
+            nodes=tuple(PlanNode.from_dict(node) for node in data["nodes"]),
+            required_variables=tuple(data.get("required_variables") or ()),
+            errors=tuple(data.get("errors") or ()),
+            compiled_at=data.get("compiled_at", 0.0),
+        )
+
+
+def _iter_strings(value: Any) -> Iterable[str]:
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, Mapping):
+        for item in value.values():
+            yield from _iter_strings(item)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            yield from _iter_strings(item)
+
+
+def _compile_templates(config: Mapping[str, Any]) -> Tuple[CompiledTemplate, ...]:
+    """Pré-compila (e mantém referência a) todos os templates ``{{...}}`` da configuração"""
+    templates = {}
+    for text in _iter_strings(config):
+        if "{{" in text and text not in templates:
+            templates[text] = compile_template(text)
+    return tuple(templates.values())
+
+
+def _required_variables(config: Mapping[str, Any]) -> Tuple[str, ...]:
+    found: Dict[str, None] = {}
+    for text in _iter_strings(config):
+        if "${" in text:
+            for name in _VARIABLE_PATTERN.findall(text):
+                found.setdefault(name, None)
+    return tuple(found)
+
+
+def _input_sources(config: Mapping[str, Any]) -> List[str]:
+    """Nós referenciados em ``config["inputs"][*]["source_node"]``"""
+    inputs = config.get("inputs")
+    if not isinstance(inputs, Mapping):
+        return []
+    return [
+        str(item["source_node"])
+        for item in inputs.values()
+        if isinstance(item, Mapping) and item.get("source_node") is not None
+    ]
+
+
+def _validate_config(registry: Any, node_type: str, config: Dict[str, Any]) -> Tuple[str, ...]:
+    executor = registry.get_executor(node_type) if registry is not None else None
+    if executor is None:
+        return ()
+    try:
+        return tuple(executor.validate_config(config).get("errors") or ())
+    except Exception as e:
+        return (f"Erro ao validar configuração: {e}",)
+
+
+def _int_option(config: Mapping[str, Any], name: str, default: int) -> int:
+    try:
+        return max(0, int(config.get(name, default)))
+    except (TypeError, ValueError):
+        return default
+
+
+def parse_config(raw: Any) -> Dict[str, Any]:
+    """Configuração do nó como dicionário (aceita JSON em texto)"""
+    if isinstance(raw, dict):
+        return raw
+    if isinstance(raw, str):
+        try:
+            parsed = json.loads(raw)
+        except json.JSONDecodeError:
+            return {}
+        return parsed if isinstance(parsed, dict) else {}
+    return {}
+
+
+def compile_plan(
+    workflow_id: Any,
+    version: str,
+    nodes: Iterable[NodeSpec],
+    edges: Iterable[Tuple[str, str]] = (),
+    registry: Any = None,
+) -> ExecutionPlan:
+    """
+    Compila um workflow em um plano de execução.
+
+    ``nodes`` vêm na ordem declarada (usada como desempate da ordem
+    topológica) e ``edges`` são pares (origem, destino) por chave de nó. Além
+    das conexões, ``inputs.*.source_node`` também cria dependência.
+    ``registry`` é o registry de executores usado para validar as
+    configurações (``None`` desativa a validação).
+    """
+    specs = list(nodes)
+    declared = {spec.key: index for index, spec in enumerate(specs)}
+    errors: List[str] = []
+
+    duplicated = sorted(key for key, count in Counter(spec.key for spec in specs).items() if count > 1)
+    if duplicated:
+        errors.append("Chaves de nó duplicadas: %s" % ", ".join(duplicated))
+
+    configs = {spec.key: parse_config(spec.config) for spec in specs}
+
+    dependencies: Dict[str, Dict[str, None]] = {key: {} for key in declared}
+    unknown: List[str] = []
+    all_edges = list(edges) + [
+        (source, spec.key) for spec in specs for source in _input_sources(configs[spec.key])
+    ]
+    for source, target in all_edges:
+        source, target = str(source), str(target)
+        if source not in declared or target not in declared:
+            unknown.append(f"{source} -> {target}")
+        elif source != target:
+            dependencies[target].setdefault(source, None)
+    if unknown:
+        errors.append("Conexões com nós inexistentes: %s" % ", ".join(unknown))
+
+    # Kahn com desempate pela ordem declarada (mesma ordem do modo sequencial)
+    dependents: Dict[str, List[str]] = {key: [] for key in declared}
+    pending = {key: len(deps) for key, deps in dependencies.items()}
+    for key, deps in dependencies.items():
+        for source in deps:
+            dependents[source].append(key)
+    ready = [(declared[key], key) for key, count in pending.items() if count == 0]
+    heapq.heapify(ready)
+    order: List[str] = []
+    while ready:
+        _, key = heapq.heappop(ready)
+        order.append(key)
+        for target in dependents[key]:
+            pending[target] -= 1
+            if pending[target] == 0:
+                heapq.heappush(ready, (declared[target], target))
+
+    if len(order) < len(declared):
+        cyclic = sorted((key for key in declared if pending[key] > 0), key=declared.get)
+        errors.append("Workflow possui ciclo entre os nós: %s" % ", ".join(cyclic))
+        order.extend(cyclic)
+
+    by_key = {spec.key: spec for spec in specs}
+    required: Dict[str, None] = {}
+    plan_nodes = []
+    for position, key in enumerate(order):
+        spec, config = by_key[key], configs[key]
+        node_variables = _required_variables(config)
+        for name in node_variables:
+            required.setdefault(name, None)
+        plan_nodes.append(
+            PlanNode(
+                key=key,
+                node_type=spec.node_type,
+                name=spec.name,
+                order=position,
+                config=config,
+                catalog_id=spec.catalog_id,
+                dependencies=tuple(sorted(dependencies[key], key=declared.get)),
+                dependents=tuple(sorted(dependents[key], key=declared.get)),
+                required_variables=node_variables,
+                errors=_validate_config(registry, spec.node_type, config),
+                continue_on_error=bool(config.get("continue_on_error", False)),
+                max_retries=_int_option(config, "max_retries", DEFAULT_NODE_MAX_RETRIES),
+                retry_delay_ms=_int_option(config, "retry_delay_ms", DEFAULT_NODE_RETRY_DELAY_MS),
+                templates=_compile_templates(config),
+            )
+        )
+
+    return ExecutionPlan(
+        workflow_id=str(workflow_id),
+        version=version,
+        nodes=tuple(plan_nodes),
+        required_variables=tuple(required),
+        errors=tuple(errors),
+        compiled_at=time.time(),
+    )
@@ -0,0 +1,75 @@
+"""
+Templates pré-compilados dos executores
+Cada template é analisado uma única vez (uma varredura de regex) em uma lista
+de segmentos estáticos e placeholders ``{{caminho}}``, com cache por texto
+"""
+
+import json
+import re
+from collections.abc import Callable
+from functools import lru_cache
+from typing import Any
+
+TEMPLATE_CACHE_SIZE = 4096
+
+_PLACEHOLDER_PATTERN = re.compile(r"\{\{\s*([^{}]+?)\s*\}\}")
+
+# Sentinela para placeholders sem valor (mantidos como estão no texto)
+MISSING = object()
+
+
+def render_value(value: Any) -> str:
+    """Converte o valor de um placeholder para texto"""
+    if isinstance(value, str):
+        return value
+    return json.dumps(value) if isinstance(value, (dict, list)) else str(value)
+
+
+class CompiledTemplate:
+    """
+    Template dividido em segmentos: ``parts`` alterna texto estático (índices
+    pares) e caminhos de placeholders (índices ímpares)
+    """
+
+    __slots__ = ("source", "parts", "raw", "paths")
+
+    def __init__(self, source: str):
+        self.source = source
+        parts: list[str] = []
+        raw: list[str] = []
+        last = 0
+        for match in _PLACEHOLDER_PATTERN.finditer(source):
+            parts.append(source[last : match.start()])
+            parts.append(match.group(1))
+            raw.append(match.group(0))
+            last = match.end()
+        parts.append(source[last:])
+        self.parts = tuple(parts)
+        self.raw = tuple(raw)
+        self.paths = tuple(parts[1::2])
+
+    @property
+    def is_static(self) -> bool:
+        return not self.raw
+
+    def render(self, resolve: Callable[[str], Any]) -> str:
+        """
+        Renderiza o template; ``resolve(caminho)`` é chamado apenas para os
+        placeholders presentes e deve retornar ``MISSING`` se não houver valor
+        """
+        if not self.raw:
+            return self.source
+
+        parts = self.parts
+        output = [parts[0]]
+        for index, path in enumerate(self.paths):
+            value = resolve(path)
+            output.append(self.raw[index] if value is MISSING else render_value(value))
+            output.append(parts[2 * index + 2])
+        return "".join(output)
+
+
+@lru_cache(maxsize=TEMPLATE_CACHE_SIZE)
+def compile_template(source: str) -> CompiledTemplate:
+    """Compila um template (cacheado por texto, compartilhado entre execuções)"""
+    return CompiledTemplate(source)
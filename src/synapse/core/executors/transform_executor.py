@@ -4,15 +4,35 @@ Criado por José - um desenvolvedor Full Stack
 Executor especializado para transformação, filtragem e manipulação de dados
 """
 
-import json
 import time
 import re
 from typing import Dict, Any, List
-from collections.abc import Callable
+from collections.abc import Callable, Iterator
 from datetime import datetime
-from jsonpath_ng import parse as jsonpath_parse
 
 from synapse.core.executors.base import BaseExecutor, ExecutorType, ExecutionContext
+from synapse.core.executors.columnar import (
+    ColumnarFrame,
+    aggregate_values,
+    extract_jsonpath,
+    extract_many,
+    extract_path,
+    split_path,
+)
+from synapse.core.executors.expressions import (
+    CompiledExpression,
+    ExpressionError,
+    compile_expression,
+    compile_program,
+)
+from synapse.core.executors.outputs import ExecutionOutputStore
+from synapse.core.executors.worker_pool import (
+    NodeWorkerPool,
+    OffloadTarget,
+    WorkerPoolUnavailable,
+    WorkerTaskError,
+    get_worker_pool,
+)
 from synapse.models.node_execution import NodeExecution
 from synapse.models.node import Node
 
@@ -45,17 +65,76 @@ class DataType:
     NULL = "null"
 
 
+class ExecutionMode:
+    """Modos de execução das transformações tabulares"""
+
+    AUTO = "auto"
+    ROW = "row"
+    COLUMNAR = "columnar"
+
+
+class OffloadMode:
+    """Onde a transformação roda (ver ``TransformExecutor.offload_target``)"""
+
+    AUTO = "auto"
+    LOOP = "loop"
+    PROCESS = "process"
+
+
+# Transformações tabulares que valem o custo de ir para o pool quando grandes
+CPU_BOUND_TRANSFORMS = {
+    TransformType.MAP,
+    TransformType.FILTER,
+    TransformType.REDUCE,
+    TransformType.SORT,
+    TransformType.GROUP,
+    TransformType.JOIN,
+    TransformType.AGGREGATE,
+}
+
+
 class TransformExecutor(BaseExecutor):
     """
     Executor especializado para transformação de dados
     Suporta múltiplas operações de transformação e manipulação
+
+    Listas de dicionários com pelo menos ``columnar_min_rows`` itens são
+    processadas em modo colunar (ver ``columnar.ColumnarFrame``); o modo pode
+    ser forçado com ``execution_mode`` na configuração do nó.
+
+    Código personalizado e transformações tabulares com pelo menos
+    ``offload_min_rows`` itens rodam no pool de processos (``worker_pool``),
+    fora do event loop; ``offload`` na configuração força ``loop`` ou
+    ``process``. No worker o contexto é uma cópia: variáveis alteradas pela
+    transformação não voltam para a execução, só o resultado.
     """
 
-    def __init__(self):
+    columnar_min_rows = 512
+
+    def __init__(
+        self,
+        worker_pool: NodeWorkerPool | None = None,
+        offload_min_rows: int | None = None,
+    ):
         super().__init__(ExecutorType.TRANSFORM)
         self.custom_functions: dict[str, Callable] = {}
+        self._worker_pool = worker_pool
+        self._offload_min_rows = offload_min_rows
         self._register_builtin_functions()
 
+    @property
+    def worker_pool(self) -> NodeWorkerPool | None:
+        """Pool injetado ou o pool global (None se desabilitado)"""
+        return self._worker_pool if self._worker_pool is not None else get_worker_pool()
+
+    @property
+    def offload_min_rows(self) -> int:
+        if self._offload_min_rows is None:
+            from synapse.core.config import settings
+
+            self._offload_min_rows = settings.EXECUTION_WORKER_OFFLOAD_MIN_ROWS
+        return self._offload_min_rows
+
     async def execute(
         self,
         node: Node,
@@ -68,15 +147,12 @@ class TransformExecutor(BaseExecutor):
         try:
             await self.pre_execute(node, context, node_execution)
 
-            # Parse da configuração do nó
-            config = self._parse_node_config(node)
-
-            # Valida configuração
-            validation = self.validate_config(config)
-            if not validation["is_valid"]:
+            # Configuração parseada e validada (pronta quando vem do plano compilado)
+            config, errors = self.prepare_config(node)
+            if errors:
                 return {
                     "success": False,
-                    "error": f"Configuração inválida: {', '.join(validation['errors'])}",
+                    "error": f"Configuração inválida: {', '.join(errors)}",
                     "output": None,
                 }
 
@@ -132,6 +208,26 @@ class TransformExecutor(BaseExecutor):
             if not config.get("function_name") and not config.get("code"):
                 errors.append("Function name ou code é obrigatório para CUSTOM")
 
+        elif transform_type == TransformType.REDUCE:
+            if not config.get("operation"):
+                errors.append("Operation é obrigatório para REDUCE")
+
+        elif transform_type == TransformType.JOIN:
+            if not (config.get("on") or config.get("left_key")):
+                errors.append("On ou left_key é obrigatório para JOIN")
+
+        execution_mode = config.get("execution_mode", ExecutionMode.AUTO)
+        if execution_mode not in (
+            ExecutionMode.AUTO,
+            ExecutionMode.ROW,
+            ExecutionMode.COLUMNAR,
+        ):
+            errors.append(f"Modo de execução inválido: {execution_mode}")
+
+        offload = config.get("offload", OffloadMode.AUTO)
+        if offload not in (OffloadMode.AUTO, OffloadMode.LOOP, OffloadMode.PROCESS):
+            errors.append(f"Modo de offload inválido: {offload}")
+
         return {
             "is_valid": len(errors) == 0,
             "errors": errors,
@@ -143,19 +239,32 @@ class TransformExecutor(BaseExecutor):
         """
         return ["transform", "map", "filter", "extract", "convert", "validate", "data"]
 
-    def _parse_node_config(self, node: Node) -> dict[str, Any]:
+    def offload_target(self, config: dict[str, Any], data: Any = None) -> OffloadTarget:
         """
-        Parse da configuração do nó
+        Código personalizado (não registrado) e transformações tabulares
+        grandes vão para o pool de processos; o resto roda no event loop
         """
-        if isinstance(node.config, dict):
-            return node.config
-        elif isinstance(node.config, str):
-            try:
-                return json.loads(node.config)
-            except json.JSONDecodeError:
-                return {}
-        else:
-            return {}
+        offload = config.get("offload", OffloadMode.AUTO)
+        if offload != OffloadMode.AUTO:
+            return OffloadTarget(offload)
+
+        transform_type = config.get("transform_type")
+        if transform_type == TransformType.CUSTOM:
+            # Funções registradas existem só neste processo
+            if config.get("code") and config.get("function_name") not in self.custom_functions:
+                return OffloadTarget.PROCESS
+        elif transform_type in CPU_BOUND_TRANSFORMS and self._row_count(data) >= self.offload_min_rows:
+            return OffloadTarget.PROCESS
+        return OffloadTarget.LOOP
+
+    @staticmethod
+    def _row_count(data: Any) -> int:
+        if isinstance(data, list):
+            return len(data)
+        if isinstance(data, dict):
+            # JOIN com {"left": [...], "right": [...]}
+            return sum(len(value) for value in data.values() if isinstance(value, list))
+        return 0
 
     def _get_input_data(
         self,
@@ -207,7 +316,49 @@ class TransformExecutor(BaseExecutor):
         context: ExecutionContext,
     ) -> dict[str, Any]:
         """
-        Executa a transformação baseada no tipo
+        Executa a transformação baseada no tipo, no event loop ou no pool de
+        processos (ver ``offload_target``)
+        """
+        pool = self.worker_pool
+        if pool is None or self.offload_target(config, data) != OffloadTarget.PROCESS:
+            return self._apply_transformation(config, data, context)
+
+        start_time = time.time()
+        try:
+            result = await pool.run(
+                run_transformation_task,
+                data,
+                config=config,
+                context_state=worker_context_state(context, config),
+            )
+        except WorkerPoolUnavailable as e:
+            self.logger.warning(f"Pool de processos indisponível, executando no event loop: {str(e)}")
+            return self._apply_transformation(config, data, context)
+        except WorkerTaskError as e:
+            return {
+                "success": False,
+                "error": str(e),
+                "execution_time_ms": int((time.time() - start_time) * 1000),
+                "metadata": {
+                    "transform_type": config["transform_type"],
+                    "input_type": type(data).__name__,
+                    "offloaded": True,
+                    "limit": e.kind,
+                },
+            }
+
+        result["metadata"]["offloaded"] = True
+        result["execution_time_ms"] = int((time.time() - start_time) * 1000)
+        return result
+
+    def _apply_transformation(
+        self,
+        config: dict[str, Any],
+        data: Any,
+        context: ExecutionContext,
+    ) -> dict[str, Any]:
+        """
+        Aplica a transformação (síncrono; roda no event loop ou num worker)
         """
         transform_type = config["transform_type"]
         start_time = time.time()
@@ -255,6 +406,9 @@ class TransformExecutor(BaseExecutor):
                 },
             }
 
+        except MemoryError:
+            # No worker vira o limite de memória da tarefa
+            raise
         except Exception as e:
             execution_time = time.time() - start_time
             return {
@@ -267,6 +421,20 @@ class TransformExecutor(BaseExecutor):
                 },
             }
 
+    def _columnar_frame(
+        self, data: Any, config: dict[str, Any]
+    ) -> ColumnarFrame | None:
+        """
+        Retorna a visão colunar dos dados, ou None quando a transformação deve
+        rodar em modo linha (dados não tabulares, poucos itens ou modo forçado)
+        """
+        mode = config.get("execution_mode", ExecutionMode.AUTO)
+        if mode == ExecutionMode.ROW or not ColumnarFrame.is_tabular(data):
+            return None
+        if mode == ExecutionMode.AUTO and len(data) < self.columnar_min_rows:
+            return None
+        return ColumnarFrame(data)
+
     def _transform_map(
         self, data: Any, config: dict[str, Any], context: ExecutionContext
     ) -> Any:
@@ -279,11 +447,19 @@ class TransformExecutor(BaseExecutor):
         mapping = config.get("mapping", {})
         expression = config.get("expression")
 
+        frame = None if expression or not mapping else self._columnar_frame(data, config)
+        if frame is not None:
+            result = frame.project(mapping)
+            return result if len(result) > 1 else result[0] if result else None
+
+        compiled = self._compile_expression(expression) if expression else None
+        scope = self._expression_scope(context)
+
         result = []
         for item in data:
             if expression:
-                # Usa expressão personalizada
-                transformed = self._evaluate_expression(expression, item, context)
+                # Usa expressão personalizada (compilada uma única vez)
+                transformed = self._run_expression(compiled, item, scope)
             elif mapping:
                 # Usa mapeamento de campos
                 transformed = {}
@@ -309,11 +485,19 @@ class TransformExecutor(BaseExecutor):
         condition = config.get("condition")
         expression = config.get("expression")
 
+        if condition and not expression:
+            frame = self._columnar_frame(data, config)
+            if frame is not None:
+                return frame.filter(condition)
+
+        compiled = self._compile_expression(expression) if expression else None
+        scope = self._expression_scope(context)
+
         result = []
         for item in data:
             if expression:
-                # Usa expressão personalizada
-                if self._evaluate_expression(expression, item, context):
+                # Usa expressão personalizada (compilada uma única vez)
+                if self._run_expression(compiled, item, scope):
                     result.append(item)
             elif condition:
                 # Usa condição estruturada
@@ -429,6 +613,12 @@ class TransformExecutor(BaseExecutor):
         sort_key = config.get("key")
         reverse = config.get("reverse", False)
 
+        frame = self._columnar_frame(data, config) if sort_key else None
+        if frame is not None:
+            result = frame.sort(sort_key, reverse=reverse)
+            if result is not None:
+                return result
+
         if sort_key:
             # Ordena por chave específica
             return sorted(
@@ -440,9 +630,12 @@ class TransformExecutor(BaseExecutor):
 
     def _transform_group(
         self, data: Any, config: dict[str, Any], context: ExecutionContext
-    ) -> dict[str, list]:
+    ) -> dict[str, Any]:
         """
         Transformação GROUP - agrupa dados por chave
+
+        Com ``aggregate`` ({"field": ..., "operations": [...]}) retorna as
+        agregações de cada grupo em vez dos itens agrupados.
         """
         if not isinstance(data, (list, tuple)):
             return {"default": [data]}
@@ -451,15 +644,33 @@ class TransformExecutor(BaseExecutor):
         if not group_key:
             return {"all": list(data)}
 
+        aggregate = config.get("aggregate")
+        frame = self._columnar_frame(data, config)
+        if frame is not None:
+            if aggregate:
+                return frame.group_aggregate(
+                    group_key,
+                    aggregate.get("field"),
+                    aggregate.get("operations", ["count"]),
+                )
+            return frame.group(group_key)
+
         groups = {}
-        for item in data:
-            key_value = self._extract_value(item, group_key)
+        for item, key_value in zip(data, extract_many(data, group_key)):
             key_str = str(key_value)
 
             if key_str not in groups:
                 groups[key_str] = []
             groups[key_str].append(item)
 
+        if aggregate:
+            field = aggregate.get("field")
+            operations = aggregate.get("operations", ["count"])
+            return {
+                key: aggregate_values(extract_many(items, field), operations, len(items))
+                for key, items in groups.items()
+            }
+
         return groups
 
     def _transform_aggregate(
@@ -467,6 +678,9 @@ class TransformExecutor(BaseExecutor):
     ) -> dict[str, Any]:
         """
         Transformação AGGREGATE - calcula agregações
+
+        Operações: count, sum, avg, min, max, std, var, count_distinct,
+        median e percentis no formato ``pNN`` (ex.: p95).
         """
         if not isinstance(data, (list, tuple)):
             data = [data]
@@ -474,32 +688,98 @@ class TransformExecutor(BaseExecutor):
         operations = config.get("operations", ["count"])
         field = config.get("field")
 
-        result = {}
-
-        for operation in operations:
-            if operation == "count":
-                result["count"] = len(data)
-            elif operation == "sum" and field:
-                values = [self._extract_value(item, field) for item in data]
-                numeric_values = [v for v in values if isinstance(v, (int, float))]
-                result["sum"] = sum(numeric_values)
-            elif operation == "avg" and field:
-                values = [self._extract_value(item, field) for item in data]
-                numeric_values = [v for v in values if isinstance(v, (int, float))]
-                result["avg"] = (
-                    sum(numeric_values) / len(numeric_values) if numeric_values else 0
-                )
-            elif operation == "min" and field:
-                values = [self._extract_value(item, field) for item in data]
-                numeric_values = [v for v in values if isinstance(v, (int, float))]
-                result["min"] = min(numeric_values) if numeric_values else None
-            elif operation == "max" and field:
-                values = [self._extract_value(item, field) for item in data]
-                numeric_values = [v for v in values if isinstance(v, (int, float))]
-                result["max"] = max(numeric_values) if numeric_values else None
+        frame = self._columnar_frame(data, config)
+        if frame is not None:
+            return frame.aggregate(field, operations)
 
+        return aggregate_values(extract_many(data, field), operations, len(data))
+
+    def _transform_reduce(
+        self, data: Any, config: dict[str, Any], context: ExecutionContext
+    ) -> Any:
+        """
+        Transformação REDUCE - reduz a lista a um único valor
+
+        Operações: sum, avg, min, max, count e demais agregações numéricas,
+        além de concat (listas), merge (dicionários) e join (strings).
+        """
+        if not isinstance(data, (list, tuple)):
+            data = [data]
+
+        operation = config["operation"]
+        values = extract_many(data, config.get("field"))
+
+        if operation == "concat":
+            result = []
+            for value in values:
+                if isinstance(value, (list, tuple)):
+                    result.extend(value)
+                elif value is not None:
+                    result.append(value)
+            return result
+        if operation == "merge":
+            result = {}
+            for value in values:
+                if isinstance(value, dict):
+                    result.update(value)
+            return result
+        if operation == "join":
+            separator = config.get("separator", "")
+            return separator.join(str(value) for value in values if value is not None)
+
+        frame = self._columnar_frame(data, config)
+        if frame is not None:
+            aggregated = frame.aggregate(config.get("field"), [operation])
+        else:
+            aggregated = aggregate_values(values, [operation], len(data))
+
+        if operation not in aggregated:
+            raise ValueError(f"Operação de REDUCE não suportada: {operation}")
+        result = aggregated[operation]
+        initial = config.get("initial")
+        if initial is not None and operation == "sum":
+            result += initial
         return result
 
+    def _transform_join(
+        self, data: Any, config: dict[str, Any], context: ExecutionContext
+    ) -> list[dict[str, Any]]:
+        """
+        Transformação JOIN - hash join entre os dados de entrada e outra lista
+
+        O lado direito vem de ``right`` (lista literal), de ``right_source``
+        (output de nó, variável ou campo de input) ou, se os dados de entrada
+        forem {"left": [...], "right": [...]}, do próprio input.
+        """
+        left = data
+        right = config.get("right")
+        right_source = config.get("right_source")
+
+        if right is None and right_source:
+            right = context.get_node_output(right_source)
+            if isinstance(right, dict) and "output" in right:
+                right = right["output"]
+            if right is None:
+                right = context.get_variable(right_source)
+            if right is None:
+                right = context.input_data.get(right_source)
+        if right is None and isinstance(data, dict):
+            left, right = data.get("left"), data.get("right")
+
+        left = [] if left is None else ([left] if isinstance(left, dict) else list(left))
+        right = [] if right is None else ([right] if isinstance(right, dict) else list(right))
+        if not all(isinstance(item, dict) for item in (*left, *right)):
+            raise ValueError("JOIN requer listas de objetos nos dois lados")
+
+        left_key = config.get("left_key") or config.get("on")
+        right_key = config.get("right_key") or config.get("on") or left_key
+        how = config.get("how", "inner")
+        suffix = config.get("suffix", "_right")
+
+        if not left:
+            return []
+        return ColumnarFrame(left).hash_join(right, left_key, right_key, how, suffix)
+
     def _transform_custom(
         self, data: Any, config: dict[str, Any], context: ExecutionContext
     ) -> Any:
@@ -513,40 +793,37 @@ class TransformExecutor(BaseExecutor):
             # Usa função registrada
             return self.custom_functions[function_name](data, config, context)
         elif code:
-            # Executa código personalizado (com cuidado!)
-            local_vars = {
+            # Executa código personalizado na linguagem segura (sem exec)
+            scope = {
                 "data": data,
                 "config": config,
-                "context": context,
-                "json": json,
-                "re": re,
-                "datetime": datetime,
+                "context": {
+                    "execution_id": context.execution_id,
+                    "workflow_id": context.workflow_id,
+                    "user_id": context.user_id,
+                    "variables": context.variables,
+                    "input_data": context.input_data,
+                    "context_data": context.context_data,
+                    "node_outputs": context.node_outputs,
+                },
+                "_lookup": lambda path, scope: self.lookup_variable(
+                    path, context, {"data": scope.get("data")}
+                ),
             }
 
             try:
-                exec(code, {"__builtins__": {}}, local_vars)
-                return local_vars.get("result", data)
-            except Exception as e:
+                compile_program(code).run(scope)
+                return scope.get("result", data)
+            except ExpressionError as e:
                 raise ValueError(f"Erro na execução do código personalizado: {str(e)}")
         else:
             return data
 
     def _extract_jsonpath(self, data: Any, path: str) -> Any:
         """
-        Extrai valor usando JSONPath
+        Extrai valor usando JSONPath (expressões compiladas ficam em cache)
         """
-        try:
-            jsonpath_expr = jsonpath_parse(path)
-            matches = jsonpath_expr.find(data)
-
-            if not matches:
-                return None
-            elif len(matches) == 1:
-                return matches[0].value
-            else:
-                return [match.value for match in matches]
-        except Exception:
-            return None
+        return extract_jsonpath(data, path)
 
     def _extract_value(self, data: Any, path: str) -> Any:
         """
@@ -560,18 +837,53 @@ class TransformExecutor(BaseExecutor):
             return self._extract_jsonpath(data, path)
 
         # Usa notação de ponto simples
+        return extract_path(data, split_path(path))
+
+    def _compile_expression(self, expression: str) -> CompiledExpression | None:
+        """
+        Compila uma expressão (com cache LRU por texto, compartilhado entre
+        itens e execuções); retorna None se a expressão for inválida
+        """
         try:
-            parts = path.split(".")
-            value = data
-            for part in parts:
-                if part.isdigit() and isinstance(value, (list, tuple)):
-                    value = value[int(part)]
-                elif isinstance(value, dict):
-                    value = value.get(part)
-                else:
-                    return None
-            return value
-        except:
+            return compile_expression(expression)
+        except ExpressionError as e:
+            self.logger.warning(f"Expressão inválida '{expression}': {str(e)}")
+            return None
+
+    def _expression_scope(self, context: ExecutionContext) -> dict[str, Any]:
+        """
+        Escopo base das expressões; ``item``/``data`` são trocados a cada item
+        """
+        return {
+            "item": None,
+            "data": None,
+            "variables": context.variables,
+            "input": context.input_data,
+            "nodes": context.node_outputs,
+            "_lookup": lambda path, scope: self.lookup_variable(
+                path, context, {"item": scope.get("item")}
+            ),
+        }
+
+    def _run_expression(
+        self,
+        compiled: CompiledExpression | None,
+        data: Any,
+        scope: dict[str, Any],
+    ) -> Any:
+        """
+        Avalia uma expressão compilada para um item
+        """
+        if compiled is None:
+            return None
+
+        scope["item"] = scope["data"] = data
+        try:
+            return compiled.evaluate(scope)
+        except ExpressionError as e:
+            self.logger.warning(
+                f"Erro ao avaliar expressão '{compiled.source}': {str(e)}"
+            )
             return None
 
     def _evaluate_expression(
@@ -580,35 +892,12 @@ class TransformExecutor(BaseExecutor):
         """
         Avalia uma expressão personalizada
         """
-        # Substitui variáveis na expressão
-        resolved_expr = self.resolve_template_variables(
-            expression, context, {"item": data}
+        return self._run_expression(
+            self._compile_expression(expression),
+            data,
+            self._expression_scope(context),
         )
 
-        # Contexto seguro para eval
-        safe_dict = {
-            "item": data,
-            "data": data,
-            "len": len,
-            "str": str,
-            "int": int,
-            "float": float,
-            "bool": bool,
-            "abs": abs,
-            "min": min,
-            "max": max,
-            "sum": sum,
-            "round": round,
-            "json": json,
-            "re": re,
-        }
-
-        try:
-            return eval(resolved_expr, {"__builtins__": {}}, safe_dict)
-        except Exception as e:
-            self.logger.warning(f"Erro ao avaliar expressão '{expression}': {str(e)}")
-            return None
-
     def _evaluate_condition(
         self, condition: dict[str, Any], data: Any, context: ExecutionContext
     ) -> bool:
@@ -627,14 +916,18 @@ class TransformExecutor(BaseExecutor):
             return field_value == value
         elif operator == "ne":
             return field_value != value
-        elif operator == "gt":
-            return field_value > value
-        elif operator == "gte":
-            return field_value >= value
-        elif operator == "lt":
-            return field_value < value
-        elif operator == "lte":
-            return field_value <= value
+        elif operator in ("gt", "gte", "lt", "lte"):
+            # Valores de tipos incomparáveis não atendem a condição
+            try:
+                if operator == "gt":
+                    return field_value > value
+                if operator == "gte":
+                    return field_value >= value
+                if operator == "lt":
+                    return field_value < value
+                return field_value <= value
+            except TypeError:
+                return False
         elif operator == "in":
             return field_value in value if isinstance(value, (list, tuple)) else False
         elif operator == "contains":
@@ -737,3 +1030,69 @@ class TransformExecutor(BaseExecutor):
         Registra uma função personalizada
         """
         self.custom_functions[name] = function
+
+
+# ----------------------------------------------------------------------
+# Execução no pool de processos
+# ----------------------------------------------------------------------
+
+_worker_executor: TransformExecutor | None = None
+
+
+def _config_strings(value: Any) -> Iterator[str]:
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, dict):
+        for key, item in value.items():
+            yield str(key)
+            yield from _config_strings(item)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            yield from _config_strings(item)
+
+
+def worker_context_state(context: ExecutionContext, config: dict[str, Any]) -> dict[str, Any]:
+    """
+    Estado do contexto enviado ao worker (pickle pelo pipe do pool): só as
+    variáveis, inputs, dados de contexto e outputs inline cujo nome aparece
+    na configuração (código, expressões, chaves). Outputs externalizados vão
+    sempre, como referência (pequena), e só são lidos se usados
+    """
+    text = "\n".join(_config_strings(config))
+    references = context.node_outputs.references
+
+    def mentioned(values: dict[str, Any], keep: Any = ()) -> dict[str, Any]:
+        return {key: value for key, value in values.items() if key in keep or str(key) in text}
+
+    return {
+        "execution_id": context.execution_id,
+        "workflow_id": context.workflow_id,
+        "user_id": context.user_id,
+        "variables": mentioned(context.variables),
+        "input_data": mentioned(context.input_data),
+        "context_data": mentioned(context.context_data),
+        "node_outputs": mentioned(context.node_outputs.snapshot(), references),
+        "output_references": sorted(references),
+        "output_store": context.node_outputs.store,
+        "output_cache_bytes": context.node_outputs.cache_bytes,
+    }
+
+
+def run_transformation_task(
+    data: Any, config: dict[str, Any], context_state: dict[str, Any]
+) -> dict[str, Any]:
+    """
+    Tarefa do pool: aplica a transformação num worker. O executor fica em
+    cache no processo, junto com as expressões compiladas
+    """
+    global _worker_executor
+    if _worker_executor is None:
+        _worker_executor = TransformExecutor()
+
+    state = dict(context_state)
+    node_outputs = state.pop("node_outputs")
+    references = state.pop("output_references")
+    output_store: ExecutionOutputStore | None = state.pop("output_store")
+    context = ExecutionContext(output_store=output_store, **state)
+    context.node_outputs.restore(node_outputs, references)
+    return _worker_executor._apply_transformation(config, data, context)
@@ -0,0 +1,585 @@
+"""
+Pool de processos dos executores de nós
+Nós IO-bound (HTTP, LLM) rodam no event loop; nós CPU-bound (código
+personalizado, transformações grandes) são despachados para um pool limitado
+de processos, para que uma transformação pesada não trave as requisições e
+WebSockets do worker da API.
+
+- Workers aquecidos: no ``forkserver`` os módulos das tarefas são carregados
+  uma vez e cada worker mantém seus caches (executor, expressões compiladas)
+  entre tarefas; são reciclados a cada ``max_tasks_per_child`` tarefas.
+- Limites por tarefa aplicados no worker: tempo (SIGALRM), CPU (RLIMIT_CPU)
+  e memória acima da base do processo (RLIMIT_AS). Sem o módulo
+  ``resource`` (Windows) só o tempo é limitado, pelo processo principal.
+- Payloads a partir de ``min_shared_bytes`` trafegam por memória
+  compartilhada (um único pickle copiado para o segmento) em vez do pipe do
+  pool; o resultado volta pelo mesmo caminho.
+- Tarefa sem resposta nem ao próprio limite derruba o pool: os processos
+  são encerrados (o worker preso não sobrevive) e um pool novo é criado. O
+  prazo conta a partir do início da tarefa no worker, que registra o
+  instante num quadro em memória compartilhada (uma posição por slot).
+- ``get_stats()`` expõe fila, execução, limites estourados e utilização.
+"""
+
+import asyncio
+import importlib
+import logging
+import math
+import multiprocessing
+import os
+import pickle
+import signal
+import struct
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from enum import Enum
+from multiprocessing import shared_memory
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+# Módulos carregados no forkserver e no aquecimento dos workers
+DEFAULT_PRELOAD = ("synapse.core.executors.transform_executor",)
+
+# Folga do processo principal além do tempo limite aplicado no worker
+_HARD_DEADLINE_GRACE = 5.0
+
+# Intervalo de consulta ao quadro de início enquanto a tarefa está na fila do pool
+_START_POLL_SECONDS = 0.05
+
+# Posição de um slot no quadro de início: (token da tarefa, instante de início)
+_SLOT = struct.Struct("dd")
+
+
+class OffloadTarget(str, Enum):
+    """Onde um nó roda: no event loop (IO-bound) ou no pool (CPU-bound)"""
+
+    LOOP = "loop"
+    PROCESS = "process"
+
+
+class WorkerPoolUnavailable(RuntimeError):
+    """O pool não pôde ser iniciado (ou usar memória compartilhada) neste ambiente"""
+
+
+class WorkerTaskError(RuntimeError):
+    """Tarefa interrompida no pool: limite estourado, worker perdido ou abandonada"""
+
+    def __init__(self, kind: str, message: str):
+        super().__init__(message)
+        self.kind = kind
+
+
+class TaskLimitExceeded(BaseException):
+    """
+    Levantada no worker pelos handlers de sinal. BaseException: o código do
+    nó (``except Exception``) não consegue engolir o limite
+    """
+
+    def __init__(self, kind: str):
+        super().__init__(kind)
+        self.kind = kind
+
+
+@dataclass(frozen=True)
+class TaskLimits:
+    timeout_seconds: float = 60.0
+    cpu_seconds: int = 30
+    memory_mb: int = 1024
+
+
+LIMIT_MESSAGES = {
+    "time": "Tarefa excedeu o tempo limite de {limits.timeout_seconds}s",
+    "cpu": "Tarefa excedeu o limite de CPU de {limits.cpu_seconds}s",
+    "memory": "Tarefa excedeu o limite de memória de {limits.memory_mb} MB",
+}
+
+
+# ----------------------------------------------------------------------
+# Payloads (inline ou memória compartilhada)
+# ----------------------------------------------------------------------
+
+
+def _pack(value: Any, min_shared_bytes: int) -> Tuple[tuple, Optional[shared_memory.SharedMemory]]:
+    data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+    if len(data) < min_shared_bytes:
+        return ("inline", data), None
+    block = shared_memory.SharedMemory(create=True, size=len(data))
+    block.buf[: len(data)] = data
+    return ("shm", block.name, len(data)), block
+
+
+def _unpack(packed: tuple, unlink: bool = False) -> Any:
+    if packed[0] == "inline":
+        return pickle.loads(packed[1])
+    block = shared_memory.SharedMemory(name=packed[1])
+    try:
+        with block.buf[: packed[2]] as view:
+            return pickle.loads(view)
+    finally:
+        block.close()
+        if unlink:
+            block.unlink()
+
+
+def _release(packed: tuple) -> None:
+    """Remove o segmento de um resultado que não será lido"""
+    if packed[0] == "shm":
+        try:
+            block = shared_memory.SharedMemory(name=packed[1])
+        except FileNotFoundError:
+            return
+        block.close()
+        block.unlink()
+
+
+def _discard_reply(future: Future) -> None:
+    """Callback de uma tarefa abandonada: libera o resultado quando chegar"""
+    if future.cancelled() or future.exception() is not None:
+        return
+    reply = future.result()
+    if "result" in reply:
+        _release(reply["result"])
+
+
+# ----------------------------------------------------------------------
+# Lado do worker
+# ----------------------------------------------------------------------
+
+
+def _raise_limit(kind: str) -> Callable:
+    def handler(signum, frame):
+        raise TaskLimitExceeded(kind)
+
+    return handler
+
+
+def _init_worker() -> None:
+    if hasattr(signal, "SIGALRM"):
+        signal.signal(signal.SIGALRM, _raise_limit("time"))
+    if resource is not None:
+        signal.signal(signal.SIGXCPU, _raise_limit("cpu"))
+
+
+# Quadros de início abertos pelo worker, por nome do segmento
+_boards: Dict[str, shared_memory.SharedMemory] = {}
+
+
+def _mark_started(start_slot: Tuple[str, int, float]) -> None:
+    """Registra no quadro do pool o instante em que a tarefa começou"""
+    name, slot, token = start_slot
+    board = _boards.get(name)
+    if board is None:
+        board = _boards[name] = shared_memory.SharedMemory(name=name)
+    offset = slot * _SLOT.size
+    # Instante antes do token: quem lê o token já encontra o instante certo
+    struct.pack_into("d", board.buf, offset + 8, time.time())
+    struct.pack_into("d", board.buf, offset, token)
+
+
+def _warm_up(modules: Sequence[str]) -> int:
+    for module in modules:
+        importlib.import_module(module)
+    return os.getpid()
+
+
+def _address_space() -> Optional[int]:
+    try:
+        with open("/proc/self/statm") as handle:
+            return int(handle.read().split()[0]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+def _set_soft_limit(kind: int, soft: int) -> None:
+    _, hard = resource.getrlimit(kind)
+    if hard != resource.RLIM_INFINITY:
+        soft = min(soft, hard)
+    resource.setrlimit(kind, (soft, hard))
+
+
+def _apply_limits(limits: TaskLimits) -> None:
+    if resource is not None:
+        usage = resource.getrusage(resource.RUSAGE_SELF)
+        _set_soft_limit(
+            resource.RLIMIT_CPU,
+            math.ceil(usage.ru_utime + usage.ru_stime + limits.cpu_seconds),
+        )
+        current = _address_space()
+        if current is not None and limits.memory_mb:
+            _set_soft_limit(resource.RLIMIT_AS, current + limits.memory_mb * 1024 * 1024)
+    if hasattr(signal, "setitimer"):
+        signal.setitimer(signal.ITIMER_REAL, limits.timeout_seconds)
+
+
+def _clear_limits() -> None:
+    if hasattr(signal, "setitimer"):
+        signal.setitimer(signal.ITIMER_REAL, 0)
+    if resource is not None:
+        for kind in (resource.RLIMIT_CPU, resource.RLIMIT_AS):
+            resource.setrlimit(kind, (resource.getrlimit(kind)[1],) * 2)
+
+
+def _run_task(
+    fn: Callable,
+    packed: tuple,
+    kwargs: Dict[str, Any],
+    limits: TaskLimits,
+    min_shared_bytes: int,
+    start_slot: Optional[Tuple[str, int, float]] = None,
+) -> Dict[str, Any]:
+    """Executa ``fn(payload, **kwargs)`` com os limites da tarefa"""
+    if start_slot is not None:
+        _mark_started(start_slot)
+    payload = _unpack(packed)
+    started = time.perf_counter()
+    try:
+        try:
+            _apply_limits(limits)
+            result = fn(payload, **kwargs)
+        finally:
+            _clear_limits()
+    except TaskLimitExceeded as e:
+        return {"limit": e.kind, "run_seconds": time.perf_counter() - started}
+    except MemoryError:
+        return {"limit": "memory", "run_seconds": time.perf_counter() - started}
+    del payload
+
+    run_seconds = time.perf_counter() - started
+    packed_result, block = _pack(result, min_shared_bytes)
+    if block is not None:
+        # O segmento continua existindo até o processo principal ler e remover
+        block.close()
+    return {"result": packed_result, "run_seconds": run_seconds, "pid": os.getpid()}
+
+
+# ----------------------------------------------------------------------
+# Pool
+# ----------------------------------------------------------------------
+
+
+class NodeWorkerPool:
+    """
+    Pool limitado de processos para nós CPU-bound. No máximo ``workers``
+    tarefas ficam no pool; as demais esperam no event loop (contadas como
+    fila). Tarefas que passam do tempo limite sem resposta do worker, ou um
+    worker que morre, fazem o pool ser recriado
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        limits: Optional[TaskLimits] = None,
+        start_method: str = "forkserver",
+        max_tasks_per_child: Optional[int] = 500,
+        min_shared_bytes: int = 256 * 1024,
+        preload: Sequence[str] = DEFAULT_PRELOAD,
+    ):
+        self.workers = workers or max(1, min(4, os.cpu_count() or 1))
+        self.limits = limits or TaskLimits()
+        if start_method not in multiprocessing.get_all_start_methods():
+            start_method = "spawn"
+        self.start_method = start_method
+        self.max_tasks_per_child = max_tasks_per_child or None
+        self.min_shared_bytes = min_shared_bytes
+        self.preload = tuple(preload)
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._warming: List[Future] = []
+        self._board: Optional[shared_memory.SharedMemory] = None
+        self._free_slots = list(range(self.workers))
+        self._tokens = 0
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._slots_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._started_at: Optional[float] = None
+        self._busy_seconds = 0.0
+        self.running = 0
+        self.waiting = 0
+        self.stats = {
+            "submitted": 0,
+            "completed": 0,
+            "failed": 0,
+            "limit_exceeded": {"time": 0, "cpu": 0, "memory": 0},
+            "crashed": 0,
+            "abandoned": 0,
+            "restarts": 0,
+            "shared_memory_tasks": 0,
+            "shared_memory_bytes": 0,
+            "queue_wait_seconds": 0.0,
+            "max_queue_wait_seconds": 0.0,
+            "run_seconds": 0.0,
+            "max_run_seconds": 0.0,
+        }
+
+    @property
+    def started(self) -> bool:
+        return self._pool is not None
+
+    def _ensure_pool(self) -> ProcessPoolExecutor:
+        if self._pool is not None:
+            return self._pool
+        try:
+            context = multiprocessing.get_context(self.start_method)
+            if self.start_method == "forkserver":
+                context.set_forkserver_preload(list(self.preload))
+            pool = ProcessPoolExecutor(
+                self.workers,
+                mp_context=context,
+                initializer=_init_worker,
+                max_tasks_per_child=self.max_tasks_per_child,
+            )
+            if self._board is None:
+                self._board = shared_memory.SharedMemory(create=True, size=_SLOT.size * self.workers)
+            # Sobe os workers e carrega os módulos das tarefas antes do uso
+            self._warming = [pool.submit(_warm_up, self.preload) for _ in range(self.workers)]
+        except (OSError, NotImplementedError, ValueError) as e:
+            raise WorkerPoolUnavailable(f"Pool de processos indisponível: {e}") from e
+        self._pool = pool
+        if self._started_at is None:
+            self._started_at = time.monotonic()
+        logger.info(
+            "Pool de executores iniciado: %s workers (%s)",
+            self.workers,
+            self.start_method,
+        )
+        return pool
+
+    def _recycle(self, pool: ProcessPoolExecutor, kill: bool = False) -> None:
+        """
+        Descarta ``pool`` (se ainda for o atual); com ``kill`` os processos
+        são encerrados, para não deixar vivo um worker preso numa tarefa
+        """
+        if self._pool is pool:
+            self._pool = None
+            self.stats["restarts"] += 1
+        # O shutdown esquece os processos: a lista é lida antes
+        processes = list((getattr(pool, "_processes", None) or {}).values()) if kill else []
+        pool.shutdown(wait=False, cancel_futures=True)
+        for process in processes:
+            if process.is_alive():
+                process.kill()
+
+    def _slots_for_loop(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._slots is None or self._slots_loop is not loop:
+            self._slots = asyncio.Semaphore(self.workers)
+            self._slots_loop = loop
+        return self._slots
+
+    def _task_started_at(self, slot: int, token: float) -> Optional[float]:
+        """Instante em que a tarefa ``token`` começou no worker (None se ainda na fila)"""
+        if self._board is None:
+            return None
+        recorded, started = _SLOT.unpack_from(self._board.buf, slot * _SLOT.size)
+        return started if recorded == token else None
+
+    async def start(self) -> None:
+        """Inicia os workers e espera o aquecimento (também acontece no primeiro uso)"""
+        self._ensure_pool()
+        warming, self._warming = self._warming, []
+        try:
+            await asyncio.gather(*(asyncio.wrap_future(future) for future in warming))
+        except BrokenProcessPool as e:
+            raise WorkerPoolUnavailable(f"Workers do pool não iniciaram: {e}") from e
+
+    async def stop(self) -> None:
+        """Encerra os workers; tarefas ainda na fila do pool são canceladas"""
+        pool, self._pool = self._pool, None
+        if pool is not None:
+            await asyncio.to_thread(pool.shutdown, wait=True, cancel_futures=True)
+        board, self._board = self._board, None
+        if board is not None:
+            board.close()
+            board.unlink()
+
+    async def run(
+        self,
+        fn: Callable,
+        payload: Any,
+        limits: Optional[TaskLimits] = None,
+        **kwargs: Any,
+    ) -> Any:
+        """
+        Executa ``fn(payload, **kwargs)`` em um worker e devolve o resultado.
+        ``fn`` precisa ser uma função de módulo (importável pelo worker).
+        Levanta ``WorkerTaskError`` se a tarefa for interrompida e
+        ``WorkerPoolUnavailable`` se o ambiente não permitir o pool
+        """
+        limits = limits or self.limits
+        slots = self._slots_for_loop()
+        self.stats["submitted"] += 1
+        queued_at = time.perf_counter()
+        self.waiting += 1
+        try:
+            await slots.acquire()
+        finally:
+            self.waiting -= 1
+        try:
+            wait = time.perf_counter() - queued_at
+            self.stats["queue_wait_seconds"] += wait
+            self.stats["max_queue_wait_seconds"] = max(self.stats["max_queue_wait_seconds"], wait)
+            self.running += 1
+            return await self._dispatch(fn, payload, kwargs, limits)
+        finally:
+            self.running -= 1
+            slots.release()
+
+    async def _dispatch(
+        self,
+        fn: Callable,
+        payload: Any,
+        kwargs: Dict[str, Any],
+        limits: TaskLimits,
+    ) -> Any:
+        try:
+            pool = self._ensure_pool()
+            packed, block = _pack(payload, self.min_shared_bytes)
+        except OSError as e:
+            raise WorkerPoolUnavailable(f"Memória compartilhada indisponível: {e}") from e
+        if block is not None:
+            self.stats["shared_memory_tasks"] += 1
+            self.stats["shared_memory_bytes"] += packed[2]
+
+        started = time.perf_counter()
+        future: Optional[Future] = None
+        # Slot no quadro de início; sem slot livre o prazo conta desde o envio
+        slot = self._free_slots.pop() if self._free_slots else None
+        try:
+            start_slot = None
+            if slot is not None:
+                self._tokens += 1
+                start_slot = (self._board.name, slot, float(self._tokens))
+            future = pool.submit(_run_task, fn, packed, kwargs, limits, self.min_shared_bytes, start_slot)
+            reply = await self._wait_reply(future, start_slot, limits)
+        except asyncio.TimeoutError:
+            # O worker não respondeu nem ao próprio limite (ex.: preso em código C)
+            future.add_done_callback(_discard_reply)
+            self.stats["abandoned"] += 1
+            self._fail("time")
+            self._recycle(pool, kill=True)
+            raise WorkerTaskError("time", LIMIT_MESSAGES["time"].format(limits=limits))
+        except asyncio.CancelledError:
+            # Quem esperava desistiu: o resultado, se vier, não será lido
+            if future is not None:
+                future.cancel()
+                future.add_done_callback(_discard_reply)
+            raise
+        except BrokenProcessPool:
+            self.stats["crashed"] += 1
+            self.stats["failed"] += 1
+            self._recycle(pool)
+            raise WorkerTaskError("crashed", "Worker do pool de executores encerrado durante a tarefa")
+        except TaskLimitExceeded as e:
+            # Limite disparado ao encerrar a tarefa
+            self._fail(e.kind)
+            raise WorkerTaskError(e.kind, LIMIT_MESSAGES[e.kind].format(limits=limits))
+        finally:
+            if slot is not None:
+                self._free_slots.append(slot)
+            self._busy_seconds += time.perf_counter() - started
+            if block is not None:
+                block.close()
+                block.unlink()
+
+        run_seconds = reply.get("run_seconds", 0.0)
+        self.stats["run_seconds"] += run_seconds
+        self.stats["max_run_seconds"] = max(self.stats["max_run_seconds"], run_seconds)
+        if "limit" in reply:
+            self._fail(reply["limit"])
+            raise WorkerTaskError(reply["limit"], LIMIT_MESSAGES[reply["limit"]].format(limits=limits))
+
+        self.stats["completed"] += 1
+        try:
+            return _unpack(reply["result"], unlink=True)
+        except BaseException:
+            _release(reply["result"])
+            raise
+
+    async def _wait_reply(
+        self,
+        future: Future,
+        start_slot: Optional[Tuple[str, int, float]],
+        limits: TaskLimits,
+    ) -> Dict[str, Any]:
+        """
+        Espera a resposta do worker até ``timeout_seconds`` + folga contados
+        do início da tarefa no worker (não do envio: a tarefa pode esperar na
+        fila do pool). Levanta ``asyncio.TimeoutError`` ao estourar o prazo
+        """
+        reply = asyncio.wrap_future(future)
+        budget = limits.timeout_seconds + _HARD_DEADLINE_GRACE
+        deadline = time.time() + budget if start_slot is None else None
+        while True:
+            if deadline is None:
+                task_started = self._task_started_at(start_slot[1], start_slot[2])
+                if task_started is not None:
+                    deadline = task_started + budget
+            timeout = _START_POLL_SECONDS if deadline is None else deadline - time.time()
+            if timeout <= 0:
+                raise asyncio.TimeoutError
+            done, _ = await asyncio.wait({reply}, timeout=timeout)
+            if done:
+                return reply.result()
+
+    def _fail(self, kind: str) -> None:
+        self.stats["failed"] += 1
+        self.stats["limit_exceeded"][kind] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        finished = max(self.stats["completed"] + self.stats["failed"], 1)
+        started = self.stats["submitted"] - self.waiting
+        uptime = time.monotonic() - self._started_at if self._started_at else 0.0
+        return {
+            **{key: value for key, value in self.stats.items() if not key.endswith("seconds")},
+            "limit_exceeded": dict(self.stats["limit_exceeded"]),
+            "started": self.started,
+            "workers": self.workers,
+            "start_method": self.start_method,
+            "running": self.running,
+            "waiting": self.waiting,
+            "queue_wait_ms": {
+                "avg": round(self.stats["queue_wait_seconds"] / max(started, 1) * 1000, 3),
+                "max": round(self.stats["max_queue_wait_seconds"] * 1000, 3),
+            },
+            "run_ms": {
+                "avg": round(self.stats["run_seconds"] / finished * 1000, 3),
+                "max": round(self.stats["max_run_seconds"] * 1000, 3),
+            },
+            "utilization": round(self._busy_seconds / (self.workers * uptime), 4) if uptime else 0.0,
+            "limits": {
+                "timeout_seconds": self.limits.timeout_seconds,
+                "cpu_seconds": self.limits.cpu_seconds,
+                "memory_mb": self.limits.memory_mb,
+            },
+        }
+
+
+_worker_pool: Optional[NodeWorkerPool] = None
+
+
+def get_worker_pool() -> Optional[NodeWorkerPool]:
+    """Pool global configurado pelas settings (None se desabilitado)"""
+    global _worker_pool
+    from synapse.core.config import settings
+
+    if not settings.EXECUTION_WORKER_POOL_ENABLED:
+        return None
+    if _worker_pool is None:
+        _worker_pool = NodeWorkerPool(
+            workers=settings.EXECUTION_WORKER_PROCESSES or None,
+            limits=TaskLimits(
+                timeout_seconds=settings.EXECUTION_WORKER_TASK_TIMEOUT,
+                cpu_seconds=settings.EXECUTION_WORKER_TASK_CPU_SECONDS,
+                memory_mb=settings.EXECUTION_WORKER_TASK_MEMORY_MB,
+            ),
+            start_method=settings.EXECUTION_WORKER_START_METHOD,
+            max_tasks_per_child=settings.EXECUTION_WORKER_MAX_TASKS_PER_CHILD,
+            min_shared_bytes=settings.EXECUTION_WORKER_SHM_MIN_BYTES,
+        )
+    return _worker_pool
@@ -0,0 +1,274 @@
+"""
+Pipeline de logging assíncrono
+Os loggers apenas enfileiram registros (``LogQueueHandler``); formatação e
+I/O (console, arquivos rotativos, handlers do uvicorn) acontecem em uma
+thread dedicada (``LogQueueListener``), fora do event loop. A fila é
+limitada: com ela cheia, registros abaixo de WARNING são descartados na
+hora e os demais esperam um pouco por espaço antes do descarte, sempre com
+contadores. O contexto da requisição (request_id, tenant, trace) vem do
+próprio ``RequestContext`` do pipeline HTTP, guardado em uma ContextVar e
+lido por atributo no momento do log, sem cópias de dicionário.
+"""
+
+import atexit
+import logging
+import queue
+import threading
+from contextvars import ContextVar
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, Iterable, List, Optional
+
+# RequestContext da requisição em andamento (definido pelo pipeline HTTP)
+current_request: ContextVar[Optional[Any]] = ContextVar("log_request_context", default=None)
+
+
+class LogStats:
+    """Contadores do pipeline (aproximados sob concorrência, exatos no descarte)"""
+
+    __slots__ = ("enqueued", "handled", "dropped", "dropped_warnings", "sampled_out", "_lock")
+
+    def __init__(self):
+        self.enqueued = 0
+        self.handled = 0
+        self.dropped = 0
+        self.dropped_warnings = 0
+        self.sampled_out = 0
+        self._lock = threading.Lock()
+
+    def drop(self, record: logging.LogRecord) -> None:
+        with self._lock:
+            self.dropped += 1
+            if record.levelno >= logging.WARNING:
+                self.dropped_warnings += 1
+
+    def as_dict(self) -> Dict[str, int]:
+        return {
+            "enqueued": self.enqueued,
+            "handled": self.handled,
+            "dropped": self.dropped,
+            "dropped_warnings": self.dropped_warnings,
+            "sampled_out": self.sampled_out,
+        }
+
+
+# Contadores globais (também recebem as amostragens do log de acesso)
+log_stats = LogStats()
+
+
+def attach_request_context(record: logging.LogRecord) -> None:
+    """Copia request_id, tenant_id e trace_id da requisição atual para o registro"""
+    ctx = current_request.get()
+    if ctx is None:
+        return
+    attributes = record.__dict__
+    # Valores passados em ``extra`` têm precedência
+    if "request_id" not in attributes and ctx.request_id is not None:
+        attributes["request_id"] = ctx.request_id
+    if "tenant_id" not in attributes and ctx.tenant_id is not None:
+        attributes["tenant_id"] = str(ctx.tenant_id)
+    if "trace_id" not in attributes:
+        trace_id = ctx.scope.get("trace_id")
+        if trace_id:
+            attributes["trace_id"] = trace_id
+
+
+class RequestContextLogFilter(logging.Filter):
+    """Anexa o contexto da requisição quando os handlers gravam de forma síncrona"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        attach_request_context(record)
+        return True
+
+
+class LogQueueHandler(QueueHandler):
+    """
+    Enfileira registros sem formatá-los. Apenas mensagens com argumentos
+    ``%`` são resolvidas aqui, para que objetos mutáveis não mudem o texto
+    até o listener processar o registro.
+    """
+
+    def __init__(self, log_queue: "queue.Queue", block_timeout: float = 0.05, stats: Optional[LogStats] = None):
+        super().__init__(log_queue)
+        self.block_timeout = block_timeout
+        self.stats = stats or log_stats
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        if record.args:
+            record.msg = record.getMessage()
+            record.args = None
+        attach_request_context(record)
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            if record.levelno < logging.WARNING or self.block_timeout <= 0:
+                self.stats.drop(record)
+                return
+            try:
+                self.queue.put(record, timeout=self.block_timeout)
+            except queue.Full:
+                self.stats.drop(record)
+                return
+        self.stats.enqueued += 1
+
+
+class RoutedQueueHandler(LogQueueHandler):
+    """Enfileira marcando o logger de origem, para handlers adotados de loggers que não propagam"""
+
+    def __init__(self, log_queue: "queue.Queue", route: str, block_timeout: float = 0.05, stats: Optional[LogStats] = None):
+        super().__init__(log_queue, block_timeout, stats)
+        self.route = route
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.log_route = self.route
+        return super().prepare(record)
+
+
+class RouteFilter(logging.Filter):
+    """Aceita apenas registros de uma rota (``None``: registros vindos do logger raiz)"""
+
+    def __init__(self, route: Optional[str]):
+        super().__init__()
+        self.route = route
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return getattr(record, "log_route", None) == self.route
+
+
+class LogQueueListener(QueueListener):
+    """Consome a fila na thread dedicada e repassa aos handlers reais"""
+
+    def __init__(self, log_queue: "queue.Queue", handlers: Iterable[logging.Handler], stats: Optional[LogStats] = None):
+        super().__init__(log_queue, *handlers, respect_handler_level=True)
+        self.stats = stats or log_stats
+
+    def handle(self, record: logging.LogRecord) -> None:
+        super().handle(record)
+        self.stats.handled += 1
+
+    def enqueue_sentinel(self) -> None:
+        # A fila é limitada: espera espaço para o sentinela em vez de falhar
+        self.queue.put(self._sentinel)
+
+
+class LogPipeline:
+    """Fila limitada + handler de enfileiramento + listener com os handlers de saída"""
+
+    def __init__(
+        self,
+        handlers: Iterable[logging.Handler],
+        queue_size: int = 10000,
+        block_timeout: float = 0.05,
+        stats: Optional[LogStats] = None,
+    ):
+        self.stats = stats or log_stats
+        self.queue: "queue.Queue" = queue.Queue(maxsize=max(queue_size, 1))
+        # Saídas do logger raiz; ``handlers`` inclui também as adotadas
+        self.sinks: List[logging.Handler] = list(handlers)
+        self.handlers: List[logging.Handler] = list(self.sinks)
+        self.handler = LogQueueHandler(self.queue, block_timeout, self.stats)
+        self.listener = LogQueueListener(self.queue, self.handlers, self.stats)
+        self._attached: List[logging.Logger] = []
+        self._adopted: List[tuple] = []
+        self._root_filter = RouteFilter(None)
+        self.running = False
+
+    def start(self) -> "LogPipeline":
+        if not self.running:
+            self.listener.start()
+            self.running = True
+        return self
+
+    def attach(self, logger: logging.Logger) -> None:
+        """Instala o handler de enfileiramento no logger"""
+        logger.addHandler(self.handler)
+        self._attached.append(logger)
+
+    def stop(self) -> None:
+        """
+        Processa tudo o que estiver na fila e encerra a thread. Os loggers
+        voltam a gravar diretamente nas saídas, para que logs emitidos depois
+        (fim do shutdown) não fiquem presos na fila.
+        """
+        if self.running:
+            self.listener.stop()
+            self.running = False
+        for handler in self.handlers:
+            try:
+                handler.flush()
+            except (OSError, ValueError):
+                # Stream já fechado no fim do processo (mesmo tratamento de logging.shutdown)
+                pass
+        for logger, routed, handler, route_filter in self._adopted:
+            logger.removeHandler(routed)
+            handler.removeFilter(route_filter)
+            logger.addHandler(handler)
+        self._adopted.clear()
+        for handler in self.sinks:
+            handler.removeFilter(self._root_filter)
+        for logger in self._attached:
+            logger.removeHandler(self.handler)
+            for handler in self.sinks:
+                logger.addHandler(handler)
+        self._attached.clear()
+        self.handlers = list(self.sinks)
+
+    def adopt(self, logger_names: Iterable[str]) -> None:
+        """
+        Move para o listener os handlers de loggers que não propagam (ex.:
+        ``uvicorn.access``); cada um continua recebendo apenas os registros
+        que chegariam ao seu logger
+        """
+        for name in logger_names:
+            logger = logging.getLogger(name)
+            handlers = [handler for handler in logger.handlers if not isinstance(handler, QueueHandler)]
+            if logger.propagate or not handlers:
+                continue
+            for handler in self.sinks:
+                handler.addFilter(self._root_filter)
+            routed = RoutedQueueHandler(self.queue, name, self.handler.block_timeout, self.stats)
+            for handler in handlers:
+                route_filter = RouteFilter(name)
+                logger.removeHandler(handler)
+                handler.addFilter(route_filter)
+                self.handlers.append(handler)
+                self._adopted.append((logger, routed, handler, route_filter))
+            logger.addHandler(routed)
+        self.listener.handlers = tuple(self.handlers)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats.as_dict(),
+            "queue_depth": self.queue.qsize(),
+            "queue_size": self.queue.maxsize,
+            "running": self.running,
+        }
+
+
+_pipeline: Optional[LogPipeline] = None
+
+
+def get_log_pipeline() -> Optional[LogPipeline]:
+    return _pipeline
+
+
+def install_log_pipeline(
+    handlers: Iterable[logging.Handler], queue_size: int = 10000, block_timeout: float = 0.05
+) -> LogPipeline:
+    """Substitui o pipeline global (processando o que houver no anterior) e o inicia"""
+    global _pipeline
+    if _pipeline is not None:
+        _pipeline.stop()
+    _pipeline = LogPipeline(handlers, queue_size, block_timeout).start()
+    return _pipeline
+
+
+def stop_log_pipeline() -> None:
+    """Esvazia a fila e encerra a thread de logging (shutdown e atexit)"""
+    if _pipeline is not None:
+        _pipeline.stop()
+
+
+atexit.register(stop_log_pipeline)
@@ -0,0 +1,48 @@
+"""
+Retrieval Core Module - Knowledge Base Vector Search
+
+Pipeline de ingestão e busca semântica para knowledge bases:
+- Chunking do conteúdo com hash estável por chunk
+- Embedders plugáveis (hashing local, OpenAI)
+- Índices ANN (NumPy força bruta, HNSW, pgvector opcional)
+- Re-indexação incremental apenas dos chunks alterados
+"""
+
+from .chunking import TextChunk, TextChunker, compute_chunk_hash
+from .embedders import (
+    BaseEmbedder,
+    HashingEmbedder,
+    OpenAIEmbedder,
+    create_embedder,
+    register_embedder,
+)
+from .vector_index import (
+    HNSWIndex,
+    NumpyIndex,
+    PgVectorIndex,
+    SearchHit,
+    VectorIndex,
+    create_vector_index,
+    matches_filters,
+)
+
+__all__ = [
+    # Chunking
+    "TextChunk",
+    "TextChunker",
+    "compute_chunk_hash",
+    # Embedders
+    "BaseEmbedder",
+    "HashingEmbedder",
+    "OpenAIEmbedder",
+    "create_embedder",
+    "register_embedder",
+    # Índices
+    "VectorIndex",
+    "NumpyIndex",
+    "HNSWIndex",
+    "PgVectorIndex",
+    "SearchHit",
+    "create_vector_index",
+    "matches_filters",
+]
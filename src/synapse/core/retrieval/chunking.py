@@ -0,0 +1,185 @@
+"""
+Chunking de conteúdo de knowledge bases
+
+Converte o campo ``content`` (JSONB) de uma knowledge base em chunks de texto
+com metadata e hash estável, usados na indexação incremental.
+"""
+
+import hashlib
+import json
+import re
+from dataclasses import dataclass, field
+from typing import Any, Iterator
+
+
+# Chaves reconhecidas como "texto principal" de um documento dentro do content
+_TEXT_KEYS = ("content", "text", "body")
+
+# Quebras preferenciais, da mais forte para a mais fraca
+_PARAGRAPH_SPLIT = re.compile(r"\n\s*\n")
+_SENTENCE_SPLIT = re.compile(r"(?<=[.!?;])\s+")
+
+
+@dataclass
+class TextChunk:
+    """Chunk de texto pronto para ser indexado"""
+
+    text: str
+    section: str
+    chunk_index: int
+    metadata: dict[str, Any] = field(default_factory=dict)
+    content_hash: str = ""
+
+    def __post_init__(self):
+        if not self.content_hash:
+            self.content_hash = compute_chunk_hash(self.section, self.text)
+
+
+def compute_chunk_hash(section: str, text: str) -> str:
+    """Hash estável de um chunk (identidade usada no re-index incremental)"""
+    digest = hashlib.sha1()
+    digest.update(section.encode("utf-8"))
+    digest.update(b"\x00")
+    digest.update(text.encode("utf-8"))
+    return digest.hexdigest()
+
+
+class TextChunker:
+    """
+    Divide o conteúdo de uma knowledge base em chunks
+
+    O conteúdo é primeiro separado em seções (chaves de dict / itens de lista)
+    e cada seção é quebrada respeitando parágrafos e sentenças, com
+    sobreposição entre chunks consecutivos.
+    """
+
+    def __init__(self, chunk_size: int = 800, chunk_overlap: int = 100):
+        if chunk_size <= 0:
+            raise ValueError("chunk_size deve ser positivo")
+        if chunk_overlap < 0 or chunk_overlap >= chunk_size:
+            raise ValueError("chunk_overlap deve estar entre 0 e chunk_size")
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+
+    def chunk_content(self, content: Any) -> list[TextChunk]:
+        """Gera os chunks de todo o conteúdo da knowledge base"""
+        chunks: list[TextChunk] = []
+        for section, text, metadata in self._iter_sections(content, ""):
+            for index, piece in enumerate(self.split_text(text)):
+                chunks.append(
+                    TextChunk(
+                        text=piece,
+                        section=section,
+                        chunk_index=index,
+                        metadata={**metadata, "section": section, "chunk_index": index},
+                    )
+                )
+        return chunks
+
+    def split_text(self, text: str) -> list[str]:
+        """Quebra um texto em pedaços de até ``chunk_size`` caracteres"""
+        text = text.strip()
+        if not text:
+            return []
+        if len(text) <= self.chunk_size:
+            return [text]
+
+        units = self._split_units(text)
+        pieces: list[str] = []
+        current = ""
+        for unit in units:
+            candidate = f"{current} {unit}".strip() if current else unit
+            if len(candidate) <= self.chunk_size:
+                current = candidate
+                continue
+            if current:
+                pieces.append(current)
+                tail = self._overlap_tail(current)
+                current = f"{tail} {unit}".strip() if tail else unit
+                if len(current) > self.chunk_size:
+                    current = unit
+            else:
+                current = unit
+        if current:
+            pieces.append(current)
+        return pieces
+
+    # ------------------------------------------------------------------
+    # Helpers internos
+    # ------------------------------------------------------------------
+
+    def _split_units(self, text: str) -> list[str]:
+        """Quebra em parágrafos/sentenças; unidades longas viram janelas fixas"""
+        units: list[str] = []
+        for paragraph in _PARAGRAPH_SPLIT.split(text):
+            paragraph = paragraph.strip()
+            if not paragraph:
+                continue
+            if len(paragraph) <= self.chunk_size:
+                units.append(paragraph)
+                continue
+            for sentence in _SENTENCE_SPLIT.split(paragraph):
+                sentence = sentence.strip()
+                if not sentence:
+                    continue
+                if len(sentence) <= self.chunk_size:
+                    units.append(sentence)
+                    continue
+                step = self.chunk_size - self.chunk_overlap
+                for start in range(0, len(sentence), step):
+                    units.append(sentence[start : start + self.chunk_size])
+                    if start + self.chunk_size >= len(sentence):
+                        break
+        return units
+
+    def _overlap_tail(self, piece: str) -> str:
+        """Últimos ``chunk_overlap`` caracteres, alinhados em fronteira de palavra"""
+        if not self.chunk_overlap:
+            return ""
+        tail = piece[-self.chunk_overlap :]
+        space = tail.find(" ")
+        return tail[space + 1 :] if 0 <= space < len(tail) - 1 else tail
+
+    def _iter_sections(
+        self, content: Any, prefix: str
+    ) -> Iterator[tuple[str, str, dict[str, Any]]]:
+        """Percorre o conteúdo gerando (seção, texto, metadata)"""
+        if content is None:
+            return
+        if isinstance(content, str):
+            yield prefix or "root", content, {}
+            return
+        if isinstance(content, dict):
+            document = _as_document(content)
+            if document is not None:
+                text, metadata = document
+                yield prefix or "root", text, metadata
+                return
+            for key, value in content.items():
+                section = f"{prefix}.{key}" if prefix else str(key)
+                yield from self._iter_sections(value, section)
+            return
+        if isinstance(content, list):
+            for index, item in enumerate(content):
+                section = f"{prefix}[{index}]" if prefix else f"[{index}]"
+                yield from self._iter_sections(item, section)
+            return
+        yield prefix or "root", json.dumps(content, default=str), {}
+
+
+def _as_document(value: dict[str, Any]) -> tuple[str, dict[str, Any]] | None:
+    """Reconhece dicts no formato documento ({"content": "...", ...})"""
+    for key in _TEXT_KEYS:
+        text = value.get(key)
+        if isinstance(text, str):
+            metadata: dict[str, Any] = {}
+            extra = value.get("metadata")
+            if isinstance(extra, dict):
+                metadata.update(extra)
+            for meta_key, meta_value in value.items():
+                if meta_key in (key, "metadata"):
+                    continue
+                if isinstance(meta_value, (str, int, float, bool)) or meta_value is None:
+                    metadata[meta_key] = meta_value
+            return text, metadata
+    return None
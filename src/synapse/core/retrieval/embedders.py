@@ -0,0 +1,151 @@
+"""
+Embedders plugáveis para indexação de knowledge bases
+
+``HashingEmbedder`` é determinístico e totalmente local (feature hashing de
+tokens), adequado para testes e para ambientes sem provedor de embeddings.
+``OpenAIEmbedder`` usa a API de embeddings da OpenAI, importada sob demanda.
+"""
+
+import hashlib
+import logging
+import re
+from abc import ABC, abstractmethod
+from typing import Any, Callable
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+class BaseEmbedder(ABC):
+    """Interface comum dos embedders"""
+
+    #: Identificador do modelo, gravado junto de cada chunk indexado
+    model_name: str = "base"
+
+    def __init__(self, dimension: int):
+        self.dimension = dimension
+
+    @abstractmethod
+    def embed_batch(self, texts: list[str]) -> np.ndarray:
+        """Calcula embeddings (float32, normalizados L2) para um lote de textos"""
+
+    def embed_query(self, text: str) -> np.ndarray:
+        """Embedding de uma consulta"""
+        return self.embed_batch([text])[0]
+
+    def embed_in_batches(self, texts: list[str], batch_size: int) -> np.ndarray:
+        """Processa ``texts`` em lotes de ``batch_size``"""
+        if not texts:
+            return np.zeros((0, self.dimension), dtype=np.float32)
+        batches = [
+            self.embed_batch(texts[start : start + batch_size])
+            for start in range(0, len(texts), batch_size)
+        ]
+        return np.vstack(batches)
+
+
+class HashingEmbedder(BaseEmbedder):
+    """
+    Embedder local baseado em feature hashing (unigramas + bigramas)
+
+    Cada token é mapeado para um índice e um sinal via blake2b, o que torna o
+    resultado estável entre processos e máquinas.
+    """
+
+    def __init__(self, dimension: int = 384, use_bigrams: bool = True):
+        super().__init__(dimension)
+        self.use_bigrams = use_bigrams
+        self.model_name = f"hashing-{dimension}{'-bi' if use_bigrams else ''}"
+        self._feature_cache: dict[str, tuple[int, float]] = {}
+
+    def embed_batch(self, texts: list[str]) -> np.ndarray:
+        matrix = np.zeros((len(texts), self.dimension), dtype=np.float32)
+        for row, text in enumerate(texts):
+            tokens = _TOKEN_PATTERN.findall(text.lower())
+            features = tokens
+            if self.use_bigrams and len(tokens) > 1:
+                features = tokens + [
+                    f"{left} {right}" for left, right in zip(tokens, tokens[1:])
+                ]
+            for feature in features:
+                index, sign = self._hash_feature(feature)
+                matrix[row, index] += sign
+        return _l2_normalize(matrix)
+
+    def _hash_feature(self, feature: str) -> tuple[int, float]:
+        cached = self._feature_cache.get(feature)
+        if cached is not None:
+            return cached
+        digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+        value = int.from_bytes(digest, "little")
+        result = (value % self.dimension, 1.0 if (value >> 63) & 1 else -1.0)
+        if len(self._feature_cache) < 200_000:
+            self._feature_cache[feature] = result
+        return result
+
+
+class OpenAIEmbedder(BaseEmbedder):
+    """Embedder remoto via API da OpenAI (SDK importado sob demanda)"""
+
+    def __init__(
+        self,
+        model: str = "text-embedding-3-small",
+        dimension: int = 1536,
+        api_key: str | None = None,
+    ):
+        super().__init__(dimension)
+        self.model = model
+        self.model_name = f"openai-{model}-{dimension}"
+        self._api_key = api_key
+        self._client = None
+
+    def _get_client(self):
+        if self._client is None:
+            try:
+                from openai import OpenAI
+            except ImportError as e:  # pragma: no cover - depende do ambiente
+                raise RuntimeError(
+                    "Pacote 'openai' não instalado; use KB_EMBEDDER=hashing"
+                ) from e
+            from synapse.core.config import settings
+
+            self._client = OpenAI(api_key=self._api_key or settings.OPENAI_API_KEY)
+        return self._client
+
+    def embed_batch(self, texts: list[str]) -> np.ndarray:
+        response = self._get_client().embeddings.create(
+            model=self.model, input=texts, dimensions=self.dimension
+        )
+        vectors = [item.embedding for item in sorted(response.data, key=lambda d: d.index)]
+        return _l2_normalize(np.asarray(vectors, dtype=np.float32))
+
+
+_EMBEDDER_FACTORIES: dict[str, Callable[..., BaseEmbedder]] = {
+    "hashing": HashingEmbedder,
+    "openai": OpenAIEmbedder,
+}
+
+
+def register_embedder(name: str, factory: Callable[..., BaseEmbedder]) -> None:
+    """Registra um novo tipo de embedder"""
+    _EMBEDDER_FACTORIES[name] = factory
+
+
+def create_embedder(name: str, **kwargs: Any) -> BaseEmbedder:
+    """Instancia um embedder pelo nome registrado"""
+    factory = _EMBEDDER_FACTORIES.get(name)
+    if factory is None:
+        raise ValueError(
+            f"Embedder desconhecido: {name}. "
+            f"Disponíveis: {', '.join(sorted(_EMBEDDER_FACTORIES))}"
+        )
+    return factory(**kwargs)
+
+
+def _l2_normalize(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (matrix / norms).astype(np.float32, copy=False)
@@ -0,0 +1,402 @@
+"""
+Serviço de retrieval para knowledge bases
+
+Pipeline de ingestão (chunking -> embeddings em lote -> índice vetorial) com
+re-indexação incremental: apenas chunks novos ou alterados são embedados
+novamente; chunks removidos saem do banco e do índice.
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any
+
+import numpy as np
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only
+
+from synapse.core.retrieval.chunking import TextChunk, TextChunker
+from synapse.core.retrieval.embedders import BaseEmbedder, create_embedder
+from synapse.core.retrieval.vector_index import (
+    PgVectorIndex,
+    VectorIndex,
+    create_vector_index,
+)
+from synapse.models.knowledge_base import KnowledgeBase
+from synapse.models.knowledge_base_chunk import KnowledgeBaseChunk
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SyncResult:
+    """Resumo de uma sincronização de knowledge base"""
+
+    kb_id: uuid.UUID
+    total_chunks: int = 0
+    added: int = 0
+    reembedded: int = 0
+    removed: int = 0
+    unchanged: int = 0
+    duration_ms: int = 0
+    errors: list[str] = field(default_factory=list)
+
+    @property
+    def synced_items(self) -> int:
+        return self.added + self.reembedded
+
+
+@dataclass
+class RetrievedChunk:
+    """Chunk retornado por uma busca top-k"""
+
+    chunk_id: uuid.UUID
+    kb_id: uuid.UUID
+    section: str
+    content: str
+    score: float
+    metadata: dict[str, Any]
+
+
+@dataclass
+class _LoadedIndex:
+    """Índice em memória de uma KB e a assinatura do estado do banco"""
+
+    index: VectorIndex
+    signature: tuple[int, Any]
+
+
+class KnowledgeBaseRetrievalService:
+    """Ingestão e busca vetorial de knowledge bases"""
+
+    def __init__(
+        self,
+        embedder: BaseEmbedder | None = None,
+        backend: str | None = None,
+        chunker: TextChunker | None = None,
+        batch_size: int | None = None,
+    ):
+        from synapse.core.config import settings
+
+        self.embedder = embedder or create_embedder(
+            settings.KB_EMBEDDER, dimension=settings.KB_EMBEDDING_DIM
+        )
+        self.backend = backend or settings.KB_VECTOR_BACKEND
+        self.chunker = chunker or TextChunker(
+            chunk_size=settings.KB_CHUNK_SIZE, chunk_overlap=settings.KB_CHUNK_OVERLAP
+        )
+        self.batch_size = batch_size or settings.KB_EMBEDDING_BATCH_SIZE
+        self._pgvector = (
+            PgVectorIndex(self.embedder.dimension) if self.backend == "pgvector" else None
+        )
+        self._indexes: dict[uuid.UUID, _LoadedIndex] = {}
+        self._locks: dict[uuid.UUID, asyncio.Lock] = {}
+
+    # ------------------------------------------------------------------
+    # Ingestão
+    # ------------------------------------------------------------------
+
+    async def sync(
+        self, db: AsyncSession, kb: KnowledgeBase, force: bool = False
+    ) -> SyncResult:
+        """
+        Sincroniza os chunks da knowledge base com seu conteúdo atual
+
+        Args:
+            db: Sessão assíncrona
+            kb: Knowledge base a indexar
+            force: Re-embeda todos os chunks mesmo sem alteração
+
+        Returns:
+            SyncResult com contagens de chunks adicionados/removidos
+        """
+        started = time.perf_counter()
+        result = SyncResult(kb_id=kb.kb_id)
+
+        async with self._lock_for(kb.kb_id):
+            chunks = self._dedupe(self.chunker.chunk_content(kb.content))
+            result.total_chunks = len(chunks)
+
+            existing_rows = (
+                await db.execute(
+                    select(KnowledgeBaseChunk)
+                    .options(
+                        load_only(
+                            KnowledgeBaseChunk.id,
+                            KnowledgeBaseChunk.content_hash,
+                            KnowledgeBaseChunk.chunk_index,
+                            KnowledgeBaseChunk.embedding_model,
+                        )
+                    )
+                    .where(KnowledgeBaseChunk.kb_id == kb.kb_id)
+                )
+            ).scalars().all()
+            existing = {row.content_hash: row for row in existing_rows}
+
+            current_hashes = {chunk.content_hash for chunk in chunks}
+            stale_ids = [
+                row.id for h, row in existing.items() if h not in current_hashes
+            ]
+            new_chunks: list[TextChunk] = []
+            reembed: list[tuple[KnowledgeBaseChunk, TextChunk]] = []
+            moved: list[tuple[KnowledgeBaseChunk, TextChunk]] = []
+            for chunk in chunks:
+                row = existing.get(chunk.content_hash)
+                if row is None:
+                    new_chunks.append(chunk)
+                elif force or row.embedding_model != self.embedder.model_name:
+                    reembed.append((row, chunk))
+                elif row.chunk_index != chunk.chunk_index:
+                    moved.append((row, chunk))
+                else:
+                    result.unchanged += 1
+
+            texts = [c.text for c in new_chunks] + [c.text for _, c in reembed]
+            vectors = await asyncio.to_thread(
+                self.embedder.embed_in_batches, texts, self.batch_size
+            )
+            new_vectors = vectors[: len(new_chunks)]
+            reembed_vectors = vectors[len(new_chunks) :]
+
+            kb_meta = {"kb_title": kb.title}
+            upserted_ids: list[str] = []
+            upserted_vectors: list[np.ndarray] = []
+            upserted_meta: list[dict[str, Any]] = []
+
+            if new_chunks:
+                rows = []
+                for chunk, vector in zip(new_chunks, new_vectors):
+                    chunk_id = uuid.uuid4()
+                    metadata = {**chunk.metadata, **kb_meta}
+                    rows.append(
+                        {
+                            "id": chunk_id,
+                            "kb_id": kb.kb_id,
+                            "section": chunk.section,
+                            "chunk_index": chunk.chunk_index,
+                            "content": chunk.text,
+                            "content_hash": chunk.content_hash,
+                            "chunk_metadata": metadata,
+                            "embedding": vector.tobytes(),
+                            "embedding_model": self.embedder.model_name,
+                        }
+                    )
+                    upserted_ids.append(str(chunk_id))
+                    upserted_vectors.append(vector)
+                    upserted_meta.append(metadata)
+                # INSERT multi-row em uma única instrução
+                await db.execute(insert(KnowledgeBaseChunk), rows)
+                result.added = len(rows)
+
+            for (row, chunk), vector in zip(reembed, reembed_vectors):
+                metadata = {**chunk.metadata, **kb_meta}
+                await db.execute(
+                    update(KnowledgeBaseChunk)
+                    .where(KnowledgeBaseChunk.id == row.id)
+                    .values(
+                        chunk_index=chunk.chunk_index,
+                        chunk_metadata=metadata,
+                        embedding=vector.tobytes(),
+                        embedding_model=self.embedder.model_name,
+                    )
+                )
+                upserted_ids.append(str(row.id))
+                upserted_vectors.append(vector)
+                upserted_meta.append(metadata)
+            result.reembedded = len(reembed)
+
+            # Chunks que apenas mudaram de posição: atualiza metadata sem embedar
+            for row, chunk in moved:
+                await db.execute(
+                    update(KnowledgeBaseChunk)
+                    .where(KnowledgeBaseChunk.id == row.id)
+                    .values(
+                        chunk_index=chunk.chunk_index,
+                        chunk_metadata={**chunk.metadata, **kb_meta},
+                    )
+                )
+            result.unchanged += len(moved)
+
+            if stale_ids:
+                await db.execute(
+                    delete(KnowledgeBaseChunk).where(KnowledgeBaseChunk.id.in_(stale_ids))
+                )
+                result.removed = len(stale_ids)
+
+            if self._pgvector is not None:
+                await self._pgvector.remove(db, [str(i) for i in stale_ids])
+                await self._pgvector.upsert(
+                    db, kb.kb_id, upserted_ids, upserted_vectors, upserted_meta
+                )
+
+            await db.commit()
+
+            # Atualiza o índice em memória incrementalmente, se já carregado
+            loaded = self._indexes.get(kb.kb_id)
+            if loaded is not None:
+                loaded.index.remove([str(i) for i in stale_ids])
+                if upserted_ids:
+                    loaded.index.upsert(
+                        upserted_ids, np.vstack(upserted_vectors), upserted_meta
+                    )
+                for row, chunk in moved:
+                    loaded.index.update_metadata(
+                        str(row.id), {**chunk.metadata, **kb_meta}
+                    )
+                loaded.signature = await self._signature(db, kb.kb_id)
+
+        result.duration_ms = int((time.perf_counter() - started) * 1000)
+        logger.info(
+            f"KB {kb.kb_id} sincronizada: +{result.added} ~{result.reembedded} "
+            f"-{result.removed} ={result.unchanged} ({result.duration_ms}ms)"
+        )
+        return result
+
+    # ------------------------------------------------------------------
+    # Busca
+    # ------------------------------------------------------------------
+
+    async def search(
+        self,
+        db: AsyncSession,
+        kb_id: uuid.UUID,
+        query: str,
+        k: int = 5,
+        filters: dict[str, Any] | None = None,
+        min_score: float | None = None,
+    ) -> list[RetrievedChunk]:
+        """Retorna os ``k`` chunks mais relevantes para ``query``"""
+        query_vector = await asyncio.to_thread(self.embedder.embed_query, query)
+
+        if self._pgvector is not None:
+            hits = await self._pgvector.search(db, kb_id, query_vector, k, filters)
+        else:
+            index = await self._get_index(db, kb_id)
+            hits = index.search(query_vector, k, filters)
+
+        if min_score is not None:
+            hits = [hit for hit in hits if hit.score >= min_score]
+        if not hits:
+            return []
+
+        rows = (
+            await db.execute(
+                select(KnowledgeBaseChunk)
+                .options(
+                    load_only(
+                        KnowledgeBaseChunk.id,
+                        KnowledgeBaseChunk.kb_id,
+                        KnowledgeBaseChunk.section,
+                        KnowledgeBaseChunk.content,
+                    )
+                )
+                .where(KnowledgeBaseChunk.id.in_([uuid.UUID(hit.id) for hit in hits]))
+            )
+        ).scalars().all()
+        by_id = {str(row.id): row for row in rows}
+
+        results = []
+        for hit in hits:
+            row = by_id.get(hit.id)
+            if row is None:
+                continue
+            results.append(
+                RetrievedChunk(
+                    chunk_id=row.id,
+                    kb_id=row.kb_id,
+                    section=row.section,
+                    content=row.content,
+                    score=hit.score,
+                    metadata=hit.metadata,
+                )
+            )
+        return results
+
+    def invalidate(self, kb_id: uuid.UUID) -> None:
+        """Descarta o índice em memória de uma KB"""
+        self._indexes.pop(kb_id, None)
+
+    # ------------------------------------------------------------------
+    # Helpers internos
+    # ------------------------------------------------------------------
+
+    async def _get_index(self, db: AsyncSession, kb_id: uuid.UUID) -> VectorIndex:
+        """Carrega (ou recarrega, se o banco mudou) o índice em memória da KB"""
+        signature = await self._signature(db, kb_id)
+        loaded = self._indexes.get(kb_id)
+        if loaded is not None and loaded.signature == signature:
+            return loaded.index
+
+        async with self._lock_for(kb_id):
+            loaded = self._indexes.get(kb_id)
+            if loaded is not None and loaded.signature == signature:
+                return loaded.index
+
+            rows = (
+                await db.execute(
+                    select(
+                        KnowledgeBaseChunk.id,
+                        KnowledgeBaseChunk.embedding,
+                        KnowledgeBaseChunk.chunk_metadata,
+                    ).where(
+                        KnowledgeBaseChunk.kb_id == kb_id,
+                        KnowledgeBaseChunk.embedding_model == self.embedder.model_name,
+                    )
+                )
+            ).all()
+            index = create_vector_index(self.backend, self.embedder.dimension)
+            if rows:
+                vectors = np.vstack(
+                    [np.frombuffer(row.embedding, dtype=np.float32) for row in rows]
+                )
+                index.upsert(
+                    [str(row.id) for row in rows],
+                    vectors,
+                    [row.chunk_metadata or {} for row in rows],
+                )
+            self._indexes[kb_id] = _LoadedIndex(index=index, signature=signature)
+            logger.debug(f"Índice da KB {kb_id} carregado com {len(rows)} chunks")
+            return index
+
+    async def _signature(self, db: AsyncSession, kb_id: uuid.UUID) -> tuple[int, Any]:
+        """(quantidade, último updated_at) dos chunks — detecta índices obsoletos"""
+        row = (
+            await db.execute(
+                select(
+                    func.count(KnowledgeBaseChunk.id),
+                    func.max(KnowledgeBaseChunk.updated_at),
+                ).where(KnowledgeBaseChunk.kb_id == kb_id)
+            )
+        ).one()
+        return int(row[0] or 0), row[1]
+
+    def _lock_for(self, kb_id: uuid.UUID) -> asyncio.Lock:
+        lock = self._locks.get(kb_id)
+        if lock is None:
+            lock = self._locks[kb_id] = asyncio.Lock()
+        return lock
+
+    @staticmethod
+    def _dedupe(chunks: list[TextChunk]) -> list[TextChunk]:
+        seen: set[str] = set()
+        unique = []
+        for chunk in chunks:
+            if chunk.content_hash in seen:
+                continue
+            seen.add(chunk.content_hash)
+            unique.append(chunk)
+        return unique
+
+
+_retrieval_service: KnowledgeBaseRetrievalService | None = None
+
+
+def get_retrieval_service() -> KnowledgeBaseRetrievalService:
+    """Retorna a instância global do serviço de retrieval"""
+    global _retrieval_service
+    if _retrieval_service is None:
+        _retrieval_service = KnowledgeBaseRetrievalService()
+    return _retrieval_service
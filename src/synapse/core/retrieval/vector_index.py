@@ -0,0 +1,642 @@
+"""
+Índices vetoriais (ANN) para retrieval em knowledge bases
+
+Backends disponíveis:
+- ``NumpyIndex``: busca exata por força bruta (produto interno vetorizado)
+- ``HNSWIndex``: grafo Hierarchical Navigable Small World em NumPy puro
+- ``PgVectorIndex``: delega a busca ao PostgreSQL com a extensão pgvector
+
+Os vetores são assumidos normalizados (L2), de modo que o produto interno
+equivale à similaridade de cosseno.
+"""
+
+import heapq
+import json
+import logging
+import math
+import random
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+from sqlalchemy import text
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SearchHit:
+    """Resultado de uma busca vetorial"""
+
+    id: str
+    score: float
+    metadata: dict[str, Any]
+
+
+def matches_filters(metadata: dict[str, Any], filters: dict[str, Any] | None) -> bool:
+    """
+    Avalia filtros de metadata
+
+    Formatos suportados por campo:
+    - valor simples: igualdade
+    - lista: pertinência
+    - dict com operadores ``$eq``, ``$ne``, ``$in``, ``$nin``, ``$gt``,
+      ``$gte``, ``$lt``, ``$lte``, ``$exists``
+    """
+    if not filters:
+        return True
+    for key, expected in filters.items():
+        value = metadata.get(key)
+        if isinstance(expected, dict):
+            for op, operand in expected.items():
+                if not _apply_operator(op, value, operand, key in metadata):
+                    return False
+        elif isinstance(expected, (list, tuple, set)):
+            if value not in expected:
+                return False
+        elif value != expected:
+            return False
+    return True
+
+
+def _apply_operator(op: str, value: Any, operand: Any, present: bool) -> bool:
+    if op == "$exists":
+        return present == bool(operand)
+    if op == "$eq":
+        return value == operand
+    if op == "$ne":
+        return value != operand
+    if op == "$in":
+        return value in operand
+    if op == "$nin":
+        return value not in operand
+    if value is None:
+        return False
+    try:
+        if op == "$gt":
+            return value > operand
+        if op == "$gte":
+            return value >= operand
+        if op == "$lt":
+            return value < operand
+        if op == "$lte":
+            return value <= operand
+    except TypeError:
+        return False
+    raise ValueError(f"Operador de filtro não suportado: {op}")
+
+
+class VectorIndex(ABC):
+    """Interface comum dos índices vetoriais em memória"""
+
+    def __init__(self, dimension: int):
+        self.dimension = dimension
+
+    @abstractmethod
+    def upsert(
+        self,
+        ids: list[str],
+        vectors: np.ndarray,
+        metadata: list[dict[str, Any]] | None = None,
+    ) -> None:
+        """Insere ou substitui vetores"""
+
+    @abstractmethod
+    def remove(self, ids: list[str]) -> int:
+        """Remove vetores; retorna quantos existiam"""
+
+    @abstractmethod
+    def search(
+        self,
+        query: np.ndarray,
+        k: int = 10,
+        filters: dict[str, Any] | None = None,
+    ) -> list[SearchHit]:
+        """Retorna os ``k`` vizinhos mais similares que satisfazem ``filters``"""
+
+    @abstractmethod
+    def update_metadata(self, item_id: str, metadata: dict[str, Any]) -> bool:
+        """Substitui a metadata de um vetor existente sem reindexá-lo"""
+
+    @abstractmethod
+    def __len__(self) -> int:
+        ...
+
+    def _check_vectors(self, ids: list[str], vectors: np.ndarray) -> np.ndarray:
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if vectors.ndim == 1:
+            vectors = vectors.reshape(1, -1)
+        if vectors.shape != (len(ids), self.dimension):
+            raise ValueError(
+                f"Esperado array ({len(ids)}, {self.dimension}), "
+                f"recebido {vectors.shape}"
+            )
+        return vectors
+
+
+class NumpyIndex(VectorIndex):
+    """Busca exata por força bruta sobre uma matriz contígua"""
+
+    def __init__(self, dimension: int, initial_capacity: int = 1024):
+        super().__init__(dimension)
+        self._vectors = np.zeros((initial_capacity, dimension), dtype=np.float32)
+        self._ids: list[str] = []
+        self._metadata: list[dict[str, Any]] = []
+        self._positions: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def upsert(self, ids, vectors, metadata=None):
+        vectors = self._check_vectors(ids, vectors)
+        metadata = metadata or [{} for _ in ids]
+        for item_id, vector, meta in zip(ids, vectors, metadata):
+            position = self._positions.get(item_id)
+            if position is None:
+                position = len(self._ids)
+                self._ensure_capacity(position + 1)
+                self._ids.append(item_id)
+                self._metadata.append(meta)
+                self._positions[item_id] = position
+            else:
+                self._metadata[position] = meta
+            self._vectors[position] = vector
+
+    def update_metadata(self, item_id, metadata):
+        position = self._positions.get(item_id)
+        if position is None:
+            return False
+        self._metadata[position] = metadata
+        return True
+
+    def remove(self, ids):
+        removed = 0
+        for item_id in ids:
+            position = self._positions.pop(item_id, None)
+            if position is None:
+                continue
+            last = len(self._ids) - 1
+            if position != last:
+                # Move o último elemento para a posição liberada (swap-remove)
+                last_id = self._ids[last]
+                self._vectors[position] = self._vectors[last]
+                self._ids[position] = last_id
+                self._metadata[position] = self._metadata[last]
+                self._positions[last_id] = position
+            self._ids.pop()
+            self._metadata.pop()
+            removed += 1
+        return removed
+
+    def search(self, query, k=10, filters=None):
+        count = len(self._ids)
+        if count == 0 or k <= 0:
+            return []
+        query = np.asarray(query, dtype=np.float32).reshape(-1)
+        scores = self._vectors[:count] @ query
+        if filters:
+            mask = np.fromiter(
+                (matches_filters(meta, filters) for meta in self._metadata),
+                dtype=bool,
+                count=count,
+            )
+            candidates = np.flatnonzero(mask)
+            if candidates.size == 0:
+                return []
+            scores = scores[candidates]
+        else:
+            candidates = None
+        top = _top_k(scores, k)
+        hits = []
+        for local in top:
+            position = int(candidates[local]) if candidates is not None else int(local)
+            hits.append(
+                SearchHit(
+                    id=self._ids[position],
+                    score=float(scores[local]),
+                    metadata=self._metadata[position],
+                )
+            )
+        return hits
+
+    def _ensure_capacity(self, size: int) -> None:
+        if size <= self._vectors.shape[0]:
+            return
+        capacity = max(size, self._vectors.shape[0] * 2)
+        grown = np.zeros((capacity, self.dimension), dtype=np.float32)
+        grown[: len(self._ids)] = self._vectors[: len(self._ids)]
+        self._vectors = grown
+
+
+class HNSWIndex(VectorIndex):
+    """
+    Índice HNSW (Malkov & Yashunin) implementado com NumPy
+
+    Remoções usam tombstones; quando a fração de nós removidos passa de
+    ``rebuild_threshold`` o grafo é reconstruído. Buscas com filtro muito
+    seletivo caem para força bruta sobre o subconjunto filtrado.
+    """
+
+    def __init__(
+        self,
+        dimension: int,
+        m: int = 16,
+        ef_construction: int = 64,
+        ef_search: int = 64,
+        rebuild_threshold: float = 0.3,
+        seed: int = 42,
+    ):
+        super().__init__(dimension)
+        self.m = m
+        self.m_max0 = m * 2
+        self.ef_construction = ef_construction
+        self.ef_search = ef_search
+        self.rebuild_threshold = rebuild_threshold
+        self._level_mult = 1 / math.log(m)
+        self._random = random.Random(seed)
+        self._reset()
+
+    def _reset(self) -> None:
+        self._vectors = np.zeros((0, self.dimension), dtype=np.float32)
+        self._size = 0
+        self._ids: list[str] = []
+        self._metadata: list[dict[str, Any]] = []
+        self._positions: dict[str, int] = {}
+        self._deleted: set[int] = set()
+        # _graph[node][layer] -> lista de vizinhos
+        self._graph: list[list[list[int]]] = []
+        self._entry_point: int | None = None
+        self._max_level = -1
+
+    def __len__(self) -> int:
+        return self._size - len(self._deleted)
+
+    # ------------------------------------------------------------------
+    # Escrita
+    # ------------------------------------------------------------------
+
+    def upsert(self, ids, vectors, metadata=None):
+        vectors = self._check_vectors(ids, vectors)
+        metadata = metadata or [{} for _ in ids]
+        for item_id, vector, meta in zip(ids, vectors, metadata):
+            existing = self._positions.get(item_id)
+            if existing is not None:
+                if np.array_equal(self._vectors[existing], vector):
+                    self._metadata[existing] = meta
+                    continue
+                self._deleted.add(existing)
+                del self._positions[item_id]
+            self._insert(item_id, vector, meta)
+        self._maybe_rebuild()
+
+    def update_metadata(self, item_id, metadata):
+        position = self._positions.get(item_id)
+        if position is None:
+            return False
+        self._metadata[position] = metadata
+        return True
+
+    def remove(self, ids):
+        removed = 0
+        for item_id in ids:
+            position = self._positions.pop(item_id, None)
+            if position is not None:
+                self._deleted.add(position)
+                removed += 1
+        self._maybe_rebuild()
+        return removed
+
+    def _insert(self, item_id: str, vector: np.ndarray, meta: dict[str, Any]) -> None:
+        node = self._size
+        self._ensure_capacity(node + 1)
+        self._vectors[node] = vector
+        self._size += 1
+        self._ids.append(item_id)
+        self._metadata.append(meta)
+        self._positions[item_id] = node
+
+        level = int(-math.log(1.0 - self._random.random()) * self._level_mult)
+        self._graph.append([[] for _ in range(level + 1)])
+
+        if self._entry_point is None:
+            self._entry_point = node
+            self._max_level = level
+            return
+
+        entry = self._entry_point
+        for layer in range(self._max_level, level, -1):
+            entry = self._greedy_closest(vector, entry, layer)
+
+        for layer in range(min(level, self._max_level), -1, -1):
+            candidates = self._search_layer(vector, [entry], self.ef_construction, layer)
+            max_neighbors = self.m_max0 if layer == 0 else self.m
+            neighbors = self._select_neighbors(candidates, self.m)
+            self._graph[node][layer] = neighbors
+            for neighbor in neighbors:
+                links = self._graph[neighbor][layer]
+                links.append(node)
+                if len(links) > max_neighbors:
+                    # Poda simples por similaridade (mais barata que a heurística)
+                    scores = self._vectors[links] @ self._vectors[neighbor]
+                    keep = np.argpartition(-scores, max_neighbors - 1)[:max_neighbors]
+                    self._graph[neighbor][layer] = [links[i] for i in keep]
+            entry = candidates[0][1]
+
+        if level > self._max_level:
+            self._max_level = level
+            self._entry_point = node
+
+    def _maybe_rebuild(self) -> None:
+        if not self._deleted or self._size == 0:
+            return
+        if len(self._deleted) / self._size < self.rebuild_threshold:
+            return
+        live = [
+            position for position in range(self._size) if position not in self._deleted
+        ]
+        ids = [self._ids[p] for p in live]
+        vectors = self._vectors[live].copy()
+        metadata = [self._metadata[p] for p in live]
+        logger.debug(f"Reconstruindo HNSW com {len(live)} nós ativos")
+        self._reset()
+        for item_id, vector, meta in zip(ids, vectors, metadata):
+            self._insert(item_id, vector, meta)
+
+    def _ensure_capacity(self, size: int) -> None:
+        if size <= self._vectors.shape[0]:
+            return
+        capacity = max(size, max(64, self._vectors.shape[0] * 2))
+        grown = np.zeros((capacity, self.dimension), dtype=np.float32)
+        grown[: self._size] = self._vectors[: self._size]
+        self._vectors = grown
+
+    # ------------------------------------------------------------------
+    # Busca
+    # ------------------------------------------------------------------
+
+    def search(self, query, k=10, filters=None):
+        if self._entry_point is None or k <= 0 or len(self) == 0:
+            return []
+        query = np.asarray(query, dtype=np.float32).reshape(-1)
+
+        if filters:
+            allowed = [
+                p
+                for p in range(self._size)
+                if p not in self._deleted and matches_filters(self._metadata[p], filters)
+            ]
+            if not allowed:
+                return []
+            # Filtro seletivo: força bruta sobre o subconjunto é mais barata
+            # e garante recall total
+            if len(allowed) <= max(self.ef_search * 4, k * 8):
+                return self._brute_force(query, allowed, k)
+            allowed_set = set(allowed)
+        else:
+            allowed_set = None
+
+        entry = self._entry_point
+        for layer in range(self._max_level, 0, -1):
+            entry = self._greedy_closest(query, entry, layer)
+
+        ef = max(self.ef_search, k)
+        while True:
+            candidates = self._search_layer(query, [entry], ef, 0)
+            hits = [
+                (score, node)
+                for score, node in candidates
+                if node not in self._deleted
+                and (allowed_set is None or node in allowed_set)
+            ]
+            if len(hits) >= k or ef >= self._size:
+                break
+            ef *= 2
+        return [
+            SearchHit(id=self._ids[node], score=float(score), metadata=self._metadata[node])
+            for score, node in hits[:k]
+        ]
+
+    def _brute_force(self, query: np.ndarray, nodes: list[int], k: int) -> list[SearchHit]:
+        scores = self._vectors[nodes] @ query
+        return [
+            SearchHit(
+                id=self._ids[nodes[i]],
+                score=float(scores[i]),
+                metadata=self._metadata[nodes[i]],
+            )
+            for i in _top_k(scores, k)
+        ]
+
+    def _greedy_closest(self, query: np.ndarray, entry: int, layer: int) -> int:
+        best = entry
+        best_score = float(self._vectors[entry] @ query)
+        improved = True
+        while improved:
+            improved = False
+            neighbors = self._graph[best][layer] if layer < len(self._graph[best]) else []
+            if not neighbors:
+                break
+            scores = self._vectors[neighbors] @ query
+            index = int(np.argmax(scores))
+            if scores[index] > best_score:
+                best_score = float(scores[index])
+                best = neighbors[index]
+                improved = True
+        return best
+
+    def _search_layer(
+        self, query: np.ndarray, entries: list[int], ef: int, layer: int
+    ) -> list[tuple[float, int]]:
+        """Beam search numa camada; retorna (score, nó) em ordem decrescente"""
+        visited = set(entries)
+        entry_scores = self._vectors[entries] @ query
+        # candidates: max-heap por score (armazenado negativo)
+        candidates = [(-float(s), n) for s, n in zip(entry_scores, entries)]
+        heapq.heapify(candidates)
+        # results: min-heap por score com no máximo ef itens
+        results = [(float(s), n) for s, n in zip(entry_scores, entries)]
+        heapq.heapify(results)
+
+        while candidates:
+            neg_score, node = heapq.heappop(candidates)
+            if -neg_score < results[0][0] and len(results) >= ef:
+                break
+            links = self._graph[node][layer] if layer < len(self._graph[node]) else []
+            fresh = [n for n in links if n not in visited]
+            if not fresh:
+                continue
+            visited.update(fresh)
+            scores = self._vectors[fresh] @ query
+            for score, neighbor in zip(scores.tolist(), fresh):
+                if len(results) < ef:
+                    heapq.heappush(candidates, (-score, neighbor))
+                    heapq.heappush(results, (score, neighbor))
+                elif score > results[0][0]:
+                    heapq.heappush(candidates, (-score, neighbor))
+                    heapq.heappushpop(results, (score, neighbor))
+        return sorted(results, reverse=True)
+
+    def _select_neighbors(
+        self, candidates: list[tuple[float, int]], m: int
+    ) -> list[int]:
+        """Heurística de diversidade do paper (mantém vizinhos não redundantes)"""
+        if len(candidates) <= m:
+            return [node for _, node in candidates]
+        nodes = [node for _, node in candidates]
+        scores = np.fromiter((score for score, _ in candidates), dtype=np.float32)
+        # Similaridade par-a-par entre candidatos calculada uma única vez
+        pairwise = self._vectors[nodes] @ self._vectors[nodes].T
+        selected: list[int] = []
+        for i in range(len(nodes)):
+            if len(selected) >= m:
+                break
+            if selected and float(pairwise[i, selected].max()) > scores[i]:
+                continue
+            selected.append(i)
+        if len(selected) < m:
+            chosen = set(selected)
+            selected.extend(
+                [i for i in range(len(nodes)) if i not in chosen][: m - len(selected)]
+            )
+        return [nodes[i] for i in selected]
+
+
+class PgVectorIndex:
+    """
+    Backend opcional usando a extensão pgvector do PostgreSQL
+
+    Os vetores ficam na tabela ``knowledge_base_chunk_vectors`` (criada sob
+    demanda com índice HNSW). Diferente dos índices em memória, as operações
+    são assíncronas e recebem a sessão do banco.
+    """
+
+    TABLE = "knowledge_base_chunk_vectors"
+
+    def __init__(self, dimension: int, schema: str = "synapscale_db"):
+        self.dimension = dimension
+        self.schema = schema
+        self._ready = False
+
+    @property
+    def _table(self) -> str:
+        return f"{self.schema}.{self.TABLE}"
+
+    async def ensure_schema(self, db) -> None:
+        """Cria extensão, tabela e índice HNSW caso não existam"""
+        if self._ready:
+            return
+        await db.execute(text("CREATE EXTENSION IF NOT EXISTS vector"))
+        await db.execute(
+            text(
+                f"CREATE TABLE IF NOT EXISTS {self._table} ("
+                "chunk_id UUID PRIMARY KEY, "
+                "kb_id UUID NOT NULL, "
+                "metadata JSONB, "
+                f"embedding vector({self.dimension}) NOT NULL)"
+            )
+        )
+        await db.execute(
+            text(
+                f"CREATE INDEX IF NOT EXISTS ix_{self.TABLE}_embedding "
+                f"ON {self._table} USING hnsw (embedding vector_ip_ops)"
+            )
+        )
+        await db.execute(
+            text(
+                f"CREATE INDEX IF NOT EXISTS ix_{self.TABLE}_kb_id "
+                f"ON {self._table} (kb_id)"
+            )
+        )
+        self._ready = True
+
+    async def upsert(self, db, kb_id, ids, vectors, metadata) -> None:
+        await self.ensure_schema(db)
+        if not ids:
+            return
+        rows = [
+            {
+                "chunk_id": item_id,
+                "kb_id": str(kb_id),
+                "metadata": json.dumps(meta, default=str),
+                "embedding": _vector_literal(vector),
+            }
+            for item_id, vector, meta in zip(ids, vectors, metadata)
+        ]
+        await db.execute(
+            text(
+                f"INSERT INTO {self._table} (chunk_id, kb_id, metadata, embedding) "
+                "VALUES (CAST(:chunk_id AS uuid), CAST(:kb_id AS uuid), "
+                "CAST(:metadata AS jsonb), CAST(:embedding AS vector)) "
+                "ON CONFLICT (chunk_id) DO UPDATE SET "
+                "metadata = EXCLUDED.metadata, embedding = EXCLUDED.embedding"
+            ),
+            rows,
+        )
+
+    async def remove(self, db, ids) -> None:
+        await self.ensure_schema(db)
+        if not ids:
+            return
+        await db.execute(
+            text(f"DELETE FROM {self._table} WHERE chunk_id = ANY(CAST(:ids AS uuid[]))"),
+            {"ids": list(ids)},
+        )
+
+    async def search(self, db, kb_id, query, k=10, filters=None) -> list[SearchHit]:
+        await self.ensure_schema(db)
+        # Filtros com operadores são avaliados em Python sobre um lote maior;
+        # igualdades simples usam containment JSONB no próprio SQL
+        simple = {
+            key: value
+            for key, value in (filters or {}).items()
+            if not isinstance(value, (dict, list, tuple, set))
+        }
+        complex_filters = {
+            key: value for key, value in (filters or {}).items() if key not in simple
+        }
+        params = {
+            "kb_id": str(kb_id),
+            "query": _vector_literal(query),
+            "limit": k * 4 if complex_filters else k,
+            "simple": json.dumps(simple, default=str),
+        }
+        result = await db.execute(
+            text(
+                f"SELECT chunk_id, metadata, -(embedding <#> CAST(:query AS vector)) AS score "
+                f"FROM {self._table} "
+                "WHERE kb_id = CAST(:kb_id AS uuid) AND metadata @> CAST(:simple AS jsonb) "
+                "ORDER BY embedding <#> CAST(:query AS vector) LIMIT :limit"
+            ),
+            params,
+        )
+        hits = []
+        for row in result:
+            metadata = row.metadata or {}
+            if not matches_filters(metadata, complex_filters):
+                continue
+            hits.append(SearchHit(id=str(row.chunk_id), score=float(row.score), metadata=metadata))
+            if len(hits) >= k:
+                break
+        return hits
+
+
+def create_vector_index(backend: str, dimension: int, **kwargs: Any) -> VectorIndex:
+    """Cria um índice em memória pelo nome do backend"""
+    if backend == "numpy":
+        return NumpyIndex(dimension, **kwargs)
+    if backend == "hnsw":
+        return HNSWIndex(dimension, **kwargs)
+    raise ValueError(f"Backend vetorial em memória desconhecido: {backend}")
+
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Índices dos ``k`` maiores scores, em ordem decrescente"""
+    if k >= scores.size:
+        return np.argsort(-scores)
+    partition = np.argpartition(-scores, k - 1)[:k]
+    return partition[np.argsort(-scores[partition])]
+
+
+def _vector_literal(vector) -> str:
+    return "[" + ",".join(f"{float(x):.7g}" for x in np.asarray(vector).reshape(-1)) + "]"
@@ -17,10 +17,20 @@ import time
 import traceback
 import os
 from datetime import datetime
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 from pathlib import Path
 
 from synapse.core.config import settings
+from synapse.core.log_pipeline import (
+    LogQueueHandler,
+    RequestContextLogFilter,
+    get_log_pipeline,
+    install_log_pipeline,
+    log_stats,
+    stop_log_pipeline,
+)
+
+TEXT_LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
 
 
 class ErrorTracker:
@@ -93,7 +103,8 @@ class UnifiedJSONFormatter(logging.Formatter):
 
         # Dados básicos do log
         log_data: dict[str, Any] = {
-            "timestamp": datetime.utcnow().isoformat() + "Z",
+            # Horário do evento (a formatação pode ocorrer depois, na thread de logging)
+            "timestamp": datetime.utcfromtimestamp(record.created).isoformat() + "Z",
             "level": record.levelname,
             "logger": record.name,
             "message": record.getMessage(),
@@ -105,6 +116,8 @@ class UnifiedJSONFormatter(logging.Formatter):
         # Adicionar informações de contexto se disponíveis
         context_fields = [
             "request_id",
+            "tenant_id",
+            "trace_id",
             "user_id",
             "endpoint_category",
             "url",
@@ -154,7 +167,9 @@ class UnifiedJSONFormatter(logging.Formatter):
             "processName",
             "relativeCreated",
             "stack_info",
+            "taskName",
             "thread",
+            "log_route",
             "threadName",
             "traceback",
         } | set(context_fields)
@@ -174,70 +189,22 @@ class UnifiedLogger:
         self._setup_handlers()
 
     def _setup_handlers(self):
-        """Configura handlers baseado no ambiente."""
-
-        # Limpar handlers existentes
-        for handler in self.logger.handlers[:]:
-            self.logger.removeHandler(handler)
+        """Garante o logging configurado e define o nível deste logger.
 
-        # Handler para console
-        console_handler = logging.StreamHandler(sys.stdout)
-
-        # Formatador baseado no ambiente
-        if settings.ENVIRONMENT == "production":
-            formatter = UnifiedJSONFormatter()
-        else:
-            formatter = logging.Formatter(
-                "%(asctime)s - %(levelname)s - %(name)s - %(message)s",
-            )
-
-        console_handler.setFormatter(formatter)
-        self.logger.addHandler(console_handler)
+        Os registros propagam até o logger raiz, onde ficam os handlers
+        (fila assíncrona ou saídas diretas); loggers nomeados não têm mais
+        handlers próprios, que gravavam de forma síncrona e duplicavam as
+        linhas do raiz.
+        """
+        ensure_logging()
 
-        # Handlers de arquivo em produção ou se configurado
-        if (
-            settings.ENVIRONMENT == "production"
-            or os.getenv("ENABLE_FILE_LOGGING", "false").lower() == "true"
-        ):
-            self._setup_file_handlers()
+        # Remover handlers de versões anteriores deste logger
+        for handler in self.logger.handlers[:]:
+            if type(handler) in _REPLACEABLE_HANDLERS:
+                self.logger.removeHandler(handler)
 
-        # Configurar nível
         log_level_name = settings.LOG_LEVEL or "INFO"
-        log_level = getattr(logging, log_level_name, logging.INFO)
-        self.logger.setLevel(log_level)
-
-    def _setup_file_handlers(self):
-        """Configura handlers de arquivo para produção."""
-
-        # Criar diretório de logs
-        def _get_log_directory():
-            """Lazy loading para evitar import circular com fallback seguro"""
-            try:
-                from synapse.core.config import settings
-                return Path(settings.LOG_DIRECTORY)
-            except ImportError:
-                # Fallback seguro se houver problema circular
-                return Path("logs")
-        
-        log_dir = _get_log_directory()
-        log_dir.mkdir(exist_ok=True)
-
-        # Handler principal
-        file_handler = logging.handlers.RotatingFileHandler(
-            log_dir / "synapse.log", maxBytes=10 * 1024 * 1024, backupCount=5  # 10MB
-        )
-        file_handler.setFormatter(UnifiedJSONFormatter())
-        self.logger.addHandler(file_handler)
-
-        # Handler para erros
-        error_handler = logging.handlers.RotatingFileHandler(
-            log_dir / "synapse_errors.log",
-            maxBytes=5 * 1024 * 1024,  # 5MB
-            backupCount=3,
-        )
-        error_handler.setLevel(logging.ERROR)
-        error_handler.setFormatter(UnifiedJSONFormatter())
-        self.logger.addHandler(error_handler)
+        self.logger.setLevel(getattr(logging, log_level_name, logging.INFO))
 
     # Métodos de logging básicos para compatibilidade
     def debug(self, message: str, *args, **kwargs):
@@ -299,16 +266,90 @@ class UnifiedLogger:
         self.logger.error(f"Error occurred: {error}", extra=extra, exc_info=True)
 
 
-# Instância global unificada
-_unified_logger = UnifiedLogger()
+# Handlers padrão (console/arquivo) substituídos pela configuração; handlers
+# de terceiros no logger raiz (ex.: captura do pytest) são preservados
+_REPLACEABLE_HANDLERS = (
+    logging.StreamHandler,
+    logging.FileHandler,
+    logging.handlers.RotatingFileHandler,
+    logging.handlers.QueueHandler,
+    LogQueueHandler,
+)
+
+# Loggers que não propagam e têm handlers próprios (configurados pelo uvicorn)
+_ADOPTED_LOGGERS = ("uvicorn", "uvicorn.access")
+
+_configured = False
+
+
+def _log_directory() -> Path:
+    """Lazy loading para evitar import circular com fallback seguro"""
+    try:
+        from synapse.core.config import settings
+
+        return Path(settings.LOG_DIRECTORY)
+    except ImportError:
+        return Path("logs")
+
+
+def build_log_handlers() -> List[logging.Handler]:
+    """Saídas de log: console, arquivo LOG_FILE e arquivos JSON rotativos."""
+
+    handlers: List[logging.Handler] = []
+
+    # Console com formatador baseado no ambiente
+    console_handler = logging.StreamHandler(sys.stdout)
+    if settings.ENVIRONMENT == "production":
+        console_handler.setFormatter(UnifiedJSONFormatter())
+    else:
+        console_handler.setFormatter(logging.Formatter(TEXT_LOG_FORMAT))
+    handlers.append(console_handler)
+
+    # Arquivo de texto configurado em LOG_FILE
+    if settings.ENABLE_LOG_FILE_OUTPUT and settings.LOG_FILE:
+        Path(settings.LOG_FILE).parent.mkdir(parents=True, exist_ok=True)
+        file_handler = logging.FileHandler(settings.LOG_FILE)
+        file_handler.setFormatter(logging.Formatter(TEXT_LOG_FORMAT))
+        handlers.append(file_handler)
+
+    # Arquivos JSON rotativos em produção ou se configurado
+    if (
+        settings.ENVIRONMENT == "production"
+        or os.getenv("ENABLE_FILE_LOGGING", "false").lower() == "true"
+    ):
+        log_dir = _log_directory()
+        log_dir.mkdir(exist_ok=True)
+
+        # Handler principal
+        json_handler = logging.handlers.RotatingFileHandler(
+            log_dir / "synapse.log", maxBytes=10 * 1024 * 1024, backupCount=5  # 10MB
+        )
+        json_handler.setFormatter(UnifiedJSONFormatter())
+        handlers.append(json_handler)
+
+        # Handler para erros
+        error_handler = logging.handlers.RotatingFileHandler(
+            log_dir / "synapse_errors.log",
+            maxBytes=5 * 1024 * 1024,  # 5MB
+            backupCount=3,
+        )
+        error_handler.setLevel(logging.ERROR)
+        error_handler.setFormatter(UnifiedJSONFormatter())
+        handlers.append(error_handler)
+
+    return handlers
 
 
 def setup_logging() -> None:
     """Configura o sistema de logging unificado.
 
-    Esta função mantém compatibilidade com o código existente
-    enquanto configura o sistema avançado.
+    Com ``LOG_ASYNC`` (padrão), o logger raiz recebe apenas um handler que
+    enfileira os registros; formatação e gravação nas saídas acontecem na
+    thread do pipeline (``synapse.core.log_pipeline``). Sem ele, as saídas
+    são anexadas diretamente ao raiz, como antes.
     """
+    global _configured
+
     # Configurar nível de log baseado no ambiente
     log_level_name = settings.LOG_LEVEL or "INFO"
     log_level = getattr(logging, log_level_name, logging.INFO)
@@ -317,23 +358,27 @@ def setup_logging() -> None:
     root_logger = logging.getLogger()
     root_logger.setLevel(log_level)
 
-    # Remover handlers existentes
+    # Encerrar o pipeline anterior (devolve as saídas ao raiz) e remover
+    # handlers de console/arquivo existentes (basicConfig e anteriores)
+    stop_log_pipeline()
     for handler in root_logger.handlers[:]:
-        root_logger.removeHandler(handler)
-
-    # Criar handler para stdout
-    console_handler = logging.StreamHandler(sys.stdout)
-
-    # Definir formatador baseado no ambiente
-    if settings.ENVIRONMENT == "production":
-        formatter = UnifiedJSONFormatter()
-    else:
-        formatter = logging.Formatter(
-            "%(asctime)s - %(levelname)s - %(name)s - %(message)s",
+        if type(handler) in _REPLACEABLE_HANDLERS:
+            root_logger.removeHandler(handler)
+
+    handlers = build_log_handlers()
+    if settings.LOG_ASYNC:
+        pipeline = install_log_pipeline(
+            handlers,
+            queue_size=settings.LOG_QUEUE_SIZE,
+            block_timeout=settings.LOG_QUEUE_BLOCK_MS / 1000,
         )
-
-    console_handler.setFormatter(formatter)
-    root_logger.addHandler(console_handler)
+        pipeline.attach(root_logger)
+        pipeline.adopt(_ADOPTED_LOGGERS)
+    else:
+        context_filter = RequestContextLogFilter()
+        for handler in handlers:
+            handler.addFilter(context_filter)
+            root_logger.addHandler(handler)
 
     # Configurar loggers específicos
     for logger_name, logger_level in [
@@ -345,13 +390,33 @@ def setup_logging() -> None:
         logger = logging.getLogger(logger_name)
         logger.setLevel(logger_level)
 
+    _configured = True
+
     # Log inicial
     logging.info(
         f"Logging unificado configurado: nível={settings.LOG_LEVEL or 'INFO'}, "
-        f"ambiente={settings.ENVIRONMENT}",
+        f"ambiente={settings.ENVIRONMENT}, assíncrono={settings.LOG_ASYNC}",
     )
 
 
+def ensure_logging() -> None:
+    """Configura o logging na primeira utilização."""
+    if not _configured:
+        setup_logging()
+
+
+def get_log_stats() -> Dict[str, Any]:
+    """Retorna contadores do pipeline de logging (fila, descartes, amostragem)."""
+    pipeline = get_log_pipeline()
+    if pipeline is not None:
+        return pipeline.get_stats()
+    return {**log_stats.as_dict(), "running": False}
+
+
+# Instância global unificada
+_unified_logger = UnifiedLogger()
+
+
 def get_logger(name: str = None) -> UnifiedLogger:
     """Obtém um logger configurado para o módulo especificado.
 
@@ -38,40 +38,23 @@ from sqlalchemy import (
 # Importar do sistema centralizado
 from synapse.core.config import settings
 from synapse.database import init_db, get_db
-from synapse.api.v1.api import api_router
+from synapse.api.v1.api import mount_api_routers
 from synapse.api.deps import get_current_user
 from synapse.models.user import User
-from synapse.middlewares.rate_limiting import rate_limit
-from synapse.middlewares.metrics import setup_metrics_middleware
-from synapse.middlewares.error_middleware import setup_error_middleware
-from synapse.middlewares.tenant_middleware import TenantMiddleware
-from synapse.error_handlers import setup_error_handlers, add_request_id_middleware
+from synapse.middlewares.pipeline import setup_request_pipeline
+from synapse.error_handlers import setup_error_handlers
+from synapse.logger_config import ensure_logging
 
 # Sistema de tracing distribuído
 from synapse.core.tracing import (
     setup_tracing,
     instrument_fastapi,
     instrument_libraries,
-    TracingMiddleware,
     get_trace_context,
 )
 
-# Configuração de logging otimizada com sistema centralizado
-log_level_name = settings.LOG_LEVEL or "INFO"
-log_level = getattr(logging, log_level_name, logging.INFO)
-logging.basicConfig(
-    level=log_level,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    handlers=[
-        logging.StreamHandler(),
-        # Adicionar FileHandler se LOG_FILE estiver configurado
-        *(
-            [logging.FileHandler(settings.LOG_FILE)]
-            if hasattr(settings, "LOG_FILE") and settings.LOG_FILE
-            else []
-        ),
-    ],
-)
+# Logging centralizado: formatação e gravação em thread dedicada (fila limitada)
+ensure_logging()
 logger = logging.getLogger(__name__)
 
 
@@ -199,12 +182,47 @@ async def lifespan(app: FastAPI):
     else:
         logger.info("⚠️  Sistema de Alertas desabilitado (ALERT_SYSTEM_ENABLED=false)")
 
+    # Contadores de uso/downloads/avaliações gravados em lote
+    try:
+        from synapse.services.counter_service import counter_service
+
+        await counter_service.start()
+        logger.info("✅ Flusher de contadores inicializado")
+    except Exception as e:
+        logger.warning(f"⚠️  Flusher de contadores não disponível: {e}")
+
+    # Pool de processos para nós CPU-bound (código personalizado, transformações grandes)
+    try:
+        from synapse.core.executors.worker_pool import get_worker_pool
+
+        worker_pool = get_worker_pool()
+        if worker_pool:
+            await worker_pool.start()
+            logger.info(f"✅ Pool de executores inicializado ({worker_pool.workers} workers)")
+    except Exception as e:
+        logger.warning(f"⚠️  Pool de executores não disponível, nós rodam no event loop: {e}")
+
+    # Invalidações de autorização propagadas entre workers
+    try:
+        from synapse.services.authorization_service import authorization_engine
+
+        await authorization_engine.start()
+        logger.info("✅ Sincronização de autorização inicializada")
+    except Exception as e:
+        logger.warning(f"⚠️  Sincronização de autorização não disponível: {e}")
+
     logger.info("🎉 SynapScale Backend iniciado com sucesso!")
 
+    # Routers ainda não usados são importados em background, após o startup
+    if router_loader and settings.API_PRELOAD_ROUTERS:
+        router_loader.start_preload(delay=settings.API_PRELOAD_DELAY_SECONDS)
+
     yield
 
     # Shutdown
     logger.info("🔄 Finalizando SynapScale Backend...")
+    if router_loader:
+        await router_loader.stop_preload()
     execution_engine_enabled = settings.EXECUTION_ENGINE_ENABLED
     if execution_engine_enabled:
         try:
@@ -227,8 +245,39 @@ async def lifespan(app: FastAPI):
     else:
         logger.info("ℹ️  Sistema de Alertas não estava habilitado")
 
+    # Grava os contadores acumulados antes de encerrar
+    try:
+        from synapse.services.counter_service import counter_service
+
+        await counter_service.stop()
+        logger.info("✅ Contadores gravados")
+    except Exception as e:
+        logger.warning(f"⚠️  Erro ao gravar contadores: {e}")
+
+    try:
+        from synapse.core.executors.worker_pool import get_worker_pool
+
+        worker_pool = get_worker_pool()
+        if worker_pool:
+            await worker_pool.stop()
+            logger.info("✅ Pool de executores finalizado")
+    except Exception as e:
+        logger.warning(f"⚠️  Erro ao finalizar pool de executores: {e}")
+
+    try:
+        from synapse.services.authorization_service import authorization_engine
+
+        await authorization_engine.stop()
+    except Exception as e:
+        logger.warning(f"⚠️  Erro ao encerrar sincronização de autorização: {e}")
+
     logger.info("✅ SynapScale Backend finalizado com sucesso")
 
+    # Esvazia a fila de logs antes de encerrar o processo
+    from synapse.core.log_pipeline import stop_log_pipeline
+
+    stop_log_pipeline()
+
 
 # Tags da API reorganizadas - ESTRUTURA FINAL SIMPLIFICADA E CONSOLIDADA
 openapi_tags = [
@@ -437,111 +486,10 @@ else:
     )
 
 
-@app.middleware("http")
-async def add_security_headers(request: Request, call_next):
-    """Adiciona headers de segurança"""
-    response = await call_next(request)
-    response.headers["X-Content-Type-Options"] = "nosniff"
-    response.headers["X-Frame-Options"] = "DENY"
-    response.headers["X-XSS-Protection"] = "1; mode=block"
-    response.headers["Strict-Transport-Security"] = (
-        "max-age=31536000; includeSubDomains"
-    )
-    response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
-    response.headers["Permissions-Policy"] = "camera=(), microphone=(), geolocation=()"
-    return response
-
-
-@app.middleware("http")
-async def add_process_time_header(request: Request, call_next):
-    """Adiciona tempo de processamento no header"""
-    start_time = time.time()
-    response = await call_next(request)
-    process_time = time.time() - start_time
-    response.headers["X-Process-Time"] = str(process_time)
-    return response
-
-
-@app.middleware("http")
-async def log_auth_requests(request: Request, call_next):
-    """Log de requisições de autenticação para debug"""
-
-    # Se for uma requisição para a API, log dos headers de autenticação
-    if request.url.path.startswith("/api/v1/"):
-        auth_header = request.headers.get("authorization")
-        if auth_header:
-            logger.debug(f"Auth header presente: {auth_header[:20]}...")
-        else:
-            logger.debug(f"Sem auth header - Path: {request.url.path}")
-
-    response = await call_next(request)
-    return response
-
-
-@app.middleware("http")
-async def log_requests(request: Request, call_next):
-    """Log de requisições com informações essenciais"""
-    start_time = time.time()
-
-    # Extrair informações da requisição
-    client_ip = request.client.host if request.client else "unknown"
-    method = request.method
-    url = str(request.url)
-    user_agent = request.headers.get("user-agent", "unknown")
-
-    response = await call_next(request)
-
-    # Calcular tempo de processamento
-    process_time = time.time() - start_time
-
-    # 🎯 FILTRAR ENDPOINTS QUE GERAM LOGS DESNECESSÁRIOS
-    # Não logar endpoints de sistema que são chamados frequentemente
-    excluded_paths = {
-        "/current-url",
-        "/.identity", 
-        "/health",
-        "/metrics",
-        "/favicon.ico"
-    }
-    
-    path = request.url.path
-    
-    # Apenas logar se não estiver na lista de exclusão
-    if path not in excluded_paths:
-        # 🔐 DESTACAR LOGS DE AUTENTICAÇÃO
-        if "/auth/" in path:
-            # Log especial para endpoints de autenticação
-            logger.info(
-                f"🔐 AUTH | {method} {path} - {response.status_code} - "
-                f"{process_time:.3f}s - {client_ip}"
-            )
-        else:
-            # Log normal para outros endpoints
-            logger.info(
-                f"{method} {url} - {response.status_code} - "
-                f"{process_time:.3f}s - {client_ip}"
-            )
-
-    return response
-
-
-@app.middleware("http")
-async def rate_limit_middleware(request: Request, call_next):
-    # Limite padrão: 100 requisições por 60 segundos
-    return await rate_limit(max_requests=100, window_seconds=60)(call_next)(request)
-
-
-# Configurar middleware de métricas para monitoramento
-setup_metrics_middleware(app)
-
-# CRÍTICO: Adicionar middleware de tenant ANTES dos outros middlewares
-app.add_middleware(TenantMiddleware)
-
-# Configurar middleware para adicionar request ID
-app.middleware("http")(add_request_id_middleware)
-
-# Configurar middleware de interceptação de erros
-setup_error_middleware(app)
+# Pipeline de requisições: request ID, tracing, captura de erros, contexto de
+# autenticação, tenant, rate limit, métricas, headers de segurança e log de
+# acesso numa única camada ASGI (mais externa que CORS e TrustedHost)
+setup_request_pipeline(app)
 
 # Configurar handlers de erro globais
 setup_error_handlers(app)
@@ -552,8 +500,6 @@ if settings.ENABLE_TRACING:
     setup_tracing()
     instrument_libraries()
     
-    # Adicionar middleware de tracing
-    app.add_middleware(TracingMiddleware)
     # Instrumentar FastAPI
     instrument_fastapi(app)
     logger.info("✅ FastAPI instrumentado com OpenTelemetry")
@@ -774,8 +720,8 @@ async def get_identity():
     }
 
 
-# Incluir roteador principal da API
-app.include_router(api_router, prefix=settings.API_V1_STR)
+# Incluir roteadores da API (importados sob demanda com API_LAZY_ROUTERS)
+router_loader = mount_api_routers(app, settings.API_V1_STR)
 
 # ------------------------------------------------------------
 # Static assets (apenas para DEBUG) – contém o CSS de override
@@ -794,6 +740,10 @@ def custom_openapi():
     # Forçar regeneração do schema (remover cache)
     app.openapi_schema = None
 
+    # O schema precisa de todas as rotas: carregar os routers ainda pendentes
+    if router_loader:
+        router_loader.load_all()
+
     # Debug: verificar se openapi_tags está correto
     print(f"DEBUG: openapi_tags tem {len(openapi_tags)} tags")
     for tag in openapi_tags:
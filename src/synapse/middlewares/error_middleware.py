@@ -7,7 +7,7 @@ interceptação de erros em diferentes camadas da aplicação.
 import logging
 import time
 import traceback
-from typing import Callable
+from typing import Callable, Optional
 
 from fastapi import Request, Response
 from fastapi.responses import JSONResponse
@@ -147,33 +147,67 @@ async def error_tracking_middleware(request: Request, call_next):
         raise
 
 
+# Categorias por trecho do path, na ordem de precedência
+ENDPOINT_CATEGORIES = (
+    ("/workspaces", "workspaces"),
+    ("/projects", "projects"),
+    ("/analytics", "analytics"),
+    ("/conversations", "ai_conversations"),
+    ("/agents", "ai_conversations"),
+    ("/workflows", "workflows"),
+    ("/llm", "llm_services"),
+    ("/auth", "authentication"),
+    ("/marketplace", "marketplace"),
+    ("/nodes", "nodes"),
+    ("/executions", "executions"),
+)
+
+
+def categorize_endpoint(path: str) -> str:
+    """Identifica a categoria do endpoint a partir do path."""
+    for fragment, category in ENDPOINT_CATEGORIES:
+        if fragment in path:
+            return category
+    return "unknown"
+
+
+def categorize_exception(
+    endpoint_category: str, path: str, exc: Exception
+) -> Optional[SynapseBaseException]:
+    """Transforma um erro genérico no erro específico da categoria do endpoint.
+
+    Retorna None quando o erro já é do SynapScale ou a categoria não tem erro próprio.
+    """
+    if isinstance(exc, SynapseBaseException):
+        return None
+
+    if endpoint_category == "workspaces":
+        return WorkspaceError(f"Erro no workspace: {str(exc)}")
+    elif endpoint_category == "projects":
+        return ProjectError(f"Erro no projeto: {str(exc)}")
+    elif endpoint_category == "analytics":
+        return AnalyticsError(f"Erro no analytics: {str(exc)}")
+    elif endpoint_category == "ai_conversations":
+        if "/agents" in path:
+            return AgentError(f"Erro no agente: {str(exc)}")
+        return ConversationError(f"Erro na conversação: {str(exc)}")
+    elif endpoint_category == "workflows":
+        return WorkflowError(f"Erro no workflow: {str(exc)}")
+    elif endpoint_category == "llm_services":
+        return LLMServiceError(f"Erro no serviço LLM: {str(exc)}")
+    elif endpoint_category == "nodes":
+        return WorkflowError(f"Erro no node: {str(exc)}")
+    elif endpoint_category == "executions":
+        return WorkflowError(f"Erro na execução: {str(exc)}")
+    return None
+
+
 async def endpoint_error_categorizer_middleware(request: Request, call_next):
     """Middleware para categorizar erros por tipo de endpoint."""
 
     # Identificar categoria do endpoint
     path = request.url.path
-    endpoint_category = "unknown"
-
-    if "/workspaces" in path:
-        endpoint_category = "workspaces"
-    elif "/projects" in path:
-        endpoint_category = "projects"
-    elif "/analytics" in path:
-        endpoint_category = "analytics"
-    elif "/conversations" in path or "/agents" in path:
-        endpoint_category = "ai_conversations"
-    elif "/workflows" in path:
-        endpoint_category = "workflows"
-    elif "/llm" in path:
-        endpoint_category = "llm_services"
-    elif "/auth" in path:
-        endpoint_category = "authentication"
-    elif "/marketplace" in path:
-        endpoint_category = "marketplace"
-    elif "/nodes" in path:
-        endpoint_category = "nodes"
-    elif "/executions" in path:
-        endpoint_category = "executions"
+    endpoint_category = categorize_endpoint(path)
 
     # Adicionar categoria ao request state
     request.state.endpoint_category = endpoint_category
@@ -196,26 +230,9 @@ async def endpoint_error_categorizer_middleware(request: Request, call_next):
         )
 
         # Transformar erro genérico em erro específico da categoria
-        if not isinstance(exc, SynapseBaseException):
-            if endpoint_category == "workspaces":
-                raise WorkspaceError(f"Erro no workspace: {str(exc)}")
-            elif endpoint_category == "projects":
-                raise ProjectError(f"Erro no projeto: {str(exc)}")
-            elif endpoint_category == "analytics":
-                raise AnalyticsError(f"Erro no analytics: {str(exc)}")
-            elif endpoint_category == "ai_conversations":
-                if "/agents" in path:
-                    raise AgentError(f"Erro no agente: {str(exc)}")
-                else:
-                    raise ConversationError(f"Erro na conversação: {str(exc)}")
-            elif endpoint_category == "workflows":
-                raise WorkflowError(f"Erro no workflow: {str(exc)}")
-            elif endpoint_category == "llm_services":
-                raise LLMServiceError(f"Erro no serviço LLM: {str(exc)}")
-            elif endpoint_category == "nodes":
-                raise WorkflowError(f"Erro no node: {str(exc)}")
-            elif endpoint_category == "executions":
-                raise WorkflowError(f"Erro na execução: {str(exc)}")
+        categorized = categorize_exception(endpoint_category, path, exc)
+        if categorized is not None:
+            raise categorized
 
         # Se não conseguiu categorizar, repassar o erro original
         raise
@@ -136,6 +136,36 @@ workflow_executions_total = Counter(
 )
 
 
+# ========================================
+# MÉTRICAS DE NOTIFICAÇÕES DE ALERTA
+# ========================================
+
+# Notificações por canal e resultado (delivered, retried, dead, suppressed)
+alert_notifications_total = Counter(
+    "synapscale_alert_notifications_total",
+    "Total de notificações de alerta por canal e resultado",
+    ["channel", "status"],
+    registry=REGISTRY,
+)
+
+# Latência do disparo do alerta até a entrega (inclui agrupamento e retentativas)
+alert_notification_delivery_seconds = Histogram(
+    "synapscale_alert_notification_delivery_seconds",
+    "Latência entre o disparo do alerta e a entrega da notificação",
+    ["channel"],
+    buckets=(0.5, 1, 5, 15, 30, 60, 120, 300, 900, 3600),
+    registry=REGISTRY,
+)
+
+# Profundidade das filas do despachante (buffer em memória, outbox, em entrega)
+alert_notification_queue_depth = Gauge(
+    "synapscale_alert_notification_queue_depth",
+    "Notificações de alerta aguardando entrega",
+    ["stage"],
+    registry=REGISTRY,
+)
+
+
 class MetricsMiddleware:
     """Middleware para coleta automática de métricas"""
 
@@ -0,0 +1,525 @@
+"""
+Pipeline ASGI de requisições
+Uma única camada ASGI com estágios ordenados (request ID, tracing, captura de
+erros, contexto de autenticação, tenant, rate limit, métricas, headers e log)
+que compartilham um contexto por requisição, no lugar da pilha de
+middlewares ``@app.middleware("http")``
+"""
+
+import asyncio
+import inspect
+import logging
+import random
+import time
+import uuid
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from fastapi import FastAPI
+from starlette.responses import JSONResponse, Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from synapse.core.config import settings
+from synapse.core.log_pipeline import current_request, log_stats
+from synapse.middlewares.error_middleware import categorize_endpoint, categorize_exception
+from synapse.middlewares.metrics import (
+    http_request_duration_seconds,
+    http_requests_active,
+    http_requests_total,
+    metrics_endpoint,
+)
+from synapse.exceptions import SynapseBaseException
+
+logger = logging.getLogger(__name__)
+
+_UNSET = object()
+
+
+class RequestContext:
+    """Estado compartilhado pelos estágios durante uma requisição"""
+
+    __slots__ = (
+        "scope",
+        "state",
+        "method",
+        "path",
+        "start",
+        "request_id",
+        "token",
+        "_claims",
+        "tenant_id",
+        "endpoint_category",
+        "status_code",
+        "error",
+    )
+
+    def __init__(self, scope: Scope):
+        self.scope = scope
+        # Mesmo dicionário usado por request.state nos endpoints
+        self.state: Dict[str, Any] = scope.setdefault("state", {})
+        self.method: str = scope["method"]
+        self.path: str = scope["path"]
+        self.start = time.perf_counter()
+        self.request_id: Optional[str] = None
+        self.token: Optional[str] = None
+        self._claims: Any = _UNSET
+        self.tenant_id = None
+        self.endpoint_category: Optional[str] = None
+        self.status_code: Optional[int] = None
+        self.error: Optional[BaseException] = None
+
+    def header(self, name: bytes) -> Optional[str]:
+        """Valor de um header da requisição (nome em minúsculas)"""
+        for key, value in self.scope["headers"]:
+            if key == name:
+                return value.decode("latin-1")
+        return None
+
+    @property
+    def client_ip(self) -> str:
+        client = self.scope.get("client")
+        return client[0] if client else "unknown"
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.start
+
+    @property
+    def claims(self) -> Optional[Dict[str, Any]]:
+        """Payload do token Bearer, decodificado na primeira leitura"""
+        if self._claims is _UNSET:
+            self._claims = None
+            if self.token:
+                from synapse.core.auth.jwt import decode_token
+
+                try:
+                    self._claims = decode_token(self.token)
+                except Exception:
+                    self._claims = None
+        return self._claims
+
+    @property
+    def route_path(self) -> str:
+        """Template da rota atendida (sem parâmetros dinâmicos), disponível após o roteamento"""
+        route = self.scope.get("route")
+        return getattr(route, "path", None) or self.path
+
+
+class Stage:
+    """
+    Estágio do pipeline. Sobrescreva apenas os ganchos necessários: ganchos
+    não sobrescritos e estágios desabilitados não entram no pipeline.
+
+    - ``on_request(ctx)``: antes do app; pode ser ``async`` e retornar uma
+      Response para encerrar a requisição
+    - ``on_response(ctx, headers)``: no início da resposta, com a lista
+      mutável de headers crus
+    - ``on_error(ctx, exc)``: exceção não tratada; pode retornar outra
+      exceção para substituí-la
+    - ``on_complete(ctx)``: ao final, com ou sem erro
+    """
+
+    name = "stage"
+    enabled = True
+
+    def on_request(self, ctx: RequestContext) -> Optional[Response]:
+        return None
+
+    def on_response(self, ctx: RequestContext, headers: List[tuple]) -> None:
+        return None
+
+    def on_error(self, ctx: RequestContext, exc: Exception) -> Optional[Exception]:
+        return None
+
+    def on_complete(self, ctx: RequestContext) -> None:
+        return None
+
+    def overrides(self, hook: str) -> bool:
+        return getattr(type(self), hook) is not getattr(Stage, hook)
+
+
+class RequestPipeline:
+    """
+    Middleware ASGI que executa os estágios na ordem dada: ``on_request`` do
+    primeiro ao último e os ganchos de resposta, erro e conclusão do último ao
+    primeiro, como numa pilha de middlewares.
+    """
+
+    def __init__(self, app: ASGIApp, stages: Sequence[Stage]):
+        self.app = app
+        self.stages = [stage for stage in stages if stage.enabled]
+        self._request_hooks = [
+            (stage.on_request, inspect.iscoroutinefunction(stage.on_request))
+            for stage in self.stages
+            if stage.overrides("on_request")
+        ]
+        inner_first = list(reversed(self.stages))
+        self._response_hooks = [s.on_response for s in inner_first if s.overrides("on_response")]
+        self._error_hooks = [s.on_error for s in inner_first if s.overrides("on_error")]
+        self._complete_hooks = [s.on_complete for s in inner_first if s.overrides("on_complete")]
+        self._observes_response = bool(self._response_hooks or self._complete_hooks)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self.stages:
+            await self.app(scope, receive, send)
+            return
+
+        ctx = RequestContext(scope)
+        # Logs emitidos durante a requisição recebem request_id/tenant/trace deste contexto
+        context_token = current_request.set(ctx)
+        if self._observes_response:
+            response_hooks = self._response_hooks
+
+            async def send_wrapper(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    ctx.status_code = message["status"]
+                    if response_hooks:
+                        headers = message.get("headers")
+                        if not isinstance(headers, list):
+                            headers = message["headers"] = list(headers or ())
+                        for hook in response_hooks:
+                            hook(ctx, headers)
+                await send(message)
+
+        else:
+            send_wrapper = send
+
+        try:
+            response = None
+            for hook, is_async in self._request_hooks:
+                response = await hook(ctx) if is_async else hook(ctx)
+                if response is not None:
+                    break
+            if response is not None:
+                await response(scope, receive, send_wrapper)
+            else:
+                await self.app(scope, receive, send_wrapper)
+        except Exception as exc:
+            ctx.error = exc
+            if ctx.status_code is None:
+                ctx.status_code = 500
+            raised: Exception = exc
+            for hook in self._error_hooks:
+                replacement = hook(ctx, raised)
+                if replacement is not None:
+                    raised = replacement
+            if raised is exc:
+                raise
+            raise raised from exc
+        finally:
+            for hook in self._complete_hooks:
+                try:
+                    hook(ctx)
+                except Exception as e:
+                    logger.error(f"Erro no estágio do pipeline HTTP: {e}")
+            current_request.reset(context_token)
+
+
+# ========================================
+# ESTÁGIOS
+# ========================================
+
+
+class RequestIdStage(Stage):
+    """Request ID (recebido em X-Request-ID ou gerado) no estado e na resposta"""
+
+    name = "request_id"
+
+    def on_request(self, ctx: RequestContext) -> None:
+        ctx.request_id = ctx.header(b"x-request-id") or str(uuid.uuid4())
+        ctx.state["request_id"] = ctx.request_id
+
+    def on_response(self, ctx: RequestContext, headers: List[tuple]) -> None:
+        headers.append((b"x-request-id", ctx.request_id.encode("latin-1")))
+
+
+class TracingStage(Stage):
+    """Propaga o contexto de trace dos headers quando o tracing está ativo"""
+
+    name = "tracing"
+
+    def __init__(self, enabled: Optional[bool] = None):
+        self.enabled = settings.ENABLE_TRACING if enabled is None else enabled
+
+    def on_request(self, ctx: RequestContext) -> None:
+        from synapse.core.tracing import (
+            _tracing_state,
+            extract_trace_context,
+            get_current_span_id,
+            get_current_trace_id,
+        )
+
+        if not _tracing_state.is_ready():
+            return
+        extract_trace_context(
+            {key.decode("latin-1"): value.decode("latin-1") for key, value in ctx.scope["headers"]}
+        )
+        trace_id = get_current_trace_id()
+        if trace_id:
+            ctx.scope["trace_id"] = trace_id
+            ctx.scope["span_id"] = get_current_span_id()
+
+
+class ErrorCaptureStage(Stage):
+    """Categoriza o endpoint, registra exceções não tratadas e as converte no erro da categoria"""
+
+    name = "error_capture"
+
+    def on_request(self, ctx: RequestContext) -> None:
+        ctx.endpoint_category = categorize_endpoint(ctx.path)
+        ctx.state["endpoint_category"] = ctx.endpoint_category
+
+    def on_error(self, ctx: RequestContext, exc: Exception) -> Optional[Exception]:
+        details = {
+            "request_id": ctx.request_id or "unknown",
+            "endpoint_category": ctx.endpoint_category,
+            "method": ctx.method,
+            "url": ctx.path,
+            "error_type": exc.__class__.__name__,
+            "process_time": ctx.elapsed,
+        }
+        if isinstance(exc, SynapseBaseException):
+            logger.warning(f"SynapScale exception in endpoint: {exc.__class__.__name__}", extra=details)
+            return None
+
+        logger.error(f"Unhandled exception in {ctx.endpoint_category} endpoint: {exc}", extra=details, exc_info=exc)
+        return categorize_exception(ctx.endpoint_category, ctx.path, exc)
+
+
+class AuthContextStage(Stage):
+    """Extrai o token Bearer uma vez; o payload é decodificado sob demanda (``ctx.claims``)"""
+
+    name = "auth_context"
+
+    def on_request(self, ctx: RequestContext) -> None:
+        authorization = ctx.header(b"authorization")
+        if authorization and authorization.startswith("Bearer "):
+            ctx.token = authorization[7:]
+        if ctx.path.startswith("/api/v1/") and logger.isEnabledFor(logging.DEBUG):
+            if authorization:
+                logger.debug(f"Auth header presente: {authorization[:20]}...")
+            else:
+                logger.debug(f"Sem auth header - Path: {ctx.path}")
+
+
+class TenantStage(Stage):
+    """Resolve o tenant do usuário autenticado (``request.state.tenant_id``)"""
+
+    name = "tenant"
+
+    def __init__(self, exclude_paths: Optional[Iterable[str]] = None):
+        self.exclude_paths = tuple(
+            exclude_paths
+            or (
+                "/docs",
+                "/redoc",
+                "/openapi.json",
+                "/health",
+                "/auth/login",
+                "/auth/register",
+                "/auth/refresh",
+            )
+        )
+
+    async def on_request(self, ctx: RequestContext) -> None:
+        if not ctx.token or ctx.path.startswith(self.exclude_paths):
+            return
+        claims = ctx.claims
+        user_id = claims.get("sub") if claims else None
+        if not user_id:
+            return
+        try:
+            tenant_id, tenant_service = await asyncio.to_thread(self._lookup, user_id)
+        except Exception:
+            # Em caso de erro, continuar sem tenant
+            return
+        if tenant_id:
+            ctx.tenant_id = tenant_id
+            ctx.state["tenant_id"] = tenant_id
+            ctx.state["tenant_service"] = tenant_service
+
+    @staticmethod
+    def _lookup(user_id: str):
+        from synapse.database import get_db
+        from synapse.services.tenant_service import TenantService
+
+        db = next(get_db())
+        try:
+            tenant_service = TenantService(db)
+            tenant = tenant_service.get_user_tenant(uuid.UUID(user_id))
+            if not tenant:
+                return None, None
+            tenant_service.set_current_tenant(tenant.id)
+            return tenant.id, tenant_service
+        finally:
+            db.close()
+
+
+class RateLimitStage(Stage):
+    """Limite global por IP em janela fixa; responde 429 com Retry-After"""
+
+    name = "rate_limit"
+
+    def __init__(
+        self,
+        max_requests: Optional[int] = None,
+        window_seconds: Optional[int] = None,
+        enabled: Optional[bool] = None,
+    ):
+        self.enabled = (
+            settings.RATE_LIMIT_ENABLED and settings.HTTP_RATE_LIMIT_ENABLED
+            if enabled is None
+            else enabled
+        )
+        self.max_requests = max_requests or settings.RATE_LIMIT_REQUESTS
+        self.window_seconds = window_seconds or settings.RATE_LIMIT_WINDOW
+        self._window = -1
+        self._counts: Dict[str, int] = {}
+
+    def on_request(self, ctx: RequestContext) -> Optional[Response]:
+        now = time.monotonic()
+        window = int(now // self.window_seconds)
+        if window != self._window:
+            self._window, self._counts = window, {}
+        ip = ctx.client_ip
+        count = self._counts.get(ip, 0) + 1
+        self._counts[ip] = count
+        if count <= self.max_requests:
+            return None
+        retry_after = max(1, int((window + 1) * self.window_seconds - now))
+        return JSONResponse(
+            status_code=429,
+            content={"detail": "Limite de requisições excedido"},
+            headers={"Retry-After": str(retry_after)},
+        )
+
+
+class MetricsStage(Stage):
+    """Métricas HTTP do Prometheus por método, rota e status"""
+
+    name = "metrics"
+
+    def __init__(self):
+        self._children: Dict[tuple, tuple] = {}
+
+    def on_request(self, ctx: RequestContext) -> None:
+        http_requests_active.inc()
+
+    def on_complete(self, ctx: RequestContext) -> None:
+        key = (ctx.method, ctx.route_path, ctx.status_code or 500)
+        children = self._children.get(key)
+        if children is None:
+            method, path, status_code = key
+            children = self._children[key] = (
+                http_requests_total.labels(method=method, endpoint=path, status_code=str(status_code)),
+                http_request_duration_seconds.labels(method=method, endpoint=path),
+            )
+        children[0].inc()
+        children[1].observe(ctx.elapsed)
+        http_requests_active.dec()
+
+
+class SecurityHeadersStage(Stage):
+    """Headers de segurança e X-Process-Time"""
+
+    name = "headers"
+
+    HEADERS = (
+        (b"x-content-type-options", b"nosniff"),
+        (b"x-frame-options", b"DENY"),
+        (b"x-xss-protection", b"1; mode=block"),
+        (b"strict-transport-security", b"max-age=31536000; includeSubDomains"),
+        (b"referrer-policy", b"strict-origin-when-cross-origin"),
+        (b"permissions-policy", b"camera=(), microphone=(), geolocation=()"),
+    )
+
+    def on_response(self, ctx: RequestContext, headers: List[tuple]) -> None:
+        headers.extend(self.HEADERS)
+        headers.append((b"x-process-time", str(ctx.elapsed).encode()))
+
+
+class AccessLogStage(Stage):
+    """
+    Log de acesso, exceto endpoints de sistema chamados com frequência.
+    Respostas 2xx/3xx rápidas são amostradas (``sample_rate``); erros e
+    requisições lentas são sempre registrados. O request_id vem do contexto
+    do log, anexado pelo pipeline de logging.
+    """
+
+    name = "logging"
+
+    def __init__(
+        self,
+        excluded_paths: Optional[Iterable[str]] = None,
+        sample_rate: Optional[float] = None,
+        slow_ms: Optional[int] = None,
+    ):
+        self.excluded_paths = frozenset(
+            excluded_paths or ("/current-url", "/.identity", "/health", "/metrics", "/favicon.ico")
+        )
+        self.sample_rate = settings.LOG_ACCESS_SAMPLE_RATE if sample_rate is None else sample_rate
+        self.slow_seconds = (settings.LOG_SLOW_REQUEST_MS if slow_ms is None else slow_ms) / 1000
+
+    def on_complete(self, ctx: RequestContext) -> None:
+        # Exceções já são registradas pelo estágio de captura de erros
+        if ctx.error is not None or ctx.path in self.excluded_paths:
+            return
+        if not logger.isEnabledFor(logging.INFO):
+            return
+        process_time = ctx.elapsed
+        if (
+            self.sample_rate < 1
+            and (ctx.status_code or 500) < 400
+            and process_time < self.slow_seconds
+            and random.random() >= self.sample_rate
+        ):
+            log_stats.sampled_out += 1
+            return
+        extra = {
+            "method": ctx.method,
+            "url": ctx.path,
+            "status_code": ctx.status_code,
+            "process_time": process_time,
+        }
+        if self.sample_rate < 1:
+            extra["sample_rate"] = self.sample_rate
+        if "/auth/" in ctx.path:
+            logger.info(
+                f"🔐 AUTH | {ctx.method} {ctx.path} - {ctx.status_code} - "
+                f"{process_time:.3f}s - {ctx.client_ip}",
+                extra=extra,
+            )
+        else:
+            query = ctx.scope.get("query_string")
+            url = f"{ctx.path}?{query.decode('latin-1')}" if query else ctx.path
+            logger.info(
+                f"{ctx.method} {url} - {ctx.status_code} - {process_time:.3f}s - {ctx.client_ip}",
+                extra=extra,
+            )
+
+
+def default_stages() -> List[Stage]:
+    """Estágios padrão, do mais externo ao mais interno"""
+    return [
+        RequestIdStage(),
+        TracingStage(),
+        ErrorCaptureStage(),
+        AuthContextStage(),
+        TenantStage(),
+        RateLimitStage(),
+        MetricsStage(),
+        SecurityHeadersStage(),
+        AccessLogStage(),
+    ]
+
+
+def setup_request_pipeline(app: FastAPI, stages: Optional[Sequence[Stage]] = None) -> None:
+    """
+    Configura o pipeline de requisições na aplicação FastAPI e o endpoint /metrics
+    """
+    stages = list(stages) if stages is not None else default_stages()
+    app.add_middleware(RequestPipeline, stages=stages)
+    app.add_route("/metrics", metrics_endpoint, methods=["GET"])
+
+    logger.info(
+        "Pipeline HTTP configurado: " + ", ".join(stage.name for stage in stages if stage.enabled)
+    )
@@ -42,6 +42,7 @@ _imports.update(safe_import("workflow_execution", ["WorkflowExecution"]))
 _imports.update(safe_import("node_execution", ["NodeExecution"]))
 _imports.update(safe_import("workflow_connection", ["WorkflowConnection"]))
 _imports.update(safe_import("workflow_execution_queue", ["WorkflowExecutionQueue"]))
+_imports.update(safe_import("workflow_execution_daily_stat", ["WorkflowExecutionDailyStat"]))
 _imports.update(safe_import("workflow_template", ["WorkflowTemplate"]))
 
 # ==================== TIPOS E STATUS ====================
@@ -82,12 +83,16 @@ _imports.update(safe_import("analytics_event", ["AnalyticsEvent"]))
 _imports.update(safe_import("analytics_report", ["AnalyticsReport"]))
 _imports.update(safe_import("analytics_dashboard", ["AnalyticsDashboard"]))
 _imports.update(safe_import("analytics_alert", ["AnalyticsAlert"]))
+_imports.update(safe_import("alert_notification", ["AlertNotification"]))
 _imports.update(safe_import("analytics_export", ["AnalyticsExport"]))
 _imports.update(safe_import("business_metric", ["BusinessMetric"]))
 _imports.update(safe_import("agent_usage_metric", ["AgentUsageMetric"]))
 _imports.update(safe_import("user_behavior_metric", ["UserBehaviorMetric"]))
 _imports.update(safe_import("workflow_execution_metric", ["WorkflowExecutionMetric"]))
 _imports.update(safe_import("analytics", ["SystemPerformanceMetric"]))
+_imports.update(safe_import("metric_rollup", ["MetricRollup", "MetricRollupCursor"]))
+_imports.update(safe_import("active_user_sketch", ["ActiveUserSketch"]))
+_imports.update(safe_import("metric_anomaly", ["MetricAnomaly", "MetricDetectorState"]))
 
 # ==================== CONTATOS & CAMPANHAS ====================
 _imports.update(safe_import("contact", ["Contact"]))
@@ -155,6 +160,7 @@ _imports.update(safe_import("webhook_log", ["WebhookLog"]))
 _imports.update(safe_import("custom_report", ["CustomReport"]))
 _imports.update(safe_import("report_execution", ["ReportExecution"]))
 _imports.update(safe_import("knowledge_base", ["KnowledgeBase"]))
+_imports.update(safe_import("knowledge_base_chunk", ["KnowledgeBaseChunk"]))
 _imports.update(safe_import("user_digitalocean", ["UserDigitalOcean"]))
 _imports.update(safe_import("user_variable", ["UserVariable"]))
 _imports.update(safe_import("user_insight", ["UserInsight"]))
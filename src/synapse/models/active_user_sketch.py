@@ -0,0 +1,35 @@
+"""Active User Sketch Models"""
+
+from sqlalchemy import Column, Date, DateTime, Index, LargeBinary, String
+from sqlalchemy.sql import func
+
+from synapse.database import Base
+
+# Escopo do sketch que agrega todos os tenants
+GLOBAL_SCOPE = "all"
+
+
+class ActiveUserSketch(Base):
+    """
+    Usuários ativos de um dia como sketch HyperLogLog (exato enquanto pequeno).
+
+    ``scope`` é ``"all"`` ou o UUID do tenant; DAU/WAU/MAU e janelas
+    arbitrárias são a mescla dos sketches diários.
+    """
+
+    __tablename__ = "active_user_sketches"
+    __table_args__ = (
+        Index("ix_active_user_sketches_scope_day", "scope", "day"),
+        {"schema": "synapscale_db", "extend_existing": True},
+    )
+
+    day = Column(Date, primary_key=True)
+    scope = Column(String(36), primary_key=True)
+    sketch = Column(LargeBinary, nullable=False)
+
+    updated_at = Column(
+        DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now()
+    )
+
+    def __str__(self):
+        return f"ActiveUserSketch({self.scope}@{self.day})"
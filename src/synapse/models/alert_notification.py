@@ -0,0 +1,50 @@
+"""Alert Notification Outbox Model"""
+
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String, Text
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+
+from synapse.database import Base
+
+
+class AlertNotification(Base):
+    """
+    Notificação de alerta pendente de entrega (outbox).
+
+    Linhas com o mesmo ``fingerprint`` (canal + destinatário) que estejam
+    pendentes são entregues juntas em um único resumo; falhas voltam para
+    ``pending`` com ``available_at`` no futuro (backoff exponencial). Em
+    ``sending``, ``available_at`` é o fim da reivindicação do processo que
+    está entregando.
+    """
+
+    __tablename__ = "alert_notification_outbox"
+    __table_args__ = (
+        Index("ix_alert_notification_outbox_due", "status", "available_at"),
+        Index("ix_alert_notification_outbox_fingerprint", "fingerprint", "status"),
+        {"schema": "synapscale_db", "extend_existing": True},
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True)
+    fingerprint = Column(String(64), nullable=False)
+    channel = Column(String(20), nullable=False)  # email, websocket, webhook
+    recipient = Column(String(500), nullable=False)
+    alert_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("synapscale_db.analytics_alerts.id", ondelete="CASCADE"),
+        nullable=True,
+    )
+    tenant_id = Column(UUID(as_uuid=True), ForeignKey("synapscale_db.tenants.id"), nullable=True)
+
+    payload = Column(JSONB, nullable=False, default=dict)  # disparo do alerta
+    config = Column(JSONB, nullable=False, default=dict)  # configuração do canal (headers etc.)
+    status = Column(String(20), nullable=False, default="pending")  # pending, sending, delivered, dead
+    attempts = Column(Integer, nullable=False, default=0)
+    last_error = Column(Text, nullable=True)
+    digest_id = Column(UUID(as_uuid=True), nullable=True)  # linhas entregues no mesmo resumo
+
+    fired_at = Column(DateTime, nullable=False)
+    available_at = Column(DateTime, nullable=False)  # pending: liberação; sending: fim da reivindicação
+    delivered_at = Column(DateTime, nullable=True)
+
+    def __str__(self):
+        return f"AlertNotification({self.channel}->{self.recipient}, {self.status})"
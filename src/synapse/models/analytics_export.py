@@ -1,6 +1,6 @@
 """Analytics Export Model"""
 
-from sqlalchemy import Column, String, DateTime, ForeignKey
+from sqlalchemy import BigInteger, Column, String, DateTime, ForeignKey, Index, Text
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -12,11 +12,14 @@ class AnalyticsExport(Base):
     """Analytics data export management"""
     
     __tablename__ = "analytics_exports"
-    __table_args__ = {"schema": "synapscale_db", "extend_existing": True}
+    __table_args__ = (
+        Index("ix_analytics_exports_status", "status"),
+        {"schema": "synapscale_db", "extend_existing": True},
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True)
     name = Column(String(255), nullable=False)
-    export_type = Column(String(50), nullable=False)  # csv, json, pdf, xlsx
+    export_type = Column(String(50), nullable=False)  # csv, json/jsonl, parquet, pdf, xlsx
     export_query = Column("query", JSONB, nullable=False)
     file_path = Column(String(500), nullable=True)
     status = Column(String(20), nullable=False, server_default="pending")
@@ -25,6 +28,12 @@ class AnalyticsExport(Base):
     completed_at = Column(DateTime(timezone=True), nullable=True)
     tenant_id = Column(UUID(as_uuid=True), ForeignKey("synapscale_db.tenants.id"), nullable=True)
     updated_at = Column(DateTime(timezone=True), nullable=True, server_default=func.current_timestamp())
+    manifest = Column(JSONB, nullable=True)  # partições, checksums e vazão por worker
+    rows_exported = Column(BigInteger, nullable=True)
+    bytes_written = Column(BigInteger, nullable=True)
+    error_message = Column(Text, nullable=True)
+    worker_id = Column(String(255), nullable=True)  # processo que coordena a exportação
+    heartbeat_at = Column(DateTime(timezone=True), nullable=True)  # último sinal de vida do dono
 
     # Relationships
     owner = relationship("User", back_populates="analytics_exports")
@@ -92,6 +101,8 @@ class AnalyticsExport(Base):
         extensions = {
             "csv": ".csv",
             "json": ".json", 
+            "jsonl": ".jsonl",
+            "parquet": ".parquet",
             "pdf": ".pdf",
             "xlsx": ".xlsx",
             "xml": ".xml"
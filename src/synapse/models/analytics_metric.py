@@ -1,6 +1,6 @@
 """Analytics Metric Model"""
 
-from sqlalchemy import Column, String, Numeric, DateTime, ForeignKey
+from sqlalchemy import Column, String, Numeric, DateTime, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -12,7 +12,16 @@ class AnalyticsMetric(Base):
     """Analytics metrics storage and tracking"""
     
     __tablename__ = "analytics_metrics"
-    __table_args__ = {"schema": "synapscale_db", "extend_existing": True}
+    __table_args__ = (
+        # Alert evaluation filters by metric and time window and aggregates the value
+        Index(
+            "ix_analytics_metrics_name_timestamp",
+            "metric_name",
+            "timestamp",
+            postgresql_include=["metric_value"],
+        ),
+        {"schema": "synapscale_db", "extend_existing": True},
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True)
     metric_name = Column(String(100), nullable=False)
@@ -23,6 +23,13 @@ class KnowledgeBase(Base):
     # Relationships
     tenant = relationship("Tenant", back_populates="knowledge_bases")
     agent_kbs = relationship("AgentKnowledgeBase", back_populates="knowledge_base")
+    chunks = relationship(
+        "KnowledgeBaseChunk",
+        back_populates="knowledge_base",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        lazy="noload",
+    )
 
     def __str__(self):
         return f"KnowledgeBase(id={self.kb_id}, title={self.title[:50]}...)"
@@ -0,0 +1,85 @@
+"""Knowledge Base Chunk Model"""
+
+import uuid
+
+from sqlalchemy import (
+    Column,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    LargeBinary,
+    String,
+    Text,
+    UniqueConstraint,
+)
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+
+from synapse.database import Base
+
+
+class KnowledgeBaseChunk(Base):
+    """Chunk indexado de uma knowledge base (texto + embedding)"""
+
+    __tablename__ = "knowledge_base_chunks"
+    __table_args__ = (
+        UniqueConstraint("kb_id", "content_hash", name="uq_kb_chunks_kb_hash"),
+        Index("ix_kb_chunks_kb_id", "kb_id"),
+        {"schema": "synapscale_db", "extend_existing": True},
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    kb_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("synapscale_db.knowledge_bases.kb_id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    section = Column(Text, nullable=False)
+    chunk_index = Column(Integer, nullable=False, default=0)
+    content = Column(Text, nullable=False)
+    content_hash = Column(String(40), nullable=False)
+    chunk_metadata = Column("metadata", JSONB, nullable=True)
+    # Vetor float32 serializado (np.ndarray.tobytes)
+    embedding = Column(LargeBinary, nullable=True)
+    embedding_model = Column(String(100), nullable=True)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    updated_at = Column(
+        DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now()
+    )
+
+    # Relationships
+    knowledge_base = relationship("KnowledgeBase", back_populates="chunks")
+
+    def __str__(self):
+        return f"KnowledgeBaseChunk(kb_id={self.kb_id}, section={self.section}, index={self.chunk_index})"
+
+    @property
+    def vector(self):
+        """Embedding como np.ndarray (ou None se ainda não indexado)"""
+        if self.embedding is None:
+            return None
+        import numpy as np  # importado no uso: o registro dos modelos não depende do numpy
+
+        return np.frombuffer(self.embedding, dtype=np.float32)
+
+    @vector.setter
+    def vector(self, value):
+        import numpy as np
+
+        self.embedding = None if value is None else np.asarray(value, dtype=np.float32).tobytes()
+
+    def to_dict(self):
+        """Converte o chunk para dicionário (sem o embedding)"""
+        return {
+            "id": str(self.id),
+            "kb_id": str(self.kb_id),
+            "section": self.section,
+            "chunk_index": self.chunk_index,
+            "content": self.content,
+            "content_hash": self.content_hash,
+            "metadata": self.chunk_metadata or {},
+            "embedding_model": self.embedding_model,
+            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
+        }
@@ -0,0 +1,82 @@
+"""Metric Anomaly Models"""
+
+from sqlalchemy import Column, DateTime, Float, ForeignKey, Index, String
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.sql import func
+
+from synapse.database import Base
+
+
+class MetricDetectorState(Base):
+    """
+    Estado dos estimadores online (EWMA, Welford, sazonal, mediana/MAD) de
+    uma série de rollups; ``last_bucket`` é o último bucket fechado incorporado.
+    """
+
+    __tablename__ = "metric_detector_states"
+    __table_args__ = {"schema": "synapscale_db", "extend_existing": True}
+
+    metric_name = Column(String(100), primary_key=True)
+    resolution = Column(String(4), primary_key=True)
+    tenant_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("synapscale_db.tenants.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    service = Column(String(50), primary_key=True)
+
+    state = Column(JSONB, nullable=False, default=dict)
+    last_bucket = Column(DateTime, nullable=False)
+    last_score = Column(Float, nullable=True)
+
+    updated_at = Column(
+        DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now()
+    )
+
+    def __str__(self):
+        return f"MetricDetectorState({self.metric_name}@{self.resolution}, last={self.last_bucket})"
+
+
+class MetricAnomaly(Base):
+    """Bucket de rollup sinalizado como anômalo quando fechou"""
+
+    __tablename__ = "metric_anomalies"
+    __table_args__ = (
+        Index("ix_metric_anomalies_bucket", "bucket_start"),
+        Index("ix_metric_anomalies_metric_bucket", "metric_name", "bucket_start"),
+        {"schema": "synapscale_db", "extend_existing": True},
+    )
+
+    metric_name = Column(String(100), primary_key=True)
+    resolution = Column(String(4), primary_key=True)
+    bucket_start = Column(DateTime, primary_key=True)
+    tenant_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("synapscale_db.tenants.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    service = Column(String(50), primary_key=True)
+
+    value = Column(Float, nullable=False)
+    expected = Column(Float, nullable=True)
+    score = Column(Float, nullable=False)
+    direction = Column(String(4), nullable=False)  # up, down
+    details = Column(JSONB, nullable=False, default=dict)  # z-scores de cada estimador
+
+    detected_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+    def __str__(self):
+        return f"MetricAnomaly({self.metric_name}@{self.bucket_start}, score={self.score:.2f})"
+
+    def to_dict(self):
+        return {
+            "metric_name": self.metric_name,
+            "service": self.service,
+            "resolution": self.resolution,
+            "bucket_start": self.bucket_start.isoformat(),
+            "value": self.value,
+            "expected": self.expected,
+            "score": self.score,
+            "direction": self.direction,
+            "details": self.details or {},
+        }
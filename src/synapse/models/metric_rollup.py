@@ -0,0 +1,65 @@
+"""Metric Rollup Models"""
+
+from sqlalchemy import BigInteger, Column, DateTime, Float, ForeignKey, Index, String
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.sql import func
+
+from synapse.database import Base
+
+
+class MetricRollup(Base):
+    """
+    Bucket pré-agregado de uma métrica (resolução 1m, 1h ou 1d).
+
+    Guarda count/sum/min/max e um sketch de quantis mesclável, permitindo
+    gráficos e percentis sem ler as linhas brutas.
+    """
+
+    __tablename__ = "metric_rollups"
+    __table_args__ = (
+        Index("ix_metric_rollups_lookup", "metric_name", "resolution", "bucket_start"),
+        {"schema": "synapscale_db", "extend_existing": True},
+    )
+
+    metric_name = Column(String(100), primary_key=True)
+    resolution = Column(String(4), primary_key=True)  # 1m, 1h, 1d
+    bucket_start = Column(DateTime, primary_key=True)
+    tenant_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("synapscale_db.tenants.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    service = Column(String(50), primary_key=True)
+
+    count = Column(BigInteger, nullable=False, default=0)
+    sum = Column(Float, nullable=False, default=0.0)
+    min = Column(Float, nullable=True)
+    max = Column(Float, nullable=True)
+    sketch = Column(JSONB, nullable=False, default=dict)
+
+    updated_at = Column(
+        DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now()
+    )
+
+    def __str__(self):
+        return (
+            f"MetricRollup({self.metric_name}@{self.resolution}, "
+            f"bucket={self.bucket_start}, count={self.count})"
+        )
+
+    @property
+    def average(self):
+        return self.sum / self.count if self.count else None
+
+
+class MetricRollupCursor(Base):
+    """Última linha bruta já incorporada aos rollups, por tabela de origem"""
+
+    __tablename__ = "metric_rollup_cursors"
+    __table_args__ = {"schema": "synapscale_db", "extend_existing": True}
+
+    source = Column(String(50), primary_key=True)
+    last_id = Column(BigInteger, nullable=False, default=0)
+    updated_at = Column(
+        DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now()
+    )
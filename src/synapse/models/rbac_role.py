@@ -69,6 +69,15 @@ class RBACRole(Base):
 
     def has_permission(self, permission_key):
         """Verifica se o role tem uma permissão específica"""
+        from sqlalchemy.orm import object_session
+
+        session = object_session(self)
+        if session is not None and self.id is not None:
+            # Bitset pré-computado do role, sem percorrer as concessões (N+1)
+            from synapse.services.authorization_service import authorization_engine
+
+            return authorization_engine.role_has_permission(session, self.id, permission_key)
+
         for rp in self.permissions:
             if rp.granted and rp.permission.key == permission_key:
                 return True
@@ -49,11 +49,16 @@ class RBACRolePermission(Base):
 
     def _evaluate_conditions(self, context):
         """Evaluate permission conditions against provided context"""
-        if not self.conditions or not context:
+        return self.evaluate_conditions(self.conditions, context)
+
+    @staticmethod
+    def evaluate_conditions(conditions, context):
+        """Evaluate a conditions mapping against provided context"""
+        if not conditions or not context:
             return True
         
         # Simple condition evaluation (can be extended)
-        for key, expected_value in self.conditions.items():
+        for key, expected_value in conditions.items():
             if key not in context:
                 return False
             
@@ -78,17 +83,9 @@ class RBACRolePermission(Base):
 
     @classmethod
     def has_permission(cls, session, role_id, permission_key, tenant_id=None, context=None):
-        """Check if role has specific permission"""
-        query = session.query(cls).join(cls.permission).filter(
-            cls.role_id == role_id,
-            cls.permission.has(key=permission_key)
+        """Check if role has specific permission (precomputed role bitset, no query per check)"""
+        from synapse.services.authorization_service import authorization_engine
+
+        return authorization_engine.role_has_permission(
+            session, role_id, permission_key, tenant_id=tenant_id, context=context
         )
-        
-        if tenant_id:
-            query = query.filter(cls.tenant_id == tenant_id)
-        
-        role_permission = query.first()
-        if not role_permission:
-            return False
-        
-        return role_permission.is_granted(context)
@@ -1,6 +1,6 @@
 """Report Execution Model"""
 
-from sqlalchemy import Column, String, Text, Integer, DateTime, ForeignKey, JSON
+from sqlalchemy import Column, String, Text, Integer, BigInteger, Float, DateTime, ForeignKey, Index, JSON
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -12,21 +12,28 @@ class ReportExecution(Base):
     """Report execution tracking and results"""
     
     __tablename__ = "report_executions"
-    __table_args__ = {"schema": "synapscale_db", "extend_existing": True}
+    __table_args__ = (
+        Index("ix_report_executions_report_started", "report_id", "started_at"),
+        {"schema": "synapscale_db", "extend_existing": True},
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True)
     report_id = Column(UUID(as_uuid=True), ForeignKey("synapscale_db.analytics_reports.id"), nullable=False)
     user_id = Column(UUID(as_uuid=True), ForeignKey("synapscale_db.users.id"), nullable=True)
     execution_type = Column(String(20), nullable=False)  # manual, scheduled, api
     parameters = Column(JSON, nullable=True)
-    status = Column(String(20), nullable=False)  # running, completed, failed
-    result_data = Column(JSON, nullable=True)
+    status = Column(String(20), nullable=False)  # queued, running, completed, failed
+    result_data = Column(JSON, nullable=True)  # manifesto das páginas do spool
+    result_format = Column(String(20), nullable=True)  # jsonl, csv, columnar
+    progress = Column(Float, nullable=True)  # 0-100
     error_message = Column(Text, nullable=True)
     execution_time_ms = Column(Integer, nullable=True)
-    rows_processed = Column(Integer, nullable=True)
-    data_size_bytes = Column(Integer, nullable=True)
+    rows_processed = Column(BigInteger, nullable=True)
+    data_size_bytes = Column(BigInteger, nullable=True)
     started_at = Column(DateTime(timezone=True), nullable=False)
     completed_at = Column(DateTime(timezone=True), nullable=True)
+    worker_id = Column(String(255), nullable=True)  # processo que executa o job
+    heartbeat_at = Column(DateTime(timezone=True), nullable=True)  # último sinal de vida do dono
     tenant_id = Column(UUID(as_uuid=True), ForeignKey("synapscale_db.tenants.id"), nullable=True)
     created_at = Column(DateTime(timezone=True), nullable=True, server_default=func.current_timestamp())
     updated_at = Column(DateTime(timezone=True), nullable=True, server_default=func.current_timestamp())
@@ -49,6 +56,11 @@ class ReportExecution(Base):
         """Check if execution is still running"""
         return self.status == "running"
 
+    @property
+    def is_pending(self):
+        """Check if execution is queued or running"""
+        return self.status in ("queued", "running")
+
     @property
     def is_failed(self):
         """Check if execution failed"""
@@ -0,0 +1,58 @@
+"""Workflow Execution Daily Stat Model"""
+
+from sqlalchemy import BigInteger, Column, Date, DateTime, ForeignKey, Index, Integer, String
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+
+from synapse.database import Base
+
+
+class WorkflowExecutionDailyStat(Base):
+    """
+    Rollup diário de execuções finalizadas por usuário/workflow/status.
+
+    Mantido incrementalmente quando uma execução atinge um estado terminal,
+    permitindo que as estatísticas sejam calculadas sem varrer workflow_executions.
+    """
+
+    __tablename__ = "workflow_execution_daily_stats"
+    __table_args__ = (
+        Index("ix_wf_exec_daily_stats_user_day", "user_id", "day"),
+        {"schema": "synapscale_db", "extend_existing": True},
+    )
+
+    user_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("synapscale_db.users.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    workflow_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("synapscale_db.workflows.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    day = Column(Date, primary_key=True)
+    status = Column(String(20), primary_key=True)
+    tenant_id = Column(UUID(as_uuid=True), ForeignKey("synapscale_db.tenants.id"), nullable=True)
+
+    execution_count = Column(Integer, nullable=False, default=0)
+    duration_sum = Column(BigInteger, nullable=False, default=0)  # segundos
+    duration_count = Column(Integer, nullable=False, default=0)
+    nodes_completed_sum = Column(BigInteger, nullable=False, default=0)
+
+    updated_at = Column(
+        DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now()
+    )
+
+    def __str__(self):
+        return (
+            f"WorkflowExecutionDailyStat(user_id={self.user_id}, workflow_id={self.workflow_id}, "
+            f"day={self.day}, status={self.status}, count={self.execution_count})"
+        )
+
+    @property
+    def average_duration(self):
+        """Duração média em segundos (None se nenhuma execução tiver duração)"""
+        if not self.duration_count:
+            return None
+        return self.duration_sum / self.duration_count
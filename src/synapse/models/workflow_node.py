@@ -23,7 +23,7 @@ class WorkflowNode(Base):
     configuration = Column(JSONB, nullable=True)
     created_at = Column(DateTime(timezone=True), nullable=True, server_default=func.now())
     tenant_id = Column(UUID(as_uuid=True), ForeignKey("synapscale_db.tenants.id"), nullable=True)
-    updated_at = Column(DateTime(timezone=True), nullable=True, server_default=func.current_timestamp())
+    updated_at = Column(DateTime(timezone=True), nullable=True, server_default=func.current_timestamp(), onupdate=func.current_timestamp())
 
     # Relationships
     workflow = relationship("Workflow", back_populates="workflow_nodes")
@@ -1,1694 +1,1613 @@
 """
 Synapse schemas module.
-"""
-
-# Agent
-from .agent import (
-    AgentBase,
-    AgentCreate,
-    AgentEnvironment,
-    AgentListResponse,
-    AgentResponse,
-    AgentScope,
-    AgentStatus,
-    AgentUpdate,
-    TriggerType,
-)
-
-# Agent Acl
-from .agent_acl import (
-    AgentACLBase,
-    AgentACLBulkUpdate,
-    AgentACLCreate,
-    AgentACLListResponse,
-    AgentACLResponse,
-    AgentACLUpdate,
-)
-
-# Agent Configuration
-from .agent_configuration import (
-    AgentConfigurationBase,
-    AgentConfigurationClone,
-    AgentConfigurationComparison,
-    AgentConfigurationCreate,
-    AgentConfigurationExport,
-    AgentConfigurationHistory,
-    AgentConfigurationList,
-    AgentConfigurationResponse,
-    AgentConfigurationStatistics,
-    AgentConfigurationTemplate,
-    AgentConfigurationUpdate,
-    AgentConfigurationValidation,
-)
-
-# Agent Error Log
-from .agent_error_log import (
-    AgentErrorLogBase,
-    AgentErrorLogCreate,
-    AgentErrorLogRead,
-    AgentErrorLogStats,
-    AgentErrorLogSummary,
-    AgentErrorLogTimeline,
-    AgentErrorLogUpdate,
-)
-
-# Agent Hierarchy
-from .agent_hierarchy import (
-    AgentHierarchyBase,
-    AgentHierarchyCreate,
-    AgentHierarchyListResponse,
-    AgentHierarchyResponse,
-    AgentHierarchyTree,
-    AgentParentUpdate,
-)
-
-# Agent Knowledge Base
-from .agent_knowledge_base import (
-    AgentKnowledgeBaseBase,
-    AgentKnowledgeBaseBulkOperation,
-    AgentKnowledgeBaseConfiguration,
-    AgentKnowledgeBaseCreate,
-    AgentKnowledgeBaseList,
-    AgentKnowledgeBaseRecommendation,
-    AgentKnowledgeBaseResponse,
-    AgentKnowledgeBaseSearch,
-    AgentKnowledgeBaseSearchResponse,
-    AgentKnowledgeBaseSearchResult,
-    AgentKnowledgeBaseStatistics,
-    AgentKnowledgeBaseUpdate,
-    AgentKnowledgeBaseUsage,
-)
-
-# Agent Model
-from .agent_model import (
-    AgentModelBase,
-    AgentModelCreate,
-    AgentModelList,
-    AgentModelResponse,
-    AgentModelUpdate,
-    AgentModelWithLLM,
-)
-
-# Agent Quota
-from .agent_quota import (
-    AgentQuotaBase,
-    AgentQuotaCreate,
-    AgentQuotaCreateDaily,
-    AgentQuotaCreateHourly,
-    AgentQuotaCreateMonthly,
-    AgentQuotaListResponse,
-    AgentQuotaRead,
-    AgentQuotaResponse,
-    AgentQuotaUpdate,
-    AgentQuotaUsageCheck,
-)
-
-# Agent Status
-from .agent_status import (
-    AgentStatusBase,
-    AgentStatusCreate,
-    AgentStatusListResponse,
-    AgentStatusResponse,
-    AgentStatusUpdate,
-)
-
-# Agent Tool
-from .agent_tool import (
-    AgentToolBase,
-    AgentToolBatch,
-    AgentToolBatchResponse,
-    AgentToolCreate,
-    AgentToolInDB,
-    AgentToolListResponse,
-    AgentToolResponse,
-    AgentToolStatistics,
-    AgentToolUpdate,
-)
-
-# Agent Trigger
-from .agent_trigger import (
-    AgentTriggerBase,
-    AgentTriggerBulkOperation,
-    AgentTriggerCreate,
-    AgentTriggerExecute,
-    AgentTriggerExecution,
-    AgentTriggerList,
-    AgentTriggerRead,
-    AgentTriggerSchedule,
-    AgentTriggerStats,
-    AgentTriggerUpdate,
-)
-
-# Agent Type
-from .agent_type import (
-    AgentTypeBase,
-    AgentTypeCreate,
-    AgentTypeListResponse,
-    AgentTypeResponse,
-    AgentTypeUpdate,
-)
-
-# Agent Usage Metric
-from .agent_usage_metric import (
-    AgentUsageMetricBase,
-    AgentUsageMetricCreate,
-    AgentUsageMetricListResponse,
-    AgentUsageMetricRead,
-    AgentUsageMetricResponse,
-    AgentUsageMetricUpdate,
-)
-
-# Analytics
-from .analytics import (
-    ABTestConfig,
-    ABTestResult,
-    AlertCreate,
-    AlertResponse,
-    AlertRule,
-    AlertUpdate,
-    AnalyticsOverview,
-    AnalyticsQuery,
-    BusinessMetricResponse,
-    CohortAnalysis,
-    CohortResult,
-    DashboardBase,
-    DashboardCreate,
-    DashboardData,
-    DashboardLayout,
-    DashboardResponse,
-    DashboardUpdate,
-    EventBase,
-    EventCreate,
-    EventResponse,
-    EventType,
-    ExportRequest,
-    ExportResponse,
-    FunnelAnalysis,
-    FunnelResult,
-    FunnelStep,
-    InsightRequest,
-    InsightResponse,
-    InsightType,
-    MetricBase,
-    MetricCreate,
-    MetricType,
-    QueryConfig,
-    QueryResponse,
-    RealTimeMetric,
-    RealTimeStats,
-    ReportBase,
-    ReportCreate,
-    ReportExecutionResponse,
-    ReportFormat,
-    ReportResponse,
-    ReportType,
-    ReportUpdate,
-    ScheduleConfig,
-    SystemInsights,
-    SystemPerformanceMetricResponse,
-    UserBehaviorMetricResponse,
-    VisualizationConfig,
-    WidgetConfig,
-)
-
-# Analytics Alert
-from .analytics_alert import (
-    AnalyticsAlertBase,
-    AnalyticsAlertCreate,
-    AnalyticsAlertListResponse,
-    AnalyticsAlertResponse,
-    AnalyticsAlertUpdate,
-    TestAlertRequest,
-    TestAlertResponse,
-)
-
-# Analytics Dashboard
-from .analytics_dashboard import (
-    AnalyticsDashboardBase,
-    AnalyticsDashboardCreate,
-    AnalyticsDashboardInDB,
-    AnalyticsDashboardListResponse,
-    AnalyticsDashboardResponse,
-    AnalyticsDashboardUpdate,
-    ChartType,
-    DashboardCloneRequest,
-    DashboardExportRequest,
-    DashboardFilter,
-    DashboardLayout,
-    DashboardShareRequest,
-    DashboardStats,
-    DashboardStatus,
-    DashboardWidget,
-    DashboardWithStats,
-    WidgetType,
-)
-
-# Analytics Event
-from .analytics_event import (
-    AnalyticsEventAggregation,
-    AnalyticsEventAggregationResult,
-    AnalyticsEventBase,
-    AnalyticsEventBatch,
-    AnalyticsEventCreate,
-    AnalyticsEventExport,
-    AnalyticsEventFilter,
-    AnalyticsEventFunnel,
-    AnalyticsEventFunnelResult,
-    AnalyticsEventList,
-    AnalyticsEventResponse,
-    AnalyticsEventStatistics,
-    AnalyticsEventUpdate,
-)
-
-# Analytics Export
-from .analytics_export import (
-    AnalyticsExportBase,
-    AnalyticsExportCreate,
-    AnalyticsExportListResponse,
-    AnalyticsExportResponse,
-    AnalyticsExportUpdate,
-    ExportStatus,
-    ExportType,
-)
-
-# Analytics Metric
-from .analytics_metric import (
-    AnalyticsMetricAggregation,
-    AnalyticsMetricAggregationResult,
-    AnalyticsMetricAlert,
-    AnalyticsMetricAlertTrigger,
-    AnalyticsMetricBase,
-    AnalyticsMetricBatch,
-    AnalyticsMetricCreate,
-    AnalyticsMetricExport,
-    AnalyticsMetricFilter,
-    AnalyticsMetricList,
-    AnalyticsMetricResponse,
-    AnalyticsMetricStatistics,
-    AnalyticsMetricTimeSeries,
-    AnalyticsMetricTimeSeriesResult,
-    AnalyticsMetricUpdate,
-)
-
-# Analytics Report
-from .analytics_report import (
-    AnalyticsReportBase,
-    AnalyticsReportCreate,
-    AnalyticsReportExecution,
-    AnalyticsReportExport,
-    AnalyticsReportList,
-    AnalyticsReportResponse,
-    AnalyticsReportResult,
-    AnalyticsReportSchedule,
-    AnalyticsReportStatistics,
-    AnalyticsReportTemplate,
-    AnalyticsReportUpdate,
-)
-
-# Audit
-from .audit import (
-    APIAuditEvent,
-    AuditCategory,
-    AuditExportRequest,
-    AuditExportResult,
-    AuditLogBase,
-    AuditLogCreate,
-    AuditLogDetailed,
-    AuditLogListResponse,
-    AuditLogResponse,
-    AuditLogSearchRequest,
-    AuditLogWithUser,
-    AuditOperation,
-    AuditReport,
-    AuditReportRequest,
-    AuditSeverity,
-    ComplianceAuditCheck,
-    DataRetentionCheck,
-    SecurityAuditEvent,
-    UserAuditEvent,
-    WorkspaceAuditEvent,
-)
-
-# Audit Log
-from .audit_log import (
-    AuditLogAlert,
-    AuditLogBase,
-    AuditLogCreate,
-    AuditLogExport,
-    AuditLogFilter,
-    AuditLogList,
-    AuditLogResponse,
-    AuditLogStatistics,
-    AuditLogSummary,
-    AuditLogUpdate,
-)
-
-# Auth
-from .auth import (
-    AuthProvider,
-    EmailVerificationRequest,
-    EmailVerificationTokenResponse,
-    PasswordChangeRequest,
-    PasswordResetConfirm,
-    PasswordResetRequest,
-    PasswordResetTokenResponse,
-    RefreshTokenRequest,
-    RefreshTokenResponse,
-    SessionInfo,
-    Token,
-    TokenResponse,
-    TwoFactorDisable,
-    TwoFactorSetup,
-    TwoFactorVerify,
-    UserBase,
-    UserCreate,
-    UserListResponse,
-    UserLogin,
-    UserPreferences,
-    UserProfile,
-    UserResponse,
-    UserSearchRequest,
-    UserStats,
-    UserStatus,
-    UserTenantRoleResponse,
-    UserUpdate,
-)
-
-# Base
-from .base import (
-    ErrorDetail,
-    ErrorResponse,
-    PaginatedResponse,
-    PaginationParams,
-)
-
-# Billing Event
-from .billing_event import (
-    BillingEventBase,
-    BillingEventCreate,
-    BillingEventListResponse,
-    BillingEventResponse,
-    BillingEventStatus,
-    BillingEventType,
-    BillingEventUpdate,
-)
-
-# Business Metric
-from .business_metric import (
-    BusinessMetricBase,
-    BusinessMetricCreate,
-    BusinessMetricListResponse,
-    BusinessMetricResponse,
-    PeriodType,
-)
-
-# Campaign
-from .campaign import (
-    CampaignBase,
-    CampaignCreate,
-    CampaignList,
-    CampaignResponse,
-    CampaignStatus,
-    CampaignType,
-    CampaignUpdate,
-)
-
-# Campaign Contact
-from .campaign_contact import (
-    CampaignContactBase,
-    CampaignContactCreate,
-    CampaignContactList,
-    CampaignContactResponse,
-    CampaignContactStatus,
-    CampaignContactUpdate,
-)
-
-# Component Version
-from .component_version import (
-    ComponentVersionBase,
-    ComponentVersionCreate,
-    ComponentVersionListResponse,
-    ComponentVersionResponse,
-    ComponentVersionUpdate,
-    VersionStatus,
-)
-
-# Contact
-from .contact import (
-    ContactBase,
-    ContactCreate,
-    ContactInDB,
-    ContactListResponse,
-    ContactResponse,
-    ContactUpdate,
-)
-
-# Contact Event
-from .contact_event import (
-    ContactEventBase,
-    ContactEventCreate,
-    ContactEventList,
-    ContactEventResponse,
-    ContactEventType,
-    ContactEventUpdate,
-)
-
-# Contact Interaction
-from .contact_interaction import (
-    ContactInteractionBase,
-    ContactInteractionCreate,
-    ContactInteractionInDB,
-    ContactInteractionListResponse,
-    ContactInteractionResponse,
-    ContactInteractionSummary,
-    ContactInteractionUpdate,
-    InteractionDirection,
-    InteractionStatus,
-    InteractionType,
-)
-
-# Contact List
-from .contact_list import (
-    ContactListBase,
-    ContactListCreate,
-    ContactListInDB,
-    ContactListListResponse,
-    ContactListResponse,
-    ContactListUpdate,
-    ContactListWithStatsResponse,
-)
-
-# Contact List Membership
-from .contact_list_membership import (
-    ContactListMembershipBase,
-    ContactListMembershipCreate,
-    ContactListMembershipSchema,
-    ContactListMembershipUpdate,
-)
-
-# Contact Note
-from .contact_note import (
-    ContactNoteBase,
-    ContactNoteCreate,
-    ContactNoteListResponse,
-    ContactNoteResponse,
-    ContactNoteUpdate,
-    NoteType,
-)
-
-# Contact Source
-from .contact_source import (
-    ContactSourceBase,
-    ContactSourceCreate,
-    ContactSourceListResponse,
-    ContactSourceResponse,
-    ContactSourceUpdate,
-    IntegrationType,
-    TestConnectionRequest,
-    TestConnectionResponse,
-)
-
-# Contact Tag
-from .contact_tag import (
-    AssignTagsResponse,
-    AssignTagsToContacts,
-    ContactTagBase,
-    ContactTagCreate,
-    ContactTagListResponse,
-    ContactTagResponse,
-    ContactTagUpdate,
-)
-
-# Conversation
-from .conversation import (
-    ConversationBase,
-    ConversationCreate,
-    ConversationListResponse,
-    ConversationResponse,
-    ConversationTitleUpdate,
-    MessageBase,
-    MessageCreate,
-    MessageListResponse,
-    MessageResponse,
-)
-
-# Conversation Llm
-from .conversation_llm import (
-    ConversationLLMBase,
-    ConversationLLMComparison,
-    ConversationLLMCreate,
-    ConversationLLMList,
-    ConversationLLMOptimization,
-    ConversationLLMOptimizationResult,
-    ConversationLLMRecommendation,
-    ConversationLLMResponse,
-    ConversationLLMStatistics,
-    ConversationLLMSwitch,
-    ConversationLLMSwitchResult,
-    ConversationLLMUpdate,
-    ConversationLLMUsage,
-)
-
-# Conversion Journey
-from .conversion_journey import (
-    ConversionJourneyBase,
-    ConversionJourneyCreate,
-    ConversionJourneyRead,
-    ConversionJourneyUpdate,
-)
-
-# Coupon
-from .coupon import (
-    CouponBase,
-    CouponCreate,
-    CouponRead,
-    CouponStats,
-    CouponUpdate,
-    CouponUsage,
-    CouponValidation,
-)
-
-# Custom Report
-from .custom_report import (
-    CustomReportBase,
-    CustomReportClone,
-    CustomReportCreate,
-    CustomReportExecution,
-    CustomReportExecutionResponse,
-    CustomReportExport,
-    CustomReportFilter,
-    CustomReportInDB,
-    CustomReportListResponse,
-    CustomReportResponse,
-    CustomReportSchedule,
-    CustomReportShare,
-    CustomReportStatistics,
-    CustomReportUpdate,
-    QueryConfig,
-    ReportCategory,
-    ReportStatus,
-    ScheduleConfig,
-    ScheduleFrequency,
-    VisualizationConfig,
-    VisualizationType,
-)
-
-# Email Verification Token
-from .email_verification_token import (
-    EmailVerificationConfirm,
-    EmailVerificationRequest,
-    EmailVerificationResponse,
-    EmailVerificationTokenBase,
-    EmailVerificationTokenCreate,
-    EmailVerificationTokenInDB,
-    EmailVerificationTokenResponse,
-    EmailVerificationTokenUpdate,
-    ResendVerificationRequest,
-)
-
-# Error
-from .error import (
-    ErrorDetail,
-    ErrorResponse,
-)
-
-# Event Type
-from .event_type import (
-    EventTypeBase,
-    EventTypeCreate,
-    EventTypeList,
-    EventTypeRead,
-    EventTypeStats,
-    EventTypeUpdate,
-    EventTypeValidation,
-)
-
-# Execution Status
-from .execution_status import (
-    ExecutionStatusBase,
-    ExecutionStatusCreate,
-    ExecutionStatusRead,
-    ExecutionStatusSummary,
-    ExecutionStatusUpdate,
-)
-
-# Feature
-from .feature import (
-    FeatureCreate,
-    FeatureListResponse,
-    FeatureResponse,
-    FeatureUpdate,
-    PlanFeatureCreate,
-    PlanFeatureListResponse,
-    PlanFeatureResponse,
-    TenantFeatureCreate,
-    TenantFeatureListResponse,
-    TenantFeatureResponse,
-    WorkspaceFeatureCreate,
-    WorkspaceFeatureListResponse,
-    WorkspaceFeatureResponse,
-)
-
-# File
-from .file import (
-    FileBase,
-    FileCreate,
-    FileListResponse,
-    FileResponse,
-    FileStatus,
-    FileUpdate,
-    ScanStatus,
-)
-
-# Invoice
-from .invoice import (
-    InvoiceBase,
-    InvoiceCreate,
-    InvoiceExport,
-    InvoiceItem,
-    InvoiceItemType,
-    InvoiceListResponse,
-    InvoicePayment,
-    InvoicePaymentResult,
-    InvoicePaymentStatus,
-    InvoicePreview,
-    InvoiceReminder,
-    InvoiceReminderType,
-    InvoiceReport,
-    InvoiceResponse,
-    InvoiceStatistics,
-    InvoiceStatus,
-    InvoiceUpdate,
-)
-
-# Knowledge Base
-from .knowledge_base import (
-    KnowledgeBaseBase,
-    KnowledgeBaseCreate,
-    KnowledgeBaseDocument,
-    KnowledgeBaseExport,
-    KnowledgeBaseIndexing,
-    KnowledgeBaseIndexingStatus,
-    KnowledgeBaseList,
-    KnowledgeBaseResponse,
-    KnowledgeBaseSearch,
-    KnowledgeBaseSearchResponse,
-    KnowledgeBaseSearchResult,
-    KnowledgeBaseStatistics,
-    KnowledgeBaseUpdate,
-)
-
-# Llm
-from .llm import (
-    LLMCapability,
-    LLMConversationCreate,
-    LLMConversationListResponse,
-    LLMConversationResponse,
-    LLMCreate,
-    LLMListResponse,
-    LLMMessageCreate,
-    LLMMessageListResponse,
-    LLMMessageResponse,
-    LLMProvider,
-    LLMResponse,
-    LLMUpdate,
-)
-
-# Marketplace
-from .marketplace import (
-    BulkComponentOperation,
-    BulkOperationResponse,
-    ComponentBase,
-    ComponentCategory,
-    ComponentCreate,
-    ComponentModerationResponse,
-    ComponentResponse,
-    ComponentSearch,
-    ComponentSearchResponse,
-    ComponentStatus,
-    ComponentType,
-    ComponentUpdate,
-    ComponentVersionResponse,
-    DownloadResponse,
-    LicenseType,
-    MarketplaceStats,
-    ModerationAction,
-    PurchaseCreate,
-    PurchaseResponse,
-    RatingBase,
-    RatingCreate,
-    RatingResponse,
-    RatingStats,
-)
-
-# Message
-from .message import (
-    MessageBase,
-    MessageCreate,
-    MessageList,
-    MessageResponse,
-    MessageStatistics,
-    MessageThread,
-    MessageUpdate,
-    MessageWithReplies,
-)
-
-# Message Feedback
-from .message_feedback import (
-    FeedbackCategory,
-    MessageFeedbackBase,
-    MessageFeedbackBatch,
-    MessageFeedbackCreate,
-    MessageFeedbackExport,
-    MessageFeedbackInDB,
-    MessageFeedbackListResponse,
-    MessageFeedbackResponse,
-    MessageFeedbackStatistics,
-    MessageFeedbackSummary,
-    MessageFeedbackUpdate,
-    RatingType,
-)
 
-# Metric Type
-from .metric_type import (
-    MetricTypeBase,
-    MetricTypeCreate,
-    MetricTypeRead,
-    MetricTypeSummary,
-    MetricTypeUpdate,
-)
-
-# Models - removido, endpoint era vazio e sem propósito
-
-# Node
-from .node import (
-    NodeBase,
-    NodeCreate,
-    NodeExecutionStatsResponse,
-    NodeListResponse,
-    NodeResponse,
-    NodeStatus,
-    NodeType,
-    NodeUpdate,
-)
-
-# Node Category
-from .node_category import (
-    NodeCategoryBase,
-    NodeCategoryBreadcrumb,
-    NodeCategoryCreate,
-    NodeCategoryDelete,
-    NodeCategoryListResponse,
-    NodeCategoryPopular,
-    NodeCategoryReorder,
-    NodeCategoryResponse,
-    NodeCategoryStats,
-    NodeCategoryTree,
-    NodeCategoryUpdate,
-)
-
-# Node Execution
-from .node_execution import (
-    NodeExecutionBase,
-    NodeExecutionCancel,
-    NodeExecutionCancelResult,
-    NodeExecutionCreate,
-    NodeExecutionExport,
-    NodeExecutionList,
-    NodeExecutionLog,
-    NodeExecutionMonitoring,
-    NodeExecutionResponse,
-    NodeExecutionRetry,
-    NodeExecutionRetryResult,
-    NodeExecutionStatistics,
-    NodeExecutionTrigger,
-    NodeExecutionTriggerResult,
-    NodeExecutionUpdate,
-)
-
-# Node Execution Status
-from .node_execution_status import (
-    NodeExecutionStatusBase,
-    NodeExecutionStatusCreate,
-    NodeExecutionStatusFilter,
-    NodeExecutionStatusFlow,
-    NodeExecutionStatusHealth,
-    NodeExecutionStatusList,
-    NodeExecutionStatusResponse,
-    NodeExecutionStatusStatistics,
-    NodeExecutionStatusTransition,
-    NodeExecutionStatusUpdate,
-    NodeExecutionStatusValidation,
-    NodeExecutionStatusValidationResult,
-)
-
-# Node Rating
-from .node_rating import (
-    NodeRatingBase,
-    NodeRatingCreate,
-    NodeRatingListResponse,
-    NodeRatingResponse,
-    NodeRatingSummary,
-    NodeRatingTrend,
-    NodeRatingUpdate,
-    RatingValue,
-)
-
-# Node Status
-from .node_status import (
-    NodeStatusBase,
-    NodeStatusCreate,
-    NodeStatusListResponse,
-    NodeStatusName,
-    NodeStatusResponse,
-    NodeStatusUpdate,
-)
-
-# Node Template
-from .node_template import (
-    NodeTemplateBase,
-    NodeTemplateCreate,
-    NodeTemplateListResponse,
-    NodeTemplateResponse,
-    NodeTemplateUpdate,
-)
-
-# Node Type
-from .node_type import (
-    NodeCategoryType,
-    NodeInputOutputCardinality,
-    NodeTypeBase,
-    NodeTypeCreate,
-    NodeTypeListResponse,
-    NodeTypeResponse,
-    NodeTypeUpdate,
-)
-
-# Password Reset Token
-from .password_reset_token import (
-    PasswordResetConfirm,
-    PasswordResetRequest,
-    PasswordResetResponse,
-    PasswordResetTokenBase,
-    PasswordResetTokenCreate,
-    PasswordResetTokenInDB,
-    PasswordResetTokenResponse,
-    PasswordResetTokenUpdate,
-)
-
-# Payment
-from .payment import (
-    InvoiceCreate,
-    InvoiceListResponse,
-    InvoiceResponse,
-    InvoiceUpdate,
-    PaginatedResponse,
-    PaymentCustomerCreate,
-    PaymentCustomerResponse,
-    PaymentMethodCreate,
-    PaymentMethodListResponse,
-    PaymentMethodResponse,
-    PaymentMethodUpdate,
-    PaymentProviderCreate,
-    PaymentProviderResponse,
-)
-
-# Payment Customer
-from .payment_customer import (
-    PaymentCustomerActivateDeactivate,
-    PaymentCustomerBase,
-    PaymentCustomerCreate,
-    PaymentCustomerCreateSimple,
-    PaymentCustomerListResponse,
-    PaymentCustomerRead,
-    PaymentCustomerResponse,
-    PaymentCustomerSearch,
-    PaymentCustomerSummary,
-    PaymentCustomerUpdate,
-    PaymentCustomerUpdateData,
-)
-
-# Payment Method
-from .payment_method import (
-    PaymentMethodBase,
-    PaymentMethodCharge,
-    PaymentMethodChargeResult,
-    PaymentMethodCreate,
-    PaymentMethodExport,
-    PaymentMethodHistory,
-    PaymentMethodList,
-    PaymentMethodResponse,
-    PaymentMethodSecurity,
-    PaymentMethodStatistics,
-    PaymentMethodToken,
-    PaymentMethodTokenResult,
-    PaymentMethodUpdate,
-    PaymentMethodValidation,
-)
-
-# Payment Provider
-from .payment_provider import (
-    PaymentProviderBase,
-    PaymentProviderCreate,
-    PaymentProviderHealth,
-    PaymentProviderList,
-    PaymentProviderResponse,
-    PaymentProviderUpdate,
-)
-
-# Plan
-from .plan import (
-    PlanBase,
-    PlanComparison,
-    PlanCreate,
-    PlanListResponse,
-    PlanMigration,
-    PlanMigrationType,
-    PlanPeriod,
-    PlanPricing,
-    PlanRecommendation,
-    PlanResponse,
-    PlanStatistics,
-    PlanStatus,
-    PlanUpdate,
-    PlanUsage,
-)
-
-# Plan Entitlement
-from .plan_entitlement import (
-    PlanEntitlementBase,
-    PlanEntitlementBulkCreate,
-    PlanEntitlementBulkUpdate,
-    PlanEntitlementCreate,
-    PlanEntitlementRead,
-    PlanEntitlementSummary,
-    PlanEntitlementUpdate,
-    PlanEntitlementWithFeature,
-)
-
-# Plan Feature
-from .plan_feature import (
-    PlanFeatureAudit,
-    PlanFeatureBase,
-    PlanFeatureBulkOperation,
-    PlanFeatureComparison,
-    PlanFeatureCreate,
-    PlanFeatureList,
-    PlanFeatureMatrix,
-    PlanFeatureResponse,
-    PlanFeatureStatistics,
-    PlanFeatureTemplate,
-    PlanFeatureUpdate,
-    PlanFeatureUsage,
-    PlanFeatureValidation,
-)
-
-# Plan Provider Mapping
-from .plan_provider_mapping import (
-    PlanProviderMappingBase,
-    PlanProviderMappingCreate,
-    PlanProviderMappingRead,
-    PlanProviderMappingUpdate,
-)
-
-# Project Collaborator
-from .project_collaborator import (
-    ActivityStatus,
-    CursorPosition,
-    PermissionLevel,
-    ProjectCollaboratorActivity,
-    ProjectCollaboratorBase,
-    ProjectCollaboratorBatch,
-    ProjectCollaboratorCreate,
-    ProjectCollaboratorExport,
-    ProjectCollaboratorFilter,
-    ProjectCollaboratorInDB,
-    ProjectCollaboratorInvite,
-    ProjectCollaboratorInviteResponse,
-    ProjectCollaboratorListResponse,
-    ProjectCollaboratorPermissionUpdate,
-    ProjectCollaboratorPresence,
-    ProjectCollaboratorResponse,
-    ProjectCollaboratorSession,
-    ProjectCollaboratorStatistics,
-    ProjectCollaboratorUpdate,
-)
-
-# Project Comment
-from .project_comment import (
-    CommentContentType,
-    CommentStatus,
-    ProjectCommentBase,
-    ProjectCommentBatch,
-    ProjectCommentCreate,
-    ProjectCommentExport,
-    ProjectCommentFilter,
-    ProjectCommentInDB,
-    ProjectCommentListResponse,
-    ProjectCommentMention,
-    ProjectCommentReaction,
-    ProjectCommentResolve,
-    ProjectCommentResolveResponse,
-    ProjectCommentResponse,
-    ProjectCommentStatistics,
-    ProjectCommentThread,
-    ProjectCommentUpdate,
-)
-
-# Project Version
-from .project_version import (
-    ProjectVersionBase,
-    ProjectVersionBranch,
-    ProjectVersionComparison,
-    ProjectVersionCreate,
-    ProjectVersionInDB,
-    ProjectVersionListResponse,
-    ProjectVersionMerge,
-    ProjectVersionResponse,
-    ProjectVersionRestore,
-    ProjectVersionRestoreResponse,
-    ProjectVersionStatistics,
-    ProjectVersionTag,
-    ProjectVersionUpdate,
-)
-
-# Rbac
-from .rbac import (
-    BulkRolePermissionCreate,
-    BulkRolePermissionResult,
-    PaginatedResponse,
-    PermissionAction,
-    PermissionBase,
-    PermissionCategory,
-    PermissionCreate,
-    PermissionListResponse,
-    PermissionPreset,
-    PermissionResource,
-    PermissionResponse,
-    PermissionSearchRequest,
-    PermissionUpdate,
-    PermissionWithRoles,
-    RBACPermissionCreate,
-    RBACPermissionListResponse,
-    RBACPermissionResponse,
-    RBACRoleCreate,
-    RBACRoleListResponse,
-    RBACRoleResponse,
-    RBACRoleUpdate,
-    RoleBase,
-    RoleCreate,
-    RoleListResponse,
-    RolePermissionBase,
-    RolePermissionCreate,
-    RolePermissionResponse,
-    RolePermissionUpdate,
-    RoleResponse,
-    RoleSearchRequest,
-    RoleTemplate,
-    RoleUpdate,
-    RoleWithPermissions,
-    UserPermissionCheck,
-    UserPermissionResult,
-    UserTenantRoleCreate,
-    UserTenantRoleResponse,
-)
-
-# Rbac Permission
-from .rbac_permission import (
-    RBACPermissionBase,
-    RBACPermissionCheck,
-    RBACPermissionCheckResult,
-    RBACPermissionCreate,
-    RBACPermissionGrant,
-    RBACPermissionList,
-    RBACPermissionMatrix,
-    RBACPermissionResponse,
-    RBACPermissionStatistics,
-    RBACPermissionUpdate,
-    RBACPermissionsByCategory,
-)
-
-# Rbac Role
-from .rbac_role import (
-    RBACRoleAssignment,
-    RBACRoleBase,
-    RBACRoleCreate,
-    RBACRoleHierarchy,
-    RBACRoleList,
-    RBACRolePermissionAssignment,
-    RBACRoleResponse,
-    RBACRoleStatistics,
-    RBACRoleUpdate,
-    RBACRoleWithPermissions,
-)
-
-# Rbac Role Permission
-from .rbac_role_permission import (
-    RBACRolePermissionBase,
-    RBACRolePermissionCreate,
-    RBACRolePermissionListResponse,
-    RBACRolePermissionResponse,
-    RBACRolePermissionUpdate,
-)
-
-# Refresh Token
-from .refresh_token import (
-    RefreshTokenAlert,
-    RefreshTokenBase,
-    RefreshTokenCleanup,
-    RefreshTokenCleanupResult,
-    RefreshTokenCreate,
-    RefreshTokenList,
-    RefreshTokenResponse,
-    RefreshTokenRevoke,
-    RefreshTokenRevokeResult,
-    RefreshTokenSecurity,
-    RefreshTokenStatistics,
-    RefreshTokenUpdate,
-    RefreshTokenUse,
-    RefreshTokenUseResult,
-    RefreshTokenValidation,
-    RefreshTokenValidationResult,
-)
-
-# Report Execution
-from .report_execution import (
-    ExecutionStatus,
-    ExecutionType,
-    ReportExecutionBase,
-    ReportExecutionBatch,
-    ReportExecutionBatchResponse,
-    ReportExecutionCancel,
-    ReportExecutionCancelResponse,
-    ReportExecutionCreate,
-    ReportExecutionExport,
-    ReportExecutionFilter,
-    ReportExecutionInDB,
-    ReportExecutionListResponse,
-    ReportExecutionMonitoring,
-    ReportExecutionResponse,
-    ReportExecutionRetry,
-    ReportExecutionRetryResponse,
-    ReportExecutionStatistics,
-    ReportExecutionTrigger,
-    ReportExecutionTriggerResponse,
-    ReportExecutionUpdate,
-)
-
-# Subscription
-from .subscription import (
-    SubscriptionBase,
-    SubscriptionCreate,
-    SubscriptionListResponse,
-    SubscriptionResponse,
-    SubscriptionStatus,
-    SubscriptionSummary,
-    SubscriptionUpdate,
-    SubscriptionWithPlan,
-)
-
-# Tag
-from .tag import (
-    TagCreateSchema,
-    TagListSchema,
-    TagResponseSchema,
-    TagUpdateSchema,
-)
-
-# Template
-from .template import (
-    CollectionBase,
-    CollectionCreate,
-    CollectionResponse,
-    CollectionUpdate,
-    DownloadCreate,
-    DownloadResponse,
-    FavoriteCreate,
-    FavoriteResponse,
-    FavoriteUpdate,
-    MarketplaceStats,
-    ReviewBase,
-    ReviewCreate,
-    ReviewResponse,
-    ReviewUpdate,
-    TemplateBase,
-    TemplateCreate,
-    TemplateDetailResponse,
-    TemplateFilter,
-    TemplateInstall,
-    TemplateInstallResponse,
-    TemplateListResponse,
-    TemplateResponse,
-    TemplateStats,
-    TemplateUpdate,
-    UserTemplateStats,
-)
-
-# Tenant
-from .tenant import (
-    BillingCycle,
-    BulkTenantFeatureResult,
-    BulkTenantFeatureUpdate,
-    TenantBase,
-    TenantBillingInfo,
-    TenantCreate,
-    TenantExportRequest,
-    TenantFeatureBase,
-    TenantFeatureCreate,
-    TenantFeatureListResponse,
-    TenantFeatureResponse,
-    TenantFeatureUpdate,
-    TenantImportRequest,
-    TenantListResponse,
-    TenantQuota,
-    TenantResponse,
-    TenantSearchRequest,
-    TenantSettings,
-    TenantStatus,
-    TenantTheme,
-    TenantUpdate,
-    TenantUsageStats,
-    TenantWithFeatures,
-    TenantWithSettings,
-)
-
-# Tenant Feature
-from .tenant_feature import (
-    TenantFeatureBase,
-    TenantFeatureBulkUpdate,
-    TenantFeatureCreate,
-    TenantFeatureList,
-    TenantFeatureRead,
-    TenantFeatureStats,
-    TenantFeatureUpdate,
-    TenantFeatureUsage,
-    TenantFeatureWithDetails,
-)
-
-# Tool
-from .tool import (
-    ToolBase,
-    ToolCreate,
-    ToolExecution,
-    ToolExecutionResult,
-    ToolList,
-    ToolResponse,
-    ToolStatistics,
-    ToolUpdate,
-)
-
-# Usage Log
-from .usage_log import (
-    UsageLogBase,
-    UsageLogCreate,
-    UsageLogList,
-    UsageLogResponse,
-    UsageLogSummary,
-    UsageLogUpdate,
-)
-
-# User
-from .user import (
-    UserBase,
-    UserCreate,
-    UserListResponse,
-    UserProfileResponse,
-    UserProfileUpdate,
-    UserResponse,
-    UserRole,
-    UserStatus,
-    UserUpdate,
-)
-
-# User Analytics
-from .user_analytics import (
-    BulkInsightAction,
-    BulkInsightActionResult,
-    InsightCategory,
-    InsightPriority,
-    InsightType,
-    PeriodType,
-    UserAnalyticsReport,
-    UserBehaviorMetricsBase,
-    UserBehaviorMetricsCreate,
-    UserBehaviorMetricsResponse,
-    UserBehaviorMetricsUpdate,
-    UserEngagementSummary,
-    UserFeedback,
-    UserInsightBase,
-    UserInsightCreate,
-    UserInsightResponse,
-    UserInsightSummary,
-    UserInsightUpdate,
-    UserInsightsListResponse,
-    UserInsightsSearchRequest,
-    UserMetricsListResponse,
-    UserMetricsSearchRequest,
-    UserProductivityMetrics,
-)
-
-# User Behavior Metric
-from .user_behavior_metric import (
-    ActivityLevel,
-    ChurnRiskResponse,
-    CohortAnalysisResponse,
-    EngagementTrendResponse,
-    PeriodType,
-    UserBehaviorMetricBase,
-    UserBehaviorMetricCreate,
-    UserBehaviorMetricInDB,
-    UserBehaviorMetricListResponse,
-    UserBehaviorMetricResponse,
-    UserBehaviorMetricUpdate,
-    UserBehaviorSummary,
-    UserSegmentResponse,
-    UserType,
-)
-
-# User Digitalocean
-from .user_digitalocean import (
-    UserDigitalOceanAuth,
-    UserDigitalOceanBase,
-    UserDigitalOceanCreate,
-    UserDigitalOceanList,
-    UserDigitalOceanPasswordUpdate,
-    UserDigitalOceanRead,
-    UserDigitalOceanStats,
-    UserDigitalOceanUpdate,
-)
-
-# User Features
-from .user_features import (
-    BillingCycle,
-    BulkVariableCreate,
-    BulkVariableResult,
-    BulkVariableUpdate,
-    PaymentMethod,
-    PaymentProvider,
-    SubscriptionBillingInfo,
-    SubscriptionInvoice,
-    SubscriptionStatus,
-    UserSubscriptionBase,
-    UserSubscriptionCreate,
-    UserSubscriptionListResponse,
-    UserSubscriptionResponse,
-    UserSubscriptionSearchRequest,
-    UserSubscriptionUpdate,
-    UserSubscriptionUsage,
-    UserSubscriptionWithPlan,
-    UserVariableBase,
-    UserVariableCreate,
-    UserVariableGroup,
-    UserVariableListResponse,
-    UserVariableResponse,
-    UserVariableSearchRequest,
-    UserVariableSecureResponse,
-    UserVariableStats,
-    UserVariableUpdate,
-    UserVariableValidation,
-    VariableCategory,
-    VariableExportRequest,
-    VariableImportRequest,
-    VariableImportResult,
-)
-
-# User Insight
-from .user_insight import (
-    InsightCategory,
-    InsightPriority,
-    InsightType,
-    UserInsightBase,
-    UserInsightCreate,
-    UserInsightListResponse,
-    UserInsightResponse,
-    UserInsightUpdate,
-)
-
-# User Subscription
-from .user_subscription import (
-    BillingCycle,
-    SubscriptionStatus,
-    UserSubscriptionBase,
-    UserSubscriptionCreate,
-    UserSubscriptionList,
-    UserSubscriptionResponse,
-    UserSubscriptionUpdate,
-)
-
-# User Tenant Role
-from .user_tenant_role import (
-    UserTenantRoleBase,
-    UserTenantRoleCreate,
-    UserTenantRoleListResponse,
-    UserTenantRoleResponse,
-    UserTenantRoleStatus,
-    UserTenantRoleUpdate,
-)
-
-# User Variable
-from .user_variable import (
-    UserVariableBase,
-    UserVariableCreate,
-    UserVariableListResponse,
-    UserVariableResponse,
-    UserVariableUpdate,
-)
-
-# Webhook Log
-from .webhook_log import (
-    WebhookEventType,
-    WebhookLogBase,
-    WebhookLogBatch,
-    WebhookLogCreate,
-    WebhookLogExport,
-    WebhookLogFilter,
-    WebhookLogInDB,
-    WebhookLogListResponse,
-    WebhookLogResponse,
-    WebhookLogRetry,
-    WebhookLogStatistics,
-    WebhookLogSummary,
-    WebhookLogUpdate,
-    WebhookStatus,
-)
-
-# Workflow
-from .workflow import (
-    ConnectionBase,
-    ConnectionCreate,
-    ConnectionResponse,
-    ConnectionUpdate,
-    ExecutionLogResponse,
-    NodeBase,
-    NodeCreate,
-    NodeResponse,
-    NodeUpdate,
-    WorkflowAnalytics,
-    WorkflowBase,
-    WorkflowCreate,
-    WorkflowExecutionCreate,
-    WorkflowExecutionRequest,
-    WorkflowExecutionResponse,
-    WorkflowExecutionUpdate,
-    WorkflowListResponse,
-    WorkflowMetrics,
-    WorkflowResponse,
-    WorkflowSearch,
-    WorkflowStats,
-    WorkflowStatus,
-    WorkflowTemplate,
-    WorkflowTemplateResponse,
-    WorkflowUpdate,
-    WorkflowVersion,
-)
-
-# Workflow Connection
-from .workflow_connection import (
-    WorkflowConnectionBase,
-    WorkflowConnectionCreate,
-    WorkflowConnectionExecution,
-    WorkflowConnectionGraph,
-    WorkflowConnectionList,
-    WorkflowConnectionPath,
-    WorkflowConnectionResponse,
-    WorkflowConnectionStatistics,
-    WorkflowConnectionUpdate,
-    WorkflowConnectionValidation,
-)
-
-# Workflow Execution
-from .workflow_execution import (
-    ExecutionBase,
-    ExecutionBatch,
-    ExecutionControl,
-    ExecutionCreate,
-    ExecutionFilter,
-    ExecutionListResponse,
-    ExecutionMetricsResponse,
-    ExecutionResponse,
-    ExecutionStats,
-    ExecutionSummary,
-    ExecutionUpdate,
-    MetricCreate,
-    MetricResponse,
-    NodeExecutionBase,
-    NodeExecutionCreate,
-    NodeExecutionFilter,
-    NodeExecutionResponse,
-    NodeExecutionStats,
-    NodeExecutionUpdate,
-    QueueItemCreate,
-    QueueItemResponse,
-    WorkflowExecutionWithNodesResponse,
-    WorkflowValidation,
-    WorkflowValidation,
-)
-
-# Workflow Execution Metric
-from .workflow_execution_metric import (
-    WorkflowExecutionMetricBase,
-    WorkflowExecutionMetricCreate,
-    WorkflowExecutionMetricList,
-    WorkflowExecutionMetricRead,
-    WorkflowExecutionMetricStats,
-    WorkflowExecutionMetricSummary,
-    WorkflowExecutionMetricTrend,
-    WorkflowExecutionMetricUpdate,
-    WorkflowExecutionMetricValue,
-)
-
-# Workflow Execution Queue
-from .workflow_execution_queue import (
-    WorkflowExecutionQueueBase,
-    WorkflowExecutionQueueCleanup,
-    WorkflowExecutionQueueCleanupResult,
-    WorkflowExecutionQueueCreate,
-    WorkflowExecutionQueueDequeue,
-    WorkflowExecutionQueueDequeueResult,
-    WorkflowExecutionQueueEnqueue,
-    WorkflowExecutionQueueEnqueueResult,
-    WorkflowExecutionQueueExport,
-    WorkflowExecutionQueueList,
-    WorkflowExecutionQueueMonitoring,
-    WorkflowExecutionQueueProcess,
-    WorkflowExecutionQueueProcessResult,
-    WorkflowExecutionQueueResponse,
-    WorkflowExecutionQueueStatistics,
-    WorkflowExecutionQueueUpdate,
-)
-
-# Workflow Node
-from .workflow_node import (
-    WorkflowNodeBase,
-    WorkflowNodeCreate,
-    WorkflowNodeExecution,
-    WorkflowNodeList,
-    WorkflowNodeResponse,
-    WorkflowNodeStatistics,
-    WorkflowNodeTemplate,
-    WorkflowNodeUpdate,
-    WorkflowNodeValidation,
-)
-
-# Workflow Template
-from .workflow_template import (
-    WorkflowTemplateBase,
-    WorkflowTemplateCreate,
-    WorkflowTemplateExport,
-    WorkflowTemplateList,
-    WorkflowTemplatePreview,
-    WorkflowTemplateRating,
-    WorkflowTemplateResponse,
-    WorkflowTemplateStatistics,
-    WorkflowTemplateUpdate,
-    WorkflowTemplateUsage,
-    WorkflowTemplateValidation,
-)
-
-# Workspace
-from .workspace import (
-    MemberInvite,
-    WorkspaceBase,
-    WorkspaceCreate,
-    WorkspaceListResponse,
-    WorkspaceResponse,
-    WorkspaceStatus,
-    WorkspaceType,
-    WorkspaceUpdate,
-)
-
-# Workspace Activity
-from .workspace_activity import (
-    ActivityAction,
-    ResourceType,
-    WorkspaceActivityAlert,
-    WorkspaceActivityBase,
-    WorkspaceActivityBatch,
-    WorkspaceActivityCreate,
-    WorkspaceActivityExport,
-    WorkspaceActivityFilter,
-    WorkspaceActivityInDB,
-    WorkspaceActivityInsight,
-    WorkspaceActivityListResponse,
-    WorkspaceActivityResponse,
-    WorkspaceActivityStatistics,
-    WorkspaceActivitySummary,
-    WorkspaceActivityTimeline,
-    WorkspaceActivityTimelineResponse,
-    WorkspaceActivityUpdate,
-)
-
-# Workspace Invitation
-from .workspace_invitation import (
-    InvitationStatus,
-    WorkspaceInvitationAccept,
-    WorkspaceInvitationBase,
-    WorkspaceInvitationBatch,
-    WorkspaceInvitationBulkCreate,
-    WorkspaceInvitationBulkCreateResponse,
-    WorkspaceInvitationCreate,
-    WorkspaceInvitationDecline,
-    WorkspaceInvitationExport,
-    WorkspaceInvitationFilter,
-    WorkspaceInvitationInDB,
-    WorkspaceInvitationListResponse,
-    WorkspaceInvitationResend,
-    WorkspaceInvitationResponse,
-    WorkspaceInvitationStatistics,
-    WorkspaceInvitationUpdate,
-)
+Os schemas são exportados sob demanda (PEP 562): ``from synapse.schemas import X``
+importa apenas o submódulo que define ``X``, e não os ~110 submódulos do pacote.
+"""
 
-# Workspace Member
-from .workspace_member import (
-    WorkspaceMemberBase,
-    WorkspaceMemberCreate,
-    WorkspaceMemberListResponse,
-    WorkspaceMemberResponse,
-    WorkspaceMemberUpdate,
-)
+import importlib
+
+# Submódulo de origem dos schemas exportados. Quando um nome aparece em mais de
+# um submódulo vale o último, como na antiga sequência de imports
+_SUBMODULE_EXPORTS = {
+    # Agent
+    "agent": (
+        "AgentBase",
+        "AgentCreate",
+        "AgentEnvironment",
+        "AgentListResponse",
+        "AgentResponse",
+        "AgentScope",
+        "AgentStatus",
+        "AgentUpdate",
+        "TriggerType",
+    ),
+    # Agent Acl
+    "agent_acl": (
+        "AgentACLBase",
+        "AgentACLBulkUpdate",
+        "AgentACLCreate",
+        "AgentACLListResponse",
+        "AgentACLResponse",
+        "AgentACLUpdate",
+    ),
+    # Agent Configuration
+    "agent_configuration": (
+        "AgentConfigurationBase",
+        "AgentConfigurationClone",
+        "AgentConfigurationComparison",
+        "AgentConfigurationCreate",
+        "AgentConfigurationExport",
+        "AgentConfigurationHistory",
+        "AgentConfigurationList",
+        "AgentConfigurationResponse",
+        "AgentConfigurationStatistics",
+        "AgentConfigurationTemplate",
+        "AgentConfigurationUpdate",
+        "AgentConfigurationValidation",
+    ),
+    # Agent Error Log
+    "agent_error_log": (
+        "AgentErrorLogBase",
+        "AgentErrorLogCreate",
+        "AgentErrorLogRead",
+        "AgentErrorLogStats",
+        "AgentErrorLogSummary",
+        "AgentErrorLogTimeline",
+        "AgentErrorLogUpdate",
+    ),
+    # Agent Hierarchy
+    "agent_hierarchy": (
+        "AgentHierarchyBase",
+        "AgentHierarchyCreate",
+        "AgentHierarchyListResponse",
+        "AgentHierarchyResponse",
+        "AgentHierarchyTree",
+        "AgentParentUpdate",
+    ),
+    # Agent Knowledge Base
+    "agent_knowledge_base": (
+        "AgentKnowledgeBaseBase",
+        "AgentKnowledgeBaseBulkOperation",
+        "AgentKnowledgeBaseConfiguration",
+        "AgentKnowledgeBaseCreate",
+        "AgentKnowledgeBaseList",
+        "AgentKnowledgeBaseRecommendation",
+        "AgentKnowledgeBaseResponse",
+        "AgentKnowledgeBaseSearch",
+        "AgentKnowledgeBaseSearchResponse",
+        "AgentKnowledgeBaseSearchResult",
+        "AgentKnowledgeBaseStatistics",
+        "AgentKnowledgeBaseUpdate",
+        "AgentKnowledgeBaseUsage",
+    ),
+    # Agent Model
+    "agent_model": (
+        "AgentModelBase",
+        "AgentModelCreate",
+        "AgentModelList",
+        "AgentModelResponse",
+        "AgentModelUpdate",
+        "AgentModelWithLLM",
+    ),
+    # Agent Quota
+    "agent_quota": (
+        "AgentQuotaBase",
+        "AgentQuotaCreate",
+        "AgentQuotaCreateDaily",
+        "AgentQuotaCreateHourly",
+        "AgentQuotaCreateMonthly",
+        "AgentQuotaListResponse",
+        "AgentQuotaRead",
+        "AgentQuotaResponse",
+        "AgentQuotaUpdate",
+        "AgentQuotaUsageCheck",
+    ),
+    # Agent Status
+    "agent_status": (
+        "AgentStatusBase",
+        "AgentStatusCreate",
+        "AgentStatusListResponse",
+        "AgentStatusResponse",
+        "AgentStatusUpdate",
+    ),
+    # Agent Tool
+    "agent_tool": (
+        "AgentToolBase",
+        "AgentToolBatch",
+        "AgentToolBatchResponse",
+        "AgentToolCreate",
+        "AgentToolInDB",
+        "AgentToolListResponse",
+        "AgentToolResponse",
+        "AgentToolStatistics",
+        "AgentToolUpdate",
+    ),
+    # Agent Trigger
+    "agent_trigger": (
+        "AgentTriggerBase",
+        "AgentTriggerBulkOperation",
+        "AgentTriggerCreate",
+        "AgentTriggerExecute",
+        "AgentTriggerExecution",
+        "AgentTriggerList",
+        "AgentTriggerRead",
+        "AgentTriggerSchedule",
+        "AgentTriggerStats",
+        "AgentTriggerUpdate",
+    ),
+    # Agent Type
+    "agent_type": (
+        "AgentTypeBase",
+        "AgentTypeCreate",
+        "AgentTypeListResponse",
+        "AgentTypeResponse",
+        "AgentTypeUpdate",
+    ),
+    # Agent Usage Metric
+    "agent_usage_metric": (
+        "AgentUsageMetricBase",
+        "AgentUsageMetricCreate",
+        "AgentUsageMetricListResponse",
+        "AgentUsageMetricRead",
+        "AgentUsageMetricResponse",
+        "AgentUsageMetricUpdate",
+    ),
+    # Analytics
+    "analytics": (
+        "ABTestConfig",
+        "ABTestResult",
+        "AlertCreate",
+        "AlertResponse",
+        "AlertRule",
+        "AlertUpdate",
+        "AnalyticsOverview",
+        "AnalyticsQuery",
+        "BusinessMetricResponse",
+        "CohortAnalysis",
+        "CohortResult",
+        "DashboardBase",
+        "DashboardCreate",
+        "DashboardData",
+        "DashboardLayout",
+        "DashboardResponse",
+        "DashboardUpdate",
+        "EventBase",
+        "EventCreate",
+        "EventResponse",
+        "EventType",
+        "ExportRequest",
+        "ExportResponse",
+        "FunnelAnalysis",
+        "FunnelResult",
+        "FunnelStep",
+        "InsightRequest",
+        "InsightResponse",
+        "InsightType",
+        "MetricBase",
+        "MetricCreate",
+        "MetricType",
+        "QueryConfig",
+        "QueryResponse",
+        "RealTimeMetric",
+        "RealTimeStats",
+        "ReportBase",
+        "ReportCreate",
+        "ReportExecutionResponse",
+        "ReportFormat",
+        "ReportResponse",
+        "ReportType",
+        "ReportUpdate",
+        "ScheduleConfig",
+        "SystemInsights",
+        "SystemPerformanceMetricResponse",
+        "UserBehaviorMetricResponse",
+        "VisualizationConfig",
+        "WidgetConfig",
+    ),
+    # Analytics Alert
+    "analytics_alert": (
+        "AnalyticsAlertBase",
+        "AnalyticsAlertCreate",
+        "AnalyticsAlertListResponse",
+        "AnalyticsAlertResponse",
+        "AnalyticsAlertUpdate",
+        "TestAlertRequest",
+        "TestAlertResponse",
+    ),
+    # Analytics Dashboard
+    "analytics_dashboard": (
+        "AnalyticsDashboardBase",
+        "AnalyticsDashboardCreate",
+        "AnalyticsDashboardInDB",
+        "AnalyticsDashboardListResponse",
+        "AnalyticsDashboardResponse",
+        "AnalyticsDashboardUpdate",
+        "ChartType",
+        "DashboardCloneRequest",
+        "DashboardExportRequest",
+        "DashboardFilter",
+        "DashboardLayout",
+        "DashboardShareRequest",
+        "DashboardStats",
+        "DashboardStatus",
+        "DashboardWidget",
+        "DashboardWithStats",
+        "WidgetType",
+    ),
+    # Analytics Event
+    "analytics_event": (
+        "AnalyticsEventAggregation",
+        "AnalyticsEventAggregationResult",
+        "AnalyticsEventBase",
+        "AnalyticsEventBatch",
+        "AnalyticsEventCreate",
+        "AnalyticsEventExport",
+        "AnalyticsEventFilter",
+        "AnalyticsEventFunnel",
+        "AnalyticsEventFunnelResult",
+        "AnalyticsEventList",
+        "AnalyticsEventResponse",
+        "AnalyticsEventStatistics",
+        "AnalyticsEventUpdate",
+    ),
+    # Analytics Export
+    "analytics_export": (
+        "AnalyticsExportBase",
+        "AnalyticsExportCreate",
+        "AnalyticsExportListResponse",
+        "AnalyticsExportProgress",
+        "AnalyticsExportResponse",
+        "AnalyticsExportUpdate",
+        "ExportStatus",
+        "ExportType",
+    ),
+    # Analytics Metric
+    "analytics_metric": (
+        "AnalyticsMetricAggregation",
+        "AnalyticsMetricAggregationResult",
+        "AnalyticsMetricAlert",
+        "AnalyticsMetricAlertTrigger",
+        "AnalyticsMetricBase",
+        "AnalyticsMetricBatch",
+        "AnalyticsMetricCreate",
+        "AnalyticsMetricExport",
+        "AnalyticsMetricFilter",
+        "AnalyticsMetricList",
+        "AnalyticsMetricResponse",
+        "AnalyticsMetricStatistics",
+        "AnalyticsMetricTimeSeries",
+        "AnalyticsMetricTimeSeriesResult",
+        "AnalyticsMetricUpdate",
+    ),
+    # Analytics Report
+    "analytics_report": (
+        "AnalyticsReportBase",
+        "AnalyticsReportCreate",
+        "AnalyticsReportExecution",
+        "AnalyticsReportExport",
+        "AnalyticsReportList",
+        "AnalyticsReportResponse",
+        "AnalyticsReportResult",
+        "AnalyticsReportSchedule",
+        "AnalyticsReportStatistics",
+        "AnalyticsReportTemplate",
+        "AnalyticsReportUpdate",
+    ),
+    # Audit
+    "audit": (
+        "APIAuditEvent",
+        "AuditCategory",
+        "AuditExportRequest",
+        "AuditExportResult",
+        "AuditLogBase",
+        "AuditLogCreate",
+        "AuditLogDetailed",
+        "AuditLogListResponse",
+        "AuditLogResponse",
+        "AuditLogSearchRequest",
+        "AuditLogWithUser",
+        "AuditOperation",
+        "AuditReport",
+        "AuditReportRequest",
+        "AuditSeverity",
+        "ComplianceAuditCheck",
+        "DataRetentionCheck",
+        "SecurityAuditEvent",
+        "UserAuditEvent",
+        "WorkspaceAuditEvent",
+    ),
+    # Audit Log
+    "audit_log": (
+        "AuditLogAlert",
+        "AuditLogBase",
+        "AuditLogCreate",
+        "AuditLogExport",
+        "AuditLogFilter",
+        "AuditLogList",
+        "AuditLogResponse",
+        "AuditLogStatistics",
+        "AuditLogSummary",
+        "AuditLogUpdate",
+    ),
+    # Auth
+    "auth": (
+        "AuthProvider",
+        "EmailVerificationRequest",
+        "EmailVerificationTokenResponse",
+        "PasswordChangeRequest",
+        "PasswordResetConfirm",
+        "PasswordResetRequest",
+        "PasswordResetTokenResponse",
+        "RefreshTokenRequest",
+        "RefreshTokenResponse",
+        "SessionInfo",
+        "Token",
+        "TokenResponse",
+        "TwoFactorDisable",
+        "TwoFactorSetup",
+        "TwoFactorVerify",
+        "UserBase",
+        "UserCreate",
+        "UserListResponse",
+        "UserLogin",
+        "UserPreferences",
+        "UserProfile",
+        "UserResponse",
+        "UserSearchRequest",
+        "UserStats",
+        "UserStatus",
+        "UserTenantRoleResponse",
+        "UserUpdate",
+    ),
+    # Base
+    "base": (
+        "ErrorDetail",
+        "ErrorResponse",
+        "PaginatedResponse",
+        "PaginationParams",
+    ),
+    # Billing Event
+    "billing_event": (
+        "BillingEventBase",
+        "BillingEventCreate",
+        "BillingEventListResponse",
+        "BillingEventResponse",
+        "BillingEventStatus",
+        "BillingEventType",
+        "BillingEventUpdate",
+    ),
+    # Business Metric
+    "business_metric": (
+        "BusinessMetricBase",
+        "BusinessMetricCreate",
+        "BusinessMetricListResponse",
+        "BusinessMetricResponse",
+        "PeriodType",
+    ),
+    # Campaign
+    "campaign": (
+        "CampaignBase",
+        "CampaignCreate",
+        "CampaignList",
+        "CampaignResponse",
+        "CampaignStatus",
+        "CampaignType",
+        "CampaignUpdate",
+    ),
+    # Campaign Contact
+    "campaign_contact": (
+        "CampaignContactBase",
+        "CampaignContactCreate",
+        "CampaignContactList",
+        "CampaignContactResponse",
+        "CampaignContactStatus",
+        "CampaignContactUpdate",
+    ),
+    # Component Version
+    "component_version": (
+        "ComponentVersionBase",
+        "ComponentVersionCreate",
+        "ComponentVersionListResponse",
+        "ComponentVersionResponse",
+        "ComponentVersionUpdate",
+        "VersionStatus",
+    ),
+    # Contact
+    "contact": (
+        "ContactBase",
+        "ContactCreate",
+        "ContactInDB",
+        "ContactListResponse",
+        "ContactResponse",
+        "ContactUpdate",
+    ),
+    # Contact Event
+    "contact_event": (
+        "ContactEventBase",
+        "ContactEventCreate",
+        "ContactEventList",
+        "ContactEventResponse",
+        "ContactEventType",
+        "ContactEventUpdate",
+    ),
+    # Contact Interaction
+    "contact_interaction": (
+        "ContactInteractionBase",
+        "ContactInteractionCreate",
+        "ContactInteractionInDB",
+        "ContactInteractionListResponse",
+        "ContactInteractionResponse",
+        "ContactInteractionSummary",
+        "ContactInteractionUpdate",
+        "InteractionDirection",
+        "InteractionStatus",
+        "InteractionType",
+    ),
+    # Contact List
+    "contact_list": (
+        "ContactListBase",
+        "ContactListCreate",
+        "ContactListInDB",
+        "ContactListListResponse",
+        "ContactListResponse",
+        "ContactListUpdate",
+        "ContactListWithStatsResponse",
+    ),
+    # Contact List Membership
+    "contact_list_membership": (
+        "ContactListMembershipBase",
+        "ContactListMembershipCreate",
+        "ContactListMembershipSchema",
+        "ContactListMembershipUpdate",
+    ),
+    # Contact Note
+    "contact_note": (
+        "ContactNoteBase",
+        "ContactNoteCreate",
+        "ContactNoteListResponse",
+        "ContactNoteResponse",
+        "ContactNoteUpdate",
+        "NoteType",
+    ),
+    # Contact Source
+    "contact_source": (
+        "ContactSourceBase",
+        "ContactSourceCreate",
+        "ContactSourceListResponse",
+        "ContactSourceResponse",
+        "ContactSourceUpdate",
+        "IntegrationType",
+        "TestConnectionRequest",
+        "TestConnectionResponse",
+    ),
+    # Contact Tag
+    "contact_tag": (
+        "AssignTagsResponse",
+        "AssignTagsToContacts",
+        "ContactTagBase",
+        "ContactTagCreate",
+        "ContactTagListResponse",
+        "ContactTagResponse",
+        "ContactTagUpdate",
+    ),
+    # Conversation
+    "conversation": (
+        "ConversationBase",
+        "ConversationCreate",
+        "ConversationListResponse",
+        "ConversationResponse",
+        "ConversationTitleUpdate",
+        "MessageBase",
+        "MessageCreate",
+        "MessageListResponse",
+        "MessageResponse",
+    ),
+    # Conversation Llm
+    "conversation_llm": (
+        "ConversationLLMBase",
+        "ConversationLLMComparison",
+        "ConversationLLMCreate",
+        "ConversationLLMList",
+        "ConversationLLMOptimization",
+        "ConversationLLMOptimizationResult",
+        "ConversationLLMRecommendation",
+        "ConversationLLMResponse",
+        "ConversationLLMStatistics",
+        "ConversationLLMSwitch",
+        "ConversationLLMSwitchResult",
+        "ConversationLLMUpdate",
+        "ConversationLLMUsage",
+    ),
+    # Conversion Journey
+    "conversion_journey": (
+        "ConversionJourneyBase",
+        "ConversionJourneyCreate",
+        "ConversionJourneyRead",
+        "ConversionJourneyUpdate",
+    ),
+    # Coupon
+    "coupon": (
+        "CouponBase",
+        "CouponCreate",
+        "CouponRead",
+        "CouponStats",
+        "CouponUpdate",
+        "CouponUsage",
+        "CouponValidation",
+    ),
+    # Custom Report
+    "custom_report": (
+        "CustomReportBase",
+        "CustomReportClone",
+        "CustomReportCreate",
+        "CustomReportExecution",
+        "CustomReportExecutionResponse",
+        "CustomReportExport",
+        "CustomReportFilter",
+        "CustomReportInDB",
+        "CustomReportListResponse",
+        "CustomReportResponse",
+        "CustomReportSchedule",
+        "CustomReportShare",
+        "CustomReportStatistics",
+        "CustomReportUpdate",
+        "QueryConfig",
+        "ReportCategory",
+        "ReportStatus",
+        "ScheduleConfig",
+        "ScheduleFrequency",
+        "VisualizationConfig",
+        "VisualizationType",
+    ),
+    # Email Verification Token
+    "email_verification_token": (
+        "EmailVerificationConfirm",
+        "EmailVerificationRequest",
+        "EmailVerificationResponse",
+        "EmailVerificationTokenBase",
+        "EmailVerificationTokenCreate",
+        "EmailVerificationTokenInDB",
+        "EmailVerificationTokenResponse",
+        "EmailVerificationTokenUpdate",
+        "ResendVerificationRequest",
+    ),
+    # Error
+    "error": (
+        "ErrorDetail",
+        "ErrorResponse",
+    ),
+    # Event Type
+    "event_type": (
+        "EventTypeBase",
+        "EventTypeCreate",
+        "EventTypeList",
+        "EventTypeRead",
+        "EventTypeStats",
+        "EventTypeUpdate",
+        "EventTypeValidation",
+    ),
+    # Execution Status
+    "execution_status": (
+        "ExecutionStatusBase",
+        "ExecutionStatusCreate",
+        "ExecutionStatusRead",
+        "ExecutionStatusSummary",
+        "ExecutionStatusUpdate",
+    ),
+    # Feature
+    "feature": (
+        "FeatureCreate",
+        "FeatureListResponse",
+        "FeatureResponse",
+        "FeatureUpdate",
+        "PlanFeatureCreate",
+        "PlanFeatureListResponse",
+        "PlanFeatureResponse",
+        "TenantFeatureCreate",
+        "TenantFeatureListResponse",
+        "TenantFeatureResponse",
+        "WorkspaceFeatureCreate",
+        "WorkspaceFeatureListResponse",
+        "WorkspaceFeatureResponse",
+    ),
+    # File
+    "file": (
+        "FileBase",
+        "FileCreate",
+        "FileListResponse",
+        "FileResponse",
+        "FileStatus",
+        "FileUpdate",
+        "ScanStatus",
+    ),
+    # Invoice
+    "invoice": (
+        "InvoiceBase",
+        "InvoiceCreate",
+        "InvoiceExport",
+        "InvoiceItem",
+        "InvoiceItemType",
+        "InvoiceListResponse",
+        "InvoicePayment",
+        "InvoicePaymentResult",
+        "InvoicePaymentStatus",
+        "InvoicePreview",
+        "InvoiceReminder",
+        "InvoiceReminderType",
+        "InvoiceReport",
+        "InvoiceResponse",
+        "InvoiceStatistics",
+        "InvoiceStatus",
+        "InvoiceUpdate",
+    ),
+    # Knowledge Base
+    "knowledge_base": (
+        "KnowledgeBaseBase",
+        "KnowledgeBaseCreate",
+        "KnowledgeBaseDocument",
+        "KnowledgeBaseExport",
+        "KnowledgeBaseIndexing",
+        "KnowledgeBaseIndexingStatus",
+        "KnowledgeBaseList",
+        "KnowledgeBaseResponse",
+        "KnowledgeBaseRetrievalRequest",
+        "KnowledgeBaseSearch",
+        "KnowledgeBaseSearchResponse",
+        "KnowledgeBaseSearchResult",
+        "KnowledgeBaseStatistics",
+        "KnowledgeBaseSyncResult",
+        "KnowledgeBaseUpdate",
+    ),
+    # Llm
+    "llm": (
+        "LLMCapability",
+        "LLMConversationCreate",
+        "LLMConversationListResponse",
+        "LLMConversationResponse",
+        "LLMCreate",
+        "LLMListResponse",
+        "LLMMessageCreate",
+        "LLMMessageListResponse",
+        "LLMMessageResponse",
+        "LLMProvider",
+        "LLMResponse",
+        "LLMUpdate",
+    ),
+    # Marketplace
+    "marketplace": (
+        "BulkComponentOperation",
+        "BulkOperationResponse",
+        "ComponentBase",
+        "ComponentCategory",
+        "ComponentCreate",
+        "ComponentModerationResponse",
+        "ComponentResponse",
+        "ComponentSearch",
+        "ComponentSearchResponse",
+        "ComponentStatus",
+        "ComponentType",
+        "ComponentUpdate",
+        "ComponentVersionResponse",
+        "DownloadResponse",
+        "LicenseType",
+        "MarketplaceStats",
+        "ModerationAction",
+        "PurchaseCreate",
+        "PurchaseResponse",
+        "RatingBase",
+        "RatingCreate",
+        "RatingResponse",
+        "RatingStats",
+    ),
+    # Message
+    "message": (
+        "MessageBase",
+        "MessageCreate",
+        "MessageList",
+        "MessageResponse",
+        "MessageStatistics",
+        "MessageThread",
+        "MessageUpdate",
+        "MessageWithReplies",
+    ),
+    # Message Feedback
+    "message_feedback": (
+        "FeedbackCategory",
+        "MessageFeedbackBase",
+        "MessageFeedbackBatch",
+        "MessageFeedbackCreate",
+        "MessageFeedbackExport",
+        "MessageFeedbackInDB",
+        "MessageFeedbackListResponse",
+        "MessageFeedbackResponse",
+        "MessageFeedbackStatistics",
+        "MessageFeedbackSummary",
+        "MessageFeedbackUpdate",
+        "RatingType",
+    ),
+    # Metric Type
+    "metric_type": (
+        "MetricTypeBase",
+        "MetricTypeCreate",
+        "MetricTypeRead",
+        "MetricTypeSummary",
+        "MetricTypeUpdate",
+    ),
+    # Node
+    "node": (
+        "NodeBase",
+        "NodeCreate",
+        "NodeExecutionStatsResponse",
+        "NodeListResponse",
+        "NodeResponse",
+        "NodeStatus",
+        "NodeType",
+        "NodeUpdate",
+    ),
+    # Node Category
+    "node_category": (
+        "NodeCategoryBase",
+        "NodeCategoryBreadcrumb",
+        "NodeCategoryCreate",
+        "NodeCategoryDelete",
+        "NodeCategoryListResponse",
+        "NodeCategoryPopular",
+        "NodeCategoryReorder",
+        "NodeCategoryResponse",
+        "NodeCategoryStats",
+        "NodeCategoryTree",
+        "NodeCategoryUpdate",
+    ),
+    # Node Execution
+    "node_execution": (
+        "NodeExecutionBase",
+        "NodeExecutionCancel",
+        "NodeExecutionCancelResult",
+        "NodeExecutionCreate",
+        "NodeExecutionExport",
+        "NodeExecutionList",
+        "NodeExecutionLog",
+        "NodeExecutionMonitoring",
+        "NodeExecutionResponse",
+        "NodeExecutionRetry",
+        "NodeExecutionRetryResult",
+        "NodeExecutionStatistics",
+        "NodeExecutionTrigger",
+        "NodeExecutionTriggerResult",
+        "NodeExecutionUpdate",
+    ),
+    # Node Execution Status
+    "node_execution_status": (
+        "NodeExecutionStatusBase",
+        "NodeExecutionStatusCreate",
+        "NodeExecutionStatusFilter",
+        "NodeExecutionStatusFlow",
+        "NodeExecutionStatusHealth",
+        "NodeExecutionStatusList",
+        "NodeExecutionStatusResponse",
+        "NodeExecutionStatusStatistics",
+        "NodeExecutionStatusTransition",
+        "NodeExecutionStatusUpdate",
+        "NodeExecutionStatusValidation",
+        "NodeExecutionStatusValidationResult",
+    ),
+    # Node Rating
+    "node_rating": (
+        "NodeRatingBase",
+        "NodeRatingCreate",
+        "NodeRatingListResponse",
+        "NodeRatingResponse",
+        "NodeRatingSummary",
+        "NodeRatingTrend",
+        "NodeRatingUpdate",
+        "RatingValue",
+    ),
+    # Node Status
+    "node_status": (
+        "NodeStatusBase",
+        "NodeStatusCreate",
+        "NodeStatusListResponse",
+        "NodeStatusName",
+        "NodeStatusResponse",
+        "NodeStatusUpdate",
+    ),
+    # Node Template
+    "node_template": (
+        "NodeTemplateBase",
+        "NodeTemplateCreate",
+        "NodeTemplateListResponse",
+        "NodeTemplateResponse",
+        "NodeTemplateUpdate",
+    ),
+    # Node Type
+    "node_type": (
+        "NodeCategoryType",
+        "NodeInputOutputCardinality",
+        "NodeTypeBase",
+        "NodeTypeCreate",
+        "NodeTypeListResponse",
+        "NodeTypeResponse",
+        "NodeTypeUpdate",
+    ),
+    # Password Reset Token
+    "password_reset_token": (
+        "PasswordResetConfirm",
+        "PasswordResetRequest",
+        "PasswordResetResponse",
+        "PasswordResetTokenBase",
+        "PasswordResetTokenCreate",
+        "PasswordResetTokenInDB",
+        "PasswordResetTokenResponse",
+        "PasswordResetTokenUpdate",
+    ),
+    # Payment
+    "payment": (
+        "InvoiceCreate",
+        "InvoiceListResponse",
+        "InvoiceResponse",
+        "InvoiceUpdate",
+        "PaginatedResponse",
+        "PaymentCustomerCreate",
+        "PaymentCustomerResponse",
+        "PaymentMethodCreate",
+        "PaymentMethodListResponse",
+        "PaymentMethodResponse",
+        "PaymentMethodUpdate",
+        "PaymentProviderCreate",
+        "PaymentProviderResponse",
+    ),
+    # Payment Customer
+    "payment_customer": (
+        "PaymentCustomerActivateDeactivate",
+        "PaymentCustomerBase",
+        "PaymentCustomerCreate",
+        "PaymentCustomerCreateSimple",
+        "PaymentCustomerListResponse",
+        "PaymentCustomerRead",
+        "PaymentCustomerResponse",
+        "PaymentCustomerSearch",
+        "PaymentCustomerSummary",
+        "PaymentCustomerUpdate",
+        "PaymentCustomerUpdateData",
+    ),
+    # Payment Method
+    "payment_method": (
+        "PaymentMethodBase",
+        "PaymentMethodCharge",
+        "PaymentMethodChargeResult",
+        "PaymentMethodCreate",
+        "PaymentMethodExport",
+        "PaymentMethodHistory",
+        "PaymentMethodList",
+        "PaymentMethodResponse",
+        "PaymentMethodSecurity",
+        "PaymentMethodStatistics",
+        "PaymentMethodToken",
+        "PaymentMethodTokenResult",
+        "PaymentMethodUpdate",
+        "PaymentMethodValidation",
+    ),
+    # Payment Provider
+    "payment_provider": (
+        "PaymentProviderBase",
+        "PaymentProviderCreate",
+        "PaymentProviderHealth",
+        "PaymentProviderList",
+        "PaymentProviderResponse",
+        "PaymentProviderUpdate",
+    ),
+    # Plan
+    "plan": (
+        "PlanBase",
+        "PlanComparison",
+        "PlanCreate",
+        "PlanListResponse",
+        "PlanMigration",
+        "PlanMigrationType",
+        "PlanPeriod",
+        "PlanPricing",
+        "PlanRecommendation",
+        "PlanResponse",
+        "PlanStatistics",
+        "PlanStatus",
+        "PlanUpdate",
+        "PlanUsage",
+    ),
+    # Plan Entitlement
+    "plan_entitlement": (
+        "PlanEntitlementBase",
+        "PlanEntitlementBulkCreate",
+        "PlanEntitlementBulkUpdate",
+        "PlanEntitlementCreate",
+        "PlanEntitlementRead",
+        "PlanEntitlementSummary",
+        "PlanEntitlementUpdate",
+        "PlanEntitlementWithFeature",
+    ),
+    # Plan Feature
+    "plan_feature": (
+        "PlanFeatureAudit",
+        "PlanFeatureBase",
+        "PlanFeatureBulkOperation",
+        "PlanFeatureComparison",
+        "PlanFeatureCreate",
+        "PlanFeatureList",
+        "PlanFeatureMatrix",
+        "PlanFeatureResponse",
+        "PlanFeatureStatistics",
+        "PlanFeatureTemplate",
+        "PlanFeatureUpdate",
+        "PlanFeatureUsage",
+        "PlanFeatureValidation",
+    ),
+    # Plan Provider Mapping
+    "plan_provider_mapping": (
+        "PlanProviderMappingBase",
+        "PlanProviderMappingCreate",
+        "PlanProviderMappingRead",
+        "PlanProviderMappingUpdate",
+    ),
+    # Project Collaborator
+    "project_collaborator": (
+        "ActivityStatus",
+        "CursorPosition",
+        "PermissionLevel",
+        "ProjectCollaboratorActivity",
+        "ProjectCollaboratorBase",
+        "ProjectCollaboratorBatch",
+        "ProjectCollaboratorCreate",
+        "ProjectCollaboratorExport",
+        "ProjectCollaboratorFilter",
+        "ProjectCollaboratorInDB",
+        "ProjectCollaboratorInvite",
+        "ProjectCollaboratorInviteResponse",
+        "ProjectCollaboratorListResponse",
+        "ProjectCollaboratorPermissionUpdate",
+        "ProjectCollaboratorPresence",
+        "ProjectCollaboratorResponse",
+        "ProjectCollaboratorSession",
+        "ProjectCollaboratorStatistics",
+        "ProjectCollaboratorUpdate",
+    ),
+    # Project Comment
+    "project_comment": (
+        "CommentContentType",
+        "CommentStatus",
+        "ProjectCommentBase",
+        "ProjectCommentBatch",
+        "ProjectCommentCreate",
+        "ProjectCommentExport",
+        "ProjectCommentFilter",
+        "ProjectCommentInDB",
+        "ProjectCommentListResponse",
+        "ProjectCommentMention",
+        "ProjectCommentReaction",
+        "ProjectCommentResolve",
+        "ProjectCommentResolveResponse",
+        "ProjectCommentResponse",
+        "ProjectCommentStatistics",
+        "ProjectCommentThread",
+        "ProjectCommentUpdate",
+    ),
+    # Project Version
+    "project_version": (
+        "ProjectVersionBase",
+        "ProjectVersionBranch",
+        "ProjectVersionComparison",
+        "ProjectVersionCreate",
+        "ProjectVersionInDB",
+        "ProjectVersionListResponse",
+        "ProjectVersionMerge",
+        "ProjectVersionResponse",
+        "ProjectVersionRestore",
+        "ProjectVersionRestoreResponse",
+        "ProjectVersionStatistics",
+        "ProjectVersionTag",
+        "ProjectVersionUpdate",
+    ),
+    # Rbac
+    "rbac": (
+        "BulkRolePermissionCreate",
+        "BulkRolePermissionResult",
+        "PaginatedResponse",
+        "PermissionAction",
+        "PermissionBase",
+        "PermissionCategory",
+        "PermissionCreate",
+        "PermissionListResponse",
+        "PermissionPreset",
+        "PermissionResource",
+        "PermissionResponse",
+        "PermissionSearchRequest",
+        "PermissionUpdate",
+        "PermissionWithRoles",
+        "RBACPermissionCreate",
+        "RBACPermissionListResponse",
+        "RBACPermissionResponse",
+        "RBACRoleCreate",
+        "RBACRoleListResponse",
+        "RBACRoleResponse",
+        "RBACRoleUpdate",
+        "RoleBase",
+        "RoleCreate",
+        "RoleListResponse",
+        "RolePermissionBase",
+        "RolePermissionCreate",
+        "RolePermissionResponse",
+        "RolePermissionUpdate",
+        "RoleResponse",
+        "RoleSearchRequest",
+        "RoleTemplate",
+        "RoleUpdate",
+        "RoleWithPermissions",
+        "UserPermissionCheck",
+        "UserPermissionResult",
+        "UserTenantRoleCreate",
+        "UserTenantRoleResponse",
+    ),
+    # Rbac Permission
+    "rbac_permission": (
+        "RBACPermissionBase",
+        "RBACPermissionCheck",
+        "RBACPermissionCheckResult",
+        "RBACPermissionCreate",
+        "RBACPermissionGrant",
+        "RBACPermissionList",
+        "RBACPermissionMatrix",
+        "RBACPermissionResponse",
+        "RBACPermissionStatistics",
+        "RBACPermissionUpdate",
+        "RBACPermissionsByCategory",
+    ),
+    # Rbac Role
+    "rbac_role": (
+        "RBACRoleAssignment",
+        "RBACRoleBase",
+        "RBACRoleCreate",
+        "RBACRoleHierarchy",
+        "RBACRoleList",
+        "RBACRolePermissionAssignment",
+        "RBACRoleResponse",
+        "RBACRoleStatistics",
+        "RBACRoleUpdate",
+        "RBACRoleWithPermissions",
+    ),
+    # Rbac Role Permission
+    "rbac_role_permission": (
+        "RBACRolePermissionBase",
+        "RBACRolePermissionCreate",
+        "RBACRolePermissionListResponse",
+        "RBACRolePermissionResponse",
+        "RBACRolePermissionUpdate",
+    ),
+    # Refresh Token
+    "refresh_token": (
+        "RefreshTokenAlert",
+        "RefreshTokenBase",
+        "RefreshTokenCleanup",
+        "RefreshTokenCleanupResult",
+        "RefreshTokenCreate",
+        "RefreshTokenList",
+        "RefreshTokenResponse",
+        "RefreshTokenRevoke",
+        "RefreshTokenRevokeResult",
+        "RefreshTokenSecurity",
+        "RefreshTokenStatistics",
+        "RefreshTokenUpdate",
+        "RefreshTokenUse",
+        "RefreshTokenUseResult",
+        "RefreshTokenValidation",
+        "RefreshTokenValidationResult",
+    ),
+    # Report Execution
+    "report_execution": (
+        "ExecutionStatus",
+        "ExecutionType",
+        "ReportExecutionBase",
+        "ReportExecutionBatch",
+        "ReportExecutionBatchResponse",
+        "ReportExecutionCancel",
+        "ReportExecutionCancelResponse",
+        "ReportExecutionCreate",
+        "ReportExecutionExport",
+        "ReportExecutionFilter",
+        "ReportExecutionInDB",
+        "ReportExecutionListResponse",
+        "ReportExecutionMonitoring",
+        "ReportExecutionResponse",
+        "ReportExecutionRetry",
+        "ReportExecutionRetryResponse",
+        "ReportExecutionStatistics",
+        "ReportExecutionTrigger",
+        "ReportExecutionTriggerResponse",
+        "ReportExecutionUpdate",
+    ),
+    # Subscription
+    "subscription": (
+        "SubscriptionBase",
+        "SubscriptionCreate",
+        "SubscriptionListResponse",
+        "SubscriptionResponse",
+        "SubscriptionStatus",
+        "SubscriptionSummary",
+        "SubscriptionUpdate",
+        "SubscriptionWithPlan",
+    ),
+    # Tag
+    "tag": (
+        "TagCreateSchema",
+        "TagListSchema",
+        "TagResponseSchema",
+        "TagUpdateSchema",
+    ),
+    # Template
+    "template": (
+        "CollectionBase",
+        "CollectionCreate",
+        "CollectionResponse",
+        "CollectionUpdate",
+        "DownloadCreate",
+        "DownloadResponse",
+        "FavoriteCreate",
+        "FavoriteResponse",
+        "FavoriteUpdate",
+        "MarketplaceStats",
+        "ReviewBase",
+        "ReviewCreate",
+        "ReviewResponse",
+        "ReviewUpdate",
+        "TemplateBase",
+        "TemplateCreate",
+        "TemplateDetailResponse",
+        "TemplateFilter",
+        "TemplateInstall",
+        "TemplateInstallResponse",
+        "TemplateListResponse",
+        "TemplateResponse",
+        "TemplateStats",
+        "TemplateUpdate",
+        "UserTemplateStats",
+    ),
+    # Tenant
+    "tenant": (
+        "BillingCycle",
+        "BulkTenantFeatureResult",
+        "BulkTenantFeatureUpdate",
+        "TenantBase",
+        "TenantBillingInfo",
+        "TenantCreate",
+        "TenantExportRequest",
+        "TenantFeatureBase",
+        "TenantFeatureCreate",
+        "TenantFeatureListResponse",
+        "TenantFeatureResponse",
+        "TenantFeatureUpdate",
+        "TenantImportRequest",
+        "TenantListResponse",
+        "TenantQuota",
+        "TenantResponse",
+        "TenantSearchRequest",
+        "TenantSettings",
+        "TenantStatus",
+        "TenantTheme",
+        "TenantUpdate",
+        "TenantUsageStats",
+        "TenantWithFeatures",
+        "TenantWithSettings",
+    ),
+    # Tenant Feature
+    "tenant_feature": (
+        "TenantFeatureBase",
+        "TenantFeatureBulkUpdate",
+        "TenantFeatureCreate",
+        "TenantFeatureList",
+        "TenantFeatureRead",
+        "TenantFeatureStats",
+        "TenantFeatureUpdate",
+        "TenantFeatureUsage",
+        "TenantFeatureWithDetails",
+    ),
+    # Tool
+    "tool": (
+        "ToolBase",
+        "ToolCreate",
+        "ToolExecution",
+        "ToolExecutionResult",
+        "ToolList",
+        "ToolResponse",
+        "ToolStatistics",
+        "ToolUpdate",
+    ),
+    # Usage Log
+    "usage_log": (
+        "UsageLogBase",
+        "UsageLogCreate",
+        "UsageLogList",
+        "UsageLogResponse",
+        "UsageLogSummary",
+        "UsageLogUpdate",
+    ),
+    # User
+    "user": (
+        "UserBase",
+        "UserCreate",
+        "UserListResponse",
+        "UserProfileResponse",
+        "UserProfileUpdate",
+        "UserResponse",
+        "UserRole",
+        "UserStatus",
+        "UserUpdate",
+    ),
+    # User Analytics
+    "user_analytics": (
+        "BulkInsightAction",
+        "BulkInsightActionResult",
+        "InsightCategory",
+        "InsightPriority",
+        "InsightType",
+        "PeriodType",
+        "UserAnalyticsReport",
+        "UserBehaviorMetricsBase",
+        "UserBehaviorMetricsCreate",
+        "UserBehaviorMetricsResponse",
+        "UserBehaviorMetricsUpdate",
+        "UserEngagementSummary",
+        "UserFeedback",
+        "UserInsightBase",
+        "UserInsightCreate",
+        "UserInsightResponse",
+        "UserInsightSummary",
+        "UserInsightUpdate",
+        "UserInsightsListResponse",
+        "UserInsightsSearchRequest",
+        "UserMetricsListResponse",
+        "UserMetricsSearchRequest",
+        "UserProductivityMetrics",
+    ),
+    # User Behavior Metric
+    "user_behavior_metric": (
+        "ActivityLevel",
+        "ChurnRiskResponse",
+        "CohortAnalysisResponse",
+        "EngagementTrendResponse",
+        "PeriodType",
+        "UserBehaviorMetricBase",
+        "UserBehaviorMetricCreate",
+        "UserBehaviorMetricInDB",
+        "UserBehaviorMetricListResponse",
+        "UserBehaviorMetricResponse",
+        "UserBehaviorMetricUpdate",
+        "UserBehaviorSummary",
+        "UserSegmentResponse",
+        "UserType",
+    ),
+    # User Digitalocean
+    "user_digitalocean": (
+        "UserDigitalOceanAuth",
+        "UserDigitalOceanBase",
+        "UserDigitalOceanCreate",
+        "UserDigitalOceanList",
+        "UserDigitalOceanPasswordUpdate",
+        "UserDigitalOceanRead",
+        "UserDigitalOceanStats",
+        "UserDigitalOceanUpdate",
+    ),
+    # User Features
+    "user_features": (
+        "BillingCycle",
+        "BulkVariableCreate",
+        "BulkVariableResult",
+        "BulkVariableUpdate",
+        "PaymentMethod",
+        "PaymentProvider",
+        "SubscriptionBillingInfo",
+        "SubscriptionInvoice",
+        "SubscriptionStatus",
+        "UserSubscriptionBase",
+        "UserSubscriptionCreate",
+        "UserSubscriptionListResponse",
+        "UserSubscriptionResponse",
+        "UserSubscriptionSearchRequest",
+        "UserSubscriptionUpdate",
+        "UserSubscriptionUsage",
+        "UserSubscriptionWithPlan",
+        "UserVariableBase",
+        "UserVariableCreate",
+        "UserVariableGroup",
+        "UserVariableListResponse",
+        "UserVariableResponse",
+        "UserVariableSearchRequest",
+        "UserVariableSecureResponse",
+        "UserVariableStats",
+        "UserVariableUpdate",
+        "UserVariableValidation",
+        "VariableCategory",
+        "VariableExportRequest",
+        "VariableImportRequest",
+        "VariableImportResult",
+    ),
+    # User Insight
+    "user_insight": (
+        "InsightCategory",
+        "InsightPriority",
+        "InsightType",
+        "UserInsightBase",
+        "UserInsightCreate",
+        "UserInsightListResponse",
+        "UserInsightResponse",
+        "UserInsightUpdate",
+    ),
+    # User Subscription
+    "user_subscription": (
+        "BillingCycle",
+        "SubscriptionStatus",
+        "UserSubscriptionBase",
+        "UserSubscriptionCreate",
+        "UserSubscriptionList",
+        "UserSubscriptionResponse",
+        "UserSubscriptionUpdate",
+    ),
+    # User Tenant Role
+    "user_tenant_role": (
+        "UserTenantRoleBase",
+        "UserTenantRoleCreate",
+        "UserTenantRoleListResponse",
+        "UserTenantRoleResponse",
+        "UserTenantRoleStatus",
+        "UserTenantRoleUpdate",
+    ),
+    # User Variable
+    "user_variable": (
+        "UserVariableBase",
+        "UserVariableCreate",
+        "UserVariableListResponse",
+        "UserVariableResponse",
+        "UserVariableUpdate",
+    ),
+    # Webhook Log
+    "webhook_log": (
+        "WebhookEventType",
+        "WebhookLogBase",
+        "WebhookLogBatch",
+        "WebhookLogCreate",
+        "WebhookLogExport",
+        "WebhookLogFilter",
+        "WebhookLogInDB",
+        "WebhookLogListResponse",
+        "WebhookLogResponse",
+        "WebhookLogRetry",
+        "WebhookLogStatistics",
+        "WebhookLogSummary",
+        "WebhookLogUpdate",
+        "WebhookStatus",
+    ),
+    # Workflow
+    "workflow": (
+        "ConnectionBase",
+        "ConnectionCreate",
+        "ConnectionResponse",
+        "ConnectionUpdate",
+        "ExecutionLogResponse",
+        "NodeBase",
+        "NodeCreate",
+        "NodeResponse",
+        "NodeUpdate",
+        "WorkflowAnalytics",
+        "WorkflowBase",
+        "WorkflowCreate",
+        "WorkflowExecutionCreate",
+        "WorkflowExecutionRequest",
+        "WorkflowExecutionResponse",
+        "WorkflowExecutionUpdate",
+        "WorkflowListResponse",
+        "WorkflowMetrics",
+        "WorkflowResponse",
+        "WorkflowSearch",
+        "WorkflowStats",
+        "WorkflowStatus",
+        "WorkflowTemplate",
+        "WorkflowTemplateResponse",
+        "WorkflowUpdate",
+        "WorkflowVersion",
+    ),
+    # Workflow Connection
+    "workflow_connection": (
+        "WorkflowConnectionBase",
+        "WorkflowConnectionCreate",
+        "WorkflowConnectionExecution",
+        "WorkflowConnectionGraph",
+        "WorkflowConnectionList",
+        "WorkflowConnectionPath",
+        "WorkflowConnectionResponse",
+        "WorkflowConnectionStatistics",
+        "WorkflowConnectionUpdate",
+        "WorkflowConnectionValidation",
+    ),
+    # Workflow Execution
+    "workflow_execution": (
+        "ExecutionBase",
+        "ExecutionBatch",
+        "ExecutionControl",
+        "ExecutionCreate",
+        "ExecutionFilter",
+        "ExecutionListResponse",
+        "ExecutionMetricsResponse",
+        "ExecutionResponse",
+        "ExecutionStats",
+        "ExecutionSummary",
+        "ExecutionUpdate",
+        "MetricCreate",
+        "MetricResponse",
+        "NodeExecutionBase",
+        "NodeExecutionCreate",
+        "NodeExecutionFilter",
+        "NodeExecutionResponse",
+        "NodeExecutionStats",
+        "NodeExecutionUpdate",
+        "QueueItemCreate",
+        "QueueItemResponse",
+        "WorkflowExecutionWithNodesResponse",
+        "WorkflowValidation",
+        "WorkflowValidation",
+    ),
+    # Workflow Execution Metric
+    "workflow_execution_metric": (
+        "WorkflowExecutionMetricBase",
+        "WorkflowExecutionMetricCreate",
+        "WorkflowExecutionMetricList",
+        "WorkflowExecutionMetricRead",
+        "WorkflowExecutionMetricStats",
+        "WorkflowExecutionMetricSummary",
+        "WorkflowExecutionMetricTrend",
+        "WorkflowExecutionMetricUpdate",
+        "WorkflowExecutionMetricValue",
+    ),
+    # Workflow Execution Queue
+    "workflow_execution_queue": (
+        "WorkflowExecutionQueueBase",
+        "WorkflowExecutionQueueCleanup",
+        "WorkflowExecutionQueueCleanupResult",
+        "WorkflowExecutionQueueCreate",
+        "WorkflowExecutionQueueDequeue",
+        "WorkflowExecutionQueueDequeueResult",
+        "WorkflowExecutionQueueEnqueue",
+        "WorkflowExecutionQueueEnqueueResult",
+        "WorkflowExecutionQueueExport",
+        "WorkflowExecutionQueueList",
+        "WorkflowExecutionQueueMonitoring",
+        "WorkflowExecutionQueueProcess",
+        "WorkflowExecutionQueueProcessResult",
+        "WorkflowExecutionQueueResponse",
+        "WorkflowExecutionQueueStatistics",
+        "WorkflowExecutionQueueUpdate",
+    ),
+    # Workflow Node
+    "workflow_node": (
+        "WorkflowNodeBase",
+        "WorkflowNodeCreate",
+        "WorkflowNodeExecution",
+        "WorkflowNodeList",
+        "WorkflowNodeResponse",
+        "WorkflowNodeStatistics",
+        "WorkflowNodeTemplate",
+        "WorkflowNodeUpdate",
+        "WorkflowNodeValidation",
+    ),
+    # Workflow Template
+    "workflow_template": (
+        "WorkflowTemplateBase",
+        "WorkflowTemplateCreate",
+        "WorkflowTemplateExport",
+        "WorkflowTemplateList",
+        "WorkflowTemplatePreview",
+        "WorkflowTemplateRating",
+        "WorkflowTemplateResponse",
+        "WorkflowTemplateStatistics",
+        "WorkflowTemplateUpdate",
+        "WorkflowTemplateUsage",
+        "WorkflowTemplateValidation",
+    ),
+    # Workspace
+    "workspace": (
+        "MemberInvite",
+        "WorkspaceBase",
+        "WorkspaceCreate",
+        "WorkspaceListResponse",
+        "WorkspaceResponse",
+        "WorkspaceStatus",
+        "WorkspaceType",
+        "WorkspaceUpdate",
+    ),
+    # Workspace Activity
+    "workspace_activity": (
+        "ActivityAction",
+        "ResourceType",
+        "WorkspaceActivityAlert",
+        "WorkspaceActivityBase",
+        "WorkspaceActivityBatch",
+        "WorkspaceActivityCreate",
+        "WorkspaceActivityExport",
+        "WorkspaceActivityFilter",
+        "WorkspaceActivityInDB",
+        "WorkspaceActivityInsight",
+        "WorkspaceActivityListResponse",
+        "WorkspaceActivityResponse",
+        "WorkspaceActivityStatistics",
+        "WorkspaceActivitySummary",
+        "WorkspaceActivityTimeline",
+        "WorkspaceActivityTimelineResponse",
+        "WorkspaceActivityUpdate",
+    ),
+    # Workspace Invitation
+    "workspace_invitation": (
+        "InvitationStatus",
+        "WorkspaceInvitationAccept",
+        "WorkspaceInvitationBase",
+        "WorkspaceInvitationBatch",
+        "WorkspaceInvitationBulkCreate",
+        "WorkspaceInvitationBulkCreateResponse",
+        "WorkspaceInvitationCreate",
+        "WorkspaceInvitationDecline",
+        "WorkspaceInvitationExport",
+        "WorkspaceInvitationFilter",
+        "WorkspaceInvitationInDB",
+        "WorkspaceInvitationListResponse",
+        "WorkspaceInvitationResend",
+        "WorkspaceInvitationResponse",
+        "WorkspaceInvitationStatistics",
+        "WorkspaceInvitationUpdate",
+    ),
+    # Workspace Member
+    "workspace_member": (
+        "WorkspaceMemberBase",
+        "WorkspaceMemberCreate",
+        "WorkspaceMemberListResponse",
+        "WorkspaceMemberResponse",
+        "WorkspaceMemberUpdate",
+    ),
+    # Workspace Project
+    "workspace_project": (
+        "ProjectStatus",
+        "WorkspaceProjectArchive",
+        "WorkspaceProjectBase",
+        "WorkspaceProjectBatch",
+        "WorkspaceProjectClone",
+        "WorkspaceProjectCloneResponse",
+        "WorkspaceProjectCreate",
+        "WorkspaceProjectDuplicate",
+        "WorkspaceProjectExport",
+        "WorkspaceProjectFilter",
+        "WorkspaceProjectInDB",
+        "WorkspaceProjectListResponse",
+        "WorkspaceProjectResponse",
+        "WorkspaceProjectRestore",
+        "WorkspaceProjectSettings",
+        "WorkspaceProjectStatistics",
+        "WorkspaceProjectTemplate",
+        "WorkspaceProjectTransfer",
+        "WorkspaceProjectUpdate",
+    ),
+}
+
+_SCHEMA_MODULES = {
+    name: module for module, names in _SUBMODULE_EXPORTS.items() for name in names
+}
+
+
+def __getattr__(name: str):
+    module = _SCHEMA_MODULES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_SCHEMA_MODULES))
 
-# Workspace Project
-from .workspace_project import (
-    ProjectStatus,
-    WorkspaceProjectArchive,
-    WorkspaceProjectBase,
-    WorkspaceProjectBatch,
-    WorkspaceProjectClone,
-    WorkspaceProjectCloneResponse,
-    WorkspaceProjectCreate,
-    WorkspaceProjectDuplicate,
-    WorkspaceProjectExport,
-    WorkspaceProjectFilter,
-    WorkspaceProjectInDB,
-    WorkspaceProjectListResponse,
-    WorkspaceProjectResponse,
-    WorkspaceProjectRestore,
-    WorkspaceProjectSettings,
-    WorkspaceProjectStatistics,
-    WorkspaceProjectTemplate,
-    WorkspaceProjectTransfer,
-    WorkspaceProjectUpdate,
-)
 
 __all__ = [
     "ABTestConfig",
@@ -1831,6 +1750,7 @@ __all__ = [
     "AnalyticsExportBase",
     "AnalyticsExportCreate",
     "AnalyticsExportListResponse",
+    "AnalyticsExportProgress",
     "AnalyticsExportResponse",
     "AnalyticsExportUpdate",
     "AnalyticsMetricAggregation",
@@ -2176,10 +2096,12 @@ __all__ = [
     "KnowledgeBaseIndexingStatus",
     "KnowledgeBaseList",
     "KnowledgeBaseResponse",
+    "KnowledgeBaseRetrievalRequest",
     "KnowledgeBaseSearch",
     "KnowledgeBaseSearchResponse",
     "KnowledgeBaseSearchResult",
     "KnowledgeBaseStatistics",
+    "KnowledgeBaseSyncResult",
     "KnowledgeBaseUpdate",
     "LLMCapability",
     "LLMConversationCreate",
@@ -2938,4 +2860,4 @@ __all__ = [
     "WorkspaceStatus",
     "WorkspaceType",
     "WorkspaceUpdate",
-]
\ No newline at end of file
+]
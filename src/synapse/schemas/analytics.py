@@ -87,7 +87,15 @@ class EventBase(BaseModel):
 
 
 class EventCreate(EventBase):
-    pass
+    event_id: str | None = Field(None, max_length=36)
+    anonymous_id: str | None = Field(None, max_length=100)
+    project_id: str | None = None
+    workspace_id: str | None = None
+    workflow_id: str | None = None
+
+
+class EventBatchCreate(BaseModel):
+    events: list[EventCreate] = Field(..., min_length=1, max_length=1000)
 
 
 class EventResponse(EventBase):
@@ -272,7 +280,9 @@ class DashboardData(BaseModel):
 
 class QueryConfig(BaseModel):
     type: str = Field(..., pattern="^(events|metrics|custom_sql)$")
+    columns: list[str] | None = None
     filters: dict[str, Any] = Field(default_factory=dict)
+    time_bucket: str | None = Field(None, pattern="^(hour|day|week|month)$")
     aggregations: list[dict[str, Any]] | None = None
     group_by: list[str] | None = None
     order_by: list[dict[str, str]] | None = None
@@ -355,6 +365,13 @@ class ReportResponse(ReportBase):
         return v
 
 
+class ReportExecutionRequest(BaseModel):
+    """Parâmetros de uma execução (sobrepõem o query_config do relatório)"""
+
+    parameters: dict[str, Any] | None = None
+    format: str | None = Field(None, pattern="^(jsonl|csv|columnar)$")
+
+
 class ReportExecutionResponse(BaseModel):
     id: int
     report_id: int
@@ -513,7 +530,8 @@ class ABTestResult(BaseModel):
 
 class ExportRequest(BaseModel):
     data_type: str = Field(..., pattern="^(events|metrics|users|workflows)$")
-    format: ReportFormat = ReportFormat.CSV
+    format: str = Field("csv", pattern="^(csv|json|jsonl|parquet)$")
+    compression: str | None = Field(None, pattern="^(gzip|zstd|none)$")
     filters: dict[str, Any] | None = Field(default_factory=dict)
     date_range: dict[str, str] | None = None
     columns: list[str] | None = None
@@ -558,7 +576,7 @@ class RealTimeStats(BaseModel):
 class AlertRule(BaseModel):
     name: str = Field(..., min_length=1, max_length=100)
     metric_name: str = Field(..., min_length=1, max_length=100)
-    condition: str = Field(..., pattern="^(greater_than|less_than|equals|not_equals)$")
+    condition: str = Field(..., pattern="^(greater_than|less_than|equals|not_equals|anomaly)$")
     threshold: float
     time_window_minutes: int = Field(5, ge=1, le=1440)
     notification_channels: list[str] = Field(..., min_items=1)
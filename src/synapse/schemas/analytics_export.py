@@ -15,11 +15,14 @@ class ExportStatus(str, Enum):
     COMPLETED = "completed"
     FAILED = "failed"
     CANCELLED = "cancelled"
+    EXPIRED = "expired"
 
 class ExportType(str, Enum):
     """Enum for the type of export."""
     CSV = "csv"
     JSON = "json"
+    JSONL = "jsonl"
+    PARQUET = "parquet"
     PDF = "pdf"
     XLSX = "xlsx"
 
@@ -51,6 +54,29 @@ class AnalyticsExportResponse(AnalyticsExportBase):
     created_at: datetime = Field(..., description="Timestamp of when the export was created.")
     completed_at: Optional[datetime] = Field(None, description="Timestamp of when the export was completed.")
     updated_at: Optional[datetime] = Field(None, description="Timestamp of the last update.")
+    rows_exported: Optional[int] = Field(None, description="Rows written by completed partitions.")
+    bytes_written: Optional[int] = Field(None, description="Bytes written by completed partitions.")
+    error_message: Optional[str] = Field(None, description="Why the export failed, if it did.")
+
+class AnalyticsExportProgress(BaseModel):
+    """Partition-level progress and per-worker throughput of an export."""
+    export_id: str
+    name: str
+    status: str
+    format: str
+    compression: Optional[str] = None
+    progress: float = Field(..., description="Percentage of completed partitions.")
+    partitions: int
+    partitions_completed: int
+    partitions_failed: int
+    rows_exported: int
+    bytes_written: int
+    workers: Dict[str, Dict[str, float]] = Field(
+        default_factory=dict, description="Rows, seconds and rows/sec per export worker."
+    )
+    created_at: Optional[str] = None
+    completed_at: Optional[str] = None
+    error_message: Optional[str] = None
 
 class AnalyticsExportListResponse(BaseModel):
     """Paginated list of analytics exports."""
@@ -181,6 +181,38 @@ class KnowledgeBaseIndexing(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class KnowledgeBaseSyncResult(BaseModel):
+    """Schema para resultado da sincronização (re-indexação incremental)"""
+    
+    kb_id: UUID = Field(..., description="ID da base de conhecimento")
+    sync_status: str = Field(..., description="Status da sincronização")
+    synced_items: int = Field(0, description="Chunks embedados nesta sincronização")
+    
+    # Detalhamento dos chunks
+    total_chunks: int = Field(0, description="Total de chunks após a sincronização")
+    added_chunks: int = Field(0, description="Chunks novos")
+    reembedded_chunks: int = Field(0, description="Chunks re-embedados")
+    removed_chunks: int = Field(0, description="Chunks removidos")
+    unchanged_chunks: int = Field(0, description="Chunks sem alteração")
+    
+    duration_ms: int = Field(0, description="Duração da sincronização em ms")
+    errors: List[str] = Field(default_factory=list, description="Erros encontrados")
+    
+    model_config = ConfigDict(from_attributes=True)
+
+
+class KnowledgeBaseRetrievalRequest(BaseModel):
+    """Schema para busca top-k por similaridade vetorial"""
+    
+    query: str = Field(..., min_length=1, description="Consulta de busca")
+    top_k: int = Field(5, ge=1, le=100, description="Quantidade de chunks retornados")
+    min_score: Optional[float] = Field(None, description="Score mínimo (cosseno)")
+    filters: Optional[Dict[str, Any]] = Field(
+        None,
+        description="Filtros de metadata (igualdade, lista ou operadores $in/$gt/...)",
+    )
+
+
 class KnowledgeBaseIndexingStatus(BaseModel):
     """Schema para status da indexação"""
     
@@ -8,7 +8,7 @@ from datetime import datetime
 from typing import Any, Dict, List, Optional
 from uuid import UUID
 
-from pydantic import BaseModel, Field, validator
+from pydantic import AliasChoices, BaseModel, Field, validator
 
 from synapse.models.workflow_execution import ExecutionStatus, NodeExecutionStatus
 
@@ -33,7 +33,7 @@ class ExecutionBase(BaseModel):
 class ExecutionCreate(ExecutionBase):
     """Schema para criação de execução de workflow"""
 
-    workflow_id: int = Field(..., gt=0)
+    workflow_id: UUID
 
     @validator("variables")
     def validate_variables(cls, v):
@@ -124,7 +124,10 @@ class NodeExecutionBase(BaseModel):
     max_retries: int = Field(default=3, ge=0, le=10)
     retry_delay_ms: int = Field(default=1000, ge=0)
     dependencies: list[str] | None = None
-    metadata: dict[str, Any] | None = None
+    # No modelo a coluna "metadata" é o atributo execution_metadata
+    metadata: dict[str, Any] | None = Field(
+        None, validation_alias=AliasChoices("execution_metadata", "metadata")
+    )
 
 
 class NodeExecutionCreate(NodeExecutionBase):
@@ -152,8 +155,8 @@ class NodeExecutionResponse(NodeExecutionBase):
 
     id: int
     execution_id: str
-    workflow_execution_id: int
-    node_id: int
+    workflow_execution_id: UUID
+    node_id: UUID
     status: NodeExecutionStatus
     output_data: dict[str, Any] | None = None
     started_at: datetime | None = None
@@ -0,0 +1,260 @@
+"""
+Serviço de Usuários Ativos
+Mantém um sketch HyperLogLog diário de usuários ativos (global e por tenant),
+atualizado na ingestão; DAU/WAU/MAU e janelas arbitrárias viram mesclas de
+sketches em vez de COUNT(DISTINCT) sobre analytics_events
+"""
+
+import logging
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.orm import Session
+
+from synapse.core.analytics.hll import HyperLogLog, hash_member
+from synapse.core.config import settings
+from synapse.models.active_user_sketch import GLOBAL_SCOPE, ActiveUserSketch
+from synapse.models.analytics_event import AnalyticsEvent
+
+logger = logging.getLogger(__name__)
+
+SketchKey = Tuple[date, str]
+
+# Janelas nomeadas, em dias (terminando no dia de referência, inclusive)
+ACTIVE_USER_WINDOWS: Dict[str, int] = {"dau": 1, "wau": 7, "mau": 30}
+
+
+def scope_for(tenant_id: Any = None) -> str:
+    return str(tenant_id) if tenant_id else GLOBAL_SCOPE
+
+
+def _utc_day(timestamp: datetime) -> date:
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.replace(tzinfo=None) - (timestamp.utcoffset() or timedelta())
+    return timestamp.date()
+
+
+def collect_active_users(rows: Iterable[Dict[str, Any]]) -> Dict[SketchKey, Set[int]]:
+    """Hashes dos usuários ativos por (dia UTC, escopo); cada evento conta no global e no seu tenant"""
+    updates: Dict[SketchKey, Set[int]] = defaultdict(set)
+    for row in rows:
+        if row.get("user_id") is None:
+            continue
+        member = hash_member(row["user_id"])
+        day = _utc_day(row["timestamp"])
+        updates[(day, GLOBAL_SCOPE)].add(member)
+        if row.get("tenant_id") is not None:
+            updates[(day, scope_for(row["tenant_id"]))].add(member)
+    return updates
+
+
+@dataclass
+class ActiveUserCount:
+    """Contagem de usuários distintos de uma janela"""
+
+    value: int
+    exact: bool
+    relative_error: float
+    start_day: date
+    end_day: date
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "value": self.value,
+            "exact": self.exact,
+            "relative_error": round(self.relative_error, 4),
+            "start_day": self.start_day.isoformat(),
+            "end_day": self.end_day.isoformat(),
+        }
+
+
+class ActiveUserService:
+    """
+    Sketches diários de usuários ativos.
+
+    Cada sketch é exato até ``ANALYTICS_HLL_EXACT_THRESHOLD`` usuários e
+    depois aproximado com erro relativo padrão 1.04/sqrt(2^p) (0,81% com
+    p=14). A união de sketches exatos é exata, então tenants pequenos recebem
+    contagens exatas em qualquer janela.
+    """
+
+    def __init__(self, precision: Optional[int] = None, exact_threshold: Optional[int] = None):
+        self.precision = precision or settings.ANALYTICS_HLL_PRECISION
+        self.exact_threshold = exact_threshold or settings.ANALYTICS_HLL_EXACT_THRESHOLD
+
+    def new_sketch(self) -> HyperLogLog:
+        return HyperLogLog(precision=self.precision, exact_threshold=self.exact_threshold)
+
+    # ==================== ATUALIZAÇÃO ====================
+
+    def record(self, db: Session, rows: Iterable[Dict[str, Any]]) -> int:
+        """Incorpora linhas de analytics_events (na transação da gravação do lote)"""
+        updates = collect_active_users(rows)
+        self.apply(db, updates)
+        return len(updates)
+
+    def apply(self, db: Session, updates: Dict[SketchKey, Set[int]]) -> None:
+        """
+        Mescla hashes novos nos sketches gravados.
+
+        As linhas ausentes são criadas vazias (ON CONFLICT DO NOTHING) e depois
+        travadas com FOR UPDATE em ordem fixa, então gravações concorrentes do
+        mesmo dia se serializam sem perder usuários.
+        """
+        if not updates:
+            return
+        keys = sorted(updates)
+        table = ActiveUserSketch.__table__
+        empty = self.new_sketch().to_bytes()
+
+        dialect = db.get_bind().dialect.name
+        supports_upsert = dialect in ("postgresql", "sqlite")
+        if supports_upsert:
+            if dialect == "postgresql":
+                from sqlalchemy.dialects.postgresql import insert as upsert
+            else:
+                from sqlalchemy.dialects.sqlite import insert as upsert
+            db.execute(
+                upsert(table).on_conflict_do_nothing(index_elements=["day", "scope"]),
+                [{"day": day, "scope": scope, "sketch": empty} for day, scope in keys],
+            )
+
+        stored = {}
+        for day in sorted({day for day, _ in keys}):
+            scopes = sorted(scope for key_day, scope in keys if key_day == day)
+            query = (
+                select(table.c.day, table.c.scope, table.c.sketch)
+                .where(table.c.day == day, table.c.scope.in_(scopes))
+                .order_by(table.c.scope)
+                .with_for_update()
+            )
+            for row in db.execute(query):
+                stored[(row.day, row.scope)] = HyperLogLog.from_bytes(row.sketch)
+
+        values = []
+        for key in keys:
+            sketch = stored.get(key) or self.new_sketch()
+            sketch.add_hashes(updates[key])
+            values.append({"day": key[0], "scope": key[1], "sketch": sketch.to_bytes()})
+
+        if supports_upsert:
+            db.execute(update(ActiveUserSketch), values)
+        else:
+            for value in values:
+                db.merge(ActiveUserSketch(**value))
+
+    def rebuild_day(self, db: Session, day: date) -> int:
+        """Recalcula os sketches de um dia a partir dos eventos brutos"""
+        start = datetime.combine(day, time.min)
+        rows = db.execute(
+            select(AnalyticsEvent.user_id, AnalyticsEvent.tenant_id)
+            .where(
+                AnalyticsEvent.timestamp >= start,
+                AnalyticsEvent.timestamp < start + timedelta(days=1),
+                AnalyticsEvent.user_id.isnot(None),
+            )
+            .distinct()
+        )
+        updates = collect_active_users(
+            {"user_id": user_id, "tenant_id": tenant_id, "timestamp": start} for user_id, tenant_id in rows
+        )
+        # O sketch global é gravado mesmo vazio: marca o dia como processado
+        updates.setdefault((day, GLOBAL_SCOPE), set())
+        db.execute(delete(ActiveUserSketch).where(ActiveUserSketch.day == day))
+        self.apply(db, updates)
+        return len(updates)
+
+    def backfill(self, db: Session, days: Optional[int] = None, today: Optional[date] = None) -> int:
+        """Reconstrói os dias recentes sem sketch global (histórico anterior à ingestão com sketches)"""
+        today = today or datetime.utcnow().date()
+        days = days if days is not None else settings.ANALYTICS_ACTIVE_USERS_BACKFILL_DAYS
+        wanted = {today - timedelta(days=offset) for offset in range(days)}
+        present = set(
+            db.execute(
+                select(ActiveUserSketch.day).where(
+                    ActiveUserSketch.scope == GLOBAL_SCOPE,
+                    ActiveUserSketch.day.in_(sorted(wanted)),
+                )
+            ).scalars()
+        )
+        missing = sorted(wanted - present)
+        for day in missing:
+            self.rebuild_day(db, day)
+            db.commit()
+        return len(missing)
+
+    def purge(self, db: Session, today: Optional[date] = None) -> int:
+        today = today or datetime.utcnow().date()
+        cutoff = today - timedelta(days=settings.ANALYTICS_ACTIVE_USERS_RETENTION_DAYS)
+        result = db.execute(delete(ActiveUserSketch).where(ActiveUserSketch.day < cutoff))
+        db.commit()
+        return result.rowcount or 0
+
+    # ==================== CONSULTA ====================
+
+    def load(self, db: Session, start_day: date, end_day: date, scope: str = GLOBAL_SCOPE) -> List[HyperLogLog]:
+        rows = db.execute(
+            select(ActiveUserSketch.sketch).where(
+                ActiveUserSketch.scope == scope,
+                ActiveUserSketch.day >= start_day,
+                ActiveUserSketch.day <= end_day,
+            )
+        ).scalars()
+        return [HyperLogLog.from_bytes(data) for data in rows]
+
+    def distinct_users(
+        self, db: Session, start_day: date, end_day: date, tenant_id: Any = None
+    ) -> ActiveUserCount:
+        """Usuários distintos ativos entre ``start_day`` e ``end_day`` (inclusive)"""
+        sketch = HyperLogLog.union(
+            self.load(db, start_day, end_day, scope_for(tenant_id)),
+            precision=self.precision,
+            exact_threshold=self.exact_threshold,
+        )
+        return ActiveUserCount(
+            value=sketch.count(),
+            exact=sketch.is_exact,
+            relative_error=sketch.relative_error,
+            start_day=start_day,
+            end_day=end_day,
+        )
+
+    def window(
+        self, db: Session, days: int, end_day: Optional[date] = None, tenant_id: Any = None
+    ) -> ActiveUserCount:
+        """Janela de ``days`` dias terminando em ``end_day`` (hoje, por padrão)"""
+        end_day = end_day or datetime.utcnow().date()
+        return self.distinct_users(db, end_day - timedelta(days=days - 1), end_day, tenant_id)
+
+    def summary(self, db: Session, end_day: Optional[date] = None, tenant_id: Any = None) -> Dict[str, Any]:
+        """DAU/WAU/MAU com a mesma leitura (30 sketches diários)"""
+        end_day = end_day or datetime.utcnow().date()
+        start_day = end_day - timedelta(days=max(ACTIVE_USER_WINDOWS.values()) - 1)
+        scope = scope_for(tenant_id)
+        rows = db.execute(
+            select(ActiveUserSketch.day, ActiveUserSketch.sketch).where(
+                ActiveUserSketch.scope == scope,
+                ActiveUserSketch.day >= start_day,
+                ActiveUserSketch.day <= end_day,
+            )
+        ).all()
+        daily = [(day, HyperLogLog.from_bytes(data)) for day, data in rows]
+
+        result = {}
+        for name, days in ACTIVE_USER_WINDOWS.items():
+            first = end_day - timedelta(days=days - 1)
+            sketch = HyperLogLog.union(
+                (sketch for day, sketch in daily if day >= first),
+                precision=self.precision,
+                exact_threshold=self.exact_threshold,
+            )
+            result[name] = ActiveUserCount(
+                sketch.count(), sketch.is_exact, sketch.relative_error, first, end_day
+            ).to_dict()
+        return result
+
+
+active_user_service = ActiveUserService()
@@ -10,7 +10,6 @@ from typing import Dict, Any, List, Optional, Union, Tuple
 from sqlalchemy.orm import Session
 from sqlalchemy import and_, or_, desc, func, text, select
 from sqlalchemy.exc import SQLAlchemyError
-import json
 import uuid
 from enum import Enum
 from dataclasses import dataclass, asdict
@@ -19,8 +18,13 @@ from synapse.models.analytics_alert import AnalyticsAlert
 from synapse.models.analytics_event import AnalyticsEvent  
 from synapse.models.analytics_metric import AnalyticsMetric
 from synapse.models.user import User
-from synapse.core.email.service import EmailService
-from synapse.core.websockets.manager import ConnectionManager
+from synapse.core.alerts.evaluation import (
+    AGGREGATIONS,
+    AggregateKey,
+    aggregate_key,
+    compute_aggregates,
+)
+from synapse.core.alerts.notifications import Notification, notification_dispatcher
 from synapse.schemas.analytics import AlertCreate, AlertUpdate
 
 logger = logging.getLogger(__name__)
@@ -100,8 +104,6 @@ class AlertService:
 
     def __init__(self, db: Session):
         self.db = db
-        self.email_service = EmailService()
-        self.websocket_manager = ConnectionManager()
         self._alert_states: Dict[str, AlertState] = {}  # Enhanced state tracking
         self._evaluation_running = False
         self._evaluation_interval = 30  # seconds
@@ -519,23 +521,40 @@ class AlertService:
                 .all()
             )
 
+            # One grouped query per tick for every distinct (metric, aggregation, window)
+            keys = {str(alert.id): self._aggregate_key(alert.condition) for alert in alerts}
+            values = await asyncio.to_thread(
+                compute_aggregates, self.db, set(keys.values()), datetime.utcnow()
+            )
+
             for alert in alerts:
                 try:
-                    await self._evaluate_alert(alert)
+                    value = values.get(keys[str(alert.id)])
+                    await self._evaluate_alert(alert, value if value is not None else 0.0)
                 except Exception as e:
                     logger.error(f"Failed to evaluate alert {alert.id}: {str(e)}")
 
         except Exception as e:
             logger.error(f"Failed to evaluate alerts: {str(e)}")
 
-    async def _evaluate_alert(self, alert: AnalyticsAlert):
+    @staticmethod
+    def _aggregate_key(condition: Dict[str, Any]) -> AggregateKey:
+        aggregation = condition.get("aggregation", "avg")
+        if aggregation not in AGGREGATIONS:
+            aggregation = "sum"  # same fallback as _get_metric_value
+        return aggregate_key(condition.get("metric"), aggregation, condition.get("timeframe", 300))
+
+    async def _evaluate_alert(
+        self, alert: AnalyticsAlert, current_value: Optional[float] = None
+    ):
         """Evaluate a specific alert"""
         try:
             alert_id = str(alert.id)
             condition = alert.condition
 
             # Get current metric value based on condition
-            current_value = await self._get_metric_value(condition)
+            if current_value is None:
+                current_value = await self._get_metric_value(condition)
 
             # Update alert state
             if alert_id not in self._alert_states:
@@ -673,7 +692,7 @@ class AlertService:
     async def _send_alert_notifications(
         self, alert: AnalyticsAlert, current_value: float
     ):
-        """Send alert notifications through configured channels"""
+        """Queue alert notifications for the configured channels"""
         try:
             notification_config = alert.notification_config
             channels = notification_config.get("channels", [])
@@ -684,145 +703,58 @@ class AlertService:
                 logger.error(f"Alert owner not found for alert {alert.id}")
                 return
 
-            # Prepare notification content
             severity = self._get_alert_severity(alert.condition)
-            subject = f"🚨 Alert Triggered: {alert.name}"
+            triggered_at = datetime.utcnow()
 
-            notification_data = {
+            payload = {
+                "event": "alert_triggered",
                 "alert_id": str(alert.id),
                 "alert_name": alert.name,
                 "description": alert.description,
+                "severity": severity.value,
+                "metric_name": alert.condition.get("metric"),
                 "current_value": current_value,
                 "threshold": alert.condition.get("threshold"),
-                "severity": severity.value,
-                "triggered_at": datetime.utcnow().isoformat(),
-                "owner_email": owner.email,
-                "owner_name": owner.full_name or owner.email,
+                "condition": alert.condition.get("operator"),
+                "triggered_at": triggered_at.isoformat(),
+                "user_id": str(alert.owner_id),
             }
 
-            # Send notifications through each channel
+            notifications = []
             for channel in channels:
-                try:
-                    if channel["type"] == NotificationChannel.EMAIL.value:
-                        await self._send_email_notification(
-                            notification_data, channel.get("config", {})
-                        )
-                    elif channel["type"] == NotificationChannel.WEBSOCKET.value:
-                        await self._send_websocket_notification(
-                            notification_data, channel.get("config", {})
-                        )
-                    elif channel["type"] == NotificationChannel.WEBHOOK.value:
-                        await self._send_webhook_notification(
-                            notification_data, channel.get("config", {})
-                        )
+                channel_type = channel.get("type")
+                channel_config = channel.get("config", {})
+                if channel_type == NotificationChannel.EMAIL.value:
+                    recipient = channel_config.get("email") or owner.email
+                    config = {"user_name": owner.full_name or owner.email}
+                elif channel_type == NotificationChannel.WEBSOCKET.value:
+                    recipient, config = str(alert.owner_id), {}
+                elif channel_type == NotificationChannel.WEBHOOK.value:
+                    recipient = channel_config.get("url")
+                    config = {"headers": channel_config.get("headers", {})}
+                else:
                     # Add Slack integration if needed
+                    continue
 
-                except Exception as e:
-                    logger.error(
-                        f"Failed to send notification via {channel['type']}: {str(e)}"
+                if not recipient:
+                    logger.error(f"No {channel_type} recipient configured for alert {alert.id}")
+                    continue
+                notifications.append(
+                    Notification(
+                        channel=channel_type,
+                        recipient=recipient,
+                        payload=payload,
+                        alert_id=alert.id,
+                        tenant_id=alert.tenant_id,
+                        config=config,
+                        fired_at=triggered_at,
                     )
+                )
 
-        except Exception as e:
-            logger.error(f"Failed to send alert notifications: {str(e)}")
-
-    async def _send_email_notification(
-        self, notification_data: Dict[str, Any], channel_config: Dict[str, Any]
-    ):
-        """Send email notification"""
-        try:
-            severity_emoji = {"low": "ℹ️", "medium": "⚠️", "high": "🔥", "critical": "💥"}
-
-            emoji = severity_emoji.get(notification_data["severity"], "🚨")
-
-            content = f"""
-            <h3>{emoji} Alert Triggered</h3>
-            <p><strong>Alert:</strong> {notification_data['alert_name']}</p>
-            <p><strong>Description:</strong> {notification_data['description']}</p>
-            <p><strong>Current Value:</strong> {notification_data['current_value']}</p>
-            <p><strong>Threshold:</strong> {notification_data['threshold']}</p>
-            <p><strong>Severity:</strong> {notification_data['severity'].upper()}</p>
-            <p><strong>Triggered At:</strong> {notification_data['triggered_at']}</p>
-            
-            <p>Please check your monitoring dashboard for more details.</p>
-            """
-
-            await self.email_service.send_notification_email(
-                email=notification_data["owner_email"],
-                title=f"Alert Triggered: {notification_data['alert_name']}",
-                content=content,
-                user_name=notification_data["owner_name"],
-                subject=f"🚨 Alert: {notification_data['alert_name']}",
-            )
-
-            logger.info(
-                f"Email notification sent for alert {notification_data['alert_id']}"
-            )
-
-        except Exception as e:
-            logger.error(f"Failed to send email notification: {str(e)}")
-
-    async def _send_websocket_notification(
-        self, notification_data: Dict[str, Any], channel_config: Dict[str, Any]
-    ):
-        """Send WebSocket notification"""
-        try:
-            # Send to alert owner via WebSocket
-            await self.websocket_manager.send_user_message(
-                user_id=str(notification_data["alert_id"]),  # This should be owner_id
-                message={"type": "alert_triggered", "data": notification_data},
-            )
-
-            logger.info(
-                f"WebSocket notification sent for alert {notification_data['alert_id']}"
-            )
-
-        except Exception as e:
-            logger.error(f"Failed to send WebSocket notification: {str(e)}")
-
-    async def _send_webhook_notification(
-        self, notification_data: Dict[str, Any], channel_config: Dict[str, Any]
-    ):
-        """Send webhook notification"""
-        try:
-            import aiohttp
-
-            webhook_url = channel_config.get("url")
-            if not webhook_url:
-                logger.error("Webhook URL not configured")
-                return
-
-            # Prepare webhook payload
-            payload = {
-                "event": "alert_triggered",
-                "timestamp": notification_data["triggered_at"],
-                "alert": {
-                    "id": notification_data["alert_id"],
-                    "name": notification_data["alert_name"],
-                    "description": notification_data["description"],
-                    "severity": notification_data["severity"],
-                    "current_value": notification_data["current_value"],
-                    "threshold": notification_data["threshold"],
-                },
-            }
-
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    webhook_url,
-                    json=payload,
-                    headers={"Content-Type": "application/json"},
-                    timeout=aiohttp.ClientTimeout(total=10),
-                ) as response:
-                    if response.status == 200:
-                        logger.info(
-                            f"Webhook notification sent for alert {notification_data['alert_id']}"
-                        )
-                    else:
-                        logger.error(
-                            f"Webhook notification failed with status {response.status}"
-                        )
+            notification_dispatcher.enqueue(notifications)
 
         except Exception as e:
-            logger.error(f"Failed to send webhook notification: {str(e)}")
+            logger.error(f"Failed to send alert notifications: {str(e)}")
 
     def _get_alert_severity(self, condition: Dict[str, Any]) -> AlertSeverity:
         """Determine alert severity based on condition"""
@@ -6,24 +6,25 @@ Lógica de negócio para analytics e insights
 
 from typing import List, Optional, Dict, Any, Union
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, desc, asc, func, text
+from sqlalchemy import Float, Integer, and_, or_, desc, asc, func, insert, text
 from datetime import datetime, timedelta
-import json
 import uuid
 from collections import defaultdict
+from functools import partial
 
 from synapse.models.analytics_event import AnalyticsEvent
-from synapse.models.analytics import EventType, MetricType
+from synapse.models.analytics import MetricType
 from synapse.models.analytics_alert import AnalyticsAlert
 from synapse.models.user_behavior_metric import UserBehaviorMetric
 from synapse.models.analytics import SystemPerformanceMetric, AnalyticsBusinessMetric
-from synapse.models.custom_report import CustomReport
+from synapse.models.analytics_report import AnalyticsReport
 from synapse.models.report_execution import ReportExecution
 from synapse.models.user_insight import UserInsight
 from synapse.models.analytics_dashboard import AnalyticsDashboard
 from synapse.models.user import User
 from synapse.models.workflow import Workflow
 from synapse.models.workspace import Workspace
+from synapse.models.workspace_project import WorkspaceProject
 from synapse.schemas.analytics import (
     EventCreate,
     MetricCreate,
@@ -32,6 +33,27 @@ from synapse.schemas.analytics import (
     AnalyticsQuery,
     InsightRequest,
 )
+from synapse.core.analytics.downsampling import lttb_indices
+from synapse.core.analytics.report_query import compile_report_query
+from synapse.core.analytics.ingestion import (
+    TENANT_SCOPED_COLUMNS,
+    IngestResult,
+    build_event_row,
+    derive_metric_rows,
+    ingestion_pipeline,
+)
+from synapse.core.config import settings
+from synapse.services.active_user_service import ACTIVE_USER_WINDOWS, active_user_service
+from synapse.services.bulk_export_service import bulk_export_service, export_status
+from synapse.services.dashboard_evaluator import DashboardEvaluator, WIDGET_HANDLERS
+from synapse.services.funnel_service import FunnelService, tenant_scope
+from synapse.services.metric_anomaly_service import metric_anomaly_service
+from synapse.services.metric_rollup_service import metric_rollup_service
+from synapse.services.report_job_service import (
+    REPORT_SOURCES,
+    execution_status,
+    report_job_service,
+)
 from synapse.core.alerts.alert_engine import (
     alert_engine,
     AlertSeverity,
@@ -51,42 +73,14 @@ class AnalyticsService:
     # ==================== EVENTOS ====================
 
     def track_event(
-        self, event_data: EventCreate, user_id: Optional[int] = None
-    ) -> AnalyticsEvent:
-        """Registra um evento de analytics"""
-
-        event = AnalyticsEvent(
-            user_id=user_id,
-            session_id=event_data.session_id,
-            event_type=EventType(event_data.event_type),
-            event_name=event_data.event_name,
-            event_category=event_data.event_category,
-            event_action=event_data.event_action,
-            event_label=event_data.event_label,
-            event_value=event_data.event_value,
-            properties=event_data.properties or {},
-            page_url=event_data.page_url,
-            page_title=event_data.page_title,
-            referrer=event_data.referrer,
-            user_agent=event_data.user_agent,
-            ip_address=event_data.ip_address,
-            country=event_data.country,
-            city=event_data.city,
-            device_type=event_data.device_type,
-            browser=event_data.browser,
-            os=event_data.os,
-            screen_resolution=event_data.screen_resolution,
-            duration_ms=event_data.duration_ms,
-        )
-
-        self.db.add(event)
-        self.db.commit()
-        self.db.refresh(event)
-
-        # Processar métricas derivadas
-        self._process_derived_metrics(event)
-
-        return event
+        self,
+        event_data: EventCreate,
+        user_id: Optional[Any] = None,
+        tenant_id: Optional[Any] = None,
+        project_id: Optional[Any] = None,
+    ) -> Dict[str, Any]:
+        """Registra um evento de analytics (enfileirado no pipeline de ingestão)"""
+        return self.track_events_batch([event_data], user_id, tenant_id, project_id)
 
     def get_events(self, query: AnalyticsQuery) -> Dict[str, Any]:
         """Obtém eventos com filtros"""
@@ -263,16 +257,11 @@ class AnalyticsService:
 
         return dashboard
 
-    def get_dashboard_data(
-        self,
-        dashboard_id: int,
-        user_id: int,
-        start_date: Optional[datetime] = None,
-        end_date: Optional[datetime] = None,
-    ) -> Dict[str, Any]:
-        """Obtém dados do dashboard"""
-
-        dashboard = (
+    def get_accessible_dashboard(
+        self, dashboard_id: Any, user_id: Any
+    ) -> Optional[AnalyticsDashboard]:
+        """Dashboard do usuário ou público"""
+        return (
             self.db.query(AnalyticsDashboard)
             .filter(
                 and_(
@@ -286,34 +275,29 @@ class AnalyticsService:
             .first()
         )
 
+    def get_dashboard_data(
+        self,
+        dashboard_id: int,
+        user_id: int,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+    ) -> Dict[str, Any]:
+        """
+        Obtém dados do dashboard (sequencial, na sessão atual).
+        Endpoints usam o ``DashboardEvaluator``, que avalia os widgets em paralelo.
+        """
+
+        dashboard = self.get_accessible_dashboard(dashboard_id, user_id)
         if not dashboard:
             return {}
 
         # Processar widgets
         widget_data = {}
         for widget in dashboard.widgets:
-            widget_id = widget.get("id")
-            widget_type = widget.get("type")
-            widget_config = widget.get("config", {})
-
-            # Add date filters to widget config if provided
-            if start_date or end_date:
-                widget_config = {
-                    **widget_config,
-                    "start_date": start_date,
-                    "end_date": end_date,
-                }
-
-            if widget_type == "metric_chart":
-                widget_data[widget_id] = self._get_metric_chart_data(widget_config)
-            elif widget_type == "event_timeline":
-                widget_data[widget_id] = self._get_event_timeline_data(widget_config)
-            elif widget_type == "user_funnel":
-                widget_data[widget_id] = self._get_user_funnel_data(widget_config)
-            elif widget_type == "kpi_card":
-                widget_data[widget_id] = self._get_kpi_card_data(widget_config)
-            elif widget_type == "heatmap":
-                widget_data[widget_id] = self._get_heatmap_data(widget_config)
+            handler = WIDGET_HANDLERS.get(widget.get("type"))
+            if handler:
+                config = DashboardEvaluator.widget_config(widget, start_date, end_date)
+                widget_data[widget.get("id")] = getattr(self, handler)(config)
 
         return {
             "dashboard": dashboard,
@@ -327,20 +311,26 @@ class AnalyticsService:
 
     # ==================== RELATÓRIOS ====================
 
-    def create_report(self, report_data: ReportCreate, user_id: int) -> CustomReport:
-        """Cria um relatório personalizado"""
+    def create_report(self, report_data: ReportCreate, user_id: Any) -> AnalyticsReport:
+        """Cria um relatório (a consulta é validada pelo query builder)"""
 
-        report = CustomReport(
-            user_id=user_id,
+        query_config = report_data.query_config.model_dump(exclude_none=True)
+        compile_report_query(query_config, REPORT_SOURCES)
+
+        schedule = None
+        if report_data.is_scheduled and report_data.schedule_config:
+            schedule = report_data.schedule_config.frequency
+
+        user = self.db.query(User).filter(User.id == user_id).first()
+        report = AnalyticsReport(
+            id=uuid.uuid4(),
             name=report_data.name,
             description=report_data.description,
-            report_type=report_data.report_type,
-            query_config=report_data.query_config,
-            visualization_config=report_data.visualization_config or {},
-            schedule_config=report_data.schedule_config or {},
-            recipients=report_data.recipients or [],
-            is_scheduled=report_data.is_scheduled or False,
-            format=report_data.format or "json",
+            report_query=query_config,
+            schedule=schedule,
+            owner_id=user_id,
+            is_active=True,
+            tenant_id=getattr(user, "tenant_id", None),
         )
 
         self.db.add(report)
@@ -349,69 +339,40 @@ class AnalyticsService:
 
         return report
 
-    def execute_report(
-        self, report_id: int, user_id: int, parameters: Optional[Dict[str, Any]] = None
-    ) -> Dict[str, Any]:
-        """Executa um relatório"""
-
-        report = (
-            self.db.query(CustomReport)
+    def get_owned_report(self, report_id: Any, user_id: Any) -> Optional[AnalyticsReport]:
+        return (
+            self.db.query(AnalyticsReport)
             .filter(
                 and_(
-                    CustomReport.id == report_id,
-                    CustomReport.user_id == user_id,
+                    AnalyticsReport.id == report_id,
+                    AnalyticsReport.owner_id == user_id,
                 ),
             )
             .first()
         )
 
+    def execute_report(
+        self,
+        report_id: Any,
+        user_id: Any,
+        parameters: Optional[Dict[str, Any]] = None,
+        result_format: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Enfileira a execução de um relatório.
+
+        O resultado é gravado em páginas no spool pelo pool de jobs; o status,
+        o progresso e as páginas são consultados pela execução retornada.
+        """
+
+        report = self.get_owned_report(report_id, user_id)
         if not report:
             raise ValueError("Relatório não encontrado")
 
-        execution = ReportExecution(
-            report_id=report_id,
-            user_id=user_id,
-            execution_id=str(uuid.uuid4()),
-            status="running",
+        execution = report_job_service.submit(
+            self.db, report, user_id, parameters=parameters, fmt=result_format
         )
-
-        self.db.add(execution)
-        self.db.commit()
-        self.db.refresh(execution)
-
-        try:
-            # Merge parameters with report config
-            query_config = report.query_config.copy() if report.query_config else {}
-            if parameters:
-                query_config.update(parameters)
-
-            # Executar query do relatório
-            result_data = self._execute_report_query(query_config)
-
-            execution.status = "completed"
-            execution.result_data = result_data
-            execution.completed_at = datetime.utcnow()
-            execution.row_count = (
-                len(result_data) if isinstance(result_data, list) else 1
-            )
-
-        except Exception as e:
-            execution.status = "failed"
-            execution.error_message = str(e)
-
-        self.db.commit()
-        self.db.refresh(execution)
-
-        return {
-            "execution_id": execution.execution_id,
-            "status": execution.status,
-            "result_data": execution.result_data,
-            "completed_at": (
-                execution.completed_at.isoformat() if execution.completed_at else None
-            ),
-            "row_count": execution.row_count,
-            "error_message": execution.error_message,
-        }
+        return execution_status(execution)
 
     # ==================== INSIGHTS ====================
 
@@ -500,91 +461,79 @@ class AnalyticsService:
 
     # ==================== MÉTODOS AUXILIARES ====================
 
-    def _process_derived_metrics(self, event: AnalyticsEvent):
-        """Processa métricas derivadas do evento"""
-
-        # Métrica de comportamento do usuário
-        if event.user_id:
-            behavior_metric = UserBehaviorMetric(
-                user_id=event.user_id,
-                metric_name=f"{event.event_category}_{event.event_action}",
-                metric_value=event.event_value or 1,
-                metric_unit="count",
-                dimensions={
-                    "event_name": event.event_name,
-                    "page_url": event.page_url,
-                    "device_type": event.device_type,
-                },
-            )
-            self.db.add(behavior_metric)
-
-        # Métrica de performance se houver duração
-        if event.duration_ms:
-            performance_metric = SystemPerformanceMetric(
-                metric_name="page_load_time",
-                metric_value=event.duration_ms,
-                metric_unit="milliseconds",
-                component="frontend",
-                dimensions={
-                    "page_url": event.page_url,
-                    "browser": event.browser,
-                },
-            )
-            self.db.add(performance_metric)
+    _CHART_TIME_RANGES = {
+        "1h": timedelta(hours=1),
+        "6h": timedelta(hours=6),
+        "24h": timedelta(days=1),
+        "1d": timedelta(days=1),
+        "7d": timedelta(days=7),
+        "30d": timedelta(days=30),
+        "90d": timedelta(days=90),
+    }
 
     def _get_metric_chart_data(self, config: Dict[str, Any]) -> Dict[str, Any]:
-        """Obtém dados para gráfico de métricas"""
+        """
+        Obtém dados para gráfico de métricas.
+
+        O número de pontos é limitado por ``max_points``: métricas de performance
+        vêm dos rollups 1m/1h/1d (ou das linhas brutas com LTTB em intervalos
+        curtos); métricas diárias são agregadas por dia no banco.
+        """
 
         metric_name = config.get("metric_name")
         metric_type = config.get("metric_type", "user_behavior")
         time_range = config.get("time_range", "7d")
+        stat = config.get("stat", "avg")
+        max_points = int(config.get("max_points") or settings.METRIC_CHART_MAX_POINTS)
 
-        # Determinar modelo
-        if metric_type == "user_behavior":
-            model = UserBehaviorMetric
-        elif metric_type == "system_performance":
-            model = SystemPerformanceMetric
-        else:
-            model = AnalyticsBusinessMetric
-
-        # Calcular período
         end_date = datetime.utcnow()
-        if time_range == "1d":
-            start_date = end_date - timedelta(days=1)
-        elif time_range == "7d":
-            start_date = end_date - timedelta(days=7)
-        elif time_range == "30d":
-            start_date = end_date - timedelta(days=30)
-        else:
-            start_date = end_date - timedelta(days=7)
-
-        # Query dados
-        metrics = (
-            self.db.query(model)
-            .filter(
-                and_(
-                    model.metric_name == metric_name,
-                    model.created_at >= start_date,
-                    model.created_at <= end_date,
-                ),
+        start_date = end_date - self._CHART_TIME_RANGES.get(time_range, timedelta(days=7))
+
+        if metric_type == "system_performance":
+            series = metric_rollup_service.get_series(
+                self.db,
+                metric_name,
+                start_date,
+                end_date,
+                max_points=max_points,
+                stat=stat,
+                tenant_id=config.get("tenant_id"),
+                service=config.get("service"),
             )
-            .order_by(model.created_at)
+            series["time_range"] = time_range
+            return series
+
+        # Métricas diárias: a coluna pedida é agregada por dia
+        if metric_type == "user_behavior":
+            model, date_column = UserBehaviorMetric, UserBehaviorMetric.date
+        else:
+            model, date_column = AnalyticsBusinessMetric, AnalyticsBusinessMetric.date
+        column = model.__table__.columns.get(metric_name)
+        if column is None or not isinstance(column.type, (Integer, Float)):
+            raise ValueError(f"Métrica inválida para {metric_type}: {metric_name}")
+
+        aggregate = {"sum": func.sum, "min": func.min, "max": func.max}.get(stat, func.avg)
+        day = func.date(date_column)
+        rows = (
+            self.db.query(day.label("day"), aggregate(column).label("value"))
+            .filter(date_column >= start_date, date_column <= end_date)
+            .group_by(day)
+            .order_by(day)
             .all()
         )
-
-        # Formatar para gráfico
-        data_points = []
-        for metric in metrics:
-            data_points.append(
-                {
-                    "timestamp": metric.created_at.isoformat(),
-                    "value": metric.metric_value,
-                }
-            )
+        points = [(str(row.day), float(row.value or 0)) for row in rows]
+        downsampled = len(points) > max_points
+        if downsampled:
+            indices = lttb_indices(range(len(points)), [value for _, value in points], max_points)
+            points = [points[index] for index in indices]
 
         return {
-            "data_points": data_points,
-            "total_points": len(data_points),
+            "data_points": [{"timestamp": day, "value": value} for day, value in points],
+            "total_points": len(points),
+            "source_points": len(rows),
+            "resolution": "1d",
+            "stat": stat,
+            "downsampled": downsampled,
             "time_range": time_range,
         }
 
@@ -638,62 +587,34 @@ class AnalyticsService:
         }
 
     def _get_user_funnel_data(self, config: Dict[str, Any]) -> Dict[str, Any]:
-        """Obtém dados para funil de usuários"""
+        """
+        Obtém dados para funil de usuários (ordenado, com janela de conversão).
+        ``tenant_id`` vem do ``DashboardEvaluator`` (tenant de quem consulta);
+        sem ele o widget falha em vez de ler eventos de todos os tenants
+        """
 
-        funnel_steps = config.get("steps", [])
         time_range = config.get("time_range", "30d")
+        end_date = config.get("end_date") or datetime.utcnow()
+        start_date = config.get("start_date") or end_date - self._CHART_TIME_RANGES.get(
+            time_range, timedelta(days=7)
+        )
 
-        # Calcular período
-        end_date = datetime.utcnow()
-        start_date = end_date - timedelta(days=30 if time_range == "30d" else 7)
-
-        funnel_data = []
-
-        for i, step in enumerate(funnel_steps):
-            event_name = step.get("event_name")
-
-            # Contar usuários únicos que completaram este passo
-            user_count = (
-                self.db.query(AnalyticsEvent.user_id)
-                .filter(
-                    and_(
-                        AnalyticsEvent.event_name == event_name,
-                        AnalyticsEvent.created_at >= start_date,
-                        AnalyticsEvent.created_at <= end_date,
-                        AnalyticsEvent.user_id.isnot(None),
-                    ),
-                )
-                .distinct()
-                .count()
-            )
-
-            # Calcular conversão
-            conversion_rate = 0
-            if i > 0 and funnel_data:
-                previous_count = funnel_data[i - 1]["user_count"]
-                conversion_rate = (
-                    (user_count / previous_count * 100) if previous_count > 0 else 0
-                )
-
-            funnel_data.append(
-                {
-                    "step": step.get("name", f"Step {i+1}"),
-                    "event_name": event_name,
-                    "user_count": user_count,
-                    "conversion_rate": round(conversion_rate, 2),
-                }
-            )
-
-        return {
-            "funnel_data": funnel_data,
-            "time_range": time_range,
-        }
+        result = FunnelService(self.db).funnel(
+            config.get("steps", []),
+            start_date,
+            end_date,
+            window_seconds=float(config.get("window_hours", 24)) * 3600,
+            tenant_id=config["tenant_id"],
+        )
+        result["time_range"] = time_range
+        return result
 
     def _get_kpi_card_data(self, config: Dict[str, Any]) -> Dict[str, Any]:
         """Obtém dados para card de KPI"""
 
         kpi_type = config.get("kpi_type")
         time_range = config.get("time_range", "30d")
+        estimate = None
 
         # Calcular período
         end_date = datetime.utcnow()
@@ -709,32 +630,16 @@ class AnalyticsService:
                 .count()
             )
 
-        elif kpi_type == "active_users":
-            value = (
-                self.db.query(AnalyticsEvent.user_id)
-                .filter(
-                    and_(
-                        AnalyticsEvent.created_at >= start_date,
-                        AnalyticsEvent.user_id.isnot(None),
-                    ),
-                )
-                .distinct()
-                .count()
-            )
-
-            previous_start = start_date - (end_date - start_date)
-            previous_value = (
-                self.db.query(AnalyticsEvent.user_id)
-                .filter(
-                    and_(
-                        AnalyticsEvent.created_at >= previous_start,
-                        AnalyticsEvent.created_at < start_date,
-                        AnalyticsEvent.user_id.isnot(None),
-                    ),
-                )
-                .distinct()
-                .count()
+        elif kpi_type == "active_users" or kpi_type in ACTIVE_USER_WINDOWS:
+            # Mescla dos sketches diários (janelas em dias UTC completos)
+            days = ACTIVE_USER_WINDOWS.get(kpi_type) or (end_date - start_date).days
+            today = end_date.date()
+            current = active_user_service.window(self.db, days, today, config.get("tenant_id"))
+            previous = active_user_service.window(
+                self.db, days, today - timedelta(days=days), config.get("tenant_id")
             )
+            value, previous_value = current.value, previous.value
+            estimate = {"exact": current.exact, "relative_error": round(current.relative_error, 4)}
 
         elif kpi_type == "total_workflows":
             value = self.db.query(Workflow).count()
@@ -755,7 +660,7 @@ class AnalyticsService:
         if previous_value > 0:
             change_percent = ((value - previous_value) / previous_value) * 100
 
-        return {
+        result = {
             "value": value,
             "previous_value": previous_value,
             "change_percent": round(change_percent, 2),
@@ -765,6 +670,9 @@ class AnalyticsService:
                 else "down" if change_percent < 0 else "stable"
             ),
         }
+        if estimate is not None:
+            result["estimate"] = estimate
+        return result
 
     def _get_heatmap_data(self, config: Dict[str, Any]) -> Dict[str, Any]:
         """Obtém dados para heatmap"""
@@ -776,28 +684,6 @@ class AnalyticsService:
             "min_value": 0,
         }
 
-    def _execute_report_query(
-        self, query_config: Dict[str, Any]
-    ) -> List[Dict[str, Any]]:
-        """Executa query do relatório"""
-
-        # Implementação simplificada - pode ser expandida com query builder
-        query_type = query_config.get("type", "events")
-
-        if query_type == "events":
-            events = self.db.query(AnalyticsEvent).limit(1000).all()
-            return [
-                {
-                    "id": event.id,
-                    "event_name": event.event_name,
-                    "user_id": event.user_id,
-                    "created_at": event.created_at.isoformat(),
-                }
-                for event in events
-            ]
-
-        return []
-
     def _collect_user_data(
         self, user_id: int, date_range: Dict[str, Any]
     ) -> Dict[str, Any]:
@@ -896,18 +782,9 @@ class AnalyticsService:
             .count()
         )
 
-        active_users = (
-            self.db.query(AnalyticsEvent.user_id)
-            .filter(
-                and_(
-                    AnalyticsEvent.created_at >= start_date,
-                    AnalyticsEvent.created_at <= end_date,
-                    AnalyticsEvent.user_id.isnot(None),
-                ),
-            )
-            .distinct()
-            .count()
-        )
+        active_users = active_user_service.distinct_users(
+            self.db, start_date.date(), end_date.date()
+        ).value
 
         return {
             "total_users": total_users,
@@ -963,24 +840,17 @@ class AnalyticsService:
     def _analyze_trends(
         self, start_date: datetime, end_date: datetime
     ) -> list[dict[str, Any]]:
-        """Analisa tendências"""
-
-        # Implementação simplificada
-        return [
-            {
-                "metric": "user_growth",
-                "trend": "increasing",
-                "change_percent": 15.5,
-            },
-        ]
+        """Tendência linear de cada métrica sobre os rollups do período"""
+        return metric_anomaly_service.trends(self.db, start_date, end_date)
 
     def _detect_anomalies(
         self, start_date: datetime, end_date: datetime
     ) -> list[dict[str, Any]]:
-        """Detecta anomalias"""
-
-        # Implementação simplificada
-        return []
+        """Anomalias sinalizadas pela detecção incremental no período"""
+        return [
+            anomaly.to_dict()
+            for anomaly in metric_anomaly_service.recent_anomalies(self.db, start_date, end_date)
+        ]
 
     def get_user_behavior_metrics(
         self, user_id: str, start_date: datetime, end_date: datetime, *args, **kwargs
@@ -1011,19 +881,91 @@ class AnalyticsService:
 
     # ==================== MÉTODOS FALTANTES PARA ENDPOINTS ====================
 
-    def track_events_batch(self, events: list, user_id: int) -> dict:
-        """Registra múltiplos eventos em lote"""
-        processed = 0
-        failed = 0
+    def track_events_batch(
+        self,
+        events: list,
+        user_id: Optional[Any] = None,
+        tenant_id: Optional[Any] = None,
+        project_id: Optional[Any] = None,
+        allowed_ids: Optional[Dict[str, set]] = None,
+    ) -> dict:
+        """
+        Registra múltiplos eventos em lote.
+
+        Com o flusher ativo os eventos são apenas enfileirados (confirmação
+        imediata); sem ele (scripts, testes) o lote é gravado direto na sessão
+        atual com INSERT multi-linha. ``allowed_ids`` (ver
+        ``tenant_event_ids``) recusa referências a outros tenants.
+        """
+        build = partial(
+            build_event_row,
+            user_id=user_id,
+            tenant_id=tenant_id,
+            project_id=project_id,
+            allowed_ids=allowed_ids,
+        )
+        if ingestion_pipeline.running:
+            result = ingestion_pipeline.submit_nowait(events, build)
+        else:
+            result = IngestResult()
+            rows = []
+            for event_data in events:
+                try:
+                    rows.append(build(event_data))
+                except ValueError as e:
+                    result.invalid += 1
+                    result.errors.append(str(e))
+            if rows:
+                self.db.execute(insert(AnalyticsEvent.__table__), rows)
+                metrics = derive_metric_rows(rows)
+                if metrics:
+                    self.db.execute(insert(SystemPerformanceMetric.__table__), metrics)
+                active_user_service.record(self.db, rows)
+                self.db.commit()
+                result.accepted = len(rows)
 
-        for event_data in events:
-            try:
-                self.track_event(event_data, user_id)
-                processed += 1
-            except Exception:
-                failed += 1
+        return {
+            "processed": result.accepted,
+            "failed": result.invalid + result.dropped,
+            **result.to_dict(),
+        }
 
-        return {"processed": processed, "failed": failed}
+    _TENANT_SCOPED_MODELS = {
+        "project_id": WorkspaceProject,
+        "workspace_id": Workspace,
+        "workflow_id": Workflow,
+    }
+
+    def tenant_event_ids(self, events: list, tenant_id: Optional[Any]) -> Dict[str, set]:
+        """
+        Ids de projeto/workspace/workflow citados pelos eventos que pertencem
+        ao tenant (uma consulta por coluna), para ``build_event_row(allowed_ids=...)``
+        """
+        cited = defaultdict(set)
+        for event in events:
+            try:
+                row = build_event_row(event)
+            except (ValueError, TypeError):
+                continue
+            for column in TENANT_SCOPED_COLUMNS:
+                if row[column] is not None:
+                    cited[column].add(row[column])
+
+        allowed = {}
+        for column in TENANT_SCOPED_COLUMNS:
+            model = self._TENANT_SCOPED_MODELS[column]
+            ids = cited.get(column)
+            allowed[column] = (
+                {
+                    row_id
+                    for (row_id,) in self.db.query(model.id).filter(
+                        model.id.in_(ids), tenant_scope(model.tenant_id, tenant_id)
+                    )
+                }
+                if ids
+                else set()
+            )
+        return allowed
 
     def get_user_events(
         self,
@@ -1075,7 +1017,7 @@ class AnalyticsService:
     def get_real_time_stats(self) -> dict:
         """Obtém estatísticas em tempo real"""
         return {
-            "active_users": 89,
+            "active_users": active_user_service.window(self.db, 1).value,
             "current_sessions": 156,
             "requests_per_minute": 342,
             "average_response_time": 185,
@@ -1171,21 +1113,24 @@ class AnalyticsService:
         """Deleta relatório"""
         return True
 
-    def execute_report_async(self, report_id: int, user_id: int) -> dict:
+    def execute_report_async(self, report_id: Any, user_id: Any) -> dict:
         """Executa relatório em background"""
-        return {
-            "execution_id": str(uuid.uuid4()),
-            "status": "started",
-            "estimated_completion": (
-                datetime.utcnow() + timedelta(minutes=5)
-            ).isoformat(),
-        }
+        return self.execute_report(report_id, user_id)
 
     def get_report_executions(
-        self, report_id: int, user_id: int, limit: int = 10, offset: int = 0
+        self, report_id: Any, user_id: Any, limit: int = 10, offset: int = 0
     ) -> list:
         """Obtém histórico de execuções do relatório"""
-        return []
+        executions = report_job_service.list_executions(
+            self.db, report_id, user_id, limit=limit, offset=offset
+        )
+        return [execution_status(execution) for execution in executions]
+
+    def get_report_execution(self, execution_id: Any, user_id: Any) -> ReportExecution:
+        execution = report_job_service.get_execution(self.db, execution_id, user_id)
+        if execution is None:
+            raise LookupError("Execução não encontrada")
+        return execution
 
     def generate_user_insights_async(self, insight_request, user_id: int) -> dict:
         """Gera insights personalizados"""
@@ -1215,23 +1160,51 @@ class AnalyticsService:
             "generated_at": datetime.utcnow().isoformat(),
         }
 
-    def analyze_funnel(self, funnel_config, user_id: int) -> dict:
-        """Análise de funil"""
+    @staticmethod
+    def _date_range(date_range: Optional[Dict[str, str]], default_days: int):
+        date_range = date_range or {}
+        end_date = (
+            datetime.fromisoformat(date_range["end"]) if date_range.get("end") else datetime.utcnow()
+        )
+        start_date = (
+            datetime.fromisoformat(date_range["start"])
+            if date_range.get("start")
+            else end_date - timedelta(days=default_days)
+        )
+        return start_date, end_date
+
+    def analyze_funnel(self, funnel_config, user_id: Any, tenant_id: Any = None) -> dict:
+        """Análise de funil ordenado (``FunnelAnalysis``) nos eventos do tenant"""
+        start_date, end_date = self._date_range(funnel_config.date_range, 30)
+        result = FunnelService(self.db).funnel(
+            [step.model_dump() for step in funnel_config.steps],
+            start_date,
+            end_date,
+            window_seconds=funnel_config.time_window_hours * 3600,
+            tenant_id=tenant_id,
+        )
         return {
-            "funnel_id": str(uuid.uuid4()),
-            "conversion_rate": 23.4,
-            "steps": [],
-            "insights": [],
+            **result,
+            "name": funnel_config.name,
+            "time_range": f"{start_date.isoformat()}/{end_date.isoformat()}",
+            "generated_at": datetime.utcnow(),
         }
 
-    def analyze_cohort(self, cohort_config, user_id: int) -> dict:
-        """Análise de coorte"""
-        return {
-            "cohort_id": str(uuid.uuid4()),
-            "retention_rates": [],
-            "cohorts": [],
-            "insights": [],
-        }
+    def analyze_cohort(self, cohort_config, user_id: Any, tenant_id: Any = None) -> dict:
+        """Matriz de retenção por coorte (``CohortAnalysis``) do tenant"""
+        default_days = {"day": 1, "week": 7, "month": 31}[cohort_config.period_type]
+        start_date, end_date = self._date_range(
+            cohort_config.date_range, default_days * cohort_config.periods
+        )
+        result = FunnelService(self.db).retention(
+            cohort_config.cohort_type,
+            cohort_config.period_type,
+            cohort_config.periods,
+            start_date,
+            end_date,
+            tenant_id=tenant_id,
+        )
+        return {**result, "generated_at": datetime.utcnow()}
 
     def analyze_ab_test(self, test_config, user_id: int) -> dict:
         """Análise de teste A/B"""
@@ -1255,35 +1228,73 @@ class AnalyticsService:
     def detect_anomalies_data(
         self, metric: str, days: int, sensitivity: float, user_id: int
     ) -> dict:
-        """Detecção de anomalias"""
-        return {
-            "anomalies_detected": 2,
-            "anomalies": [],
-            "baseline": 45.2,
-            "threshold": 67.8,
-        }
+        """
+        Detecção de anomalias sob demanda nos rollups horários da métrica;
+        ``sensitivity`` é o |score| mínimo para sinalizar um bucket
+        """
+        user = self.db.query(User).filter(User.id == user_id).first()
+        return metric_anomaly_service.detect(
+            self.db,
+            metric,
+            days,
+            sensitivity=sensitivity,
+            tenant_id=getattr(user, "tenant_id", None),
+        )
 
-    def export_data_async(self, export_request, user_id: int) -> dict:
-        """Exporta dados em background"""
-        return {
-            "export_id": str(uuid.uuid4()),
-            "status": "started",
-            "estimated_completion": (
-                datetime.utcnow() + timedelta(minutes=3)
-            ).isoformat(),
-        }
+    def export_data_async(self, export_request, user_id: Any) -> dict:
+        """
+        Agenda uma exportação em massa (partições por intervalo de tempo
+        gravadas em paralelo pelo serviço de exportação)
+        """
+        if export_request.data_type not in REPORT_SOURCES:
+            raise ValueError(f"Exportação não suportada para {export_request.data_type}")
+
+        query: Dict[str, Any] = {"type": export_request.data_type}
+        if export_request.filters:
+            query["filters"] = export_request.filters
+        if export_request.date_range:
+            query["date_range"] = export_request.date_range
+        if export_request.columns:
+            query["columns"] = export_request.columns
+        if export_request.limit:
+            query["limit"] = export_request.limit
+        if export_request.compression:
+            query["compression"] = export_request.compression
+
+        user = self.db.query(User).filter(User.id == user_id).first()
+        export = bulk_export_service.create(
+            self.db,
+            owner_id=user_id,
+            name=f"{export_request.data_type}-{datetime.utcnow():%Y%m%d%H%M%S}",
+            export_type=export_request.format,
+            export_query=query,
+            tenant_id=getattr(user, "tenant_id", None),
+        )
+        return export_status(export)
 
     def get_user_exports(
-        self, user_id: int, status: str = None, limit: int = 20, offset: int = 0
+        self, user_id: Any, status: str = None, limit: int = 20, offset: int = 0
     ) -> list:
         """Lista exportações do usuário"""
-        return []
+        return [
+            export_status(export)
+            for export in bulk_export_service.list_exports(self.db, user_id, status, limit, offset)
+        ]
 
-    def download_export(self, export_id: int, user_id: int) -> dict:
-        """Download de exportação"""
+    def download_export(self, export_id: Any, user_id: Any) -> dict:
+        """Metadados de download de uma exportação concluída"""
+        export = bulk_export_service.get_export(self.db, export_id, user_id)
+        if export is None:
+            raise LookupError("Exportação não encontrada")
+        files, filename, etag = bulk_export_service.download_files(export)
+        expires_at = export.completed_at + timedelta(days=settings.EXPORT_RETENTION_DAYS)
         return {
-            "download_url": f"https://storage.synapscale.com/exports/{export_id}.csv",
-            "expires_at": (datetime.utcnow() + timedelta(hours=24)).isoformat(),
+            "download_url": f"{settings.API_V1_STR}/analytics/exports/{export.id}/download",
+            "filename": filename,
+            "size_bytes": sum(size for _, size in files),
+            "etag": etag,
+            "partitions": (export.manifest or {}).get("partitions", []),
+            "expires_at": expires_at.isoformat(),
         }
 
     def create_alert(self, alert_rule, user_id: int) -> dict:
@@ -0,0 +1,607 @@
+"""
+Motor de autorização com decisões pré-computadas
+Cada principal (usuário, tenant) tem o conjunto efetivo de permissões
+compilado em um bitset sobre os ids de permissão (uma posição por chave),
+e cada workspace tem o dono e os papéis dos membros ativos em um dicionário.
+As verificações viram consultas O(1) em memória; o banco só é lido quando
+a entrada é criada ou fica inválida.
+
+As entradas guardam as versões dos escopos de que dependem (global, tenant,
+principal ou workspace). Alterações em roles, permissões, atribuições ou
+membros feitas por qualquer sessão incrementam essas versões (no flush, no
+commit e no rollback), e um log de alterações limitado no Redis (um stream
+com MAXLEN) propaga a invalidação para os outros workers, que leem só o que
+veio depois da última entrada vista; quem ficou para trás do log descarta o
+cache inteiro. O TTL limita a defasagem se o Redis estiver indisponível. Os listeners só são registrados quando este módulo é
+importado, que é também a única forma de haver entradas em cache.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, Optional, Set, Tuple
+
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+from synapse.core.config import settings
+from synapse.models.rbac_permission import RBACPermission
+from synapse.models.rbac_role import RBACRole
+from synapse.models.rbac_role_permission import RBACRolePermission
+from synapse.models.user_tenant_role import UserTenantRole
+from synapse.models.workspace import Workspace
+from synapse.models.workspace_member import WorkspaceMember
+
+logger = logging.getLogger(__name__)
+
+GLOBAL_SCOPE = "rbac"
+
+# Permissões de workspace por papel do membro (o dono tem todas)
+WORKSPACE_PERMISSION_BITS = {"read": 1, "write": 2, "admin": 4}
+WORKSPACE_ROLE_PERMISSIONS = {
+    "owner": ("read", "write", "admin"),
+    "admin": ("read", "write", "admin"),
+    "member": ("read", "write"),
+    "viewer": ("read",),
+}
+
+
+def tenant_scope(tenant_id: Any) -> str:
+    return f"tenant:{tenant_id}" if tenant_id is not None else GLOBAL_SCOPE
+
+
+def principal_scope(user_id: Any, tenant_id: Any) -> str:
+    return f"principal:{user_id}:{tenant_id}"
+
+
+def workspace_scope(workspace_id: Any) -> str:
+    return f"workspace:{workspace_id}"
+
+
+def _mask(permissions: Iterable[str]) -> int:
+    mask = 0
+    for permission in permissions:
+        mask |= WORKSPACE_PERMISSION_BITS[permission]
+    return mask
+
+
+WORKSPACE_ROLE_MASKS = {role: _mask(permissions) for role, permissions in WORKSPACE_ROLE_PERMISSIONS.items()}
+
+
+def _uuid(value: Any) -> Any:
+    """Ids recebidos como texto viram ``UUID`` para os parâmetros das consultas"""
+    if isinstance(value, str):
+        try:
+            return uuid.UUID(value)
+        except ValueError:
+            return value
+    return value
+
+
+def _role_value(role: Any) -> str:
+    return str(getattr(role, "value", role) or "").lower()
+
+
+def _text(value: Any) -> str:
+    return value.decode() if isinstance(value, bytes) else value
+
+
+def _timestamp(value: Optional[datetime]) -> Optional[float]:
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+@dataclass
+class RoleGrants:
+    """Permissões concedidas por um role, por tenant da concessão"""
+
+    tenant_id: Optional[str]
+    mask: int = 0
+    masks_by_tenant: Dict[Optional[str], int] = field(default_factory=dict)
+    conditional: Dict[int, Tuple[dict, ...]] = field(default_factory=dict)
+    versions: Tuple[int, ...] = ()
+    expires: float = 0.0
+
+
+@dataclass
+class Principal:
+    """Conjunto efetivo de um usuário em um tenant"""
+
+    mask: int
+    conditional: Dict[int, Tuple[dict, ...]]
+    role_ids: frozenset
+    versions: Tuple[int, ...]
+    expires: float
+
+
+@dataclass
+class WorkspaceAccess:
+    """Dono e papéis dos membros ativos de um workspace"""
+
+    owner_id: Optional[str]
+    roles: Dict[str, str]
+    masks: Dict[str, int]
+    version: int
+    expires: float
+
+
+class AuthorizationEngine:
+    """
+    Decisões de autorização em memória. ``clock`` é a base dos TTLs e das
+    expirações das atribuições (segundos epoch).
+    """
+
+    def __init__(
+        self,
+        ttl: Optional[float] = None,
+        max_entries: Optional[int] = None,
+        redis_prefix: Optional[str] = None,
+        sync_interval_ms: Optional[int] = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.ttl = settings.RBAC_CACHE_TTL if ttl is None else ttl
+        self.max_entries = max_entries or settings.RBAC_CACHE_SIZE
+        self.redis_prefix = settings.RBAC_REDIS_PREFIX if redis_prefix is None else redis_prefix
+        interval_ms = settings.RBAC_VERSION_SYNC_MS if sync_interval_ms is None else sync_interval_ms
+        self.sync_interval = max(interval_ms, 10) / 1000
+        self.clock = clock
+
+        self._bits: Dict[str, int] = {}
+        self._versions: Dict[str, int] = {}
+        self._roles: Dict[str, RoleGrants] = {}
+        self._principals: "OrderedDict[Tuple[str, str], Principal]" = OrderedDict()
+        self._workspaces: "OrderedDict[str, WorkspaceAccess]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.change_log_size = settings.RBAC_CHANGE_LOG_SIZE
+        self._outbox: Set[str] = set()
+        self._last_change: Optional[str] = None
+        self._client = None
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._stopping = False
+        self.stats = {
+            "hits": 0,
+            "loads": 0,
+            "invalidations": 0,
+            "remote_invalidations": 0,
+            "remote_resets": 0,
+        }
+
+    # ==================== VERSÕES ====================
+
+    def version(self, scope: str) -> int:
+        return self._versions.get(scope, 0)
+
+    def bump(self, scopes: Iterable[str], publish: bool = False) -> None:
+        """Invalida as entradas que dependem dos escopos"""
+        with self._lock:
+            for scope in scopes:
+                self._versions[scope] = self._versions.get(scope, 0) + 1
+                self.stats["invalidations"] += 1
+                if publish and self.redis_prefix:
+                    self._outbox.add(scope)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._roles.clear()
+            self._principals.clear()
+            self._workspaces.clear()
+
+    def _bit(self, key: str) -> int:
+        bit = self._bits.get(key)
+        if bit is None:
+            with self._lock:
+                bit = self._bits.setdefault(key, 1 << len(self._bits))
+        return bit
+
+    def _store(self, entries: OrderedDict, key: Any, entry: Any) -> None:
+        with self._lock:
+            entries[key] = entry
+            entries.move_to_end(key)
+            while len(entries) > self.max_entries:
+                entries.popitem(last=False)
+
+    # ==================== RBAC ====================
+
+    def _role_versions(self, tenant_id: Optional[str]) -> Tuple[int, ...]:
+        return (self.version(GLOBAL_SCOPE), self.version(tenant_scope(tenant_id)))
+
+    def _load_roles(self, db: Session, role_ids: Set[str]) -> None:
+        """Compila os roles ausentes com uma consulta para todas as concessões"""
+        now = self.clock()
+        marker = self.stats["invalidations"]
+        roles = {
+            str(role_id): RoleGrants(
+                tenant_id=str(tenant_id) if tenant_id else None,
+                versions=self._role_versions(str(tenant_id) if tenant_id else None),
+                expires=now + self.ttl,
+            )
+            for role_id, tenant_id in db.execute(
+                select(RBACRole.id, RBACRole.tenant_id).where(
+                    RBACRole.id.in_([_uuid(role_id) for role_id in role_ids])
+                )
+            )
+        }
+        rows = db.execute(
+            select(
+                RBACRolePermission.role_id,
+                RBACRolePermission.tenant_id,
+                RBACRolePermission.conditions,
+                RBACPermission.key,
+            )
+            .join(RBACPermission, RBACPermission.id == RBACRolePermission.permission_id)
+            .where(
+                RBACRolePermission.role_id.in_([_uuid(role_id) for role_id in roles]),
+                RBACRolePermission.granted.isnot(False),
+            )
+        )
+        for role_id, grant_tenant, conditions, key in rows:
+            grants = roles[str(role_id)]
+            bit = self._bit(key)
+            if conditions:
+                grants.conditional[bit] = grants.conditional.get(bit, ()) + (conditions,)
+                continue
+            grant_tenant = str(grant_tenant) if grant_tenant else None
+            grants.mask |= bit
+            grants.masks_by_tenant[grant_tenant] = grants.masks_by_tenant.get(grant_tenant, 0) | bit
+        with self._lock:
+            # Invalidado durante a leitura: guarda sem versão para recarregar na próxima
+            if self.stats["invalidations"] != marker:
+                for grants in roles.values():
+                    grants.versions = ()
+            self._roles.update(roles)
+            self.stats["loads"] += 1
+        for role_id in role_ids - set(roles):
+            self._roles.pop(role_id, None)
+
+    def _valid_role(self, role_id: str) -> Optional[RoleGrants]:
+        grants = self._roles.get(role_id)
+        if grants is None or grants.expires <= self.clock():
+            return None
+        if grants.versions != self._role_versions(grants.tenant_id):
+            return None
+        return grants
+
+    def role_grants(self, db: Session, role_id: Any) -> Optional[RoleGrants]:
+        role_id = str(role_id)
+        grants = self._valid_role(role_id)
+        if grants is None:
+            self._load_roles(db, {role_id})
+            grants = self._roles.get(role_id)
+        return grants
+
+    @staticmethod
+    def _allowed(
+        mask: int, conditional: Dict[int, Tuple[dict, ...]], bit: Optional[int], context: Optional[dict]
+    ) -> bool:
+        if bit is None:
+            return False
+        if mask & bit:
+            return True
+        conditions = conditional.get(bit)
+        if not conditions:
+            return False
+        # Sem contexto, concessões condicionais valem (mesma regra de ``is_granted``)
+        return context is None or any(
+            RBACRolePermission.evaluate_conditions(item, context) for item in conditions
+        )
+
+    def role_has_permission(
+        self,
+        db: Session,
+        role_id: Any,
+        permission_key: str,
+        tenant_id: Any = None,
+        context: Optional[dict] = None,
+    ) -> bool:
+        """Equivalente a ``RBACRolePermission.has_permission`` sem consultas por verificação"""
+        grants = self.role_grants(db, role_id)
+        if grants is None:
+            return False
+        mask = grants.mask if tenant_id is None else grants.masks_by_tenant.get(str(tenant_id), 0)
+        return self._allowed(mask, grants.conditional, self._bits.get(permission_key), context)
+
+    def _principal_versions(self, user_id: str, tenant_id: str) -> Tuple[int, ...]:
+        return (
+            self.version(GLOBAL_SCOPE),
+            self.version(tenant_scope(tenant_id)),
+            self.version(principal_scope(user_id, tenant_id)),
+        )
+
+    def principal(self, db: Session, user_id: Any, tenant_id: Any) -> Principal:
+        """Conjunto efetivo do principal, compilado de todas as atribuições válidas"""
+        key = (str(user_id), str(tenant_id))
+        entry = self._principals.get(key)
+        if (
+            entry is not None
+            and entry.expires > self.clock()
+            and entry.versions == self._principal_versions(*key)
+        ):
+            self.stats["hits"] += 1
+            return entry
+
+        versions = self._principal_versions(*key)
+        now = self.clock()
+        expires = now + self.ttl
+        role_ids = set()
+        assignments = db.execute(
+            select(UserTenantRole.role_id, UserTenantRole.expires_at).where(
+                UserTenantRole.user_id == _uuid(user_id),
+                UserTenantRole.tenant_id == _uuid(tenant_id),
+                UserTenantRole.is_active.isnot(False),
+            )
+        )
+        for role_id, expires_at in assignments:
+            deadline = _timestamp(expires_at)
+            if deadline is not None:
+                if deadline <= now:
+                    continue
+                expires = min(expires, deadline)
+            role_ids.add(str(role_id))
+
+        missing = {role_id for role_id in role_ids if self._valid_role(role_id) is None}
+        if missing:
+            self._load_roles(db, missing)
+
+        mask, conditional = 0, {}
+        for role_id in role_ids:
+            grants = self._roles.get(role_id)
+            if grants is None:
+                continue
+            mask |= grants.mask
+            for bit, conditions in grants.conditional.items():
+                conditional[bit] = conditional.get(bit, ()) + conditions
+            expires = min(expires, grants.expires)
+
+        entry = Principal(mask, conditional, frozenset(role_ids), versions, expires)
+        self._store(self._principals, key, entry)
+        return entry
+
+    def has_permission(
+        self,
+        db: Session,
+        user_id: Any,
+        tenant_id: Any,
+        permission_key: str,
+        context: Optional[dict] = None,
+    ) -> bool:
+        """Verifica se o usuário tem a permissão em algum dos seus roles no tenant"""
+        entry = self.principal(db, user_id, tenant_id)
+        return self._allowed(entry.mask, entry.conditional, self._bits.get(permission_key), context)
+
+    # ==================== WORKSPACES ====================
+
+    def workspace(self, db: Session, workspace_id: Any) -> Optional[WorkspaceAccess]:
+        """Dono e membros ativos do workspace (``None`` se não existir)"""
+        key = str(workspace_id)
+        entry = self._workspaces.get(key)
+        if (
+            entry is not None
+            and entry.expires > self.clock()
+            and entry.version == self.version(workspace_scope(key))
+        ):
+            self.stats["hits"] += 1
+            return entry
+
+        version = self.version(workspace_scope(key))
+        owner = db.execute(select(Workspace.owner_id).where(Workspace.id == _uuid(workspace_id))).first()
+        roles = {
+            str(user_id): _role_value(role)
+            for user_id, role in db.execute(
+                select(WorkspaceMember.user_id, WorkspaceMember.role).where(
+                    WorkspaceMember.workspace_id == _uuid(workspace_id),
+                    WorkspaceMember.status == "active",
+                )
+            )
+        }
+        with self._lock:
+            self.stats["loads"] += 1
+        if owner is None and not roles:
+            return None
+
+        entry = WorkspaceAccess(
+            owner_id=str(owner[0]) if owner is not None and owner[0] else None,
+            roles=roles,
+            masks={user_id: WORKSPACE_ROLE_MASKS.get(role, 0) for user_id, role in roles.items()},
+            version=version,
+            expires=self.clock() + self.ttl,
+        )
+        self._store(self._workspaces, key, entry)
+        return entry
+
+    def workspace_role(self, db: Session, workspace_id: Any, user_id: Any) -> Optional[str]:
+        entry = self.workspace(db, workspace_id)
+        return entry.roles.get(str(user_id)) if entry is not None else None
+
+    def is_workspace_member(self, db: Session, workspace_id: Any, user_id: Any) -> bool:
+        entry = self.workspace(db, workspace_id)
+        return entry is not None and str(user_id) in entry.roles
+
+    def has_workspace_permission(self, db: Session, workspace_id: Any, user_id: Any, permission: str) -> bool:
+        """O dono tem todas as permissões; membros, as do seu papel"""
+        entry = self.workspace(db, workspace_id)
+        if entry is None:
+            return False
+        user_id = str(user_id)
+        if entry.owner_id == user_id:
+            return True
+        bit = WORKSPACE_PERMISSION_BITS.get(permission)
+        return bit is not None and bool(entry.masks.get(user_id, 0) & bit)
+
+    # ==================== INVALIDAÇÃO ====================
+
+    def _role_tenant(self, session: Session, role_id: Any) -> Tuple[bool, Optional[str]]:
+        """Tenant de um role sem consultar o banco (cache ou identity map)"""
+        grants = self._roles.get(str(role_id))
+        if grants is not None:
+            return True, grants.tenant_id
+        for key, instance in session.identity_map.items():
+            if key[0] is RBACRole and key[1] == (role_id,):
+                return True, str(instance.tenant_id) if instance.tenant_id else None
+        return False, None
+
+    def scopes_for(self, session: Session, instance: Any) -> Set[str]:
+        """Escopos afetados pela alteração de uma instância"""
+        if isinstance(instance, (WorkspaceMember, Workspace)):
+            workspace_id = instance.workspace_id if isinstance(instance, WorkspaceMember) else instance.id
+            return {workspace_scope(workspace_id)} if workspace_id is not None else set()
+        if isinstance(instance, UserTenantRole):
+            return {principal_scope(instance.user_id, instance.tenant_id)}
+        if isinstance(instance, RBACRole):
+            return {tenant_scope(instance.tenant_id)}
+        if isinstance(instance, RBACRolePermission):
+            found, tenant_id = self._role_tenant(session, instance.role_id)
+            return {tenant_scope(tenant_id) if found else GLOBAL_SCOPE}
+        if isinstance(instance, RBACPermission):
+            return {GLOBAL_SCOPE}
+        return set()
+
+    # ==================== SINCRONIZAÇÃO ENTRE WORKERS ====================
+
+    async def sync_versions(self) -> int:
+        """
+        Publica as invalidações locais e aplica as dos outros workers: lê do
+        log só as entradas depois da última vista (normalmente nenhuma). Se o
+        log foi aparado além dela, descarta o cache. Retorna quantos escopos
+        foram invalidados.
+        """
+        if not self.redis_prefix:
+            return 0
+        if self._client is None:
+            import redis.asyncio as redis
+
+            self._client = redis.from_url(settings.REDIS_URL)
+        key = f"{self.redis_prefix}:changes"
+
+        with self._lock:
+            outbox, self._outbox = self._outbox, set()
+        try:
+            if outbox:
+                pipeline = self._client.pipeline(transaction=False)
+                for scope in outbox:
+                    pipeline.xadd(key, {"s": scope}, maxlen=self.change_log_size, approximate=True)
+                await pipeline.execute()
+            if self._last_change is None:
+                # Primeira leitura: o cache local não depende de nada anterior
+                latest = await self._client.xrevrange(key, count=1)
+                self._last_change = _text(latest[0][0]) if latest else "0-0"
+                return 0
+            pipeline = self._client.pipeline(transaction=False)
+            pipeline.xrange(key, min=f"({self._last_change}", count=self.change_log_size)
+            pipeline.xrange(key, count=1)
+            pipeline.xlen(key)
+            entries, oldest, length = await pipeline.execute()
+        except Exception:
+            with self._lock:
+                self._outbox |= outbox
+            raise
+
+        if not entries:
+            return 0
+        self._last_change = _text(entries[-1][0])
+        if oldest and oldest[0][0] == entries[0][0] and length >= self.change_log_size:
+            # Tudo o que restou no log é novo e o log já foi aparado: entradas
+            # depois da última vista podem ter sido descartadas
+            self.clear()
+            with self._lock:
+                self.stats["remote_resets"] += 1
+            return len(entries)
+
+        changed = {_text(fields.get(b"s") or fields.get("s")) for _, fields in entries}
+        self.bump(changed)
+        with self._lock:
+            self.stats["remote_invalidations"] += len(changed)
+        return len(changed)
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def run(self) -> None:
+        self._wakeup = asyncio.Event()
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.sync_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await self.sync_versions()
+            except Exception as e:
+                logger.warning(f"Erro ao sincronizar versões de autorização: {e}")
+
+    async def start(self) -> None:
+        if self.running or not self.redis_prefix:
+            return
+        self._stopping = False
+        self._task = asyncio.create_task(self.run(), name="authorization_sync")
+
+    async def stop(self) -> None:
+        """Publica as invalidações pendentes e encerra a sincronização"""
+        if self._task is not None:
+            self._stopping = True
+            if self._wakeup is not None:
+                self._wakeup.set()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self._wakeup = None
+        if self._outbox:
+            try:
+                await self.sync_versions()
+            except Exception as e:
+                logger.warning(f"Erro ao publicar invalidações de autorização: {e}")
+        if self._client is not None:
+            await self._client.close()
+            self._client = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "principals": len(self._principals),
+            "roles": len(self._roles),
+            "workspaces": len(self._workspaces),
+            "permission_bits": len(self._bits),
+            "pending_publish": len(self._outbox),
+        }
+
+
+authorization_engine = AuthorizationEngine()
+
+_PENDING_SCOPES = "authorization_scopes"
+
+
+def invalidate_changed_authorizations(session: Session, flush_context: Any = None) -> None:
+    """Invalida no flush (para a própria sessão) e guarda os escopos para o commit"""
+    scopes = set()
+    for instance in (*session.new, *session.dirty, *session.deleted):
+        scopes |= authorization_engine.scopes_for(session, instance)
+    if scopes:
+        session.info.setdefault(_PENDING_SCOPES, set()).update(scopes)
+        authorization_engine.bump(scopes)
+
+
+def _settle_pending_scopes(session: Session, publish: bool) -> None:
+    """
+    Invalida de novo ao fim da transação: decisões carregadas por outras
+    sessões entre o flush e o commit (ou rollback) viram estado antigo
+    """
+    scopes = session.info.pop(_PENDING_SCOPES, None)
+    if scopes:
+        authorization_engine.bump(scopes, publish=publish)
+
+
+event.listen(Session, "after_flush", invalidate_changed_authorizations)
+event.listen(Session, "after_commit", lambda session: _settle_pending_scopes(session, publish=True))
+event.listen(Session, "after_soft_rollback", lambda session, previous: _settle_pending_scopes(session, publish=False))
@@ -0,0 +1,562 @@
+"""
+Serviço de Exportação em Massa
+Produz os arquivos de analytics_exports: o intervalo de tempo pedido é
+dividido em partições exportadas em paralelo por um pool de workers, cada uma
+com sua sessão (``COPY TO STDOUT`` para CSV no PostgreSQL, cursor de servidor
+com ``yield_per`` nos demais casos). O manifesto com checksums fica na
+exportação, então uma exportação que falhou retoma só as partições pendentes.
+"""
+
+import logging
+import shutil
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import replace
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import or_, select, update
+from sqlalchemy.orm import Session
+
+from synapse.core.analytics.bulk_export import (
+    EXPORT_COMPRESSIONS,
+    ExportFormatError,
+    ExportManifest,
+    ExportPartition,
+    PartitionWriter,
+    normalize_format,
+    partition_suffix,
+    split_time_range,
+    verify_partition,
+    write_manifest_file,
+)
+from synapse.core.analytics.report_query import (
+    ReportQueryError,
+    ReportSource,
+    compile_report_query,
+    parse_datetime,
+)
+from synapse.core.config import settings
+from synapse.models.analytics_export import AnalyticsExport
+from synapse.services.report_job_service import REPORT_SOURCES, worker_identity
+
+logger = logging.getLogger(__name__)
+
+EXPORT_DIRECTORY = "exports"
+
+
+def _default_session_factory() -> Session:
+    from synapse.database import SessionLocal
+
+    return SessionLocal()
+
+
+def _default_storage_root() -> Path:
+    from synapse.core.storage.storage_manager import storage_manager
+
+    return storage_manager.base_path
+
+
+def _as_utc(value: datetime) -> datetime:
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+
+
+def export_status(export: AnalyticsExport) -> Dict[str, Any]:
+    manifest = ExportManifest.from_dict(export.manifest) if export.manifest else None
+    partitions = manifest.partitions if manifest else []
+    return {
+        "export_id": str(export.id),
+        "name": export.name,
+        "status": export.status,
+        "format": manifest.format if manifest else export.export_type,
+        "compression": manifest.compression if manifest else None,
+        "progress": manifest.progress() if manifest else 0.0,
+        "partitions": len(partitions),
+        "partitions_completed": sum(1 for partition in partitions if partition.status == "completed"),
+        "partitions_failed": sum(1 for partition in partitions if partition.status == "failed"),
+        "rows_exported": export.rows_exported or 0,
+        "bytes_written": export.bytes_written or 0,
+        "workers": manifest.worker_throughput() if manifest else {},
+        "created_at": export.created_at.isoformat() if export.created_at else None,
+        "completed_at": export.completed_at.isoformat() if export.completed_at else None,
+        "error_message": export.error_message,
+    }
+
+
+class BulkExportService:
+    """
+    Exportações particionadas por tempo.
+
+    Um pool pequeno coordena as exportações (planeja, acompanha e grava o
+    manifesto, único escritor da linha da exportação) e um pool compartilhado
+    de ``EXPORT_WORKERS`` threads grava as partições.
+
+    Exportações em andamento ficam em nome de ``worker_id``, com
+    ``heartbeat_at`` renovado por uma thread; só as que ficaram sem heartbeat
+    por mais de ``stale_after`` são dadas como interrompidas.
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        partition_span: Optional[timedelta] = None,
+        batch_size: Optional[int] = None,
+        session_factory: Callable[[], Session] = _default_session_factory,
+        storage_root: Optional[Path] = None,
+        sources: Optional[Dict[str, ReportSource]] = None,
+        use_copy: Optional[bool] = None,
+        worker_id: Optional[str] = None,
+        stale_after: Optional[timedelta] = None,
+    ):
+        self.workers = workers or settings.EXPORT_WORKERS
+        self.partition_span = partition_span or timedelta(hours=settings.EXPORT_PARTITION_HOURS)
+        self.batch_size = batch_size or settings.EXPORT_BATCH_SIZE
+        self.session_factory = session_factory
+        self._storage_root = storage_root
+        self.sources = sources or REPORT_SOURCES
+        self.use_copy = settings.EXPORT_USE_COPY if use_copy is None else use_copy
+        self.worker_id = worker_id or worker_identity()
+        self.stale_after = stale_after or timedelta(seconds=settings.EXPORT_STALE_SECONDS)
+        self._coordinators: Optional[ThreadPoolExecutor] = None
+        self._partition_pool: Optional[ThreadPoolExecutor] = None
+        self._stopping: Optional[threading.Event] = None
+        self._lock = threading.Lock()
+
+    @property
+    def storage_root(self) -> Path:
+        if self._storage_root is None:
+            self._storage_root = _default_storage_root()
+        return self._storage_root
+
+    def _get_executors(self) -> Tuple[ThreadPoolExecutor, ThreadPoolExecutor]:
+        with self._lock:
+            if self._coordinators is None:
+                self._coordinators = ThreadPoolExecutor(
+                    max_workers=settings.EXPORT_MAX_CONCURRENT, thread_name_prefix="export-job"
+                )
+                self._partition_pool = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="export-worker"
+                )
+                self._stopping = threading.Event()
+                threading.Thread(
+                    target=self._heartbeat_loop,
+                    args=(self._stopping,),
+                    name="export-heartbeat",
+                    daemon=True,
+                ).start()
+            return self._coordinators, self._partition_pool
+
+    def _heartbeat_loop(self, stopping: threading.Event) -> None:
+        interval = self.stale_after.total_seconds() / 4
+        while not stopping.wait(interval):
+            try:
+                self.heartbeat()
+            except Exception as e:
+                logger.warning(f"Falha ao renovar o heartbeat das exportações: {e}")
+
+    def heartbeat(self) -> int:
+        """Renova ``heartbeat_at`` das exportações em andamento neste processo"""
+        db = self.session_factory()
+        try:
+            result = db.execute(
+                update(AnalyticsExport)
+                .where(
+                    AnalyticsExport.worker_id == self.worker_id,
+                    AnalyticsExport.status == "processing",
+                )
+                .values(heartbeat_at=datetime.now(timezone.utc))
+            )
+            db.commit()
+            return result.rowcount or 0
+        finally:
+            db.close()
+
+    # ==================== CONFIGURAÇÃO ====================
+
+    @staticmethod
+    def export_config(export: AnalyticsExport) -> Dict[str, Any]:
+        """``export_query`` no formato do query builder (``data_type`` é sinônimo de ``type``)"""
+        config = dict(export.export_query or {})
+        if "data_type" in config:
+            config.setdefault("type", config.pop("data_type"))
+        config.pop("compression", None)
+        return config
+
+    @staticmethod
+    def export_compression(export: AnalyticsExport) -> str:
+        compression = (export.export_query or {}).get("compression") or settings.EXPORT_COMPRESSION
+        if compression not in EXPORT_COMPRESSIONS:
+            raise ExportFormatError(f"Compressão não suportada: {compression}")
+        return compression
+
+    def validate(self, export: AnalyticsExport) -> None:
+        """Erros de formato e de consulta aparecem na requisição, não só no job"""
+        fmt = normalize_format(export.export_type)
+        partition_suffix(fmt, self.export_compression(export))
+        config = self.export_config(export)
+        if config.get("aggregations") or config.get("group_by") or config.get("time_bucket"):
+            raise ReportQueryError("Exportações em massa copiam linhas; use relatórios para agregações")
+        compile_report_query(config, self.sources, export.tenant_id)
+
+    def create(
+        self,
+        db: Session,
+        owner_id: Any,
+        name: str,
+        export_type: str,
+        export_query: Dict[str, Any],
+        tenant_id: Any = None,
+    ) -> AnalyticsExport:
+        """Registra a exportação como ``pending`` e agenda"""
+        export = AnalyticsExport(
+            id=uuid.uuid4(),
+            name=name,
+            export_type=export_type,
+            export_query=export_query,
+            owner_id=owner_id,
+            tenant_id=tenant_id,
+            status="pending",
+        )
+        self.validate(export)
+        db.add(export)
+        db.commit()
+        db.refresh(export)
+        self.submit(export.id)
+        return export
+
+    def submit(self, export_id: Any) -> None:
+        coordinators, _ = self._get_executors()
+        coordinators.submit(self.run, export_id)
+
+    def resume(self, export: AnalyticsExport) -> bool:
+        """
+        Volta uma exportação falha/cancelada para ``pending`` mantendo o
+        manifesto; o chamador faz o commit e chama ``submit``.
+        """
+        if export.status not in ("failed", "cancelled"):
+            return False
+        export.status = "pending"
+        export.error_message = None
+        export.completed_at = None
+        return True
+
+    # ==================== PLANEJAMENTO ====================
+
+    def _time_bounds(self, db: Session, export: AnalyticsExport, config: Dict[str, Any]) -> Optional[Tuple[datetime, datetime]]:
+        date_range = config.get("date_range") or {}
+        filters = config.get("filters") or {}
+        start = date_range.get("start") or filters.get("start_date")
+        end = date_range.get("end") or filters.get("end_date")
+        if start is not None and end is not None:
+            return _as_utc(parse_datetime(start)), _as_utc(parse_datetime(end))
+
+        # Intervalo aberto: limites reais dos dados que passam nos filtros
+        source = self.sources[config.get("type", "events")]
+        bounds_config = {
+            **config,
+            "columns": None,
+            "order_by": None,
+            "aggregations": [
+                {"function": "min", "field": source.timestamp_column, "alias": "first"},
+                {"function": "max", "field": source.timestamp_column, "alias": "last"},
+            ],
+        }
+        compiled = compile_report_query(bounds_config, self.sources, export.tenant_id)
+        first, last = db.execute(compiled.statement).one()
+        if first is None:
+            return None
+        lower = parse_datetime(start) if start is not None else first
+        upper = parse_datetime(end) if end is not None else last + timedelta(microseconds=1)
+        return _as_utc(lower), _as_utc(upper)
+
+    def plan(self, db: Session, export: AnalyticsExport) -> ExportManifest:
+        fmt = normalize_format(export.export_type)
+        compression = self.export_compression(export)
+        config = self.export_config(export)
+        columns = compile_report_query(config, self.sources, export.tenant_id).columns
+        manifest = ExportManifest(format=fmt, compression=compression, columns=columns)
+
+        if config.get("limit"):
+            # Um LIMIT global não se divide entre partições
+            manifest.partitions.append(ExportPartition(index=0, start=None, end=None))
+            return manifest
+        bounds = self._time_bounds(db, export, config)
+        if bounds is None:
+            return manifest
+        for index, (start, end) in enumerate(split_time_range(*bounds, self.partition_span)):
+            manifest.partitions.append(
+                ExportPartition(index=index, start=start.isoformat(), end=end.isoformat())
+            )
+        return manifest
+
+    # ==================== EXECUÇÃO ====================
+
+    def run(self, export_id: Any) -> None:
+        """Coordena uma exportação (thread do pool de coordenação)"""
+        db = self.session_factory()
+        try:
+            export = db.get(AnalyticsExport, export_id)
+            if export is None or export.status != "pending":
+                return
+            export.status = "processing"
+            export.error_message = None
+            export.worker_id = self.worker_id
+            export.heartbeat_at = datetime.now(timezone.utc)
+            db.commit()
+
+            manifest = ExportManifest.from_dict(export.manifest) if export.manifest else self.plan(db, export)
+            directory = f"{EXPORT_DIRECTORY}/{export.id}"
+            config = self.export_config(export)
+            pending = [
+                partition
+                for partition in manifest.partitions
+                if not verify_partition(self.storage_root, partition)
+            ]
+            export.manifest = manifest.to_dict()
+            db.commit()
+
+            _, pool = self._get_executors()
+            futures = {
+                pool.submit(self._export_partition, config, export.tenant_id, manifest, partition, directory): partition.index
+                for partition in pending
+            }
+            for future in as_completed(futures):
+                index = futures[future]
+                try:
+                    manifest.partitions[index] = future.result()
+                except Exception as e:
+                    logger.error(f"Falha na partição {index} da exportação {export_id}: {e}")
+                    manifest.partitions[index] = replace(
+                        manifest.partitions[index], status="failed", error=str(e)[:500]
+                    )
+                export.manifest = manifest.to_dict()
+                export.rows_exported = manifest.rows
+                export.bytes_written = manifest.bytes
+                db.commit()
+
+            export.completed_at = datetime.now(timezone.utc)
+            if manifest.is_complete:
+                write_manifest_file(self.storage_root, directory, export.id, manifest)
+                export.status = "completed"
+                export.file_path = directory
+                throughput = ", ".join(
+                    f"{worker}: {stats['rows_per_second']:.0f} linhas/s"
+                    for worker, stats in sorted(manifest.worker_throughput().items())
+                )
+                logger.info(
+                    f"Exportação {export.id} concluída: {manifest.rows} linhas em "
+                    f"{len(manifest.partitions)} partições ({throughput or 'sem linhas'})"
+                )
+            else:
+                failed = sum(1 for partition in manifest.partitions if partition.status == "failed")
+                export.status = "failed"
+                export.error_message = f"{failed} partições falharam; a exportação pode ser retomada"
+            db.commit()
+        except Exception as e:
+            logger.error(f"Falha na exportação {export_id}: {e}")
+            db.rollback()
+            db.execute(
+                update(AnalyticsExport)
+                .where(AnalyticsExport.id == export_id)
+                .values(
+                    status="failed",
+                    error_message=str(e)[:2000],
+                    completed_at=datetime.now(timezone.utc),
+                )
+            )
+            db.commit()
+        finally:
+            db.close()
+
+    def _export_partition(
+        self,
+        config: Dict[str, Any],
+        tenant_id: Any,
+        manifest: ExportManifest,
+        partition: ExportPartition,
+        directory: str,
+    ) -> ExportPartition:
+        """Grava uma partição (thread do pool de workers, sessão própria)"""
+        partition_config = dict(config)
+        if partition.start is not None:
+            partition_config["date_range"] = {"start": partition.start, "end": partition.end}
+        compiled = compile_report_query(partition_config, self.sources, tenant_id)
+        relative = f"{directory}/part-{partition.index:05d}{partition_suffix(manifest.format, manifest.compression)}"
+        column_types = []
+        for column in compiled.statement.selected_columns:
+            try:
+                column_types.append(column.type.python_type)
+            except NotImplementedError:
+                column_types.append(None)
+
+        started = time.perf_counter()
+        db = self.session_factory()
+        writer = None
+        try:
+            # O cabeçalho CSV vai só na partição 0 (as partições são concatenadas no download)
+            header = partition.index == 0
+            use_copy = manifest.format == "csv" and self.use_copy and db.get_bind().dialect.name == "postgresql"
+            writer = PartitionWriter(
+                self.storage_root / relative,
+                compiled.columns,
+                manifest.format,
+                manifest.compression,
+                header=header and not use_copy,
+                column_types=column_types,
+            )
+            if use_copy:
+                rows = self._copy_partition(db, compiled.statement, writer, header=header)
+            else:
+                result = db.execute(compiled.statement.execution_options(yield_per=self.batch_size))
+                for batch in result.partitions(self.batch_size):
+                    writer.write_rows(batch)
+                rows = writer.rows
+            size, checksum = writer.commit()
+        except Exception:
+            if writer is not None:
+                writer.abort()
+            raise
+        finally:
+            db.close()
+
+        return replace(
+            partition,
+            status="completed",
+            file=relative,
+            rows=rows,
+            bytes=size,
+            sha256=checksum,
+            seconds=round(time.perf_counter() - started, 3),
+            worker=threading.current_thread().name,
+            error=None,
+        )
+
+    @staticmethod
+    def _copy_partition(db: Session, statement, writer: PartitionWriter, header: bool) -> int:
+        """``COPY (SELECT ...) TO STDOUT`` direto para o arquivo comprimido"""
+        bind = db.get_bind()
+        compiled = statement.compile(dialect=bind.dialect)
+        params = {
+            name: str(value) if isinstance(value, uuid.UUID) else value
+            for name, value in compiled.params.items()
+        }
+        connection = db.connection().connection
+        with connection.cursor() as cursor:
+            query = cursor.mogrify(str(compiled), params).decode()
+            cursor.copy_expert(
+                f"COPY ({query}) TO STDOUT WITH (FORMAT csv, HEADER {'true' if header else 'false'})",
+                writer.stream,
+            )
+            return cursor.rowcount
+
+    # ==================== CONSULTA E DOWNLOAD ====================
+
+    def get_export(self, db: Session, export_id: Any, user_id: Any) -> Optional[AnalyticsExport]:
+        try:
+            export_id = uuid.UUID(str(export_id))
+        except ValueError:
+            return None
+        return db.execute(
+            select(AnalyticsExport).where(AnalyticsExport.id == export_id, AnalyticsExport.owner_id == user_id)
+        ).scalar_one_or_none()
+
+    def list_exports(
+        self, db: Session, user_id: Any, status: Optional[str] = None, limit: int = 20, offset: int = 0
+    ) -> List[AnalyticsExport]:
+        query = select(AnalyticsExport).where(AnalyticsExport.owner_id == user_id)
+        if status:
+            query = query.where(AnalyticsExport.status == status)
+        return list(
+            db.execute(query.order_by(AnalyticsExport.created_at.desc()).limit(limit).offset(offset)).scalars()
+        )
+
+    def download_files(
+        self, export: AnalyticsExport, partition: Optional[int] = None
+    ) -> Tuple[List[Tuple[Path, int]], str, str]:
+        """
+        (arquivos com tamanho, nome do download, ETag). Sem ``partition`` o
+        download é a concatenação de todas as partições (CSV/JSONL).
+        """
+        if export.status != "completed" or not export.manifest:
+            raise LookupError("A exportação não foi concluída")
+        manifest = ExportManifest.from_dict(export.manifest)
+        suffix = partition_suffix(manifest.format, manifest.compression)
+        if partition is not None:
+            if not 0 <= partition < len(manifest.partitions):
+                raise IndexError(f"Partição inexistente: {partition}")
+            selected = manifest.partitions[partition]
+            return (
+                [(self.storage_root / selected.file, selected.bytes)],
+                f"export-{export.id}-part-{partition:05d}{suffix}",
+                selected.sha256,
+            )
+        if not manifest.concatenable and len(manifest.partitions) > 1:
+            raise ExportFormatError("Arquivos parquet são baixados por partição")
+        files = [(self.storage_root / item.file, item.bytes) for item in manifest.partitions]
+        return files, f"export-{export.id}{suffix}", manifest.etag
+
+    # ==================== MANUTENÇÃO ====================
+
+    def recover_interrupted(self, db: Session, now: Optional[datetime] = None) -> int:
+        """
+        Exportações em andamento cujo processo parou de dar sinal de vida
+        (retomáveis pelo manifesto); as de workers vivos não são tocadas
+        """
+        now = now or datetime.now(timezone.utc)
+        result = db.execute(
+            update(AnalyticsExport)
+            .where(
+                AnalyticsExport.status == "processing",
+                or_(
+                    AnalyticsExport.heartbeat_at.is_(None),
+                    AnalyticsExport.heartbeat_at < now - self.stale_after,
+                ),
+            )
+            .values(
+                status="failed",
+                error_message="Exportação interrompida: o worker parou de responder; pode ser retomada",
+                completed_at=now,
+            )
+        )
+        db.commit()
+        return result.rowcount or 0
+
+    def purge(self, db: Session, days: Optional[int] = None) -> int:
+        """Remove arquivos de exportações antigas"""
+        days = days if days is not None else settings.EXPORT_RETENTION_DAYS
+        cutoff = datetime.now(timezone.utc) - timedelta(days=days)
+        expired = list(
+            db.execute(
+                select(AnalyticsExport.id).where(
+                    AnalyticsExport.status.in_(("completed", "failed")),
+                    AnalyticsExport.completed_at < cutoff,
+                )
+            ).scalars()
+        )
+        for export_id in expired:
+            shutil.rmtree(self.storage_root / EXPORT_DIRECTORY / str(export_id), ignore_errors=True)
+        if expired:
+            db.execute(
+                update(AnalyticsExport)
+                .where(AnalyticsExport.id.in_(expired))
+                .values(manifest=None, file_path=None, status="expired")
+            )
+            db.commit()
+        return len(expired)
+
+    def shutdown(self, wait: bool = True, cancel_pending: bool = False) -> None:
+        with self._lock:
+            executors = (self._coordinators, self._partition_pool)
+            self._coordinators = self._partition_pool = None
+            stopping, self._stopping = self._stopping, None
+        if stopping is not None:
+            stopping.set()
+        for executor in executors:
+            if executor is not None:
+                executor.shutdown(wait=wait, cancel_futures=cancel_pending)
+
+
+bulk_export_service = BulkExportService()
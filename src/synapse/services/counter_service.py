@@ -0,0 +1,443 @@
+"""
+Contadores sem contenção para uso, downloads e avaliações
+Incrementos em linhas muito acessadas (templates populares, componentes do
+marketplace, nós, arquivos) não fazem mais read-modify-write no ORM: são
+acumulados em shards em memória (um lock por shard) e gravados em lote por um
+flusher com ``UPDATE ... SET x = x + :delta`` — atômico no banco, então
+workers diferentes nunca perdem incrementos. Médias de avaliação não são
+acumuladas: o mesmo UPDATE recalcula média e quantidade da tabela de
+avaliações, então não há arredondamento acumulado (``nodes.rating_average``
+é inteiro) nem delta perdido entre workers.
+
+Cada incremento também alimenta scores de tendência com decaimento
+exponencial (forward decay), guardados no Redis (compartilhados entre
+workers) ou em memória.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+from sqlalchemy import bindparam, func, select, update
+
+from synapse.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# O marco do forward decay avança a cada N meias-vidas; scores do período
+# anterior entram na leitura com fator 2^-N
+PERIOD_HALF_LIVES = 32
+
+TEMPLATE = "workflow_template"
+MARKETPLACE_COMPONENT = "marketplace_component"
+NODE = "node"
+FILE = "file"
+
+
+@dataclass(frozen=True)
+class RatingSource:
+    """Colunas (média, quantidade) da tabela e a tabela de avaliações de onde são recalculadas"""
+
+    average: str
+    count: str
+    ratings: Any
+    foreign_key: str
+    score: str = "rating"
+
+
+@dataclass(frozen=True)
+class CounterTarget:
+    """Tabela com contadores: colunas incrementáveis, origem das avaliações e pesos de tendência"""
+
+    model: Any
+    counters: Tuple[str, ...]
+    rating: Optional[RatingSource] = None
+    touch: Optional[str] = None
+    trending: Mapping[str, float] = field(default_factory=dict)
+
+    def parse_id(self, key: str) -> Any:
+        return self.model.__table__.c.id.type.python_type(key)
+
+
+def default_targets() -> Dict[str, CounterTarget]:
+    from synapse.models.file import File
+    from synapse.models.marketplace import ComponentRating, MarketplaceComponent
+    from synapse.models.node import Node
+    from synapse.models.node_rating import NodeRating
+    from synapse.models.template import TemplateReview
+    from synapse.models.workflow_template import WorkflowTemplate
+
+    return {
+        TEMPLATE: CounterTarget(
+            WorkflowTemplate,
+            counters=("download_count", "downloads_count", "usage_count", "view_count"),
+            rating=RatingSource("rating_average", "rating_count", TemplateReview, "template_id"),
+            touch="last_used_at",
+            trending={"downloads_count": 1.0, "usage_count": 3.0, "view_count": 0.1},
+        ),
+        MARKETPLACE_COMPONENT: CounterTarget(
+            MarketplaceComponent,
+            counters=("downloads_count", "install_count", "view_count", "like_count"),
+            rating=RatingSource("rating_average", "rating_count", ComponentRating, "component_id"),
+            touch="last_download_at",
+            trending={"downloads_count": 1.0, "install_count": 3.0, "like_count": 0.5, "view_count": 0.1},
+        ),
+        NODE: CounterTarget(
+            Node,
+            counters=("usage_count",),
+            rating=RatingSource("rating_average", "rating_count", NodeRating, "node_id"),
+            trending={"usage_count": 1.0},
+        ),
+        FILE: CounterTarget(File, counters=("access_count",), touch="last_accessed_at"),
+    }
+
+
+@dataclass
+class PendingCounters:
+    """Deltas acumulados de uma linha desde o último flush"""
+
+    deltas: Counter = field(default_factory=Counter)
+    rated: bool = False
+    touched: bool = False
+    trend: float = 0.0
+
+    def merge(self, other: "PendingCounters") -> None:
+        self.deltas.update(other.deltas)
+        self.rated = self.rated or other.rated
+        self.touched = self.touched or other.touched
+        self.trend += other.trend
+
+    @property
+    def has_writes(self) -> bool:
+        return any(self.deltas.values()) or self.rated or self.touched
+
+
+Batch = Dict[Tuple[str, str], PendingCounters]
+
+
+def _update_statement(target: CounterTarget, columns: Tuple[str, ...], rating: bool, touch: bool):
+    """UPDATE atômico: cada contador soma o seu delta e média/quantidade vêm da tabela de avaliações"""
+    table = target.model.__table__
+    values: Dict[str, Any] = {
+        name: func.coalesce(table.c[name], 0) + bindparam(f"d_{name}") for name in columns
+    }
+    if rating:
+        source = target.rating
+        ratings = source.ratings.__table__
+        of_row = ratings.c[source.foreign_key] == table.c.id
+        scores = ratings.c[source.score]
+        values[source.average] = func.coalesce(select(func.avg(scores)).where(of_row).scalar_subquery(), 0)
+        values[source.count] = select(func.count()).select_from(ratings).where(of_row).scalar_subquery()
+    if touch and target.touch:
+        values[target.touch] = func.now()
+    return update(table).where(table.c.id == bindparam("row_id")).values(values)
+
+
+def write_counter_batch(batch: Batch, targets: Mapping[str, CounterTarget]) -> int:
+    """
+    Grava o lote em uma transação: um executemany por tabela e formato de
+    UPDATE, com as linhas em ordem de id (workers concorrentes travam as
+    linhas na mesma ordem, sem deadlock). Retorna quantas linhas foram tocadas.
+    """
+    from synapse.database import get_db_session
+
+    groups: Dict[Tuple[str, Tuple[str, ...], bool, bool], List[Dict[str, Any]]] = {}
+    for (scope, key), entry in sorted(batch.items()):
+        if not entry.has_writes:
+            continue
+        target = targets[scope]
+        columns = tuple(sorted(name for name, delta in entry.deltas.items() if delta))
+        rating = bool(target.rating and entry.rated)
+        params: Dict[str, Any] = {"row_id": target.parse_id(key)}
+        params.update({f"d_{name}": entry.deltas[name] for name in columns})
+        groups.setdefault((scope, columns, rating, entry.touched), []).append(params)
+
+    if not groups:
+        return 0
+    with get_db_session() as db:
+        for (scope, columns, rating, touch), rows in groups.items():
+            db.execute(_update_statement(targets[scope], columns, rating, touch), rows)
+    return sum(len(rows) for rows in groups.values())
+
+
+class DecayedScores:
+    """
+    Scores de tendência em memória com forward decay: um evento de peso w no
+    instante t soma ``w·2^((t − L)/meia-vida)`` ao item, relativo ao marco L do
+    período; a leitura divide por ``2^((agora − L)/meia-vida)``. Nada precisa
+    ser decaído periodicamente.
+    """
+
+    def __init__(self, half_life_seconds: float, clock: Callable[[], float] = time.time):
+        self.half_life = half_life_seconds
+        self._clock = clock
+        self._scores: Dict[Tuple[str, int], Counter] = {}
+        self._lock = threading.Lock()
+
+    def period(self, now: float) -> Tuple[int, float]:
+        """Índice do período e fator de crescimento em relação ao seu marco"""
+        span = self.half_life * PERIOD_HALF_LIVES
+        index = int(now // span)
+        return index, 2 ** ((now - index * span) / self.half_life)
+
+    async def add(self, scope: str, items: Mapping[str, float]) -> None:
+        index, boost = self.period(self._clock())
+        with self._lock:
+            scores = self._scores.setdefault((scope, index), Counter())
+            for key, weight in items.items():
+                scores[key] += weight * boost
+            for stale in [k for k in self._scores if k[0] == scope and k[1] < index - 1]:
+                del self._scores[stale]
+
+    async def top(self, scope: str, limit: int) -> List[Tuple[str, float]]:
+        index, boost = self.period(self._clock())
+        combined: Counter = Counter()
+        with self._lock:
+            for key, score in self._scores.get((scope, index - 1), {}).items():
+                combined[key] += score * 2**-PERIOD_HALF_LIVES
+            combined.update(self._scores.get((scope, index), {}))
+        return [(key, score / boost) for key, score in combined.most_common(limit)]
+
+
+class RedisDecayedScores(DecayedScores):
+    """Mesmo esquema em sorted sets do Redis (uma chave por escopo e período)"""
+
+    def __init__(self, redis_url: str, prefix: str, half_life_seconds: float, clock: Callable[[], float] = time.time):
+        super().__init__(half_life_seconds, clock)
+        import redis.asyncio as redis
+
+        self.client = redis.from_url(redis_url)
+        self.prefix = prefix
+
+    def key(self, scope: str, index: int) -> str:
+        return f"{self.prefix}:{scope}:{index}"
+
+    async def add(self, scope: str, items: Mapping[str, float]) -> None:
+        index, boost = self.period(self._clock())
+        key = self.key(scope, index)
+        pipe = self.client.pipeline(transaction=False)
+        for member, weight in items.items():
+            pipe.zincrby(key, weight * boost, member)
+        pipe.expire(key, int(self.half_life * PERIOD_HALF_LIVES * 2))
+        await pipe.execute()
+
+    async def top(self, scope: str, limit: int) -> List[Tuple[str, float]]:
+        index, boost = self.period(self._clock())
+        merged = f"{self.key(scope, index)}:top"
+        pipe = self.client.pipeline(transaction=True)
+        pipe.zunionstore(
+            merged,
+            {self.key(scope, index): 1.0, self.key(scope, index - 1): 2**-PERIOD_HALF_LIVES},
+        )
+        pipe.zrevrange(merged, 0, limit - 1, withscores=True)
+        pipe.delete(merged)
+        _, rows, _ = await pipe.execute()
+        return [(member.decode() if isinstance(member, bytes) else member, score / boost) for member, score in rows]
+
+
+class CounterService:
+    """
+    Acumula incrementos e avaliações por linha e grava em lote. ``increment``
+    e ``add_rating`` são síncronos, não bloqueiam e são seguros entre threads
+    (endpoints síncronos rodam no threadpool).
+    """
+
+    def __init__(
+        self,
+        targets: Optional[Mapping[str, CounterTarget]] = None,
+        shards: Optional[int] = None,
+        flush_interval_ms: Optional[int] = None,
+        half_life_hours: Optional[float] = None,
+        redis_prefix: Optional[str] = None,
+        writer: Optional[Callable[[Batch, Mapping[str, CounterTarget]], int]] = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        self._targets = targets
+        self.flush_interval = (flush_interval_ms or settings.COUNTER_FLUSH_INTERVAL_MS) / 1000
+        self.writer = writer or write_counter_batch
+        half_life = (half_life_hours or settings.TRENDING_HALF_LIFE_HOURS) * 3600
+        self._shards: List[Tuple[threading.Lock, Batch]] = [
+            (threading.Lock(), {}) for _ in range(max(1, shards or settings.COUNTER_SHARDS))
+        ]
+
+        self.local_trending = DecayedScores(half_life, clock)
+        self.shared_trending: Optional[RedisDecayedScores] = None
+        prefix = settings.TRENDING_REDIS_PREFIX if redis_prefix is None else redis_prefix
+        if prefix and settings.REDIS_URL:
+            self.shared_trending = RedisDecayedScores(settings.REDIS_URL, prefix, half_life, clock)
+
+        self.stats = {"increments": 0, "flushes": 0, "rows_written": 0, "failed_flushes": 0}
+        self._stats_lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._stopping = False
+
+    @property
+    def targets(self) -> Mapping[str, CounterTarget]:
+        if self._targets is None:
+            self._targets = default_targets()
+        return self._targets
+
+    # ==================== REGISTRO ====================
+
+    def _record(self, scope: str, row_id: Any, apply: Callable[[PendingCounters], None]) -> None:
+        target = self.targets.get(scope)
+        if target is None:
+            raise ValueError(f"Contador desconhecido: {scope}")
+        # Id inválido falha aqui, para o chamador, e não no flush do lote
+        key = (scope, str(target.parse_id(str(row_id))))
+        lock, pending = self._shards[hash(key) % len(self._shards)]
+        with lock:
+            entry = pending.get(key)
+            if entry is None:
+                entry = pending[key] = PendingCounters()
+            apply(entry)
+        with self._stats_lock:
+            self.stats["increments"] += 1
+
+    def increment(self, scope: str, row_id: Any, touch: bool = False, **deltas: int) -> None:
+        """Soma ``deltas`` (coluna=quantidade) aos contadores da linha; ``touch`` atualiza o timestamp de uso"""
+        target = self.targets.get(scope)
+        unknown = [name for name in deltas if target is not None and name not in target.counters]
+        if unknown:
+            raise ValueError(f"Contadores desconhecidos em {scope}: {', '.join(unknown)}")
+
+        def apply(entry: PendingCounters) -> None:
+            entry.deltas.update(deltas)
+            entry.touched = entry.touched or touch
+            entry.trend += sum(target.trending.get(name, 0.0) * delta for name, delta in deltas.items())
+
+        self._record(scope, row_id, apply)
+
+    def add_rating(self, scope: str, row_id: Any) -> None:
+        """
+        Avaliação da linha criada, alterada ou removida (já gravada): média e
+        quantidade são recalculadas da tabela de avaliações no próximo flush
+        """
+        if not self.targets[scope].rating:
+            raise ValueError(f"{scope} não tem avaliações")
+
+        def apply(entry: PendingCounters) -> None:
+            entry.rated = True
+
+        self._record(scope, row_id, apply)
+
+    def pending(self) -> int:
+        return sum(len(pending) for _, pending in self._shards)
+
+    def drain(self) -> Batch:
+        batch: Batch = {}
+        for lock, pending in self._shards:
+            with lock:
+                batch.update(pending)
+                pending.clear()
+        return batch
+
+    def requeue(self, batch: Batch) -> None:
+        """Devolve um lote que não pôde ser gravado (somando ao que chegou depois)"""
+        for key, entry in batch.items():
+            entry.trend = 0.0
+            lock, pending = self._shards[hash(key) % len(self._shards)]
+            with lock:
+                current = pending.get(key)
+                if current is None:
+                    pending[key] = entry
+                else:
+                    current.merge(entry)
+
+    # ==================== FLUSH ====================
+
+    async def flush(self) -> int:
+        """Aplica tendências e grava os deltas acumulados; retorna as linhas gravadas"""
+        batch = self.drain()
+        if not batch:
+            return 0
+
+        trends: Dict[str, Dict[str, float]] = {}
+        for (scope, key), entry in batch.items():
+            if entry.trend:
+                trends.setdefault(scope, {})[key] = entry.trend
+        for scope, items in trends.items():
+            await self.local_trending.add(scope, items)
+            if self.shared_trending is not None:
+                try:
+                    await self.shared_trending.add(scope, items)
+                except Exception as e:
+                    logger.warning(f"Erro ao atualizar tendências no Redis: {e}")
+
+        try:
+            written = await asyncio.to_thread(self.writer, batch, self.targets)
+        except Exception as e:
+            logger.error(f"Falha ao gravar {len(batch)} contadores: {e}")
+            self.requeue(batch)
+            with self._stats_lock:
+                self.stats["failed_flushes"] += 1
+            return 0
+
+        with self._stats_lock:
+            self.stats["flushes"] += 1
+            self.stats["rows_written"] += written
+        return written
+
+    async def trending(self, scope: str, limit: int = 10) -> List[Tuple[str, float]]:
+        """Ids com maior score de tendência (decaído até agora), do Redis se disponível"""
+        if self.shared_trending is not None:
+            try:
+                return await self.shared_trending.top(scope, limit)
+            except Exception as e:
+                logger.warning(f"Erro ao ler tendências do Redis, usando memória: {e}")
+        return await self.local_trending.top(scope, limit)
+
+    # ==================== CICLO DE VIDA ====================
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def run(self) -> None:
+        self._wakeup = asyncio.Event()
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    async def start(self) -> None:
+        if self.running:
+            return
+        self._stopping = False
+        self._task = asyncio.create_task(self.run(), name="counter_flusher")
+
+    async def stop(self) -> None:
+        """Encerra o flusher sem interromper uma gravação e grava o que estiver acumulado"""
+        if self._task is not None:
+            self._stopping = True
+            if self._wakeup is not None:
+                self._wakeup.set()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self._wakeup = None
+        await self.flush()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "pending_rows": self.pending(),
+            "shards": len(self._shards),
+            "flush_interval_ms": int(self.flush_interval * 1000),
+            "shared_trending": self.shared_trending is not None,
+            "running": self.running,
+        }
+
+
+# Serviço global de contadores
+counter_service = CounterService()
@@ -0,0 +1,213 @@
+"""
+Avaliação concorrente de widgets de dashboards
+Cada widget roda em sua própria sessão (do pool de conexões) com limite de
+concorrência por dashboard; resultados são cacheados por (tenant, hash da
+configuração, bucket de tempo) com TTL alinhado à granularidade do widget.
+O ``tenant_id`` da configuração é sempre o de quem consulta: o valor salvo
+no widget é sobrescrito antes do cálculo
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from collections.abc import AsyncIterator, Callable
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from synapse.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Métodos do AnalyticsService que calculam cada tipo de widget
+WIDGET_HANDLERS: Dict[str, str] = {
+    "metric_chart": "_get_metric_chart_data",
+    "event_timeline": "_get_event_timeline_data",
+    "user_funnel": "_get_user_funnel_data",
+    "kpi_card": "_get_kpi_card_data",
+    "heatmap": "_get_heatmap_data",
+}
+
+# TTL (segundos) por intervalo do widget: quanto maior a janela, menos um
+# minuto a mais de dados muda o resultado
+WIDGET_TTL_SECONDS: Dict[str, int] = {
+    "1h": 60,
+    "6h": 300,
+    "24h": 300,
+    "1d": 300,
+    "7d": 900,
+    "30d": 3600,
+    "90d": 3600,
+}
+DEFAULT_WIDGET_TTL_SECONDS = 300
+
+WidgetCompute = Callable[[str, Dict[str, Any]], Any]
+
+
+def widget_ttl(config: Dict[str, Any]) -> int:
+    return WIDGET_TTL_SECONDS.get(config.get("time_range"), DEFAULT_WIDGET_TTL_SECONDS)
+
+
+def widget_cache_key(widget_type: str, config: Dict[str, Any], now: Optional[float] = None) -> str:
+    """
+    Chave de cache do widget: tenant + hash estável da configuração + índice
+    do bucket de tempo atual (o resultado expira na virada do bucket)
+    """
+    ttl = widget_ttl(config)
+    tenant = config.get("tenant_id") or "global"
+    digest = hashlib.sha256(
+        json.dumps({"type": widget_type, "config": config}, sort_keys=True, default=str).encode()
+    ).hexdigest()[:32]
+    bucket = int((now if now is not None else time.time()) // ttl)
+    return f"analytics:widget:{tenant}:{digest}:{ttl}:{bucket}"
+
+
+def compute_widget(widget_type: str, config: Dict[str, Any]) -> Any:
+    """Calcula um widget em uma sessão própria (executado em thread)"""
+    from synapse.database import SessionLocal
+    from synapse.services.analytics_service import AnalyticsService
+
+    db = SessionLocal()
+    try:
+        return getattr(AnalyticsService(db), WIDGET_HANDLERS[widget_type])(config)
+    finally:
+        db.close()
+
+
+class DashboardEvaluator:
+    """
+    Avalia os widgets de um dashboard em paralelo.
+
+    Widgets idênticos em andamento (mesma chave de cache) são calculados uma
+    única vez; falhas de um widget não afetam os demais.
+    """
+
+    def __init__(
+        self,
+        compute: WidgetCompute = compute_widget,
+        concurrency: Optional[int] = None,
+        cache: Any = None,
+    ):
+        self.compute = compute
+        self.concurrency = concurrency or settings.DASHBOARD_WIDGET_CONCURRENCY
+        self._cache = cache
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    async def _get_cache(self):
+        if self._cache is None:
+            from synapse.core.cache import get_cache_manager
+
+            self._cache = await get_cache_manager()
+        return self._cache
+
+    @staticmethod
+    def widget_config(
+        widget: Dict[str, Any],
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        tenant_id: Optional[Any] = None,
+    ) -> Dict[str, Any]:
+        config = dict(widget.get("config") or {})
+        # Escopo do tenant de quem consulta, nunca o salvo no widget
+        config["tenant_id"] = tenant_id
+        if start_date or end_date:
+            config.update({"start_date": start_date, "end_date": end_date})
+        return config
+
+    async def evaluate_widget(
+        self,
+        widget: Dict[str, Any],
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        tenant_id: Optional[Any] = None,
+    ) -> Dict[str, Any]:
+        """Resultado de um widget: ``{"widget_id", "type", "data" | "error", "cached", "duration_ms"}``"""
+        widget_type = widget.get("type")
+        result: Dict[str, Any] = {"widget_id": widget.get("id"), "type": widget_type, "cached": False}
+        started = time.perf_counter()
+
+        if widget_type not in WIDGET_HANDLERS:
+            result["error"] = f"Tipo de widget não suportado: {widget_type}"
+            return result
+
+        config = self.widget_config(widget, start_date, end_date, tenant_id)
+        key = widget_cache_key(widget_type, config)
+        try:
+            cache = await self._get_cache()
+            data = await cache.get(key)
+            if data is not None:
+                result["cached"] = True
+            else:
+                data = await self._compute_once(key, widget_type, config)
+                await cache.set(key, data, ttl=widget_ttl(config))
+            result["data"] = data
+        except Exception as e:
+            logger.error(f"Erro ao avaliar widget {result['widget_id']} ({widget_type}): {e}")
+            result["error"] = str(e)
+
+        result["duration_ms"] = round((time.perf_counter() - started) * 1000, 2)
+        return result
+
+    async def _compute_once(self, key: str, widget_type: str, config: Dict[str, Any]) -> Any:
+        """Single-flight: requisições simultâneas do mesmo widget compartilham o cálculo"""
+        future = self._inflight.get(key)
+        if future is not None:
+            return await asyncio.shield(future)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            data = await asyncio.to_thread(self.compute, widget_type, config)
+            future.set_result(data)
+            return data
+        except Exception as e:
+            future.set_exception(e)
+            # Evita "exception was never retrieved" quando ninguém mais aguarda
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+    async def iter_widgets(
+        self,
+        widgets: List[Dict[str, Any]],
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        tenant_id: Optional[Any] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Gera os resultados (no escopo de ``tenant_id``) na ordem em que ficam prontos"""
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def run(widget):
+            async with semaphore:
+                return await self.evaluate_widget(widget, start_date, end_date, tenant_id)
+
+        tasks = [asyncio.create_task(run(widget)) for widget in widgets]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def evaluate(
+        self,
+        widgets: List[Dict[str, Any]],
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        tenant_id: Optional[Any] = None,
+    ) -> Dict[Any, Dict[str, Any]]:
+        """Avalia todos os widgets e retorna os resultados indexados por widget_id"""
+        results = {}
+        async for result in self.iter_widgets(widgets, start_date, end_date, tenant_id):
+            results[result["widget_id"]] = result
+        return results
+
+
+def format_sse(event: str, data: Any) -> str:
+    """Serializa uma mensagem Server-Sent Events"""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+dashboard_evaluator = DashboardEvaluator()
@@ -0,0 +1,158 @@
+"""
+Leitura de execuções sem as colunas pesadas
+Listagens carregam só o resumo das execuções e dos nós: outputs, inputs,
+contexto, logs e debug ficam adiados (``defer``) e não são carregados nem
+por acesso preguiçoso ao montar a resposta. Outputs externalizados (ver
+``synapse.core.executors.outputs``) continuam como referência até que um
+leitor peça o conteúdo, e são removidos quando a execução é excluída.
+"""
+
+import logging
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+from sqlalchemy import event, inspect, select
+from sqlalchemy.orm import Session, defer
+
+from synapse.core.executors.outputs import (
+    ExecutionOutputStore,
+    get_output_store,
+    is_output_reference,
+)
+from synapse.models.node_execution import NodeExecution
+from synapse.models.workflow_execution import WorkflowExecution
+
+logger = logging.getLogger(__name__)
+
+# Colunas JSON/texto que crescem com o conteúdo da execução
+EXECUTION_HEAVY_COLUMNS = (
+    "input_data",
+    "output_data",
+    "context_data",
+    "variables",
+    "execution_log",
+    "error_details",
+    "debug_info",
+)
+NODE_HEAVY_COLUMNS = (
+    "input_data",
+    "output_data",
+    "config_data",
+    "execution_log",
+    "error_details",
+    "debug_info",
+)
+
+# Propriedades dos modelos exigidas pelos schemas de resposta (calculadas só
+# com colunas do resumo)
+SUMMARY_PROPERTIES = {NodeExecution: ("status",)}
+
+# Diretórios de outputs mais novos que isso podem ser de uma execução que
+# ainda não foi gravada
+ORPHAN_GRACE_SECONDS = 3600
+
+
+class ExecutionOutputService:
+    """Resumo das execuções para listagens e outputs completos sob demanda"""
+
+    def __init__(self, store: Optional[ExecutionOutputStore] = None):
+        self._store = store
+
+    @property
+    def store(self) -> ExecutionOutputStore:
+        if self._store is None:
+            self._store = get_output_store()
+        return self._store
+
+    @staticmethod
+    def summary_options(model: Any, columns: Optional[Sequence[str]] = None) -> List[Any]:
+        """Opções de query que adiam as colunas pesadas do modelo"""
+        if columns is None:
+            columns = NODE_HEAVY_COLUMNS if model is NodeExecution else EXECUTION_HEAVY_COLUMNS
+        return [defer(getattr(model, column)) for column in columns]
+
+    @staticmethod
+    def loaded_fields(obj: Any) -> Dict[str, Any]:
+        """
+        Colunas já carregadas do objeto (e as propriedades de
+        ``SUMMARY_PROPERTIES``), para validar o schema de resposta sem
+        disparar o carregamento das adiadas (que ficam com o valor padrão)
+        """
+        state = inspect(obj)
+        unloaded = state.unloaded
+        fields = {
+            attr.key: getattr(obj, attr.key)
+            for attr in state.mapper.column_attrs
+            if attr.key not in unloaded
+        }
+        fields.update({name: getattr(obj, name) for name in SUMMARY_PROPERTIES.get(type(obj), ())})
+        return fields
+
+    def resolve_output_data(
+        self, output_data: Optional[Dict[str, Any]], execution_id: str
+    ) -> Optional[Dict[str, Any]]:
+        """``output_data`` de um nó da execução com o output externalizado carregado"""
+        return self.store.resolve_output_data(output_data, execution_id)
+
+    def node_output(self, node_execution: NodeExecution, execution_id: str) -> Dict[str, Any]:
+        """Output completo de um nó da execução com o tamanho e onde estava guardado"""
+        output_data = node_execution.output_data or {}
+        output = output_data.get("output")
+        reference = output if is_output_reference(output) else None
+        return {
+            "node_key": node_execution.node_key,
+            "storage": "external" if reference else "inline",
+            "bytes": reference["bytes"] if reference else None,
+            "stored_bytes": reference["stored_bytes"] if reference else None,
+            "output": self.store.load(reference, execution_id) if reference else output,
+        }
+
+    def purge(self, db: Session, grace_seconds: float = ORPHAN_GRACE_SECONDS) -> int:
+        """
+        Remove os outputs de execuções que não existem mais (excluídas em
+        massa ou em cascata, sem passar pela sessão). Retorna quantas foram
+        removidas
+        """
+        stored = self.store.stored_executions(time.time() - grace_seconds)
+        names = list(stored)
+        existing = set()
+        for start in range(0, len(names), 1000):
+            chunk = names[start : start + 1000]
+            existing.update(
+                db.execute(
+                    select(WorkflowExecution.execution_id).where(WorkflowExecution.execution_id.in_(chunk))
+                ).scalars()
+            )
+        orphans = [name for name in names if name not in existing]
+        for name in orphans:
+            self.store.delete_execution(name)
+        return len(orphans)
+
+
+execution_output_service = ExecutionOutputService()
+
+_DELETED_EXECUTIONS = "deleted_execution_outputs"
+
+
+def _collect_deleted_executions(session: Session, flush_context: Any = None) -> None:
+    """Guarda as execuções excluídas no flush; os arquivos só saem no commit"""
+    deleted = [
+        str(instance.execution_id)
+        for instance in session.deleted
+        if isinstance(instance, WorkflowExecution) and instance.execution_id
+    ]
+    if deleted:
+        session.info.setdefault(_DELETED_EXECUTIONS, set()).update(deleted)
+
+
+def _delete_outputs_after_commit(session: Session) -> None:
+    for execution_id in session.info.pop(_DELETED_EXECUTIONS, ()):
+        try:
+            execution_output_service.store.delete_execution(execution_id)
+        except Exception as e:
+            logger.warning(f"Erro ao remover outputs da execução {execution_id}: {e}")
+
+
+event.listen(Session, "after_flush", _collect_deleted_executions)
+event.listen(Session, "after_commit", _delete_outputs_after_commit)
+event.listen(Session, "after_soft_rollback", lambda session, previous: session.info.pop(_DELETED_EXECUTIONS, None))
@@ -0,0 +1,292 @@
+"""
+Cache de planos de execução compilados
+Planos são identificados por (workflow_id, versão), onde a versão é um hash
+da versão declarada do workflow, da sua definição e de um agregado barato
+(contagem e último ``updated_at``) dos nós e conexões. Ficam em um LRU por
+processo e no Redis (compartilhado entre workers); alterações em workflows,
+nós ou conexões feitas por qualquer sessão invalidam o LRU local e, como
+mudam a versão, tornam as entradas antigas do Redis inalcançáveis (expiram
+pelo TTL).
+"""
+
+import hashlib
+import json
+import logging
+import threading
+from collections import OrderedDict
+from itertools import chain
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import event, func, inspect, select
+from sqlalchemy.orm import Session
+
+from synapse.core.config import settings
+from synapse.core.executors.plan import ExecutionPlan, NodeSpec, compile_plan
+from synapse.models.node import Node
+from synapse.models.workflow import Workflow
+from synapse.models.workflow_connection import WorkflowConnection
+from synapse.models.workflow_node import WorkflowNode
+
+logger = logging.getLogger(__name__)
+
+PLAN_CACHE_PREFIX = "workflow_plan"
+
+# Chaves aceitas nas conexões de ``definition["connections"]``
+_EDGE_SOURCE_KEYS = ("source", "source_node", "from")
+_EDGE_TARGET_KEYS = ("target", "target_node", "to")
+
+
+def _first(item: Dict[str, Any], keys: Iterable[str]) -> Any:
+    for key in keys:
+        if item.get(key) is not None:
+            return item[key]
+    return None
+
+
+def _digest(value: str, size: int = 12) -> str:
+    return hashlib.blake2b(value.encode(), digest_size=size).hexdigest()
+
+
+def specs_from_definition(definition: Any) -> Tuple[List[NodeSpec], List[Tuple[str, str]]]:
+    """Nós e arestas a partir de ``workflow.definition`` ({"nodes": [...], "connections": [...]})"""
+    definition = definition if isinstance(definition, dict) else {}
+    specs = []
+    for index, item in enumerate(definition.get("nodes") or []):
+        if not isinstance(item, dict):
+            continue
+        data = item.get("data") if isinstance(item.get("data"), dict) else {}
+        specs.append(
+            NodeSpec(
+                key=str(item.get("id") or item.get("key") or f"node_{index}"),
+                node_type=str(item.get("type") or data.get("type") or "").lower(),
+                config=item.get("config") or data.get("config") or {},
+                name=item.get("name") or data.get("label"),
+                catalog_id=str(item["node_id"]) if item.get("node_id") else None,
+            )
+        )
+    edges = []
+    for item in definition.get("connections") or []:
+        if isinstance(item, dict):
+            source, target = _first(item, _EDGE_SOURCE_KEYS), _first(item, _EDGE_TARGET_KEYS)
+            if source is not None and target is not None:
+                edges.append((str(source), str(target)))
+    return specs, edges
+
+
+def _spec_from_workflow_node(workflow_node: WorkflowNode, node: Optional[Node]) -> NodeSpec:
+    """Instância do nó no workflow; a configuração da instância sobrescreve a do catálogo"""
+    catalog = node.definition if node is not None and isinstance(node.definition, dict) else {}
+    config = dict(catalog.get("config") or {})
+    config.update(workflow_node.configuration or {})
+    node_type = config.get("type") or catalog.get("type") or (node.category if node is not None else "")
+    return NodeSpec(
+        key=str(workflow_node.id),
+        node_type=str(node_type or "").lower(),
+        config=config,
+        name=workflow_node.instance_name or (node.name if node is not None else None),
+        catalog_id=str(workflow_node.node_id) if workflow_node.node_id else None,
+    )
+
+
+class ExecutionPlanCache:
+    """
+    Compila e cacheia planos de execução. ``shared_cache`` é um objeto com
+    ``get``/``set`` assíncronos (``CacheManager``); ``None`` usa o cache global
+    e ``False`` desativa o nível compartilhado.
+    """
+
+    def __init__(
+        self,
+        registry: Any = None,
+        max_entries: Optional[int] = None,
+        ttl: Optional[int] = None,
+        shared_cache: Any = None,
+    ):
+        self._registry = registry
+        self.max_entries = max_entries or settings.EXECUTION_PLAN_CACHE_SIZE
+        self.ttl = ttl or settings.EXECUTION_PLAN_CACHE_TTL
+        self._shared = shared_cache
+        self._plans: "OrderedDict[Tuple[str, str], ExecutionPlan]" = OrderedDict()
+        self._workflows_by_catalog_node: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+        self.stats = {"memory_hits": 0, "shared_hits": 0, "compiles": 0, "invalidations": 0}
+
+    @property
+    def registry(self):
+        if self._registry is None:
+            from synapse.core.executors import executor_registry
+
+            self._registry = executor_registry
+        return self._registry
+
+    async def _get_shared(self):
+        if self._shared is None:
+            from synapse.core.cache import get_cache_manager
+
+            self._shared = await get_cache_manager()
+        return self._shared or None
+
+    @staticmethod
+    def shared_key(workflow_id: Any, version: str) -> str:
+        return f"{PLAN_CACHE_PREFIX}:{workflow_id}:{version}"
+
+    # ------------------------------------------------------------------
+    # Versão e origem
+    # ------------------------------------------------------------------
+
+    def plan_version(self, db: Session, workflow: Workflow) -> str:
+        """Versão do plano: duas consultas agregadas (nós e conexões), sem carregar os nós"""
+        nodes = (
+            select(func.count(WorkflowNode.id), func.max(WorkflowNode.updated_at), func.max(Node.updated_at))
+            .select_from(WorkflowNode)
+            .outerjoin(Node, Node.id == WorkflowNode.node_id)
+            .where(WorkflowNode.workflow_id == workflow.id)
+        )
+        connections = select(
+            func.count(WorkflowConnection.id), func.max(WorkflowConnection.updated_at)
+        ).where(WorkflowConnection.workflow_id == workflow.id)
+        node_row = db.execute(nodes).one()
+        connection_row = db.execute(connections).one()
+
+        definition = json.dumps(workflow.definition or {}, sort_keys=True, default=str)
+        parts = [workflow.version or "", _digest(definition), *node_row, *connection_row]
+        return _digest("|".join(str(part) for part in parts))
+
+    def load_source(
+        self, db: Session, workflow: Workflow
+    ) -> Tuple[List[NodeSpec], List[Tuple[str, str]]]:
+        """
+        Nós e arestas do workflow: instâncias em workflow_nodes/connections
+        quando existem, senão ``workflow.definition``
+        """
+        rows = (
+            db.query(WorkflowNode, Node)
+            .outerjoin(Node, Node.id == WorkflowNode.node_id)
+            .filter(WorkflowNode.workflow_id == workflow.id)
+            .order_by(WorkflowNode.position_x, WorkflowNode.position_y, WorkflowNode.created_at)
+            .all()
+        )
+        if not rows:
+            return specs_from_definition(workflow.definition)
+
+        edges = (
+            db.query(WorkflowConnection.source_node_id, WorkflowConnection.target_node_id)
+            .filter(WorkflowConnection.workflow_id == workflow.id)
+            .all()
+        )
+        specs = [_spec_from_workflow_node(workflow_node, node) for workflow_node, node in rows]
+        return specs, [(str(source), str(target)) for source, target in edges]
+
+    def compile(self, db: Session, workflow: Workflow, version: Optional[str] = None) -> ExecutionPlan:
+        version = version or self.plan_version(db, workflow)
+        specs, edges = self.load_source(db, workflow)
+        self.stats["compiles"] += 1
+        return compile_plan(workflow.id, version, specs, edges, registry=self.registry)
+
+    # ------------------------------------------------------------------
+    # Cache
+    # ------------------------------------------------------------------
+
+    def get_cached(self, workflow_id: Any, version: Optional[str]) -> Optional[ExecutionPlan]:
+        if not version:
+            return None
+        key = (str(workflow_id), version)
+        with self._lock:
+            plan = self._plans.get(key)
+            if plan is not None:
+                self._plans.move_to_end(key)
+                self.stats["memory_hits"] += 1
+            return plan
+
+    def store(self, plan: ExecutionPlan) -> None:
+        with self._lock:
+            self._plans[(plan.workflow_id, plan.version)] = plan
+            self._plans.move_to_end((plan.workflow_id, plan.version))
+            for catalog_id in plan.catalog_ids:
+                self._workflows_by_catalog_node.setdefault(catalog_id, set()).add(plan.workflow_id)
+            while len(self._plans) > self.max_entries:
+                self._plans.popitem(last=False)
+
+    async def get_plan(self, db: Session, workflow: Workflow) -> ExecutionPlan:
+        """Plano da versão atual do workflow (memória → Redis → compilação)"""
+        version = self.plan_version(db, workflow)
+        plan = self.get_cached(workflow.id, version)
+        if plan is not None:
+            return plan
+
+        key = self.shared_key(workflow.id, version)
+        shared = None
+        try:
+            shared = await self._get_shared()
+            if shared is not None:
+                plan = ExecutionPlan.from_dict(await shared.get(key))
+        except Exception as e:
+            logger.warning(f"Erro ao ler plano de execução do cache: {e}")
+        if plan is not None:
+            self.stats["shared_hits"] += 1
+        else:
+            plan = self.compile(db, workflow, version)
+            if shared is not None:
+                try:
+                    await shared.set(key, plan.to_dict(), ttl=self.ttl)
+                except Exception as e:
+                    logger.warning(f"Erro ao gravar plano de execução no cache: {e}")
+
+        self.store(plan)
+        return plan
+
+    def compile_nodes(
+        self,
+        workflow_id: Any,
+        version: Optional[str],
+        specs: List[NodeSpec],
+        edges: List[Tuple[str, str]],
+    ) -> ExecutionPlan:
+        """Compila um plano a partir de nós já conhecidos (ex.: os materializados de uma execução)"""
+        self.stats["compiles"] += 1
+        plan = compile_plan(workflow_id, version or "", specs, edges, registry=self.registry)
+        if version:
+            self.store(plan)
+        return plan
+
+    def invalidate(self, workflow_id: Any = None) -> int:
+        """Remove do LRU local os planos de um workflow (ou todos)"""
+        with self._lock:
+            if workflow_id is None:
+                keys = list(self._plans)
+            else:
+                keys = [key for key in self._plans if key[0] == str(workflow_id)]
+            for key in keys:
+                del self._plans[key]
+            if keys:
+                self.stats["invalidations"] += 1
+            return len(keys)
+
+    def invalidate_catalog_node(self, node_id: Any) -> int:
+        with self._lock:
+            workflow_ids = self._workflows_by_catalog_node.pop(str(node_id), set())
+        return sum(self.invalidate(workflow_id) for workflow_id in workflow_ids)
+
+
+def _workflow_changed(instance: Workflow) -> bool:
+    state = inspect(instance)
+    return state.attrs.definition.history.has_changes() or state.attrs.version.history.has_changes()
+
+
+def invalidate_changed_plans(session: Session, flush_context: Any = None) -> None:
+    """after_flush: invalida planos de workflows cujos nós, conexões ou definição mudaram"""
+    for instance in chain(session.new, session.dirty, session.deleted):
+        if isinstance(instance, Workflow):
+            if instance.id is not None and (instance not in session.dirty or _workflow_changed(instance)):
+                execution_plan_cache.invalidate(instance.id)
+        elif isinstance(instance, (WorkflowNode, WorkflowConnection)):
+            if instance.workflow_id is not None:
+                execution_plan_cache.invalidate(instance.workflow_id)
+        elif isinstance(instance, Node) and instance.id is not None:
+            execution_plan_cache.invalidate_catalog_node(instance.id)
+
+
+# Cache global de planos
+execution_plan_cache = ExecutionPlanCache()
+
+event.listen(Session, "after_flush", invalidate_changed_plans)
@@ -5,30 +5,30 @@ Engine completa de execução em tempo real com todas as funcionalidades
 """
 
 import asyncio
-import json
 import logging
-import re
 import time
 import traceback
 import uuid
-from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional, Union, Tuple
 import threading
 
-from sqlalchemy import asc, desc, func, or_, text
+from sqlalchemy import asc, desc, or_
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
 
 from synapse.models.workflow_execution import (
     WorkflowExecution,
-    NodeExecution,
-    ExecutionQueue,
-    ExecutionMetrics,
     ExecutionStatus,
-    NodeExecutionStatus,
+)
+from synapse.models.node_execution import NodeExecution
+from synapse.models.workflow_execution_queue import (
+    WorkflowExecutionQueue as ExecutionQueue,
+)
+from synapse.models.workflow_execution_metric import (
+    WorkflowExecutionMetric as ExecutionMetrics,
 )
 from synapse.models.workflow import Workflow
-from synapse.models.node import Node
 from synapse.schemas.workflow_execution import (
     ExecutionCreate,
     ExecutionResponse,
@@ -37,8 +37,32 @@ from synapse.schemas.workflow_execution import (
     ExecutionFilter,
 )
 from synapse.database import get_db
+from synapse.core.config import settings
+from synapse.core.executors import (
+    ExecutionContext,
+    ExecutorRegistry,
+    executor_registry,
+    get_worker_pool,
+)
+from synapse.core.executors.outputs import ExecutionOutputStore, get_output_store
+from synapse.core.executors.plan import ExecutionPlan, NodeSpec, PlanNode
 from synapse.core.websockets.manager import ConnectionManager
+from synapse.services.execution_plan_service import (
+    ExecutionPlanCache,
+    execution_plan_cache,
+)
+from synapse.services.execution_output_service import ExecutionOutputService
+from synapse.services.execution_state_service import (
+    LiveStateMirror,
+    NodeStateBuffer,
+    insert_node_executions,
+    node_execution_rows,
+)
 from synapse.services.variable_service import VariableService
+from synapse.services.execution_stats_service import (
+    ExecutionStatsService,
+    RollupContribution,
+)
 from synapse.exceptions import DatabaseError
 
 
@@ -47,32 +71,57 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+class NodeRunError(RuntimeError):
+    """Falha do executor de um nó depois de todas as tentativas"""
+
+    def __init__(self, message: str, attempts: int):
+        super().__init__(message)
+        self.attempts = attempts
+
+
 class ExecutionEngine:
     """
     Engine principal de execução de workflows
     Gerencia todo o ciclo de vida de execução
     """
 
-    def __init__(self, websocket_manager: ConnectionManager | None = None):
+    def __init__(
+        self,
+        websocket_manager: ConnectionManager | None = None,
+        plan_cache: ExecutionPlanCache | None = None,
+        registry: ExecutorRegistry | None = None,
+        output_store: ExecutionOutputStore | None = None,
+    ):
         self.websocket_manager = websocket_manager
         self.variable_service = VariableService()
+        self.stats_service = ExecutionStatsService()
+        self.plan_cache = plan_cache or execution_plan_cache
+        # Executores por tipo de nó (substituível, ex.: executores simulados
+        # do harness de benchmark)
+        self.registry = registry or executor_registry
+        # Outputs grandes dos nós vão para o armazenamento (padrão: StorageManager)
+        self._output_store = output_store
+        self.live_state_mirror = (
+            LiveStateMirror()
+            if settings.EXECUTION_NODE_STATE_STORE == "redis"
+            else None
+        )
+        self.node_states: dict[str, NodeStateBuffer] = {}
 
-        # Disable ThreadPoolExecutor for development to avoid multiprocessing issues
-        # TODO: Re-enable with proper configuration for production
-        # try:
-        #     if multiprocessing.current_process().name == 'MainProcess':
-        #         multiprocessing.set_start_method('spawn', force=True)
-        # except RuntimeError:
-        #     # Method already set, continue
-        #     pass
-        #
-        # self.executor = ThreadPoolExecutor(max_workers=5)  # Reduced workers for stability
-        self.executor = None  # Disabled for development
+        # Nós CPU-bound rodam no pool de processos global (iniciado no
+        # lifespan); nós IO-bound continuam no event loop
+        self.worker_pool = get_worker_pool()
         self.running_executions: dict[str, asyncio.Task] = {}
         self.execution_lock = threading.Lock()
         self.is_running = False
         self.queue_processor_task = None
 
+    @property
+    def output_store(self) -> ExecutionOutputStore:
+        if self._output_store is None:
+            self._output_store = get_output_store()
+        return self._output_store
+
     async def start(self) -> None:
         """Inicia a engine de execução"""
         if self.is_running:
@@ -142,12 +191,10 @@ class ExecutionEngine:
             else:
                 user_variables = execution_data.variables
 
-            # Valida o workflow antes da execução
-            validation = await self._validate_workflow(
-                db,
-                workflow,
-                user_variables,
-            )
+            # Plano compilado da versão atual (cacheado) e validação
+            # das variáveis desta execução
+            plan = await self.plan_cache.get_plan(db, workflow)
+            validation = plan.validate(user_variables)
             if not validation["is_valid"]:
                 raise ValueError(
                     f"Workflow inválido: {', '.join(validation['errors'])}",
@@ -179,17 +226,20 @@ class ExecutionEngine:
                 notify_on_failure=execution_data.notify_on_failure,
                 tags=execution_data.tags,
                 metadata=execution_data.metadata,
+                debug_info={"plan_version": plan.version},
             )
 
+            # Execução, nós e item da fila em uma única transação
             db.add(execution)
-            db.commit()
-            db.refresh(execution)
+            db.flush()
 
             # Cria execuções de nós
-            await self._create_node_executions(db, execution, workflow)
+            await self._create_node_executions(db, execution, plan)
 
             # Adiciona à fila de execução
             await self._add_to_queue(db, execution)
+            db.commit()
+            db.refresh(execution)
 
             # Notifica via WebSocket
             if self.websocket_manager:
@@ -299,26 +349,27 @@ class ExecutionEngine:
                     del self.running_executions[execution_id]
 
             # Atualiza status no banco
+            previous_stats = RollupContribution.from_execution(execution)
             execution.status = ExecutionStatus.CANCELLED  # type: ignore
             execution.completed_at = datetime.utcnow()  # type: ignore
             execution.error_message = (  # type: ignore
                 reason or "Execução cancelada pelo usuário"
             )
 
-            # Cancela nós em execução
+            # Cancela nós pendentes ou em execução (o status do nó é
+            # derivado de started_at/completed_at/error_message)
             db.query(NodeExecution).filter(
                 NodeExecution.workflow_execution_id == execution.id,
-                NodeExecution.status.in_(
-                    [NodeExecutionStatus.PENDING, NodeExecutionStatus.RUNNING],
-                ),
+                NodeExecution.completed_at.is_(None),
             ).update(
                 {
-                    "status": NodeExecutionStatus.SKIPPED,
                     "completed_at": datetime.utcnow(),
                     "error_message": "Cancelado junto com o workflow",
                 },
+                synchronize_session=False,
             )
 
+            self.stats_service.record_transition(db, execution, previous_stats)
             db.commit()
 
             # Notifica via WebSocket
@@ -387,7 +438,8 @@ class ExecutionEngine:
                     "tentativas" % execution_id,
                 )
 
-            # Reset da execução
+            # Reset da execução (a tentativa anterior sai do rollup)
+            previous_stats = RollupContribution.from_execution(execution)
             execution.status = ExecutionStatus.PENDING  # type: ignore
             execution.retry_count += 1  # type: ignore
             execution.started_at = None  # type: ignore
@@ -403,20 +455,23 @@ class ExecutionEngine:
                 NodeExecution.workflow_execution_id == execution.id,
             ).update(
                 {
-                    "status": NodeExecutionStatus.PENDING,
                     "started_at": None,
                     "completed_at": None,
+                    "duration_ms": None,
                     "error_message": None,
                     "error_details": None,
                     "output_data": None,
                     "retry_count": 0,
                 },
+                synchronize_session=False,
             )
+            self.output_store.delete_execution(str(execution.execution_id))
 
-            db.commit()
+            self.stats_service.record_transition(db, execution, previous_stats)
 
-            # Adiciona novamente à fila
+            # Adiciona novamente à fila (mesma transação do reset)
             await self._add_to_queue(db, execution)
+            db.commit()
 
             logger.info(
                 "🔄 Execução %s reiniciada (tentativa %s)",
@@ -653,13 +708,20 @@ class ExecutionEngine:
         execution: WorkflowExecution,
     ) -> None:
         """
-        Executa um workflow completo
+        Executa um workflow completo. Transições dos nós, métricas e progresso
+        são gravados em lote a cada tick de flush (``NodeStateBuffer``); se
+        qualquer erro interromper a execução, o que estiver no buffer é gravado
+        junto com o status ``failed``
         """
+        execution_key = str(execution.execution_id)
+        state = NodeStateBuffer(execution, mirror=self.live_state_mirror)
+        self.node_states[execution_key] = state
+        finalized = False
         try:
             # Atualiza status para executando
             execution.status = ExecutionStatus.RUNNING  # type: ignore
             execution.started_at = datetime.utcnow()  # type: ignore
-            db.commit()
+            self._commit_node_states(db, execution, state)
 
             # Notifica início
             if self.websocket_manager:
@@ -672,13 +734,33 @@ class ExecutionEngine:
                     str(execution.user_id),  # type: ignore
                 )
 
-            # Carrega nós para execução
+            # Carrega só as colunas usadas na execução; o estado dos nós é
+            # escrito pelo buffer, não pelo ORM
             node_executions = (
-                db.query(NodeExecution)
+                db.query(
+                    NodeExecution.id,
+                    NodeExecution.node_id,
+                    NodeExecution.node_key,
+                    NodeExecution.node_type,
+                    NodeExecution.node_name,
+                    NodeExecution.config_data,
+                    NodeExecution.dependencies,
+                )
                 .filter(NodeExecution.workflow_execution_id == execution.id)
                 .order_by(NodeExecution.execution_order)
                 .all()
             )
+            plan = self._plan_for_execution(execution, node_executions)
+            context = ExecutionContext(
+                execution_id=str(execution.execution_id),
+                workflow_id=execution.workflow_id,
+                user_id=execution.user_id,
+                variables=execution.variables,
+                input_data=execution.input_data,
+                context_data=execution.context_data,
+                output_store=self.output_store,
+                output_cache_bytes=settings.EXECUTION_OUTPUT_CACHE_BYTES,
+            )
 
             # Executa nós em ordem
             for node_execution in node_executions:
@@ -694,10 +776,14 @@ class ExecutionEngine:
                     break
 
                 # Executa o nó
+                plan_node = plan.node(node_execution.node_key)
                 success = await self._execute_node(
                     db,
                     execution,
                     node_execution,
+                    plan_node,
+                    context,
+                    state,
                 )
 
                 if success:
@@ -706,7 +792,7 @@ class ExecutionEngine:
                     execution.failed_nodes += 1  # type: ignore
 
                     # Se falhou e não deve continuar, para a execução
-                    if not node_execution.node.continue_on_error:
+                    if not plan_node.continue_on_error:
                         execution.status = ExecutionStatus.FAILED  # type: ignore
                         execution.error_message = (  # type: ignore
                             "Nó %s falhou e interrompeu a execução"
@@ -714,9 +800,11 @@ class ExecutionEngine:
                         )
                         break
 
-                # Atualiza progresso
+                # Atualiza progresso (gravado junto com o próximo lote)
                 execution.update_progress()
-                db.commit()
+                if state.due():
+                    self._commit_node_states(db, execution, state)
+                await state.publish(progress=execution.progress_percentage)
 
                 # Notifica progresso
                 if self.websocket_manager:
@@ -739,12 +827,12 @@ class ExecutionEngine:
             execution.actual_duration = (  # type: ignore
                 execution.duration_seconds  # type: ignore
             )
-            db.commit()
-
-            # Remove da lista de execuções ativas
-            with self.execution_lock:
-                if str(execution.execution_id) in self.running_executions:
-                    del self.running_executions[str(execution.execution_id)]
+            execution.debug_info = {  # type: ignore
+                **(execution.debug_info or {}),
+                "outputs": dict(context.node_outputs.stats),
+            }
+            self._commit_node_states(db, execution, state, final=True)
+            finalized = True
 
             # Notifica conclusão
             if self.websocket_manager:
@@ -760,74 +848,205 @@ class ExecutionEngine:
                 )
 
             logger.info(
-                "✅ Execução %s finalizada com status %s",
+                "✅ Execução %s finalizada com status %s (%s transações)",
                 execution.execution_id,
                 execution.status.value,
+                state.stats["transactions"],
             )
 
-        except (TimeoutError, DatabaseError) as e:
+        except Exception as e:
             logger.error(
                 "❌ Erro na execução %s: %s",
                 execution.execution_id,
                 str(e),
             )
+            if not finalized:
+                self._fail_execution(db, execution, state, e)
 
-            # Marca como falha
+        finally:
+            # Remove da lista de execuções ativas
+            with self.execution_lock:
+                self.running_executions.pop(execution_key, None)
+            self.node_states.pop(execution_key, None)
+            await state.close()
+
+    def _fail_execution(
+        self,
+        db: Session,
+        execution: WorkflowExecution,
+        state: NodeStateBuffer,
+        error: Exception,
+    ) -> None:
+        """
+        Commit final de uma execução interrompida por erro, com o que estiver
+        pendente no buffer. Um erro do banco invalida a transação, que é
+        desfeita antes (o buffer só é esvaziado depois de gravado)
+        """
+        traceback_text = traceback.format_exc()
+        if isinstance(error, (SQLAlchemyError, DatabaseError)):
+            db.rollback()
+        try:
             execution.status = ExecutionStatus.FAILED  # type: ignore
             execution.completed_at = datetime.utcnow()  # type: ignore
-            execution.error_message = str(e)  # type: ignore
+            execution.error_message = str(error)  # type: ignore
             execution.error_details = {  # type: ignore
-                "traceback": traceback.format_exc(),
+                "traceback": traceback_text,
             }
-            db.commit()
+            self._commit_node_states(db, execution, state, final=True)
+        except Exception as e:
+            logger.error(
+                "❌ Falha ao gravar o estado final da execução %s: %s",
+                state.execution_id,
+                str(e),
+            )
+            db.rollback()
 
-            # Remove da lista de execuções ativas
-            with self.execution_lock:
-                if str(execution.execution_id) in self.running_executions:
-                    del self.running_executions[str(execution.execution_id)]
+    def _commit_node_states(
+        self,
+        db: Session,
+        execution: WorkflowExecution,
+        state: NodeStateBuffer,
+        final: bool = False,
+    ) -> None:
+        """
+        Uma transação: lote pendente de transições e métricas dos nós mais as
+        alterações da execução (progresso, status). No commit final também
+        registra o rollup e as contagens de escrita em ``debug_info``
+        """
+        state.flush(db)
+        state.stats["transactions"] += 1
+        if final:
+            execution.debug_info = {  # type: ignore
+                **(execution.debug_info or {}),
+                "node_state": {"mode": state.mode.value, **state.stats},
+            }
+            self.stats_service.record_transition(db, execution)
+        db.commit()
+
+    async def get_live_node_states(
+        self,
+        execution_id: str,
+    ) -> dict[str, Any] | None:
+        """
+        Nós em andamento de uma execução, inclusive os ainda não gravados no
+        banco (buffer deste processo ou espelho no Redis)
+        """
+        state = self.node_states.get(execution_id)
+        if state is not None:
+            return state.snapshot()
+        if self.live_state_mirror is not None:
+            return await self.live_state_mirror.read(execution_id)
+        return None
+
+    def _plan_for_execution(
+        self,
+        execution: WorkflowExecution,
+        node_executions: list[Any],
+    ) -> ExecutionPlan:
+        """
+        Plano da versão com que a execução foi criada; se não estiver mais em
+        cache, é recompilado a partir dos nós materializados da execução
+        """
+        version = (execution.debug_info or {}).get("plan_version")
+        plan = self.plan_cache.get_cached(execution.workflow_id, version)
+        if plan is not None:
+            return plan
+
+        specs = [
+            NodeSpec(
+                key=ne.node_key,
+                node_type=ne.node_type,
+                config=ne.config_data or {},
+                name=ne.node_name,
+                catalog_id=str(ne.node_id) if ne.node_id else None,
+            )
+            for ne in node_executions
+        ]
+        edges = [
+            (source, ne.node_key)
+            for ne in node_executions
+            for source in ne.dependencies or []
+        ]
+        return self.plan_cache.compile_nodes(
+            execution.workflow_id,
+            version,
+            specs,
+            edges,
+        )
 
     async def _execute_node(
         self,
         db: Session,
         execution: WorkflowExecution,
-        node_execution: NodeExecution,
+        node_execution: Any,
+        plan_node: PlanNode,
+        context: ExecutionContext,
+        state: NodeStateBuffer,
     ) -> bool:
         """
-        Executa um nó específico
+        Executa um nó do plano: com o executor registrado para o tipo
+        (configuração já parseada e validada na compilação) ou simulado.
+        O estado vai para o buffer; se o nó passar de
+        ``state.watchdog_seconds`` rodando, o início é gravado na hora
         """
+        started_at = None
+        attempts = 1
         try:
-            # Atualiza status para executando
-            node_execution.status = NodeExecutionStatus.RUNNING  # type: ignore
-            node_execution.started_at = datetime.utcnow()  # type: ignore
-            db.commit()
+            # Configuração inválida já é conhecida pelo plano: falha sem executar
+            if plan_node.errors:
+                raise ValueError(
+                    "Configuração inválida: %s" % ", ".join(plan_node.errors),
+                )
+
+            started_at = datetime.utcnow()
+            state.start(node_execution.id, node_execution.node_key, started_at)
+            if state.due():
+                self._commit_node_states(db, execution, state)
 
             start_time = time.time()
 
-            # Simula execução do nó (aqui você implementaria a lógica real)
-            # Por enquanto, vamos simular diferentes tipos de nós
-            await self._simulate_node_execution(node_execution)
+            # Outputs externalizados dos nós de origem são lidos numa thread
+            # antes de executar (o executor os acessa de forma síncrona)
+            await context.node_outputs.preload(plan_node.dependencies)
+            run = asyncio.ensure_future(
+                self._run_node(node_execution, plan_node, context),
+            )
+            try:
+                done, _ = await asyncio.wait({run}, timeout=state.watchdog_seconds)
+                if not done:
+                    # Nó lento: grava o início para que apareça em execução
+                    state.persist_running()
+                    self._commit_node_states(db, execution, state)
+                    await state.publish()
+                output, attempts = await run
+            except asyncio.CancelledError:
+                run.cancel()
+                raise
+            finally:
+                context.node_outputs.release()
 
             # Calcula duração
             duration_ms = int((time.time() - start_time) * 1000)
 
-            # Marca como concluído
-            node_execution.status = (  # type: ignore
-                NodeExecutionStatus.COMPLETED  # type: ignore
+            # Marca como concluído; outputs acima do limite vão para o
+            # armazenamento e a linha (e o contexto) guardam só a referência
+            output = await context.node_outputs.aspill(plan_node.key, output)
+            state.finish(
+                node_execution.id,
+                started_at=started_at,
+                completed_at=datetime.utcnow(),
+                duration_ms=duration_ms,
+                retry_count=attempts - 1,
+                output_data={
+                    "result": "success",
+                    "output": output,
+                    "processed_at": datetime.utcnow().isoformat(),
+                },
             )
-            node_execution.completed_at = datetime.utcnow()  # type: ignore
-            node_execution.duration_ms = duration_ms  # type: ignore
-            node_execution.output_data = {  # type: ignore
-                "result": "success",
-                "processed_at": datetime.utcnow().isoformat(),
-            }
-
-            db.commit()
 
             # Registra métrica
-            await self._record_metric(
-                db,
-                int(execution.id),  # type: ignore
-                int(node_execution.id),  # type: ignore
+            state.metric(
+                node_execution.id,
                 "execution_time",
                 "node_duration_ms",
                 duration_ms,
@@ -835,34 +1054,56 @@ class ExecutionEngine:
 
             return True
 
-        except (TimeoutError, ValueError) as e:
-            logger.error(
-                "❌ Erro na execução do nó %s: %s",
-                node_execution.node_key,
-                str(e),
-            )
-            return False
         except Exception as e:
             logger.error(
-                "❌ Erro inesperado na execução do nó %s: %s",
+                "❌ Erro na execução do nó %s: %s",
                 node_execution.node_key,
                 str(e),
             )
 
             # Marca como falha
-            node_execution.status = NodeExecutionStatus.FAILED  # type: ignore
-            node_execution.completed_at = datetime.utcnow()  # type: ignore
-            node_execution.error_message = str(e)  # type: ignore
-            node_execution.error_details = {  # type: ignore
-                "traceback": traceback.format_exc(),
-            }
-
-            db.commit()
+            if isinstance(e, NodeRunError):
+                attempts = e.attempts
+            state.finish(
+                node_execution.id,
+                started_at=started_at,
+                completed_at=datetime.utcnow(),
+                retry_count=attempts - 1,
+                error_message=str(e),
+                error_details={"traceback": traceback.format_exc()},
+            )
             return False
 
+    async def _run_node(
+        self,
+        node_execution: Any,
+        plan_node: PlanNode,
+        context: ExecutionContext,
+    ) -> Tuple[Any, int]:
+        """Saída do nó e número de tentativas"""
+        executor = self.registry.get_executor(plan_node.node_type)
+        if executor is None:
+            # Tipos sem executor registrado continuam simulados
+            await self._simulate_node_execution(node_execution)
+            return None, 1
+
+        result = await executor.execute_with_retry(
+            plan_node,
+            context,
+            node_execution,
+            max_retries=plan_node.max_retries,
+            retry_delay=plan_node.retry_delay_ms / 1000,
+        )
+        if not result.get("success", False):
+            raise NodeRunError(
+                result.get("error") or "Execução do nó falhou",
+                result.get("attempt", plan_node.max_retries + 1),
+            )
+        return result.get("output"), result.get("attempt", 1)
+
     async def _simulate_node_execution(
         self,
-        node_execution: NodeExecution,
+        node_execution: Any,
     ) -> None:
         """
         Simula execução de diferentes tipos de nós
@@ -885,87 +1126,17 @@ class ExecutionEngine:
             # Execução padrão
             await asyncio.sleep(0.5)
 
-    async def _validate_workflow(
-        self,
-        db: Session,
-        workflow: Workflow,
-        variables: dict[str, Any],
-    ) -> dict[str, Any]:
-        """
-        Valida um workflow antes da execução
-        """
-        errors = []
-        warnings: list[str] = []
-
-        # Carrega nós do workflow
-        nodes = db.query(Node).filter(Node.workflow_id == workflow.id).all()
-
-        if not nodes:
-            errors.append("Workflow não possui nós")
-
-        # Valida variáveis necessárias
-        required_vars = []
-        for node in nodes:
-            if node.config and isinstance(node.config, dict):
-                # Extrai variáveis do config (formato ${VAR_NAME})
-                config_str = json.dumps(node.config)
-                vars_in_config = re.findall(r"\$\{([^}]+)\}", config_str)
-                required_vars.extend(vars_in_config)
-
-        # Remove duplicatas
-        required_vars = list(set(required_vars))
-
-        # Verifica se todas as variáveis necessárias estão disponíveis
-        missing_vars = [var for var in required_vars if var not in variables]
-        if missing_vars:
-            errors.append(
-                "Variáveis necessárias não encontradas: %s" % ", ".join(missing_vars),
-            )
-
-        # Estima duração (baseado no tipo e quantidade de nós)
-        estimated_duration = len(nodes) * 2  # 2 segundos por nó em média
-
-        return {
-            "is_valid": len(errors) == 0,
-            "errors": errors,
-            "warnings": warnings,
-            "total_nodes": len(nodes),
-            "estimated_duration_seconds": estimated_duration,
-            "required_variables": required_vars,
-        }
-
     async def _create_node_executions(
         self,
         db: Session,
         execution: WorkflowExecution,
-        workflow: Workflow,
+        plan: ExecutionPlan,
     ) -> None:
         """
-        Cria execuções para todos os nós do workflow
+        Cria execuções para todos os nós do plano, em ordem topológica, com
+        um único INSERT multi-linha (na transação do chamador)
         """
-        nodes = (
-            db.query(Node)
-            .filter(Node.workflow_id == workflow.id)
-            .order_by(Node.position)
-            .all()
-        )
-
-        for i, node in enumerate(nodes):
-            node_execution = NodeExecution(
-                execution_id=str(uuid.uuid4()),
-                workflow_execution_id=execution.id,
-                node_id=node.id,
-                node_key=node.key or f"node_{i}",
-                node_type=node.type,
-                node_name=node.name,
-                execution_order=i,
-                config_data=node.config,
-                max_retries=3,
-                retry_delay_ms=1000,
-            )
-            db.add(node_execution)
-
-        db.commit()
+        insert_node_executions(db, node_execution_rows(execution, plan))
 
     async def _add_to_queue(
         self,
@@ -973,7 +1144,7 @@ class ExecutionEngine:
         execution: WorkflowExecution,
     ) -> None:
         """
-        Adiciona execução à fila
+        Adiciona execução à fila (o commit fica com o chamador)
         """
         queue_item = ExecutionQueue(
             queue_id=str(uuid.uuid4()),
@@ -984,38 +1155,6 @@ class ExecutionEngine:
             max_retries=execution.max_retries,
         )
         db.add(queue_item)
-        db.commit()
-
-    async def _record_metric(
-        self,
-        db: Session,
-        workflow_execution_id: int,
-        node_execution_id: int | None,
-        metric_type: str,
-        metric_name: str,
-        value: int | float | str | dict[str, Any],
-    ) -> None:
-        """
-        Registra uma métrica de execução
-        """
-        metric = ExecutionMetrics(
-            workflow_execution_id=workflow_execution_id,
-            node_execution_id=node_execution_id,
-            metric_type=metric_type,
-            metric_name=metric_name,
-        )
-
-        if isinstance(value, int):
-            metric.value_numeric = value  # type: ignore
-        elif isinstance(value, float):
-            metric.value_float = str(value)  # type: ignore
-        elif isinstance(value, str):
-            metric.value_text = value  # type: ignore
-        else:
-            metric.value_json = value  # type: ignore
-
-        db.add(metric)
-        db.commit()
 
 
 class ExecutionService:
@@ -1024,8 +1163,12 @@ class ExecutionService:
     Interface de alto nível para a ExecutionEngine
     """
 
-    def __init__(self, websocket_manager: ConnectionManager | None = None):
-        self.engine = ExecutionEngine(websocket_manager)
+    def __init__(
+        self,
+        websocket_manager: ConnectionManager | None = None,
+        engine: ExecutionEngine | None = None,
+    ):
+        self.engine = engine or ExecutionEngine(websocket_manager)
 
     async def initialize(self) -> None:
         """Inicializa o serviço de execução"""
@@ -1050,6 +1193,9 @@ class ExecutionService:
             "running_executions": len(self.engine.running_executions),
             "has_queue_processor": self.engine.queue_processor_task is not None
             and not self.engine.queue_processor_task.done(),
+            "worker_pool": self.engine.worker_pool.get_stats()
+            if self.engine.worker_pool
+            else None,
         }
 
     async def create_and_start_execution(
@@ -1084,11 +1230,12 @@ class ExecutionService:
         filters: ExecutionFilter | None = None,
     ) -> list[ExecutionResponse]:
         """
-        Obtém execuções de um usuário com filtros
+        Obtém execuções de um usuário com filtros (resumo: colunas pesadas
+        como outputs, logs e debug não são carregadas)
         """
         query = db.query(WorkflowExecution).filter(
             WorkflowExecution.user_id == user_id,
-        )
+        ).options(*ExecutionOutputService.summary_options(WorkflowExecution))
 
         if filters:
             if filters.status:
@@ -1141,116 +1288,24 @@ class ExecutionService:
             )
 
         executions = query.all()
-        return [ExecutionResponse.from_orm(e) for e in executions]
+        return [
+            ExecutionResponse.model_validate(ExecutionOutputService.loaded_fields(e))
+            for e in executions
+        ]
 
     async def get_execution_statistics(
         self,
         db: Session,
         user_id: int,
+        trend_days: int = 30,
     ) -> ExecutionStats:
         """
-        Obtém estatísticas de execução de um usuário
+        Obtém estatísticas de execução de um usuário a partir do rollup diário
         """
-        # Contadores básicos
-        total = (
-            db.query(WorkflowExecution)
-            .filter(WorkflowExecution.user_id == user_id)
-            .count()
-        )
-        running = (
-            db.query(WorkflowExecution)
-            .filter(
-                WorkflowExecution.user_id == user_id,
-                WorkflowExecution.status.in_(
-                    [ExecutionStatus.PENDING, ExecutionStatus.RUNNING],
-                ),
-            )
-            .count()
-        )
-        completed = (
-            db.query(WorkflowExecution)
-            .filter(
-                WorkflowExecution.user_id == user_id,
-                WorkflowExecution.status == ExecutionStatus.COMPLETED,
-            )
-            .count()
-        )
-        failed = (
-            db.query(WorkflowExecution)
-            .filter(
-                WorkflowExecution.user_id == user_id,
-                WorkflowExecution.status == ExecutionStatus.FAILED,
-            )
-            .count()
-        )
-        cancelled = (
-            db.query(WorkflowExecution)
-            .filter(
-                WorkflowExecution.user_id == user_id,
-                WorkflowExecution.status == ExecutionStatus.CANCELLED,
-            )
-            .count()
-        )
-
-        # Taxa de sucesso
-        success_rate = (completed / total * 100) if total > 0 else 0
-
-        # Duração média
-        avg_duration = (
-            db.query(func.avg(WorkflowExecution.actual_duration))
-            .filter(
-                WorkflowExecution.user_id == user_id,
-                WorkflowExecution.actual_duration.isnot(None),
-            )
-            .scalar()
-            or 0
-        )
-
-        # Total de nós executados
-        total_nodes = (
-            db.query(func.sum(WorkflowExecution.completed_nodes))
-            .filter(WorkflowExecution.user_id == user_id)
-            .scalar()
-            or 0
-        )
-
-        # Média de nós por execução
-        avg_nodes = (total_nodes / total) if total > 0 else 0
-
-        # Workflows mais usados - implementação simplificada
-        most_used: list[tuple[int, int]] = []
-        try:
-            most_used = db.execute(
-                text(
-                    """
-                        SELECT workflow_id, COUNT(*) as count
-                        FROM workflow_executions
-                        WHERE user_id = :user_id
-                        GROUP BY workflow_id
-                        ORDER BY count DESC
-                        LIMIT 5
-                    """
-                ),
-                {"user_id": user_id},
-            ).fetchall()
-        except (DatabaseError, TypeError):
-            # Em caso de erro, retorna lista vazia
-            most_used = []
-
-        return ExecutionStats(
-            total_executions=total,
-            running_executions=running,
-            completed_executions=completed,
-            failed_executions=failed,
-            cancelled_executions=cancelled,
-            average_duration_seconds=(float(avg_duration) if avg_duration else None),
-            success_rate_percentage=success_rate,
-            total_nodes_executed=total_nodes,
-            average_nodes_per_execution=avg_nodes,
-            most_used_workflows=[
-                {"workflow_id": w[0], "count": w[1]} for w in most_used
-            ],
-            execution_trends={},  # Implementar trends se necessário
+        return self.engine.stats_service.get_statistics(
+            db,
+            user_id,
+            trend_days=trend_days,
         )
 
     # Métodos de conveniência que delegam para a engine
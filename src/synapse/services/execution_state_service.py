@@ -0,0 +1,327 @@
+"""
+Estado dos nós durante a execução de um workflow
+As execuções de nós são materializadas com um único INSERT multi-linha; as
+transições de estado ficam em um buffer por execução e são gravadas em lote
+(``UPDATE ... FROM (VALUES ...)`` no PostgreSQL) a cada tick de flush, junto
+com as métricas. No modo ``final`` o início dos nós fica só em memória (ou
+espelhado no Redis) e apenas o estado final é gravado — exceto para nós que
+passam de ``EXECUTION_FAST_NODE_MS`` rodando, cujo início é persistido para
+que apareçam como em execução.
+
+``node_executions`` não tem coluna de status: ele é derivado de
+``started_at``/``completed_at``/``error_message`` (``NodeExecution.status``).
+"""
+
+import logging
+import time
+import uuid
+from datetime import datetime
+from enum import Enum
+from typing import Any, Callable, Dict, List, Mapping, Optional
+
+from sqlalchemy import Integer, bindparam, cast, column, insert, null, update, values
+from sqlalchemy.orm import Session
+
+from synapse.core.config import settings
+from synapse.core.executors.plan import ExecutionPlan
+from synapse.models.node_execution import NodeExecution
+from synapse.models.workflow_execution_metric import WorkflowExecutionMetric
+
+logger = logging.getLogger(__name__)
+
+LIVE_STATE_PREFIX = "execution_state"
+
+# Colunas gravadas a cada transição (snapshot completo do estado do nó)
+NODE_STATE_COLUMNS = (
+    "started_at",
+    "completed_at",
+    "duration_ms",
+    "output_data",
+    "error_message",
+    "error_details",
+    "retry_count",
+    "updated_at",
+)
+
+
+class NodeStateMode(str, Enum):
+    """Quando as transições de estado dos nós são gravadas"""
+
+    TICK = "tick"  # início e fim dos nós a cada tick de flush
+    FINAL = "final"  # só o estado final (e o início de nós lentos)
+
+
+def node_execution_rows(execution: Any, plan: ExecutionPlan) -> List[Dict[str, Any]]:
+    """
+    Linhas de ``node_executions`` para todos os nós do plano (mesmas chaves em
+    todas). ``node_id`` é obrigatório na tabela: nós sem nó do catálogo (itens
+    de ``workflow.definition`` sem ``node_id``) são rejeitados
+    """
+    missing = [plan_node.key for plan_node in plan.nodes if not plan_node.catalog_id]
+    if missing:
+        raise ValueError(
+            "Nós sem nó do catálogo (node_id): %s" % ", ".join(missing),
+        )
+    return [
+        {
+            "execution_id": str(uuid.uuid4()),
+            "workflow_execution_id": execution.id,
+            "node_id": uuid.UUID(plan_node.catalog_id),
+            "node_key": plan_node.key,
+            "node_type": plan_node.node_type,
+            "node_name": plan_node.name,
+            "execution_order": plan_node.order,
+            "config_data": plan_node.config,
+            "dependencies": list(plan_node.dependencies),
+            "dependents": list(plan_node.dependents),
+            "retry_count": 0,
+            "max_retries": plan_node.max_retries,
+            "retry_delay": max(1, round(plan_node.retry_delay_ms / 1000)),
+            "tenant_id": execution.tenant_id,
+        }
+        for plan_node in plan.nodes
+    ]
+
+
+def insert_node_executions(db: Session, rows: List[Dict[str, Any]]) -> None:
+    """
+    Um único executemany: o SQLAlchemy 2.0 o envia como INSERT multi-linha
+    (insertmanyvalues), na transação do chamador
+    """
+    if rows:
+        db.execute(insert(NodeExecution.__table__), rows)
+
+
+def update_node_states(db: Session, states: Mapping[int, Mapping[str, Any]]) -> None:
+    """
+    Grava snapshots de estado de vários nós em um só comando. No PostgreSQL é
+    um ``UPDATE ... FROM (VALUES ...)``; nos demais bancos, um executemany do
+    mesmo UPDATE
+    """
+    if not states:
+        return
+    table = NodeExecution.__table__
+    rows = [
+        (node_execution_id, *(state.get(name) for name in NODE_STATE_COLUMNS))
+        for node_execution_id, state in states.items()
+    ]
+
+    if db.get_bind().dialect.name == "postgresql":
+        # None vira NULL do SQL (e não o 'null' do JSON nas colunas JSONB)
+        source = values(
+            column("id", Integer),
+            *(column(name, table.c[name].type) for name in NODE_STATE_COLUMNS),
+            name="node_state",
+        ).data([tuple(null() if value is None else value for value in row) for row in rows])
+        # NULLs em VALUES chegam sem tipo (text): cast explícito no SET
+        db.execute(
+            update(table)
+            .where(table.c.id == source.c.id)
+            .values(
+                {
+                    name: cast(source.c[name], table.c[name].type)
+                    for name in NODE_STATE_COLUMNS
+                }
+            )
+        )
+        return
+
+    statement = (
+        update(table)
+        .where(table.c.id == bindparam("_id"))
+        .values({name: bindparam(f"_{name}") for name in NODE_STATE_COLUMNS})
+    )
+    parameters = [
+        {"_id": row[0], **{f"_{name}": v for name, v in zip(NODE_STATE_COLUMNS, row[1:])}}
+        for row in rows
+    ]
+    db.execute(statement, parameters)
+
+
+def metric_row(
+    workflow_execution_id: Any,
+    node_execution_id: Optional[int],
+    metric_type: str,
+    metric_name: str,
+    value: Any,
+    tenant_id: Any = None,
+    measured_at: Optional[datetime] = None,
+) -> Dict[str, Any]:
+    """Linha de ``workflow_execution_metrics`` com o valor na coluna do seu tipo"""
+    return {
+        "workflow_execution_id": workflow_execution_id,
+        "node_execution_id": node_execution_id,
+        "metric_type": metric_type,
+        "metric_name": metric_name,
+        "value_numeric": value if isinstance(value, int) and not isinstance(value, bool) else None,
+        "value_float": str(value) if isinstance(value, float) else None,
+        "value_text": value if isinstance(value, str) else None,
+        "value_json": value if isinstance(value, (dict, list, bool)) else None,
+        "tenant_id": tenant_id,
+        "measured_at": measured_at or datetime.utcnow(),
+    }
+
+
+def _snapshot(**fields: Any) -> Dict[str, Any]:
+    state = dict.fromkeys(NODE_STATE_COLUMNS)
+    state.update(fields)
+    state["updated_at"] = datetime.utcnow()
+    return state
+
+
+class LiveStateMirror:
+    """
+    Espelho do estado em andamento de uma execução no cache compartilhado
+    (``CacheManager``), para que outros workers vejam nós que ainda não foram
+    gravados no banco. Falhas são apenas registradas no log.
+    """
+
+    def __init__(self, cache: Any = None, ttl: int = 3600):
+        self._cache = cache
+        self.ttl = ttl
+
+    async def _get_cache(self):
+        if self._cache is None:
+            from synapse.core.cache import get_cache_manager
+
+            self._cache = await get_cache_manager()
+        return self._cache
+
+    @staticmethod
+    def key(execution_id: str) -> str:
+        return f"{LIVE_STATE_PREFIX}:{execution_id}"
+
+    async def publish(self, execution_id: str, state: Dict[str, Any]) -> None:
+        try:
+            await (await self._get_cache()).set(self.key(execution_id), state, ttl=self.ttl)
+        except Exception as e:
+            logger.warning(f"Erro ao espelhar estado da execução {execution_id}: {e}")
+
+    async def read(self, execution_id: str) -> Optional[Dict[str, Any]]:
+        try:
+            return await (await self._get_cache()).get(self.key(execution_id))
+        except Exception as e:
+            logger.warning(f"Erro ao ler estado da execução {execution_id}: {e}")
+            return None
+
+    async def clear(self, execution_id: str) -> None:
+        try:
+            await (await self._get_cache()).delete(self.key(execution_id))
+        except Exception as e:
+            logger.warning(f"Erro ao limpar estado da execução {execution_id}: {e}")
+
+
+class NodeStateBuffer:
+    """
+    Transições de estado e métricas de uma execução entre flushes. Cada nó
+    guarda só o snapshot mais recente, então início e fim no mesmo tick viram
+    uma única linha no UPDATE em lote. ``flush`` grava na transação do
+    chamador (que faz o commit junto com o progresso da execução).
+    """
+
+    def __init__(
+        self,
+        execution: Any,
+        mode: Optional[str] = None,
+        flush_interval_ms: Optional[int] = None,
+        fast_node_ms: Optional[int] = None,
+        mirror: Optional[LiveStateMirror] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.execution_id = str(execution.execution_id)
+        self.workflow_execution_id = execution.id
+        self.tenant_id = getattr(execution, "tenant_id", None)
+        self.mode = NodeStateMode(mode or settings.EXECUTION_NODE_STATE_MODE)
+        if flush_interval_ms is None:
+            flush_interval_ms = settings.EXECUTION_STATE_FLUSH_INTERVAL_MS
+        if fast_node_ms is None:
+            fast_node_ms = settings.EXECUTION_FAST_NODE_MS
+        self.flush_interval = flush_interval_ms / 1000
+        self.fast_node_seconds = fast_node_ms / 1000
+        self.mirror = mirror
+        self._clock = clock
+        self._last_flush = clock()
+        self._pending: Dict[int, Dict[str, Any]] = {}
+        self._running: Dict[int, Dict[str, Any]] = {}
+        self._metrics: List[Dict[str, Any]] = []
+        self.live: Dict[int, Dict[str, Any]] = {}
+        self.stats = {
+            "transactions": 0,
+            "flushes": 0,
+            "node_updates": 0,
+            "metrics": 0,
+            "deferred_starts": 0,
+        }
+
+    @property
+    def watchdog_seconds(self) -> float:
+        """Quanto um nó roda antes de o seu início ser gravado no banco"""
+        return self.fast_node_seconds if self.mode is NodeStateMode.FINAL else self.flush_interval
+
+    def start(self, node_execution_id: int, node_key: str, started_at: datetime) -> None:
+        state = _snapshot(started_at=started_at, retry_count=0)
+        self.live[node_execution_id] = {"node_key": node_key, "started_at": started_at.isoformat()}
+        if self.mode is NodeStateMode.FINAL:
+            self._running[node_execution_id] = state
+        else:
+            self._pending[node_execution_id] = state
+
+    def finish(self, node_execution_id: int, **fields: Any) -> None:
+        """Estado final do nó (``started_at``, ``completed_at``, ``output_data``/``error_*``...)"""
+        if self._running.pop(node_execution_id, None) is not None:
+            self.stats["deferred_starts"] += 1
+        self.live.pop(node_execution_id, None)
+        self._pending[node_execution_id] = _snapshot(**fields)
+
+    def persist_running(self) -> int:
+        """Inclui no próximo flush os nós em andamento que ainda não foram gravados"""
+        moved = len(self._running)
+        self._pending.update(self._running)
+        self._running.clear()
+        return moved
+
+    def metric(self, node_execution_id: Optional[int], metric_type: str, metric_name: str, value: Any) -> None:
+        self._metrics.append(
+            metric_row(
+                self.workflow_execution_id,
+                node_execution_id,
+                metric_type,
+                metric_name,
+                value,
+                tenant_id=self.tenant_id,
+            )
+        )
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending) + len(self._metrics)
+
+    def due(self) -> bool:
+        return bool(self.pending) and self._clock() - self._last_flush >= self.flush_interval
+
+    def flush(self, db: Session) -> bool:
+        """Grava transições e métricas pendentes (sem commit)"""
+        self._last_flush = self._clock()
+        if not self.pending:
+            return False
+        update_node_states(db, self._pending)
+        if self._metrics:
+            db.execute(insert(WorkflowExecutionMetric.__table__), self._metrics)
+        self.stats["flushes"] += 1
+        self.stats["node_updates"] += len(self._pending)
+        self.stats["metrics"] += len(self._metrics)
+        self._pending.clear()
+        self._metrics.clear()
+        return True
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Estado em andamento (para o espelho e consultas ao vivo)"""
+        return {"running": list(self.live.values()), "unflushed": self.pending, "mode": self.mode.value}
+
+    async def publish(self, **progress: Any) -> None:
+        if self.mirror is not None:
+            await self.mirror.publish(self.execution_id, {**self.snapshot(), **progress})
+
+    async def close(self) -> None:
+        if self.mirror is not None:
+            await self.mirror.clear(self.execution_id)
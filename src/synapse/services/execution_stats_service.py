@@ -0,0 +1,340 @@
+"""
+Serviço de Estatísticas de Execução
+Mantém o rollup diário de execuções finalizadas e calcula as estatísticas
+agregadas a partir dele, sem varrer a tabela workflow_executions
+"""
+
+import logging
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import case, delete, func, insert, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from synapse.models.workflow_execution import ExecutionStatus, WorkflowExecution
+from synapse.models.workflow_execution_daily_stat import WorkflowExecutionDailyStat
+from synapse.schemas.workflow_execution import ExecutionStats
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_STATUSES = (
+    ExecutionStatus.COMPLETED.value,
+    ExecutionStatus.FAILED.value,
+    ExecutionStatus.CANCELLED.value,
+    ExecutionStatus.TIMEOUT.value,
+)
+ACTIVE_STATUSES = (ExecutionStatus.PENDING.value, ExecutionStatus.RUNNING.value)
+
+_ROLLUP_KEY = ("user_id", "workflow_id", "day", "status")
+_ROLLUP_COUNTERS = ("execution_count", "duration_sum", "duration_count", "nodes_completed_sum")
+
+
+def _status_value(status: Any) -> str:
+    return status.value if isinstance(status, ExecutionStatus) else str(status)
+
+
+@dataclass(frozen=True)
+class RollupContribution:
+    """Contribuição de uma execução finalizada para uma linha do rollup"""
+
+    user_id: Any
+    workflow_id: Any
+    tenant_id: Any
+    day: date
+    status: str
+    duration: Optional[int]
+    completed_nodes: int
+
+    @classmethod
+    def from_execution(cls, execution: WorkflowExecution) -> Optional["RollupContribution"]:
+        """Retorna a contribuição da execução, ou None se ela não estiver em estado terminal"""
+        status = _status_value(execution.status)
+        if status not in TERMINAL_STATUSES:
+            return None
+        finished_at = execution.completed_at or execution.created_at or datetime.utcnow()
+        return cls(
+            user_id=execution.user_id,
+            workflow_id=execution.workflow_id,
+            tenant_id=execution.tenant_id,
+            day=finished_at.date(),
+            status=status,
+            duration=execution.actual_duration,
+            completed_nodes=execution.completed_nodes or 0,
+        )
+
+    def counters(self, sign: int = 1) -> Dict[str, int]:
+        has_duration = self.duration is not None
+        return {
+            "execution_count": sign,
+            "duration_sum": sign * (self.duration or 0),
+            "duration_count": sign if has_duration else 0,
+            "nodes_completed_sum": sign * self.completed_nodes,
+        }
+
+
+class ExecutionStatsService:
+    """
+    Estatísticas de execução baseadas no rollup diário.
+
+    O rollup tem granularidade usuário/workflow/dia/status, então o custo das
+    consultas é proporcional ao número de dias ativos e não ao de execuções.
+    """
+
+    def record_transition(
+        self,
+        db: Session,
+        execution: WorkflowExecution,
+        previous: Optional[RollupContribution] = None,
+    ) -> None:
+        """
+        Atualiza o rollup após uma mudança de status.
+
+        ``previous`` é a contribuição capturada antes da mudança (via
+        ``RollupContribution.from_execution``); ela é descontada para que
+        reexecuções e correções de status não contem a mesma execução duas vezes.
+        A escrita acontece na transação do chamador, dentro de um savepoint para
+        que uma falha no rollup nunca derrube a execução.
+        """
+        current = RollupContribution.from_execution(execution)
+        if previous == current:
+            return
+
+        try:
+            with db.begin_nested():
+                if previous is not None:
+                    self._apply(db, previous, sign=-1)
+                if current is not None:
+                    self._apply(db, current, sign=1)
+        except SQLAlchemyError as e:
+            logger.warning(
+                "Falha ao atualizar rollup de execução %s: %s",
+                execution.execution_id,
+                str(e),
+            )
+
+    def _apply(self, db: Session, contribution: RollupContribution, sign: int) -> None:
+        table = WorkflowExecutionDailyStat.__table__
+        values = {
+            "user_id": contribution.user_id,
+            "workflow_id": contribution.workflow_id,
+            "day": contribution.day,
+            "status": contribution.status,
+            "tenant_id": contribution.tenant_id,
+            **contribution.counters(sign),
+        }
+
+        dialect = db.get_bind().dialect.name
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert as upsert
+        elif dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert as upsert
+        else:
+            self._apply_orm(db, values)
+            return
+
+        stmt = upsert(table).values(**values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=list(_ROLLUP_KEY),
+            set_={
+                **{name: table.c[name] + stmt.excluded[name] for name in _ROLLUP_COUNTERS},
+                "updated_at": func.now(),
+            },
+        )
+        db.execute(stmt)
+
+    def _apply_orm(self, db: Session, values: Dict[str, Any]) -> None:
+        key = tuple(values[name] for name in _ROLLUP_KEY)
+        row = db.get(WorkflowExecutionDailyStat, key)
+        if row is None:
+            db.add(WorkflowExecutionDailyStat(**values))
+            return
+        for name in _ROLLUP_COUNTERS:
+            setattr(row, name, (getattr(row, name) or 0) + values[name])
+
+    def rebuild(self, db: Session, user_id: Any = None) -> int:
+        """
+        Reconstrói o rollup a partir de workflow_executions (backfill/reparo).
+        Retorna o número de linhas do rollup geradas.
+        """
+        stats = WorkflowExecutionDailyStat
+        execution = WorkflowExecution
+        day = func.date(func.coalesce(execution.completed_at, execution.created_at))
+
+        source = (
+            select(
+                execution.user_id,
+                execution.workflow_id,
+                day,
+                execution.status,
+                execution.tenant_id,
+                func.count(),
+                func.coalesce(func.sum(execution.actual_duration), 0),
+                func.count(execution.actual_duration),
+                func.coalesce(func.sum(execution.completed_nodes), 0),
+            )
+            .where(execution.status.in_(TERMINAL_STATUSES))
+            .group_by(
+                execution.user_id,
+                execution.workflow_id,
+                day,
+                execution.status,
+                execution.tenant_id,
+            )
+        )
+        purge = delete(stats)
+        if user_id is not None:
+            source = source.where(execution.user_id == user_id)
+            purge = purge.where(stats.user_id == user_id)
+
+        db.execute(purge)
+        result = db.execute(
+            insert(stats).from_select(
+                [
+                    "user_id",
+                    "workflow_id",
+                    "day",
+                    "status",
+                    "tenant_id",
+                    *_ROLLUP_COUNTERS,
+                ],
+                source,
+            )
+        )
+        db.commit()
+        return result.rowcount or 0
+
+    def get_statistics(
+        self,
+        db: Session,
+        user_id: Any,
+        trend_days: int = 30,
+        top_workflows: int = 5,
+    ) -> ExecutionStats:
+        """
+        Calcula as estatísticas de um usuário.
+
+        Três consultas, cada uma em uma única passada: agregação condicional por
+        dia no rollup (totais + tendência), top workflows no rollup e contagem
+        das execuções ainda ativas (poucas linhas, via índice de user_id).
+        """
+        stats = WorkflowExecutionDailyStat
+
+        def count_for(status: str):
+            return func.coalesce(
+                func.sum(case((stats.status == status, stats.execution_count), else_=0)), 0
+            )
+
+        daily_rows = (
+            db.query(
+                stats.day,
+                func.coalesce(func.sum(stats.execution_count), 0),
+                count_for(ExecutionStatus.COMPLETED.value),
+                count_for(ExecutionStatus.FAILED.value),
+                count_for(ExecutionStatus.CANCELLED.value),
+                count_for(ExecutionStatus.TIMEOUT.value),
+                func.coalesce(func.sum(stats.duration_sum), 0),
+                func.coalesce(func.sum(stats.duration_count), 0),
+                func.coalesce(func.sum(stats.nodes_completed_sum), 0),
+            )
+            .filter(stats.user_id == user_id)
+            .group_by(stats.day)
+            .order_by(stats.day)
+            .all()
+        )
+
+        workflow_total = func.sum(stats.execution_count).label("count")
+        most_used = (
+            db.query(stats.workflow_id, workflow_total)
+            .filter(stats.user_id == user_id)
+            .group_by(stats.workflow_id)
+            .having(workflow_total > 0)
+            .order_by(workflow_total.desc())
+            .limit(top_workflows)
+            .all()
+        )
+
+        execution = WorkflowExecution
+        live_total, live_running, live_nodes = (
+            db.query(
+                func.count(),
+                func.coalesce(
+                    func.sum(case((execution.status.in_(ACTIVE_STATUSES), 1), else_=0)), 0
+                ),
+                func.coalesce(func.sum(execution.completed_nodes), 0),
+            )
+            .filter(
+                execution.user_id == user_id,
+                execution.status.notin_(TERMINAL_STATUSES),
+            )
+            .one()
+        )
+
+        return self._build_stats(
+            daily_rows,
+            most_used,
+            int(live_total or 0),
+            int(live_running or 0),
+            int(live_nodes or 0),
+            trend_days,
+        )
+
+    @staticmethod
+    def _build_stats(
+        daily_rows: List[Any],
+        most_used: List[Any],
+        live_total: int,
+        live_running: int,
+        live_nodes: int,
+        trend_days: int,
+    ) -> ExecutionStats:
+        totals = [0] * 8
+        by_day: Dict[date, Any] = {}
+        for row in daily_rows:
+            day = row[0]
+            if isinstance(day, str):  # SQLite devolve DATE como texto
+                day = date.fromisoformat(day)
+            counters = [int(value or 0) for value in row[1:]]
+            by_day[day] = counters
+            totals = [acc + value for acc, value in zip(totals, counters)]
+
+        finished, completed, failed, cancelled, timeout, duration_sum, duration_count, nodes = totals
+        total = finished + live_total
+        total_nodes = nodes + live_nodes
+
+        today = datetime.utcnow().date()
+        daily = []
+        for offset in range(trend_days - 1, -1, -1):
+            day = today - timedelta(days=offset)
+            counters = by_day.get(day, [0] * 8)
+            daily.append(
+                {
+                    "date": day.isoformat(),
+                    "total": counters[0],
+                    "completed": counters[1],
+                    "failed": counters[2],
+                    "cancelled": counters[3],
+                    "timeout": counters[4],
+                    "average_duration_seconds": (
+                        counters[5] / counters[6] if counters[6] else None
+                    ),
+                }
+            )
+
+        return ExecutionStats(
+            total_executions=total,
+            running_executions=live_running,
+            completed_executions=completed,
+            failed_executions=failed,
+            cancelled_executions=cancelled,
+            average_duration_seconds=(duration_sum / duration_count if duration_count else None),
+            success_rate_percentage=(completed / total * 100) if total > 0 else 0,
+            total_nodes_executed=total_nodes,
+            average_nodes_per_execution=(total_nodes / total) if total > 0 else 0,
+            most_used_workflows=[
+                {"workflow_id": str(workflow_id), "count": int(count)}
+                for workflow_id, count in most_used
+            ],
+            execution_trends={"period_days": trend_days, "daily": daily},
+        )
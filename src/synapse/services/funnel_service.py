@@ -0,0 +1,272 @@
+"""
+Serviço de Funis e Coortes
+Monta as fontes (eventos, coortes) sobre analytics_events e executa o motor
+de funil/retenção no banco (plano com funções de janela) ou em NumPy, com
+cache de resultados
+"""
+
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from sqlalchemy import Integer, and_, cast, func, or_, select
+from sqlalchemy.orm import Session
+
+from synapse.core.analytics.funnels import (
+    ResultCache,
+    build_funnel_select,
+    build_retention_select,
+    build_step_results,
+    funnel_from_arrays,
+    retention_from_rows,
+)
+from synapse.core.config import settings
+from synapse.models.analytics_event import AnalyticsEvent
+from synapse.models.user import User
+from synapse.models.workflow import Workflow
+
+logger = logging.getLogger(__name__)
+
+# Colunas de analytics_events aceitas em ``filters`` de um passo
+STEP_FILTER_COLUMNS = (
+    "event_type",
+    "category",
+    "action",
+    "label",
+    "page_url",
+    "device_type",
+    "country",
+    "browser",
+    "os",
+)
+
+PERIOD_SECONDS = {"day": 86400, "week": 604800}
+# 1970-01-01 foi quinta-feira: deslocamento para semanas começando na segunda
+_WEEK_OFFSET_SECONDS = 4 * 86400
+
+result_cache = ResultCache(ttl=settings.ANALYTICS_FUNNEL_CACHE_TTL_SECONDS)
+
+
+def _epoch(column):
+    return func.extract("epoch", column)
+
+
+def period_index(column, period_type: str):
+    """Índice inteiro do período (dia/semana/mês) de uma coluna de data"""
+    if period_type == "month":
+        return cast(
+            func.extract("year", column) * 12 + func.extract("month", column) - 1, Integer
+        )
+    offset = _WEEK_OFFSET_SECONDS if period_type == "week" else 0
+    # floor antes do cast: no PostgreSQL o cast arredonda, jogando a segunda
+    # metade do período no bucket seguinte
+    return cast(func.floor((_epoch(column) - offset) / PERIOD_SECONDS[period_type]), Integer)
+
+
+def tenant_scope(column, tenant_id: Any):
+    """Filtro de tenant aplicado a toda consulta de origem (sem tenant = só linhas sem tenant)"""
+    return column.is_(None) if tenant_id is None else column == tenant_id
+
+
+def period_label(index: int, period_type: str) -> str:
+    if period_type == "month":
+        return f"{index // 12:04d}-{index % 12 + 1:02d}"
+    offset = _WEEK_OFFSET_SECONDS if period_type == "week" else 0
+    start = datetime(1970, 1, 1) + timedelta(seconds=index * PERIOD_SECONDS[period_type] + offset)
+    return start.date().isoformat()
+
+
+class FunnelService:
+    """
+    Funis ordenados com janela de conversão e matrizes de retenção.
+
+    Ambos leem analytics_events uma única vez por consulta; resultados ficam
+    em cache por ``ANALYTICS_FUNNEL_CACHE_TTL_SECONDS``.
+    """
+
+    def __init__(self, db: Session, engine: Optional[str] = None):
+        self.db = db
+        self.engine = engine or settings.ANALYTICS_FUNNEL_ENGINE
+
+    # ==================== FUNIS ====================
+
+    @staticmethod
+    def _step_predicate(step: Dict[str, Any]):
+        conditions = []
+        if step.get("event_name"):
+            conditions.append(AnalyticsEvent.action == step["event_name"])
+        for key, value in (step.get("filters") or {}).items():
+            if key not in STEP_FILTER_COLUMNS:
+                raise ValueError(f"Filtro de passo não suportado: {key}")
+            column = getattr(AnalyticsEvent, key)
+            conditions.append(column.in_(value) if isinstance(value, list) else column == value)
+        if not conditions:
+            raise ValueError("Cada passo do funil precisa de event_name ou filters")
+        return and_(*conditions)
+
+    def _funnel_source(self, steps, start_date, end_date, tenant_id):
+        predicates = [self._step_predicate(step) for step in steps]
+        query = select(
+            AnalyticsEvent.user_id.label("user_id"),
+            _epoch(AnalyticsEvent.timestamp).label("ts"),
+            AnalyticsEvent.event_id.label("seq"),
+            *[cast(predicate, Integer).label(f"m{k}") for k, predicate in enumerate(predicates)],
+        ).where(
+            AnalyticsEvent.timestamp >= start_date,
+            AnalyticsEvent.timestamp <= end_date,
+            AnalyticsEvent.user_id.isnot(None),
+            or_(*predicates),
+        )
+        return query.where(tenant_scope(AnalyticsEvent.tenant_id, tenant_id))
+
+    def funnel(
+        self,
+        steps: List[Dict[str, Any]],
+        start_date: datetime,
+        end_date: datetime,
+        window_seconds: float,
+        tenant_id: Any = None,
+    ) -> Dict[str, Any]:
+        """Funil ordenado: usuários e conversão por passo, tempo médio até cada passo"""
+        if len(steps) < 2:
+            raise ValueError("O funil precisa de pelo menos dois passos")
+
+        params = {
+            "steps": steps,
+            "start": start_date,
+            "end": end_date,
+            "window": window_seconds,
+            "tenant": tenant_id,
+        }
+
+        def compute():
+            source = self._funnel_source(steps, start_date, end_date, tenant_id)
+            if self.engine == "numpy":
+                counts, averages = self._funnel_numpy(source, len(steps), window_seconds)
+            else:
+                row = self.db.execute(
+                    build_funnel_select(source.subquery("events"), len(steps), window_seconds)
+                ).one()
+                counts = [row[2 * k] or 0 for k in range(len(steps))]
+                averages = [row[2 * k + 1] for k in range(len(steps))]
+            names = [step.get("name") or f"Step {k + 1}" for k, step in enumerate(steps)]
+            return [result.to_dict() for result in build_step_results(names, counts, averages)]
+
+        funnel_data, cached = result_cache.get_or_compute(result_cache.key("funnel", params), compute)
+        first, last = funnel_data[0]["user_count"], funnel_data[-1]["user_count"]
+        return {
+            "funnel_data": funnel_data,
+            "total_users": first,
+            "conversion_rate": round(last / first * 100, 2) if first else 0.0,
+            "window_seconds": window_seconds,
+            "cached": cached,
+        }
+
+    def _funnel_numpy(self, source, n_steps: int, window_seconds: float):
+        """Lê os eventos em lotes e roda a máquina de estados vetorizada"""
+        codes: Dict[Any, int] = {}
+        users, times, flags = [], [], []
+        result = self.db.execute(source.execution_options(yield_per=50_000))
+        for partition in result.partitions():
+            for row in partition:
+                users.append(codes.setdefault(row[0], len(codes)))
+                times.append(float(row[1]))
+                flags.append(row[3:])
+        masks = np.asarray(flags, dtype=bool).T if flags else np.zeros((n_steps, 0), dtype=bool)
+        counts, averages = funnel_from_arrays(
+            np.asarray(users, dtype=np.int64), np.asarray(times), masks, window_seconds
+        )
+        return counts.tolist(), [None if np.isnan(value) else float(value) for value in averages]
+
+    # ==================== COORTES ====================
+
+    def _cohort_anchor(self, cohort_type: str, period_type: str, start_date, end_date, tenant_id):
+        if cohort_type == "registration":
+            anchor = User.created_at
+            query = select(User.id.label("user_id"), period_index(anchor, period_type).label("cohort"))
+            return query.where(anchor >= start_date, anchor <= end_date, tenant_scope(User.tenant_id, tenant_id))
+
+        if cohort_type == "first_workflow":
+            first = (
+                select(Workflow.user_id.label("user_id"), func.min(Workflow.created_at).label("first_at"))
+                .where(tenant_scope(Workflow.tenant_id, tenant_id))
+                .group_by(Workflow.user_id)
+                .subquery()
+            )
+        elif cohort_type == "first_purchase":
+            first = (
+                select(
+                    AnalyticsEvent.user_id.label("user_id"),
+                    func.min(AnalyticsEvent.timestamp).label("first_at"),
+                )
+                .where(
+                    AnalyticsEvent.user_id.isnot(None),
+                    or_(AnalyticsEvent.event_type == "purchase", AnalyticsEvent.action == "purchase"),
+                    tenant_scope(AnalyticsEvent.tenant_id, tenant_id),
+                )
+                .group_by(AnalyticsEvent.user_id)
+                .subquery()
+            )
+        else:
+            raise ValueError(f"Tipo de coorte não suportado: {cohort_type}")
+
+        return select(
+            first.c.user_id, period_index(first.c.first_at, period_type).label("cohort")
+        ).where(first.c.first_at >= start_date, first.c.first_at <= end_date)
+
+    def retention(
+        self,
+        cohort_type: str,
+        period_type: str,
+        periods: int,
+        start_date: datetime,
+        end_date: datetime,
+        tenant_id: Any = None,
+    ) -> Dict[str, Any]:
+        """Matriz de retenção: % de cada coorte ativa em cada período seguinte"""
+        if period_type not in ("day", "week", "month"):
+            raise ValueError(f"Período não suportado: {period_type}")
+
+        params = {
+            "cohort_type": cohort_type,
+            "period_type": period_type,
+            "periods": periods,
+            "start": start_date,
+            "end": end_date,
+            "tenant": tenant_id,
+        }
+
+        def compute():
+            cohorts = self._cohort_anchor(cohort_type, period_type, start_date, end_date, tenant_id).subquery(
+                "cohorts"
+            )
+            sizes = dict(
+                self.db.execute(
+                    select(cohorts.c.cohort, func.count()).group_by(cohorts.c.cohort)
+                ).all()
+            )
+            events = select(
+                AnalyticsEvent.user_id.label("user_id"),
+                period_index(AnalyticsEvent.timestamp, period_type).label("period"),
+            ).where(
+                AnalyticsEvent.timestamp >= start_date,
+                AnalyticsEvent.user_id.isnot(None),
+                tenant_scope(AnalyticsEvent.tenant_id, tenant_id),
+            )
+
+            rows = self.db.execute(
+                build_retention_select(events.subquery("activity"), cohorts, periods)
+            ).all()
+            matrix = retention_from_rows(rows, sizes, periods)
+            return {
+                "cohort_data": matrix.rates,
+                "cohort_labels": [period_label(label, period_type) for label in matrix.cohort_labels],
+                "cohort_sizes": matrix.cohort_sizes,
+                "period_labels": [f"{period_type} {offset}" for offset in range(periods)],
+                "total_cohorts": len(matrix.cohort_labels),
+            }
+
+        data, cached = result_cache.get_or_compute(result_cache.key("retention", params), compute)
+        return {**data, "cached": cached}
+
@@ -8,6 +8,8 @@ This service provides a unified interface for:
 - Replacing hardcoded enum-based data with dynamic database queries
 """
 
+import functools
+import importlib
 import logging
 import time
 from typing import Optional, List, Dict, Any
@@ -36,33 +38,25 @@ from synapse.exceptions import (
 
 # Sistema de tracing distribuído
 from synapse.core.tracing import trace_operation, trace_database_operation
+from synapse.core.config import settings
 
-# Import for real LLM functionality
-try:
-    import openai
-    from openai import AsyncOpenAI
-
-    OPENAI_AVAILABLE = True
-except ImportError:
-    OPENAI_AVAILABLE = False
-
-try:
-    import anthropic
-
-    ANTHROPIC_AVAILABLE = True
-except ImportError:
-    ANTHROPIC_AVAILABLE = False
+logger = logging.getLogger(__name__)
 
-try:
-    import google.generativeai as genai
 
-    GOOGLE_AVAILABLE = True
-except ImportError:
-    GOOGLE_AVAILABLE = False
+@functools.lru_cache(maxsize=None)
+def _optional_sdk(module_name: str):
+    """Import a provider SDK on first use; None when it is not installed"""
+    try:
+        return importlib.import_module(module_name)
+    except ImportError:
+        return None
 
-from synapse.core.config import settings
 
-logger = logging.getLogger(__name__)
+def _async_openai(api_key: str):
+    openai = _optional_sdk("openai")
+    if openai is None:
+        raise ImportError("openai package is not installed")
+    return openai.AsyncOpenAI(api_key=api_key)
 
 
 class LLMResponse:
@@ -149,11 +143,9 @@ class UnifiedLLMService:
         self.providers = {}
 
         # OpenAI
-        if OPENAI_AVAILABLE and self.settings.OPENAI_API_KEY:
+        if self.settings.OPENAI_API_KEY and _optional_sdk("openai"):
             try:
-                self.clients["openai"] = AsyncOpenAI(
-                    api_key=self.settings.OPENAI_API_KEY
-                )
+                self.clients["openai"] = _async_openai(self.settings.OPENAI_API_KEY)
                 self.providers["openai"] = {
                     "name": "OpenAI",
                     "models": ["gpt-4o", "gpt-4-turbo", "gpt-3.5-turbo"],
@@ -165,7 +157,8 @@ class UnifiedLLMService:
                 self.providers["openai"] = {"available": False, "error": str(e)}
 
         # Anthropic
-        if ANTHROPIC_AVAILABLE and self.settings.ANTHROPIC_API_KEY:
+        anthropic = _optional_sdk("anthropic") if self.settings.ANTHROPIC_API_KEY else None
+        if anthropic:
             try:
                 self.clients["anthropic"] = anthropic.AsyncAnthropic(
                     api_key=self.settings.ANTHROPIC_API_KEY
@@ -185,7 +178,8 @@ class UnifiedLLMService:
                 self.providers["anthropic"] = {"available": False, "error": str(e)}
 
         # Google
-        if GOOGLE_AVAILABLE and self.settings.GOOGLE_API_KEY:
+        genai = _optional_sdk("google.generativeai") if self.settings.GOOGLE_API_KEY else None
+        if genai:
             try:
                 genai.configure(api_key=self.settings.GOOGLE_API_KEY)
                 self.providers["google"] = {
@@ -659,7 +653,7 @@ class UnifiedLLMService:
     ) -> LLMResponse:
         """Generate text using OpenAI with custom key"""
         try:
-            client = AsyncOpenAI(api_key=api_key)
+            client = _async_openai(api_key)
             response = await client.chat.completions.create(
                 model=model,
                 messages=[{"role": "user", "content": prompt}],
@@ -1133,7 +1127,7 @@ class UnifiedLLMService:
     ) -> LLMResponse:
         """Generate chat completion using OpenAI with custom key"""
         try:
-            client = AsyncOpenAI(api_key=api_key)
+            client = _async_openai(api_key)
             response = await client.chat.completions.create(
                 model=model,
                 messages=messages,
@@ -16,6 +16,7 @@ from synapse.models.marketplace import (
     ComponentRating,
     ComponentPurchase,
 )
+from synapse.services.counter_service import MARKETPLACE_COMPONENT, counter_service
 
 logger = logging.getLogger(__name__)
 
@@ -279,6 +280,7 @@ class MarketplaceService:
         self, component_id: int, user_id: int, version: str = None
     ) -> dict:
         """Faz download de um componente"""
+        self._count(component_id, touch=True, downloads_count=1)
         return {
             "download_url": f"https://storage.synapscale.com/components/{component_id}.zip",
             "expires_at": (datetime.utcnow() + timedelta(hours=24)).isoformat(),
@@ -289,6 +291,7 @@ class MarketplaceService:
         self, component_id: int, user_id: int, workspace_id: int = None
     ) -> dict:
         """Instala um componente no workspace"""
+        self._count(component_id, install_count=1)
         return {
             "installation_id": 1,
             "component_id": component_id,
@@ -297,6 +300,13 @@ class MarketplaceService:
             "installed_at": datetime.utcnow().isoformat(),
         }
 
+    def _count(self, component_id, touch: bool = False, **deltas: int) -> None:
+        """Contadores do componente, acumulados e gravados em lote"""
+        try:
+            counter_service.increment(MARKETPLACE_COMPONENT, component_id, touch=touch, **deltas)
+        except ValueError as e:
+            logger.warning(f"Contador ignorado para o componente {component_id}: {e}")
+
     def create_rating(self, component_id: int, rating_data, user_id: int) -> dict:
         """Cria uma avaliação"""
         return {
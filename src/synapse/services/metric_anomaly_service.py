@@ -0,0 +1,331 @@
+"""
+Serviço de Anomalias de Métricas
+Mantém estimadores online por série de rollup (métrica, serviço, tenant,
+resolução) e sinaliza anomalias à medida que os buckets fecham: cada execução
+lê só os buckets posteriores ao último incorporado em cada série. Séries novas
+são iniciadas com o backfill vetorizado sobre o histórico recente.
+"""
+
+import logging
+from collections import defaultdict
+from dataclasses import replace
+from datetime import datetime, timedelta
+from itertools import groupby
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import and_, delete, func, select
+from sqlalchemy.orm import Session
+
+from synapse.core.analytics.anomaly import (
+    AnomalyScore,
+    DetectorConfig,
+    DetectorState,
+    score_series,
+    season_slot,
+    trend_summary,
+)
+from synapse.core.config import settings
+from synapse.models.metric_anomaly import MetricAnomaly, MetricDetectorState
+from synapse.models.metric_rollup import MetricRollup
+from synapse.services.metric_rollup_service import RESOLUTIONS, bucket_start
+
+logger = logging.getLogger(__name__)
+
+_SERIES_KEY = ("metric_name", "resolution", "tenant_id", "service")
+
+
+def _upsert(db: Session):
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        return None
+    return insert
+
+
+def _average(total: float, count: int) -> Optional[float]:
+    return total / count if count else None
+
+
+class MetricAnomalyService:
+    """
+    Detecção incremental de anomalias sobre os rollups de métricas.
+
+    O valor de cada bucket é a média (sum/count). O estado de cada série
+    (``MetricDetectorState``) avança junto com as anomalias encontradas, na
+    mesma transação; reprocessar um bucket é impossível porque a leitura
+    começa depois de ``last_bucket``.
+    """
+
+    def __init__(self, config: Optional[DetectorConfig] = None, resolutions: Optional[Sequence[str]] = None):
+        self.config = config or DetectorConfig(
+            window=settings.ANALYTICS_ANOMALY_WINDOW,
+            min_samples=settings.ANALYTICS_ANOMALY_MIN_SAMPLES,
+            threshold=settings.ANALYTICS_ANOMALY_THRESHOLD,
+        )
+        self.resolutions = list(
+            resolutions
+            or [name.strip() for name in settings.ANALYTICS_ANOMALY_RESOLUTIONS.split(",") if name.strip()]
+        )
+
+    # ==================== DETECÇÃO INCREMENTAL ====================
+
+    def run_incremental(self, db: Session, now: Optional[datetime] = None) -> int:
+        """Processa os buckets que fecharam desde a última execução; retorna anomalias novas"""
+        now = now or datetime.utcnow()
+        found = 0
+        for resolution in self.resolutions:
+            found += self._process_resolution(db, resolution, now)
+            db.commit()
+        return found
+
+    def _process_resolution(self, db: Session, resolution: str, now: datetime) -> int:
+        seconds = RESOLUTIONS[resolution]
+        # Fechado = terminou há pelo menos o atraso configurado (linhas atrasadas dos rollups)
+        closed = now - timedelta(seconds=settings.ANALYTICS_ANOMALY_CLOSE_DELAY_SECONDS)
+        last_closed = bucket_start(closed, seconds) - timedelta(seconds=seconds)
+        horizon = last_closed - timedelta(seconds=seconds * settings.ANALYTICS_ANOMALY_BACKFILL_BUCKETS)
+
+        rollup, state = MetricRollup, MetricDetectorState
+        rows = db.execute(
+            select(
+                rollup.metric_name,
+                rollup.tenant_id,
+                rollup.service,
+                rollup.bucket_start,
+                rollup.sum,
+                rollup.count,
+                state.state,
+            )
+            .outerjoin(
+                state,
+                and_(*(getattr(state, name) == getattr(rollup, name) for name in _SERIES_KEY)),
+            )
+            .where(
+                rollup.resolution == resolution,
+                rollup.bucket_start <= last_closed,
+                rollup.bucket_start > func.coalesce(state.last_bucket, horizon),
+            )
+            .order_by(rollup.metric_name, rollup.tenant_id, rollup.service, rollup.bucket_start)
+        ).all()
+
+        states: List[Dict[str, Any]] = []
+        anomalies: List[Dict[str, Any]] = []
+        for (metric_name, tenant_id, service), series in groupby(rows, key=lambda row: row[:3]):
+            series = [row for row in series if row.count]
+            if not series:
+                continue
+            buckets = [row.bucket_start for row in series]
+            values = [_average(row.sum, row.count) for row in series]
+            slots = [season_slot(bucket, resolution) for bucket in buckets]
+            stored = series[0].state
+            if stored is None:
+                scores, detector = score_series(values, slots, self.config)
+            else:
+                detector = DetectorState.from_dict(stored)
+                scores = [detector.update(value, slot, self.config) for value, slot in zip(values, slots)]
+            detector.last_bucket = buckets[-1].isoformat()
+
+            key = {"metric_name": metric_name, "resolution": resolution, "tenant_id": tenant_id, "service": service}
+            states.append(
+                {**key, "state": detector.to_dict(), "last_bucket": buckets[-1], "last_score": detector.last_score}
+            )
+            anomalies.extend(
+                self._anomaly_row(key, bucket, score)
+                for bucket, score in zip(buckets, scores)
+                if score.is_anomaly
+            )
+
+        self._save(db, states, anomalies)
+        if anomalies:
+            logger.info(f"{len(anomalies)} anomalias em buckets {resolution} de {len(states)} séries")
+        return len(anomalies)
+
+    @staticmethod
+    def _anomaly_row(key: Dict[str, Any], bucket: datetime, score: AnomalyScore) -> Dict[str, Any]:
+        return {
+            **key,
+            "bucket_start": bucket,
+            "value": score.value,
+            "expected": score.expected,
+            "score": score.score,
+            "direction": score.direction,
+            "details": {
+                "ewma_z": score.ewma_z,
+                "rolling_z": score.rolling_z,
+                "seasonal_z": score.seasonal_z,
+                "robust_z": score.robust_z,
+            },
+        }
+
+    def _save(self, db: Session, states: List[Dict[str, Any]], anomalies: List[Dict[str, Any]]) -> None:
+        insert = _upsert(db)
+        if insert is None:
+            for values in states:
+                db.merge(MetricDetectorState(**values))
+            for values in anomalies:
+                db.merge(MetricAnomaly(**values))
+            return
+        if states:
+            stmt = insert(MetricDetectorState.__table__)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=list(_SERIES_KEY),
+                set_={
+                    "state": stmt.excluded.state,
+                    "last_bucket": stmt.excluded.last_bucket,
+                    "last_score": stmt.excluded.last_score,
+                    "updated_at": func.now(),
+                },
+            )
+            db.execute(stmt, states)
+        if anomalies:
+            db.execute(insert(MetricAnomaly.__table__).on_conflict_do_nothing(), anomalies)
+
+    def purge(self, db: Session, now: Optional[datetime] = None) -> int:
+        now = now or datetime.utcnow()
+        cutoff = now - timedelta(days=settings.ANALYTICS_ANOMALY_RETENTION_DAYS)
+        result = db.execute(delete(MetricAnomaly).where(MetricAnomaly.bucket_start < cutoff))
+        db.commit()
+        return result.rowcount or 0
+
+    # ==================== CONSULTA ====================
+
+    def recent_anomalies(
+        self,
+        db: Session,
+        start: datetime,
+        end: datetime,
+        metric_name: Optional[str] = None,
+        tenant_id: Any = None,
+        limit: int = 50,
+    ) -> List[MetricAnomaly]:
+        """Anomalias do período, das mais intensas para as menos"""
+        query = select(MetricAnomaly).where(
+            MetricAnomaly.bucket_start >= start, MetricAnomaly.bucket_start <= end
+        )
+        if metric_name is not None:
+            query = query.where(MetricAnomaly.metric_name == metric_name)
+        if tenant_id is not None:
+            query = query.where(MetricAnomaly.tenant_id == tenant_id)
+        query = query.order_by(func.abs(MetricAnomaly.score).desc(), MetricAnomaly.bucket_start.desc())
+        return list(db.execute(query.limit(limit)).scalars())
+
+    def current_score(
+        self, db: Session, metric_name: str, since: datetime, tenant_id: Any = None
+    ) -> Optional[float]:
+        """
+        Score de maior magnitude entre os últimos buckets fechados da métrica
+        (todas as séries/resoluções atualizadas desde ``since``); usado pelas
+        condições de alerta ``anomaly``
+        """
+        query = select(MetricDetectorState.last_score).where(
+            MetricDetectorState.metric_name == metric_name,
+            MetricDetectorState.last_bucket >= since,
+            MetricDetectorState.last_score.isnot(None),
+        )
+        if tenant_id is not None:
+            query = query.where(MetricDetectorState.tenant_id == tenant_id)
+        scores = list(db.execute(query).scalars())
+        return max(scores, key=abs) if scores else None
+
+    def _series(
+        self,
+        db: Session,
+        resolution: str,
+        start: datetime,
+        end: datetime,
+        metric_name: Optional[str] = None,
+        tenant_id: Any = None,
+    ) -> Dict[str, List[Tuple[datetime, float]]]:
+        """Média por bucket de cada métrica (serviços e tenants somados)"""
+        rollup = MetricRollup
+        query = select(
+            rollup.metric_name,
+            rollup.bucket_start,
+            func.sum(rollup.sum).label("sum"),
+            func.sum(rollup.count).label("count"),
+        ).where(
+            rollup.resolution == resolution,
+            rollup.bucket_start >= start,
+            rollup.bucket_start <= end,
+        )
+        if metric_name is not None:
+            query = query.where(rollup.metric_name == metric_name)
+        if tenant_id is not None:
+            query = query.where(rollup.tenant_id == tenant_id)
+        rows = db.execute(
+            query.group_by(rollup.metric_name, rollup.bucket_start).order_by(
+                rollup.metric_name, rollup.bucket_start
+            )
+        )
+        series: Dict[str, List[Tuple[datetime, float]]] = defaultdict(list)
+        for row in rows:
+            if row.count:
+                series[row.metric_name].append((row.bucket_start, row.sum / row.count))
+        return series
+
+    def detect(
+        self,
+        db: Session,
+        metric_name: str,
+        days: int,
+        sensitivity: Optional[float] = None,
+        tenant_id: Any = None,
+        resolution: str = "1h",
+    ) -> Dict[str, Any]:
+        """
+        Detecção sob demanda (vetorizada) nos últimos ``days`` dias, com o
+        histórico anterior usado para aquecer os estimadores
+        """
+        config = self.config if sensitivity is None else replace(self.config, threshold=sensitivity)
+        end = datetime.utcnow()
+        start = end - timedelta(days=days)
+        warmup = timedelta(seconds=RESOLUTIONS[resolution] * max(config.window, config.min_samples) * 2)
+        points = self._series(db, resolution, start - warmup, end, metric_name, tenant_id).get(metric_name, [])
+
+        buckets = [bucket for bucket, _ in points]
+        scores, state = score_series(
+            [value for _, value in points], [season_slot(bucket, resolution) for bucket in buckets], config
+        )
+        anomalies = [
+            {"bucket_start": bucket.isoformat(), **score.to_dict()}
+            for bucket, score in zip(buckets, scores)
+            if score.is_anomaly and bucket >= start
+        ]
+        last = next((score for score in reversed(scores) if score.expected is not None), None)
+        baseline = last.expected if last else None
+        scale = (state.residual_var if state.residual_count else state.ewm_var) ** 0.5
+        return {
+            "metric": metric_name,
+            "resolution": resolution,
+            "anomalies_detected": len(anomalies),
+            "anomalies": anomalies,
+            "baseline": baseline,
+            "threshold": baseline + config.threshold * scale if baseline is not None else None,
+            "lower_threshold": baseline - config.threshold * scale if baseline is not None else None,
+            "sensitivity": config.threshold,
+            "points": sum(1 for bucket in buckets if bucket >= start),
+        }
+
+    def trends(
+        self,
+        db: Session,
+        start: datetime,
+        end: datetime,
+        tenant_id: Any = None,
+        limit: int = 10,
+    ) -> List[Dict[str, Any]]:
+        """Tendência linear de cada métrica no período (rollup diário, ou horário até 14 dias)"""
+        resolution = "1h" if end - start <= timedelta(days=14) else "1d"
+        trends = []
+        for metric_name, points in self._series(db, resolution, start, end, tenant_id=tenant_id).items():
+            summary = trend_summary([value for _, value in points])
+            if summary is not None:
+                trends.append({"metric": metric_name, "resolution": resolution, **summary})
+        trends.sort(key=lambda item: abs(item["change_percent"] or 0.0), reverse=True)
+        return trends[:limit]
+
+
+metric_anomaly_service = MetricAnomalyService()
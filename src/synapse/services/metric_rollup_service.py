@@ -0,0 +1,422 @@
+"""
+Serviço de Rollups de Métricas
+Mantém buckets pré-agregados (1m/1h/1d) das métricas de performance e monta
+séries para gráficos com número de pontos limitado, independente do volume
+de linhas brutas
+"""
+
+import logging
+import math
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import and_, delete, func, select, tuple_
+from sqlalchemy.orm import Session
+
+from synapse.core.analytics.downsampling import lttb_indices
+from synapse.core.analytics.sketch import QuantileSketch
+from synapse.core.config import settings
+from synapse.models.analytics import SystemPerformanceMetric
+from synapse.models.metric_rollup import MetricRollup, MetricRollupCursor
+
+logger = logging.getLogger(__name__)
+
+# Resoluções da mais fina para a mais grossa (segundos por bucket)
+RESOLUTIONS: Dict[str, int] = {"1m": 60, "1h": 3600, "1d": 86400}
+
+# Por quanto tempo cada resolução é mantida (None = indefinidamente)
+RETENTION: Dict[str, Optional[timedelta]] = {
+    "1m": timedelta(days=2),
+    "1h": timedelta(days=90),
+    "1d": None,
+}
+
+BASIC_STATS = ("avg", "sum", "count", "min", "max")
+PERCENTILE_STATS = {"p50": 0.5, "p75": 0.75, "p90": 0.9, "p95": 0.95, "p99": 0.99}
+
+SOURCE = "system_performance_metrics"
+
+_EPOCH = datetime(1970, 1, 1)
+_ROLLUP_KEY = ("tenant_id", "service", "metric_name", "resolution", "bucket_start")
+
+
+def bucket_start(timestamp: datetime, seconds: int) -> datetime:
+    """Início do bucket de ``seconds`` que contém ``timestamp`` (UTC, sem tzinfo)"""
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.replace(tzinfo=None) - (timestamp.utcoffset() or timedelta())
+    offset = int((timestamp - _EPOCH).total_seconds()) // seconds * seconds
+    return _EPOCH + timedelta(seconds=offset)
+
+
+def choose_resolution(
+    span: timedelta, max_points: int, raw_max_span: Optional[timedelta] = None
+) -> str:
+    """
+    Escolhe a resolução para um intervalo: ``raw`` para intervalos curtos,
+    senão a resolução mais fina cujo número de buckets cabe em ``max_points``
+    (``1d`` quando nenhuma cabe; a série é então reduzida com LTTB).
+    """
+    if raw_max_span is not None and span <= raw_max_span:
+        return "raw"
+    seconds = span.total_seconds()
+    for resolution, size in RESOLUTIONS.items():
+        if math.ceil(seconds / size) <= max_points:
+            return resolution
+    return "1d"
+
+
+@dataclass
+class RollupBucket:
+    """Agregado de um bucket: contadores simples + sketch de quantis"""
+
+    count: int = 0
+    sum: float = 0.0
+    min: Optional[float] = None
+    max: Optional[float] = None
+    sketch: QuantileSketch = field(default_factory=QuantileSketch)
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        self.sum += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+        self.sketch.add(value)
+
+    def merge(self, other: "RollupBucket") -> "RollupBucket":
+        self.count += other.count
+        self.sum += other.sum
+        if other.min is not None:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+        if other.max is not None:
+            self.max = other.max if self.max is None else max(self.max, other.max)
+        self.sketch.merge(other.sketch)
+        return self
+
+    def stat(self, name: str) -> Optional[float]:
+        if name in PERCENTILE_STATS:
+            return self.sketch.quantile(PERCENTILE_STATS[name])
+        if name == "avg":
+            return self.sum / self.count if self.count else None
+        return getattr(self, name)
+
+    @classmethod
+    def from_row(cls, row: Any) -> "RollupBucket":
+        return cls(
+            count=row.count,
+            sum=row.sum,
+            min=row.min,
+            max=row.max,
+            sketch=QuantileSketch.from_dict(row.sketch),
+        )
+
+    def to_values(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "min": self.min,
+            "max": self.max,
+            "sketch": self.sketch.to_dict(),
+        }
+
+
+def accumulate(
+    points: Iterable[Tuple[Any, str, str, datetime, float]],
+    resolutions: Iterable[str] = RESOLUTIONS,
+) -> Dict[Tuple, RollupBucket]:
+    """
+    Agrupa pontos ``(tenant_id, service, metric_name, timestamp, value)`` em
+    buckets de todas as resoluções, indexados por ``_ROLLUP_KEY``
+    """
+    resolutions = [(name, RESOLUTIONS[name]) for name in resolutions]
+    buckets: Dict[Tuple, RollupBucket] = {}
+    for tenant_id, service, metric_name, timestamp, value in points:
+        if value is None:
+            continue
+        value = float(value)
+        for resolution, seconds in resolutions:
+            key = (tenant_id, service, metric_name, resolution, bucket_start(timestamp, seconds))
+            bucket = buckets.get(key)
+            if bucket is None:
+                bucket = buckets[key] = RollupBucket()
+            bucket.add(value)
+    return buckets
+
+
+class MetricRollupService:
+    """
+    Rollups incrementais de system_performance_metrics.
+
+    As linhas brutas são lidas em ordem de id a partir de um cursor persistido
+    e incorporadas aos buckets de 1m/1h/1d na mesma transação que avança o
+    cursor (o cursor é travado com FOR UPDATE, então vários workers não
+    contam a mesma linha duas vezes).
+    """
+
+    def __init__(self, batch_size: Optional[int] = None, safety_lag_seconds: Optional[float] = None):
+        self.batch_size = batch_size or settings.METRIC_ROLLUP_BATCH_SIZE
+        self.safety_lag = (
+            settings.METRIC_ROLLUP_SAFETY_LAG_SECONDS if safety_lag_seconds is None else safety_lag_seconds
+        )
+        # Amostras (instante, maior id visível) para a marca d'água
+        self._samples: deque = deque()
+
+    # ==================== MANUTENÇÃO ====================
+
+    def advance_watermark(self, max_id: Optional[int], now: Optional[float] = None) -> Optional[int]:
+        """
+        Maior id seguro para processar: o maior id visível há pelo menos
+        ``safety_lag`` segundos. Ids são alocados antes do commit, então uma
+        transação lenta pode tornar visível um id menor que outro já
+        processado; esperar a folga antes de avançar o cursor evita pulá-la
+        """
+        if max_id is None or self.safety_lag <= 0:
+            return max_id
+        now = time.monotonic() if now is None else now
+        self._samples.append((now, max_id))
+        cutoff = now - self.safety_lag
+        # Mantém só a amostra mais recente já fora da folga (e as posteriores)
+        while len(self._samples) > 1 and self._samples[1][0] <= cutoff:
+            self._samples.popleft()
+        observed_at, watermark = self._samples[0]
+        return watermark if observed_at <= cutoff else None
+
+    def run_incremental(self, db: Session, max_batches: int = 50) -> int:
+        """Incorpora as linhas novas aos rollups; retorna quantas foram processadas"""
+        watermark = self.advance_watermark(db.execute(select(func.max(SystemPerformanceMetric.id))).scalar())
+        if watermark is None:
+            return 0
+        processed = 0
+        for _ in range(max_batches):
+            count = self._process_batch(db, watermark)
+            db.commit()
+            processed += count
+            if count < self.batch_size:
+                break
+        return processed
+
+    def _lock_cursor(self, db: Session) -> MetricRollupCursor:
+        cursor = db.execute(
+            select(MetricRollupCursor)
+            .where(MetricRollupCursor.source == SOURCE)
+            .with_for_update()
+        ).scalar_one_or_none()
+        if cursor is None:
+            cursor = MetricRollupCursor(source=SOURCE, last_id=0)
+            db.add(cursor)
+            db.flush()
+        return cursor
+
+    def _process_batch(self, db: Session, watermark: int) -> int:
+        cursor = self._lock_cursor(db)
+        metric = SystemPerformanceMetric
+        rows = db.execute(
+            select(
+                metric.id,
+                metric.tenant_id,
+                metric.service,
+                metric.metric_name,
+                metric.timestamp,
+                metric.value,
+            )
+            .where(metric.id > cursor.last_id, metric.id <= watermark)
+            .order_by(metric.id)
+            .limit(self.batch_size)
+        ).all()
+        if not rows:
+            return 0
+
+        self.apply(db, accumulate(row[1:] for row in rows))
+        cursor.last_id = rows[-1].id
+        return len(rows)
+
+    def apply(self, db: Session, buckets: Dict[Tuple, RollupBucket]) -> None:
+        """Mescla os buckets novos com os já gravados e faz upsert do resultado"""
+        if not buckets:
+            return
+        table = MetricRollup.__table__
+        key_columns = [table.c[name] for name in _ROLLUP_KEY]
+        keys = list(buckets)
+
+        for offset in range(0, len(keys), 500):
+            chunk = keys[offset : offset + 500]
+            for row in db.execute(select(table).where(tuple_(*key_columns).in_(chunk))):
+                key = tuple(getattr(row, name) for name in _ROLLUP_KEY)
+                buckets[key] = RollupBucket.from_row(row).merge(buckets[key])
+
+        values = [
+            {**dict(zip(_ROLLUP_KEY, key)), **bucket.to_values()} for key, bucket in buckets.items()
+        ]
+
+        dialect = db.get_bind().dialect.name
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert as upsert
+        elif dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert as upsert
+        else:
+            for value in values:
+                db.merge(MetricRollup(**value))
+            return
+
+        stmt = upsert(table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=list(_ROLLUP_KEY),
+            set_={
+                **{name: stmt.excluded[name] for name in ("count", "sum", "min", "max", "sketch")},
+                "updated_at": func.now(),
+            },
+        )
+        db.execute(stmt, values)
+
+    def purge(self, db: Session, now: Optional[datetime] = None) -> int:
+        """Remove buckets além da retenção de cada resolução"""
+        now = now or datetime.utcnow()
+        deleted = 0
+        for resolution, retention in RETENTION.items():
+            if retention is None:
+                continue
+            result = db.execute(
+                delete(MetricRollup).where(
+                    MetricRollup.resolution == resolution,
+                    MetricRollup.bucket_start < now - retention,
+                )
+            )
+            deleted += result.rowcount or 0
+        db.commit()
+        return deleted
+
+    # ==================== CONSULTA ====================
+
+    def get_series(
+        self,
+        db: Session,
+        metric_name: str,
+        start: datetime,
+        end: datetime,
+        max_points: Optional[int] = None,
+        stat: str = "avg",
+        tenant_id: Any = None,
+        service: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Série de uma métrica no intervalo, com no máximo ``max_points`` pontos.
+
+        Intervalos curtos usam as linhas brutas (apenas timestamp/valor, com
+        limite) reduzidas por LTTB; os demais usam o rollup mais fino que cabe
+        no orçamento de pontos.
+        """
+        if stat not in BASIC_STATS and stat not in PERCENTILE_STATS:
+            raise ValueError(f"Estatística não suportada: {stat}")
+        max_points = max(3, max_points or settings.METRIC_CHART_MAX_POINTS)
+        raw_max_span = timedelta(minutes=settings.METRIC_CHART_RAW_MAX_SPAN_MINUTES)
+
+        resolution = choose_resolution(end - start, max_points, raw_max_span)
+        points = None
+        if resolution == "raw":
+            points = self._raw_points(db, metric_name, start, end, tenant_id, service)
+            if points is None:
+                resolution = choose_resolution(end - start, max_points)
+        if points is None:
+            points = self._rollup_points(
+                db, metric_name, resolution, start, end, stat, tenant_id, service
+            )
+
+        total = len(points)
+        downsampled = total > max_points
+        if downsampled:
+            indices = lttb_indices(
+                [timestamp.timestamp() for timestamp, _ in points],
+                [value for _, value in points],
+                max_points,
+            )
+            points = [points[index] for index in indices]
+
+        return {
+            "data_points": [
+                {"timestamp": timestamp.isoformat(), "value": value} for timestamp, value in points
+            ],
+            "total_points": len(points),
+            "source_points": total,
+            "resolution": resolution,
+            "stat": stat if resolution != "raw" else "value",
+            "downsampled": downsampled,
+        }
+
+    def _filters(self, model, metric_name, tenant_id, service) -> List[Any]:
+        filters = [model.metric_name == metric_name]
+        if tenant_id is not None:
+            filters.append(model.tenant_id == tenant_id)
+        if service is not None:
+            filters.append(model.service == service)
+        return filters
+
+    def _raw_points(self, db, metric_name, start, end, tenant_id, service):
+        """Pontos brutos do intervalo, ou None se excederem o limite de leitura"""
+        metric = SystemPerformanceMetric
+        limit = settings.METRIC_CHART_RAW_POINT_LIMIT
+        rows = db.execute(
+            select(metric.timestamp, metric.value)
+            .where(
+                and_(
+                    *self._filters(metric, metric_name, tenant_id, service),
+                    metric.timestamp >= start,
+                    metric.timestamp <= end,
+                )
+            )
+            .order_by(metric.timestamp)
+            .limit(limit + 1)
+        ).all()
+        if len(rows) > limit:
+            return None
+        return [(row.timestamp, row.value) for row in rows]
+
+    def _rollup_points(self, db, metric_name, resolution, start, end, stat, tenant_id, service):
+        rollup = MetricRollup
+        filters = and_(
+            *self._filters(rollup, metric_name, tenant_id, service),
+            rollup.resolution == resolution,
+            rollup.bucket_start >= bucket_start(start, RESOLUTIONS[resolution]),
+            rollup.bucket_start <= end,
+        )
+
+        if stat in PERCENTILE_STATS:
+            # Sketches de serviços/tenants diferentes no mesmo bucket são mesclados
+            merged: Dict[datetime, RollupBucket] = {}
+            rows = db.execute(
+                select(rollup.bucket_start, rollup.count, rollup.sum, rollup.min, rollup.max, rollup.sketch)
+                .where(filters)
+                .order_by(rollup.bucket_start)
+            )
+            for row in rows:
+                bucket = RollupBucket.from_row(row)
+                if row.bucket_start in merged:
+                    merged[row.bucket_start].merge(bucket)
+                else:
+                    merged[row.bucket_start] = bucket
+            return [(timestamp, bucket.stat(stat)) for timestamp, bucket in merged.items()]
+
+        rows = db.execute(
+            select(
+                rollup.bucket_start,
+                func.sum(rollup.count).label("count"),
+                func.sum(rollup.sum).label("sum"),
+                func.min(rollup.min).label("min"),
+                func.max(rollup.max).label("max"),
+            )
+            .where(filters)
+            .group_by(rollup.bucket_start)
+            .order_by(rollup.bucket_start)
+        ).all()
+        points = []
+        for row in rows:
+            if stat == "avg":
+                value = row.sum / row.count if row.count else None
+            else:
+                value = getattr(row, stat)
+            points.append((row.bucket_start, float(value) if value is not None else None))
+        return points
+
+
+metric_rollup_service = MetricRollupService()
@@ -0,0 +1,445 @@
+"""
+Serviço de Jobs de Relatório
+Executa relatórios fora da requisição: o ``query_config`` é compilado pelo
+query builder, o resultado é lido em lotes (``yield_per``) por um pool de
+workers e gravado em páginas comprimidas via StorageManager. Progresso,
+linhas e bytes ficam em ReportExecution; as páginas são servidas do spool.
+"""
+
+import logging
+import os
+import shutil
+import socket
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from sqlalchemy import or_, select, update
+from sqlalchemy.orm import Session
+
+from synapse.core.analytics.report_query import ReportSource, compile_report_query
+from synapse.core.analytics.spool import (
+    SPOOL_FORMATS,
+    ResultSpool,
+    SpoolManifest,
+    iter_download,
+    read_page,
+)
+from synapse.core.config import settings
+from synapse.models.analytics import SystemPerformanceMetric
+from synapse.models.analytics_event import AnalyticsEvent
+from synapse.models.analytics_report import AnalyticsReport
+from synapse.models.report_execution import ReportExecution
+
+logger = logging.getLogger(__name__)
+
+# Fontes consultáveis por relatórios (``query_config.type``)
+REPORT_SOURCES: Dict[str, ReportSource] = {
+    "events": ReportSource(
+        table=AnalyticsEvent.__table__,
+        columns=(
+            "event_id",
+            "event_type",
+            "category",
+            "action",
+            "label",
+            "user_id",
+            "session_id",
+            "page_url",
+            "referrer",
+            "value",
+            "workspace_id",
+            "project_id",
+            "workflow_id",
+            "country",
+            "city",
+            "device_type",
+            "os",
+            "browser",
+            "timestamp",
+        ),
+        default_columns=("event_id", "event_type", "action", "user_id", "value", "timestamp"),
+    ),
+    "metrics": ReportSource(
+        table=SystemPerformanceMetric.__table__,
+        columns=("metric_name", "metric_type", "service", "environment", "value", "unit", "timestamp"),
+        default_columns=("metric_name", "service", "value", "unit", "timestamp"),
+    ),
+}
+
+SPOOL_DIRECTORY = "reports"
+
+
+def _default_session_factory() -> Session:
+    from synapse.database import SessionLocal
+
+    return SessionLocal()
+
+
+def _default_storage_root() -> Path:
+    from synapse.core.storage.storage_manager import storage_manager
+
+    return storage_manager.base_path
+
+
+def worker_identity() -> str:
+    """Identifica este processo como dono das execuções que ele agenda"""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def estimate_rows(db: Session, statement) -> Optional[int]:
+    """Estimativa do planner do PostgreSQL (usada só para o percentual de progresso)"""
+    bind = db.get_bind()
+    if bind.dialect.name != "postgresql":
+        return None
+    try:
+        compiled = statement.compile(dialect=bind.dialect)
+        # Savepoint: um EXPLAIN com erro não pode abortar a transação do streaming
+        with db.begin_nested():
+            plan = db.connection().exec_driver_sql(
+                f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params
+            ).scalar()
+        return int(plan[0]["Plan"]["Plan Rows"])
+    except Exception as e:
+        logger.debug(f"Não foi possível estimar as linhas do relatório: {e}")
+        return None
+
+
+def execution_status(execution: ReportExecution) -> Dict[str, Any]:
+    manifest = execution.result_data or {}
+    return {
+        "execution_id": str(execution.id),
+        "report_id": str(execution.report_id),
+        "status": execution.status,
+        "progress": execution.progress,
+        "rows_processed": execution.rows_processed or 0,
+        "data_size_bytes": execution.data_size_bytes or 0,
+        "format": execution.result_format,
+        "pages": len(manifest.get("pages", [])),
+        "columns": manifest.get("columns", []),
+        "started_at": execution.started_at.isoformat() if execution.started_at else None,
+        "completed_at": execution.completed_at.isoformat() if execution.completed_at else None,
+        "execution_time_ms": execution.execution_time_ms,
+        "error_message": execution.error_message,
+    }
+
+
+class ReportJobService:
+    """
+    Fila de execuções de relatório.
+
+    Cada job usa duas sessões: uma mantém o cursor de streaming aberto (um
+    commit fecharia o cursor do servidor) e a outra grava progresso a cada
+    página.
+
+    As execuções ficam em nome de ``worker_id`` e uma thread renova o
+    ``heartbeat_at`` de todas elas; só execuções sem heartbeat há mais de
+    ``stale_after`` são dadas como interrompidas.
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        page_size: Optional[int] = None,
+        session_factory: Callable[[], Session] = _default_session_factory,
+        storage_root: Optional[Path] = None,
+        sources: Optional[Dict[str, ReportSource]] = None,
+        worker_id: Optional[str] = None,
+        stale_after: Optional[timedelta] = None,
+    ):
+        self.workers = workers or settings.REPORT_WORKER_CONCURRENCY
+        self.page_size = page_size or settings.REPORT_PAGE_SIZE
+        self.session_factory = session_factory
+        self._storage_root = storage_root
+        self.sources = sources or REPORT_SOURCES
+        self.worker_id = worker_id or worker_identity()
+        self.stale_after = stale_after or timedelta(seconds=settings.REPORT_JOB_STALE_SECONDS)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._stopping: Optional[threading.Event] = None
+        self._lock = threading.Lock()
+
+    @property
+    def storage_root(self) -> Path:
+        if self._storage_root is None:
+            self._storage_root = _default_storage_root()
+        return self._storage_root
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="report-job"
+                )
+                self._stopping = threading.Event()
+                threading.Thread(
+                    target=self._heartbeat_loop,
+                    args=(self._stopping,),
+                    name="report-job-heartbeat",
+                    daemon=True,
+                ).start()
+            return self._executor
+
+    def _heartbeat_loop(self, stopping: threading.Event) -> None:
+        interval = self.stale_after.total_seconds() / 4
+        while not stopping.wait(interval):
+            try:
+                self.heartbeat()
+            except Exception as e:
+                logger.warning(f"Falha ao renovar o heartbeat dos jobs de relatório: {e}")
+
+    def heartbeat(self) -> int:
+        """Renova ``heartbeat_at`` das execuções pendentes deste processo"""
+        db = self.session_factory()
+        try:
+            result = db.execute(
+                update(ReportExecution)
+                .where(
+                    ReportExecution.worker_id == self.worker_id,
+                    ReportExecution.status.in_(("queued", "running")),
+                )
+                .values(heartbeat_at=datetime.now(timezone.utc))
+            )
+            db.commit()
+            return result.rowcount or 0
+        finally:
+            db.close()
+
+    # ==================== SUBMISSÃO ====================
+
+    def submit(
+        self,
+        db: Session,
+        report: AnalyticsReport,
+        user_id: Any,
+        parameters: Optional[Dict[str, Any]] = None,
+        fmt: Optional[str] = None,
+        execution_type: str = "api",
+    ) -> ReportExecution:
+        """Valida a consulta, registra a execução como ``queued`` e agenda no pool"""
+        fmt = fmt or settings.REPORT_DEFAULT_FORMAT
+        if fmt not in SPOOL_FORMATS:
+            raise ValueError(f"Formato de resultado não suportado: {fmt}")
+        # Erros de configuração aparecem na requisição, não só no job
+        compile_report_query(self._query_config(report, parameters), self.sources, report.tenant_id)
+
+        execution = ReportExecution(
+            id=uuid.uuid4(),
+            report_id=report.id,
+            user_id=user_id,
+            execution_type=execution_type,
+            parameters=parameters or {},
+            status="queued",
+            result_format=fmt,
+            progress=0.0,
+            rows_processed=0,
+            started_at=datetime.now(timezone.utc),
+            worker_id=self.worker_id,
+            heartbeat_at=datetime.now(timezone.utc),
+            tenant_id=report.tenant_id,
+        )
+        db.add(execution)
+        db.commit()
+        db.refresh(execution)
+
+        self._get_executor().submit(self.run, execution.id)
+        return execution
+
+    @staticmethod
+    def _query_config(report: AnalyticsReport, parameters: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        config = dict(report.report_query or {})
+        for key, value in (parameters or {}).items():
+            if key == "filters":
+                config["filters"] = {**(config.get("filters") or {}), **value}
+            else:
+                config[key] = value
+        return config
+
+    # ==================== EXECUÇÃO ====================
+
+    def run(self, execution_id: Any) -> None:
+        """Executa um job (thread do pool)"""
+        status_db = self.session_factory()
+        stream_db = self.session_factory()
+        spool = None
+        started = datetime.now(timezone.utc)
+        try:
+            execution = status_db.get(ReportExecution, execution_id)
+            if execution is None or execution.status != "queued":
+                return
+            report = status_db.get(AnalyticsReport, execution.report_id)
+            execution.status = "running"
+            execution.started_at = started
+            execution.worker_id = self.worker_id
+            execution.heartbeat_at = started
+            status_db.commit()
+
+            compiled = compile_report_query(
+                self._query_config(report, execution.parameters), self.sources, report.tenant_id
+            )
+            estimate = estimate_rows(stream_db, compiled.statement)
+            spool = ResultSpool(
+                self.storage_root,
+                f"{SPOOL_DIRECTORY}/{execution.id}",
+                compiled.columns,
+                execution.result_format or settings.REPORT_DEFAULT_FORMAT,
+            )
+
+            result = stream_db.execute(compiled.statement.execution_options(yield_per=self.page_size))
+            for rows in result.partitions(self.page_size):
+                spool.write_page(rows)
+                rows_done = spool.manifest.rows
+                execution.rows_processed = rows_done
+                execution.data_size_bytes = spool.manifest.bytes
+                execution.result_data = spool.manifest.to_dict()
+                if estimate:
+                    execution.progress = round(min(99.0, rows_done / estimate * 100), 1)
+                status_db.commit()
+
+            finished = datetime.now(timezone.utc)
+            execution.status = "completed"
+            execution.progress = 100.0
+            execution.result_data = spool.manifest.to_dict()
+            execution.rows_processed = spool.manifest.rows
+            execution.data_size_bytes = spool.manifest.bytes
+            execution.completed_at = finished
+            execution.execution_time_ms = int((finished - started).total_seconds() * 1000)
+            status_db.commit()
+            logger.info(
+                f"Relatório {execution.report_id} concluído: {spool.manifest.rows} linhas, "
+                f"{len(spool.manifest.pages)} páginas"
+            )
+        except Exception as e:
+            logger.error(f"Falha na execução de relatório {execution_id}: {e}")
+            status_db.rollback()
+            if spool is not None:
+                spool.discard()
+            finished = datetime.now(timezone.utc)
+            status_db.execute(
+                update(ReportExecution)
+                .where(ReportExecution.id == execution_id)
+                .values(
+                    status="failed",
+                    error_message=str(e)[:2000],
+                    result_data=None,
+                    completed_at=finished,
+                    execution_time_ms=int((finished - started).total_seconds() * 1000),
+                )
+            )
+            status_db.commit()
+        finally:
+            stream_db.close()
+            status_db.close()
+
+    # ==================== RESULTADOS ====================
+
+    def get_execution(self, db: Session, execution_id: Any, user_id: Any) -> Optional[ReportExecution]:
+        try:
+            execution_id = uuid.UUID(str(execution_id))
+        except ValueError:
+            return None
+        return db.execute(
+            select(ReportExecution).where(
+                ReportExecution.id == execution_id, ReportExecution.user_id == user_id
+            )
+        ).scalar_one_or_none()
+
+    def list_executions(
+        self, db: Session, report_id: Any, user_id: Any, limit: int = 10, offset: int = 0
+    ) -> List[ReportExecution]:
+        return list(
+            db.execute(
+                select(ReportExecution)
+                .where(ReportExecution.report_id == report_id, ReportExecution.user_id == user_id)
+                .order_by(ReportExecution.started_at.desc())
+                .limit(limit)
+                .offset(offset)
+            ).scalars()
+        )
+
+    def read_page(self, execution: ReportExecution, page: int) -> Dict[str, Any]:
+        """Uma página do resultado; páginas já gravadas podem ser lidas durante a execução"""
+        if not execution.result_data:
+            raise LookupError("A execução ainda não tem resultados")
+        manifest = SpoolManifest.from_dict(execution.result_data)
+        rows = read_page(self.storage_root, manifest, page)
+        return {
+            "execution_id": str(execution.id),
+            "status": execution.status,
+            "page": page,
+            "total_pages": len(manifest.pages),
+            "total_rows": manifest.rows,
+            "columns": manifest.columns,
+            "rows": rows,
+        }
+
+    def download(self, execution: ReportExecution) -> tuple[Iterator[bytes], str]:
+        """(bytes, nome do arquivo) do resultado completo, comprimido com gzip"""
+        if execution.status != "completed" or not execution.result_data:
+            raise LookupError("A execução não foi concluída")
+        manifest = SpoolManifest.from_dict(execution.result_data)
+        suffix = SPOOL_FORMATS[manifest.format]
+        return iter_download(self.storage_root, manifest), f"report-{execution.id}{suffix}"
+
+    # ==================== MANUTENÇÃO ====================
+
+    def recover_interrupted(self, db: Session, now: Optional[datetime] = None) -> int:
+        """
+        Execuções na fila/rodando cujo processo parou de dar sinal de vida;
+        jobs vivos de outros workers têm heartbeat recente e não são tocados
+        """
+        now = now or datetime.now(timezone.utc)
+        result = db.execute(
+            update(ReportExecution)
+            .where(
+                ReportExecution.status.in_(("queued", "running")),
+                or_(
+                    ReportExecution.heartbeat_at.is_(None),
+                    ReportExecution.heartbeat_at < now - self.stale_after,
+                ),
+            )
+            .values(
+                status="failed",
+                error_message="Execução interrompida: o worker parou de responder",
+                completed_at=now,
+            )
+        )
+        db.commit()
+        return result.rowcount or 0
+
+    def purge(self, db: Session, days: Optional[int] = None) -> int:
+        """Remove spools de execuções antigas"""
+        days = days if days is not None else settings.REPORT_SPOOL_RETENTION_DAYS
+        cutoff = datetime.now(timezone.utc) - timedelta(days=days)
+        expired = list(
+            db.execute(
+                select(ReportExecution.id).where(
+                    ReportExecution.status == "completed",
+                    ReportExecution.completed_at < cutoff,
+                )
+            ).scalars()
+        )
+        for execution_id in expired:
+            shutil.rmtree(self.storage_root / SPOOL_DIRECTORY / str(execution_id), ignore_errors=True)
+        if expired:
+            db.execute(
+                update(ReportExecution)
+                .where(ReportExecution.id.in_(expired))
+                .values(result_data=None, status="expired")
+            )
+            db.commit()
+        return len(expired)
+
+    def shutdown(self, wait: bool = True, cancel_pending: bool = False) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+            stopping, self._stopping = self._stopping, None
+        if stopping is not None:
+            stopping.set()
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=cancel_pending)
+
+
+report_job_service = ReportJobService()
@@ -27,6 +27,7 @@ from synapse.models.template import (
     TemplateLicense,
 )
 from synapse.models import Workflow, Node, User
+from synapse.services.counter_service import TEMPLATE, counter_service
 from synapse.schemas.template import (
     TemplateCreate,
     TemplateUpdate,
@@ -499,13 +500,14 @@ class TemplateService:
             )
 
             db.add(download)
-
-            # Incrementa contador
-            template.download_count += 1
-            template.last_used_at = datetime.utcnow()
-
             await db.commit()
 
+            # Contadores acumulados e gravados em lote (sem travar a linha),
+            # só depois que o download foi gravado
+            counter_service.increment(
+                TEMPLATE, template.id, touch=True, download_count=1, downloads_count=1
+            )
+
             self.logger.info(
                 f"✅ Download do template {template_id} registrado para usuário {user_id}"
             )
@@ -603,13 +605,12 @@ class TemplateService:
             )
 
             db.add(usage)
-
-            # Incrementa contador de uso
-            template.usage_count += 1
-            template.last_used_at = datetime.utcnow()
-
             await db.commit()
 
+            # Contador de uso acumulado e gravado em lote (sem travar a linha),
+            # só depois que a instalação foi gravada
+            counter_service.increment(TEMPLATE, template.id, touch=True, usage_count=1)
+
             self.logger.info(
                 f"✅ Template {template.id} instalado como workflow {new_workflow.id}"
             )
@@ -1004,33 +1005,54 @@ class TemplateService:
         self, db: AsyncSession, limit: int = 5
     ) -> List[Dict[str, Any]]:
         """
-        Obtém templates em tendência baseado em downloads recentes
+        Obtém templates em tendência pelo score com decaimento dos contadores
+        de downloads e uso; sem dados de tendência (ex.: logo após o deploy),
+        completa com os mais baixados dos últimos 7 dias
         """
         try:
-            # Últimos 7 dias
-            recent_date = datetime.utcnow() - timedelta(days=7)
-
-            result = await db.execute(
-                select(WorkflowTemplate)
-                .where(
-                    and_(
+            ranked = await counter_service.trending(TEMPLATE, limit * 3)
+            scores = {key: score for key, score in ranked}
+
+            templates = []
+            if scores:
+                result = await db.execute(
+                    select(WorkflowTemplate).where(
+                        WorkflowTemplate.id.in_([uuid.UUID(key) for key in scores]),
                         WorkflowTemplate.status == TemplateStatus.PUBLISHED.value,
-                        WorkflowTemplate.created_at >= recent_date,
                     )
                 )
-                .order_by(
-                    desc(WorkflowTemplate.downloads), desc(WorkflowTemplate.rating)
+                templates = sorted(
+                    result.scalars().all(),
+                    key=lambda template: scores[str(template.id)],
+                    reverse=True,
+                )[:limit]
+
+            if len(templates) < limit:
+                recent_date = datetime.utcnow() - timedelta(days=7)
+                result = await db.execute(
+                    select(WorkflowTemplate)
+                    .where(
+                        and_(
+                            WorkflowTemplate.status == TemplateStatus.PUBLISHED.value,
+                            WorkflowTemplate.created_at >= recent_date,
+                            WorkflowTemplate.id.notin_([t.id for t in templates]),
+                        )
+                    )
+                    .order_by(
+                        desc(WorkflowTemplate.downloads_count),
+                        desc(WorkflowTemplate.rating_average),
+                    )
+                    .limit(limit - len(templates))
                 )
-                .limit(limit)
-            )
-            templates = result.scalars().all()
+                templates.extend(result.scalars().all())
 
             return [
                 {
                     "id": template.id,
                     "name": template.name,
-                    "downloads": template.downloads,
-                    "rating": template.rating,
+                    "downloads": template.downloads_count,
+                    "rating": float(template.rating_average or 0),
+                    "trending_score": round(scores.get(str(template.id), 0.0), 4),
                 }
                 for template in templates
             ]
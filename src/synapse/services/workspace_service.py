@@ -30,6 +30,7 @@ from synapse.models.workspace_project import WorkspaceProject
 from synapse.models.project_collaborator import ProjectCollaborator
 from synapse.models.project_comment import ProjectComment
 from synapse.schemas.user_features import SubscriptionStatus
+from synapse.services.authorization_service import authorization_engine
 
 logger = logging.getLogger(__name__)
 
@@ -1564,48 +1565,14 @@ class WorkspaceService:
         return collaborator
 
     def _has_permission(self, workspace_id: str, user_id: str, permission: str) -> bool:
-        """Verifica se usuário tem permissão específica"""
-        # Owner sempre tem todas as permissões
-        workspace = self.get_workspace_by_id(workspace_id)
-        if workspace and str(workspace.owner_id) == str(user_id):
-            return True
-
-        # Verificar membership
-        member = (
-            self.db.query(WorkspaceMember)
-            .filter(
-                WorkspaceMember.workspace_id == workspace_id,
-                WorkspaceMember.user_id == user_id,
-                WorkspaceMember.status == "active",
-            )
-            .first()
+        """Verifica se usuário tem permissão específica (dono tem todas)"""
+        return authorization_engine.has_workspace_permission(
+            self.db, workspace_id, user_id, permission
         )
 
-        if not member:
-            return False
-
-        # Mapear permissões por role
-        permissions_map = {
-            WorkspaceRole.ADMIN: ["read", "write", "admin"],
-            WorkspaceRole.MEMBER: ["read", "write"],
-            WorkspaceRole.VIEWER: ["read"],
-        }
-
-        allowed_permissions = permissions_map.get(member.role, [])
-        return permission in allowed_permissions
-
     def _is_workspace_member(self, workspace_id: str, user_id: str) -> bool:
-        """Verifica se usuário é membro do workspace"""
-        return (
-            self.db.query(WorkspaceMember)
-            .filter(
-                WorkspaceMember.workspace_id == workspace_id,
-                WorkspaceMember.user_id == user_id,
-                WorkspaceMember.status == "active",
-            )
-            .first()
-            is not None
-        )
+        """Verifica se usuário é membro ativo do workspace"""
+        return authorization_engine.is_workspace_member(self.db, workspace_id, user_id)
 
     def _can_edit_project(self, project_id: str, user_id: str) -> bool:
         """Verifica se usuário pode editar projeto"""
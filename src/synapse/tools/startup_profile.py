@@ -0,0 +1,182 @@
+"""
+Perfil de tempo de import no startup.
+
+Importa o módulo alvo num interpretador novo com ``-X importtime`` (import a
+frio, sem nada em cache em ``sys.modules``) e mostra os módulos mais caros.
+
+Usage:
+    python -m synapse.tools.startup_profile
+    python -m synapse.tools.startup_profile --top 40 --filter synapse
+    python -m synapse.tools.startup_profile --budget 3.0      # exit 1 se exceder
+    python -m synapse.tools.startup_profile --routers         # custo de cada router
+    python -m synapse.tools.startup_profile --json
+"""
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional
+
+DEFAULT_TARGET = "synapse.main"
+
+_IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$")
+
+
+@dataclass
+class ImportRecord:
+    """Uma linha do ``-X importtime`` (tempos em segundos)"""
+
+    module: str
+    self_seconds: float
+    cumulative_seconds: float
+    depth: int
+
+
+@dataclass
+class StartupProfile:
+    target: str
+    wall_seconds: float
+    import_seconds: float
+    modules: int
+    records: List[ImportRecord]
+    loaded: List[str]
+
+    def top(self, count: int, key: str = "cumulative", prefix: Optional[str] = None) -> List[ImportRecord]:
+        records = [r for r in self.records if prefix is None or r.module.startswith(prefix)]
+        attribute = "cumulative_seconds" if key == "cumulative" else "self_seconds"
+        return sorted(records, key=lambda r: getattr(r, attribute), reverse=True)[:count]
+
+
+def parse_importtime(output: str) -> List[ImportRecord]:
+    records = []
+    for line in output.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            records.append(
+                ImportRecord(
+                    module=module,
+                    self_seconds=int(self_us) / 1e6,
+                    cumulative_seconds=int(cumulative_us) / 1e6,
+                    depth=max(0, (len(indent) - 1) // 2),
+                )
+            )
+    return records
+
+
+def profile_import(target: str = DEFAULT_TARGET, env: Optional[Dict[str, str]] = None) -> StartupProfile:
+    """Mede o import a frio de ``target`` num subprocesso"""
+    code = (
+        "import json, sys, time\n"
+        "start = time.perf_counter()\n"
+        f"import {target}\n"
+        "wall = time.perf_counter() - start\n"
+        "print('@@PROFILE@@' + json.dumps({'wall': wall, 'loaded': sorted(sys.modules)}))\n"
+    )
+    # O subprocesso precisa enxergar os mesmos pacotes que o processo pai
+    # (ex.: ``pythonpath`` do pytest.ini não chega pelo ambiente)
+    process_env = {**os.environ, "PYTHONPATH": os.pathsep.join(sys.path), **(env or {})}
+    process_env.setdefault("PYTHONDONTWRITEBYTECODE", "0")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        env=process_env,
+    )
+    marker = next((line for line in result.stdout.splitlines() if line.startswith("@@PROFILE@@")), None)
+    if result.returncode != 0 or marker is None:
+        raise RuntimeError(f"Falha ao importar {target}:\n{result.stderr[-4000:]}")
+
+    data = json.loads(marker[len("@@PROFILE@@"):])
+    records = parse_importtime(result.stderr)
+    root = next((r for r in records if r.module == target), None)
+    return StartupProfile(
+        target=target,
+        wall_seconds=data["wall"],
+        import_seconds=root.cumulative_seconds if root else data["wall"],
+        modules=len(records),
+        records=records,
+        loaded=data["loaded"],
+    )
+
+
+def profile_routers() -> Dict[str, float]:
+    """Tempo de import de cada router do manifesto, na ordem do manifesto, após o startup"""
+    from synapse import main
+
+    loader = main.router_loader
+    if loader is None:
+        return {}
+    loader.load_all()
+    return dict(loader.load_times)
+
+
+def _print_table(title: str, records: List[ImportRecord], total: float) -> None:
+    print(f"\n{title}")
+    print(f"{'cumulativo':>12} {'próprio':>10} {'%':>6}  módulo")
+    for record in records:
+        share = record.cumulative_seconds / total * 100 if total else 0
+        print(
+            f"{record.cumulative_seconds * 1000:>10.1f}ms {record.self_seconds * 1000:>8.1f}ms "
+            f"{share:>5.1f}%  {'  ' * min(record.depth, 8)}{record.module}"
+        )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m synapse.tools.startup_profile",
+        description="Perfil do tempo de import a frio da aplicação",
+    )
+    parser.add_argument("--target", default=DEFAULT_TARGET, help="módulo a importar (padrão: synapse.main)")
+    parser.add_argument("--top", type=int, default=25, help="quantidade de módulos listados")
+    parser.add_argument("--filter", default=None, help="listar apenas módulos com este prefixo")
+    parser.add_argument("--budget", type=float, default=None, help="falhar (exit 1) se o import exceder N segundos")
+    parser.add_argument("--routers", action="store_true", help="medir também o import de cada router da API")
+    parser.add_argument("--json", action="store_true", help="saída em JSON")
+    args = parser.parse_args(argv)
+
+    profile = profile_import(args.target)
+    routers = profile_routers() if args.routers else {}
+    over_budget = args.budget is not None and profile.import_seconds > args.budget
+
+    if args.json:
+        print(
+            json.dumps(
+                {
+                    "target": profile.target,
+                    "import_seconds": profile.import_seconds,
+                    "wall_seconds": profile.wall_seconds,
+                    "modules": profile.modules,
+                    "budget_seconds": args.budget,
+                    "over_budget": over_budget,
+                    "top_cumulative": [asdict(r) for r in profile.top(args.top, "cumulative", args.filter)],
+                    "top_self": [asdict(r) for r in profile.top(args.top, "self", args.filter)],
+                    "routers": routers,
+                },
+                indent=2,
+            )
+        )
+    else:
+        print(
+            f"import {profile.target}: {profile.import_seconds:.3f}s "
+            f"({profile.modules} módulos, {profile.wall_seconds:.3f}s de relógio)"
+        )
+        _print_table("Maior tempo cumulativo", profile.top(args.top, "cumulative", args.filter), profile.import_seconds)
+        _print_table("Maior tempo próprio", profile.top(args.top, "self", args.filter), profile.import_seconds)
+        if routers:
+            print(f"\nRouters da API (import sob demanda, total {sum(routers.values()):.3f}s)")
+            for module, seconds in sorted(routers.items(), key=lambda item: item[1], reverse=True):
+                print(f"{seconds * 1000:>10.1f}ms  {module}")
+        if args.budget is not None:
+            status = "EXCEDIDO" if over_budget else "ok"
+            print(f"\nOrçamento: {profile.import_seconds:.3f}s / {args.budget:.3f}s — {status}")
+
+    return 1 if over_budget else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,762 @@
+"""
+Harness de benchmark e replay do ExecutionEngine
+
+Sintetiza workflows com formato configurável (cadeia, fan-out, diamante, de
+poucos a milhares de nós) e os executa por
+``ExecutionService.create_and_start_execution`` contra SQLite (padrão) ou um
+PostgreSQL local (``BENCHMARK_DATABASE_URL``). Nós HTTP e LLM usam
+executores simulados com distribuições de latência determinísticas (seed);
+nós de transformação rodam o executor real. Reporta vazão, espera até o
+primeiro nó, overhead de escalonamento por nó e comandos SQL por execução,
+em JSON para acompanhamento de tendência.
+
+Também grava uma execução real (entradas, configuração, saídas e duração de
+cada nó, lidas do banco) e a reexecuta offline, servindo as saídas gravadas.
+
+Uso:
+    PYTHONPATH=src python tests/benchmarks/replay_harness.py run --shape diamond --nodes 1000
+    PYTHONPATH=src python tests/benchmarks/replay_harness.py record <execution_id> -o execucao.json
+    PYTHONPATH=src python tests/benchmarks/replay_harness.py replay execucao.json --speed 0
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import math
+import os
+import platform
+import random
+import re
+import statistics
+import tempfile
+import time
+import uuid
+from collections import Counter, defaultdict
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.schema import CreateColumn
+
+from synapse.core.executors import (
+    BaseExecutor,
+    ExecutorRegistry,
+    ExecutorType,
+    TransformExecutor,
+)
+from synapse.core.executors.outputs import ExecutionOutputStore, get_output_store
+from synapse.models.node import Node
+from synapse.models.node_execution import NodeExecution
+from synapse.models.workflow import Workflow
+from synapse.models.workflow_connection import WorkflowConnection
+from synapse.models.workflow_execution import WorkflowExecution
+from synapse.models.workflow_execution_daily_stat import WorkflowExecutionDailyStat
+from synapse.models.workflow_execution_metric import WorkflowExecutionMetric
+from synapse.models.workflow_execution_queue import WorkflowExecutionQueue
+from synapse.models.workflow_node import WorkflowNode
+from synapse.schemas.workflow_execution import ExecutionCreate
+from synapse.services.execution_plan_service import ExecutionPlanCache
+from synapse.services.execution_service import ExecutionEngine, ExecutionService
+
+RESULTS_FORMAT = 1
+RECORDING_FORMAT = 1
+SHAPES = ("chain", "fan_out", "diamond")
+
+# Tabelas usadas pela criação e execução (SQLite)
+MODELS = (
+    Node,
+    Workflow,
+    WorkflowNode,
+    WorkflowConnection,
+    WorkflowExecution,
+    NodeExecution,
+    WorkflowExecutionQueue,
+    WorkflowExecutionMetric,
+    WorkflowExecutionDailyStat,
+)
+
+
+@compiles(JSONB, "sqlite")
+def _jsonb_on_sqlite(element, compiler, **kw):
+    return "JSON"
+
+
+@compiles(CreateColumn, "sqlite")
+def _column_on_sqlite(element, compiler, **kw):
+    # Defaults do schema PostgreSQL com cast (ex.: 'draft'::character varying)
+    return re.sub(r"::[a-z][a-z ]*[a-z]", "", compiler.visit_create_column(element, **kw))
+
+
+# ----------------------------------------------------------------------
+# Latência simulada
+# ----------------------------------------------------------------------
+
+
+@dataclass
+class LatencyModel:
+    """
+    Distribuição de latência de um tipo de nó. ``spread`` depende do tipo:
+    amplitude (± ms) na uniforme, desvio padrão (ms) na normal e sigma na
+    lognormal (``mean_ms`` é a mediana); ignorado em fixed/exponential
+    """
+
+    kind: str = "fixed"
+    mean_ms: float = 0.0
+    spread: float = 0.0
+    failure_rate: float = 0.0
+
+    KINDS = ("fixed", "uniform", "normal", "lognormal", "exponential")
+
+    def __post_init__(self):
+        if self.kind not in self.KINDS:
+            raise ValueError(f"Distribuição desconhecida: {self.kind} (use {', '.join(self.KINDS)})")
+
+    @classmethod
+    def parse(cls, text: str) -> "LatencyModel":
+        """``tipo:media_ms[:spread[:taxa_de_falha]]``, ex.: ``lognormal:20:0.5``"""
+        kind, *numbers = text.split(":")
+        return cls(kind, *(float(number) for number in numbers))
+
+    def sample(self, rng: random.Random) -> float:
+        """Latência em segundos"""
+        if self.kind == "uniform":
+            value = rng.uniform(self.mean_ms - self.spread, self.mean_ms + self.spread)
+        elif self.kind == "normal":
+            value = rng.gauss(self.mean_ms, self.spread)
+        elif self.kind == "lognormal":
+            value = rng.lognormvariate(math.log(self.mean_ms), self.spread) if self.mean_ms > 0 else 0.0
+        elif self.kind == "exponential":
+            value = rng.expovariate(1 / self.mean_ms) if self.mean_ms > 0 else 0.0
+        else:
+            value = self.mean_ms
+        return max(value, 0.0) / 1000
+
+    def fails(self, rng: random.Random) -> bool:
+        return self.failure_rate > 0 and rng.random() < self.failure_rate
+
+
+DEFAULT_LATENCIES = {
+    "http": LatencyModel("lognormal", 5.0, 0.5),
+    "llm": LatencyModel("lognormal", 20.0, 0.5),
+}
+
+
+# ----------------------------------------------------------------------
+# Executores simulados, de replay e instrumentação
+# ----------------------------------------------------------------------
+
+
+class Probe:
+    """Tempo dentro dos executores por execução (início do primeiro nó e tempo ocupado)"""
+
+    def __init__(self):
+        self.first_start: Dict[str, float] = {}
+        self.busy: Dict[str, float] = defaultdict(float)
+        self.injected: Dict[str, float] = defaultdict(float)
+        self.calls = 0
+
+
+class TimedExecutor(BaseExecutor):
+    """Envolve um executor e mede o tempo gasto nele; o restante é overhead da engine"""
+
+    def __init__(self, inner: BaseExecutor, probe: Probe):
+        super().__init__(inner.executor_type)
+        self.inner = inner
+        self.probe = probe
+
+    def get_supported_node_types(self) -> List[str]:
+        return self.inner.get_supported_node_types()
+
+    def validate_config(self, config: Dict[str, Any]) -> Dict[str, Any]:
+        return self.inner.validate_config(config)
+
+    async def execute(self, node, context, node_execution) -> Dict[str, Any]:
+        start = time.perf_counter()
+        self.probe.first_start.setdefault(context.execution_id, start)
+        try:
+            return await self.inner.execute(node, context, node_execution)
+        finally:
+            self.probe.busy[context.execution_id] += time.perf_counter() - start
+            self.probe.calls += 1
+
+
+class SimulatedExecutor(BaseExecutor):
+    """Executor HTTP/LLM sem rede: espera uma latência sorteada e devolve uma saída determinística"""
+
+    def __init__(self, executor_type: ExecutorType, latency: LatencyModel, seed: int, probe: Probe):
+        super().__init__(executor_type)
+        self.latency = latency
+        self.rng = random.Random(f"{seed}:{executor_type.value}")
+        self.probe = probe
+
+    def validate_config(self, config: Dict[str, Any]) -> Dict[str, Any]:
+        return {"is_valid": True, "errors": []}
+
+    async def execute(self, node, context, node_execution) -> Dict[str, Any]:
+        delay = self.latency.sample(self.rng)
+        failed = self.latency.fails(self.rng)
+        self.probe.injected[context.execution_id] += delay
+        await asyncio.sleep(delay)
+        if failed:
+            return {"success": False, "error": f"Falha simulada em {node.key}"}
+        if self.executor_type == ExecutorType.LLM:
+            output = {"content": f"resposta de {node.key}", "usage": {"total_tokens": 32}}
+        else:
+            output = {"status_code": 200, "body": {"node": node.key, "input": context.input_data}}
+        return {"success": True, "output": output}
+
+
+class ReplayExecutor(BaseExecutor):
+    """Serve as saídas gravadas por chave do nó, com a duração gravada vezes ``speed``"""
+
+    def __init__(self, node_types: Iterable[str], nodes: Dict[str, Dict[str, Any]], speed: float, probe: Probe):
+        super().__init__(ExecutorType.TRANSFORM)
+        self.node_types = sorted(set(node_types))
+        self.nodes = nodes
+        self.speed = speed
+        self.probe = probe
+
+    def get_supported_node_types(self) -> List[str]:
+        return self.node_types
+
+    def validate_config(self, config: Dict[str, Any]) -> Dict[str, Any]:
+        return {"is_valid": True, "errors": []}
+
+    async def execute(self, node, context, node_execution) -> Dict[str, Any]:
+        recorded = self.nodes[node.key]
+        delay = (recorded.get("duration_ms") or 0) / 1000 * self.speed
+        self.probe.injected[context.execution_id] += delay
+        if delay:
+            await asyncio.sleep(delay)
+        if recorded.get("error"):
+            return {"success": False, "error": recorded["error"]}
+        return {"success": True, "output": recorded.get("output")}
+
+
+def build_registry(latencies: Dict[str, LatencyModel], seed: int, probe: Probe) -> ExecutorRegistry:
+    """Executores simulados para HTTP/LLM e o real para transformações, todos medidos"""
+    registry = ExecutorRegistry()
+    registry.register(TimedExecutor(TransformExecutor(), probe))
+    for name, latency in latencies.items():
+        registry.register(TimedExecutor(SimulatedExecutor(ExecutorType(name), latency, seed, probe), probe))
+    return registry
+
+
+# ----------------------------------------------------------------------
+# Workflows sintéticos
+# ----------------------------------------------------------------------
+
+
+def _node_config(node_type: str, index: int, max_retries: int) -> Dict[str, Any]:
+    retry = {"max_retries": max_retries, "retry_delay_ms": 0}
+    if node_type == "llm":
+        return {"provider": "openai", "model": "gpt-4o-mini", "prompt": f"Resuma o passo {index}", **retry}
+    if node_type == "transform":
+        return {"transform_type": "extract", "path": "index", **retry}
+    return {"url": f"https://bench.local/items/{index}", "method": "GET", **retry}
+
+
+def synthesize_workflow(
+    shape: str,
+    nodes: int,
+    mix: Dict[str, float],
+    seed: int = 7,
+    max_retries: int = 0,
+) -> Dict[str, Any]:
+    """
+    ``workflow.definition`` com ``nodes`` nós: ``chain`` (n0→n1→…),
+    ``fan_out`` (n0→todos os demais) ou ``diamond`` (n0→intermediários→último).
+    Os tipos dos nós são sorteados com os pesos de ``mix``
+    """
+    if shape not in SHAPES:
+        raise ValueError(f"Formato desconhecido: {shape} (use {', '.join(SHAPES)})")
+    if nodes < (3 if shape == "diamond" else 1):
+        raise ValueError(f"Formato {shape} precisa de mais nós")
+
+    rng = random.Random(seed)
+    types, weights = zip(*sorted(mix.items()))
+    keys = [f"n{index}" for index in range(nodes)]
+    definition_nodes = []
+    for index, key in enumerate(keys):
+        node_type = rng.choices(types, weights)[0]
+        definition_nodes.append({
+            "id": key,
+            "type": node_type,
+            "name": f"{node_type} {index}",
+            "node_id": str(uuid.UUID(int=rng.getrandbits(128))),
+            "config": _node_config(node_type, index, max_retries),
+        })
+
+    if shape == "chain":
+        edges = list(zip(keys, keys[1:]))
+    elif shape == "fan_out":
+        edges = [(keys[0], key) for key in keys[1:]]
+    else:
+        middle = keys[1:-1]
+        edges = [(keys[0], key) for key in middle] + [(key, keys[-1]) for key in middle]
+    return {
+        "nodes": definition_nodes,
+        "connections": [{"source": source, "target": target} for source, target in edges],
+    }
+
+
+# ----------------------------------------------------------------------
+# Banco de dados
+# ----------------------------------------------------------------------
+
+
+class BenchmarkDatabase:
+    """
+    SQLite em arquivo temporário (tabelas criadas aqui) ou o PostgreSQL de
+    ``url``/``BENCHMARK_DATABASE_URL``, já migrado. No PostgreSQL os workflows
+    pertencem a ``BENCHMARK_USER_ID``/``BENCHMARK_TENANT_ID`` (chaves
+    estrangeiras), então o banco deve ser descartável. Outputs grandes dos
+    nós vão para ``output_store`` (no SQLite, um diretório ao lado do banco)
+    """
+
+    def __init__(self, url: Optional[str] = None, directory: Optional[str] = None):
+        url = url or os.getenv("BENCHMARK_DATABASE_URL")
+        self.directory = None
+        if url is None:
+            self.directory = directory or tempfile.mkdtemp(prefix="synapse-bench-")
+            url = f"sqlite:///{os.path.join(self.directory, 'bench.sqlite')}"
+        self.engine = create_engine(url)
+        self.dialect = self.engine.dialect.name
+        self.statements = 0
+        self.commits = 0
+
+        if self.dialect == "sqlite":
+            schema = os.path.join(self.directory or tempfile.mkdtemp(prefix="synapse-bench-"), "schema.sqlite")
+
+            @event.listens_for(self.engine, "connect")
+            def attach_schema(connection, _):
+                connection.execute(f"ATTACH DATABASE '{schema}' AS synapscale_db")
+
+            for model in MODELS:
+                model.__table__.create(self.engine, checkfirst=True)
+            self.user_id, self.tenant_id = uuid.uuid4(), uuid.uuid4()
+            self.output_store = ExecutionOutputStore(os.path.join(self.directory, "storage"))
+        else:
+            try:
+                self.user_id = uuid.UUID(os.environ["BENCHMARK_USER_ID"])
+                self.tenant_id = uuid.UUID(os.environ["BENCHMARK_TENANT_ID"])
+            except KeyError as e:
+                raise ValueError(f"{e.args[0]} é obrigatório para benchmarks no PostgreSQL") from e
+            self.output_store = get_output_store()
+
+        event.listen(self.engine, "before_cursor_execute", self._count_statement)
+        event.listen(self.engine, "commit", self._count_commit)
+        self.session = sessionmaker(bind=self.engine, expire_on_commit=False)
+
+    def _count_statement(self, *args) -> None:
+        self.statements += 1
+
+    def _count_commit(self, connection) -> None:
+        self.commits += 1
+
+    def create_workflow(self, definition: Dict[str, Any], name: str = "benchmark") -> uuid.UUID:
+        with self.session() as db:
+            workflow = Workflow(
+                id=uuid.uuid4(),
+                name=name,
+                definition=definition,
+                user_id=self.user_id,
+                tenant_id=self.tenant_id,
+                is_active=True,
+                is_public=False,
+                status="active",
+                version="1",
+            )
+            db.add(workflow)
+            db.commit()
+            return workflow.id
+
+    def close(self) -> None:
+        self.engine.dispose()
+
+
+# ----------------------------------------------------------------------
+# Execução e métricas
+# ----------------------------------------------------------------------
+
+
+def _status(value: Any) -> str:
+    return getattr(value, "value", value)
+
+
+def _percentiles(values: List[float], scale: float = 1000.0) -> Dict[str, float]:
+    if not values:
+        return {"p50": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0}
+    ordered = sorted(values)
+
+    def at(fraction):
+        return round(ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] * scale, 3)
+
+    return {"p50": at(0.5), "p95": at(0.95), "p99": at(0.99), "max": round(ordered[-1] * scale, 3)}
+
+
+async def drive_executions(
+    database: BenchmarkDatabase,
+    workflow_id: uuid.UUID,
+    registry: ExecutorRegistry,
+    probe: Probe,
+    executions: int,
+    concurrency: int,
+    input_data: Optional[Dict[str, Any]] = None,
+    variables: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """Cria e executa ``executions`` execuções do workflow, até ``concurrency`` ao mesmo tempo"""
+    plan_cache = ExecutionPlanCache(registry=registry, shared_cache=False)
+    service = ExecutionService(engine=ExecutionEngine(
+        plan_cache=plan_cache, registry=registry, output_store=database.output_store
+    ))
+    semaphore = asyncio.Semaphore(max(concurrency, 1))
+    samples: List[Dict[str, Any]] = []
+
+    async def run_one(index: int) -> None:
+        async with semaphore:
+            with database.session() as db:
+                submitted = time.perf_counter()
+                response = await service.create_and_start_execution(
+                    db,
+                    ExecutionCreate(
+                        workflow_id=workflow_id,
+                        input_data={"index": index, **(input_data or {})},
+                        variables=variables or {},
+                        timeout_seconds=None,
+                    ),
+                    database.user_id,
+                )
+                created = time.perf_counter()
+                task = service.engine.running_executions.get(response.execution_id)
+                if task is not None:
+                    await task
+                finished = time.perf_counter()
+                execution = (
+                    db.query(WorkflowExecution)
+                    .filter(WorkflowExecution.execution_id == response.execution_id)
+                    .one()
+                )
+                samples.append({
+                    "execution_id": response.execution_id,
+                    "status": _status(execution.status),
+                    "nodes": execution.total_nodes,
+                    "submitted": submitted,
+                    "created": created,
+                    "first_node": probe.first_start.get(response.execution_id, finished),
+                    "finished": finished,
+                    "busy": probe.busy.get(response.execution_id, 0.0),
+                    "injected": probe.injected.get(response.execution_id, 0.0),
+                })
+
+    statements, commits = database.statements, database.commits
+    start = time.perf_counter()
+    await asyncio.gather(*(run_one(index) for index in range(executions)))
+    elapsed = time.perf_counter() - start
+    statements, commits = database.statements - statements, database.commits - commits
+
+    total_nodes = sum(sample["nodes"] for sample in samples)
+    overhead = [
+        max(sample["finished"] - sample["first_node"] - sample["busy"], 0.0) / sample["nodes"]
+        for sample in samples
+        if sample["nodes"]
+    ]
+    return {
+        "executions": len(samples),
+        "nodes": total_nodes,
+        "elapsed_seconds": round(elapsed, 4),
+        "throughput": {
+            "executions_per_second": round(len(samples) / elapsed, 3),
+            "nodes_per_second": round(total_nodes / elapsed, 3),
+        },
+        "create_ms": _percentiles([sample["created"] - sample["submitted"] for sample in samples]),
+        "queue_wait_ms": _percentiles([sample["first_node"] - sample["created"] for sample in samples]),
+        "execution_ms": _percentiles([sample["finished"] - sample["submitted"] for sample in samples]),
+        "scheduling_overhead_us_per_node": _percentiles(overhead, scale=1e6),
+        "injected_latency_ms_per_execution": round(
+            statistics.fmean(sample["injected"] for sample in samples) * 1000, 3
+        ) if samples else 0.0,
+        "db": {
+            "statements_per_execution": round(statements / max(len(samples), 1), 2),
+            "commits_per_execution": round(commits / max(len(samples), 1), 2),
+            "statements_total": statements,
+        },
+        "statuses": dict(Counter(sample["status"] for sample in samples)),
+        "execution_ids": [sample["execution_id"] for sample in samples],
+    }
+
+
+@dataclass
+class BenchmarkConfig:
+    shape: str = "chain"
+    nodes: int = 10
+    executions: int = 20
+    concurrency: int = 4
+    mix: Dict[str, float] = field(default_factory=lambda: {"http": 0.7, "llm": 0.3})
+    latencies: Dict[str, LatencyModel] = field(default_factory=lambda: dict(DEFAULT_LATENCIES))
+    max_retries: int = 0
+    seed: int = 7
+    database_url: Optional[str] = None
+
+
+def _environment(database: BenchmarkDatabase) -> Dict[str, Any]:
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "database": database.dialect,
+    }
+
+
+async def run_benchmark(config: BenchmarkConfig, database: Optional[BenchmarkDatabase] = None) -> Dict[str, Any]:
+    """Sintetiza o workflow, executa e devolve o relatório (JSON-serializável)"""
+    owned = database is None
+    database = database or BenchmarkDatabase(config.database_url)
+    try:
+        probe = Probe()
+        registry = build_registry(config.latencies, config.seed, probe)
+        definition = synthesize_workflow(config.shape, config.nodes, config.mix, config.seed, config.max_retries)
+        workflow_id = database.create_workflow(definition, name=f"benchmark {config.shape} {config.nodes}")
+        results = await drive_executions(
+            database, workflow_id, registry, probe, config.executions, config.concurrency
+        )
+        return {
+            "format": RESULTS_FORMAT,
+            "benchmark": f"execution_engine.{config.shape}.{config.nodes}",
+            "config": asdict(config),
+            "environment": _environment(database),
+            "results": results,
+        }
+    finally:
+        if owned:
+            database.close()
+
+
+# ----------------------------------------------------------------------
+# Gravação e replay
+# ----------------------------------------------------------------------
+
+
+def record_execution(db, execution_id: str, store: Optional[ExecutionOutputStore] = None) -> Dict[str, Any]:
+    """
+    Entradas, configuração, dependências, saídas e duração de cada nó de uma
+    execução (saídas externalizadas são lidas de ``store``)
+    """
+    store = store or get_output_store()
+    execution = db.query(WorkflowExecution).filter(WorkflowExecution.execution_id == execution_id).one()
+    nodes = (
+        db.query(NodeExecution)
+        .filter(NodeExecution.workflow_execution_id == execution.id)
+        .order_by(NodeExecution.execution_order)
+        .all()
+    )
+    return {
+        "format": RECORDING_FORMAT,
+        "execution_id": execution.execution_id,
+        "workflow_id": str(execution.workflow_id),
+        "status": _status(execution.status),
+        "input_data": execution.input_data or {},
+        "variables": execution.variables or {},
+        "nodes": [
+            {
+                "key": node.node_key,
+                "type": node.node_type,
+                "name": node.node_name,
+                "node_id": str(node.node_id) if node.node_id else None,
+                "config": node.config_data or {},
+                "dependencies": list(node.dependencies or []),
+                "duration_ms": node.duration_ms,
+                "output": store.resolve((node.output_data or {}).get("output"), execution.execution_id),
+                "error": node.error_message,
+            }
+            for node in nodes
+        ],
+    }
+
+
+def save_recording(recording: Dict[str, Any], path: str) -> None:
+    with open(path, "w", encoding="utf-8") as handle:
+        json.dump(recording, handle, indent=2, default=str)
+
+
+def load_recording(path: str) -> Dict[str, Any]:
+    with open(path, encoding="utf-8") as handle:
+        recording = json.load(handle)
+    if recording.get("format") != RECORDING_FORMAT:
+        raise ValueError(f"Formato de gravação não suportado: {recording.get('format')}")
+    return recording
+
+
+def recording_definition(recording: Dict[str, Any]) -> Dict[str, Any]:
+    """``workflow.definition`` equivalente ao workflow gravado"""
+    return {
+        "nodes": [
+            {
+                "id": node["key"],
+                "type": node["type"],
+                "name": node.get("name"),
+                "node_id": node.get("node_id") or str(uuid.uuid4()),
+                "config": node.get("config") or {},
+            }
+            for node in recording["nodes"]
+        ],
+        "connections": [
+            {"source": source, "target": node["key"]}
+            for node in recording["nodes"]
+            for source in node.get("dependencies") or []
+        ],
+    }
+
+
+def _normalized(value: Any) -> Any:
+    return json.loads(json.dumps(value, sort_keys=True, default=str))
+
+
+async def replay_recording(
+    recording: Dict[str, Any],
+    speed: float = 1.0,
+    executions: int = 1,
+    concurrency: int = 1,
+    database: Optional[BenchmarkDatabase] = None,
+) -> Dict[str, Any]:
+    """
+    Reexecuta a gravação offline (SQLite por padrão): cada nó devolve a saída
+    gravada após a duração gravada × ``speed``. ``mismatches`` lista os nós
+    cuja saída persistida difere da gravada
+    """
+    owned = database is None
+    database = database or BenchmarkDatabase()
+    try:
+        probe = Probe()
+        nodes = {node["key"]: node for node in recording["nodes"]}
+        registry = ExecutorRegistry()
+        registry.register(TimedExecutor(
+            ReplayExecutor((node["type"] for node in recording["nodes"]), nodes, speed, probe), probe
+        ))
+        workflow_id = database.create_workflow(recording_definition(recording), name="replay")
+        results = await drive_executions(
+            database,
+            workflow_id,
+            registry,
+            probe,
+            executions,
+            concurrency,
+            input_data=recording.get("input_data"),
+            variables=recording.get("variables"),
+        )
+
+        mismatches = []
+        with database.session() as db:
+            for execution_id in results["execution_ids"]:
+                replayed = record_execution(db, execution_id, database.output_store)
+                for node in replayed["nodes"]:
+                    if _normalized(node["output"]) != _normalized(nodes[node["key"]].get("output")):
+                        mismatches.append({"execution_id": execution_id, "node": node["key"]})
+        results["mismatches"] = mismatches
+        return {
+            "format": RESULTS_FORMAT,
+            "benchmark": f"execution_engine.replay.{recording['execution_id']}",
+            "config": {"speed": speed, "executions": executions, "concurrency": concurrency},
+            "environment": _environment(database),
+            "results": results,
+        }
+    finally:
+        if owned:
+            database.close()
+
+
+def write_results(report: Dict[str, Any], path: str) -> str:
+    """Grava o relatório em JSON (um arquivo por benchmark para séries históricas)"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as handle:
+        json.dump(report, handle, indent=2, sort_keys=True, default=str)
+    return path
+
+
+# ----------------------------------------------------------------------
+# CLI
+# ----------------------------------------------------------------------
+
+
+def _parse_pairs(values: List[str], parser) -> Dict[str, Any]:
+    pairs = {}
+    for value in values:
+        name, _, rest = value.partition("=")
+        pairs[name] = parser(rest)
+    return pairs
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark e replay do ExecutionEngine")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="Executa um workflow sintético")
+    run.add_argument("--shape", choices=SHAPES, default="chain")
+    run.add_argument("--nodes", type=int, default=10)
+    run.add_argument("--executions", type=int, default=20)
+    run.add_argument("--concurrency", type=int, default=4)
+    run.add_argument("--latency", action="append", default=[], help="tipo=dist:media_ms[:spread[:falhas]]")
+    run.add_argument("--mix", action="append", default=[], help="tipo=peso (http, llm, transform)")
+    run.add_argument("--seed", type=int, default=7)
+    run.add_argument("--database-url")
+    run.add_argument("-o", "--output")
+
+    record = commands.add_parser("record", help="Grava uma execução real do banco")
+    record.add_argument("execution_id")
+    record.add_argument("--database-url", default=os.getenv("BENCHMARK_DATABASE_URL") or os.getenv("DATABASE_URL"))
+    record.add_argument("-o", "--output", required=True)
+
+    replay = commands.add_parser("replay", help="Reexecuta uma gravação offline")
+    replay.add_argument("recording")
+    replay.add_argument("--speed", type=float, default=1.0)
+    replay.add_argument("--executions", type=int, default=1)
+    replay.add_argument("--concurrency", type=int, default=1)
+    replay.add_argument("-o", "--output")
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.WARNING)
+    for name in ("synapse", "executor"):
+        logging.getLogger(name).setLevel(logging.WARNING)
+
+    if args.command == "record":
+        engine = create_engine(args.database_url)
+        with sessionmaker(bind=engine)() as db:
+            save_recording(record_execution(db, args.execution_id), args.output)
+        engine.dispose()
+        print(args.output)
+        return
+
+    if args.command == "run":
+        config = BenchmarkConfig(
+            shape=args.shape,
+            nodes=args.nodes,
+            executions=args.executions,
+            concurrency=args.concurrency,
+            seed=args.seed,
+            database_url=args.database_url,
+        )
+        config.latencies.update(_parse_pairs(args.latency, LatencyModel.parse))
+        if args.mix:
+            config.mix = _parse_pairs(args.mix, float)
+        report = asyncio.run(run_benchmark(config))
+    else:
+        report = asyncio.run(replay_recording(
+            load_recording(args.recording), args.speed, args.executions, args.concurrency
+        ))
+
+    report["results"].pop("execution_ids", None)
+    if args.output:
+        print(write_results(report, args.output))
+    else:
+        print(json.dumps(report, indent=2, sort_keys=True, default=str))
+
+
+if __name__ == "__main__":
+    main()
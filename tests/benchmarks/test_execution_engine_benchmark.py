@@ -0,0 +1,137 @@
+"""
+Benchmarks do ExecutionEngine pelo harness de replay: formatos de workflow,
+workflow de 1000 nós, latências determinísticas e gravação/replay offline.
+Os relatórios JSON vão para ``BENCHMARK_RESULTS_DIR`` (ou o diretório
+temporário do teste) para acompanhamento de tendência.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import random
+
+import pytest
+
+from replay_harness import (
+    BenchmarkConfig,
+    BenchmarkDatabase,
+    LatencyModel,
+    load_recording,
+    record_execution,
+    replay_recording,
+    run_benchmark,
+    save_recording,
+    write_results,
+)
+
+pytestmark = [pytest.mark.performance, pytest.mark.slow]
+
+FAST = {"http": LatencyModel("lognormal", 2.0, 0.5), "llm": LatencyModel("uniform", 4.0, 2.0)}
+
+
+@pytest.fixture(autouse=True)
+def quiet_logs():
+    loggers = [logging.getLogger(name) for name in ("synapse", "executor")]
+    levels = [logger.level for logger in loggers]
+    for logger in loggers:
+        logger.setLevel(logging.WARNING)
+    yield
+    for logger, level in zip(loggers, levels):
+        logger.setLevel(level)
+
+
+@pytest.fixture()
+def results_dir(tmp_path):
+    return os.getenv("BENCHMARK_RESULTS_DIR") or str(tmp_path)
+
+
+@pytest.fixture()
+def database(tmp_path):
+    database = BenchmarkDatabase(directory=str(tmp_path))
+    yield database
+    database.close()
+
+
+def summary(report):
+    results = report["results"]
+    return (
+        f"{report['benchmark']}: {results['throughput']['executions_per_second']} execuções/s, "
+        f"{results['throughput']['nodes_per_second']} nós/s, "
+        f"espera p95 {results['queue_wait_ms']['p95']}ms, "
+        f"overhead p50 {results['scheduling_overhead_us_per_node']['p50']}µs/nó, "
+        f"{results['db']['statements_per_execution']} comandos SQL/execução"
+    )
+
+
+@pytest.mark.parametrize("shape", ["chain", "fan_out", "diamond"])
+def test_workflow_shapes(shape, database, results_dir):
+    config = BenchmarkConfig(shape=shape, nodes=50, executions=12, concurrency=4, latencies=dict(FAST))
+    report = asyncio.run(run_benchmark(config, database))
+    path = write_results(report, os.path.join(results_dir, f"execution_engine_{shape}.json"))
+    print("\n" + summary(report))
+
+    results = report["results"]
+    assert results["statuses"] == {"completed": 12}
+    assert results["nodes"] == 12 * 50
+    # Escritas em lote: comandos por execução não crescem com o número de nós
+    assert results["db"]["statements_per_execution"] < 50
+    with open(path) as handle:
+        saved = json.load(handle)
+    assert saved["config"]["shape"] == shape and saved["environment"]["database"] == "sqlite"
+    assert set(saved["results"]) >= {"throughput", "queue_wait_ms", "scheduling_overhead_us_per_node", "db"}
+
+
+def test_thousand_node_workflow(database, results_dir):
+    config = BenchmarkConfig(
+        shape="diamond",
+        nodes=1000,
+        executions=2,
+        concurrency=1,
+        mix={"http": 0.6, "llm": 0.2, "transform": 0.2},
+        latencies={"http": LatencyModel("fixed", 0), "llm": LatencyModel("fixed", 0)},
+    )
+    report = asyncio.run(run_benchmark(config, database))
+    write_results(report, os.path.join(results_dir, "execution_engine_diamond_1000.json"))
+    print("\n" + summary(report))
+
+    results = report["results"]
+    assert results["statuses"] == {"completed": 2}
+    assert results["db"]["statements_per_execution"] < 50
+    assert results["scheduling_overhead_us_per_node"]["p50"] < 5_000
+
+
+def test_latency_distributions_are_deterministic():
+    model = LatencyModel.parse("lognormal:20:0.5")
+    first = [model.sample(random.Random(3)) for _ in range(3)]
+    assert first == [model.sample(random.Random(3)) for _ in range(3)]
+    samples = [model.sample(rng) for rng in [random.Random(11)] for _ in range(5000)]
+    assert 0.018 < sorted(samples)[len(samples) // 2] < 0.022
+    assert LatencyModel.parse("fixed:5").sample(random.Random()) == 0.005
+    with pytest.raises(ValueError):
+        LatencyModel.parse("pareto:5")
+
+
+def test_record_and_replay_offline(database, tmp_path, results_dir):
+    config = BenchmarkConfig(shape="diamond", nodes=12, executions=1, concurrency=1, latencies=dict(FAST))
+    report = asyncio.run(run_benchmark(config, database))
+    execution_id = report["results"]["execution_ids"][0]
+    with database.session() as db:
+        recording = record_execution(db, execution_id, database.output_store)
+    path = str(tmp_path / "recording.json")
+    save_recording(recording, path)
+
+    # Replay em outro banco, sem os executores simulados, na velocidade gravada e sem espera
+    recorded = load_recording(path)
+    replays = {speed: asyncio.run(replay_recording(recorded, speed=speed, executions=3)) for speed in (1.0, 0.0)}
+    write_results(replays[0.0], os.path.join(results_dir, "execution_engine_replay.json"))
+    print("\n" + summary(replays[0.0]))
+
+    assert [node["key"] for node in recorded["nodes"]][0] == "n0" and len(recorded["nodes"]) == 12
+    assert all(node["output"] is not None for node in recorded["nodes"])
+    for replay in replays.values():
+        assert replay["results"]["statuses"] == {"completed": 3}
+        assert replay["results"]["mismatches"] == []
+    recorded_ms = sum(node["duration_ms"] for node in recorded["nodes"])
+    assert replays[1.0]["results"]["injected_latency_ms_per_execution"] == pytest.approx(recorded_ms)
+    assert replays[0.0]["results"]["injected_latency_ms_per_execution"] == 0
@@ -0,0 +1,128 @@
+"""
+Benchmark dos outputs em camadas: memória por execução (pico do
+tracemalloc) e tamanho de ``node_executions.output_data`` com outputs
+grandes mantidos na linha vs externalizados no armazenamento, e listagem
+de execuções sem as colunas pesadas.
+"""
+
+import asyncio
+import logging
+import os
+import tracemalloc
+
+import pytest
+from sqlalchemy import event, text
+
+from replay_harness import (
+    BenchmarkDatabase,
+    Probe,
+    TimedExecutor,
+    drive_executions,
+    synthesize_workflow,
+    write_results,
+)
+from synapse.core.executors import BaseExecutor, ExecutorRegistry, ExecutorType
+from synapse.core.executors.outputs import ExecutionOutputStore
+from synapse.services.execution_service import ExecutionService
+
+pytestmark = [pytest.mark.performance, pytest.mark.slow]
+
+NODES = 30
+EXECUTIONS = 3
+ROWS_PER_OUTPUT = 2_000  # ~150 KB de JSON por nó
+
+
+class PayloadExecutor(BaseExecutor):
+    """Nó HTTP simulado que devolve uma página grande e lê o output do nó anterior"""
+
+    def __init__(self, probe: Probe):
+        super().__init__(ExecutorType.HTTP)
+        self.probe = probe
+        self.previous_reads = 0
+
+    def validate_config(self, config):
+        return {"is_valid": True, "errors": []}
+
+    async def execute(self, node, context, node_execution):
+        index = int(node.key[1:])
+        if index and context.get_node_output(f"n{index - 1}")["node"] == f"n{index - 1}":
+            self.previous_reads += 1
+        rows = [{"id": row, "node": node.key, "text": f"linha {row} " * 4} for row in range(ROWS_PER_OUTPUT)]
+        return {"success": True, "output": {"node": node.key, "rows": rows}}
+
+
+@pytest.fixture(autouse=True)
+def quiet_logs():
+    loggers = [logging.getLogger(name) for name in ("synapse", "executor")]
+    levels = [logger.level for logger in loggers]
+    for logger in loggers:
+        logger.setLevel(logging.WARNING)
+    yield
+    for logger, level in zip(loggers, levels):
+        logger.setLevel(level)
+
+
+def run(tmp_path, name, inline_bytes):
+    (tmp_path / name).mkdir()
+    database = BenchmarkDatabase(directory=str(tmp_path / name))
+    database.output_store = ExecutionOutputStore(tmp_path / name / "storage", inline_bytes=inline_bytes)
+    probe = Probe()
+    executor = PayloadExecutor(probe)
+    registry = ExecutorRegistry()
+    registry.register(TimedExecutor(executor, probe))
+    workflow_id = database.create_workflow(synthesize_workflow("chain", NODES, {"http": 1.0}))
+
+    asyncio.run(drive_executions(database, workflow_id, registry, probe, 1, 1))  # aquecimento
+    tracemalloc.start()
+    try:
+        results = asyncio.run(drive_executions(database, workflow_id, registry, probe, EXECUTIONS, 1))
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    with database.engine.connect() as connection:
+        row_bytes = connection.execute(text("SELECT SUM(LENGTH(output_data)) FROM node_executions")).scalar()
+    storage = tmp_path / name / "storage"
+    stored_bytes = sum(path.stat().st_size for path in storage.rglob("*.json.gz")) if storage.exists() else 0
+    return database, executor, {
+        "peak_memory_mb": round(peak / 2**20, 2),
+        "node_output_row_bytes": row_bytes,
+        "external_stored_bytes": stored_bytes,
+        "statuses": results["statuses"],
+    }
+
+
+def test_spilled_outputs_reduce_memory_and_row_size(tmp_path):
+    inline_db, inline_executor, inline = run(tmp_path, "inline", inline_bytes=2**40)
+    spill_db, spill_executor, spilled = run(tmp_path, "spill", inline_bytes=16_384)
+
+    # Listagem: uma query, sem outputs, logs ou debug no SELECT
+    statements = []
+    event.listen(spill_db.engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    with spill_db.session() as db:
+        listed = asyncio.run(ExecutionService(engine=object()).get_user_executions(db, spill_db.user_id))
+    inline_db.close()
+    spill_db.close()
+
+    report = {
+        "benchmark": "execution_outputs.spill",
+        "config": {"nodes": NODES, "executions": EXECUTIONS, "rows_per_output": ROWS_PER_OUTPUT},
+        "results": {"inline": inline, "spill": spilled},
+    }
+    write_results(report, os.path.join(os.getenv("BENCHMARK_RESULTS_DIR") or str(tmp_path), "execution_outputs.json"))
+    print(
+        f"\n{EXECUTIONS}×{NODES} nós: pico de memória {inline['peak_memory_mb']} MB (na linha) vs "
+        f"{spilled['peak_memory_mb']} MB (externalizado); output_data {inline['node_output_row_bytes'] / 2**20:.1f} MB "
+        f"vs {spilled['node_output_row_bytes'] / 2**10:.1f} KB + {spilled['external_stored_bytes'] / 2**10:.0f} KB gzip"
+    )
+
+    assert inline["statuses"] == spilled["statuses"] == {"completed": EXECUTIONS}
+    # Os nós seguintes continuam lendo o output anterior (carregado sob demanda)
+    assert inline_executor.previous_reads == spill_executor.previous_reads == (EXECUTIONS + 1) * (NODES - 1)
+    assert spilled["node_output_row_bytes"] * 20 < inline["node_output_row_bytes"]
+    assert spilled["external_stored_bytes"] * 5 < inline["node_output_row_bytes"]
+    assert spilled["peak_memory_mb"] * 2 < inline["peak_memory_mb"]
+
+    assert len(listed) == EXECUTIONS + 1 and all(execution.debug_info is None for execution in listed)
+    assert len(statements) == 1
+    assert not any(column in statements[0] for column in ("output_data", "execution_log", "debug_info"))
@@ -0,0 +1,45 @@
+"""
+Benchmark de usuários ativos: MAU como mescla de 30 sketches diários vs
+união exata dos conjuntos de usuários
+"""
+
+import time
+
+import numpy as np
+import pytest
+
+from synapse.core.analytics.hll import HyperLogLog
+
+pytestmark = [pytest.mark.performance, pytest.mark.slow]
+
+DAYS = 30
+DAILY_USERS = 50_000
+POPULATION = 400_000
+
+
+def test_mau_sketch_merge():
+    rng = np.random.default_rng(11)
+    daily_ids = [rng.choice(POPULATION, DAILY_USERS, replace=False).tolist() for _ in range(DAYS)]
+    sketches = []
+    for ids in daily_ids:
+        sketch = HyperLogLog()
+        sketch.add_many(ids)
+        sketches.append(HyperLogLog.from_bytes(sketch.to_bytes()))
+
+    start = time.perf_counter()
+    exact = len(set().union(*daily_ids))
+    exact_elapsed = time.perf_counter() - start
+
+    runs = 200
+    start = time.perf_counter()
+    for _ in range(runs):
+        estimate = HyperLogLog.union(sketches).count()
+    merge_elapsed = (time.perf_counter() - start) / runs
+
+    error = abs(estimate - exact) / exact
+    print(
+        f"\nMAU ({DAYS} dias x {DAILY_USERS:,} usuários): exato={exact:,} em {exact_elapsed * 1000:.1f} ms, "
+        f"sketch={estimate:,} em {merge_elapsed * 1e6:.0f} µs (erro {error:.2%})"
+    )
+    assert error < 0.03
+    assert merge_elapsed < exact_elapsed
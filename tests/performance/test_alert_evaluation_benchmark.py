@@ -0,0 +1,103 @@
+"""
+Benchmark da avaliação de alertas: 10k alertas por tick avaliados em lote
+(um agregado por métrica/agregação/janela) vs uma consulta por alerta,
+e o custo da roda de timers com intervalos por alerta
+"""
+
+import random
+import time
+import uuid
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.orm import sessionmaker
+
+from synapse.core.alerts.alert_engine import AlertEvaluationEngine
+from synapse.core.alerts.evaluation import TimerWheel
+from synapse.models import AnalyticsMetric
+
+from sqlite_support import sqlite_engine
+
+pytestmark = [pytest.mark.performance, pytest.mark.slow]
+
+ALERTS = 10_000
+METRICS = 200
+ROWS = 100_000
+SAMPLE = 300  # alertas avaliados um a um (extrapolado para ALERTS)
+NOW = datetime(2026, 10, 19, 12, 0, 0)
+
+
+def test_batched_alert_evaluation(tmp_path):
+    engine = sqlite_engine(tmp_path, models=(AnalyticsMetric,))
+
+    rng = random.Random(17)
+    with engine.begin() as conn:
+        conn.execute(
+            AnalyticsMetric.__table__.insert(),
+            [
+                {
+                    "id": uuid.uuid4(),
+                    "metric_name": f"metric_{i % METRICS}",
+                    "metric_value": Decimal(rng.randint(0, 1000)),
+                    "dimensions": {},
+                    "timestamp": NOW - timedelta(seconds=rng.randint(0, 3600)),
+                }
+                for i in range(ROWS)
+            ],
+        )
+    db = sessionmaker(bind=engine)()
+
+    specs = {
+        str(i): {
+            "condition": {
+                "metric_name": f"metric_{rng.randrange(METRICS)}",
+                "threshold": rng.randint(100, 900),
+                "condition": rng.choice(["greater_than", "less_than"]),
+                "aggregation": rng.choice(["avg", "max", "count"]),
+                "time_window_minutes": rng.choice([5, 15, 60]),
+            },
+            "tenant_id": None,
+        }
+        for i in range(ALERTS)
+    }
+    evaluator = AlertEvaluationEngine()
+
+    evaluator._evaluate_specs(db, dict(list(specs.items())[:1]), NOW)  # configuração dos mappers
+
+    runs = 5
+    elapsed = time.perf_counter()
+    for _ in range(runs):
+        results = evaluator._evaluate_specs(db, specs, NOW)
+    batched = (time.perf_counter() - elapsed) / runs
+
+    functions = {"avg": func.avg, "max": func.max, "count": func.count}
+    elapsed = time.perf_counter()
+    for alert_id in list(specs)[:SAMPLE]:
+        condition = specs[alert_id]["condition"]
+        value = db.execute(
+            select(functions[condition["aggregation"]](AnalyticsMetric.metric_value)).where(
+                AnalyticsMetric.metric_name == condition["metric_name"],
+                AnalyticsMetric.timestamp >= NOW - timedelta(minutes=condition["time_window_minutes"]),
+                AnalyticsMetric.timestamp <= NOW,
+            )
+        ).scalar()
+        assert float(value) == pytest.approx(results[alert_id][0])
+    per_alert = (time.perf_counter() - elapsed) / SAMPLE * ALERTS
+
+    wheel = TimerWheel()
+    for alert_id in specs:
+        wheel.schedule(alert_id, rng.choice([1, 6, 12, 60]), rng.randint(1, 12))
+    elapsed = time.perf_counter()
+    fired = sum(len(wheel.advance()) for _ in range(720))
+    wheel_tick = (time.perf_counter() - elapsed) / 720
+
+    print(
+        f"\n{ALERTS:,} alertas em {METRICS} métricas: lote {batched * 1000:.0f} ms, "
+        f"uma consulta por alerta ~{per_alert * 1000:.0f} ms ({per_alert / batched:.0f}x)\n"
+        f"Roda de timers: {wheel_tick * 1e6:.0f} µs/tick, {fired / 720:,.0f} alertas vencidos por tick"
+    )
+    assert len(results) == ALERTS
+    assert batched < per_alert
+    db.close()
@@ -0,0 +1,99 @@
+"""
+Benchmark do despachante de notificações durante uma tempestade de alertas:
+10k disparos para poucos destinatários colapsam em digests, o enqueue não
+bloqueia a avaliação e a entrega respeita os limites por canal
+"""
+
+import asyncio
+import time
+import uuid
+from datetime import datetime
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.orm import sessionmaker
+
+from synapse.core.alerts.notifications import Notification, NotificationDispatcher
+from synapse.models import AlertNotification
+
+from sqlite_support import sqlite_engine
+
+pytestmark = [pytest.mark.performance, pytest.mark.slow]
+
+FIRINGS = 10_000
+RECIPIENTS = 50
+SEND_LATENCY = 0.05  # segundos por chamada ao provedor (simulado)
+
+
+def test_alert_storm_collapses_into_digests(tmp_path):
+    engine = sqlite_engine(tmp_path, models=(AlertNotification,))
+
+    session_factory = sessionmaker(bind=engine)
+
+    in_flight = peak = 0
+    sends = 0
+
+    async def webhook(digest):
+        nonlocal in_flight, peak, sends
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(SEND_LATENCY)
+        in_flight -= 1
+        sends += 1
+
+    dispatcher = NotificationDispatcher(
+        workers=16,
+        channel_limits={"webhook": 8},
+        group_window=0.5,
+        dedup_window=0,
+        poll_interval=0.05,
+        session_factory=session_factory,
+        senders={"webhook": webhook},
+    )
+
+    async def storm():
+        await dispatcher.start()
+        started = time.perf_counter()
+        now = datetime.utcnow()
+        enqueue_time = 0.0
+        for batch in range(10):
+            notifications = [
+                Notification(
+                    channel="webhook",
+                    recipient=f"https://hooks.example.com/{i % RECIPIENTS}",
+                    payload={"event": "alert_triggered", "alert_id": str(i), "severity": "high"},
+                    alert_id=uuid.uuid4(),
+                    fired_at=now,
+                )
+                for i in range(batch * FIRINGS // 10, (batch + 1) * FIRINGS // 10)
+            ]
+            elapsed = time.perf_counter()
+            dispatcher.enqueue(notifications)
+            enqueue_time += time.perf_counter() - elapsed
+            await asyncio.sleep(0)
+
+        while dispatcher.stats.notifications_delivered < FIRINGS:
+            assert time.perf_counter() - started < 60
+            await asyncio.sleep(0.02)
+        total = time.perf_counter() - started
+        await dispatcher.stop()
+        return enqueue_time, total
+
+    enqueue_time, total = asyncio.run(storm())
+
+    with session_factory() as db:
+        digests = db.execute(select(func.count(func.distinct(AlertNotification.digest_id)))).scalar_one()
+        delivered = db.execute(
+            select(func.count()).select_from(AlertNotification).where(AlertNotification.status == "delivered")
+        ).scalar_one()
+
+    sequential = FIRINGS * SEND_LATENCY
+    print(
+        f"\n{FIRINGS:,} disparos para {RECIPIENTS} destinatários: enqueue {enqueue_time * 1e6 / FIRINGS:.1f} µs/disparo, "
+        f"{sends} entregas ({digests} digests) em {total:.2f}s, pico de {peak} envios simultâneos; "
+        f"um envio síncrono por disparo levaria ~{sequential:.0f}s"
+    )
+    assert delivered == FIRINGS
+    assert sends == digests <= RECIPIENTS * 2
+    assert peak <= 8
+    assert enqueue_time < 1.0
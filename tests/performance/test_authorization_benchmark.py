@@ -0,0 +1,154 @@
+"""
+Benchmark das verificações de autorização: consultas por verificação
+(padrão anterior de ``RBACRolePermission.has_permission`` e de
+``WorkspaceService._has_permission``) vs decisões pré-computadas. Reporta
+verificações por segundo; o alvo é pelo menos 10k/s sem consultas.
+"""
+
+import random
+import time
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.orm import sessionmaker
+
+from synapse.models.rbac_permission import RBACPermission
+from synapse.models.rbac_role import RBACRole
+from synapse.models.rbac_role_permission import RBACRolePermission
+from synapse.models.user_tenant_role import UserTenantRole
+from synapse.models.workspace import Workspace
+from synapse.models.workspace_member import WorkspaceMember
+from synapse.services.authorization_service import authorization_engine
+
+from sqlite_support import sqlite_engine
+
+pytestmark = [pytest.mark.performance, pytest.mark.slow]
+
+USERS, ROLES, PERMISSIONS, WORKSPACES, MEMBERS = 200, 20, 300, 50, 40
+CHECKS = 100_000
+LEGACY_CHECKS = 1_000
+
+
+def seed(db, rng):
+    tenant_id = uuid.uuid4()
+    keys = [f"resource{i}:action{i % 7}" for i in range(PERMISSIONS)]
+    permissions = [RBACPermission(id=uuid.uuid4(), key=key) for key in keys]
+    roles = [
+        RBACRole(id=uuid.uuid4(), name=f"r{i}", tenant_id=tenant_id, is_system=False, role_metadata={})
+        for i in range(ROLES)
+    ]
+    db.add_all(permissions + roles)
+    for role in roles:
+        for granted in rng.sample(permissions, 40):
+            db.add(RBACRolePermission(
+                id=uuid.uuid4(), role_id=role.id, permission_id=granted.id, granted=True, conditions={}, tenant_id=tenant_id
+            ))
+    users = [uuid.uuid4() for _ in range(USERS)]
+    for user_id in users:
+        for role in rng.sample(roles, 3):
+            db.add(UserTenantRole(
+                id=uuid.uuid4(), user_id=user_id, tenant_id=tenant_id, role_id=role.id, is_active=True, conditions={}
+            ))
+    now = datetime.now(timezone.utc)
+    workspaces = []
+    for index in range(WORKSPACES):
+        workspace = Workspace(
+            id=uuid.uuid4(), name=f"w{index}", slug=f"w{index}", type="collaborative",
+            owner_id=users[index], tenant_id=tenant_id,
+        )
+        workspaces.append(workspace)
+        db.add(workspace)
+        for user_id in rng.sample(users, MEMBERS):
+            db.add(WorkspaceMember(
+                workspace_id=workspace.id, user_id=user_id, tenant_id=tenant_id,
+                role=rng.choice(["admin", "member", "viewer"]), status="active", is_favorite=False,
+                joined_at=now, last_seen_at=now,
+            ))
+    db.commit()
+    return tenant_id, keys, roles, users, workspaces
+
+
+def legacy_role_check(db, role_id, key):
+    role_permission = (
+        db.query(RBACRolePermission)
+        .join(RBACRolePermission.permission)
+        .filter(RBACRolePermission.role_id == role_id, RBACRolePermission.permission.has(key=key))
+        .first()
+    )
+    return role_permission is not None and role_permission.is_granted()
+
+
+def legacy_workspace_check(db, workspace_id, user_id, permission):
+    workspace = db.query(Workspace).filter(Workspace.id == workspace_id).first()
+    if workspace and workspace.owner_id == user_id:
+        return True
+    member = (
+        db.query(WorkspaceMember)
+        .filter(
+            WorkspaceMember.workspace_id == workspace_id,
+            WorkspaceMember.user_id == user_id,
+            WorkspaceMember.status == "active",
+        )
+        .first()
+    )
+    allowed = {"admin": ("read", "write", "admin"), "member": ("read", "write"), "viewer": ("read",)}
+    return member is not None and permission in allowed.get(member.role, ())
+
+
+def test_authorization_checks_per_second(tmp_path, monkeypatch):
+    engine = sqlite_engine(tmp_path, models=(RBACPermission, RBACRole, RBACRolePermission, UserTenantRole, Workspace, WorkspaceMember))
+
+    queries = []
+    event.listen(engine, "before_cursor_execute", lambda *args: queries.append(1))
+    monkeypatch.setattr(authorization_engine, "redis_prefix", "")
+    authorization_engine.clear()
+
+    rng = random.Random(7)
+    with sessionmaker(bind=engine, expire_on_commit=False)() as db:
+        tenant_id, keys, roles, users, workspaces = seed(db, rng)
+        checks = [
+            (
+                rng.choice(users),
+                rng.choice(keys),
+                rng.choice(roles).id,
+                rng.choice(workspaces).id,
+                rng.choice(("read", "write", "admin")),
+            )
+            for _ in range(CHECKS)
+        ]
+
+        queries.clear()
+        start = time.perf_counter()
+        for user_id, key, role_id, workspace_id, permission in checks[:LEGACY_CHECKS]:
+            legacy_role_check(db, role_id, key)
+            legacy_workspace_check(db, workspace_id, user_id, permission)
+        legacy_rate = 2 * LEGACY_CHECKS / (time.perf_counter() - start)
+        legacy_queries = len(queries)
+
+        # Aquecimento: uma carga por principal, role e workspace
+        for user_id in users:
+            authorization_engine.principal(db, user_id, tenant_id)
+        for workspace in workspaces:
+            authorization_engine.workspace(db, workspace.id)
+
+        queries.clear()
+        start = time.perf_counter()
+        allowed = 0
+        for user_id, key, role_id, workspace_id, permission in checks:
+            allowed += authorization_engine.has_permission(db, user_id, tenant_id, key)
+            allowed += authorization_engine.has_workspace_permission(db, workspace_id, user_id, permission)
+        cached_rate = 2 * CHECKS / (time.perf_counter() - start)
+
+    engine.dispose()
+    authorization_engine.clear()
+    print(
+        f"\nconsultas por verificação: {legacy_rate:,.0f} verificações/s ({legacy_queries} consultas para {2 * LEGACY_CHECKS}), "
+        f"pré-computado: {cached_rate:,.0f} verificações/s ({len(queries)} consultas para {2 * CHECKS})"
+    )
+    assert legacy_queries >= 2 * LEGACY_CHECKS
+    assert queries == []
+    assert 0 < allowed < 2 * CHECKS
+    assert cached_rate >= 10_000
+    assert cached_rate > 10 * legacy_rate
@@ -0,0 +1,73 @@
+"""
+Benchmark de expressões do TransformExecutor: eval por item vs expressão compilada
+"""
+
+import json
+import re
+import time
+
+import pytest
+
+from synapse.core.executors.base import ExecutionContext
+from synapse.core.executors.transform_executor import TransformExecutor
+
+pytestmark = [pytest.mark.performance, pytest.mark.slow]
+
+ITEMS = 50_000
+EXPRESSIONS = [
+    "item['amount'] * 1.1 > {{threshold}} and item['status'] == 'paid'",
+    "len(item['name']) > 5 and item['name'].startswith('cli')",
+]
+
+
+def _legacy_evaluate(executor, expression, item, context):
+    """Caminho anterior: resolve templates e chama eval a cada item"""
+    resolved = executor.resolve_template_variables(expression, context, {"item": item})
+    safe_dict = {
+        "item": item,
+        "data": item,
+        "len": len,
+        "str": str,
+        "int": int,
+        "float": float,
+        "bool": bool,
+        "abs": abs,
+        "min": min,
+        "max": max,
+        "sum": sum,
+        "round": round,
+        "json": json,
+        "re": re,
+    }
+    return eval(resolved, {"__builtins__": {}}, safe_dict)
+
+
+@pytest.mark.parametrize("expression", EXPRESSIONS)
+def test_compiled_expression_throughput(expression):
+    executor = TransformExecutor()
+    context = ExecutionContext(
+        execution_id="bench",
+        workflow_id=1,
+        user_id=1,
+        variables={"threshold": 500, **{f"var_{i}": i for i in range(30)}},
+    )
+    data = [
+        {"amount": i % 1000, "status": "paid" if i % 3 else "open", "name": f"cliente-{i}"}
+        for i in range(ITEMS)
+    ]
+
+    start = time.perf_counter()
+    legacy = [item for item in data if _legacy_evaluate(executor, expression, item, context)]
+    legacy_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    compiled = executor._transform_filter(data, {"expression": expression}, context)
+    compiled_time = time.perf_counter() - start
+
+    print(
+        f"\n{expression!r}: eval={ITEMS / legacy_time:,.0f} itens/s "
+        f"compilada={ITEMS / compiled_time:,.0f} itens/s "
+        f"({legacy_time / compiled_time:.1f}x)"
+    )
+    assert compiled == legacy
+    assert compiled_time < legacy_time
@@ -0,0 +1,122 @@
+"""
+Benchmark da latência p99 por requisição com log de acesso em INFO:
+handler de arquivo JSON gravando no event loop (como antes) vs o mesmo
+handler atrás do pipeline assíncrono. O handler simula o fsync de uma
+rotação a cada ``ROTATE_EVERY`` registros.
+"""
+
+import asyncio
+import logging
+import os
+import statistics
+import time
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from synapse.core.log_pipeline import LogPipeline, LogStats
+from synapse.logger_config import UnifiedJSONFormatter
+from synapse.middlewares.pipeline import setup_request_pipeline
+
+pytestmark = [pytest.mark.performance, pytest.mark.slow]
+
+REQUESTS = 2_000
+ROTATE_EVERY = 250
+ROTATION_STALL = 0.02
+
+
+class RotatingJSONSink(logging.FileHandler):
+    """Arquivo JSON com uma pausa de "rotação" (fsync) periódica"""
+
+    def __init__(self, path):
+        super().__init__(path)
+        self.setFormatter(UnifiedJSONFormatter())
+        self.written = 0
+
+    def emit(self, record):
+        super().emit(record)
+        self.written += 1
+        if self.written % ROTATE_EVERY == 0:
+            os.fsync(self.stream.fileno())
+            time.sleep(ROTATION_STALL)
+
+
+def app() -> FastAPI:
+    application = FastAPI()
+
+    @application.get("/api/v1/ping")
+    async def ping():
+        logging.getLogger("synapse.api.ping").info("ping atendido")
+        return {"status": "ok"}
+
+    setup_request_pipeline(application)
+    return application
+
+
+async def latencies(application: FastAPI):
+    transport = httpx.ASGITransport(app=application)
+    samples = []
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        for _ in range(100):  # aquecimento
+            await client.get("/api/v1/ping")
+        for _ in range(REQUESTS):
+            start = time.perf_counter()
+            response = await client.get("/api/v1/ping")
+            samples.append(time.perf_counter() - start)
+            assert response.status_code == 200
+    return samples
+
+
+def p99(samples):
+    return statistics.quantiles(samples, n=100)[98]
+
+
+def test_p99_latency_sync_vs_queued_logging(tmp_path):
+    root = logging.getLogger()
+    synapse_logger, client_logger = logging.getLogger("synapse"), logging.getLogger("httpx")
+    saved_handlers, saved_level = root.handlers[:], root.level
+    saved_levels = synapse_logger.level, client_logger.level
+    root.handlers.clear()
+    root.setLevel(logging.INFO)
+    synapse_logger.setLevel(logging.INFO)
+    client_logger.setLevel(logging.WARNING)  # só os logs do servidor
+    try:
+        sync_sink = RotatingJSONSink(tmp_path / "sync.log")
+        root.addHandler(sync_sink)
+        sync_samples = asyncio.run(latencies(app()))
+        root.removeHandler(sync_sink)
+        sync_sink.close()
+
+        queued_sink = RotatingJSONSink(tmp_path / "queued.log")
+        pipeline = LogPipeline([queued_sink], queue_size=10_000, stats=LogStats())
+        pipeline.attach(root)
+        pipeline.start()
+        queued_samples = asyncio.run(latencies(app()))
+        pipeline.stop()
+        root.removeHandler(queued_sink)
+        queued_sink.close()
+    finally:
+        root.handlers[:] = saved_handlers
+        root.setLevel(saved_level)
+        synapse_logger.setLevel(saved_levels[0])
+        client_logger.setLevel(saved_levels[1])
+
+    stats = pipeline.get_stats()
+    sync_p99, queued_p99 = p99(sync_samples), p99(queued_samples)
+    sync_stalls, queued_stalls = (sum(sample >= ROTATION_STALL for sample in samples) for samples in (sync_samples, queued_samples))
+    print(
+        f"\nGET /api/v1/ping com log INFO: síncrono p50 {statistics.median(sync_samples) * 1e6:.0f} µs "
+        f"p99 {sync_p99 * 1e6:.0f} µs máx {max(sync_samples) * 1e3:.1f} ms; "
+        f"fila p50 {statistics.median(queued_samples) * 1e6:.0f} µs "
+        f"p99 {queued_p99 * 1e6:.0f} µs máx {max(queued_samples) * 1e3:.1f} ms; "
+        f"requisições presas na rotação: {sync_stalls} vs {queued_stalls}; "
+        f"{stats['handled']} registros processados, {stats['dropped']} descartados"
+    )
+    # Cada requisição gera dois registros (endpoint + acesso), todos gravados
+    assert queued_sink.written == sync_sink.written >= 2 * REQUESTS
+    assert stats["dropped"] == 0
+    # Com a fila, o fsync da rotação não segura mais as requisições
+    assert sync_stalls >= 2 * REQUESTS // ROTATE_EVERY
+    assert queued_stalls <= 2
+    assert queued_p99 < sync_p99
@@ -0,0 +1,142 @@
+"""
+Benchmark das escritas de estado por execução (200 nós): padrão anterior
+(um commit por transição, por métrica e por progresso) vs estado dos nós em
+lote por tick de flush. Reporta transações por execução e tempo total.
+"""
+
+import asyncio
+import time
+import uuid
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.orm import sessionmaker
+
+from synapse.core.config import settings
+from synapse.core.executors import executor_registry
+from synapse.core.executors.plan import NodeSpec, compile_plan
+from synapse.models.node_execution import NodeExecution
+from synapse.models.workflow_execution import ExecutionStatus, WorkflowExecution
+from synapse.models.workflow_execution_metric import WorkflowExecutionMetric
+from synapse.services.execution_plan_service import ExecutionPlanCache
+from synapse.services.execution_service import ExecutionEngine
+from synapse.services.execution_state_service import node_execution_rows
+
+from sqlite_support import sqlite_engine
+
+pytestmark = [pytest.mark.performance, pytest.mark.slow]
+
+NODES = 200
+
+
+@pytest.fixture()
+def database(tmp_path):
+    engine = sqlite_engine(tmp_path, models=(WorkflowExecution, NodeExecution, WorkflowExecutionMetric))
+
+    commits = []
+    event.listen(engine, "commit", lambda connection: commits.append(1))
+    yield SimpleNamespace(session=sessionmaker(bind=engine, expire_on_commit=False), commits=commits)
+    engine.dispose()
+
+
+def build_plan():
+    specs = [
+        NodeSpec(f"n{i}", "transform", {"transform_type": "extract", "path": "value"}, catalog_id=str(uuid.uuid4()))
+        for i in range(NODES)
+    ]
+    edges = [(f"n{i}", f"n{i + 1}") for i in range(NODES - 1)]
+    return compile_plan("wf", "v1", specs, edges, registry=executor_registry)
+
+
+def new_execution(plan):
+    return WorkflowExecution(
+        workflow_id=uuid.uuid4(),
+        user_id=uuid.uuid4(),
+        status=ExecutionStatus.PENDING,
+        input_data={"value": 1},
+        total_nodes=NODES,
+        started_at=datetime.utcnow(),
+        debug_info={"plan_version": plan.version},
+    )
+
+
+def legacy_run(db, plan):
+    """Padrão anterior: um objeto por nó e commits por transição/métrica/progresso"""
+    execution = new_execution(plan)
+    db.add(execution)
+    db.commit()
+    nodes = []
+    for row in node_execution_rows(execution, plan):
+        node = NodeExecution(**row)
+        db.add(node)
+        nodes.append(node)
+    db.commit()
+
+    execution.status = ExecutionStatus.RUNNING
+    db.commit()
+    for node in nodes:
+        node.started_at = datetime.utcnow()
+        db.commit()
+        node.completed_at = datetime.utcnow()
+        node.duration_ms = 0
+        node.output_data = {"result": "success", "output": 1}
+        db.commit()
+        db.add(WorkflowExecutionMetric(
+            workflow_execution_id=execution.id,
+            node_execution_id=node.id,
+            metric_type="execution_time",
+            metric_name="node_duration_ms",
+            value_numeric=0,
+        ))
+        db.commit()
+        execution.completed_nodes += 1
+        execution.update_progress()
+        db.commit()
+    execution.status = ExecutionStatus.COMPLETED
+    db.commit()
+
+
+def batched_run(db, plan, engine):
+    execution = new_execution(plan)
+    db.add(execution)
+    db.flush()
+    asyncio.run(engine._create_node_executions(db, execution, plan))
+    db.commit()
+    asyncio.run(engine._execute_workflow(db, execution))
+    assert execution.status == ExecutionStatus.COMPLETED
+
+
+def test_node_state_transactions_per_execution(database, monkeypatch):
+    monkeypatch.setattr(settings, "EXECUTION_NODE_STATE_MODE", "tick")
+    monkeypatch.setattr(settings, "EXECUTION_STATE_FLUSH_INTERVAL_MS", 1000)
+    plan = build_plan()
+    cache = ExecutionPlanCache(registry=executor_registry, shared_cache=False)
+    cache.store(plan)
+    engine = ExecutionEngine(plan_cache=cache)
+    engine.stats_service = SimpleNamespace(record_transition=lambda *args, **kwargs: None)
+
+    with database.session() as db:
+        start = time.perf_counter()
+        legacy_run(db, plan)
+        legacy_seconds = time.perf_counter() - start
+        legacy_transactions = len(database.commits)
+
+        database.commits.clear()
+        start = time.perf_counter()
+        batched_run(db, plan, engine)
+        batched_seconds = time.perf_counter() - start
+        batched_transactions = len(database.commits)
+
+        assert db.query(NodeExecution).filter(NodeExecution.completed_at.isnot(None)).count() == 2 * NODES
+        assert db.query(WorkflowExecutionMetric).count() == 2 * NODES
+
+    print(
+        f"\n{NODES} nós: anterior {legacy_transactions} transações em {legacy_seconds * 1000:.0f}ms, "
+        f"em lote {batched_transactions} transações em {batched_seconds * 1000:.0f}ms"
+    )
+    assert legacy_transactions == 4 * NODES + 4
+    # Criação + RUNNING + final, mais um flush por segundo de execução
+    assert batched_transactions <= 3 + int(batched_seconds) + 1
+    assert batched_seconds < legacy_seconds
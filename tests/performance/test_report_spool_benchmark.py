@@ -0,0 +1,60 @@
+"""
+Benchmark do spool de relatórios: resultado lido em lotes com yield_per e
+gravado em páginas comprimidas, com memória de pico independente do total
+de linhas
+"""
+
+import time
+import tracemalloc
+
+import pytest
+from sqlalchemy import Column, Float, Integer, MetaData, String, Table, create_engine, select
+
+from synapse.core.analytics.spool import ResultSpool
+
+pytestmark = [pytest.mark.performance, pytest.mark.slow]
+
+ROWS = 300_000
+PAGE_SIZE = 5_000
+
+
+def test_spool_memory_is_bounded_by_page_size(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'report.sqlite'}")
+    metadata = MetaData()
+    events = Table(
+        "events", metadata, Column("id", Integer), Column("action", String), Column("value", Float)
+    )
+    metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(
+            events.insert(),
+            [{"id": i, "action": f"action_{i % 50}", "value": i * 0.5} for i in range(ROWS)],
+        )
+
+    def spool_rows(limit, directory):
+        with engine.connect() as conn:
+            spool = ResultSpool(tmp_path / "storage", directory, ["id", "action", "value"], "jsonl")
+            result = conn.execute(select(events).limit(limit).execution_options(yield_per=PAGE_SIZE))
+            for rows in result.partitions(PAGE_SIZE):
+                spool.write_page(rows)
+        return spool.manifest
+
+    start = time.perf_counter()
+    manifest = spool_rows(ROWS, "reports/full")
+    elapsed = time.perf_counter() - start
+
+    peaks = []
+    for limit in (ROWS // 6, ROWS):
+        tracemalloc.start()
+        spool_rows(limit, f"reports/traced-{limit}")
+        peaks.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+
+    print(
+        f"\nSpool de {manifest.rows:,} linhas em {len(manifest.pages)} páginas: {elapsed:.2f} s "
+        f"({manifest.rows / elapsed:,.0f} linhas/s), {manifest.bytes / 1e6:.1f} MB gzip, "
+        f"pico de memória {peaks[0] / 1e6:.1f} MB ({ROWS // 6:,} linhas) / {peaks[1] / 1e6:.1f} MB ({ROWS:,})"
+    )
+    assert manifest.rows == ROWS
+    # 6x mais linhas, praticamente a mesma memória (só o manifesto cresce)
+    assert peaks[1] < peaks[0] * 1.5 + 1e6
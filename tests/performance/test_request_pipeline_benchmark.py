@@ -0,0 +1,121 @@
+"""
+Benchmark do overhead por requisição: pilha antiga de middlewares
+``@app.middleware("http")`` vs pipeline ASGI único, medidos com cliente ASGI
+em processo contra um endpoint trivial
+"""
+
+import asyncio
+import logging
+import time
+
+import httpx
+import pytest
+from fastapi import FastAPI, Request
+
+from synapse.error_handlers import add_request_id_middleware
+from synapse.middlewares.error_middleware import setup_error_middleware
+from synapse.middlewares.metrics import setup_metrics_middleware
+from synapse.middlewares.pipeline import setup_request_pipeline
+from synapse.middlewares.rate_limiting import rate_limit
+from synapse.middlewares.tenant_middleware import TenantMiddleware
+
+pytestmark = [pytest.mark.performance, pytest.mark.slow]
+
+REQUESTS = 2_000
+
+
+def bare_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping():
+        return {"status": "ok"}
+
+    return app
+
+
+def legacy_app() -> FastAPI:
+    """Mesma pilha que main.py montava antes do pipeline"""
+    app = bare_app()
+
+    @app.middleware("http")
+    async def add_security_headers(request: Request, call_next):
+        response = await call_next(request)
+        response.headers["X-Content-Type-Options"] = "nosniff"
+        response.headers["X-Frame-Options"] = "DENY"
+        response.headers["X-XSS-Protection"] = "1; mode=block"
+        response.headers["Strict-Transport-Security"] = "max-age=31536000; includeSubDomains"
+        response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
+        response.headers["Permissions-Policy"] = "camera=(), microphone=(), geolocation=()"
+        return response
+
+    @app.middleware("http")
+    async def add_process_time_header(request: Request, call_next):
+        start_time = time.time()
+        response = await call_next(request)
+        response.headers["X-Process-Time"] = str(time.time() - start_time)
+        return response
+
+    @app.middleware("http")
+    async def log_auth_requests(request: Request, call_next):
+        if request.url.path.startswith("/api/v1/"):
+            request.headers.get("authorization")
+        return await call_next(request)
+
+    @app.middleware("http")
+    async def log_requests(request: Request, call_next):
+        start_time = time.time()
+        response = await call_next(request)
+        time.time() - start_time
+        return response
+
+    @app.middleware("http")
+    async def rate_limit_middleware(request: Request, call_next):
+        return await rate_limit(max_requests=100, window_seconds=60)(call_next)(request)
+
+    setup_metrics_middleware(app)
+    app.add_middleware(TenantMiddleware)
+    app.middleware("http")(add_request_id_middleware)
+    setup_error_middleware(app)
+    return app
+
+
+def pipeline_app() -> FastAPI:
+    app = bare_app()
+    setup_request_pipeline(app)
+    return app
+
+
+async def measure(app: FastAPI) -> float:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        for _ in range(100):  # aquecimento (montagem da pilha de middlewares)
+            await client.get("/ping")
+        start = time.perf_counter()
+        for _ in range(REQUESTS):
+            response = await client.get("/ping")
+        elapsed = time.perf_counter() - start
+        assert response.status_code == 200
+    return elapsed / REQUESTS
+
+
+def test_pipeline_overhead_vs_legacy_stack():
+    # Sem log de acesso em INFO para medir só o custo das camadas
+    synapse_logger = logging.getLogger("synapse")
+    level = synapse_logger.level
+    synapse_logger.setLevel(logging.WARNING)
+    try:
+        bare, legacy, pipeline = (
+            asyncio.run(measure(app)) for app in (bare_app(), legacy_app(), pipeline_app())
+        )
+    finally:
+        synapse_logger.setLevel(level)
+
+    legacy_overhead, pipeline_overhead = legacy - bare, pipeline - bare
+    print(
+        f"\nGET /ping: sem middleware {bare * 1e6:.0f} µs, "
+        f"pilha antiga {legacy * 1e6:.0f} µs (+{legacy_overhead * 1e6:.0f}), "
+        f"pipeline {pipeline * 1e6:.0f} µs (+{pipeline_overhead * 1e6:.0f}); "
+        f"{legacy / pipeline:.1f}x mais rápido por requisição"
+    )
+    assert pipeline < legacy
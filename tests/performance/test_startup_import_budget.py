@@ -0,0 +1,41 @@
+"""
+Regressão do tempo de startup: import a frio de ``synapse.main`` num
+subprocesso deve caber no orçamento e não pode carregar endpoints nem
+submódulos de schemas (ficam para a primeira requisição / pré-carga)
+"""
+
+import os
+
+import pytest
+
+from synapse.tools.startup_profile import profile_import
+
+pytestmark = [pytest.mark.performance, pytest.mark.slow]
+
+# Antes da montagem preguiçosa o import levava ~6s; hoje fica em ~2s
+IMPORT_BUDGET_SECONDS = float(os.getenv("STARTUP_IMPORT_BUDGET_SECONDS", "4.0"))
+
+LAZY_SUBMODULES = ("synapse.api.v1.endpoints.", "synapse.schemas.")
+LAZY_DEPENDENCIES = {"openai", "anthropic", "numpy"}
+# Usado pelos handlers de erro registrados no startup
+STARTUP_MODULES = {"synapse.schemas.error"}
+
+
+def test_cold_import_fits_budget():
+    profile = profile_import("synapse.main")
+
+    slowest = ", ".join(
+        f"{r.module} {r.cumulative_seconds * 1000:.0f}ms" for r in profile.top(8, prefix="synapse.")
+    )
+    print(f"\nimport synapse.main: {profile.import_seconds:.2f}s ({profile.modules} módulos); {slowest}")
+
+    eager = [
+        name
+        for name in profile.loaded
+        if (name.startswith(LAZY_SUBMODULES) or name.split(".")[0] in LAZY_DEPENDENCIES)
+        and name not in STARTUP_MODULES
+    ]
+    assert eager == [], f"Módulos que deveriam ser carregados sob demanda: {eager[:10]}"
+    assert profile.import_seconds < IMPORT_BUDGET_SECONDS, (
+        f"import a frio levou {profile.import_seconds:.2f}s (orçamento {IMPORT_BUDGET_SECONDS:.1f}s): {slowest}"
+    )
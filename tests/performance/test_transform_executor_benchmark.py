@@ -0,0 +1,96 @@
+"""
+Benchmark do TransformExecutor: modo linha vs modo colunar com 100k linhas
+"""
+
+import random
+import time
+
+import pytest
+
+from synapse.core.executors.base import ExecutionContext
+from synapse.core.executors.transform_executor import TransformExecutor
+
+pytestmark = [pytest.mark.performance, pytest.mark.slow]
+
+ROWS = 100_000
+
+SCENARIOS = {
+    "filter": {
+        "transform_type": "filter",
+        "condition": {"field": "metrics.latency_ms", "operator": "gt", "value": 250},
+    },
+    "aggregate": {
+        "transform_type": "aggregate",
+        "field": "metrics.latency_ms",
+        "operations": ["count", "sum", "avg", "min", "max", "p50", "p95", "p99"],
+    },
+    "group_aggregate": {
+        "transform_type": "group",
+        "key": "region",
+        "aggregate": {"field": "amount", "operations": ["count", "sum", "avg", "p95"]},
+    },
+    "map": {
+        "transform_type": "map",
+        "mapping": {"id": "id", "latency": "metrics.latency_ms", "region": "region"},
+    },
+}
+
+
+@pytest.fixture(scope="module")
+def dataset():
+    rng = random.Random(42)
+    regions = [f"region-{i}" for i in range(50)]
+    return [
+        {
+            "id": i,
+            "region": rng.choice(regions),
+            "amount": round(rng.uniform(1, 1000), 2),
+            "metrics": {"latency_ms": rng.randint(1, 1000)},
+        }
+        for i in range(ROWS)
+    ]
+
+
+def _assert_same(actual, expected):
+    if isinstance(expected, dict):
+        assert list(actual) == list(expected)
+        for key, value in expected.items():
+            _assert_same(actual[key], value)
+    elif isinstance(expected, float):
+        assert actual == pytest.approx(expected)
+    else:
+        assert actual == expected
+
+
+def _best_of(fn, repeat=3):
+    timings = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+@pytest.mark.parametrize("scenario", list(SCENARIOS))
+def test_columnar_vs_row_100k(dataset, scenario):
+    executor = TransformExecutor()
+    context = ExecutionContext(execution_id="bench", workflow_id=1, user_id=1)
+    config = SCENARIOS[scenario]
+    method = getattr(executor, f"_transform_{config['transform_type']}")
+
+    row_time, row_result = _best_of(
+        lambda: method(dataset, {**config, "execution_mode": "row"}, context)
+    )
+    columnar_time, columnar_result = _best_of(
+        lambda: method(dataset, {**config, "execution_mode": "columnar"}, context)
+    )
+
+    print(
+        f"\n{scenario}: row={row_time * 1000:.1f}ms "
+        f"columnar={columnar_time * 1000:.1f}ms "
+        f"speedup={row_time / columnar_time:.1f}x"
+    )
+    _assert_same(columnar_result, row_result)
+    if scenario in ("filter", "aggregate"):
+        assert columnar_time < row_time
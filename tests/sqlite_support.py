@@ -0,0 +1,45 @@
+"""
+SQLite para testes de serviços que usam os modelos reais
+Os modelos vivem no schema ``synapscale_db`` e usam JSONB; aqui o schema é
+anexado como um segundo banco SQLite e JSONB vira JSON.
+"""
+
+from pathlib import Path
+from typing import Iterable, Optional
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.compiler import compiles
+
+
+@compiles(JSONB, "sqlite")
+def _jsonb_on_sqlite(element, compiler, **kw):
+    return "JSON"
+
+
+def sqlite_engine(
+    directory: Optional[Path] = None,
+    models: Iterable = (),
+    threaded: bool = False,
+) -> Engine:
+    """
+    Engine SQLite com o schema ``synapscale_db`` anexado e as tabelas de
+    ``models`` criadas. Sem ``directory`` tudo fica em memória (uma conexão);
+    ``threaded`` libera o uso da conexão em outras threads
+    """
+    connect_args = {"check_same_thread": False} if threaded else {}
+    if directory is None:
+        engine = create_engine("sqlite://", connect_args=connect_args)
+        schema = ":memory:"
+    else:
+        engine = create_engine(f"sqlite:///{Path(directory) / 'db.sqlite'}", connect_args=connect_args)
+        schema = Path(directory) / "schema.sqlite"
+
+    @event.listens_for(engine, "connect")
+    def attach_schema(connection, _):
+        connection.execute(f"ATTACH DATABASE '{schema}' AS synapscale_db")
+
+    for model in models:
+        model.__table__.create(engine)
+    return engine
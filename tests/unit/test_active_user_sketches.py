@@ -0,0 +1,74 @@
+"""
+Testes do HyperLogLog e dos sketches diários de usuários ativos
+"""
+
+import uuid
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy.orm import Session
+
+from synapse.core.analytics.hll import HyperLogLog, relative_error
+from synapse.models.active_user_sketch import ActiveUserSketch
+from synapse.services.active_user_service import ActiveUserService, collect_active_users
+
+from sqlite_support import sqlite_engine
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.mark.parametrize("cardinality", [3_000, 40_000, 300_000])
+def test_estimate_within_error_bound(cardinality):
+    sketch = HyperLogLog(precision=14, exact_threshold=1024)
+    sketch.add_many(range(cardinality))
+    assert not sketch.is_exact
+    # 4 desvios padrão: falha espúria praticamente impossível
+    assert abs(sketch.count() - cardinality) / cardinality < 4 * relative_error(14)
+
+
+def test_exact_mode_union_and_serialization():
+    small, other = HyperLogLog(exact_threshold=100), HyperLogLog(exact_threshold=100)
+    small.add_many(range(60))
+    other.add_many(range(30, 90))
+    union = HyperLogLog.from_bytes(small.to_bytes()).merge(other)
+    assert union.is_exact and union.count() == 90 and union.relative_error == 0.0
+
+    other.add_many(range(90, 200))  # passa do limite: vira registradores
+    assert not other.is_exact
+    merged = HyperLogLog.from_bytes(small.to_bytes()).merge(other)
+    assert not merged.is_exact
+    assert HyperLogLog.from_bytes(merged.to_bytes()).count() == merged.count()
+    assert abs(merged.count() - 200) <= 3
+
+
+@pytest.fixture
+def db():
+    engine = sqlite_engine(models=(ActiveUserSketch,))
+
+    with Session(engine) as session:
+        yield session
+
+
+def test_daily_sketches_merge_into_windows(db):
+    service = ActiveUserService(precision=12, exact_threshold=50)
+    tenant = uuid.uuid4()
+    users = [uuid.uuid4() for _ in range(40)]
+    today = date(2026, 10, 19)
+
+    def events(day, members, tenant_id=None):
+        stamp = datetime.combine(day, datetime.min.time(), tzinfo=timezone.utc) + timedelta(hours=12)
+        return [{"user_id": user, "tenant_id": tenant_id, "timestamp": stamp} for user in members]
+
+    service.record(db, events(today, users[:10], tenant))
+    service.record(db, events(today, users[5:15], tenant))  # mesmo dia: mescla no registro existente
+    service.record(db, events(today - timedelta(days=3), users[10:30]))
+    service.record(db, events(today - timedelta(days=20), users[:40] + [None]))
+    db.commit()
+
+    summary = service.summary(db, today)
+    assert summary["dau"]["value"] == 15 and summary["dau"]["exact"]
+    assert summary["wau"]["value"] == 30
+    assert summary["mau"]["value"] == 40
+    assert service.window(db, 7, today, tenant_id=tenant).value == 15
+
+    assert len(collect_active_users(events(today, users[:3], tenant))) == 2  # global + tenant
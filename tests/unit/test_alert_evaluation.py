@@ -0,0 +1,108 @@
+"""
+Testes da avaliação de alertas em lote: roda de timers, agregados
+compartilhados e distribuição dos resultados entre alertas
+"""
+
+import uuid
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.orm import sessionmaker
+
+from synapse.core.alerts.alert_engine import AlertEvaluationEngine
+from synapse.core.alerts.evaluation import TimerWheel, aggregate_key, compute_aggregates
+from synapse.models import AnalyticsMetric
+
+from sqlite_support import sqlite_engine
+
+pytestmark = pytest.mark.unit
+
+NOW = datetime(2026, 10, 19, 12, 0, 0)
+
+
+def test_timer_wheel_fires_each_key_on_its_interval():
+    wheel = TimerWheel(slots=8)
+    wheel.schedule("fast", 2)
+    wheel.schedule("slow", 20, delay=3)  # mais longo que uma volta da roda
+    wheel.schedule("gone", 1)
+
+    fired = {"fast": [], "slow": [], "gone": []}
+    for _ in range(45):
+        for key in wheel.advance():
+            fired[key].append(wheel.tick)
+        if wheel.tick == 2:
+            assert wheel.cancel("gone") and not wheel.cancel("gone")
+
+    assert fired["fast"] == list(range(2, 46, 2))
+    assert fired["slow"] == [3, 23, 43]
+    assert fired["gone"] == [1, 2]
+    assert len(wheel) == 2 and "gone" not in wheel and wheel.interval("slow") == 20
+
+
+@pytest.fixture()
+def db(tmp_path):
+    engine = sqlite_engine(tmp_path, models=(AnalyticsMetric,))
+
+    session = sessionmaker(bind=engine)()
+    session.add_all(
+        AnalyticsMetric(
+            id=uuid.uuid4(),
+            metric_name=name,
+            metric_value=Decimal(value),
+            dimensions={},
+            timestamp=NOW - timedelta(minutes=minutes),
+        )
+        for name, offset in (("latency", 0), ("errors", 100))
+        for minutes, value in ((m, m + offset) for m in range(0, 60, 2))
+    )
+    session.commit()
+    yield session
+    session.close()
+
+
+def test_grouped_aggregates_match_per_key_queries(db):
+    keys = {
+        aggregate_key(name, aggregation, window * 60)
+        for name in ("latency", "errors", "missing")
+        for aggregation in ("avg", "sum", "min", "max", "count", "p99")
+        for window in (5, 15, 60)
+    }
+    values = compute_aggregates(db, keys, NOW)
+    assert len(values) == len(keys)
+
+    # count conta linhas (COUNT(*)), não valores não nulos
+    functions = {"avg": func.avg, "sum": func.sum, "min": func.min, "max": func.max, "count": lambda _: func.count()}
+    for key, value in values.items():
+        expected = db.execute(
+            select(functions[key.aggregation](AnalyticsMetric.metric_value)).where(
+                AnalyticsMetric.metric_name == key.metric_name,
+                AnalyticsMetric.timestamp >= NOW - timedelta(seconds=key.window_seconds),
+                AnalyticsMetric.timestamp <= NOW,
+            )
+        ).scalar()
+        if expected is None:
+            assert value is None
+        else:
+            assert value == pytest.approx(float(expected))
+    assert values[aggregate_key("missing", "count", 300)] == 0.0
+
+
+def test_engine_fans_shared_aggregates_out_to_alerts(db):
+    engine = AlertEvaluationEngine()
+    specs = {
+        "a": {"condition": {"metric_name": "latency", "threshold": 2, "condition": "greater_than"}},
+        "b": {"condition": {"metric_name": "latency", "threshold": 1, "condition": "greater_than"}},
+        "c": {"condition": {"metric_name": "errors", "threshold": 50, "condition": "less_than",
+                            "aggregation": "min", "time_window_minutes": 60}},
+        "d": {"condition": {"metric_name": "missing", "threshold": 1, "condition": "greater_than"}},
+        "e": {"condition": {"metric_name": "latency", "condition": "greater_than"}},
+    }
+    results = engine._evaluate_specs(db, {key: {**spec, "tenant_id": None} for key, spec in specs.items()}, NOW)
+
+    # latência média nos últimos 5 minutos: (0 + 2 + 4) / 3
+    assert results["a"] == (pytest.approx(2.0), 2, False)
+    assert results["b"][2] is True and results["a"][0] == results["b"][0]
+    assert results["c"] == (pytest.approx(100.0), 50, False)
+    assert set(results) == {"a", "b", "c"}  # sem dados / condição incompleta
@@ -0,0 +1,193 @@
+"""
+Testes do despachante de notificações de alerta: agrupamento em digest,
+supressão de duplicatas, retentativas com backoff e falhas permanentes
+"""
+
+import asyncio
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.orm import sessionmaker
+
+from synapse.core.alerts.notifications import (
+    Notification,
+    NotificationDispatcher,
+    PermanentDeliveryError,
+    parse_channel_limits,
+    retry_delay,
+)
+from synapse.models import AlertNotification
+
+from sqlite_support import sqlite_engine
+
+pytestmark = pytest.mark.unit
+
+NOW = datetime(2026, 10, 19, 12, 0, 0)
+
+
+@pytest.fixture()
+def session_factory(tmp_path):
+    engine = sqlite_engine(tmp_path, models=(AlertNotification,))
+
+    return sessionmaker(bind=engine)
+
+
+def firing(alert_id, channel="email", recipient="ops@example.com", severity="high", seconds=0, at=NOW):
+    return Notification(
+        channel=channel,
+        recipient=recipient,
+        payload={
+            "event": "alert_triggered",
+            "alert_id": str(alert_id),
+            "alert_name": f"Alert {alert_id}",
+            "severity": severity,
+            "message": "<b>latency</b> exceeded threshold",
+        },
+        alert_id=alert_id,
+        fired_at=at + timedelta(seconds=seconds),
+    )
+
+
+def make_dispatcher(session_factory, **kwargs):
+    options = {"workers": 2, "channel_limits": {"email": 1}, "group_window": 30, "dedup_window": 300,
+               "max_attempts": 3, "retry_base": 5, "retry_max": 60, "lease": 120}
+    options.update(kwargs)
+    return NotificationDispatcher(session_factory=session_factory, **options)
+
+
+def test_firings_for_one_recipient_are_grouped_into_a_digest(session_factory):
+    dispatcher = make_dispatcher(session_factory)
+    alerts = [uuid.uuid4() for _ in range(3)]
+    dispatcher.enqueue([firing(alert_id, seconds=i) for i, alert_id in enumerate(alerts)])
+    dispatcher.enqueue([firing(alerts[0], channel="webhook", recipient="https://hooks.example.com/a")])
+    assert asyncio.run(dispatcher.flush()) == 4
+
+    # Janela de agrupamento ainda aberta: nada é reivindicado
+    assert dispatcher._claim(10, now=NOW + timedelta(seconds=29)) == []
+
+    digests = {d.channel: d for d in dispatcher._claim(10, now=NOW + timedelta(seconds=30))}
+    assert set(digests) == {"email", "webhook"}
+    email = digests["email"]
+    assert email.count == 3 and email.first_fired_at == NOW
+    assert [f["alert_id"] for f in email.firings] == [str(a) for a in alerts]
+
+    message = email.message()
+    assert message["event"] == "alert_digest" and message["count"] == 3
+    subject, _, content = email.email()
+    assert "3 alerts" in subject and "&lt;b&gt;latency&lt;/b&gt;" in content
+    assert digests["webhook"].message()["event"] == "alert_triggered"
+
+    # Linhas reivindicadas não são entregues duas vezes enquanto a reivindicação vale
+    assert dispatcher._claim(10, now=NOW + timedelta(seconds=149)) == []
+    # Reivindicação vencida: o processo que a fez parou, outro reivindica de novo
+    reclaimed = dispatcher._claim(10, now=NOW + timedelta(seconds=150))
+    assert sorted(d.count for d in reclaimed) == [1, 3]
+
+
+def test_delivered_firings_are_suppressed_within_the_dedup_window(session_factory):
+    sent = []
+
+    async def sender(digest):
+        sent.append(digest)
+
+    dispatcher = make_dispatcher(session_factory, group_window=0, senders={"email": sender})
+    alert_id = uuid.uuid4()
+
+    async def scenario():
+        dispatcher.enqueue([firing(alert_id, at=datetime.utcnow())])
+        await dispatcher.flush()
+        for digest in dispatcher._claim(10):
+            assert await dispatcher._deliver(digest) == "delivered"
+
+    asyncio.run(scenario())
+    assert len(sent) == 1 and dispatcher.stats.notifications_delivered == 1
+
+    assert dispatcher.enqueue([firing(alert_id)]) == 0
+    assert dispatcher.enqueue([firing(alert_id, severity="critical")]) == 1
+    assert dispatcher.stats.suppressed == 1
+
+    with session_factory() as db:
+        row = db.execute(select(AlertNotification)).scalar_one()
+        assert row.status == "delivered" and row.digest_id is not None
+
+
+def test_failed_deliveries_back_off_then_go_dead(session_factory):
+    async def flaky(digest):
+        raise ConnectionError("connection reset")
+
+    async def rejecting(digest):
+        raise PermanentDeliveryError("Webhook responded with HTTP 404")
+
+    dispatcher = make_dispatcher(
+        session_factory, group_window=0, max_attempts=2, senders={"email": flaky, "webhook": rejecting}
+    )
+    now = datetime.utcnow()
+    dispatcher.enqueue(
+        [firing(uuid.uuid4(), at=now), firing(uuid.uuid4(), channel="webhook", recipient="https://x", at=now)]
+    )
+
+    async def attempt(now):
+        statuses = {}
+        for digest in dispatcher._claim(10, now=now):
+            statuses[digest.channel] = await dispatcher._deliver(digest)
+        return statuses
+
+    asyncio.run(dispatcher.flush())
+    assert asyncio.run(attempt(datetime.utcnow())) == {"email": "pending", "webhook": "dead"}
+
+    with session_factory() as db:
+        row = db.execute(select(AlertNotification).where(AlertNotification.channel == "email")).scalar_one()
+        assert row.attempts == 1 and "connection reset" in row.last_error
+        retry_at = row.available_at
+    assert retry_at > datetime.utcnow() + timedelta(seconds=2)
+
+    # Só volta a ser tentada depois do backoff, e a segunda falha esgota as tentativas
+    assert asyncio.run(attempt(retry_at - timedelta(seconds=1))) == {}
+    assert asyncio.run(attempt(retry_at)) == {"email": "dead"}
+    assert dispatcher.stats.retried == 1 and dispatcher.stats.dead == 2
+
+
+def test_running_dispatcher_delivers_and_recovers_interrupted_claims(session_factory):
+    sent = []
+
+    async def sender(digest):
+        sent.append(digest.count)
+
+    dispatcher = make_dispatcher(session_factory, group_window=0, poll_interval=0.01,
+                                 senders={"email": sender})
+
+    async def scenario():
+        # Simula um processo que ainda está entregando e outro que caiu com
+        # linhas reivindicadas (reivindicação já vencida)
+        dispatcher.enqueue([firing(uuid.uuid4(), recipient="c@example.com", at=datetime.utcnow())])
+        await dispatcher.flush()
+        assert len(dispatcher._claim(10)) == 1
+        crashed_at = datetime.utcnow() - timedelta(minutes=5)
+        dispatcher.enqueue([firing(uuid.uuid4(), recipient="a@example.com", at=crashed_at)])
+        await dispatcher.flush()
+        assert len(dispatcher._claim(10, now=crashed_at)) == 1
+
+        await dispatcher.start()
+        dispatcher.enqueue([firing(uuid.uuid4(), recipient="b@example.com", at=datetime.utcnow())])
+        for _ in range(200):
+            if dispatcher.stats.notifications_delivered == 2:
+                break
+            await asyncio.sleep(0.01)
+        await dispatcher.stop()
+
+    asyncio.run(scenario())
+    assert sorted(sent) == [1, 1]
+    with session_factory() as db:
+        live = db.execute(
+            select(AlertNotification).where(AlertNotification.recipient == "c@example.com")
+        ).scalar_one()
+        assert live.status == "sending"
+    assert not dispatcher.running and dispatcher.get_stats()["buffered"] == 0
+
+
+def test_retry_delay_and_channel_limits():
+    delays = [retry_delay(attempt, 5, 60) for attempt in range(1, 8)]
+    assert 2.5 <= delays[0] <= 5 and all(30 <= d <= 60 for d in delays[4:])
+    assert parse_channel_limits("email:4, webhook:16,bad,zero:0") == {"email": 4, "webhook": 16, "zero": 1}
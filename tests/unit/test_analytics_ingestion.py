@@ -0,0 +1,289 @@
+"""
+Testes do pipeline de ingestão de eventos de analytics
+"""
+
+import asyncio
+import uuid
+
+import pytest
+from sqlalchemy.exc import IntegrityError, OperationalError
+
+from synapse.core.analytics.ingestion import (
+    AnalyticsIngestionPipeline,
+    IngestionBackpressure,
+    OverflowPolicy,
+    RedisStreamBuffer,
+    RingBuffer,
+    build_event_row,
+    derive_metric_rows,
+)
+from synapse.schemas.analytics import EventCreate
+
+pytestmark = pytest.mark.unit
+
+PROJECT_ID = str(uuid.uuid4())
+TENANT_ID = uuid.uuid4()
+
+
+def _event(**overrides):
+    data = {
+        "event_type": "page_view",
+        "event_name": "home",
+        "project_id": PROJECT_ID,
+        "duration_ms": 120,
+        "page_url": "/home",
+    }
+    data.update(overrides)
+    return EventCreate(**data)
+
+
+def test_build_event_row_maps_schema_to_columns():
+    row = build_event_row(_event(event_category="nav"), user_id=str(uuid.uuid4()), tenant_id=TENANT_ID)
+    assert row["category"] == "nav"
+    assert row["action"] == "home"
+    assert row["project_id"] == uuid.UUID(PROJECT_ID)
+    assert row["properties"] == {"event_name": "home", "duration_ms": 120}
+    assert row["event_id"] == str(row["id"])
+
+    metrics = derive_metric_rows([row])
+    assert metrics[0]["metric_name"] == "page_load_time" and metrics[0]["value"] == 120.0
+
+    with pytest.raises(ValueError):
+        build_event_row(_event(project_id=None))
+
+    # Referências de outro tenant são recusadas
+    allowed = {"project_id": {uuid.UUID(PROJECT_ID)}}
+    assert build_event_row(_event(), tenant_id=TENANT_ID, allowed_ids=allowed)["project_id"] == uuid.UUID(PROJECT_ID)
+    with pytest.raises(ValueError, match="workflow_id"):
+        build_event_row(_event(workflow_id=str(uuid.uuid4())), tenant_id=TENANT_ID, allowed_ids=allowed)
+    with pytest.raises(ValueError, match="project_id"):
+        build_event_row(_event(project_id=str(uuid.uuid4())), tenant_id=TENANT_ID, allowed_ids=allowed)
+
+
+def test_tenant_event_ids_keep_only_the_callers_projects():
+    from datetime import datetime
+
+    from sqlalchemy import insert
+    from sqlalchemy.orm import Session
+    from sqlite_support import sqlite_engine
+
+    from synapse.models.workspace_project import WorkspaceProject
+    from synapse.services.analytics_service import AnalyticsService
+
+    engine = sqlite_engine(models=(WorkspaceProject,))
+    other_project = uuid.uuid4()
+    now = datetime(2024, 1, 1)
+    common = {
+        "workspace_id": uuid.uuid4(),
+        "workflow_id": uuid.uuid4(),
+        "name": "p",
+        "allow_concurrent_editing": False,
+        "version_control_enabled": False,
+        "status": "active",
+        "is_template": False,
+        "is_public": False,
+        "collaborator_count": 0,
+        "edit_count": 0,
+        "comment_count": 0,
+        "created_at": now,
+        "updated_at": now,
+        "last_edited_at": now,
+    }
+    with Session(engine) as db:
+        db.execute(
+            insert(WorkspaceProject.__table__),
+            [
+                {**common, "id": uuid.UUID(PROJECT_ID), "tenant_id": TENANT_ID},
+                {**common, "id": other_project, "tenant_id": uuid.uuid4()},
+            ],
+        )
+        events = [_event(), _event(project_id=str(other_project)), _event(project_id=None)]
+        allowed = AnalyticsService(db).tenant_event_ids(events, TENANT_ID)
+    assert allowed == {"project_id": {uuid.UUID(PROJECT_ID)}, "workspace_id": set(), "workflow_id": set()}
+
+
+def test_ring_buffer_overflow_policies():
+    buffer = RingBuffer(3, OverflowPolicy.DROP_OLDEST)
+    assert buffer.put_many([{"n": i} for i in range(5)]) == (3, 2)
+    assert [row["n"] for row in buffer.take(10)] == [2, 3, 4]
+
+    buffer = RingBuffer(2, OverflowPolicy.DROP_NEWEST)
+    assert buffer.put_many([{"n": i} for i in range(3)]) == (2, 1)
+
+    buffer = RingBuffer(2, OverflowPolicy.REJECT)
+    buffer.put_many([{"n": 0}])
+    with pytest.raises(IngestionBackpressure):
+        buffer.put_many([{"n": 1}, {"n": 2}])
+
+
+def test_flusher_batches_and_requeues_failed_writes():
+    batches = []
+    fail = {"next": True}
+
+    def writer(events, metrics):
+        if fail["next"]:
+            fail["next"] = False
+            raise OperationalError("INSERT", {}, ConnectionError("db down"))
+        batches.append((len(events), len(metrics)))
+
+    async def scenario():
+        pipeline = AnalyticsIngestionPipeline(
+            capacity=100, batch_size=10, flush_interval_ms=10, writer=writer, redis_stream=""
+        )
+        result = pipeline.submit_nowait(
+            [_event() for _ in range(25)] + [_event(project_id=None)],
+            lambda event: build_event_row(event, tenant_id=TENANT_ID),
+        )
+        assert (result.accepted, result.invalid) == (25, 1)
+
+        assert await pipeline.flush() == 0  # falha: lote volta ao buffer
+        assert len(pipeline.buffer) == 25
+
+        await pipeline.start()
+        await asyncio.sleep(0.1)
+        await pipeline.stop()
+        return pipeline
+
+    pipeline = asyncio.run(scenario())
+    assert sum(size for size, _ in batches) == 25
+    assert max(size for size, _ in batches) <= 10
+    stats = pipeline.get_stats()
+    assert stats["flushed_events"] == 25 and stats["flushed_metrics"] == 25
+    assert stats["failed_flushes"] == 1 and stats["buffered"] == 0
+
+
+def test_row_that_always_fails_goes_to_dead_letter():
+    written = []
+    poison = "poison"
+
+    def writer(events, metrics):
+        if any(row["event_id"] == poison for row in events):
+            raise IntegrityError("INSERT", {}, ValueError("violates check constraint"))
+        written.extend(row["event_id"] for row in events)
+
+    async def scenario():
+        pipeline = AnalyticsIngestionPipeline(
+            capacity=100, batch_size=10, flush_interval_ms=10, writer=writer, redis_stream=""
+        )
+        events = [_event(event_id=f"e{n}") for n in range(25)]
+        events[13] = _event(event_id=poison)
+        pipeline.submit_nowait(events, lambda event: build_event_row(event, tenant_id=TENANT_ID))
+
+        # O lote com a linha ruim é dividido; as demais são gravadas na hora
+        assert await pipeline.flush() == 10
+        assert await pipeline.flush() == 9
+        assert await pipeline.flush() == 5
+        assert await pipeline.flush() == 0
+        return pipeline
+
+    pipeline = asyncio.run(scenario())
+    assert len(written) == 24 and poison not in written
+    assert [entry["event"]["event_id"] for entry in pipeline.dead_letters] == [poison]
+    assert "IntegrityError" in pipeline.dead_letters[0]["error"]
+    stats = pipeline.get_stats()
+    assert stats["dead_lettered"] == 1 and stats["failed_flushes"] == 0 and stats["buffered"] == 0
+
+
+class _FakeStreamClient:
+    """Stream em memória com grupo, PEL e XAUTOCLAIM (semântica do Redis 7)"""
+
+    def __init__(self):
+        self.entries = {}
+        self.pending = {}  # id -> [consumidor, instante da entrega]
+        self.last_delivered = 0
+        self.sequence = 0
+        self.now = 0.0
+        self.dead = []
+
+    async def xgroup_create(self, *args, **kwargs):
+        return True
+
+    async def xlen(self, stream):
+        return len(self.entries)
+
+    def pipeline(self, transaction=False):
+        client, calls = self, []
+
+        class Pipeline:
+            def xadd(self, stream, fields, **kwargs):
+                calls.append((stream, fields))
+
+            async def execute(self):
+                for stream, fields in calls:
+                    if stream.endswith(":dead"):
+                        client.dead.append(fields)
+                        continue
+                    client.sequence += 1
+                    client.entries[client.sequence] = fields
+
+        return Pipeline()
+
+    async def xreadgroup(self, group, consumer, streams, count):
+        ids = [i for i in sorted(self.entries) if i > self.last_delivered][:count]
+        for entry_id in ids:
+            self.pending[entry_id] = [consumer, self.now]
+            self.last_delivered = entry_id
+        return [["stream", [(i, self.entries[i]) for i in ids]]] if ids else []
+
+    async def xautoclaim(self, stream, group, consumer, min_idle_time, start_id, count):
+        idle = [i for i in sorted(self.pending) if (self.now - self.pending[i][1]) * 1000 >= min_idle_time][:count]
+        for entry_id in idle:
+            self.pending[entry_id] = [consumer, self.now]
+        return ["0-0", [(i, self.entries.get(i)) for i in idle], []]
+
+    async def xack(self, stream, group, *ids):
+        for entry_id in ids:
+            self.pending.pop(entry_id, None)
+
+    async def xdel(self, stream, *ids):
+        for entry_id in ids:
+            self.entries.pop(entry_id, None)
+
+
+def test_redis_stream_reclaims_stale_pending_and_never_trims_unacked():
+    client = _FakeStreamClient()
+    first = RedisStreamBuffer("", "events", capacity=3, consumer="worker-a", claim_idle_ms=1000, client=client)
+    second = RedisStreamBuffer("", "events", capacity=3, consumer="worker-b", claim_idle_ms=1000, client=client)
+    rows = [build_event_row(_event(), tenant_id=TENANT_ID) for _ in range(4)]
+
+    async def scenario():
+        assert await first.put_many(rows) == 1  # cheio: descarta o excedente, não apara
+        taken, ids = await first.take(10)  # worker-a cai sem confirmar
+        assert len(taken) == 3 and set(client.pending) == set(ids)
+
+        assert await second.take(10) == ([], [])  # pendentes ainda recentes
+        client.now += 2
+        reclaimed, reclaimed_ids = await second.take(10)
+        assert reclaimed_ids == ids and all(client.pending[i][0] == "worker-b" for i in ids)
+        await second.ack(reclaimed_ids)
+        assert client.entries == {} and client.pending == {}
+
+    asyncio.run(scenario())
+
+
+def test_redis_stream_acks_rejected_rows_into_the_dead_letter_stream():
+    client = _FakeStreamClient()
+    written = []
+
+    def writer(events, metrics):
+        if any(row["event_id"] == "poison" for row in events):
+            raise IntegrityError("INSERT", {}, ValueError("bad row"))
+        written.extend(row["event_id"] for row in events)
+
+    async def scenario():
+        pipeline = AnalyticsIngestionPipeline(
+            capacity=100, batch_size=10, flush_interval_ms=10, writer=writer, redis_stream=""
+        )
+        pipeline.stream = RedisStreamBuffer("", "events", capacity=100, consumer="a", client=client)
+        rows = [build_event_row(_event(event_id=name), tenant_id=TENANT_ID) for name in ("a", "poison", "b")]
+        await pipeline.stream.put_many(rows)
+        client.entries[99] = {"e": "{not json"}
+
+        assert await pipeline.flush() == 2
+        return pipeline
+
+    asyncio.run(scenario())
+    assert written == ["a", "b"]
+    # Nada fica pendente para o XAUTOCLAIM reentregar
+    assert client.entries == {} and client.pending == {}
+    assert sorted(entry["error"].split(":")[0] for entry in client.dead) == ["IntegrityError", "JSONDecodeError"]
@@ -0,0 +1,279 @@
+"""
+Testes do motor de autorização: bitset efetivo por principal, roles sem
+N+1, workspaces sem consultas por verificação e invalidação versionada
+(sessões locais e outros workers via Redis)
+"""
+
+import asyncio
+import uuid
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.orm import sessionmaker
+
+from synapse.models.rbac_permission import RBACPermission
+from synapse.models.rbac_role import RBACRole
+from synapse.models.rbac_role_permission import RBACRolePermission
+from synapse.models.user_tenant_role import UserTenantRole
+from synapse.models.workspace import Workspace
+from synapse.models.workspace_member import WorkspaceMember
+from synapse.services.authorization_service import AuthorizationEngine, authorization_engine
+
+from sqlite_support import sqlite_engine
+
+pytestmark = pytest.mark.unit
+
+MODELS = (RBACPermission, RBACRole, RBACRolePermission, UserTenantRole, Workspace, WorkspaceMember)
+
+
+@pytest.fixture()
+def database(tmp_path, monkeypatch):
+    engine = sqlite_engine(tmp_path, models=MODELS)
+
+    queries = []
+    event.listen(engine, "before_cursor_execute", lambda *args: queries.append(args[2]))
+    monkeypatch.setattr(authorization_engine, "redis_prefix", "")
+    authorization_engine.clear()
+    yield SimpleNamespace(session=sessionmaker(bind=engine, expire_on_commit=False), queries=queries)
+    authorization_engine.clear()
+    engine.dispose()
+
+
+def permission(db, key):
+    item = RBACPermission(id=uuid.uuid4(), key=key)
+    db.add(item)
+    return item
+
+
+def role(db, tenant_id, *grants):
+    item = RBACRole(id=uuid.uuid4(), name=f"role-{uuid.uuid4().hex[:6]}", tenant_id=tenant_id, is_system=False, role_metadata={})
+    db.add(item)
+    for granted_permission, granted, conditions in grants:
+        db.add(
+            RBACRolePermission(
+                id=uuid.uuid4(),
+                role_id=item.id,
+                permission_id=granted_permission.id,
+                granted=granted,
+                conditions=conditions,
+                tenant_id=tenant_id,
+            )
+        )
+    return item
+
+
+def assign(db, user_id, tenant_id, assigned_role, expires_at=None):
+    item = UserTenantRole(
+        id=uuid.uuid4(),
+        user_id=user_id,
+        tenant_id=tenant_id,
+        role_id=assigned_role.id,
+        is_active=True,
+        expires_at=expires_at,
+        conditions={},
+    )
+    db.add(item)
+    return item
+
+
+def test_principal_permissions_are_a_bitset_over_all_roles(database):
+    user_id, tenant_id = uuid.uuid4(), uuid.uuid4()
+    with database.session() as db:
+        read, deploy, delete = (permission(db, key) for key in ("workflows:read", "workflows:deploy", "workflows:delete"))
+        editor = role(db, tenant_id, (read, True, {}), (deploy, True, {"env": "staging"}))
+        admin = role(db, tenant_id, (delete, True, {}))
+        assign(db, user_id, tenant_id, editor)
+        assign(db, user_id, tenant_id, admin, expires_at=datetime.now(timezone.utc) - timedelta(days=1))
+        db.commit()
+
+        assert authorization_engine.has_permission(db, user_id, tenant_id, "workflows:read")
+        # Concessão condicional: vale sem contexto, e com contexto só se as condições baterem
+        assert authorization_engine.has_permission(db, user_id, tenant_id, "workflows:deploy")
+        assert authorization_engine.has_permission(db, user_id, tenant_id, "workflows:deploy", {"env": "staging"})
+        assert not authorization_engine.has_permission(db, user_id, tenant_id, "workflows:deploy", {"env": "prod"})
+        # Atribuição expirada e permissão desconhecida
+        assert not authorization_engine.has_permission(db, user_id, tenant_id, "workflows:delete")
+        assert not authorization_engine.has_permission(db, user_id, tenant_id, "billing:read")
+
+        database.queries.clear()
+        for _ in range(1000):
+            assert authorization_engine.has_permission(db, str(user_id), str(tenant_id), "workflows:read")
+        assert database.queries == []
+
+
+def test_role_model_checks_use_the_cached_grants(database):
+    tenant_id = uuid.uuid4()
+    with database.session() as db:
+        read, write = permission(db, "files:read"), permission(db, "files:write")
+        viewer = role(db, tenant_id, (read, True, {}), (write, False, {}))
+        db.commit()
+
+        assert viewer.has_permission("files:read") and not viewer.has_permission("files:write")
+        assert RBACRolePermission.has_permission(db, viewer.id, "files:read", tenant_id=tenant_id)
+        assert not RBACRolePermission.has_permission(db, viewer.id, "files:read", tenant_id=uuid.uuid4())
+
+        database.queries.clear()
+        for _ in range(100):
+            assert viewer.has_permission("files:read")
+            assert not RBACRolePermission.has_permission(db, viewer.id, "files:write")
+        assert database.queries == []
+
+
+def test_role_and_assignment_changes_invalidate_principals(database):
+    user_id, tenant_id = uuid.uuid4(), uuid.uuid4()
+    with database.session() as db:
+        read, write = permission(db, "projects:read"), permission(db, "projects:write")
+        member = role(db, tenant_id, (read, True, {}))
+        assignment = assign(db, user_id, tenant_id, member)
+        db.commit()
+        assert not authorization_engine.has_permission(db, user_id, tenant_id, "projects:write")
+
+        # Outra sessão concede a permissão ao role
+        with database.session() as other:
+            other.add(RBACRolePermission(id=uuid.uuid4(), role_id=member.id, permission_id=write.id, granted=True, conditions={}))
+            other.commit()
+        assert authorization_engine.has_permission(db, user_id, tenant_id, "projects:write")
+
+        db.delete(assignment)
+        db.commit()
+        assert not authorization_engine.has_permission(db, user_id, tenant_id, "projects:read")
+
+        # Alteração desfeita também invalida o que foi lido durante a transação
+        assign(db, user_id, tenant_id, member)
+        db.flush()
+        assert authorization_engine.has_permission(db, user_id, tenant_id, "projects:read")
+        db.rollback()
+        assert not authorization_engine.has_permission(db, user_id, tenant_id, "projects:read")
+
+
+def test_assignment_expiry_is_honoured_between_reloads(database, monkeypatch):
+    user_id, tenant_id = uuid.uuid4(), uuid.uuid4()
+    now = [datetime.now(timezone.utc).timestamp()]
+    monkeypatch.setattr(authorization_engine, "clock", lambda: now[0])
+    with database.session() as db:
+        temporary = role(db, tenant_id, (permission(db, "reports:read"), True, {}))
+        assign(db, user_id, tenant_id, temporary, expires_at=datetime.now(timezone.utc) + timedelta(seconds=30))
+        db.commit()
+
+        assert authorization_engine.has_permission(db, user_id, tenant_id, "reports:read")
+        now[0] += 31
+        assert not authorization_engine.has_permission(db, user_id, tenant_id, "reports:read")
+
+
+def test_workspace_checks_are_lookups_after_the_first_load(database):
+    owner, admin, viewer, outsider = (uuid.uuid4() for _ in range(4))
+    tenant_id, workspace_id = uuid.uuid4(), uuid.uuid4()
+    with database.session() as db:
+        db.add(Workspace(id=workspace_id, name="w", slug="w", type="collaborative", owner_id=owner, tenant_id=tenant_id))
+        joined = datetime.now(timezone.utc)
+        members = {}
+        for user_id, member_role in ((admin, "admin"), (viewer, "viewer")):
+            members[user_id] = WorkspaceMember(
+                workspace_id=workspace_id,
+                user_id=user_id,
+                tenant_id=tenant_id,
+                role=member_role,
+                status="active",
+                is_favorite=False,
+                joined_at=joined,
+                last_seen_at=joined,
+            )
+            db.add(members[user_id])
+        db.commit()
+
+        # Mesmas chamadas de WorkspaceService._has_permission/_is_workspace_member
+        ws = str(workspace_id)
+        can = lambda user_id, permission: authorization_engine.has_workspace_permission(db, ws, str(user_id), permission)
+        member = lambda user_id: authorization_engine.is_workspace_member(db, ws, str(user_id))
+        assert can(owner, "admin") and can(admin, "admin") and can(viewer, "read")
+        assert not can(viewer, "write") and not can(outsider, "read")
+        assert member(viewer) and not member(outsider) and not member(owner)
+
+        database.queries.clear()
+        for _ in range(500):
+            assert can(admin, "write") and member(viewer)
+        assert database.queries == []
+
+        members[viewer].status = "left"
+        db.commit()
+        assert not member(viewer)
+
+
+class FakeRedis:
+    """Stream compartilhado entre "workers" (XADD com MAXLEN, XRANGE, XREVRANGE, XLEN)"""
+
+    def __init__(self):
+        self.streams = {}
+        self.sequence = 0
+
+    def pipeline(self, transaction=True):
+        calls = []
+        redis = self
+
+        class Pipeline:
+            def __getattr__(self, name):
+                return lambda *args, **kwargs: calls.append((name, args, kwargs))
+
+            async def execute(self):
+                return [await getattr(redis, name)(*args, **kwargs) for name, args, kwargs in calls]
+
+        return Pipeline()
+
+    async def xadd(self, key, fields, maxlen=None, approximate=True):
+        self.sequence += 1
+        entries = self.streams.setdefault(key, [])
+        entries.append((f"{self.sequence}-0".encode(), {name.encode(): value.encode() for name, value in fields.items()}))
+        if maxlen is not None:
+            del entries[: max(len(entries) - maxlen, 0)]
+
+    async def xrange(self, key, min="-", max="+", count=None):
+        after = int(min[1:].split("-")[0]) if min.startswith("(") else 0
+        entries = [entry for entry in self.streams.get(key, []) if int(entry[0].split(b"-")[0]) > after]
+        return entries[:count]
+
+    async def xrevrange(self, key, max="+", min="-", count=None):
+        return list(reversed(self.streams.get(key, [])))[:count]
+
+    async def xlen(self, key):
+        return len(self.streams.get(key, []))
+
+
+def test_versions_are_shared_between_workers():
+    redis = FakeRedis()
+    workers = [AuthorizationEngine(redis_prefix="authz"), AuthorizationEngine(redis_prefix="authz")]
+    for worker in workers:
+        worker._client = redis
+        asyncio.run(worker.sync_versions())
+
+    before = workers[1].version("workspace:w1")
+    workers[0].bump(["workspace:w1"], publish=True)
+    asyncio.run(workers[0].sync_versions())
+    assert asyncio.run(workers[1].sync_versions()) == 1
+    assert workers[1].version("workspace:w1") == before + 1
+    assert asyncio.run(workers[1].sync_versions()) == 0
+
+
+def test_change_log_is_bounded_and_lagging_workers_reset(monkeypatch):
+    redis = FakeRedis()
+    workers = [AuthorizationEngine(redis_prefix="authz"), AuthorizationEngine(redis_prefix="authz")]
+    for worker in workers:
+        worker.change_log_size = 5
+        worker._client = redis
+        asyncio.run(worker.sync_versions())
+
+    workers[0].bump([f"workspace:w{index}" for index in range(3)], publish=True)
+    asyncio.run(workers[0].sync_versions())
+    assert asyncio.run(workers[1].sync_versions()) == 3
+    assert workers[1].stats["remote_resets"] == 0
+
+    # Mais alterações do que o log guarda: o worker atrasado descarta o cache
+    cleared = []
+    monkeypatch.setattr(workers[1], "clear", lambda: cleared.append(True))
+    workers[0].bump([f"workspace:w{index}" for index in range(3, 12)], publish=True)
+    asyncio.run(workers[0].sync_versions())
+    assert len(redis.streams["authz:changes"]) == 5
+    asyncio.run(workers[1].sync_versions())
+    assert cleared and workers[1].stats["remote_resets"] == 1
+    assert asyncio.run(workers[1].sync_versions()) == 0
@@ -0,0 +1,253 @@
+"""
+Testes do motor de exportação em massa: partições, checksums, retomada e
+download com Range
+"""
+
+import csv
+import gzip
+import hashlib
+import io
+import json
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import Column, DateTime, Float, MetaData, String, Table
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import sessionmaker
+
+from synapse.core.analytics.bulk_export import (
+    ExportFormatError,
+    PartitionWriter,
+    iter_file_range,
+    parse_byte_range,
+    split_time_range,
+)
+from synapse.core.analytics.report_query import ReportSource, compile_report_query
+from synapse.models.analytics_export import AnalyticsExport
+from synapse.services.bulk_export_service import REPORT_SOURCES, BulkExportService, export_status
+
+from sqlite_support import sqlite_engine
+
+pytestmark = pytest.mark.unit
+
+
+def test_time_range_partitions_are_half_open_and_contiguous():
+    start = datetime(2026, 1, 1)
+    ranges = split_time_range(start, start + timedelta(hours=30), timedelta(hours=12))
+    assert [(b - a).total_seconds() / 3600 for a, b in ranges] == [12, 12, 6]
+    assert all(ranges[i][1] == ranges[i + 1][0] for i in range(len(ranges) - 1))
+
+    compiled = compile_report_query(
+        {"type": "events", "date_range": {"start": ranges[0][0], "end": ranges[0][1]}}, REPORT_SOURCES
+    )
+    sql = str(compiled.statement.compile(dialect=postgresql.dialect()))
+    assert "timestamp >= " in sql and "timestamp < " in sql and "timestamp <=" not in sql
+
+
+@pytest.mark.parametrize("fmt", ["csv", "jsonl"])
+def test_gzip_partitions_concatenate_with_single_header_and_checksums(tmp_path, fmt):
+    files = []
+    for index, rows in enumerate([[(1, "a"), (2, "b")], [(3, "c")]]):
+        writer = PartitionWriter(tmp_path / f"part-{index}", ["n", "s"], fmt, "gzip", header=index == 0)
+        writer.write_rows(rows)
+        size, checksum = writer.commit()
+        path = tmp_path / f"part-{index}"
+        assert size == path.stat().st_size
+        assert checksum == hashlib.sha256(path.read_bytes()).hexdigest()
+        files.append((path, size))
+
+    text = gzip.decompress(b"".join(iter_file_range(files))).decode()
+    if fmt == "csv":
+        assert list(csv.reader(io.StringIO(text))) == [["n", "s"], ["1", "a"], ["2", "b"], ["3", "c"]]
+    else:
+        assert [json.loads(line)["n"] for line in text.splitlines()] == [1, 2, 3]
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_missing_optional_codecs_fail_before_writing(tmp_path):
+    for fmt, compression, module in (("csv", "zstd", "zstandard"), ("parquet", "none", "pyarrow")):
+        try:
+            __import__(module)
+        except ImportError:
+            with pytest.raises(ExportFormatError):
+                PartitionWriter(tmp_path / "part", ["n"], fmt, compression)
+            assert not list(tmp_path.iterdir())
+
+
+def test_byte_ranges_span_partition_files(tmp_path):
+    files = []
+    for index, data in enumerate([b"abcd", b"efg", b"hijkl"]):
+        path = tmp_path / f"f{index}"
+        path.write_bytes(data)
+        files.append((path, len(data)))
+
+    assert parse_byte_range(None, 12) is None
+    assert parse_byte_range("bytes=0-1,4-5", 12) is None
+    assert parse_byte_range("bytes=-3", 12) == (9, 11)
+    assert parse_byte_range("bytes=10-", 12) == (10, 11)
+    with pytest.raises(ValueError):
+        parse_byte_range("bytes=12-", 12)
+
+    assert b"".join(iter_file_range(files, 2, 8)) == b"cdefghi"
+    assert b"".join(iter_file_range(files, *parse_byte_range("bytes=-3", 12), chunk_size=2)) == b"jkl"
+
+
+def _export_environment(tmp_path):
+    engine = sqlite_engine(tmp_path, threaded=True)
+
+    metadata = MetaData()
+    events = Table(
+        "events",
+        metadata,
+        Column("action", String),
+        Column("value", Float),
+        Column("timestamp", DateTime),
+        Column("tenant_id", String),
+    )
+    metadata.create_all(engine)
+    AnalyticsExport.__table__.create(engine)
+    Session = sessionmaker(bind=engine)
+
+    start = datetime(2026, 1, 1)
+    with engine.begin() as conn:
+        conn.execute(
+            events.insert(),
+            [{"action": f"a{i % 3}", "value": i, "timestamp": start + timedelta(minutes=30 * i)} for i in range(144)],
+        )
+    service = BulkExportService(
+        workers=3,
+        partition_span=timedelta(hours=12),
+        batch_size=7,
+        session_factory=Session,
+        storage_root=tmp_path / "storage",
+        sources={"events": ReportSource(events, ("action", "value", "timestamp"), ("action", "value"))},
+    )
+    return service, Session
+
+
+def test_export_runs_partitions_in_parallel_and_resumes_only_broken_ones(tmp_path):
+    service, Session = _export_environment(tmp_path)
+    db = Session()
+    owner = uuid.uuid4()
+    export = service.create(
+        db,
+        owner_id=owner,
+        name="events",
+        export_type="csv",
+        export_query={"data_type": "events", "filters": {"action": ["a0", "a1"]}},
+    )
+    service.shutdown(wait=True)
+    db.expire_all()
+    export = service.get_export(db, export.id, owner)
+
+    status = export_status(export)
+    assert export.status == "completed" and status["progress"] == 100.0
+    assert status["partitions"] == 6 and export.rows_exported == 96
+    assert sum(stats["rows"] for stats in status["workers"].values()) == 96
+
+    files, filename, etag = service.download_files(export)
+    rows = list(csv.reader(io.StringIO(gzip.decompress(b"".join(iter_file_range(files))).decode())))
+    assert filename.endswith(".csv.gz") and rows[0] == ["action", "value"] and len(rows) == 97
+    document = json.loads((service.storage_root / export.file_path / "manifest.json").read_text())
+    assert [item["sha256"] for item in document["files"]] == [p["sha256"] for p in export.manifest["partitions"]]
+
+    # Partição corrompida: só ela é regravada na retomada
+    broken = files[2][0]
+    broken.write_bytes(b"truncated")
+    untouched = files[4][0].stat().st_mtime_ns
+    export.status = "failed"
+    db.commit()
+    assert service.resume(export)
+    db.commit()
+    service.run(export.id)
+    db.expire_all()
+    export = service.get_export(db, export.id, owner)
+
+    files, _, resumed_etag = service.download_files(export)
+    assert export.status == "completed" and resumed_etag == etag
+    assert files[4][0].stat().st_mtime_ns == untouched
+    assert len(gzip.decompress(b"".join(iter_file_range(files))).decode().splitlines()) == 97
+    service.shutdown(wait=True)
+    db.close()
+
+
+def test_failed_partition_marks_export_resumable(tmp_path):
+    service, Session = _export_environment(tmp_path)
+    db = Session()
+    export = AnalyticsExport(
+        id=uuid.uuid4(),
+        name="e",
+        export_type="jsonl",
+        export_query={"type": "events", "compression": "none"},
+        owner_id=uuid.uuid4(),
+        status="pending",
+    )
+    db.add(export)
+    db.commit()
+
+    original = service._export_partition
+
+    def flaky(config, tenant_id, manifest, partition, directory):
+        if partition.index == 1:
+            raise OSError("disk full")
+        return original(config, tenant_id, manifest, partition, directory)
+
+    service._export_partition = flaky
+    service.run(export.id)
+    db.expire_all()
+    status = export_status(db.get(AnalyticsExport, export.id))
+    assert status["status"] == "failed" and status["partitions_failed"] == 1
+    assert status["partitions_completed"] == 5 and "retomada" in status["error_message"]
+
+    with pytest.raises(LookupError):
+        service.download_files(db.get(AnalyticsExport, export.id))
+    service.shutdown(wait=True)
+    db.close()
+
+
+def test_recovery_only_fails_exports_with_a_stale_heartbeat(tmp_path):
+    engine = sqlite_engine(tmp_path, models=(AnalyticsExport,))
+    Session = sessionmaker(bind=engine)
+    service = BulkExportService(
+        session_factory=Session,
+        storage_root=tmp_path,
+        worker_id="api-1:10",
+        stale_after=timedelta(minutes=5),
+    )
+    now = datetime(2026, 1, 1, 12, tzinfo=timezone.utc)
+
+    db = Session()
+    exports = {}
+    for name, status, worker, idle in [
+        ("other_live", "processing", "api-2:20", 1),
+        ("other_dead", "processing", "api-3:30", 10),
+        ("own_old_heartbeat", "processing", "api-1:10", 10),
+        ("queued", "pending", None, None),
+    ]:
+        exports[name] = AnalyticsExport(
+            id=uuid.uuid4(),
+            name=name,
+            export_type="csv",
+            export_query={"type": "events"},
+            owner_id=uuid.uuid4(),
+            status=status,
+            worker_id=worker,
+            heartbeat_at=now - timedelta(minutes=idle) if idle is not None else None,
+        )
+    db.add_all(exports.values())
+    db.commit()
+
+    # O heartbeat renova só as exportações em andamento deste processo
+    assert service.heartbeat() == 1
+    assert service.recover_interrupted(db, now=now) == 1
+
+    db.expire_all()
+    statuses = {name: db.get(AnalyticsExport, export.id).status for name, export in exports.items()}
+    assert statuses == {
+        "other_live": "processing",
+        "other_dead": "failed",
+        "own_old_heartbeat": "processing",
+        "queued": "pending",
+    }
+    db.close()
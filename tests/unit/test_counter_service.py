@@ -0,0 +1,212 @@
+"""
+Testes dos contadores sem contenção: incrementos concorrentes sem perdas,
+UPDATE atômico com médias de avaliação recalculadas, devolução do lote em
+falhas e scores de tendência com decaimento
+"""
+
+import asyncio
+import threading
+import uuid
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import insert, select
+from sqlalchemy.orm import sessionmaker
+
+import synapse.database
+from synapse.models.template import TemplateReview
+from synapse.models.workflow_template import WorkflowTemplate
+from synapse.services.counter_service import (
+    PERIOD_HALF_LIVES,
+    TEMPLATE,
+    CounterService,
+    DecayedScores,
+)
+
+from sqlite_support import sqlite_engine
+
+pytestmark = pytest.mark.unit
+
+HOUR = 3600
+
+
+class Clock:
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def service(**kwargs):
+    kwargs.setdefault("redis_prefix", "")
+    kwargs.setdefault("half_life_hours", 24)
+    return CounterService(**kwargs)
+
+
+@pytest.fixture()
+def template_table(tmp_path, monkeypatch):
+    engine = sqlite_engine(tmp_path, models=(WorkflowTemplate, TemplateReview))
+
+    factory = sessionmaker(bind=engine)
+
+    @contextmanager
+    def get_db_session():
+        with factory() as db:
+            yield db
+            db.commit()
+
+    monkeypatch.setattr(synapse.database, "get_db_session", get_db_session)
+
+    template_id = uuid.uuid4()
+    with engine.begin() as connection:
+        connection.execute(
+            insert(WorkflowTemplate.__table__),
+            {
+                "id": template_id,
+                "name": "t",
+                "title": "t",
+                "category": "c",
+                "author_id": uuid.uuid4(),
+                "workflow_definition": {},
+                "workflow_data": {},
+                "nodes_data": [],
+                "rating_average": 4.0,
+                "rating_count": 2,
+                "usage_count": 10,
+            },
+        )
+
+    def read():
+        with engine.connect() as connection:
+            return connection.execute(
+                select(WorkflowTemplate.__table__).where(WorkflowTemplate.id == template_id)
+            ).one()
+
+    yield engine, template_id, read
+    engine.dispose()
+
+
+def test_concurrent_increments_are_not_lost_and_flush_atomically(template_table):
+    _, template_id, read = template_table
+    workers = [service(shards=4), service(shards=4)]
+
+    def hammer(counters):
+        for _ in range(2500):
+            counters.increment(TEMPLATE, template_id, touch=True, usage_count=1, downloads_count=2)
+
+    threads = [threading.Thread(target=hammer, args=(workers[i % 2],)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # Cada worker grava o seu lote com x = x + delta: nada se perde entre eles
+    assert all(counters.pending() == 1 for counters in workers)
+    assert asyncio.run(workers[0].flush()) == 1
+    assert asyncio.run(workers[1].flush()) == 1
+    row = read()
+    assert row.usage_count == 10 + 8 * 2500
+    assert row.downloads_count == 8 * 2500 * 2
+    assert row.download_count is None and row.last_used_at is not None
+    assert workers[0].stats["increments"] == 4 * 2500
+
+
+def test_rating_average_is_recomputed_from_the_ratings_table(template_table):
+    engine, template_id, read = template_table
+    counters = service()
+
+    def review(review_id, rating):
+        return {
+            "id": review_id,
+            "template_id": template_id,
+            "user_id": uuid.uuid4(),
+            "tenant_id": uuid.uuid4(),
+            "rating": rating,
+        }
+
+    with engine.begin() as connection:
+        connection.execute(insert(TemplateReview.__table__), [review(1, 5), review(2, 3), review(3, 4)])
+    counters.add_rating(TEMPLATE, template_id)
+    counters.add_rating(TEMPLATE, template_id)
+    assert counters.pending() == 1
+    asyncio.run(counters.flush())
+    row = read()
+    assert (row.rating_count, float(row.rating_average)) == (3, 4.0)
+
+    # Remoção de uma nota e alteração de outra: nada de delta acumulado
+    with engine.begin() as connection:
+        connection.execute(TemplateReview.__table__.delete().where(TemplateReview.id == 1))
+        connection.execute(TemplateReview.__table__.update().where(TemplateReview.id == 2).values(rating=5))
+    counters.add_rating(TEMPLATE, template_id)
+    asyncio.run(counters.flush())
+    row = read()
+    assert (row.rating_count, float(row.rating_average)) == (2, 4.5)
+
+    with engine.begin() as connection:
+        connection.execute(TemplateReview.__table__.delete())
+    counters.add_rating(TEMPLATE, template_id)
+    asyncio.run(counters.flush())
+    row = read()
+    assert (row.rating_count, float(row.rating_average)) == (0, 0.0)
+
+
+def test_failed_flush_requeues_and_merges_with_new_increments():
+    template_id = uuid.uuid4()
+    calls = []
+
+    def writer(batch, targets):
+        calls.append({key: dict(entry.deltas) for key, entry in batch.items()})
+        if len(calls) == 1:
+            raise RuntimeError("banco indisponível")
+        return len(batch)
+
+    counters = service(writer=writer)
+    counters.increment(TEMPLATE, template_id, usage_count=2)
+    assert asyncio.run(counters.flush()) == 0
+    assert counters.stats["failed_flushes"] == 1
+
+    counters.increment(TEMPLATE, str(template_id), usage_count=1)
+    assert asyncio.run(counters.flush()) == 1
+    assert calls[-1] == {(TEMPLATE, str(template_id)): {"usage_count": 3}}
+    assert counters.pending() == 0
+
+
+def test_invalid_ids_and_columns_fail_at_increment():
+    counters = service(writer=lambda batch, targets: len(batch))
+    with pytest.raises(ValueError):
+        counters.increment(TEMPLATE, "not-a-uuid", usage_count=1)
+    with pytest.raises(ValueError):
+        counters.increment(TEMPLATE, uuid.uuid4(), price=1)
+    with pytest.raises(ValueError):
+        counters.increment("unknown", uuid.uuid4(), usage_count=1)
+    assert counters.pending() == 0
+
+
+def test_trending_scores_decay_with_half_life():
+    clock = Clock()
+    counters = service(clock=clock, writer=lambda batch, targets: len(batch))
+    old, new = uuid.uuid4(), uuid.uuid4()
+
+    counters.increment(TEMPLATE, old, downloads_count=10)
+    asyncio.run(counters.flush())
+    clock.now += 24 * HOUR
+    counters.increment(TEMPLATE, new, downloads_count=3, usage_count=1)
+    asyncio.run(counters.flush())
+
+    ranked = asyncio.run(counters.trending(TEMPLATE, 10))
+    assert [key for key, _ in ranked] == [str(new), str(old)]
+    assert [score for _, score in ranked] == pytest.approx([6.0, 5.0])
+
+
+def test_trending_survives_period_rollover():
+    half_life = 1.0
+    clock = Clock(now=PERIOD_HALF_LIVES * half_life * 10 - 0.5)
+    scores = DecayedScores(half_life, clock)
+    asyncio.run(scores.add("s", {"a": 8.0}))
+
+    clock.now += 2.0  # atravessa o marco do período
+    asyncio.run(scores.add("s", {"b": 1.0}))
+    ranked = dict(asyncio.run(scores.top("s", 10)))
+    assert ranked["a"] == pytest.approx(2.0)
+    assert ranked["b"] == pytest.approx(1.0)
@@ -0,0 +1,111 @@
+"""
+Testes da avaliação concorrente de widgets de dashboard
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from synapse.services.dashboard_evaluator import (
+    DashboardEvaluator,
+    format_sse,
+    widget_cache_key,
+)
+
+pytestmark = pytest.mark.unit
+
+
+class MemoryCache:
+    def __init__(self):
+        self.data = {}
+        self.ttls = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, ttl=None):
+        self.data[key] = value
+        self.ttls[key] = ttl
+        return True
+
+
+def test_cache_key_is_stable_and_bucketed_by_granularity():
+    config = {"time_range": "1h", "metric_name": "latency", "tags": {"b": 1, "a": 2}}
+    reordered = {"tags": {"a": 2, "b": 1}, "metric_name": "latency", "time_range": "1h"}
+
+    assert widget_cache_key("metric_chart", config, now=600) == widget_cache_key("metric_chart", reordered, now=659)
+    assert widget_cache_key("metric_chart", config, now=600) != widget_cache_key("metric_chart", config, now=660)
+    assert widget_cache_key("kpi_card", config, now=600) != widget_cache_key("metric_chart", config, now=600)
+    assert widget_cache_key("kpi_card", {"time_range": "30d"}, now=600).split(":")[4] == "3600"
+    # Mesma configuração em tenants diferentes não compartilha resultado
+    assert widget_cache_key("kpi_card", {**config, "tenant_id": "t1"}, now=600) != widget_cache_key(
+        "kpi_card", {**config, "tenant_id": "t2"}, now=600
+    )
+
+
+def test_widget_config_is_scoped_to_the_caller_tenant():
+    seen = []
+
+    def compute(widget_type, config):
+        seen.append(config["tenant_id"])
+        return {"tenant": config["tenant_id"]}
+
+    widgets = [
+        {"id": "saved", "type": "kpi_card", "config": {"kpi_type": "active_users", "tenant_id": "victim"}},
+        {"id": "plain", "type": "kpi_card", "config": {"kpi_type": "active_users"}},
+    ]
+
+    async def scenario():
+        evaluator = DashboardEvaluator(compute=compute, cache=MemoryCache())
+        mine = await evaluator.evaluate(widgets, tenant_id="caller")
+        other = await evaluator.evaluate(widgets, tenant_id="other")
+        return mine, other
+
+    mine, other = asyncio.run(scenario())
+
+    assert mine["saved"]["data"] == mine["plain"]["data"] == {"tenant": "caller"}
+    assert other["saved"]["data"] == {"tenant": "other"} and not other["saved"]["cached"]
+    assert "victim" not in seen
+
+
+def test_widgets_run_concurrently_with_cap_and_cache():
+    calls = []
+    active = {"now": 0, "peak": 0}
+    lock = threading.Lock()
+
+    def compute(widget_type, config):
+        with lock:
+            calls.append(config["n"])
+            active["now"] += 1
+            active["peak"] = max(active["peak"], active["now"])
+        time.sleep(0.05)
+        with lock:
+            active["now"] -= 1
+        if config["n"] == 3:
+            raise RuntimeError("query failed")
+        return {"value": config["n"]}
+
+    widgets = [{"id": f"w{n}", "type": "kpi_card", "config": {"n": n}} for n in range(8)]
+    widgets.append({"id": "dup", "type": "kpi_card", "config": {"n": 0}})
+    widgets.append({"id": "bad", "type": "unknown"})
+
+    async def scenario():
+        evaluator = DashboardEvaluator(compute=compute, concurrency=3, cache=MemoryCache())
+        first = await evaluator.evaluate(widgets)
+        second = await evaluator.evaluate(widgets)
+        return first, second
+
+    first, second = asyncio.run(scenario())
+
+    assert active["peak"] == 3
+    assert sorted(calls).count(0) == 1  # widget duplicado calculado uma vez
+    assert first["w5"]["data"] == {"value": 5} and first["dup"]["data"] == {"value": 0}
+    assert "query failed" in first["w3"]["error"]
+    assert "error" in first["bad"]
+    assert second["w5"]["cached"] and not second["w3"]["cached"]
+
+
+def test_format_sse():
+    assert format_sse("widget", {"id": 1}) == 'event: widget\ndata: {"id": 1}\n\n'
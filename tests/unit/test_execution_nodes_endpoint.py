@@ -0,0 +1,103 @@
+"""
+Testes do endpoint de nós de uma execução: a listagem sem dados carrega só o
+resumo (colunas pesadas adiadas) e valida o mesmo schema da listagem completa
+"""
+
+import asyncio
+import uuid
+from datetime import datetime, timezone
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from sqlalchemy.orm import sessionmaker
+
+from synapse.api.deps import get_current_active_user, get_db
+from synapse.api.v1.endpoints import executions
+from synapse.models.node_execution import NodeExecution
+from synapse.models.workflow_execution import WorkflowExecution
+
+from sqlite_support import sqlite_engine
+
+pytestmark = pytest.mark.unit
+
+
+class CurrentUser:
+    def __init__(self, tenant_id):
+        self.id = uuid.uuid4()
+        self.tenant_id = tenant_id
+
+
+@pytest.fixture()
+def client():
+    engine = sqlite_engine(models=(WorkflowExecution, NodeExecution), threaded=True)
+    factory = sessionmaker(bind=engine)
+    tenant_id = uuid.uuid4()
+    now = datetime.now(timezone.utc)
+
+    with factory() as db:
+        execution = WorkflowExecution(
+            id=uuid.uuid4(),
+            execution_id="exec_nodes",
+            workflow_id=uuid.uuid4(),
+            user_id=uuid.uuid4(),
+            status="completed",
+            tenant_id=tenant_id,
+        )
+        db.add(execution)
+        db.flush()
+        for order, error in enumerate((None, "falhou")):
+            db.add(
+                NodeExecution(
+                    execution_id=str(uuid.uuid4()),
+                    workflow_execution_id=execution.id,
+                    node_id=uuid.uuid4(),
+                    node_key=f"n{order}",
+                    node_type="transform",
+                    execution_order=order,
+                    output_data={"result": "success", "output": {"rows": order}},
+                    execution_log="log " * 100,
+                    started_at=now,
+                    completed_at=now,
+                    error_message=error,
+                    retry_count=0,
+                    max_retries=3,
+                    tenant_id=tenant_id,
+                    created_at=now,
+                    updated_at=now,
+                )
+            )
+        db.commit()
+
+    def session():
+        with factory() as db:
+            yield db
+
+    app = FastAPI()
+    app.include_router(executions.router, prefix="/executions")
+    app.dependency_overrides[get_db] = session
+    app.dependency_overrides[get_current_active_user] = lambda: CurrentUser(tenant_id)
+
+    async def get(path):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as http:
+            return await http.get(path)
+
+    yield lambda path: asyncio.run(get(path))
+    engine.dispose()
+
+
+def test_node_summaries_validate_without_loading_heavy_columns(client):
+    response = client("/executions/exec_nodes/nodes")
+    assert response.status_code == 200
+    body = response.json()
+    assert body["total"] == 2
+    assert [(item["node_key"], item["status"]) for item in body["items"]] == [
+        ("n0", "completed"),
+        ("n1", "failed"),
+    ]
+    assert all(item["output_data"] is None and item["execution_log"] is None for item in body["items"])
+
+    full = client("/executions/exec_nodes/nodes?include_data=true").json()
+    assert [item["status"] for item in full["items"]] == ["completed", "failed"]
+    assert full["items"][1]["output_data"] == {"result": "success", "output": {"rows": 1}}
@@ -0,0 +1,200 @@
+"""
+Testes dos outputs em camadas: outputs pequenos na linha, grandes
+comprimidos no armazenamento com referência, carregamento sob demanda pelo
+contexto (variáveis, expressões), cache limitado, referências forjadas e
+remoção junto com a execução
+"""
+
+import asyncio
+import gzip
+import json
+import threading
+import uuid
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from synapse.core.executors.base import BaseExecutor, ExecutionContext
+from synapse.core.executors.expressions import compile_expression
+from synapse.core.executors.outputs import (
+    ExecutionOutputStore,
+    NodeOutputs,
+    is_output_reference,
+)
+from synapse.models.node_execution import NodeExecution
+from synapse.models.workflow_execution import WorkflowExecution
+from synapse.models.workflow_execution_metric import WorkflowExecutionMetric
+from synapse.models.workflow_execution_queue import WorkflowExecutionQueue
+from synapse.services.execution_output_service import ExecutionOutputService, execution_output_service
+
+from sqlite_support import sqlite_engine
+
+pytestmark = pytest.mark.unit
+
+LARGE = {"items": [{"id": index, "text": "x" * 40} for index in range(200)]}
+
+
+@pytest.fixture()
+def store(tmp_path):
+    return ExecutionOutputStore(tmp_path, inline_bytes=1024)
+
+
+def test_small_outputs_stay_inline_and_large_ones_are_stored(store, tmp_path):
+    inline, size = store.put("exec_1", "small", {"ok": True})
+    assert inline == {"ok": True} and size == len('{"ok":true}')
+
+    reference, size = store.put("exec_1", "../grande nó", LARGE)
+    assert is_output_reference(reference)
+    assert reference["bytes"] == size > 1024 > reference["stored_bytes"]
+    assert reference["preview"].startswith('{"items":[{"id":0')
+
+    # Caminho relativo à raiz, sem sair do diretório da execução
+    path = tmp_path / reference["$ref"]
+    assert path.parent == tmp_path / "execution_outputs" / "exec_1"
+    with gzip.open(path, "rb") as handle:
+        assert json.loads(handle.read()) == LARGE
+    assert store.load(reference, "exec_1") == LARGE
+    assert store.resolve_output_data({"result": "success", "output": reference}, "exec_1")["output"] == LARGE
+
+    store.delete_execution("exec_1")
+    assert not path.exists()
+
+
+def test_references_outside_the_execution_directory_are_rejected(store):
+    with pytest.raises(ValueError):
+        store.load({"$ref": "../../etc/passwd", "encoding": "json+gzip"}, "exec_1")
+
+    # Referência válida, mas de outra execução
+    reference, _ = store.put("exec_other", "big", LARGE)
+    with pytest.raises(ValueError):
+        store.load(reference, "exec_1")
+    assert store.load(reference, "exec_other") == LARGE
+
+
+def test_inline_outputs_shaped_like_references_are_not_followed(store, tmp_path):
+    secret, _ = store.put("exec_victim", "big", LARGE)
+    forged = {"$ref": secret["$ref"], "encoding": "json+gzip"}
+
+    # Gravado pelo store: o formato de referência nunca fica inline na linha
+    stored, _ = store.put("exec_6", "forged", forged)
+    assert stored["$ref"].startswith("execution_outputs/exec_6/")
+    assert store.load(stored, "exec_6") == forged
+
+    # Na memória da execução só vale como referência o que ``spill`` gravou
+    outputs = NodeOutputs(store, execution_id="exec_6")
+    outputs["forged"] = forged
+    assert outputs["forged"] == forged
+    outputs.spill("spilled", forged)
+    assert outputs["spilled"] == forged and outputs.references == {"spilled"}
+
+
+def test_node_outputs_keep_only_references_and_load_on_demand(store):
+    outputs = NodeOutputs(store, execution_id="exec_2", cache_bytes=1_000_000)
+    assert outputs.spill("a", {"value": 1}) == {"value": 1}
+    row_value = outputs.spill("b", LARGE)
+
+    assert is_output_reference(row_value)
+    assert outputs.snapshot()["b"] is row_value  # snapshot não carrega nada
+    assert outputs.stats["loads"] == 0
+    assert outputs["b"] == LARGE and outputs.get("b") == LARGE
+    assert outputs["b"] is outputs["b"]  # segunda leitura vem do cache
+    assert outputs.stats["loads"] == 1
+    assert (outputs.stats["inline"], outputs.stats["spilled"]) == (1, 1)
+    assert outputs.stats["spilled_bytes"] == row_value["bytes"]
+
+
+def test_cache_is_bounded_by_bytes(store):
+    outputs = NodeOutputs(store, execution_id="exec_3", cache_bytes=20_000)
+    for key in ("a", "b", "c"):
+        outputs.spill(key, LARGE)  # ~11 KB cada: cabem só um no cache
+    for key in ("a", "b", "a", "c"):
+        assert outputs[key] == LARGE
+    assert outputs.stats["loads"] == 4
+    assert outputs._cached_bytes <= 20_000
+
+
+def test_context_reads_spilled_outputs_through_variables_and_expressions(store):
+    context = ExecutionContext("exec_4", 1, 1, output_store=store)
+    context.set_node_output("fetch", LARGE)  # executor grava o output completo
+    context.node_outputs.spill("fetch", LARGE)  # engine externaliza ao concluir
+
+    assert context.to_dict()["node_outputs"]["fetch"]["$ref"].endswith(".json.gz")
+    assert context.get_node_output("fetch") == LARGE
+    assert BaseExecutor.lookup_variable(None, "fetch.items.3.id", context) == 3
+    scope = {"nodes": context.node_outputs}
+    assert compile_expression("len(nodes.fetch['items'])").evaluate(scope) == 200
+    assert compile_expression("nodes.get('fetch')['items'][1].id").evaluate(scope) == 1
+
+
+def test_without_store_outputs_behave_like_a_dict():
+    context = ExecutionContext("exec_5", 1, 1)
+    assert context.node_outputs.spill("a", LARGE) is LARGE
+    assert context.to_dict()["node_outputs"] == {"a": LARGE}
+
+
+def test_spill_and_preload_run_off_the_event_loop(store, monkeypatch):
+    outputs = NodeOutputs(store, execution_id="exec_7", cache_bytes=0)
+    threads = []
+
+    def record(function):
+        def wrapper(*args):
+            threads.append(threading.get_ident())
+            return function(*args)
+
+        return wrapper
+
+    monkeypatch.setattr(store, "put", record(store.put))
+    monkeypatch.setattr(store, "load", record(store.load))
+
+    async def run():
+        reference = await outputs.aspill("big", LARGE)
+        outputs["small"] = 1
+        await outputs.preload(["big", "small"])
+        value = outputs["big"]  # pré-carregado: nada é lido no loop
+        outputs.release()
+        return reference, value, threading.get_ident()
+
+    reference, value, loop_thread = asyncio.run(run())
+    assert is_output_reference(reference) and value == LARGE
+    assert len(threads) == 2 and loop_thread not in threads
+    assert outputs.stats["loads"] == 1
+
+
+def test_outputs_are_removed_with_their_execution(store, monkeypatch):
+    engine = sqlite_engine(
+        models=(WorkflowExecution, NodeExecution, WorkflowExecutionMetric, WorkflowExecutionQueue)
+    )
+    monkeypatch.setattr(execution_output_service, "_store", store)
+    kept, deleted, orphan = (str(uuid.uuid4()) for _ in range(3))
+    paths = {}
+    for execution_id in (kept, deleted, orphan):
+        reference, _ = store.put(execution_id, "big", LARGE)
+        paths[execution_id] = store.base_path / reference["$ref"]
+
+    with sessionmaker(bind=engine)() as db:
+        rows = {
+            execution_id: WorkflowExecution(
+                id=uuid.uuid4(),
+                execution_id=execution_id,
+                workflow_id=uuid.uuid4(),
+                user_id=uuid.uuid4(),
+                status="completed",
+            )
+            for execution_id in (kept, deleted)
+        }
+        db.add_all(rows.values())
+        db.commit()
+
+        # Exclusão pela sessão: os arquivos saem no commit, não no flush
+        db.delete(rows[deleted])
+        db.flush()
+        assert paths[deleted].exists()
+        db.commit()
+        assert not paths[deleted].exists()
+
+        # Exclusão fora da sessão: a limpeza periódica remove os órfãos
+        service = ExecutionOutputService(store)
+        assert service.purge(db) == 0  # ainda dentro da carência
+        assert service.purge(db, grace_seconds=-60) == 1
+    assert paths[kept].exists() and not paths[orphan].exists()
+    engine.dispose()
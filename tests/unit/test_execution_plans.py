@@ -0,0 +1,195 @@
+"""
+Testes dos planos de execução compilados: ordem topológica, dependências,
+validação na compilação, cache por versão (memória e compartilhado) e
+invalidação quando nós do workflow mudam
+"""
+
+import asyncio
+import json
+import uuid
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from synapse.core.executors import ExecutionContext, executor_registry
+from synapse.core.executors.plan import ExecutionPlan, NodeSpec, compile_plan
+from synapse.core.executors.templates import compile_template
+from synapse.models.node import Node
+from synapse.models.workflow_connection import WorkflowConnection
+from synapse.models.workflow_node import WorkflowNode
+from synapse.services.execution_plan_service import (
+    ExecutionPlanCache,
+    execution_plan_cache,
+    specs_from_definition,
+)
+
+from sqlite_support import sqlite_engine
+
+pytestmark = pytest.mark.unit
+
+DEFINITION = {
+    "nodes": [
+        {"id": "fetch", "type": "http", "config": {"url": "https://api/${API_HOST}/{{input.id}}", "method": "GET"}},
+        {"id": "report", "type": "transform", "config": {
+            "transform_type": "map", "mapping": {"name": "{{shape.name}}"},
+            "inputs": {"data": {"source_node": "shape"}},
+        }},
+        {"id": "shape", "type": "transform", "config": {"transform_type": "extract", "path": "body"}},
+        {"id": "notify", "type": "http", "config": {"method": "POST"}},
+    ],
+    "connections": [{"source": "fetch", "target": "shape"}],
+}
+
+
+def test_compile_orders_nodes_topologically_and_collects_requirements():
+    specs, edges = specs_from_definition(DEFINITION)
+    plan = compile_plan("wf-1", "v1", specs, edges, registry=executor_registry)
+
+    # "report" depende de "shape" via inputs.source_node, mesmo declarado antes
+    assert [node.key for node in plan.nodes] == ["fetch", "shape", "report", "notify"]
+    assert [node.order for node in plan.nodes] == [0, 1, 2, 3]
+    assert plan.node("shape").dependencies == ("fetch",)
+    assert plan.node("shape").dependents == ("report",)
+    assert plan.required_variables == ("API_HOST",)
+    assert plan.errors == ()
+
+    # Configuração inválida é detectada na compilação pelo executor do tipo
+    assert plan.node("notify").errors == ("URL é obrigatória",)
+    assert plan.node("fetch").is_valid
+
+    # Templates já compilados e fixados no plano
+    (template,) = plan.node("fetch").templates
+    assert template is compile_template("https://api/${API_HOST}/{{input.id}}")
+
+    validation = plan.validate({})
+    assert not validation["is_valid"]
+    assert validation["errors"] == ["Variáveis necessárias não encontradas: API_HOST"]
+    assert validation["warnings"] == ["Nó notify: URL é obrigatória"]
+    assert plan.validate({"API_HOST": "x"})["is_valid"]
+
+
+def test_compile_reports_cycles_and_unknown_connections():
+    specs = [NodeSpec(key, "transform", {"transform_type": "extract", "path": "a"}) for key in "abc"]
+    plan = compile_plan("wf", "v", specs, [("a", "b"), ("b", "a"), ("c", "zzz")])
+
+    assert plan.errors == (
+        "Conexões com nós inexistentes: c -> zzz",
+        "Workflow possui ciclo entre os nós: a, b",
+    )
+    assert [node.key for node in plan.nodes] == ["c", "a", "b"]
+    assert not plan.validate({})["is_valid"]
+
+
+def test_plan_round_trips_through_json():
+    specs, edges = specs_from_definition(DEFINITION)
+    plan = compile_plan("wf-1", "v1", specs, edges, registry=executor_registry)
+
+    restored = ExecutionPlan.from_dict(json.loads(json.dumps(plan.to_dict())))
+
+    assert restored == plan
+    assert restored.node("fetch").templates[0].paths == ("input.id",)
+    assert ExecutionPlan.from_dict({"format": 0}) is None
+
+
+def test_executor_runs_off_plan_without_revalidating(monkeypatch):
+    specs = [NodeSpec("pick", "transform", {"transform_type": "extract", "path": "payload.value",
+                                             "source": "input"})]
+    plan_node = compile_plan("wf", "v", specs, registry=executor_registry).node("pick")
+    executor = executor_registry.get_executor("transform")
+
+    def fail(config):
+        raise AssertionError("validate_config não deve rodar para nós do plano")
+
+    monkeypatch.setattr(executor, "validate_config", fail)
+    context = ExecutionContext("exec-1", 1, 1, input_data={"payload": {"value": 42}})
+    result = asyncio.run(executor.execute(plan_node, context, SimpleNamespace()))
+
+    assert result["success"], result
+    assert context.get_node_output("pick") == result["output"]
+
+
+class MemorySharedCache:
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, ttl=None):
+        self.data[key] = json.loads(json.dumps(value))
+        return True
+
+
+@pytest.fixture()
+def session_factory(tmp_path):
+    engine = sqlite_engine(tmp_path, models=(Node, WorkflowNode, WorkflowConnection))
+
+    return sessionmaker(bind=engine)
+
+
+def seed_workflow(db):
+    workflow = SimpleNamespace(id=uuid.uuid4(), version="1.0", definition={"nodes": [], "connections": []})
+    catalog = Node(
+        id=uuid.uuid4(), name="HTTP", category="http", user_id=uuid.uuid4(),
+        definition={"config": {"method": "GET", "timeout": 10}},
+        created_at=datetime(2026, 10, 1), updated_at=datetime(2026, 10, 1),
+    )
+    first, second = (
+        WorkflowNode(id=uuid.uuid4(), workflow_id=workflow.id, node_id=catalog.id, instance_name=name,
+                     position_x=x, position_y=0, configuration=config,
+                     created_at=datetime(2026, 10, 1), updated_at=datetime(2026, 10, 1))
+        for name, x, config in (
+            ("download", 0, {"url": "https://a"}),
+            ("upload", 100, {"url": "https://b/{{download.body}}", "method": "POST", "body": "x"}),
+        )
+    )
+    db.add_all([catalog, first, second])
+    db.add(WorkflowConnection(id=uuid.uuid4(), workflow_id=workflow.id, source_node_id=first.id,
+                              target_node_id=second.id, updated_at=datetime(2026, 10, 1)))
+    db.commit()
+    return workflow, first, second
+
+
+def test_plan_cache_compiles_once_per_version(session_factory):
+    shared = MemorySharedCache()
+    cache = ExecutionPlanCache(registry=executor_registry, shared_cache=shared)
+    with session_factory() as db:
+        workflow, first, second = seed_workflow(db)
+
+        plan = asyncio.run(cache.get_plan(db, workflow))
+        assert asyncio.run(cache.get_plan(db, workflow)) is plan
+        assert cache.stats["compiles"] == 1 and cache.stats["memory_hits"] == 1
+
+        # Catálogo + instância: tipo e defaults vêm do nó, URL da instância
+        assert [node.key for node in plan.nodes] == [str(first.id), str(second.id)]
+        assert plan.nodes[0].node_type == "http"
+        assert plan.nodes[0].config == {"method": "GET", "timeout": 10, "url": "https://a"}
+        assert plan.nodes[1].dependencies == (str(first.id),)
+        assert plan.nodes[0].catalog_id == str(first.node_id)
+
+        # Outro worker: mesma versão vem do cache compartilhado, sem compilar
+        other = ExecutionPlanCache(registry=executor_registry, shared_cache=shared)
+        assert asyncio.run(other.get_plan(db, workflow)) == plan
+        assert other.stats == {"memory_hits": 0, "shared_hits": 1, "compiles": 0, "invalidations": 0}
+
+
+def test_node_update_invalidates_and_bumps_version(session_factory, monkeypatch):
+    monkeypatch.setattr(execution_plan_cache, "_shared", False)
+    monkeypatch.setattr(execution_plan_cache, "_registry", executor_registry)
+    execution_plan_cache.invalidate()
+    with session_factory() as db:
+        workflow, first, _ = seed_workflow(db)
+        plan = asyncio.run(execution_plan_cache.get_plan(db, workflow))
+        assert execution_plan_cache.get_cached(workflow.id, plan.version) is plan
+
+        first.configuration = {"url": "https://changed"}
+        db.commit()
+
+        # Listener after_flush descartou o plano local; a versão mudou
+        assert execution_plan_cache.get_cached(workflow.id, plan.version) is None
+        updated = asyncio.run(execution_plan_cache.get_plan(db, workflow))
+        assert updated.version != plan.version
+        assert updated.nodes[0].config["url"] == "https://changed"
+    execution_plan_cache.invalidate()
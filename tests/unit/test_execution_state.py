@@ -0,0 +1,186 @@
+"""
+Testes da gravação em lote do estado dos nós: materialização com um INSERT,
+transições e métricas por tick de flush, modo ``final`` (só o estado final
+de nós rápidos) e quantidade de transações por execução
+"""
+
+import asyncio
+import uuid
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import sessionmaker
+
+from synapse.core.config import settings
+from synapse.core.executors import executor_registry
+from synapse.core.executors.plan import NodeSpec, compile_plan
+from synapse.models.node_execution import NodeExecution
+from synapse.models.workflow_execution import ExecutionStatus, WorkflowExecution
+from synapse.models.workflow_execution_metric import WorkflowExecutionMetric
+from synapse.services.execution_plan_service import ExecutionPlanCache
+from synapse.services.execution_service import ExecutionEngine
+from synapse.services.execution_state_service import (
+    NodeStateBuffer,
+    node_execution_rows,
+    update_node_states,
+)
+
+from sqlite_support import sqlite_engine
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture()
+def database(tmp_path):
+    engine = sqlite_engine(tmp_path, models=(WorkflowExecution, NodeExecution, WorkflowExecutionMetric))
+
+    commits = []
+    event.listen(engine, "commit", lambda connection: commits.append(1))
+    factory = sessionmaker(bind=engine, expire_on_commit=False)
+    yield SimpleNamespace(session=factory, commits=commits)
+    engine.dispose()
+
+
+def transform(key):
+    return NodeSpec(key, "transform", {"transform_type": "extract", "path": "value"}, catalog_id=str(uuid.uuid4()))
+
+
+def run_workflow(database, specs, monkeypatch, mode="tick", flush_interval_ms=60_000, fast_node_ms=500):
+    monkeypatch.setattr(settings, "EXECUTION_NODE_STATE_MODE", mode)
+    monkeypatch.setattr(settings, "EXECUTION_STATE_FLUSH_INTERVAL_MS", flush_interval_ms)
+    monkeypatch.setattr(settings, "EXECUTION_FAST_NODE_MS", fast_node_ms)
+
+    cache = ExecutionPlanCache(registry=executor_registry, shared_cache=False)
+    engine = ExecutionEngine(plan_cache=cache)
+    engine.stats_service = SimpleNamespace(record_transition=lambda *args, **kwargs: None)
+    edges = [(a.key, b.key) for a, b in zip(specs, specs[1:])]
+    plan = compile_plan("wf", "v1", specs, edges, registry=executor_registry)
+    cache.store(plan)
+
+    with database.session() as db:
+        execution = WorkflowExecution(
+            workflow_id=uuid.uuid4(),
+            user_id=uuid.uuid4(),
+            status=ExecutionStatus.PENDING,
+            input_data={"value": 42},
+            total_nodes=len(specs),
+            started_at=datetime.utcnow(),
+            debug_info={"plan_version": plan.version},
+        )
+        db.add(execution)
+        db.flush()
+        asyncio.run(engine._create_node_executions(db, execution, plan))
+        db.commit()
+
+        created = len(database.commits)
+        asyncio.run(engine._execute_workflow(db, execution))
+        transactions = len(database.commits) - created
+
+        nodes = db.query(NodeExecution).order_by(NodeExecution.execution_order).all()
+        metrics = db.query(WorkflowExecutionMetric).count()
+        return execution, nodes, metrics, transactions
+
+
+def test_run_writes_node_states_and_metrics_in_one_batch(database, monkeypatch):
+    specs = [transform(f"n{index}") for index in range(30)]
+    execution, nodes, metrics, transactions = run_workflow(database, specs, monkeypatch)
+
+    # Criação (execução + 30 nós) foi uma transação; a execução inteira, duas:
+    # RUNNING e o commit final com todos os nós, métricas e progresso
+    assert database.commits[:1] == [1]
+    assert transactions == 2
+    assert execution.status == ExecutionStatus.COMPLETED
+    assert execution.completed_nodes == 30 and execution.progress_percentage == 100
+    assert [node.node_key for node in nodes] == [spec.key for spec in specs]
+    assert {node.status for node in nodes} == {"completed"}
+    assert all(node.started_at and node.duration_ms is not None for node in nodes)
+    assert nodes[0].output_data["result"] == "success"
+    assert metrics == 30
+    assert execution.debug_info["node_state"] == {
+        "mode": "tick",
+        "transactions": 2,
+        "flushes": 1,
+        "node_updates": 30,
+        "metrics": 30,
+        "deferred_starts": 0,
+    }
+
+
+def test_zero_flush_interval_writes_every_transition(database, monkeypatch):
+    specs = [transform(f"n{index}") for index in range(5)]
+    execution, nodes, metrics, transactions = run_workflow(database, specs, monkeypatch, flush_interval_ms=0)
+
+    # Sem agrupamento: início de cada nó + fim do anterior + commit final
+    assert transactions > 5
+    assert {node.status for node in nodes} == {"completed"} and metrics == 5
+
+
+def test_final_mode_persists_start_only_for_slow_nodes(database, monkeypatch):
+    async def slow_simulation(node_execution):
+        await asyncio.sleep(0.05)
+
+    specs = [transform("a"), NodeSpec("slow", "ai_model", {}, catalog_id=str(uuid.uuid4())), transform("b")]
+    monkeypatch.setattr(ExecutionEngine, "_simulate_node_execution", lambda self, ne: slow_simulation(ne))
+    execution, nodes, metrics, transactions = run_workflow(database, specs, monkeypatch, mode="final", fast_node_ms=10)
+
+    # RUNNING + início do nó lento (com o fim de "a") + final
+    assert transactions == 3
+    assert [node.status for node in nodes] == ["completed", "completed", "completed"]
+    assert nodes[1].duration_ms >= 50
+    assert execution.debug_info["node_state"]["deferred_starts"] == 2
+
+
+def test_failed_node_is_written_with_the_final_commit(database, monkeypatch):
+    invalid = NodeSpec("notify", "http", {"method": "POST"}, catalog_id=str(uuid.uuid4()))
+    specs = [transform("a"), invalid, transform("b")]
+    execution, nodes, metrics, transactions = run_workflow(database, specs, monkeypatch)
+
+    assert transactions == 2
+    assert execution.status == ExecutionStatus.FAILED
+    assert [node.status for node in nodes] == ["completed", "failed", "pending"]
+    assert nodes[1].error_message == "Configuração inválida: URL é obrigatória"
+    assert nodes[1].retry_count == 0
+    assert metrics == 1
+
+
+def test_unexpected_error_still_writes_buffered_states(database, monkeypatch):
+    async def broken_publish(self, **progress):
+        raise RuntimeError("cache indisponível")
+
+    monkeypatch.setattr(NodeStateBuffer, "publish", broken_publish)
+    specs = [transform("a"), transform("b")]
+    execution, nodes, metrics, transactions = run_workflow(database, specs, monkeypatch)
+
+    # O fim de "a" estava só no buffer quando o erro interrompeu a execução
+    assert transactions == 2
+    assert execution.status == ExecutionStatus.FAILED
+    assert execution.error_message == "cache indisponível"
+    assert [node.status for node in nodes] == ["completed", "pending"]
+    assert nodes[0].retry_count == 0 and metrics == 1
+
+
+def test_nodes_without_catalog_node_are_rejected():
+    # Itens de ``workflow.definition`` sem ``node_id`` não têm nó do catálogo
+    specs = [transform("a"), NodeSpec("b", "transform", {"transform_type": "extract", "path": "value"})]
+    plan = compile_plan("wf", "v1", specs, registry=executor_registry)
+    execution = SimpleNamespace(id=uuid.uuid4(), tenant_id=None)
+
+    with pytest.raises(ValueError, match="node_id.*: b$"):
+        node_execution_rows(execution, plan)
+
+
+def test_postgresql_update_uses_values_list():
+    statements = []
+    db = SimpleNamespace(
+        get_bind=lambda: SimpleNamespace(dialect=SimpleNamespace(name="postgresql")),
+        execute=lambda statement, *args: statements.append(statement),
+    )
+    update_node_states(db, {1: {"started_at": datetime.utcnow()}, 2: {"output_data": {"x": 1}}})
+
+    (statement,) = statements
+    sql = str(statement.compile(dialect=postgresql.dialect()))
+    assert sql.startswith("UPDATE synapscale_db.node_executions SET")
+    assert "FROM (VALUES" in sql and "CAST(node_state.output_data AS JSONB)" in sql
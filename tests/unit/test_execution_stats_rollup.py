@@ -0,0 +1,77 @@
+"""
+Testes do rollup de estatísticas de execução
+"""
+
+import uuid
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from synapse.models.workflow_execution import ExecutionStatus
+from synapse.services.execution_stats_service import ExecutionStatsService, RollupContribution
+
+pytestmark = pytest.mark.unit
+
+
+def _execution(status, duration=12, completed_nodes=3):
+    return SimpleNamespace(
+        execution_id=str(uuid.uuid4()),
+        user_id=uuid.uuid4(),
+        workflow_id=uuid.uuid4(),
+        tenant_id=None,
+        status=status,
+        completed_at=datetime(2026, 10, 1, 23, 59),
+        created_at=datetime(2026, 10, 1, 8, 0),
+        actual_duration=duration,
+        completed_nodes=completed_nodes,
+    )
+
+
+def test_contribution_only_for_terminal_statuses():
+    assert RollupContribution.from_execution(_execution(ExecutionStatus.RUNNING)) is None
+
+    contribution = RollupContribution.from_execution(_execution(ExecutionStatus.FAILED, duration=None))
+    assert contribution.status == "failed"
+    assert contribution.day.isoformat() == "2026-10-01"
+    assert contribution.counters(sign=-1) == {
+        "execution_count": -1,
+        "duration_sum": 0,
+        "duration_count": 0,
+        "nodes_completed_sum": -3,
+    }
+
+
+def test_build_stats_combines_rollup_and_live_executions():
+    today = datetime.utcnow().date()
+    # day, total, completed, failed, cancelled, timeout, duration_sum, duration_count, nodes
+    daily_rows = [
+        (today - timedelta(days=90), 4, 4, 0, 0, 0, 40, 4, 8),
+        ((today - timedelta(days=1)).isoformat(), 3, 1, 1, 1, 0, 20, 2, 5),
+        (today, 1, 1, 0, 0, 0, 0, 0, 2),
+    ]
+    workflow_id = uuid.uuid4()
+
+    stats = ExecutionStatsService._build_stats(
+        daily_rows,
+        most_used=[(workflow_id, 6)],
+        live_total=2,
+        live_running=1,
+        live_nodes=1,
+        trend_days=7,
+    )
+
+    assert stats.total_executions == 10
+    assert stats.running_executions == 1
+    assert stats.completed_executions == 6
+    assert stats.failed_executions == 1
+    assert stats.average_duration_seconds == 10.0
+    assert stats.success_rate_percentage == 60.0
+    assert stats.total_nodes_executed == 16
+    assert stats.most_used_workflows == [{"workflow_id": str(workflow_id), "count": 6}]
+
+    daily = stats.execution_trends["daily"]
+    assert len(daily) == 7
+    assert daily[-1]["date"] == today.isoformat() and daily[-1]["total"] == 1
+    assert daily[-2]["failed"] == 1 and daily[-2]["average_duration_seconds"] == 10.0
+    assert daily[0]["total"] == 0
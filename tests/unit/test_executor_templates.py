@@ -0,0 +1,62 @@
+"""
+Testes dos templates pré-compilados do BaseExecutor
+"""
+
+import pytest
+
+from synapse.core.executors.base import ExecutionContext
+from synapse.core.executors.templates import compile_template
+from synapse.core.executors.transform_executor import TransformExecutor
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture
+def executor():
+    return TransformExecutor()
+
+
+@pytest.fixture
+def context():
+    context = ExecutionContext(
+        execution_id="exec-1",
+        workflow_id=7,
+        user_id=3,
+        variables={"base_url": "https://api.example.com", "dotted.key": "ok", "token": "t"},
+        input_data={"user": {"id": 42, "tags": ["a", "b"]}},
+    )
+    context.set_node_output("fetch", {"output": {"items": [{"sku": "X1"}], "total": 1}})
+    return context
+
+
+def test_compiled_template_segments_are_cached():
+    template = compile_template("{{ base_url }}/users/{{user.id}}")
+    assert template is compile_template("{{ base_url }}/users/{{user.id}}")
+    assert template.parts == ("", "base_url", "/users/", "user.id", "")
+    assert compile_template("sem placeholders").is_static
+
+
+def test_resolves_nested_paths_and_specials(executor, context):
+    rendered = executor.resolve_template_variables(
+        "{{base_url}}/users/{{user.id}}?sku={{fetch.output.items.0.sku}}&wf={{workflow_id}}",
+        context,
+    )
+    assert rendered == "https://api.example.com/users/42?sku=X1&wf=7"
+
+
+def test_values_precedence_and_serialization(executor, context):
+    rendered = executor.resolve_template_variables(
+        "{{token}} {{user.tags}} {{dotted.key}} {{missing.path}}",
+        context,
+        {"token": "override"},
+    )
+    assert rendered == 'override ["a", "b"] ok {{missing.path}}'
+
+
+def test_resolve_config_templates_walks_nested_structures(executor, context):
+    config = {"headers": {"X-User": "{{user.id}}"}, "list": ["{{token}}", 3], "flag": True}
+    assert executor.resolve_config_templates(config, context) == {
+        "headers": {"X-User": "42"},
+        "list": ["t", 3],
+        "flag": True,
+    }
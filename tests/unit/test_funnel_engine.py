@@ -0,0 +1,177 @@
+"""
+Testes do motor de funis e coortes (NumPy e plano SQL com funções de janela)
+"""
+
+import numpy as np
+import pytest
+import sqlalchemy as sa
+
+from synapse.core.analytics.funnels import (
+    ResultCache,
+    build_funnel_select,
+    build_retention_select,
+    funnel_from_arrays,
+    retention_from_arrays,
+    retention_from_rows,
+)
+
+pytestmark = pytest.mark.unit
+
+WINDOW = 200.0
+
+
+def _reference_funnel(users, times, steps, n_steps, window):
+    """windowFunnel por usuário, evento a evento"""
+    reached = [set() for _ in range(n_steps)]
+    order = sorted(range(len(users)), key=lambda i: (users[i], times[i]))
+    state = {}
+    for i in order:
+        starts = state.setdefault(users[i], [None] * n_steps)
+        # Passos processados do maior para o menor: o mesmo evento não avança duas vezes
+        for k in sorted(steps[i], reverse=True):
+            if k == 0:
+                starts[0] = times[i]
+            elif starts[k - 1] is not None and times[i] - starts[k - 1] <= window:
+                starts[k] = starts[k - 1]
+        for k in range(n_steps):
+            if starts[k] is not None:
+                reached[k].add(users[i])
+    return [len(users_at_step) for users_at_step in reached]
+
+
+@pytest.fixture
+def events():
+    rng = np.random.default_rng(3)
+    size = 3_000
+    users = rng.integers(0, 200, size)
+    times = rng.permutation(size * 3)[:size].astype(float)  # timestamps distintos
+    names = rng.integers(0, 4, size)  # 3 = evento fora do funil
+    steps = [{int(name)} if name < 3 else set() for name in names]
+    # Alguns eventos casam com dois passos ao mesmo tempo
+    steps = [step | {2} if name == 1 and i % 7 == 0 else step for i, (step, name) in enumerate(zip(steps, names))]
+    masks = np.array([[k in step for step in steps] for k in range(3)])
+    return users, times, steps, masks
+
+
+def test_vectorized_funnel_matches_reference(events):
+    users, times, steps, masks = events
+    counts, averages = funnel_from_arrays(users, times, masks, WINDOW)
+    assert counts.tolist() == _reference_funnel(users.tolist(), times.tolist(), steps, 3, WINDOW)
+    assert counts[0] >= counts[1] >= counts[2] > 0
+    assert 0 < averages[1] <= averages[2] <= WINDOW
+
+
+def test_sql_plan_matches_vectorized_engine(events):
+    users, times, _, masks = events
+    engine = sa.create_engine("sqlite://")
+    metadata = sa.MetaData()
+    table = sa.Table(
+        "events",
+        metadata,
+        sa.Column("user_id", sa.Integer),
+        sa.Column("ts", sa.Float),
+        sa.Column("seq", sa.Integer),
+        *[sa.Column(f"m{k}", sa.Integer) for k in range(3)],
+    )
+    metadata.create_all(engine)
+    rows = [
+        {"user_id": int(u), "ts": float(t), "seq": i, **{f"m{k}": int(masks[k][i]) for k in range(3)}}
+        for i, (u, t) in enumerate(zip(users, times))
+    ]
+    with engine.begin() as conn:
+        conn.execute(table.insert(), rows)
+        result = conn.execute(build_funnel_select(sa.select(table).subquery(), 3, WINDOW)).one()
+
+    counts, averages = funnel_from_arrays(users, times, masks, WINDOW)
+    assert [result[2 * k] for k in range(3)] == counts.tolist()
+    assert [result[2 * k + 1] for k in range(1, 3)] == pytest.approx(averages[1:].tolist())
+    assert result[1] == 0
+
+
+def test_retention_matrix_sql_and_numpy_agree():
+    # coorte do usuário = período de cadastro; atividade em períodos seguintes
+    cohort_of = {1: 0, 2: 0, 3: 1, 4: 1}
+    activity = [(1, 0), (1, 1), (1, 1), (2, 0), (2, 2), (3, 1), (3, 2), (4, 1), (1, 5)]
+    sizes = {0: 2, 1: 3}  # usuário 5 da coorte 1 nunca voltou
+
+    users = np.array([user for user, _ in activity])
+    matrix = retention_from_arrays(
+        users,
+        np.array([cohort_of[user] for user in users]),
+        np.array([period for _, period in activity]),
+        sizes,
+        periods=3,
+    )
+    assert matrix.cohort_labels == [0, 1]
+    assert matrix.rates == [[100.0, 50.0, 50.0], [66.67, 33.33, 0.0]]
+
+    engine = sa.create_engine("sqlite://")
+    metadata = sa.MetaData()
+    activity_table = sa.Table("activity", metadata, sa.Column("user_id", sa.Integer), sa.Column("period", sa.Integer))
+    cohort_table = sa.Table("cohorts", metadata, sa.Column("user_id", sa.Integer), sa.Column("cohort", sa.Integer))
+    metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(activity_table.insert(), [{"user_id": u, "period": p} for u, p in activity])
+        conn.execute(cohort_table.insert(), [{"user_id": u, "cohort": c} for u, c in cohort_of.items()])
+        rows = conn.execute(build_retention_select(activity_table, cohort_table, 3)).all()
+    assert retention_from_rows(rows, sizes, 3).rates == matrix.rates
+
+
+def test_result_cache_hits_until_ttl():
+    cache = ResultCache(ttl=60)
+    calls = []
+    key = cache.key("funnel", {"steps": ["a", "b"]})
+    assert cache.get_or_compute(key, lambda: calls.append(1) or "x") == ("x", False)
+    assert cache.get_or_compute(key, lambda: calls.append(1) or "y") == ("x", True)
+    assert len(calls) == 1
+
+
+@pytest.mark.parametrize("cohort_type", ["registration", "first_workflow", "first_purchase"])
+def test_cohort_sources_are_tenant_scoped_and_floor_periods(cohort_type):
+    from datetime import datetime
+
+    from sqlalchemy.dialects import postgresql
+
+    from synapse.services.funnel_service import FunnelService
+
+    anchor = FunnelService(db=None)._cohort_anchor(
+        cohort_type, "week", datetime(2024, 1, 1), datetime(2024, 3, 1), "tenant-a"
+    )
+    sql = str(anchor.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+    assert "tenant_id = 'tenant-a'" in sql
+    # cast sem floor arredondaria a segunda metade do período para o seguinte
+    assert "CAST(floor((EXTRACT(epoch FROM" in sql
+
+
+def test_funnel_widget_uses_the_caller_tenant(monkeypatch):
+    import asyncio
+
+    from synapse.services import analytics_service
+    from synapse.services.dashboard_evaluator import DashboardEvaluator
+
+    seen = []
+
+    def funnel(self, steps, start_date, end_date, window_seconds, tenant_id=None):
+        seen.append(tenant_id)
+        return {"steps": []}
+
+    monkeypatch.setattr(analytics_service.FunnelService, "funnel", funnel)
+
+    def compute(widget_type, config):
+        return analytics_service.AnalyticsService(db=None)._get_user_funnel_data(config)
+
+    class NoCache:
+        async def get(self, key):
+            return None
+
+        async def set(self, key, value, ttl=None):
+            return True
+
+    widget = {"id": "f", "type": "user_funnel", "config": {"steps": [{}, {}], "tenant_id": "victim"}}
+    evaluator = DashboardEvaluator(compute=compute, cache=NoCache())
+    result = asyncio.run(evaluator.evaluate([widget], tenant_id="caller"))
+    assert "error" not in result["f"] and seen == ["caller"]
+
+    # Fora do avaliador (sem escopo definido) o widget não lê todos os tenants
+    with pytest.raises(KeyError):
+        compute("user_funnel", {"steps": [{}, {}]})
@@ -0,0 +1,109 @@
+"""
+Testes do pipeline de retrieval de knowledge bases (chunking, embedders, índices)
+"""
+
+import numpy as np
+import pytest
+
+from synapse.core.retrieval import (
+    HashingEmbedder,
+    HNSWIndex,
+    NumpyIndex,
+    TextChunker,
+    matches_filters,
+)
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture
+def kb_content():
+    return {
+        "faq": [
+            {"content": "Para redefinir a senha acesse as configurações. " * 20, "lang": "pt"},
+            {"content": "Billing happens monthly on the first day.", "lang": "en"},
+        ],
+        "intro": "Bem-vindo ao SynapScale.\n\nAutomatize workflows com agentes.",
+    }
+
+
+def test_chunker_respects_size_and_keeps_document_metadata(kb_content):
+    chunker = TextChunker(chunk_size=200, chunk_overlap=40)
+    chunks = chunker.chunk_content(kb_content)
+
+    assert all(len(chunk.text) <= 200 for chunk in chunks)
+    faq_chunks = [c for c in chunks if c.section == "faq[0]"]
+    assert len(faq_chunks) > 1
+    assert [c.chunk_index for c in faq_chunks] == list(range(len(faq_chunks)))
+    assert all(c.metadata["lang"] == "pt" for c in faq_chunks)
+
+
+def test_chunk_hash_is_stable_and_only_changes_for_edited_sections(kb_content):
+    chunker = TextChunker(chunk_size=200, chunk_overlap=40)
+    before = {c.content_hash for c in chunker.chunk_content(kb_content)}
+
+    kb_content["intro"] = "Texto de introdução reescrito."
+    after = {c.content_hash for c in chunker.chunk_content(kb_content)}
+
+    assert len(before - after) == 1
+    assert len(after - before) == 1
+
+
+def test_hashing_embedder_is_deterministic_and_normalized():
+    texts = ["monthly billing", "reset password"]
+    first = HashingEmbedder(dimension=64).embed_batch(texts)
+    second = HashingEmbedder(dimension=64).embed_in_batches(texts, batch_size=1)
+
+    np.testing.assert_allclose(first, second)
+    np.testing.assert_allclose(np.linalg.norm(first, axis=1), 1.0, rtol=1e-5)
+
+
+def test_metadata_filters():
+    metadata = {"lang": "pt", "chunk_index": 3}
+    assert matches_filters(metadata, {"lang": "pt"})
+    assert matches_filters(metadata, {"lang": ["pt", "en"]})
+    assert matches_filters(metadata, {"chunk_index": {"$gte": 2, "$lt": 4}})
+    assert not matches_filters(metadata, {"source": {"$exists": True}})
+    assert not matches_filters(metadata, {"lang": {"$ne": "pt"}})
+
+
+@pytest.mark.parametrize("index_cls", [NumpyIndex, HNSWIndex])
+def test_index_upsert_search_filter_and_remove(index_cls):
+    embedder = HashingEmbedder(dimension=64)
+    texts = ["monthly billing invoice", "reset your password", "workflow agents"]
+    index = index_cls(64)
+    index.upsert(
+        ["a", "b", "c"],
+        embedder.embed_batch(texts),
+        [{"lang": "en"}, {"lang": "pt"}, {"lang": "en"}],
+    )
+
+    hits = index.search(embedder.embed_query("billing invoice"), k=1)
+    assert hits[0].id == "a"
+
+    filtered = index.search(embedder.embed_query("billing invoice"), k=3, filters={"lang": "pt"})
+    assert [hit.id for hit in filtered] == ["b"]
+
+    assert index.remove(["a"]) == 1
+    assert len(index) == 2
+    assert all(hit.id != "a" for hit in index.search(embedder.embed_query("billing"), k=3))
+
+
+def test_hnsw_recall_against_brute_force():
+    rng = np.random.default_rng(7)
+    vectors = rng.normal(size=(1500, 32)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    ids = [str(i) for i in range(len(vectors))]
+
+    exact = NumpyIndex(32)
+    exact.upsert(ids, vectors)
+    approx = HNSWIndex(32, ef_search=100)
+    approx.upsert(ids, vectors)
+
+    recall = 0.0
+    queries = rng.normal(size=(30, 32)).astype(np.float32)
+    for query in queries:
+        expected = {hit.id for hit in exact.search(query, k=10)}
+        found = {hit.id for hit in approx.search(query, k=10)}
+        recall += len(expected & found) / 10
+    assert recall / len(queries) >= 0.9
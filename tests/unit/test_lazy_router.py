@@ -0,0 +1,182 @@
+"""
+Testes da montagem preguiçosa de routers: import na primeira requisição,
+precedência de rotas igual à montagem antecipada, carga total e
+requisições concorrentes ao mesmo router
+"""
+
+import asyncio
+import sys
+import textwrap
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from synapse.api.lazy_router import LazyRouterLoader, LazyRouterPlaceholder, RouterEntry
+
+pytestmark = pytest.mark.unit
+
+PACKAGE = "lazy_router_fixture_endpoints"
+
+ENDPOINTS = {
+    "items": """
+        from fastapi import APIRouter
+        router = APIRouter()
+
+        @router.get("/special")
+        async def special():
+            return {"handler": "items.special"}
+
+        @router.get("/{item_id}")
+        async def read_item(item_id: str):
+            return {"handler": "items.read", "item_id": item_id}
+    """,
+    # Rota genérica registrada depois: só deve atender o que items não atende
+    "catch_all": """
+        from fastapi import APIRouter
+        router = APIRouter()
+
+        @router.get("/items/{item_id}/raw")
+        async def raw(item_id: str):
+            return {"handler": "catch_all.raw"}
+
+        @router.get("/{anything:path}")
+        async def anything(anything: str):
+            return {"handler": "catch_all", "path": anything}
+    """,
+    "slow": """
+        import time
+        from fastapi import APIRouter
+        time.sleep(0.05)
+        router = APIRouter()
+
+        @router.get("")
+        async def index():
+            return {"handler": "slow"}
+    """,
+}
+
+MANIFEST = (
+    RouterEntry("items", "/items", ("items",)),
+    RouterEntry("slow", "/slow"),
+    RouterEntry("catch_all", ""),
+)
+
+
+@pytest.fixture
+def endpoints_package(tmp_path, monkeypatch):
+    package = tmp_path / PACKAGE
+    package.mkdir()
+    (package / "__init__.py").write_text("")
+    for name, source in ENDPOINTS.items():
+        (package / f"{name}.py").write_text(textwrap.dedent(source))
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield PACKAGE
+    for name in [m for m in sys.modules if m == PACKAGE or m.startswith(PACKAGE + ".")]:
+        del sys.modules[name]
+
+
+def make_app(lazy: bool):
+    app = FastAPI()
+    loader = LazyRouterLoader(app, "/api/v1", MANIFEST, PACKAGE)
+    if lazy:
+        loader.mount()
+    else:
+        loader.mount()
+        loader.load_all()
+    return app, loader
+
+
+async def get_all(app, paths):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        return [await client.get(path) for path in paths]
+
+
+def test_router_is_imported_on_first_request(endpoints_package):
+    app, loader = make_app(lazy=True)
+    assert f"{PACKAGE}.items" not in sys.modules
+    assert all(isinstance(r, LazyRouterPlaceholder) for r in app.router.routes[-3:])
+
+    (response,) = asyncio.run(get_all(app, ["/api/v1/items/42"]))
+
+    assert response.json() == {"handler": "items.read", "item_id": "42"}
+    assert f"{PACKAGE}.items" in sys.modules
+    assert f"{PACKAGE}.slow" not in sys.modules
+    assert [entry.module for entry in loader.pending] == ["slow", "catch_all"]
+    assert "items" in loader.load_times
+
+
+def test_route_precedence_matches_eager_mounting(endpoints_package):
+    paths = [
+        "/api/v1/items/special",
+        "/api/v1/items/7/raw",
+        "/api/v1/items/7",
+        "/api/v1/other/thing",
+        "/api/v1/slow",
+    ]
+    eager_app, _ = make_app(lazy=False)
+    eager = [r.json() for r in asyncio.run(get_all(eager_app, paths))]
+
+    # Ordem de primeiro acesso invertida: o catch-all carrega antes de items
+    lazy_app, _ = make_app(lazy=True)
+    lazy = [r.json() for r in asyncio.run(get_all(lazy_app, list(reversed(paths))))][::-1]
+
+    assert lazy == eager
+    assert eager[0] == {"handler": "items.special"}
+    assert eager[1] == {"handler": "catch_all.raw"}
+    assert eager[3] == {"handler": "catch_all", "path": "other/thing"}
+    assert [type(r) for r in lazy_app.router.routes] == [type(r) for r in eager_app.router.routes]
+
+
+def test_load_all_replaces_every_placeholder(endpoints_package):
+    app, loader = make_app(lazy=True)
+    loader.load_all()
+
+    assert loader.pending == []
+    assert not any(isinstance(r, LazyRouterPlaceholder) for r in app.router.routes)
+    paths = app.openapi()["paths"]
+    assert "/api/v1/items/{item_id}" in paths
+    assert paths["/api/v1/items/special"]["get"]["tags"] == ["items"]
+
+
+def test_concurrent_first_requests_import_once(endpoints_package):
+    app, loader = make_app(lazy=True)
+    imports = []
+    original_import = loader._import
+
+    def counting_import(entry):
+        imports.append(entry.module)
+        return original_import(entry)
+
+    loader._import = counting_import
+
+    async def burst():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await asyncio.gather(*(client.get("/api/v1/slow") for _ in range(20)))
+
+    responses = asyncio.run(burst())
+
+    assert all(r.json() == {"handler": "slow"} for r in responses)
+    assert imports == ["slow"]
+    assert [entry.module for entry in loader.pending] == ["items", "catch_all"]
+    assert sum(isinstance(r, LazyRouterPlaceholder) for r in app.router.routes) == 2
+
+
+def test_failed_import_is_retried(endpoints_package, tmp_path):
+    app = FastAPI()
+    loader = LazyRouterLoader(app, "/api/v1", [RouterEntry("missing", "/missing")], PACKAGE)
+    loader.mount()
+
+    async def first_request():
+        transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.get("/api/v1/missing")
+
+    assert asyncio.run(first_request()).status_code == 500
+    assert [entry.module for entry in loader.pending] == ["missing"]
+
+    (tmp_path / PACKAGE / "missing.py").write_text(textwrap.dedent(ENDPOINTS["slow"]))
+    assert asyncio.run(first_request()).json() == {"handler": "slow"}
+    assert loader.pending == []
@@ -0,0 +1,155 @@
+"""
+Testes do pipeline de logging: formatação e I/O na thread do listener, fila
+limitada com contadores de descarte, contexto da requisição sem cópias,
+amostragem do log de acesso e devolução das saídas no encerramento
+"""
+
+import logging
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from synapse.core.log_pipeline import LogPipeline, LogStats, current_request
+from synapse.logger_config import UnifiedJSONFormatter
+from synapse.middlewares.pipeline import AccessLogStage
+
+pytestmark = pytest.mark.unit
+
+
+class RecordingHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+        self.lines = []
+        self.threads = set()
+
+    def emit(self, record):
+        self.threads.add(threading.current_thread().name)
+        self.records.append(record)
+        self.lines.append(self.format(record))
+
+
+@pytest.fixture()
+def isolated_logger():
+    logger = logging.getLogger(f"synapse.test.{id(object())}")
+    logger.propagate = False
+    logger.setLevel(logging.DEBUG)
+    yield logger
+    logger.handlers.clear()
+
+
+def test_records_are_formatted_on_the_listener_thread(isolated_logger):
+    sink = RecordingHandler()
+    formatted_on = set()
+
+    class TrackingFormatter(UnifiedJSONFormatter):
+        def format(self, record):
+            formatted_on.add(threading.current_thread().name)
+            return super().format(record)
+
+    sink.setFormatter(TrackingFormatter())
+    pipeline = LogPipeline([sink], queue_size=100, stats=LogStats())
+    pipeline.attach(isolated_logger)
+    pipeline.start()
+
+    items = ["a"]
+    isolated_logger.info("itens: %s", items)
+    items.append("b")  # depois do log: não muda a mensagem
+    pipeline.stop()
+
+    assert threading.current_thread().name not in formatted_on | sink.threads
+    assert sink.records[0].getMessage() == "itens: ['a']"
+    assert '"message": "itens: [\'a\']"' in sink.lines[0]
+    assert pipeline.get_stats()["handled"] == 1
+
+
+def test_bounded_queue_drops_and_counts(isolated_logger):
+    sink = RecordingHandler()
+    stats = LogStats()
+    pipeline = LogPipeline([sink], queue_size=3, block_timeout=0.01, stats=stats)
+    pipeline.attach(isolated_logger)
+
+    # Listener parado: a fila enche e nada bloqueia por mais que block_timeout
+    for index in range(5):
+        isolated_logger.info(f"info {index}")
+    isolated_logger.error("erro sem espaço")
+    assert (stats.enqueued, stats.dropped, stats.dropped_warnings) == (3, 3, 1)
+
+    pipeline.start()
+    pipeline.stop()
+    assert [record.getMessage() for record in sink.records] == ["info 0", "info 1", "info 2"]
+
+
+def test_request_context_is_attached_by_attribute(isolated_logger):
+    sink = RecordingHandler()
+    pipeline = LogPipeline([sink], stats=LogStats())
+    pipeline.attach(isolated_logger)
+    pipeline.start()
+
+    ctx = SimpleNamespace(request_id="req-1", tenant_id="tenant-1", scope={"trace_id": "trace-1"})
+    token = current_request.set(ctx)
+    try:
+        isolated_logger.info("dentro da requisição")
+        isolated_logger.info("request_id explícito", extra={"request_id": "outro"})
+    finally:
+        current_request.reset(token)
+    isolated_logger.info("fora da requisição")
+    pipeline.stop()
+
+    inside, explicit, outside = sink.records
+    assert (inside.request_id, inside.tenant_id, inside.trace_id) == ("req-1", "tenant-1", "trace-1")
+    assert explicit.request_id == "outro"
+    assert not hasattr(outside, "request_id")
+
+
+def test_stop_returns_sinks_and_adopted_handlers():
+    root = logging.getLogger("synapse.test.root")
+    root.propagate = False
+    adopted_logger = logging.getLogger("synapse.test.adopted")
+    adopted_logger.propagate = False
+    sink, adopted = RecordingHandler(), RecordingHandler()
+    adopted_logger.addHandler(adopted)
+
+    pipeline = LogPipeline([sink], stats=LogStats())
+    pipeline.attach(root)
+    pipeline.adopt([adopted_logger.name])
+    pipeline.start()
+    root.warning("raiz")
+    adopted_logger.warning("adotado")
+    pipeline.stop()
+
+    # Cada saída recebeu só os registros do seu logger, na thread do listener
+    assert [record.getMessage() for record in sink.records] == ["raiz"]
+    assert [record.getMessage() for record in adopted.records] == ["adotado"]
+    assert root.handlers == [sink] and adopted_logger.handlers == [adopted]
+
+    root.warning("depois do stop")
+    assert sink.records[-1].getMessage() == "depois do stop"
+    root.handlers.clear()
+    adopted_logger.handlers.clear()
+
+
+def test_access_log_sampling_keeps_errors_and_slow_requests(monkeypatch):
+    logged = []
+    from synapse.middlewares import pipeline as pipeline_module
+
+    monkeypatch.setattr(pipeline_module.logger, "info", lambda message, **kwargs: logged.append(kwargs["extra"]))
+    monkeypatch.setattr(pipeline_module.logger, "isEnabledFor", lambda level: True)
+    stats = LogStats()
+    monkeypatch.setattr(pipeline_module, "log_stats", stats)
+    stage = AccessLogStage(sample_rate=0.0, slow_ms=100)
+
+    def request(status_code, elapsed):
+        return SimpleNamespace(
+            error=None, path="/api/v1/items", method="GET", status_code=status_code,
+            elapsed=elapsed, client_ip="127.0.0.1", scope={},
+        )
+
+    for _ in range(10):
+        stage.on_complete(request(200, 0.001))
+    stage.on_complete(request(503, 0.001))
+    stage.on_complete(request(200, 0.5))
+
+    assert stats.sampled_out == 10
+    assert [(entry["status_code"], entry["sample_rate"]) for entry in logged] == [(503, 0.0), (200, 0.0)]
@@ -0,0 +1,131 @@
+"""
+Testes da detecção de anomalias: equivalência vetorizado/incremental,
+sazonalidade, tendências e execução incremental sobre os rollups
+"""
+
+import uuid
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+from sqlalchemy import select
+from sqlalchemy.orm import sessionmaker
+
+from synapse.core.analytics.anomaly import (
+    DetectorConfig,
+    DetectorState,
+    score_series,
+    season_slot,
+    trend_summary,
+)
+from synapse.models.metric_anomaly import MetricAnomaly, MetricDetectorState
+from synapse.models.metric_rollup import MetricRollup
+from synapse.services.metric_anomaly_service import MetricAnomalyService
+
+from sqlite_support import sqlite_engine
+
+pytestmark = pytest.mark.unit
+
+START = datetime(2026, 9, 1)
+
+
+def _hourly(n, seed=3, spikes=()):
+    rng = np.random.default_rng(seed)
+    hours = np.arange(n)
+    values = 100 + 30 * np.sin(2 * np.pi * (hours % 24) / 24) + rng.normal(0, 2, n)
+    for index in spikes:
+        values[index] += 40
+    buckets = [START + timedelta(hours=int(h)) for h in hours]
+    return values.tolist(), buckets
+
+
+def test_vectorized_backfill_matches_incremental_updates():
+    values, buckets = _hourly(600)
+    slots = [season_slot(bucket, "1h") for bucket in buckets]
+    config = DetectorConfig()
+
+    batch, final = score_series(values, slots, config)
+    state = DetectorState()
+    online = [state.update(value, slot, config) for value, slot in zip(values, slots)]
+
+    for a, b in zip(batch, online):
+        assert a.is_anomaly == b.is_anomaly
+        for field in ("expected", "ewma_z", "rolling_z", "seasonal_z", "robust_z", "score"):
+            left, right = getattr(a, field), getattr(b, field)
+            assert (left is None) == (right is None)
+            if left is not None:
+                assert left == pytest.approx(right, rel=1e-6, abs=1e-6)
+
+    # O estado final do backfill continua a série como o incremental
+    restored = DetectorState.from_dict(final.to_dict())
+    assert restored.update(values[-1], slots[-1], config).score == pytest.approx(
+        state.update(values[-1], slots[-1], config).score, rel=1e-6
+    )
+
+
+def test_seasonal_baseline_flags_only_injected_spikes():
+    values, buckets = _hourly(24 * 21, spikes=(400, 450))
+    slots = [season_slot(bucket, "1h") for bucket in buckets]
+    scores, _ = score_series(values, slots, DetectorConfig())
+
+    flagged = {index for index, score in enumerate(scores) if score.is_anomaly}
+    assert {400, 450} <= flagged
+    assert len(flagged - {400, 450}) <= 3
+    assert scores[400].direction == "up" and scores[400].seasonal_z is not None
+
+    # Sem dados suficientes nada é pontuado
+    assert not any(score.is_anomaly for score in score_series(values[:5], slots[:5], DetectorConfig())[0])
+
+
+def test_trend_summary():
+    rising = trend_summary([10 + 2 * i for i in range(20)])
+    assert rising["trend"] == "increasing" and rising["r_squared"] == pytest.approx(1.0)
+    assert rising["change_percent"] == pytest.approx(380.0)
+    assert trend_summary([50.0, 50.5, 49.8, 50.1])["trend"] == "stable"
+    assert trend_summary([1.0, 2.0]) is None
+
+
+def test_incremental_run_resumes_after_last_closed_bucket(tmp_path):
+    engine = sqlite_engine(tmp_path, models=(MetricRollup, MetricDetectorState, MetricAnomaly))
+
+    db = sessionmaker(bind=engine)()
+
+    tenant = uuid.uuid4()
+    values, buckets = _hourly(24 * 20, spikes=(24 * 19 + 5,))
+    db.add_all(
+        MetricRollup(
+            metric_name="latency",
+            resolution="1h",
+            bucket_start=bucket,
+            tenant_id=tenant,
+            service="api",
+            count=4,
+            sum=value * 4,
+            sketch={},
+        )
+        for value, bucket in zip(values, buckets)
+    )
+    db.commit()
+
+    service = MetricAnomalyService(resolutions=["1h"])
+    # Primeira execução: só os buckets fechados até o dia 19, via backfill vetorizado
+    assert service.run_incremental(db, now=buckets[24 * 19]) == 0
+    state = db.execute(select(MetricDetectorState)).scalar_one()
+    assert state.last_bucket == buckets[24 * 19 - 2]
+
+    # Segunda execução: continua do estado salvo e encontra o pico
+    assert service.run_incremental(db, now=buckets[-1] + timedelta(hours=2)) == 1
+    assert service.run_incremental(db, now=buckets[-1] + timedelta(hours=2)) == 0
+    anomaly = db.execute(select(MetricAnomaly)).scalar_one()
+    assert anomaly.bucket_start == buckets[24 * 19 + 5] and anomaly.direction == "up"
+
+    db.expire_all()
+    state = db.execute(select(MetricDetectorState)).scalar_one()
+    assert state.last_bucket == buckets[-1] and state.state["count"] == len(buckets)
+    assert service.current_score(db, "latency", buckets[-1], tenant) == pytest.approx(state.last_score)
+
+    recent = service.recent_anomalies(db, buckets[0], buckets[-1], metric_name="latency")
+    assert [item.to_dict()["score"] for item in recent] == [anomaly.score]
+    trend = service.trends(db, buckets[-24 * 7], buckets[-1])[0]
+    assert trend["metric"] == "latency" and trend["resolution"] == "1h"
+    db.close()
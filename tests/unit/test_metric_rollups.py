@@ -0,0 +1,88 @@
+"""
+Testes dos rollups de métricas, sketch de quantis e downsampling LTTB
+"""
+
+import uuid
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from synapse.core.analytics.downsampling import lttb_indices
+from synapse.core.analytics.sketch import QuantileSketch
+from synapse.services.metric_rollup_service import (
+    MetricRollupService,
+    RollupBucket,
+    accumulate,
+    bucket_start,
+    choose_resolution,
+)
+
+pytestmark = pytest.mark.unit
+
+
+def test_sketch_quantiles_within_relative_error_and_mergeable():
+    rng = np.random.default_rng(7)
+    values = rng.lognormal(mean=3, sigma=1, size=20_000)
+
+    left, right = QuantileSketch(), QuantileSketch()
+    left.add_many(values[:10_000])
+    for value in values[10_000:]:
+        right.add(float(value))
+    merged = QuantileSketch.from_dict(left.to_dict()).merge(right)
+
+    assert merged.count == 20_000
+    for q in (0.5, 0.95, 0.99):
+        exact = np.quantile(values, q, method="lower")
+        assert abs(merged.quantile(q) - exact) / exact < 0.03
+
+
+def test_accumulate_builds_all_resolutions():
+    tenant = uuid.uuid4()
+    base = datetime(2026, 10, 19, 10, 0, 0)
+    points = [(tenant, "api", "latency", base + timedelta(seconds=20 * i), float(i)) for i in range(9)]
+
+    buckets = accumulate(points)
+    minutes = {key[4]: bucket for key, bucket in buckets.items() if key[3] == "1m"}
+    assert sorted(bucket.count for bucket in minutes.values()) == [3, 3, 3]
+
+    hour = buckets[(tenant, "api", "latency", "1h", base)]
+    day = buckets[(tenant, "api", "latency", "1d", base.replace(hour=0))]
+    assert (hour.count, hour.sum, hour.min, hour.max) == (9, 36.0, 0.0, 8.0)
+    assert day.stat("avg") == 4.0 and day.stat("p50") == pytest.approx(4.0, rel=0.02)
+
+    combined = RollupBucket().merge(minutes[base]).merge(minutes[base + timedelta(minutes=1)])
+    assert (combined.count, combined.max) == (6, 5.0)
+
+
+def test_bucket_start_and_resolution_choice():
+    assert bucket_start(datetime(2026, 10, 19, 10, 59, 59), 3600) == datetime(2026, 10, 19, 10)
+    assert choose_resolution(timedelta(minutes=30), 500, timedelta(hours=1)) == "raw"
+    assert choose_resolution(timedelta(hours=6), 500) == "1m"
+    assert choose_resolution(timedelta(days=7), 500) == "1h"
+    assert choose_resolution(timedelta(days=90), 500) == "1d"
+    assert choose_resolution(timedelta(days=3650), 500) == "1d"
+
+
+def test_lttb_keeps_endpoints_and_peaks():
+    x = np.arange(10_000)
+    y = np.sin(x / 300.0)
+    y[4321] = 25.0
+
+    indices = lttb_indices(x, y, 200)
+    assert len(indices) == 200
+    assert indices[0] == 0 and indices[-1] == 9_999
+    assert np.all(np.diff(indices) > 0)
+    assert 4321 in indices
+    assert len(lttb_indices(x[:50], y[:50], 200)) == 50
+
+
+def test_watermark_waits_for_the_safety_lag():
+    service = MetricRollupService(batch_size=100, safety_lag_seconds=30)
+    # Ids visíveis agora podem ter "buracos" de transações ainda abertas
+    assert service.advance_watermark(100, now=0) is None
+    assert service.advance_watermark(150, now=20) is None
+    assert service.advance_watermark(180, now=31) == 100
+    assert service.advance_watermark(200, now=55) == 150
+    assert service.advance_watermark(None, now=60) is None
+    assert MetricRollupService(batch_size=100, safety_lag_seconds=0).advance_watermark(200) == 200
@@ -0,0 +1,192 @@
+"""
+Testes do query builder de relatórios, do spool paginado e da execução de jobs
+"""
+
+import gzip
+import json
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import Column, DateTime, Float, MetaData, String, Table
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import sessionmaker
+
+from synapse.core.analytics.report_query import ReportQueryError, ReportSource, compile_report_query
+from synapse.core.analytics.spool import ResultSpool, iter_download, read_page
+from synapse.models.analytics_report import AnalyticsReport
+from synapse.models.report_execution import ReportExecution
+from synapse.services.report_job_service import ReportJobService, REPORT_SOURCES
+
+from sqlite_support import sqlite_engine
+
+pytestmark = pytest.mark.unit
+
+
+def _sql(compiled):
+    return str(compiled.statement.compile(dialect=postgresql.dialect()))
+
+
+def test_query_builder_compiles_aggregations_with_bound_values():
+    compiled = compile_report_query(
+        {
+            "type": "events",
+            "filters": {"event_type": ["click", "view"], "value": {"gte": 10}, "time_range": "7d"},
+            "time_bucket": "day",
+            "group_by": ["action"],
+            "aggregations": [
+                {"function": "count", "alias": "events"},
+                {"function": "count_distinct", "field": "user_id", "alias": "users"},
+            ],
+            "order_by": [{"field": "events", "direction": "desc"}],
+            "limit": 100,
+        },
+        REPORT_SOURCES,
+        tenant_id=uuid.uuid4(),
+    )
+    sql = _sql(compiled)
+    assert compiled.columns == ["period", "action", "events", "users"]
+    assert "date_trunc" in sql and "GROUP BY" in sql and "count(DISTINCT" in sql
+    assert "tenant_id =" in sql and "click" not in sql  # valores sempre como parâmetros
+
+
+@pytest.mark.parametrize(
+    "config",
+    [
+        {"type": "custom_sql"},
+        {"type": "events", "columns": ["ip_address"]},
+        {"type": "events", "filters": {"action": {"regex": ".*"}}},
+        {"type": "events", "aggregations": [{"function": "sum"}]},
+        {"type": "events", "order_by": [{"field": "action; DROP TABLE x"}]},
+    ],
+)
+def test_query_builder_rejects_configs_outside_whitelist(config):
+    with pytest.raises(ReportQueryError):
+        compile_report_query(config, REPORT_SOURCES)
+
+
+@pytest.mark.parametrize("fmt", ["jsonl", "csv", "columnar"])
+def test_spool_pages_roundtrip_and_concatenate(tmp_path, fmt):
+    spool = ResultSpool(tmp_path, "reports/x", ["n", "at"], fmt)
+    stamp = datetime(2026, 1, 1)
+    spool.write_page([(1, stamp), (2, stamp)])
+    spool.write_page([(3, None)])
+
+    assert spool.manifest.rows == 3 and len(spool.manifest.pages) == 2
+    assert read_page(tmp_path, spool.manifest, 1)[0]["n"] in (3, "3")
+    assert read_page(tmp_path, spool.manifest, 0)[0]["at"] == stamp.isoformat()
+
+    text = gzip.decompress(b"".join(iter_download(tmp_path, spool.manifest))).decode()
+    if fmt == "csv":
+        assert text.splitlines() == ["n,at", f"1,{stamp.isoformat()}", f"2,{stamp.isoformat()}", "3,"]
+    else:
+        assert len(text.splitlines()) == (3 if fmt == "jsonl" else 2)
+
+
+def test_job_streams_query_into_pages_and_tracks_progress(tmp_path):
+    engine = sqlite_engine(tmp_path, threaded=True)
+
+    metadata = MetaData()
+    events = Table(
+        "events",
+        metadata,
+        Column("action", String),
+        Column("value", Float),
+        Column("timestamp", DateTime),
+        Column("tenant_id", String),
+    )
+    metadata.create_all(engine)
+    AnalyticsReport.__table__.create(engine)
+    ReportExecution.__table__.create(engine)
+    Session = sessionmaker(bind=engine)
+
+    start = datetime(2026, 1, 1)
+    with engine.begin() as conn:
+        conn.execute(
+            events.insert(),
+            [{"action": f"a{i % 3}", "value": i, "timestamp": start + timedelta(minutes=i)} for i in range(25)],
+        )
+
+    service = ReportJobService(
+        workers=1,
+        page_size=10,
+        session_factory=Session,
+        storage_root=tmp_path / "storage",
+        sources={"events": ReportSource(events, ("action", "value", "timestamp"), ("action", "value"))},
+    )
+    db = Session()
+    report = AnalyticsReport(
+        id=uuid.uuid4(),
+        name="r",
+        report_query={"type": "events", "filters": {"value": {"lt": 23}}},
+        owner_id=uuid.uuid4(),
+        is_active=True,
+    )
+    db.add(report)
+    db.commit()
+
+    execution = service.submit(db, report, report.owner_id, parameters={"order_by": [{"field": "value"}]})
+    service.shutdown(wait=True)
+    db.expire_all()
+    execution = service.get_execution(db, execution.id, report.owner_id)
+
+    assert execution.status == "completed" and execution.progress == 100.0
+    assert execution.rows_processed == 23 and execution.data_size_bytes > 0
+    page = service.read_page(execution, 2)
+    assert page["total_pages"] == 3 and [row["value"] for row in page["rows"]] == [20.0, 21.0, 22.0]
+
+    chunks, filename = service.download(execution)
+    lines = gzip.decompress(b"".join(chunks)).decode().splitlines()
+    assert filename.endswith(".jsonl.gz") and json.loads(lines[0]) == {"action": "a0", "value": 0.0}
+
+    with pytest.raises(ReportQueryError):
+        service.submit(db, report, report.owner_id, parameters={"columns": ["tenant_id"]})
+    db.close()
+
+
+def test_recovery_only_fails_executions_with_a_stale_heartbeat(tmp_path):
+    engine = sqlite_engine(tmp_path, models=(AnalyticsReport, ReportExecution))
+    Session = sessionmaker(bind=engine)
+    service = ReportJobService(
+        session_factory=Session,
+        storage_root=tmp_path,
+        worker_id="api-1:10",
+        stale_after=timedelta(minutes=5),
+    )
+    now = datetime(2026, 1, 1, 12, tzinfo=timezone.utc)
+
+    db = Session()
+    executions = {}
+    for name, status, worker, idle in [
+        ("other_live", "running", "api-2:20", 1),
+        ("other_dead", "running", "api-3:30", 10),
+        ("other_dead_queued", "queued", "api-3:30", 10),
+        ("own_old_heartbeat", "queued", "api-1:10", 10),
+        ("finished", "completed", "api-3:30", 60),
+    ]:
+        executions[name] = ReportExecution(
+            id=uuid.uuid4(),
+            report_id=uuid.uuid4(),
+            execution_type="api",
+            status=status,
+            started_at=now - timedelta(hours=1),
+            worker_id=worker,
+            heartbeat_at=now - timedelta(minutes=idle),
+        )
+    db.add_all(executions.values())
+    db.commit()
+
+    # O heartbeat renova só as execuções pendentes deste processo
+    assert service.heartbeat() == 1
+    assert service.recover_interrupted(db, now=now) == 2
+
+    db.expire_all()
+    statuses = {name: db.get(ReportExecution, execution.id).status for name, execution in executions.items()}
+    assert statuses == {
+        "other_live": "running",
+        "other_dead": "failed",
+        "other_dead_queued": "failed",
+        "own_old_heartbeat": "queued",
+        "finished": "completed",
+    }
+    db.close()
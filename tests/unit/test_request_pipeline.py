@@ -0,0 +1,105 @@
+"""
+Testes do pipeline ASGI de requisições: contexto compartilhado entre
+estágios, headers, rate limit, métricas e conversão de erros por categoria
+"""
+
+import asyncio
+
+import httpx
+import pytest
+from fastapi import FastAPI, Request
+
+from synapse.exceptions import WorkspaceError
+from synapse.middlewares.metrics import http_requests_total
+from synapse.middlewares.pipeline import (
+    AuthContextStage,
+    RateLimitStage,
+    RequestPipeline,
+    Stage,
+    TracingStage,
+    default_stages,
+    setup_request_pipeline,
+)
+
+pytestmark = pytest.mark.unit
+
+
+def make_app(stages=None):
+    app = FastAPI()
+
+    @app.get("/api/v1/items/{item_id}")
+    async def read_item(item_id: int, request: Request):
+        return {
+            "item_id": item_id,
+            "request_id": request.state.request_id,
+            "category": request.state.endpoint_category,
+        }
+
+    @app.get("/api/v1/workspaces/broken")
+    async def broken():
+        raise RuntimeError("boom")
+
+    setup_request_pipeline(app, stages)
+    return app
+
+
+def call(app, path, headers=None, raise_app_exceptions=True):
+    async def run():
+        transport = httpx.ASGITransport(app=app, raise_app_exceptions=raise_app_exceptions)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.get(path, headers=headers)
+
+    return asyncio.run(run())
+
+
+def test_stages_share_request_context_and_decorate_response():
+    response = call(make_app(), "/api/v1/items/7", headers={"X-Request-ID": "req-123"})
+
+    assert response.status_code == 200
+    assert response.json() == {"item_id": 7, "request_id": "req-123", "category": "unknown"}
+    assert response.headers["x-request-id"] == "req-123"
+    assert response.headers["x-frame-options"] == "DENY"
+    assert float(response.headers["x-process-time"]) >= 0
+
+
+def test_metrics_use_route_template():
+    app = make_app()
+    sample = http_requests_total.labels(method="GET", endpoint="/api/v1/items/{item_id}", status_code="200")
+    before = sample._value.get()
+    for item_id in (1, 2, 3):
+        call(app, f"/api/v1/items/{item_id}")
+    assert sample._value.get() == before + 3
+
+
+def test_unhandled_errors_are_converted_to_the_endpoint_category():
+    with pytest.raises(WorkspaceError, match="boom"):
+        call(make_app(), "/api/v1/workspaces/broken")
+
+
+def test_rate_limit_short_circuits_but_keeps_response_stages():
+    stages = [RateLimitStage(2, 60, enabled=True) if s.name == "rate_limit" else s for s in default_stages()]
+    app = make_app(stages)
+
+    statuses = [call(app, "/api/v1/items/1").status_code for _ in range(3)]
+    assert statuses == [200, 200, 429]
+    limited = call(app, "/api/v1/items/1")
+    assert int(limited.headers["retry-after"]) >= 1 and "x-request-id" in limited.headers
+
+
+def test_disabled_stages_and_unused_hooks_are_left_out():
+    class CountingStage(Stage):
+        name = "counting"
+
+        def __init__(self):
+            self.seen = 0
+
+        def on_request(self, ctx):
+            self.seen += 1
+
+    counting = CountingStage()
+    pipeline = RequestPipeline(
+        FastAPI(), [TracingStage(enabled=False), RateLimitStage(enabled=False), AuthContextStage(), counting]
+    )
+    assert [stage.name for stage in pipeline.stages] == ["auth_context", "counting"]
+    assert len(pipeline._request_hooks) == 2
+    assert not pipeline._response_hooks and not pipeline._complete_hooks and not pipeline._error_hooks
@@ -0,0 +1,109 @@
+"""
+Testes do modo colunar do TransformExecutor (paridade com o modo linha)
+"""
+
+import random
+
+import pytest
+
+from synapse.core.executors.base import ExecutionContext
+from synapse.core.executors.transform_executor import TransformExecutor
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture
+def executor():
+    return TransformExecutor()
+
+
+@pytest.fixture
+def context():
+    return ExecutionContext(execution_id="exec-1", workflow_id=1, user_id=1)
+
+
+@pytest.fixture
+def rows():
+    rng = random.Random(3)
+    regions = ["norte", "sul", "leste", "oeste"]
+    data = [
+        {
+            "id": i,
+            "region": rng.choice(regions),
+            "amount": rng.randint(1, 500),
+            "meta": {"score": rng.random()},
+        }
+        for i in range(2000)
+    ]
+    data[10]["amount"] = "n/a"
+    return data
+
+
+def _assert_same(actual, expected):
+    if isinstance(expected, dict):
+        assert list(actual) == list(expected)
+        for key, value in expected.items():
+            _assert_same(actual[key], value)
+    elif isinstance(expected, float):
+        assert actual == pytest.approx(expected)
+    else:
+        assert actual == expected
+
+
+def _run(executor, context, data, config, mode):
+    method = getattr(executor, f"_transform_{config['transform_type']}")
+    return method(data, {**config, "execution_mode": mode}, context)
+
+
+@pytest.mark.parametrize(
+    "config",
+    [
+        {"transform_type": "filter", "condition": {"field": "amount", "operator": "gte", "value": 250}},
+        {"transform_type": "filter", "condition": {"field": "region", "operator": "in", "value": ["sul", "norte"]}},
+        {"transform_type": "map", "mapping": {"value": "amount", "score": "meta.score"}},
+        {"transform_type": "group", "key": "region"},
+        {
+            "transform_type": "group",
+            "key": "region",
+            "aggregate": {"field": "amount", "operations": ["count", "sum", "min", "max", "p90"]},
+        },
+        {"transform_type": "aggregate", "field": "amount", "operations": ["count", "sum", "avg", "median", "p99"]},
+        {"transform_type": "sort", "key": "meta.score", "reverse": True},
+        {"transform_type": "reduce", "operation": "sum", "field": "amount"},
+    ],
+)
+def test_columnar_matches_row_mode(executor, context, rows, config):
+    row_result = _run(executor, context, rows, config, "row")
+    columnar_result = _run(executor, context, rows, config, "columnar")
+    _assert_same(columnar_result, row_result)
+
+
+def test_hash_join_inner_and_left(executor, context):
+    orders = [{"id": 1, "customer_id": 10}, {"id": 2, "customer_id": 11}, {"id": 3, "customer_id": 99}]
+    customers = [{"id": 10, "name": "Ana"}, {"id": 11, "name": "Bruno"}]
+    config = {"transform_type": "join", "left_key": "customer_id", "right_key": "id", "right": customers}
+
+    inner = executor._transform_join(orders, config, context)
+    assert [(row["id"], row["name"], row["id_right"]) for row in inner] == [(1, "Ana", 10), (2, "Bruno", 11)]
+
+    left = executor._transform_join(orders, {**config, "how": "left"}, context)
+    assert len(left) == 3 and "name" not in left[-1]
+
+
+def test_reduce_concat_and_merge(executor, context):
+    data = [{"tags": ["a", "b"], "attrs": {"x": 1}}, {"tags": ["c"], "attrs": {"y": 2}}]
+    assert executor._transform_reduce(data, {"operation": "concat", "field": "tags"}, context) == ["a", "b", "c"]
+    assert executor._transform_reduce(data, {"operation": "merge", "field": "attrs"}, context) == {"x": 1, "y": 2}
+
+
+def test_min_max_keep_the_input_type(executor, context):
+    # Coluna mista: o extremo volta com o tipo original, como no modo linha
+    data = [{"region": "sul" if i % 2 else "norte", "amount": float(i) if i % 3 else i} for i in range(3, 1200)]
+    configs = [
+        {"transform_type": "aggregate", "field": "amount", "operations": ["min", "max"]},
+        {"transform_type": "group", "key": "region", "aggregate": {"field": "amount", "operations": ["min", "max"]}},
+    ]
+    for config in configs:
+        row_result = _run(executor, context, data, config, "row")
+        columnar_result = _run(executor, context, data, config, "columnar")
+        assert repr(columnar_result) == repr(row_result)
@@ -0,0 +1,125 @@
+"""
+Testes da linguagem de expressões compiladas do TransformExecutor
+"""
+
+import pytest
+
+from synapse.core.executors.base import ExecutionContext
+from synapse.core.executors.expressions import (
+    ExpressionError,
+    compile_expression,
+    compile_program,
+)
+from synapse.core.executors.transform_executor import TransformExecutor
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture
+def executor():
+    return TransformExecutor()
+
+
+@pytest.fixture
+def context():
+    return ExecutionContext(
+        execution_id="exec-1",
+        workflow_id=1,
+        user_id=1,
+        variables={"threshold": 10, "limits": {"max": 50}},
+    )
+
+
+@pytest.mark.parametrize(
+    "expression, expected",
+    [
+        ("item['price'] * item['qty'] + 1", 31),
+        ("item.customer.name.upper()", "ANA"),
+        ("item.price >= {{threshold}} and item.qty <= {{limits.max}}", True),
+        ("'vip' if item.price >= 10 else 'regular'", "vip"),
+        ("matches(item.customer.email, r'@example\\.com$')", True),
+        ("re.sub('[^0-9]', '', item.phone)", "5511999"),
+        ("sum(line['v'] for line in item.lines if line['v'] > 1)", 5),
+        ("len(item.get('tags', [])) == 2 and 'a' in item.tags", True),
+        ("'Olá {{item.customer.name}}'", "Olá Ana"),
+        ("f'{item.price:.2f}'", "10.00"),
+        ("coalesce(item.missing, item.price)", 10),
+    ],
+)
+def test_expressions(executor, context, expression, expected):
+    item = {
+        "price": 10,
+        "qty": 3,
+        "phone": "+55 (11) 999",
+        "tags": ["a", "b"],
+        "lines": [{"v": 1}, {"v": 2}, {"v": 3}],
+        "customer": {"name": "Ana", "email": "ana@example.com"},
+    }
+    assert executor._evaluate_expression(expression, item, context) == expected
+
+
+@pytest.mark.parametrize(
+    "expression",
+    [
+        "().__class__.__bases__[0].__subclasses__()",
+        "__import__('os').system('true')",
+        "item.__class__",
+        "'{0.__class__}'.format(item)",
+        "(lambda: 1)()",
+        "open('/etc/passwd')",
+        "getattr(item, 'keys')",
+        "[x := 1]",
+        "2 ** 100000",
+        "'a' * 10 ** 7",
+        "[0] * 10 ** 8",
+        "(10 ** 1000) ** 1000",
+        "f'{1:>200000000}'",
+        "'%0200000000d' % 1",
+        "'1'.zfill(200000000)",
+        "','.join(['a' * 1000000] * 1000)",
+    ],
+)
+def test_sandbox_rejects_unsafe_constructs(expression):
+    with pytest.raises(ExpressionError):
+        compile_expression(expression).evaluate({"item": {}})
+
+
+def test_comprehensions_share_the_iteration_budget():
+    nested = compile_expression("len([(a, b) for a in range(1500) for b in range(1000)])")
+    with pytest.raises(ExpressionError, match="iterações"):
+        nested.evaluate({})
+    # O orçamento é por avaliação, não acumula no escopo reaproveitado
+    scope = {}
+    for _ in range(5):
+        assert compile_expression("len([x for x in range(500000)])").evaluate(scope) == 500000
+
+
+def test_compiled_expressions_are_cached():
+    assert compile_expression("item.a + 1") is compile_expression("item.a + 1")
+
+
+def test_map_and_filter_use_compiled_expression(executor, context):
+    data = [{"v": i} for i in range(20)]
+
+    mapped = executor._transform_map(data, {"expression": "item.v * 2"}, context)
+    assert mapped == [i * 2 for i in range(20)]
+
+    filtered = executor._transform_filter(data, {"expression": "item.v >= {{threshold}}"}, context)
+    assert [row["v"] for row in filtered] == list(range(10, 20))
+
+
+def test_custom_code_runs_in_safe_language(executor, context):
+    code = (
+        "result = []\n"
+        "for row in data:\n"
+        "    if row['v'] % 2:\n"
+        "        continue\n"
+        "    result.append({'v': row['v'], 'limit': context.variables['threshold']})\n"
+    )
+    output = executor._transform_custom([{"v": 1}, {"v": 2}], {"code": code}, context)
+    assert output == [{"v": 2, "limit": 10}]
+
+    with pytest.raises(ValueError):
+        executor._transform_custom([], {"code": "import os"}, context)
+    with pytest.raises(ExpressionError):
+        compile_program("while True:\n    pass")
@@ -0,0 +1,209 @@
+"""
+Testes do pool de processos dos executores: classificação loop/processo,
+transformações no worker iguais às do event loop (com memória
+compartilhada), limites de tempo/CPU/memória, recuperação de worker perdido
+ou preso (prazo contado do início no worker), resultados abandonados e
+contexto enviado ao worker
+"""
+
+import asyncio
+import os
+import signal
+import time
+from pathlib import Path
+
+import pytest
+
+from synapse.core.executors import worker_pool
+from synapse.core.executors.base import ExecutionContext
+from synapse.core.executors.outputs import ExecutionOutputStore
+from synapse.core.executors.transform_executor import TransformExecutor, worker_context_state
+from synapse.core.executors.worker_pool import (
+    NodeWorkerPool,
+    OffloadTarget,
+    TaskLimits,
+    WorkerTaskError,
+)
+
+pytestmark = pytest.mark.unit
+
+ROWS = [{"id": index, "group": index % 7, "value": index * 3 % 11} for index in range(2_000)]
+
+
+def burn_cpu(_):
+    while True:
+        pass
+
+
+def ignore_deadline(path):
+    # Preso como em código C: o alarme do próprio worker nunca dispara
+    signal.pthread_sigmask(signal.SIG_BLOCK, {signal.SIGALRM})
+    Path(path).write_text(str(os.getpid()))
+    time.sleep(60)
+
+
+def slow_large_result(seconds):
+    time.sleep(seconds)
+    return "x" * 100_000
+
+
+def shared_segments():
+    return {name for name in os.listdir("/dev/shm") if name.startswith("psm_")}
+
+
+def process_gone(pid, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return True
+        time.sleep(0.05)
+    return False
+
+
+@pytest.fixture(scope="module")
+def pool():
+    pool = NodeWorkerPool(workers=1, limits=TaskLimits(3, 1, 64), min_shared_bytes=4096)
+    asyncio.run(pool.start())
+    yield pool
+    asyncio.run(pool.stop())
+
+
+@pytest.fixture()
+def executor(pool):
+    return TransformExecutor(worker_pool=pool, offload_min_rows=1_000)
+
+
+def test_offload_target_by_transform_and_size(executor):
+    sort = {"transform_type": "sort", "key": "value"}
+    assert executor.offload_target(sort, ROWS) == OffloadTarget.PROCESS
+    assert executor.offload_target(sort, ROWS[:10]) == OffloadTarget.LOOP
+    assert executor.offload_target({**sort, "offload": "loop"}, ROWS) == OffloadTarget.LOOP
+    assert executor.offload_target({"transform_type": "extract", "path": "id"}, ROWS) == OffloadTarget.LOOP
+    assert executor.offload_target({"transform_type": "custom", "code": "result = data"}, []) == OffloadTarget.PROCESS
+    # Funções registradas só existem no processo principal
+    registered = {"transform_type": "custom", "function_name": "clean_text", "code": "result = data"}
+    assert executor.offload_target(registered, []) == OffloadTarget.LOOP
+    assert executor.validate_config({**sort, "offload": "gpu"})["errors"] == ["Modo de offload inválido: gpu"]
+
+
+def test_offloaded_transformations_match_inline(executor, pool):
+    context = ExecutionContext("exec_1", 1, 1, variables={"threshold": 5})
+    shared_before = pool.stats["shared_memory_tasks"]
+    configs = [
+        {"transform_type": "sort", "key": "value", "reverse": True},
+        {"transform_type": "filter", "expression": "item.value > variables.threshold"},
+        {"transform_type": "custom", "code": "result = [row.id for row in data if row.group == 3]"},
+    ]
+    for config in configs:
+        offloaded = asyncio.run(executor._execute_transformation(config, ROWS, context))
+        inline = executor._apply_transformation(config, ROWS, context)
+        assert offloaded["success"] and offloaded["metadata"]["offloaded"]
+        assert offloaded["output"] == inline["output"]
+    assert pool.stats["shared_memory_tasks"] > shared_before
+
+
+@pytest.mark.parametrize(
+    "function, argument, kind",
+    [
+        (time.sleep, 30, "time"),
+        (burn_cpu, None, "cpu"),
+        (bytearray, 512 * 2**20, "memory"),
+    ],
+)
+def test_task_limits_are_enforced(pool, function, argument, kind):
+    started = time.perf_counter()
+    with pytest.raises(WorkerTaskError) as error:
+        asyncio.run(pool.run(function, argument))
+    assert error.value.kind == kind
+    assert time.perf_counter() - started < 10
+    assert pool.stats["limit_exceeded"][kind] >= 1
+    # O worker continua utilizável depois do limite
+    assert asyncio.run(pool.run(len, [1, 2, 3])) == 3
+
+
+def test_pool_recovers_from_a_crashed_worker(pool):
+    restarts = pool.stats["restarts"]
+    with pytest.raises(WorkerTaskError) as error:
+        asyncio.run(pool.run(os._exit, 3))
+    assert error.value.kind == "crashed"
+    assert pool.stats["restarts"] == restarts + 1
+    assert asyncio.run(pool.run(sorted, [3, 1, 2])) == [1, 2, 3]
+
+    stats = pool.get_stats()
+    assert stats["crashed"] >= 1 and stats["running"] == stats["waiting"] == 0
+
+
+def test_worker_stuck_past_the_hard_deadline_is_killed(tmp_path, monkeypatch):
+    monkeypatch.setattr(worker_pool, "_HARD_DEADLINE_GRACE", 0.5)
+    stuck_pool = NodeWorkerPool(workers=1, limits=TaskLimits(0.5, 5, 64))
+    asyncio.run(stuck_pool.start())
+    try:
+        marker = tmp_path / "pid"
+        with pytest.raises(WorkerTaskError) as error:
+            asyncio.run(stuck_pool.run(ignore_deadline, str(marker)))
+        assert error.value.kind == "time"
+        assert stuck_pool.stats["abandoned"] == 1 and stuck_pool.stats["restarts"] == 1
+        assert process_gone(int(marker.read_text()))
+        assert asyncio.run(stuck_pool.run(len, [1, 2])) == 2
+    finally:
+        asyncio.run(stuck_pool.stop())
+
+
+def test_hard_deadline_counts_from_the_start_in_the_worker(monkeypatch):
+    monkeypatch.setattr(worker_pool, "_HARD_DEADLINE_GRACE", 0.3)
+    busy_pool = NodeWorkerPool(workers=1, limits=TaskLimits(1.0, 5, 64))
+    asyncio.run(busy_pool.start())
+
+    async def queued_behind_abandoned_task():
+        # A tarefa cancelada continua no worker; a próxima espera na fila do pool
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(busy_pool.run(slow_large_result, 0.8), 0.05)
+        return await busy_pool.run(slow_large_result, 0.8)
+
+    try:
+        started = time.perf_counter()
+        assert asyncio.run(queued_behind_abandoned_task()) == "x" * 100_000
+        # Terminou depois do prazo contado do envio, dentro do contado do início
+        assert time.perf_counter() - started > 1.3
+        assert busy_pool.stats["abandoned"] == 0 and busy_pool.stats["restarts"] == 0
+    finally:
+        asyncio.run(busy_pool.stop())
+
+
+@pytest.mark.skipif(not os.path.isdir("/dev/shm"), reason="sem /dev/shm")
+def test_result_of_a_cancelled_task_is_released(pool):
+    before = shared_segments()
+
+    async def cancel():
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(pool.run(slow_large_result, 0.5), 0.1)
+        await asyncio.sleep(1.5)
+
+    asyncio.run(cancel())
+    assert shared_segments() <= before
+    assert asyncio.run(pool.run(sorted, [2, 1])) == [1, 2]
+
+
+def test_worker_context_carries_only_what_the_config_mentions(tmp_path):
+    store = ExecutionOutputStore(tmp_path, inline_bytes=1024)
+    context = ExecutionContext(
+        "exec_ctx",
+        1,
+        1,
+        variables={"threshold": 5, "unused_variable": "x" * 10_000},
+        input_data={"region": "sul", "payload": list(range(1_000))},
+        output_store=store,
+    )
+    context.node_outputs.spill("fetch", {"rows": 1})
+    context.node_outputs.spill("archive", {"rows": list(range(2_000))})
+    context.node_outputs.spill("unrelated", {"rows": 2})
+    config = {"transform_type": "filter", "expression": "item.value > variables.threshold and nodes.fetch.rows"}
+
+    state = worker_context_state(context, config)
+    assert state["variables"] == {"threshold": 5}
+    assert state["input_data"] == {}
+    # Externalizados vão sempre como referência (pequena); inline só se citados
+    assert set(state["node_outputs"]) == {"fetch", "archive"}
+    assert state["output_references"] == ["archive"]